@@ -0,0 +1,176 @@
+# @AI-HINT: Lazy router registry - route table declared up front; endpoint modules imported and mounted on first request to their paths
+"""
+Router Registry - lazy mounting of the v1 endpoint modules.
+
+Importing every endpoint module (and through them stripe, socketio, the
+schemas and services) and cloning their ~1,250 routes into the app was most
+of the API's cold start. ``routers.py`` declares the route table instead:
+module name, include prefix, tags and the URL paths the module serves.
+
+``mount()`` installs an ASGI middleware. The first request whose path falls
+under a module's paths imports the module (in a worker thread) and includes
+its router at the position it has in the declaration order, so route
+precedence is the same as with eager mounting. A request for the OpenAPI
+schema loads every module. Once everything is loaded the middleware is a
+single attribute check.
+
+A module whose router is included without a prefix must declare ``paths``
+(normally its router's own prefix). Routes outside the declared paths are
+logged when the module loads, since requests to them cannot trigger the
+load. ``warm_up()`` preloads hot modules after startup; ``mount(lazy=False)``
+includes everything at once.
+"""
+
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RouterSpec(NamedTuple):
+    module: str
+    prefix: str
+    tags: List[str]
+    paths: Tuple[str, ...]
+
+
+def _first_segment(path: str) -> str:
+    end = path.find("/", 1)
+    return path if end == -1 else path[:end]
+
+
+def _under(path: str, mount_path: str) -> bool:
+    return path == mount_path or path.startswith(mount_path + "/")
+
+
+class RouterRegistry:
+    """Declared endpoint modules of one API package, mounted on demand."""
+
+    def __init__(self, package: str):
+        self.package = package
+        self.specs: List[RouterSpec] = []
+        self.load_ms: Dict[str, float] = {}
+        self._by_segment: Dict[str, List[int]] = {}
+        self._routes: Dict[int, List[Any]] = {}
+        self._app = None
+        self._prefix = ""
+        self._anchor = 0
+        self._schema_paths: Tuple[str, ...] = ()
+        self._lock = threading.RLock()
+
+    def add(self, module: str, prefix: str = "", tags: Optional[List[str]] = None,
+            paths: Optional[Sequence[str]] = None) -> None:
+        """Declare ``<package>.<module>.router``, included under ``prefix`` and serving ``paths``."""
+        mount_paths = tuple(paths) if paths else (prefix,)
+        if not all(mount_paths):
+            raise ValueError(f"router {module} is included without a prefix and must declare its paths")
+        index = len(self.specs)
+        self.specs.append(RouterSpec(module, prefix, list(tags or []), mount_paths))
+        for segment in {_first_segment(p) for p in mount_paths}:
+            self._by_segment.setdefault(segment, []).append(index)
+
+    # ------------------------------------------------------------------
+    # Mounting
+    # ------------------------------------------------------------------
+
+    def mount(self, app, prefix: str = "/api", lazy: bool = True) -> None:
+        """Attach to ``app``; routes are inserted where ``include_router`` would have put them now."""
+        self._app = app
+        self._prefix = prefix
+        self._anchor = len(app.router.routes)
+        self._schema_paths = tuple(p for p in (app.openapi_url,) if p)
+        if lazy:
+            app.add_middleware(LazyRouterMiddleware, registry=self)
+        else:
+            self.load_all()
+
+    @property
+    def pending(self) -> bool:
+        return len(self._routes) < len(self.specs)
+
+    def loaded(self) -> List[str]:
+        return [self.specs[i].module for i in sorted(self._routes)]
+
+    def unloaded_for(self, path: str) -> List[int]:
+        """Indexes of the not-yet-loaded modules serving ``path``."""
+        if path in self._schema_paths:
+            return [i for i in range(len(self.specs)) if i not in self._routes]
+        if not path.startswith(self._prefix):
+            return []
+        path = path[len(self._prefix):] or "/"
+        return [
+            i for i in self._by_segment.get(_first_segment(path), ())
+            if i not in self._routes and any(_under(path, p) for p in self.specs[i].paths)
+        ]
+
+    async def ensure_loaded(self, indexes: Iterable[int]) -> None:
+        for index in sorted(indexes):
+            if index not in self._routes:
+                # Import off the event loop; including the router is cheap by comparison
+                await asyncio.to_thread(importlib.import_module, self._module_name(index))
+                self._load(index)
+
+    def load_all(self) -> None:
+        for index in range(len(self.specs)):
+            self._load(index)
+
+    async def warm_up(self, modules: Iterable[str]) -> None:
+        """Preload the named modules (e.g. the hottest endpoints) without blocking requests."""
+        names = {spec.module: i for i, spec in enumerate(self.specs)}
+        for module in modules:
+            if module not in names:
+                logger.warning(f"routers.warm_up_unknown module={module}")
+                continue
+            try:
+                await self.ensure_loaded([names[module]])
+            except Exception as e:
+                logger.warning(f"routers.warm_up_failed module={module}: {e}")
+        logger.info(f"routers.warmed loaded={len(self._routes)}/{len(self.specs)}")
+
+    def _module_name(self, index: int) -> str:
+        return f"{self.package}.{self.specs[index].module}"
+
+    def _load(self, index: int) -> None:
+        with self._lock:
+            if index in self._routes:
+                return
+            spec = self.specs[index]
+            start = time.perf_counter()
+            module = importlib.import_module(self._module_name(index))
+            routes = self._app.router.routes
+            before = len(routes)
+            self._app.include_router(module.router, prefix=self._prefix + spec.prefix, tags=spec.tags)
+            added = routes[before:]
+            del routes[before:]
+            position = self._anchor + sum(len(r) for i, r in self._routes.items() if i < index)
+            routes[position:position] = added
+            self._routes[index] = added
+            self._app.openapi_schema = None
+            self.load_ms[spec.module] = round((time.perf_counter() - start) * 1000, 2)
+
+        undeclared = sorted({
+            route.path for route in added
+            if not any(_under(route.path, self._prefix + p) for p in spec.paths)
+        })
+        if undeclared:
+            logger.warning(f"routers.undeclared_paths module={spec.module} paths={undeclared[:5]}")
+        logger.info(f"routers.loaded module={spec.module} routes={len(added)} ms={self.load_ms[spec.module]}")
+
+
+class LazyRouterMiddleware:
+    """Loads the endpoint modules serving a request's path before routing it."""
+
+    def __init__(self, app, registry: RouterRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if self.registry.pending and scope["type"] in ("http", "websocket"):
+            indexes = self.registry.unloaded_for(scope["path"])
+            if indexes:
+                await self.registry.ensure_loaded(indexes)
+        await self.app(scope, receive, send)
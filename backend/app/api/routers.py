@@ -1,366 +1,322 @@
-# @AI-HINT: Central router registry - aggregates all v1 API routers into master router
-from fastapi import APIRouter
-from .v1 import (
-    health, users, projects, proposals, contracts, portfolio, payments, 
-    auth, client, assessments, interviews, verification,
-    analytics_pro, escrow_pro, notifications_pro, teams, audit,
-    export_import, i18n, rate_limiting, webhooks, scheduler, reports, referrals, moderation,
-    bulk_operations, saved_searches, activity_feed, api_keys, comments, file_versions, custom_fields,
-    templates, organizations, notification_preferences, two_factor, email_templates, integrations,
-    push_notifications, invoice_tax, contract_builder, skill_graph,
-    social_login, timezone, backup_restore,
-    portfolio_builder, compliance, learning_center,
-    analytics_dashboard, marketplace,
-    subscription_billing, legal_documents, knowledge_base, workflow_automation,
-    messages, notifications, reviews, disputes, milestones, skills, admin,
-    time_entries, invoices, escrow, categories, favorites, tags, support_tickets, refunds, search,
-    websocket, uploads, portal_endpoints, analytics, job_alerts, ai_services, fraud_detection, stripe, chatbot,
-    # New enterprise features
-    user_feedback, data_analytics_export,
-    availability_calendar, review_responses,
-    rate_cards, proposal_templates,
-    notes_tags, custom_statuses, search_advanced, realtime_notifications,
-    ai_matching,
-    # Version 2.0 Advanced Features
-    security, video_communication,
-    # Now enabled - all modules working
-    multicurrency, ai_advanced, admin_fraud_alerts,
-    # AI Writing Assistant
-    ai_writing,
-    # Billion Dollar Upgrade Features
-    scope_change, wallet, community, workroom, feature_flags,
-    # Pakistan Payments - USDC, JazzCash, EasyPaisa, Wise, Payoneer
-    pakistan_payments,
-    # Blog & News
-    blog,
-    # Public clients showcase
-    public_clients,
-    # Public freelancer profiles
-    public_profiles,
-    # Fiverr/Upwork Feature Parity - Gig Marketplace & Seller Tiers
-    gigs, seller_stats, talent_invitations,
-    external_projects,
-    price_estimator,
-    # Standalone Public Tools
-    invoice_generator, contract_builder_standalone, income_calculator,
-    scope_planner, expense_tax_calculator,
-)
-
-
-api_router = APIRouter()
+# @AI-HINT: Central router registry - declares every v1 endpoint module with its prefix, tags and paths; mounted lazily on first request
+from .router_registry import RouterRegistry
+
+
+api_routes = RouterRegistry("app.api.v1")
 
 # Core services
-api_router.include_router(health.router, prefix="/health", tags=["health"]) 
-api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
-api_router.include_router(websocket.router, prefix="/ws", tags=["websocket"])  # WebSocket status
+api_routes.add("health", prefix="/health", tags=["health"]) 
+api_routes.add("auth", prefix="/auth", tags=["auth"])
+api_routes.add("websocket", prefix="/ws", tags=["websocket"])  # WebSocket status
 
 # User management
-api_router.include_router(users.router, prefix="/users", tags=["users"])
-api_router.include_router(skills.router, prefix="/skills", tags=["skills"])
-api_router.include_router(job_alerts.router, prefix="/job-alerts", tags=["job-alerts"])
-api_router.include_router(admin.router, prefix="", tags=["admin"])  # Admin endpoints
+api_routes.add("users", prefix="/users", tags=["users"])
+api_routes.add("skills", prefix="/skills", tags=["skills"])
+api_routes.add("job_alerts", prefix="/job-alerts", tags=["job-alerts"])
+api_routes.add("admin", tags=["admin"], paths=["/admin"])  # Admin endpoints
 
 # Project workflow
-api_router.include_router(projects.router, prefix="/projects", tags=["projects"])
-api_router.include_router(proposals.router, prefix="/proposals", tags=["proposals"])
-api_router.include_router(contracts.router, prefix="/contracts", tags=["contracts"])
-api_router.include_router(milestones.router, prefix="/milestones", tags=["milestones"])
-api_router.include_router(scope_change.router, prefix="/scope-changes", tags=["scope-changes"])
+api_routes.add("projects", prefix="/projects", tags=["projects"])
+api_routes.add("proposals", prefix="/proposals", tags=["proposals"])
+api_routes.add("contracts", prefix="/contracts", tags=["contracts"])
+api_routes.add("milestones", prefix="/milestones", tags=["milestones"])
+api_routes.add("scope_change", prefix="/scope-changes", tags=["scope-changes"])
 
 # Communication
-api_router.include_router(messages.router, prefix="", tags=["messages"])
-api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
+api_routes.add("messages", tags=["messages"], paths=["/conversations", "/messages"])
+api_routes.add("notifications", prefix="/notifications", tags=["notifications"])
 
 # Reviews and disputes
-api_router.include_router(reviews.router, prefix="/reviews", tags=["reviews"])
-api_router.include_router(disputes.router, prefix="/disputes", tags=["disputes"])
+api_routes.add("reviews", prefix="/reviews", tags=["reviews"])
+api_routes.add("disputes", prefix="/disputes", tags=["disputes"])
 
 # Payments and portfolio
-api_router.include_router(payments.router, prefix="/payments", tags=["payments"])
-api_router.include_router(stripe.router, prefix="/stripe", tags=["stripe"])
-api_router.include_router(portfolio.router, prefix="/portfolio", tags=["portfolio"])
-api_router.include_router(wallet.router, prefix="/wallet", tags=["wallet"])
+api_routes.add("payments", prefix="/payments", tags=["payments"])
+api_routes.add("stripe", prefix="/stripe", tags=["stripe"])
+api_routes.add("portfolio", prefix="/portfolio", tags=["portfolio"])
+api_routes.add("wallet", prefix="/wallet", tags=["wallet"])
 
 
 # Time tracking, invoices, and escrow
-api_router.include_router(time_entries.router, prefix="", tags=["time-tracking"])
-api_router.include_router(invoices.router, prefix="", tags=["invoices"])
-api_router.include_router(escrow.router, prefix="", tags=["escrow"])
+api_routes.add("time_entries", tags=["time-tracking"], paths=["/time-entries"])
+api_routes.add("invoices", tags=["invoices"], paths=["/invoices"])
+api_routes.add("escrow", tags=["escrow"], paths=["/escrow"])
 
 # Categories, tags, and favorites
-api_router.include_router(categories.router, prefix="", tags=["categories"])
-api_router.include_router(tags.router, prefix="", tags=["tags"])
-api_router.include_router(favorites.router, prefix="", tags=["favorites"])
+api_routes.add("categories", tags=["categories"], paths=["/categories"])
+api_routes.add("tags", tags=["tags"], paths=["/tags"])
+api_routes.add("favorites", tags=["favorites"], paths=["/favorites"])
 
 # Support and refunds
-api_router.include_router(support_tickets.router, prefix="", tags=["support"])
-api_router.include_router(refunds.router, prefix="", tags=["refunds"])
+api_routes.add("support_tickets", tags=["support"], paths=["/support-tickets"])
+api_routes.add("refunds", tags=["refunds"], paths=["/refunds"])
 
 # Search functionality
-api_router.include_router(search.router, prefix="", tags=["search"])
-api_router.include_router(search_advanced.router, prefix="", tags=["search-advanced"])  # Turso FTS5 search
+api_routes.add("search", tags=["search"], paths=["/search"])
+api_routes.add("search_advanced", tags=["search-advanced"], paths=["/search"])  # Turso FTS5 search
 
 # Real-time notifications
-api_router.include_router(realtime_notifications.router, prefix="/realtime", tags=["realtime"])
+api_routes.add("realtime_notifications", prefix="/realtime", tags=["realtime"])
 
 # AI-powered matching
-api_router.include_router(ai_matching.router, prefix="", tags=["ai-matching"])
+api_routes.add("ai_matching", tags=["ai-matching"], paths=["/matching"])
 
 
 # Analytics and reporting
-api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
+api_routes.add("analytics", prefix="/analytics", tags=["analytics"])
 
 # Advanced Analytics Pro - ML predictions and BI
-api_router.include_router(analytics_pro.router, prefix="/analytics-pro", tags=["analytics-pro"])
+api_routes.add("analytics_pro", prefix="/analytics-pro", tags=["analytics-pro"])
 
 # File uploads and client tools
-api_router.include_router(uploads.router, prefix="/uploads", tags=["uploads"])
-api_router.include_router(client.router, prefix="/client", tags=["client"])
+api_routes.add("uploads", prefix="/uploads", tags=["uploads"])
+api_routes.add("client", prefix="/client", tags=["client"])
 
 # AI services
-api_router.include_router(ai_services.router, prefix="/ai", tags=["ai"])
+api_routes.add("ai_services", prefix="/ai", tags=["ai"])
 
 # AI Price Estimator - General-purpose pricing intelligence (public)
-api_router.include_router(price_estimator.router, prefix="/price-estimator", tags=["price-estimator"])
+api_routes.add("price_estimator", prefix="/price-estimator", tags=["price-estimator"])
 
 # Standalone Public Tools
-api_router.include_router(invoice_generator.router, prefix="/invoice-generator", tags=["invoice-generator"])
-api_router.include_router(contract_builder_standalone.router, prefix="/contract-builder-standalone", tags=["contract-builder-standalone"])
-api_router.include_router(income_calculator.router, prefix="/income-calculator", tags=["income-calculator"])
-api_router.include_router(scope_planner.router, prefix="/scope-planner", tags=["scope-planner"])
-api_router.include_router(expense_tax_calculator.router, prefix="/expense-tax-calculator", tags=["expense-tax-calculator"])
+api_routes.add("invoice_generator", prefix="/invoice-generator", tags=["invoice-generator"])
+api_routes.add("contract_builder_standalone", prefix="/contract-builder-standalone", tags=["contract-builder-standalone"])
+api_routes.add("income_calculator", prefix="/income-calculator", tags=["income-calculator"])
+api_routes.add("scope_planner", prefix="/scope-planner", tags=["scope-planner"])
+api_routes.add("expense_tax_calculator", prefix="/expense-tax-calculator", tags=["expense-tax-calculator"])
 
 # Skill Assessments - Professional skill verification
-api_router.include_router(assessments.router, prefix="/assessments", tags=["assessments"])
+api_routes.add("assessments", prefix="/assessments", tags=["assessments"])
 
 # Video Interviews - WebRTC video calling
-api_router.include_router(interviews.router, prefix="/interviews", tags=["interviews"])
+api_routes.add("interviews", prefix="/interviews", tags=["interviews"])
 
 # Identity Verification - KYC workflow
-api_router.include_router(verification.router, prefix="/verification", tags=["verification"])
+api_routes.add("verification", prefix="/verification", tags=["verification"])
 
 # Portal endpoints (client and freelancer dashboards)
-api_router.include_router(portal_endpoints.router, prefix="/portal", tags=["portals"])
+api_routes.add("portal_endpoints", prefix="/portal", tags=["portals"])
 
 # Advanced Escrow Pro - Stripe integration with milestones
-api_router.include_router(escrow_pro.router, prefix="/escrow-pro", tags=["escrow-pro"])
+api_routes.add("escrow_pro", prefix="/escrow-pro", tags=["escrow-pro"])
 
 # Notification Center Pro - Multi-channel notifications
-api_router.include_router(notifications_pro.router, prefix="/notifications-pro", tags=["notifications-pro"])
+api_routes.add("notifications_pro", prefix="/notifications-pro", tags=["notifications-pro"])
 
 # AI Chatbot - Intelligent support automation
-api_router.include_router(chatbot.router, prefix="/chatbot", tags=["chatbot"])
+api_routes.add("chatbot", prefix="/chatbot", tags=["chatbot"])
 
 # Team Collaboration - Agency and team management
-api_router.include_router(teams.router, prefix="/teams", tags=["teams"])
+api_routes.add("teams", prefix="/teams", tags=["teams"])
 
 # Audit Trail - Compliance and security logging
-api_router.include_router(audit.router, prefix="/audit", tags=["audit"])
+api_routes.add("audit", prefix="/audit", tags=["audit"])
 
 # Export/Import - Data portability and GDPR compliance
-api_router.include_router(export_import.router, prefix="/export-import", tags=["export-import"])
+api_routes.add("export_import", prefix="/export-import", tags=["export-import"])
 
 # Internationalization (i18n) - Multi-language support
-api_router.include_router(i18n.router, prefix="/i18n", tags=["i18n"])
+api_routes.add("i18n", prefix="/i18n", tags=["i18n"])
 
 # Rate Limiting Pro - Advanced API rate limiting
-api_router.include_router(rate_limiting.router, prefix="/rate-limits", tags=["rate-limits"])
+api_routes.add("rate_limiting", prefix="/rate-limits", tags=["rate-limits"])
 
 # Webhooks - Third-party integrations
-api_router.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
+api_routes.add("webhooks", prefix="/webhooks", tags=["webhooks"])
 
 # Background Task Scheduler - Job queue management
-api_router.include_router(scheduler.router, prefix="/scheduler", tags=["scheduler"])
+api_routes.add("scheduler", prefix="/scheduler", tags=["scheduler"])
 
 # Report Generation - PDF/Excel exports
-api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
+api_routes.add("reports", prefix="/reports", tags=["reports"])
+api_routes.add("pdf_jobs", prefix="/pdf-jobs", tags=["pdf-jobs"])
 
 # Referral System - User acquisition rewards
-api_router.include_router(referrals.router, prefix="/referrals", tags=["referrals"])
+api_routes.add("referrals", prefix="/referrals", tags=["referrals"])
 
 # Content Moderation - AI-powered content safety
-api_router.include_router(moderation.router, prefix="/moderation", tags=["moderation"])
+api_routes.add("moderation", prefix="/moderation", tags=["moderation"])
 
 # Bulk Operations - Batch processing
-api_router.include_router(bulk_operations.router, prefix="/bulk", tags=["bulk-operations"])
+api_routes.add("bulk_operations", prefix="/bulk", tags=["bulk-operations"])
 
 # Saved Searches - Persistent search queries
-api_router.include_router(saved_searches.router, prefix="/saved-searches", tags=["saved-searches"])
+api_routes.add("saved_searches", prefix="/saved-searches", tags=["saved-searches"])
 
 # Activity Feed - User timeline and social features
-api_router.include_router(activity_feed.router, prefix="/activity", tags=["activity-feed"])
+api_routes.add("activity_feed", prefix="/activity", tags=["activity-feed"])
 
 # API Keys - Developer API management
-api_router.include_router(api_keys.router, prefix="/api-keys", tags=["api-keys"])
+api_routes.add("api_keys", prefix="/api-keys", tags=["api-keys"])
 
 # Comments - Threaded discussions
-api_router.include_router(comments.router, prefix="/comments", tags=["comments"])
+api_routes.add("comments", prefix="/comments", tags=["comments"])
 
 # File Versions - Document version control
-api_router.include_router(file_versions.router, prefix="/file-versions", tags=["file-versions"])
+api_routes.add("file_versions", prefix="/file-versions", tags=["file-versions"])
 
 # Custom Fields - Dynamic entity metadata
-api_router.include_router(custom_fields.router, prefix="/custom-fields", tags=["custom-fields"])
+api_routes.add("custom_fields", prefix="/custom-fields", tags=["custom-fields"])
 
 # Templates - Reusable project/proposal/contract templates
-api_router.include_router(templates.router, tags=["templates"])
+api_routes.add("templates", tags=["templates"], paths=["/templates"])
 
 # Organizations - Multi-tenant workspace management
-api_router.include_router(organizations.router, tags=["organizations"])
+api_routes.add("organizations", tags=["organizations"], paths=["/organizations"])
 
 # Notification Preferences - Granular notification settings
-api_router.include_router(notification_preferences.router, tags=["notification-preferences"])
+api_routes.add("notification_preferences", tags=["notification-preferences"], paths=["/notification-preferences"])
 
 # Two-Factor Authentication - TOTP 2FA with backup codes
-api_router.include_router(two_factor.router, tags=["two-factor"])
+api_routes.add("two_factor", tags=["two-factor"], paths=["/2fa"])
 
 # Email Templates - Customizable email templates
-api_router.include_router(email_templates.router, tags=["email-templates"])
+api_routes.add("email_templates", tags=["email-templates"], paths=["/email-templates"])
 
 # Integrations Hub - Third-party service integrations
-api_router.include_router(integrations.router, tags=["integrations"])
+api_routes.add("integrations", tags=["integrations"], paths=["/integrations"])
 
 # Mobile Push Notifications - FCM/APNs
-api_router.include_router(push_notifications.router, tags=["push-notifications"])
+api_routes.add("push_notifications", tags=["push-notifications"], paths=["/push-notifications"])
 
 # Invoice & Tax Management - Professional invoicing
-api_router.include_router(invoice_tax.router, tags=["invoice-tax"])
+api_routes.add("invoice_tax", tags=["invoice-tax"], paths=["/invoice-tax"])
 
 # Contract Builder - Visual contract creation
-api_router.include_router(contract_builder.router, tags=["contract-builder"])
+api_routes.add("contract_builder", tags=["contract-builder"], paths=["/contract-builder"])
 
 # Skill Graph - Skill relationships and endorsements
-api_router.include_router(skill_graph.router, tags=["skill-graph"])
+api_routes.add("skill_graph", tags=["skill-graph"], paths=["/skill-graph"])
 
 # AI Writing Assistant - Content generation
-api_router.include_router(ai_writing.router, prefix="/ai-writing", tags=["ai-writing"])
+api_routes.add("ai_writing", prefix="/ai-writing", tags=["ai-writing"])
 
 # Social Login - OAuth2 social authentication
-api_router.include_router(social_login.router, tags=["social-login"])
+api_routes.add("social_login", tags=["social-login"], paths=["/social-auth"])
 
 # Timezone Management - Smart timezone handling
-api_router.include_router(timezone.router, tags=["timezone"])
+api_routes.add("timezone", tags=["timezone"], paths=["/timezone"])
 
 # Backup & Restore - Data backup and restoration
-api_router.include_router(backup_restore.router, tags=["backup-restore"])
+api_routes.add("backup_restore", tags=["backup-restore"], paths=["/backup"])
 
 # Portfolio Builder - Professional portfolio creation
-api_router.include_router(portfolio_builder.router, tags=["portfolio-builder"])
+api_routes.add("portfolio_builder", tags=["portfolio-builder"], paths=["/portfolio-builder"])
 
 # Compliance Center - GDPR and regulatory compliance
-api_router.include_router(compliance.router, tags=["compliance"])
+api_routes.add("compliance", tags=["compliance"], paths=["/compliance"])
 
 # Learning Center - Tutorials and courses
-api_router.include_router(learning_center.router, tags=["learning-center"])
+api_routes.add("learning_center", tags=["learning-center"], paths=["/learning"])
 
 # Fraud Detection - AI-powered fraud prevention
-api_router.include_router(fraud_detection.router, tags=["fraud-detection"])
+api_routes.add("fraud_detection", tags=["fraud-detection"], paths=["/fraud-detection"])
 
 # Analytics Dashboard - Business intelligence
-api_router.include_router(analytics_dashboard.router, tags=["analytics-dashboard"])
+api_routes.add("analytics_dashboard", tags=["analytics-dashboard"], paths=["/analytics-dashboard"])
 
 # Marketplace - Advanced search and discovery
-api_router.include_router(marketplace.router, tags=["marketplace"])
+api_routes.add("marketplace", tags=["marketplace"], paths=["/marketplace"])
 
 # Subscription & Billing - Premium plans and payments
-api_router.include_router(subscription_billing.router, tags=["subscriptions"])
+api_routes.add("subscription_billing", tags=["subscriptions"], paths=["/subscriptions"])
 
 # Legal Document Center - NDAs, contracts, e-signatures
-api_router.include_router(legal_documents.router, tags=["legal-documents"])
+api_routes.add("legal_documents", tags=["legal-documents"], paths=["/legal-documents"])
 
 # Knowledge Base & FAQ - Help center
-api_router.include_router(knowledge_base.router, tags=["knowledge-base"])
+api_routes.add("knowledge_base", tags=["knowledge-base"], paths=["/knowledge-base"])
 
 # Workflow Automation - Triggers and automated actions
-api_router.include_router(workflow_automation.router, tags=["workflows"])
+api_routes.add("workflow_automation", tags=["workflows"], paths=["/workflows"])
 
 # User Feedback - NPS surveys and feature requests
-api_router.include_router(user_feedback.router, tags=["user-feedback"])
+api_routes.add("user_feedback", tags=["user-feedback"], paths=["/feedback"])
 
 
 
 # Data Analytics Export - BI and reporting exports
-api_router.include_router(data_analytics_export.router, tags=["data-export"])
+api_routes.add("data_analytics_export", tags=["data-export"], paths=["/data-export"])
 
 # Availability Calendar - Freelancer scheduling
-api_router.include_router(availability_calendar.router, tags=["availability"])
+api_routes.add("availability_calendar", tags=["availability"], paths=["/availability"])
 
 # Review Responses - Business owner replies
-api_router.include_router(review_responses.router, tags=["review-responses"])
+api_routes.add("review_responses", tags=["review-responses"], paths=["/review-responses"])
 
 # Rate Cards - Freelancer pricing structures
-api_router.include_router(rate_cards.router, tags=["rate-cards"])
+api_routes.add("rate_cards", tags=["rate-cards"], paths=["/rate-cards"])
 
 # Proposal Templates - Reusable proposal templates
-api_router.include_router(proposal_templates.router, tags=["proposal-templates"])
+api_routes.add("proposal_templates", tags=["proposal-templates"], paths=["/proposal-templates"])
 
 # Notes & Tags - Organization and metadata
-api_router.include_router(notes_tags.router, tags=["notes-tags"])
+api_routes.add("notes_tags", tags=["notes-tags"], paths=["/notes-tags"])
 
 # Custom Statuses - Workflow customization
-api_router.include_router(custom_statuses.router, tags=["custom-statuses"])
+api_routes.add("custom_statuses", tags=["custom-statuses"], paths=["/custom-statuses"])
 
 # ========================================
 # VERSION 2.0 ADVANCED FEATURES
 # ========================================
 
 # Advanced Security - MFA, risk-based auth, session management
-api_router.include_router(security.router, prefix="/security", tags=["security-advanced"])
+api_routes.add("security", prefix="/security", tags=["security-advanced"])
 
 # Video Communication - WebRTC calls, screen sharing, whiteboard
-api_router.include_router(video_communication.router, prefix="/video", tags=["video"])
+api_routes.add("video_communication", prefix="/video", tags=["video"])
 
 # Multi-Currency Payments
-api_router.include_router(multicurrency.router, prefix="/multicurrency", tags=["multicurrency"])
+api_routes.add("multicurrency", prefix="/multicurrency", tags=["multicurrency"])
 
 # Advanced AI - ML-powered features
-api_router.include_router(ai_advanced.router, prefix="/ai-advanced", tags=["ai-advanced"])
+api_routes.add("ai_advanced", prefix="/ai-advanced", tags=["ai-advanced"])
 
 # Admin Fraud Alerts - Real-time fraud monitoring
-api_router.include_router(admin_fraud_alerts.router, prefix="/admin/fraud-alerts", tags=["admin-fraud"])
+api_routes.add("admin_fraud_alerts", prefix="/admin/fraud-alerts", tags=["admin-fraud"])
 
 # ========================================
 # BILLION DOLLAR UPGRADE FEATURES
 # ========================================
 
 # Community Hub - Q&A, Playbooks, Office Hours
-api_router.include_router(community.router, prefix="/community", tags=["community"])
+api_routes.add("community", prefix="/community", tags=["community"])
 
 # Collaboration Workroom - Kanban, Files, Discussions
-api_router.include_router(workroom.router, prefix="/workroom", tags=["workroom"])
+api_routes.add("workroom", prefix="/workroom", tags=["workroom"])
 
 # Feature Flags - A/B Testing and gradual rollouts
-api_router.include_router(feature_flags.router, tags=["feature-flags"])
+api_routes.add("feature_flags", tags=["feature-flags"], paths=["/feature-flags"])
 
 # Pakistan Payments - USDC, JazzCash, EasyPaisa, AirTM, Wise, Payoneer
 # Stripe is NOT available in Pakistan - these are the alternatives
-api_router.include_router(pakistan_payments.router, prefix="/pk-payments", tags=["pakistan-payments"])
+api_routes.add("pakistan_payments", prefix="/pk-payments", tags=["pakistan-payments"])
 
 # ============================================================================
 
 # Blog & News
-api_router.include_router(blog.router, prefix="/blog", tags=["blog"])
+api_routes.add("blog", prefix="/blog", tags=["blog"])
 
 # Public clients showcase (no auth required)
-api_router.include_router(public_clients.router, tags=["public-clients"])
+api_routes.add("public_clients", tags=["public-clients"], paths=["/public-clients"])
 
 # Public freelancer profiles (no auth required - shareable profiles)
-api_router.include_router(public_profiles.router, prefix="/freelancers", tags=["public-profiles"])
+api_routes.add("public_profiles", prefix="/freelancers", tags=["public-profiles"])
 
 # ============================================================================
 # FIVERR/UPWORK FEATURE PARITY - Gig Marketplace & Seller Tier System
 # ============================================================================
 
 # Gig Marketplace - Fiverr-style service packages with 3-tier pricing
-api_router.include_router(gigs.router, prefix="/gigs", tags=["gigs"])
+api_routes.add("gigs", prefix="/gigs", tags=["gigs"])
 
 # Seller Stats & Tier System - Bronze to Platinum levels with JSS algorithm
-api_router.include_router(seller_stats.router, prefix="/seller-stats", tags=["seller-stats"])
+api_routes.add("seller_stats", prefix="/seller-stats", tags=["seller-stats"])
 
 # Talent Invitations - Upwork-style invite-to-bid system
-api_router.include_router(talent_invitations.router, prefix="/invitations", tags=["talent-invitations"])
+api_routes.add("talent_invitations", prefix="/invitations", tags=["talent-invitations"])
 
 # ============================================================================
 # EXTERNAL PROJECT SCRAPER - Aggregate freelance projects from RemoteOK, Jobicy, Arbeitnow
 # ============================================================================
-api_router.include_router(external_projects.router, prefix="", tags=["external-projects"])
\ No newline at end of file
+api_routes.add("external_projects", tags=["external-projects"], paths=["/external-projects", "/external-projects-categories", "/external-projects-stats"])
\ No newline at end of file
@@ -1,48 +1,9 @@
 # @AI-HINT: API v1 exports
-from . import (
-    health, users, auth, projects, proposals, contracts, portfolio, payments,
-    client, assessments, interviews, verification,
-    analytics_pro, escrow_pro, notifications_pro, teams, audit,
-    export_import, i18n, rate_limiting, webhooks, scheduler,
-    reports, referrals, moderation, bulk_operations, saved_searches,
-    activity_feed, api_keys, comments, file_versions, custom_fields,
-    templates, organizations, notification_preferences, two_factor,
-    email_templates, integrations, push_notifications, invoice_tax,
-    contract_builder, skill_graph, social_login, timezone, backup_restore,
-    portfolio_builder, compliance, learning_center,
-    analytics_dashboard, marketplace, subscription_billing,
-    legal_documents, knowledge_base, workflow_automation, messages,
-    notifications, reviews, disputes, milestones, skills, admin,
-    time_entries, invoices, escrow, categories, favorites, tags,
-    support_tickets, refunds, search, websocket, uploads, portal_endpoints,
-    analytics, job_alerts, ai_services, fraud_detection, stripe,
-    user_feedback,
-    data_analytics_export, availability_calendar,
-    review_responses,
-    rate_cards, proposal_templates,
-    notes_tags, custom_statuses, search_advanced,
-    realtime_notifications, ai_matching, security, video_communication,
-    # Version 2.0 features
-    multicurrency, ai_advanced, admin_fraud_alerts,
-    # Billion Dollar Upgrade
-    scope_change, wallet, community, workroom, feature_flags,
-    # Pakistan Payments
-    pakistan_payments,
-    # Blog & News
-    blog,
-    # Public clients showcase
-    public_clients,
-    # Fiverr/Upwork Feature Parity - Gig Marketplace & Seller Tiers
-    gigs, seller_stats, talent_invitations,
-    # External Projects
-    external_projects,
-    # AI Writing
-    ai_writing,
-    # Chatbot
-    chatbot,
-    # General-Purpose AI Price Estimator
-    price_estimator,
-)
+"""
+Endpoint modules are imported on first use (see ``app.api.router_registry``);
+``from app.api.v1 import gigs`` and ``app.api.v1.gigs`` both still work.
+"""
+import importlib
 
 __all__ = [
     "health", "users", "auth", "projects", "proposals", "contracts",
@@ -75,3 +36,9 @@ __all__ = [
     "external_projects", "ai_writing", "chatbot",
     "price_estimator",
 ]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
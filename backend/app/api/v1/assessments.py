@@ -8,6 +8,7 @@ Endpoints for:
 - Managing skill certifications
 """
 
+import asyncio
 from typing import List, Optional, Any
 from fastapi import APIRouter, Depends, HTTPException, Query, Body
 from sqlalchemy.orm import Session
@@ -187,7 +188,9 @@ async def submit_answer(
     """
     engine = get_assessment_engine(db)
     _verify_session_owner(engine, session_id, current_user.id)
-    result = engine.submit_answer(
+    # Coding answers run in the sandbox pool; keep the event loop free while they do
+    result = await asyncio.to_thread(
+        engine.submit_answer,
         session_id=session_id,
         question_id=request.question_id,
         answer=request.answer
@@ -8,10 +8,12 @@ Provides:
 - Bulk payment operations (process, refund)
 - Import operations (CSV, JSON)
 - Progress tracking for long operations
+
+Project, user and payment operations run through the chunked, set-based
+bulk executor; their progress is persisted and survives restarts.
 """
 
 import uuid
-from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, UploadFile, File
 from pydantic import BaseModel, Field
@@ -19,30 +21,33 @@ from sqlalchemy.orm import Session
 
 from ...db.session import get_db
 from ...core.security import get_current_active_user, require_admin
+from ...services.bulk_executor import BULK_ACTIONS, get_bulk_executor
 
 
 router = APIRouter()
 
+BULK_MAX_ITEMS = 100_000
+
 
 # ============== Pydantic Models ==============
 
 class BulkProjectOperation(BaseModel):
     """Bulk project operation request."""
-    project_ids: List[str] = Field(..., min_length=1, max_length=100)
+    project_ids: List[str] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
     operation: str = Field(..., description="archive, unarchive, delete, update_status, update_category")
     params: Optional[Dict[str, Any]] = None
 
 
 class BulkUserOperation(BaseModel):
     """Bulk user operation request."""
-    user_ids: List[str] = Field(..., min_length=1, max_length=100)
+    user_ids: List[str] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
     operation: str = Field(..., description="activate, suspend, send_message, update_role")
     params: Optional[Dict[str, Any]] = None
 
 
 class BulkPaymentOperation(BaseModel):
     """Bulk payment operation request."""
-    payment_ids: List[str] = Field(..., min_length=1, max_length=50)
+    payment_ids: List[str] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
     operation: str = Field(..., description="process, refund, cancel, mark_complete")
     params: Optional[Dict[str, Any]] = None
 
@@ -63,61 +68,26 @@ class BulkExportRequest(BaseModel):
     format: str = Field(default="csv", description="csv, json, xlsx")
 
 
-# ============== In-Memory State ==============
-
-# Track bulk operations progress
-_bulk_operations: Dict[str, Dict] = {}
-
-
-def _get_operation_state(operation_id: str) -> Optional[Dict]:
-    """Get bulk operation state."""
-    return _bulk_operations.get(operation_id)
-
-
-def _update_operation_state(operation_id: str, updates: Dict):
-    """Update bulk operation state."""
-    if operation_id in _bulk_operations:
-        _bulk_operations[operation_id].update(updates)
-
-
 # ============== Helper Functions ==============
 
-async def process_bulk_operation(
-    operation_id: str,
-    items: List[str],
+def queue_bulk_operation(
+    background_tasks: BackgroundTasks,
+    op_type: str,
     operation: str,
-    processor: callable
-):
-    """Process items in bulk with progress tracking."""
-    total = len(items)
-    processed = 0
-    failed = []
-    succeeded = []
-    
-    _bulk_operations[operation_id]["status"] = "processing"
-    
-    for item_id in items:
-        try:
-            result = await processor(item_id, operation)
-            succeeded.append({"id": item_id, "result": result})
-        except Exception as e:
-            failed.append({"id": item_id, "error": str(e)})
-        
-        processed += 1
-        _bulk_operations[operation_id]["progress"] = {
-            "processed": processed,
-            "total": total,
-            "percentage": round((processed / total) * 100, 1)
-        }
-    
-    _bulk_operations[operation_id]["status"] = "completed"
-    _bulk_operations[operation_id]["results"] = {
-        "succeeded": len(succeeded),
-        "failed": len(failed),
-        "succeeded_items": succeeded,
-        "failed_items": failed
-    }
-    _bulk_operations[operation_id]["completed_at"] = datetime.now(timezone.utc).isoformat()
+    items: List[str],
+    params: Optional[Dict[str, Any]],
+    current_user
+) -> Dict[str, Any]:
+    """Persist a queued bulk operation and schedule its chunked execution."""
+    params = params or {}
+    missing = [p for p in BULK_ACTIONS[(op_type, operation)].required_params if p not in params]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Missing params for {operation}: {missing}")
+    
+    executor = get_bulk_executor()
+    record = executor.create(op_type, operation, len(set(items)), str(current_user.get("id")))
+    background_tasks.add_task(executor.run, record["id"], items, params)
+    return record
 
 
 # ============== Bulk Project Operations ==============
@@ -151,30 +121,11 @@ async def bulk_project_operation(
     if request.operation == "delete" and current_user.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Admin access required for bulk delete")
     
-    operation_id = str(uuid.uuid4())
-    
-    _bulk_operations[operation_id] = {
-        "id": operation_id,
-        "type": "project_operation",
-        "operation": request.operation,
-        "item_count": len(request.project_ids),
-        "status": "queued",
-        "progress": {"processed": 0, "total": len(request.project_ids), "percentage": 0},
-        "created_by": str(current_user.get("id")),
-        "created_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    async def process_project(project_id: str, operation: str):
-        # Mock processing - in production would update database
-        return {"project_id": project_id, "operation": operation, "success": True}
-    
-    background_tasks.add_task(
-        process_bulk_operation,
-        operation_id,
-        request.project_ids,
-        request.operation,
-        process_project
+    record = queue_bulk_operation(
+        background_tasks, "project_operation", request.operation,
+        request.project_ids, request.params, current_user
     )
+    operation_id = record["id"]
     
     return {
         "operation_id": operation_id,
@@ -214,29 +165,11 @@ async def bulk_user_operation(
             detail=f"Invalid operation. Must be one of: {valid_operations}"
         )
     
-    operation_id = str(uuid.uuid4())
-    
-    _bulk_operations[operation_id] = {
-        "id": operation_id,
-        "type": "user_operation",
-        "operation": request.operation,
-        "item_count": len(request.user_ids),
-        "status": "queued",
-        "progress": {"processed": 0, "total": len(request.user_ids), "percentage": 0},
-        "created_by": str(current_user.get("id")),
-        "created_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    async def process_user(user_id: str, operation: str):
-        return {"user_id": user_id, "operation": operation, "success": True}
-    
-    background_tasks.add_task(
-        process_bulk_operation,
-        operation_id,
-        request.user_ids,
-        request.operation,
-        process_user
+    record = queue_bulk_operation(
+        background_tasks, "user_operation", request.operation,
+        request.user_ids, request.params, current_user
     )
+    operation_id = record["id"]
     
     return {
         "operation_id": operation_id,
@@ -274,29 +207,11 @@ async def bulk_payment_operation(
             detail=f"Invalid operation. Must be one of: {valid_operations}"
         )
     
-    operation_id = str(uuid.uuid4())
-    
-    _bulk_operations[operation_id] = {
-        "id": operation_id,
-        "type": "payment_operation",
-        "operation": request.operation,
-        "item_count": len(request.payment_ids),
-        "status": "queued",
-        "progress": {"processed": 0, "total": len(request.payment_ids), "percentage": 0},
-        "created_by": str(current_user.get("id")),
-        "created_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    async def process_payment(payment_id: str, operation: str):
-        return {"payment_id": payment_id, "operation": operation, "success": True}
-    
-    background_tasks.add_task(
-        process_bulk_operation,
-        operation_id,
-        request.payment_ids,
-        request.operation,
-        process_payment
+    record = queue_bulk_operation(
+        background_tasks, "payment_operation", request.operation,
+        request.payment_ids, request.params, current_user
     )
+    operation_id = record["id"]
     
     return {
         "operation_id": operation_id,
@@ -416,7 +331,7 @@ async def get_operation_status(
     """
     Get status of a bulk operation.
     """
-    operation = _bulk_operations.get(operation_id)
+    operation = get_bulk_executor().get(operation_id, with_failures=True)
     
     if not operation:
         raise HTTPException(status_code=404, detail="Operation not found")
@@ -442,24 +357,17 @@ async def list_operations(
     user_id = str(current_user.get("id"))
     is_admin = current_user.get("role") == "admin"
     
-    operations = list(_bulk_operations.values())
-    
     # Filter by user unless admin
-    if not is_admin:
-        operations = [op for op in operations if op.get("created_by") == user_id]
-    
-    if status:
-        operations = [op for op in operations if op.get("status") == status]
-    
-    if operation_type:
-        operations = [op for op in operations if op.get("type") == operation_type]
-    
-    # Sort by created_at descending
-    operations = sorted(operations, key=lambda x: x.get("created_at", ""), reverse=True)
+    operations, total = get_bulk_executor().list(
+        created_by=None if is_admin else user_id,
+        status=status,
+        op_type=operation_type,
+        limit=limit
+    )
     
     return {
-        "operations": operations[:limit],
-        "total": len(operations)
+        "operations": operations,
+        "total": total
     }
 
 
@@ -470,18 +378,22 @@ async def cancel_operation(
     db: Session = Depends(get_db)
 ):
     """
-    Cancel a queued bulk operation.
+    Cancel a queued or running bulk operation.
+    
+    A running operation stops before its next chunk; chunks already
+    applied are not rolled back.
     """
-    operation = _bulk_operations.get(operation_id)
+    executor = get_bulk_executor()
+    operation = executor.get(operation_id)
     
     if not operation:
         raise HTTPException(status_code=404, detail="Operation not found")
     
-    if operation.get("status") != "queued":
-        raise HTTPException(status_code=400, detail="Can only cancel queued operations")
+    if operation.get("status") not in ("queued", "processing"):
+        raise HTTPException(status_code=400, detail="Can only cancel queued or running operations")
     
-    operation["status"] = "cancelled"
-    operation["cancelled_at"] = datetime.now(timezone.utc).isoformat()
+    if executor.cancel(operation_id) is None:
+        raise HTTPException(status_code=400, detail="Operation already finished")
     
     return {
         "success": True,
@@ -11,6 +11,7 @@ import logging
 from app.core.security import get_current_active_user
 from app.services import contracts_service
 from app.services.db_utils import paginate_params
+from app.services.realtime_metrics import ACTIVE_CONTRACT_STATUSES, publish as publish_metrics
 from app.models.user import User
 from app.schemas.contract import ContractCreate, ContractRead, ContractUpdate
 from app.api.v1.utils import sanitize_text, SCRIPT_PATTERN, HTML_PATTERN
@@ -232,6 +233,7 @@ def create_direct_contract(
             raise HTTPException(status_code=500, detail="Failed to create contract")
         
         logger.info(f"Direct contract {contract_id} created by client {current_user.id} for freelancer {hire_data.freelancer_id}")
+        publish_metrics("contract_started", freelancer_id=hire_data.freelancer_id, client_id=current_user.id)
             
         return {
             "id": contract_id,
@@ -392,6 +394,7 @@ def create_contract(
             )
         
         logger.info(f"Contract {contract_id} created by client {current_user.id} for project {contract.project_id}")
+        publish_metrics("contract_started", freelancer_id=contract.freelancer_id, client_id=current_user.id)
         
         # Return created contract
         return {
@@ -517,6 +520,10 @@ def update_contract(
     try:
         contracts_service.update_contract_fields(contract_id, set_parts, values)
         logger.info(f"Contract {contract_id} updated by user {current_user.id}")
+        was_active = current_status in ACTIVE_CONTRACT_STATUSES
+        if 'status' in update_data and was_active != (update_data['status'] in ACTIVE_CONTRACT_STATUSES):
+            publish_metrics("contract_ended" if was_active else "contract_started",
+                            freelancer_id=freelancer_id, client_id=client_id, status=update_data['status'])
     except Exception as e:
         logger.error(f"Failed to update contract {contract_id}: {e}")
         raise HTTPException(
@@ -571,6 +578,9 @@ def delete_contract(
     try:
         contracts_service.cancel_contract(contract_id, datetime.now(timezone.utc).isoformat())
         logger.info(f"Contract {contract_id} cancelled by client {current_user.id}")
+        if current_status in ACTIVE_CONTRACT_STATUSES:
+            publish_metrics("contract_ended", freelancer_id=contract_data["freelancer_id"], client_id=client_id,
+                            status="cancelled")
     except Exception as e:
         logger.error(f"Failed to cancel contract {contract_id}: {e}")
         raise HTTPException(
@@ -10,6 +10,7 @@ from app.schemas.escrow import (
 )
 from app.services import escrow_service
 from app.services.db_utils import get_user_role
+from app.services.ledger import InsufficientFunds
 
 router = APIRouter(prefix="/escrow", tags=["escrow"])
 
@@ -32,9 +33,12 @@ async def create_escrow(
         raise HTTPException(status_code=400, detail=f"Insufficient balance. Available: ${balance:.2f}")
 
     expires_at = escrow.expires_at.isoformat() if escrow.expires_at else None
-    result = escrow_service.create_escrow(
-        escrow.contract_id, current_user.id, escrow.amount, expires_at, escrow.notes
-    )
+    try:
+        result = escrow_service.create_escrow(
+            escrow.contract_id, current_user.id, escrow.amount, expires_at, escrow.notes
+        )
+    except InsufficientFunds:
+        raise HTTPException(status_code=400, detail="Insufficient balance")
     if not result:
         raise HTTPException(status_code=500, detail="Failed to retrieve created escrow")
     return result
@@ -99,10 +103,10 @@ async def release_escrow(
     if freelancer_id is None:
         raise HTTPException(status_code=404, detail="Contract not found")
 
-    escrow_service.release_escrow_funds(
-        escrow_id, release_data.amount, freelancer_id,
-        escrow["released_amount"], escrow["amount"]
-    )
+    try:
+        escrow_service.release_escrow_funds(escrow_id, release_data.amount, freelancer_id)
+    except InsufficientFunds:
+        raise HTTPException(status_code=409, detail="Escrow balance changed concurrently; please retry")
     return await get_escrow(escrow_id, current_user)
 
 
@@ -128,9 +132,10 @@ async def refund_escrow(
     if refund_data.amount > available:
         raise HTTPException(status_code=400, detail=f"Insufficient escrow balance for refund. Available: ${available:.2f}")
 
-    escrow_service.refund_escrow_funds(
-        escrow_id, refund_data.amount, escrow["client_id"], escrow["released_amount"]
-    )
+    try:
+        escrow_service.refund_escrow_funds(escrow_id, refund_data.amount, escrow["client_id"])
+    except InsufficientFunds:
+        raise HTTPException(status_code=409, detail="Escrow balance changed concurrently; please retry")
     return await get_escrow(escrow_id, current_user)
 
 
@@ -16,12 +16,13 @@ from datetime import datetime, timezone
 from fastapi import APIRouter, Query, HTTPException, status, Depends
 from typing import Optional, List, Dict, Any
 
+from app.db.schema_registry import ensure_schema
 from app.db.turso_http import get_turso_http
 from app.core.security import require_admin, get_current_active_user
 from app.models.user import User
 from app.services.external_project_scraper import (
     scrape_all_sources,
-    save_projects_to_db,
+    forget_project_hashes,
 )
 
 logger = logging.getLogger("megilance.external_projects")
@@ -56,54 +57,9 @@ def _parse_project_tags(project: dict) -> dict:
 # DATABASE INITIALIZATION
 # ============================================================================
 
-_table_created = False
-
 def ensure_external_projects_table(turso):
-    """Create external_projects table if it doesn't exist (runs once per process)"""
-    global _table_created
-    if _table_created:
-        return
-
-    turso.execute_many([
-        {"q": """CREATE TABLE IF NOT EXISTS external_projects (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            source TEXT NOT NULL,
-            source_id TEXT UNIQUE NOT NULL,
-            source_url TEXT NOT NULL,
-            title TEXT NOT NULL,
-            company TEXT NOT NULL,
-            company_logo TEXT,
-            description TEXT NOT NULL,
-            description_plain TEXT,
-            category TEXT DEFAULT 'Other',
-            tags TEXT DEFAULT '[]',
-            project_type TEXT DEFAULT 'remote',
-            experience_level TEXT DEFAULT 'any',
-            budget_min REAL,
-            budget_max REAL,
-            budget_currency TEXT DEFAULT 'USD',
-            budget_period TEXT DEFAULT 'fixed',
-            location TEXT DEFAULT 'Remote',
-            geo TEXT,
-            apply_url TEXT NOT NULL,
-            trust_score REAL DEFAULT 0.5,
-            is_verified INTEGER DEFAULT 0,
-            is_flagged INTEGER DEFAULT 0,
-            flag_reason TEXT,
-            posted_at TEXT,
-            scraped_at TEXT DEFAULT (datetime('now')),
-            expires_at TEXT,
-            views_count INTEGER DEFAULT 0,
-            clicks_count INTEGER DEFAULT 0,
-            saves_count INTEGER DEFAULT 0
-        )""", "params": []},
-        {"q": "CREATE INDEX IF NOT EXISTS idx_ext_projects_category ON external_projects(category)", "params": []},
-        {"q": "CREATE INDEX IF NOT EXISTS idx_ext_projects_source ON external_projects(source)", "params": []},
-        {"q": "CREATE INDEX IF NOT EXISTS idx_ext_projects_posted ON external_projects(posted_at DESC)", "params": []},
-        {"q": "CREATE INDEX IF NOT EXISTS idx_ext_projects_trust ON external_projects(trust_score DESC)", "params": []},
-        {"q": "CREATE INDEX IF NOT EXISTS idx_ext_projects_flagged ON external_projects(is_flagged)", "params": []},
-    ])
-    _table_created = True
+    """Create external_projects table if this process has not yet (bootstrapped at startup)"""
+    ensure_schema("external_projects", backend=turso)
 
 
 # ============================================================================
@@ -346,24 +302,21 @@ async def trigger_scrape(current_user: User = Depends(require_admin)):
         logger.error(f"Database error: {e}")
         raise HTTPException(status_code=503, detail="Database unavailable")
 
-    # Run scrapers
+    # Run the scrape pipeline (fetch, score and save only new/changed listings)
     started_at = datetime.now(timezone.utc)
-    results = scrape_all_sources()
-
-    # Save to database
-    all_projects = results["all_projects"]
-    db_result = save_projects_to_db(turso, all_projects)
-
+    stats = await scrape_all_sources(turso)
     completed_at = datetime.now(timezone.utc)
 
     return {
         "status": "completed",
-        "projects_scraped": results["stats"]["total_scraped"],
-        "projects_added": db_result["inserted"],
-        "projects_updated": db_result["updated"],
-        "projects_flagged": results["stats"]["flagged"],
-        "sources_scraped": results["stats"]["sources"],
-        "errors": results["stats"]["errors"],
+        "projects_scraped": stats["total_scraped"],
+        "projects_added": stats["inserted"],
+        "projects_updated": stats["updated"],
+        "projects_unchanged": stats["unchanged"],
+        "projects_flagged": stats["flagged"],
+        "sources_scraped": stats["sources"],
+        "sources_not_modified": stats["not_modified"],
+        "errors": stats["errors"],
         "started_at": started_at.isoformat(),
         "completed_at": completed_at.isoformat(),
         "duration_seconds": (completed_at - started_at).total_seconds(),
@@ -407,11 +360,14 @@ async def cleanup_old_projects(
 
     if days == 0:
         turso.execute("DELETE FROM external_projects")
+        forget_project_hashes(turso)
         return {"message": "Cleared all external projects"}
 
     turso.execute(
         "DELETE FROM external_projects WHERE scraped_at < datetime('now', '-' || CAST(? AS TEXT) || ' days')",
         [days]
     )
+    # Deleted listings must be re-inserted if they show up in a feed again
+    forget_project_hashes(turso)
 
     return {"message": f"Cleaned up projects older than {days} days"}
@@ -6,12 +6,14 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import Optional, List
 from datetime import datetime, timedelta, timezone
 import json
+import logging
 import uuid
 
 from app.db.turso_http import get_turso_http
 from app.core.security import get_current_active_user
 from app.models.user import User
 from app.services.db_utils import sanitize_text, paginate_params
+from app.services.seller_stats_engine import get_seller_stats_engine
 from app.schemas.gig import (
     GigCreate, GigUpdate, GigListResponse, GigDetailResponse, GigSellerInfo,
     GigPackageResponse, GigSearchParams, GigSearchResponse,
@@ -22,6 +24,8 @@ from app.schemas.gig import (
     GigFAQResponse, GigExtraResponse
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -29,6 +33,14 @@ router = APIRouter()
 # HELPER FUNCTIONS
 # =====================
 
+def _record_seller_event(event: str, seller_id: int, *args) -> None:
+    """Apply an order event to the seller's stats; drift is repaired by the reconcile job."""
+    try:
+        getattr(get_seller_stats_engine(), event)(seller_id, *args)
+    except Exception as e:
+        logger.warning(f"seller_stats.{event}_failed seller_id={seller_id}: {e}")
+
+
 def _row_to_gig(row: list, columns: list) -> dict:
     """Convert database row to gig dict"""
     result = {}
@@ -541,6 +553,7 @@ def create_order(
             "UPDATE gigs SET orders_in_progress = orders_in_progress + 1 WHERE id = ?",
             [gig_id]
         )
+        _record_seller_event("order_placed", seller_id)
         
         return {
             "id": order_id,
@@ -732,14 +745,14 @@ def accept_delivery(
     
     # Verify order and ownership
     result = turso.execute(
-        "SELECT buyer_id, seller_id, gig_id, status FROM gig_orders WHERE id = ?",
+        "SELECT buyer_id, seller_id, gig_id, status, total_price, deadline FROM gig_orders WHERE id = ?",
         [order_id]
     )
     
     if not result.get("rows"):
         raise HTTPException(status_code=404, detail="Order not found")
     
-    buyer_id, seller_id, gig_id, order_status = result["rows"][0]
+    buyer_id, seller_id, gig_id, order_status, total_price, deadline = result["rows"][0]
     
     if buyer_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
@@ -761,21 +774,7 @@ def accept_delivery(
         WHERE id = ?
     """, [gig_id])
     
-    # Update/create seller stats
-    existing = turso.execute("SELECT id FROM seller_stats WHERE user_id = ?", [seller_id])
-    if existing.get("rows"):
-        turso.execute("""
-            UPDATE seller_stats SET
-                total_orders = total_orders + 1,
-                completed_orders = completed_orders + 1,
-                updated_at = datetime('now')
-            WHERE user_id = ?
-        """, [seller_id])
-    else:
-        turso.execute("""
-            INSERT INTO seller_stats (user_id, total_orders, completed_orders, created_at, updated_at)
-            VALUES (?, 1, 1, datetime('now'), datetime('now'))
-        """, [seller_id])
+    _record_seller_event("order_completed", seller_id, buyer_id, total_price, deadline)
     
     return {"message": "Order completed successfully"}
 
@@ -927,23 +926,7 @@ def create_review(
         WHERE id = ?
     """, [avg_rating, gig_id])
     
-    # Update seller stats
-    seller_avg = turso.execute(
-        "SELECT AVG(rating_overall) FROM gig_reviews WHERE seller_id = ?",
-        [seller_id]
-    )
-    seller_avg_rating = seller_avg["rows"][0][0] if seller_avg.get("rows") else 0
-    
-    existing_stats = turso.execute("SELECT id FROM seller_stats WHERE user_id = ?", [seller_id])
-    if existing_stats.get("rows"):
-        turso.execute("""
-            UPDATE seller_stats SET
-                total_reviews = total_reviews + 1,
-                average_rating = ?,
-                five_star_reviews = five_star_reviews + CASE WHEN ? >= 4.5 THEN 1 ELSE 0 END,
-                updated_at = datetime('now')
-            WHERE user_id = ?
-        """, [seller_avg_rating, rating_overall, seller_id])
+    _record_seller_event("review_added", seller_id, rating_overall)
     
     # Get review ID
     result = turso.execute(
@@ -48,6 +48,15 @@ class IncomeCalculateRequest(BaseModel):
     sick_days: int = Field(default=5, ge=0, le=365)
 
 
+class IncomeSweepRequest(IncomeCalculateRequest):
+    """Base scenario plus the rates and weekly hours to sweep and an optional projection."""
+    rates: List[float] = Field(..., min_length=1, max_length=50)
+    hours_options: List[float] = Field(default_factory=lambda: [40], min_length=1, max_length=50)
+    projection_years: int = Field(default=0, ge=0, le=10)
+    income_growth_percent: float = Field(default=0, ge=-50, le=100)
+    expense_growth_percent: float = Field(default=0, ge=-50, le=100)
+
+
 # ============================================================================
 # Endpoints
 # ============================================================================
@@ -101,3 +110,33 @@ async def calculate_income(request: IncomeCalculateRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred calculating your income. Please try again."
         )
+
+
+@router.post("/sweep")
+async def calculate_income_sweep(request: IncomeSweepRequest):
+    """
+    Net income across a rate x weekly-hours grid, with a year-over-year projection.
+
+    **No authentication required** - one call instead of one ``/calculate``
+    per combination. Each grid row has gross, tax, net, effective hourly and
+    marginal rate; ``projection_years`` adds a yearly projection of the base
+    scenario using the given income and expense growth.
+    """
+    inputs = request.model_dump(exclude={
+        "rates", "hours_options", "projection_years", "income_growth_percent", "expense_growth_percent",
+    })
+    try:
+        return income_calculator_engine.calculate_income_sweep(
+            rates=request.rates,
+            hours_options=request.hours_options,
+            projection_years=request.projection_years,
+            income_growth_percent=request.income_growth_percent,
+            expense_growth_percent=request.expense_growth_percent,
+            **inputs,
+        )
+    except Exception as e:
+        logger.error("Income sweep failed", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred calculating your income. Please try again."
+        )
@@ -28,6 +28,7 @@ from app.services.video_interview import (
     get_signaling_server,
     InterviewStatus
 )
+from app.services.webrtc_signaling import SIGNAL_TYPES
 
 logger = logging.getLogger(__name__)
 
@@ -490,10 +491,11 @@ async def websocket_signaling(
     """
     WebSocket endpoint for real-time WebRTC signaling.
     
-    Handles:
+    Plain-websocket alternative to the Socket.IO ``webrtc_*`` events (same
+    relay, deliveries arrive as JSON with an ``event`` field). Handles:
     - offer: SDP offer from caller
     - answer: SDP answer from callee
-    - ice-candidate: ICE candidate exchange
+    - ice-candidate: ICE candidate exchange (coalesced into ice-candidates batches)
     - media-toggle: Video/audio toggle notifications
     """
     await websocket.accept()
@@ -501,50 +503,24 @@ async def websocket_signaling(
     signaling_server = get_signaling_server()
     interview_service = get_interview_service(db)
     
-    socket_id = None
+    import secrets
+    socket_id = f"ws-{secrets.token_urlsafe(16)}"
     user_id = None
     
     try:
-        # Validate token and get user info (simplified)
-        # In production, would properly validate JWT token
-        interview = await interview_service.get_interview(room_id)
-        if not interview:
-            await websocket.close(code=4001, reason="Interview not found")
-            return
-        
-        # Determine user from token
-        if token == interview["tokens"]["client"]:
-            user_id = interview["client_id"]
-        elif token == interview["tokens"]["freelancer"]:
-            user_id = interview["freelancer_id"]
-        else:
-            await websocket.close(code=4002, reason="Invalid token")
+        try:
+            joined = await signaling_server.join(socket_id, room_id, token, send=websocket.send_json)
+        except ValueError as e:
+            await websocket.close(code=4002, reason=str(e))
             return
-        
-        # Register connection
-        import secrets
-        socket_id = secrets.token_urlsafe(16)
-        
-        reg_result = await signaling_server.register_connection(
-            socket_id=socket_id,
-            user_id=user_id,
-            room_id=room_id
-        )
-        
-        # Notify other participants
-        other_sockets = await signaling_server.broadcast_to_room(
-            room_id=room_id,
-            exclude_socket=socket_id,
-            message_type="participant-joined",
-            data={"user_id": user_id, "socket_id": socket_id}
-        )
+        user_id = joined["user_id"]
         
         # Send connection confirmation
         await websocket.send_json({
             "type": "connected",
             "socket_id": socket_id,
             "user_id": user_id,
-            "other_participants": reg_result["other_participants"]
+            "other_participants": joined["other_participants"]
         })
         
         # Message loop
@@ -554,22 +530,20 @@ async def websocket_signaling(
             
             msg_type = message.get("type")
             
-            if msg_type in ["offer", "answer", "ice-candidate"]:
-                # Route signaling message to target
-                to_socket = message.get("to_socket")
-                if to_socket:
-                    route_result = await signaling_server.route_signal(
-                        from_socket=socket_id,
-                        to_socket=to_socket,
-                        signal_type=msg_type,
-                        data=message.get("data", {})
+            if msg_type in SIGNAL_TYPES:
+                # Relay to the target participant (any worker, any transport)
+                try:
+                    seq = signaling_server.signal(
+                        socket_id, room_id, message.get("to_user_id"), msg_type, message.get("data")
                     )
-                    # In production, would send to target WebSocket
-                    # For now, just acknowledge
-                    await websocket.send_json({
-                        "type": "signal-sent",
-                        "to_socket": to_socket
-                    })
+                except ValueError as e:
+                    await websocket.send_json({"type": "error", "detail": str(e)})
+                    continue
+                await websocket.send_json({
+                    "type": "signal-sent",
+                    "to_user_id": message.get("to_user_id"),
+                    "seq": seq
+                })
             
             elif msg_type == "media-toggle":
                 # Notify others of media state change
@@ -595,7 +569,6 @@ async def websocket_signaling(
     except Exception as e:
         logger.error(f"WebSocket error: {str(e)}")
     finally:
-        if socket_id:
-            await signaling_server.unregister_connection(socket_id)
-            if user_id:
-                await interview_service.leave_room(room_id, user_id)
+        await signaling_server.leave(socket_id)
+        if user_id:
+            await interview_service.leave_room(room_id, user_id)
@@ -300,9 +300,16 @@ async def export_invoice_pdf(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
 ):
-    """Export invoice as PDF."""
+    """Export invoice as PDF; returns a render job handle to poll and download."""
     service = get_invoice_tax_service(db)
     result = await service.export_invoice_pdf(invoice_id, current_user["id"])
+    
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Invoice not found"
+        )
+    
     return result
 
 
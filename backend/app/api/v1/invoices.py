@@ -11,6 +11,7 @@ from app.schemas.invoice import (
 )
 from app.services import invoices_service
 from app.services.db_utils import get_user_role
+from app.services.pdf_renderer import get_pdf_renderer, invoice_document
 
 router = APIRouter(prefix="/invoices", tags=["invoices"])
 
@@ -88,6 +89,25 @@ async def get_invoice(
     return invoice
 
 
+@router.post("/{invoice_id}/pdf", status_code=status.HTTP_202_ACCEPTED)
+async def render_invoice_pdf(
+    invoice_id: int,
+    current_user: User = Depends(get_current_user)
+):
+    """Queue a PDF of the invoice; returns a render job handle to poll and download"""
+    invoice = invoices_service.get_invoice_by_id(invoice_id)
+    if not invoice:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+
+    if invoice["from_user_id"] != current_user.id and invoice["to_user_id"] != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    return get_pdf_renderer().submit(
+        invoice_document(invoice), owner_id=current_user.id, kind="invoice",
+        filename=f"{invoice['invoice_number']}.pdf"
+    )
+
+
 @router.patch("/{invoice_id}/pay", response_model=InvoiceRead)
 async def pay_invoice(
     invoice_id: int,
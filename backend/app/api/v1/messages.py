@@ -8,6 +8,8 @@ import logging
 
 from app.core.security import get_current_user_from_token
 from app.services import messages_service
+from app.services.realtime_metrics import publish as publish_metrics
+from app.services.workflow_automation import TriggerType, fire_trigger
 from app.services.db_utils import paginate_params
 from app.api.v1.utils import SCRIPT_PATTERN, moderate_content
 
@@ -322,6 +324,9 @@ def send_message(
             raise HTTPException(status_code=500, detail="Failed to send message")
 
         messages_service.update_conversation_timestamp(conversation_id, now)
+        publish_metrics("message_sent", receiver_id=receiver_id, sender_id=user_id)
+        fire_trigger(TriggerType.MESSAGE_RECEIVED, user_id=receiver_id, sender_id=user_id,
+                     conversation_id=conversation_id, message_id=new_id)
 
         logger.info(f"Message {new_id} sent from user {user_id} to user {receiver_id} in conversation {conversation_id}")
 
@@ -370,14 +375,18 @@ def get_messages(
 
     # Mark messages as read
     unread_ids = []
+    unread_live = 0
     for msg in messages:
         msg["is_read"] = bool(msg.get("is_read"))
         msg["is_deleted"] = bool(msg.get("is_deleted"))
         if not msg.get("is_read") and msg.get("receiver_id") == user_id:
             unread_ids.append(msg["id"])
+            unread_live += not msg["is_deleted"]
 
     if unread_ids:
         messages_service.mark_messages_read(unread_ids, now)
+        if unread_live:
+            publish_metrics("messages_read", receiver_id=user_id, count=unread_live)
 
     # Return in chronological order
     return list(reversed(messages))
@@ -404,6 +413,8 @@ def get_message(
         messages_service.mark_single_message_read(message_id, now)
         message["is_read"] = True
         message["read_at"] = now
+        if not message.get("is_deleted"):
+            publish_metrics("messages_read", receiver_id=user_id, count=1)
 
     return message
 
@@ -444,6 +455,12 @@ def update_message(
     if updates:
         params.append(message_id)
         messages_service.update_message_fields(message_id, ', '.join(updates), params)
+        if (message_update.is_read is not None and message_update.is_read != bool(ownership.get("is_read"))
+                and not ownership.get("is_deleted")):
+            if message_update.is_read:
+                publish_metrics("messages_read", receiver_id=user_id, count=1)
+            else:
+                publish_metrics("message_unread", receiver_id=user_id)
 
     # Fetch updated message
     updated = messages_service.get_message_by_id(message_id)
@@ -466,6 +483,8 @@ def delete_message(
         raise HTTPException(status_code=403, detail="Only sender can delete message")
 
     messages_service.soft_delete_message(message_id)
+    if not ownership.get("is_read") and not ownership.get("is_deleted"):
+        publish_metrics("message_deleted", receiver_id=ownership.get("receiver_id"))
     return {"message": "Message deleted successfully"}
 
 
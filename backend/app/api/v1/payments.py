@@ -15,6 +15,8 @@ from app.models.user import User
 from app.schemas.payment import PaymentCreate, PaymentRead, PaymentUpdate
 from app.db.turso_http import get_turso_http
 from app.services.db_utils import sanitize_text, paginate_params
+from app.services.realtime_metrics import publish as publish_metrics
+from app.services.workflow_automation import TriggerType, fire_trigger
 import logging
 
 logger = logging.getLogger("megilance")
@@ -351,6 +353,7 @@ def create_payment(
         if not rows:
             raise HTTPException(status_code=500, detail="Payment created but not found")
         
+        publish_metrics("payment_created", from_user_id=current_user.id, to_user_id=payment.to_user_id)
         return _row_to_payment(rows[0], columns)
         
     except HTTPException:
@@ -511,7 +514,13 @@ def complete_payment(
         rows = result.get("rows", [])
         if not rows:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Payment not found after completion")
-        return _row_to_payment(rows[0], result.get("columns", []))
+        completed = _row_to_payment(rows[0], result.get("columns", []))
+        publish_metrics("payment_completed", from_user_id=existing[0], to_user_id=existing[1],
+                        amount=completed.get("amount"), at=now)
+        for trigger, party in ((TriggerType.PAYMENT_SENT, existing[0]),
+                               (TriggerType.PAYMENT_RECEIVED, existing[1])):
+            fire_trigger(trigger, user_id=party, payment_id=payment_id, amount=completed.get("amount"))
+        return completed
         
     except HTTPException:
         raise
@@ -0,0 +1,74 @@
+# @AI-HINT: PDF render job endpoints - poll a queued invoice/contract/report/export PDF, download it, and run month-end invoice batches
+"""
+PDF Jobs API - status and downloads for documents queued on the render pool.
+
+Endpoints that produce PDFs return a job handle straight away; clients poll
+``status_url`` and fetch ``download_url`` once the job is ``completed``.
+"""
+
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, RedirectResponse
+
+from app.core.security import get_current_active_user, require_admin
+from app.core.storage import get_storage
+from app.services.db_utils import get_user_role
+from app.services.pdf_renderer import get_pdf_renderer, job_handle, render_month_end_invoices
+
+router = APIRouter()
+
+
+def _owned_job(job_id: str, current_user) -> dict:
+    job = get_pdf_renderer().get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Render job not found")
+    if job["owner_id"] != current_user.id and get_user_role(current_user) != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return job
+
+
+@router.get("/batches/{batch_id}")
+async def get_batch_status(batch_id: str, current_user=Depends(require_admin)):
+    """Progress of a batch render: per-status counts, total pages and failed jobs"""
+    batch = get_pdf_renderer().batch_status(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch
+
+
+@router.post("/batches/month-end-invoices", status_code=status.HTTP_202_ACCEPTED)
+async def queue_month_end_invoices(
+    year: int = Query(..., ge=2000, le=2100),
+    month: int = Query(..., ge=1, le=12),
+    current_user=Depends(require_admin)
+):
+    """Queue PDFs for every invoice created in the given month as one batch"""
+    return render_month_end_invoices(year, month)
+
+
+@router.get("/{job_id}")
+async def get_job_status(job_id: str, current_user=Depends(get_current_active_user)):
+    """Current state of a render job"""
+    return job_handle(_owned_job(job_id, current_user))
+
+
+@router.get("/{job_id}/download")
+async def download_job(job_id: str, current_user=Depends(get_current_active_user)):
+    """The rendered PDF; 409 until the job has completed"""
+    job = _owned_job(job_id, current_user)
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Render job is {job['status']}")
+
+    storage = get_storage()
+    local = storage.local_path(job["path"])
+    if local is None:
+        return RedirectResponse(storage.signed_url(job["path"]))
+    if not os.path.exists(local):
+        raise HTTPException(status_code=404, detail="Rendered file is no longer available")
+    return FileResponse(
+        local,
+        media_type="application/pdf",
+        filename=job["filename"],
+        headers={"Cache-Control": "private, max-age=3600"},
+    )
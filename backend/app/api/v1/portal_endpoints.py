@@ -384,11 +384,8 @@ async def withdraw_funds(
 
     now = datetime.now(timezone.utc).isoformat()
 
-    success = portal_service.create_withdrawal(freelancer.id, body.amount, now)
-    if not success:
-        raise HTTPException(status_code=500, detail="Failed to process withdrawal")
-
-    new_balance = current_balance - body.amount
-    portal_service.update_user_balance(freelancer.id, new_balance)
+    new_balance = portal_service.create_withdrawal(freelancer.id, body.amount, now)
+    if new_balance is None:
+        raise HTTPException(status_code=400, detail="Insufficient funds")
 
     return {"message": "Withdrawal requested successfully", "new_balance": new_balance}
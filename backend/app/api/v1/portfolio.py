@@ -7,14 +7,16 @@ import os
 import re
 from pathlib import Path
 
-from app.core.security import get_current_user_from_token
+from app.core.security import get_current_active_user, get_current_user_from_token
 from app.services import portfolio_service
 from app.services.db_utils import paginate_params
 from app.schemas.portfolio import PortfolioItemCreate, PortfolioItemUpdate
 from app.api.v1.uploads import (
     PORTFOLIO_DIR, ALLOWED_IMAGE_TYPES, MAX_PORTFOLIO_SIZE,
-    sanitize_filename, validate_file_content, validate_path
+    sanitize_filename, validate_file_content, validate_path, check_storage_quota
 )
+from app.services.image_derivatives import get_derivative_pipeline
+from app.services.usage_meter import get_usage_meter
 
 router = APIRouter()
 
@@ -114,7 +116,7 @@ def create_portfolio_item(
 @router.post("/items", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def create_portfolio_item_wizard(
     request: Request,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_active_user)  # the user object carries the plan the quota check needs
 ):
     """Create a new portfolio item from wizard (multipart/form-data)"""
     user_role = current_user.get("role", "")
@@ -156,12 +158,15 @@ async def create_portfolio_item_wizard(
                     )
                 # Validate MIME type from content bytes
                 validate_file_content(content, ALLOWED_IMAGE_TYPES)
+                check_storage_quota(current_user, content)
                 # Sanitize filename and save securely
                 safe_filename = sanitize_filename(value.filename or "portfolio.jpg")
                 file_path = PORTFOLIO_DIR / safe_filename
                 validate_path(safe_filename, PORTFOLIO_DIR)
                 with open(file_path, "wb") as f:
                     f.write(content)
+                get_derivative_pipeline().enqueue(f"portfolio/{safe_filename}", content)
+                get_usage_meter().record(current_user, "storage", len(content))
 
                 index = key.split("_")[1]
                 is_cover = form.get(f"image_{index}_is_cover") == "true"
@@ -170,7 +175,7 @@ async def create_portfolio_item_wizard(
                 if is_cover or not image_url:
                     image_url = saved_url
 
-    user_id = current_user.get("user_id")
+    user_id = current_user.id
     tags_json = json.dumps(tags)
 
     try:
@@ -38,6 +38,27 @@ class PriceEstimateRequest(BaseModel):
     freelancer_country: Optional[str] = Field(None, min_length=2, max_length=2, description="Freelancer ISO country code (e.g. PK, IN, PH)")
 
 
+class PriceGridRequest(BaseModel):
+    """Scenario grid: one project priced for every combination of the listed options."""
+    category: str
+    service_type: str
+    experience_levels: List[str] = Field(default=["junior", "mid", "senior", "expert"], min_length=1, max_length=10)
+    regions: List[str] = Field(default=["global_remote"], min_length=1, max_length=20)
+    urgencies: List[str] = Field(default=["standard"], min_length=1, max_length=10)
+    quality_tiers: List[str] = Field(default=["standard"], min_length=1, max_length=10)
+    client_countries: Optional[List[str]] = Field(None, max_length=250, description="Price per client country instead of per region")
+    freelancer_countries: Optional[List[str]] = Field(None, max_length=250, description="Price per freelancer country instead of per region")
+    client_country: Optional[str] = Field(None, min_length=2, max_length=2)
+    freelancer_country: Optional[str] = Field(None, min_length=2, max_length=2)
+    scope: str = "medium"
+    estimated_hours: Optional[int] = Field(None, ge=1, le=10000)
+    description: Optional[str] = Field(default="", max_length=5000)
+    features: Optional[List[str]] = Field(None, max_length=50)
+    team_size: int = Field(default=1, ge=1, le=50)
+    include_rows: bool = Field(default=True, description="Return the compact row of every scenario")
+    detail: List[int] = Field(default_factory=list, max_length=5, description="Scenario indexes to return full estimates for")
+
+
 # ============================================================================
 # Endpoints
 # ============================================================================
@@ -139,7 +160,7 @@ async def estimate_price(request: PriceEstimateRequest):
         # Augment with platform market data if available
         try:
             platform_data = price_estimator_engine.get_platform_market_data(
-                request.category, request.service_type
+                request.category, request.service_type, request.freelancer_country
             )
             result["platform_data"] = platform_data
         except Exception:
@@ -214,3 +235,62 @@ async def compare_estimates(requests: List[PriceEstimateRequest]):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred comparing estimates. Please try again."
         )
+
+
+@router.post("/estimate-grid")
+async def estimate_price_grid(request: PriceGridRequest):
+    """
+    Price one project across a grid of options in a single call.
+
+    **No authentication required** - every combination of experience level,
+    location (regions, or client/freelancer countries), urgency and quality
+    tier gets its hourly rate and totals. Full estimates (breakdown, factors,
+    timeline...) are only built for the scenario indexes listed in ``detail``.
+    """
+    try:
+        grid = price_estimator_engine.estimate_price_grid(
+            category=request.category,
+            service_type=request.service_type,
+            experience_levels=request.experience_levels,
+            regions=request.regions,
+            urgencies=request.urgencies,
+            quality_tiers=request.quality_tiers,
+            scope=request.scope,
+            estimated_hours=request.estimated_hours,
+            description=request.description or "",
+            features=request.features,
+            team_size=request.team_size,
+            client_country=request.client_country,
+            freelancer_country=request.freelancer_country,
+            client_countries=request.client_countries,
+            freelancer_countries=request.freelancer_countries,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    bad = [i for i in request.detail if not 0 <= i < len(grid)]
+    if bad:
+        raise HTTPException(status_code=400, detail=f"Scenario indexes out of range: {bad}")
+
+    try:
+        return {
+            "axes": {
+                "experience_level": grid.axes["experience_level"],
+                "location": [
+                    {"region": region, "client_country": client, "freelancer_country": freelancer}
+                    for region, client, freelancer in grid.axes["location"]
+                ],
+                "urgency": grid.axes["urgency"],
+                "quality_tier": grid.axes["quality_tier"],
+            },
+            "shape": list(grid.shape),
+            "summary": grid.summary(),
+            "rows": grid.rows() if request.include_rows else None,
+            "details": {str(i): grid.detail(i) for i in request.detail},
+        }
+    except Exception:
+        logger.error("Price grid estimation failed", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred processing the price grid. Please try again."
+        )
@@ -15,6 +15,7 @@ from app.services.db_utils import get_user_role, sanitize_text, paginate_params
 from app.db.turso_http import get_turso_http
 from app.services.profile_validation import is_profile_complete, get_missing_profile_fields
 from app.api.v1.utils import moderate_content
+from app.services.usage_meter import get_usage_meter, quota_exceeded_detail
 import logging
 
 logger = logging.getLogger("megilance")
@@ -301,6 +302,11 @@ def create_project(
         if not ok:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Project {field_name} rejected: {reason}")
     
+    # Plan quota - answered from the in-memory usage meter
+    quota = get_usage_meter().check(current_user, "projects")
+    if not quota["allowed"]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=quota_exceeded_detail(quota))
+    
     try:
         turso = get_turso_http()
         now = datetime.now(timezone.utc).isoformat()
@@ -346,6 +352,7 @@ def create_project(
         if not row:
             raise HTTPException(status_code=500, detail="Project created but not found")
         
+        get_usage_meter().record(current_user, "projects")
         return _row_to_project(row)
         
     except HTTPException:
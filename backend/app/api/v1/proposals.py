@@ -28,6 +28,9 @@ from app.schemas.proposal import ProposalCreate, ProposalRead, ProposalUpdate
 from app.services.profile_validation import is_profile_complete, get_missing_profile_fields
 from app.services import proposals_service
 from app.services.db_utils import sanitize_text, paginate_params
+from app.services.realtime_metrics import publish as publish_metrics
+from app.services.usage_meter import get_usage_meter, quota_exceeded_detail
+from app.services.workflow_automation import TriggerType, fire_trigger
 from app.api.v1.utils import moderate_content
 
 router = APIRouter()
@@ -238,11 +241,11 @@ def create_proposal(
         )
     
     # Check if project exists and is open
-    project_status = proposals_service.get_project_status(proposal.project_id)
-    if project_status is None:
+    project = proposals_service.get_project_status(proposal.project_id)
+    if project is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
-    if project_status != "open":
+    if project["status"] != "open":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Project is not open for proposals"
@@ -255,6 +258,11 @@ def create_proposal(
             detail="You have already submitted a proposal for this project"
         )
     
+    # Plan quota - answered from the in-memory usage meter
+    quota = get_usage_meter().check(current_user, "proposals")
+    if not quota["allowed"]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=quota_exceeded_detail(quota))
+    
     # Auto-calculate bid_amount from hours * rate if not provided
     bid_amount = proposal.bid_amount
     if not bid_amount and proposal.estimated_hours and proposal.hourly_rate:
@@ -272,6 +280,10 @@ def create_proposal(
     
     if not result:
         raise HTTPException(status_code=500, detail="Failed to create proposal")
+    get_usage_meter().record(current_user, "proposals")
+    publish_metrics("proposal_submitted", freelancer_id=current_user.id, client_id=project["client_id"])
+    fire_trigger(TriggerType.PROPOSAL_RECEIVED, user_id=project["client_id"], freelancer_id=current_user.id,
+                 project_id=proposal.project_id, proposal_id=result.get("id"))
     return result
 
 
@@ -329,6 +341,8 @@ def delete_proposal(
         )
     
     proposals_service.delete_proposal(proposal_id)
+    publish_metrics("proposal_closed", freelancer_id=current_user.id,
+                    client_id=proposals_service.get_project_client_id(entry["project_id"]), status="deleted")
     return
 
 
@@ -401,6 +415,9 @@ def reject_proposal(
     result = proposals_service.reject_proposal(proposal_id, reason=sanitize_text(reason) if reason else None)
     if not result:
         raise HTTPException(status_code=500, detail="Failed to retrieve updated proposal")
+    publish_metrics("proposal_closed", freelancer_id=existing["freelancer_id"], client_id=client_id, status="rejected")
+    fire_trigger(TriggerType.PROPOSAL_REJECTED, user_id=existing["freelancer_id"], client_id=client_id,
+                 proposal_id=proposal_id)
     return result
 
 
@@ -461,6 +478,8 @@ def withdraw_proposal(
     result = proposals_service.withdraw_proposal(proposal_id)
     if not result:
         raise HTTPException(status_code=500, detail="Failed to withdraw proposal")
+    publish_metrics("proposal_closed", freelancer_id=current_user.id,
+                    client_id=proposals_service.get_project_client_id(existing["project_id"]), status="withdrawn")
     return result
 
 
@@ -5,6 +5,8 @@ from fastapi import APIRouter, Depends, Query, HTTPException, status
 from typing import List, Optional, Literal
 
 from app.services import search_service
+from app.services.autocomplete_index import autocomplete_service
+from app.services.discovery_index import freelancer_discovery, project_discovery
 
 router = APIRouter(prefix="/search", tags=["search"])
 
@@ -36,6 +38,13 @@ def sanitize_search_query(query: str) -> str:
     return query
 
 
+def plain_search_term(query: str) -> str:
+    """Same cleanup as ``sanitize_search_query`` without LIKE escaping (for in-memory matching)."""
+    if not query:
+        return ""
+    return re.sub(r'[;\'\"\-\-]', '', query.strip()[:MAX_QUERY_LENGTH])
+
+
 def sanitize_skill_list(skills: str) -> List[str]:
     """Sanitize and parse skill list"""
     if not skills:
@@ -88,6 +97,23 @@ async def search_projects(
     Returns {items, total_count, facets:{categories, experience_levels}}.
     """
     validate_search_params(q, limit, offset)
+    autocomplete_service.record_search(plain_search_term(q) if q else None)
+
+    # Open-project browsing without free text is served by the in-memory facet index
+    if not (q and sanitize_search_query(q)) and (project_status or "").lower() == "open":
+        result = project_discovery.search(
+            category=plain_search_term(category) if category else None,
+            skills=sanitize_skill_list(skills) if skills else (),
+            budget_min=budget_min,
+            budget_max=budget_max,
+            budget_type=budget_type,
+            experience_level=experience_level,
+            sort=sort or "newest",
+            limit=limit,
+            offset=offset,
+        )
+        if result is not None:
+            return result
     
     conditions = []
     params = []
@@ -174,6 +200,29 @@ async def search_freelancers(
     params = []
     
     validate_search_params(q, limit, offset)
+    autocomplete_service.record_search(plain_search_term(q) if q else None)
+
+    # Filters the facet index covers are answered in-process (min_rating before paging)
+    if (
+        not (q and sanitize_search_query(q))
+        and not (languages and sanitize_search_query(languages))
+        and not (timezone and sanitize_search_query(timezone))
+        and not preferred_project_size
+    ):
+        result = freelancer_discovery.search(
+            location=plain_search_term(location) if location else None,
+            skills=sanitize_skill_list(skills) if skills else (),
+            min_rate=min_rate,
+            max_rate=max_rate,
+            min_rating=min_rating,
+            experience_level=experience_level,
+            availability_status=availability_status,
+            sort=sort or "newest",
+            limit=limit,
+            offset=offset,
+        )
+        if result is not None:
+            return result
 
     # Exclude private profiles
     conditions.append("(u.profile_visibility IS NULL OR u.profile_visibility != 'private')")
@@ -266,6 +315,7 @@ async def global_search(
     safe_q = sanitize_search_query(q)
     if not safe_q:
         return {"query": q, "results": {"projects": [], "freelancers": [], "skills": [], "tags": []}, "total_results": 0}
+    autocomplete_service.record_search(plain_search_term(q))
     search_term = f"%{safe_q}%"
     
     projects = search_service.global_search_projects(search_term, limit)
@@ -299,6 +349,11 @@ async def search_autocomplete(
     safe_q = sanitize_search_query(q)
     if not safe_q:
         return {"query": q, "suggestions": []}
+
+    suggestions = autocomplete_service.suggest(plain_search_term(q), type, limit)
+    if suggestions is not None:
+        return {"query": q, "suggestions": suggestions}
+
     search_term = f"{safe_q}%"
     suggestions = []
     
@@ -4,10 +4,12 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import Optional, List
-from datetime import datetime, timedelta
 import json
 
 from app.db.turso_http import get_turso_http
+from app.services.seller_stats_engine import (
+    LEVEL_ORDER, LEVEL_REQUIREMENTS, calculate_jss, calculate_level, get_seller_stats_engine
+)
 from app.core.security import get_current_active_user
 from app.models.user import User
 # Schemas imported but using dict responses for flexibility
@@ -24,44 +26,6 @@ router = APIRouter()
 # LEVEL DEFINITIONS
 # =====================
 
-LEVEL_REQUIREMENTS = {
-    "new_seller": {
-        "min_orders": 0,
-        "min_earnings": 0,
-        "min_rating": 0,
-        "min_completion_rate": 0,
-        "min_on_time_rate": 0,
-    },
-    "bronze": {
-        "min_orders": 5,
-        "min_earnings": 100,
-        "min_rating": 4.0,
-        "min_completion_rate": 80,
-        "min_on_time_rate": 80,
-    },
-    "silver": {
-        "min_orders": 20,
-        "min_earnings": 500,
-        "min_rating": 4.5,
-        "min_completion_rate": 90,
-        "min_on_time_rate": 85,
-    },
-    "gold": {
-        "min_orders": 50,
-        "min_earnings": 2000,
-        "min_rating": 4.7,
-        "min_completion_rate": 95,
-        "min_on_time_rate": 90,
-    },
-    "platinum": {
-        "min_orders": 100,
-        "min_earnings": 10000,
-        "min_rating": 4.9,
-        "min_completion_rate": 98,
-        "min_on_time_rate": 95,
-    }
-}
-
 LEVEL_BENEFITS = {
     "new_seller": {
         "commission_rate": 20,
@@ -100,52 +64,6 @@ LEVEL_BENEFITS = {
     }
 }
 
-LEVEL_ORDER = ["new_seller", "bronze", "silver", "gold", "platinum"]
-
-
-def calculate_jss(stats: dict) -> float:
-    """Calculate Job Success Score (0-100)"""
-    # Weighted components:
-    # - Completion rate: 30%
-    # - Ratings: 30%
-    # - On-time delivery: 20%
-    # - Repeat clients: 10%
-    # - Disputes: 10% (penalty)
-    
-    completion_score = (stats.get("completion_rate", 0) / 100) * 30
-    
-    rating = stats.get("average_rating", 0)
-    rating_score = (rating / 5.0) * 30 if rating > 0 else 0
-    
-    on_time_score = (stats.get("on_time_delivery_rate", 0) / 100) * 20
-    
-    repeat_score = (stats.get("repeat_client_rate", 0) / 100) * 10
-    
-    # Dispute penalty
-    total_orders = stats.get("total_orders", 0)
-    disputed = stats.get("disputed_orders", 0)
-    dispute_rate = (disputed / total_orders * 100) if total_orders > 0 else 0
-    dispute_penalty = min(dispute_rate * 2, 10)  # Max 10% penalty
-    
-    jss = completion_score + rating_score + on_time_score + repeat_score - dispute_penalty
-    return max(0, min(100, jss))
-
-
-def calculate_level(stats: dict) -> str:
-    """Determine seller level based on stats"""
-    for level in reversed(LEVEL_ORDER):
-        reqs = LEVEL_REQUIREMENTS[level]
-        if (
-            stats.get("completed_orders", 0) >= reqs["min_orders"] and
-            stats.get("total_earnings", 0) >= reqs["min_earnings"] and
-            stats.get("average_rating", 0) >= reqs["min_rating"] and
-            stats.get("completion_rate", 0) >= reqs["min_completion_rate"] and
-            stats.get("on_time_delivery_rate", 0) >= reqs["min_on_time_rate"]
-        ):
-            return level
-    return "new_seller"
-
-
 # =====================
 # ENDPOINTS
 # =====================
@@ -322,6 +240,7 @@ def get_user_stats(user_id: int):
         "total_reviews": stats.get("total_reviews", 0),
         "on_time_delivery_rate": stats.get("on_time_delivery_rate", 100),
         "response_rate": stats.get("response_rate", 100),
+        "leaderboard_rank": get_seller_stats_engine().rank(user_id),
         "badges": benefits.get("badges", [])
     }
 
@@ -330,120 +249,19 @@ def get_user_stats(user_id: int):
 def recalculate_stats(
     current_user: User = Depends(get_current_active_user)
 ):
-    """Recalculate seller stats from order history."""
+    """Reconcile seller stats with the full order history."""
     if current_user.user_type.lower() != "freelancer":
         raise HTTPException(status_code=403, detail="Only freelancers have seller stats")
     
-    turso = get_turso_http()
-    
-    # Get all orders for this seller
-    orders_result = turso.execute("""
-        SELECT status, completed_at, deadline, total_price, buyer_id
-        FROM gig_orders
-        WHERE seller_id = ?
-    """, [current_user.id])
-    
-    orders = orders_result.get("rows", [])
-    
-    total_orders = len(orders)
-    completed_orders = sum(1 for o in orders if o[0] == "completed")
-    cancelled_orders = sum(1 for o in orders if o[0] == "cancelled")
-    disputed_orders = sum(1 for o in orders if o[0] == "disputed")
-    
-    # Calculate on-time rate
-    on_time = 0
-    for o in orders:
-        if o[0] == "completed" and o[1] and o[2]:
-            completed_at = datetime.fromisoformat(o[1].replace('Z', '+00:00')) if isinstance(o[1], str) else o[1]
-            deadline = datetime.fromisoformat(o[2].replace('Z', '+00:00')) if isinstance(o[2], str) else o[2]
-            if completed_at <= deadline:
-                on_time += 1
-    
-    on_time_rate = (on_time / completed_orders * 100) if completed_orders > 0 else 100
-    completion_rate = (completed_orders / total_orders * 100) if total_orders > 0 else 100
-    
-    # Calculate earnings
-    total_earnings = sum(o[3] or 0 for o in orders if o[0] == "completed")
-    
-    # Calculate unique and repeat clients
-    buyer_ids = [o[4] for o in orders if o[0] == "completed"]
-    unique_clients = len(set(buyer_ids))
-    repeat_clients = len(buyer_ids) - unique_clients
-    repeat_client_rate = (repeat_clients / len(buyer_ids) * 100) if buyer_ids else 0
-    
-    # Get review stats
-    reviews_result = turso.execute("""
-        SELECT COUNT(*), AVG(rating_overall), SUM(CASE WHEN rating_overall >= 4.5 THEN 1 ELSE 0 END)
-        FROM gig_reviews
-        WHERE seller_id = ?
-    """, [current_user.id])
-    
-    review_row = reviews_result["rows"][0] if reviews_result.get("rows") else [0, 0, 0]
-    total_reviews = review_row[0] or 0
-    average_rating = review_row[1] or 0
-    five_star_reviews = review_row[2] or 0
-    
-    # Build stats dict
-    stats = {
-        "total_orders": total_orders,
-        "completed_orders": completed_orders,
-        "cancelled_orders": cancelled_orders,
-        "disputed_orders": disputed_orders,
-        "on_time_delivery_rate": round(on_time_rate, 1),
-        "completion_rate": round(completion_rate, 1),
-        "total_earnings": total_earnings,
-        "unique_clients": unique_clients,
-        "repeat_clients": repeat_clients,
-        "repeat_client_rate": round(repeat_client_rate, 1),
-        "total_reviews": total_reviews,
-        "average_rating": round(average_rating, 2) if average_rating else 0,
-        "five_star_reviews": five_star_reviews
-    }
-    
-    # Calculate JSS and level
-    jss = calculate_jss(stats)
-    level = calculate_level(stats)
-    
-    # Update or insert stats
-    existing = turso.execute("SELECT id FROM seller_stats WHERE user_id = ?", [current_user.id])
-    
-    if existing.get("rows"):
-        turso.execute("""
-            UPDATE seller_stats SET
-                level = ?, total_orders = ?, completed_orders = ?, cancelled_orders = ?,
-                disputed_orders = ?, on_time_delivery_rate = ?, completion_rate = ?,
-                total_earnings = ?, unique_clients = ?, repeat_clients = ?,
-                repeat_client_rate = ?, total_reviews = ?, average_rating = ?,
-                five_star_reviews = ?, jss_score = ?, jss_calculated_at = datetime('now'),
-                updated_at = datetime('now')
-            WHERE user_id = ?
-        """, [
-            level, total_orders, completed_orders, cancelled_orders, disputed_orders,
-            on_time_rate, completion_rate, total_earnings, unique_clients, repeat_clients,
-            repeat_client_rate, total_reviews, average_rating, five_star_reviews, jss,
-            current_user.id
-        ])
-    else:
-        turso.execute("""
-            INSERT INTO seller_stats (
-                user_id, level, total_orders, completed_orders, cancelled_orders,
-                disputed_orders, on_time_delivery_rate, completion_rate,
-                total_earnings, unique_clients, repeat_clients, repeat_client_rate,
-                total_reviews, average_rating, five_star_reviews, jss_score,
-                jss_calculated_at, created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'), datetime('now'), datetime('now'))
-        """, [
-            current_user.id, level, total_orders, completed_orders, cancelled_orders,
-            disputed_orders, on_time_rate, completion_rate, total_earnings, unique_clients,
-            repeat_clients, repeat_client_rate, total_reviews, average_rating,
-            five_star_reviews, jss
-        ])
+    # Stats are maintained on order events; this rebuilds them from scratch
+    report = get_seller_stats_engine().reconcile(seller_id=current_user.id)
+    stats = report["stats"]
     
     return {
         "message": "Stats recalculated successfully",
-        "level": level,
-        "jss_score": round(jss, 1),
-        "stats": stats
+        "level": stats["level"],
+        "jss_score": round(stats["jss_score"], 1),
+        "stats": {k: v for k, v in stats.items() if k not in ("level", "jss_score")}
     }
 
 
@@ -466,38 +284,31 @@ def get_leaderboard(
     level: Optional[str] = None
 ):
     """Get top sellers leaderboard."""
-    turso = get_turso_http()
-    
-    sql = """
-    SELECT s.user_id, s.level, s.jss_score, s.completed_orders, s.average_rating,
-           s.total_earnings, u.name, u.profile_image_url
-    FROM seller_stats s
-    LEFT JOIN users u ON s.user_id = u.id
-    WHERE s.completed_orders > 0
-    """
-    params = []
-    
-    if level:
-        sql += " AND s.level = ?"
-        params.append(level)
-    
-    sql += " ORDER BY s.jss_score DESC, s.completed_orders DESC LIMIT ?"
-    params.append(limit)
-    
-    result = turso.execute(sql, params)
+    top = get_seller_stats_engine().leaderboard(limit, level)
+    
+    users = {}
+    if top:
+        turso = get_turso_http()
+        placeholders = ",".join("?" for _ in top)
+        result = turso.execute(
+            f"SELECT id, name, profile_image_url FROM users WHERE id IN ({placeholders})",
+            [entry["user_id"] for entry in top]
+        )
+        users = {row[0]: row for row in result.get("rows", [])}
     
     sellers = []
-    for i, row in enumerate(result.get("rows", []), 1):
+    for i, entry in enumerate(top, 1):
+        user = users.get(entry["user_id"])
         sellers.append({
             "rank": i,
-            "user_id": row[0],
-            "level": row[1],
-            "jss_score": row[2],
-            "completed_orders": row[3],
-            "average_rating": row[4],
-            "full_name": row[6],
-            "avatar_url": row[7],
-            "badges": LEVEL_BENEFITS.get(row[1], {}).get("badges", [])
+            "user_id": entry["user_id"],
+            "level": entry["level"],
+            "jss_score": entry["jss_score"],
+            "completed_orders": entry["completed_orders"],
+            "average_rating": entry["average_rating"],
+            "full_name": user[1] if user else None,
+            "avatar_url": user[2] if user else None,
+            "badges": LEVEL_BENEFITS.get(entry["level"], {}).get("badges", [])
         })
     
     return {
@@ -7,6 +7,8 @@ from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status
 from app.core.security import get_current_user
 from app.core.rate_limiter import api_rate_limit
 from app.services.uploads_service import get_user_avatar_url, update_user_avatar, clear_user_avatar
+from app.services.image_derivatives import get_derivative_pipeline
+from app.services.usage_meter import get_usage_meter, quota_exceeded_detail
 import os
 import re
 import uuid
@@ -22,9 +24,10 @@ UPLOAD_DIR = Path("uploads").resolve()  # Use absolute path
 AVATAR_DIR = UPLOAD_DIR / "avatars"
 PORTFOLIO_DIR = UPLOAD_DIR / "portfolio"
 DOCUMENT_DIR = UPLOAD_DIR / "documents"
+GIG_DIR = UPLOAD_DIR / "gigs"
 
 # Create directories if they don't exist
-for directory in [AVATAR_DIR, PORTFOLIO_DIR, DOCUMENT_DIR]:
+for directory in [AVATAR_DIR, PORTFOLIO_DIR, DOCUMENT_DIR, GIG_DIR]:
     try:
         directory.mkdir(parents=True, exist_ok=True)
     except (FileExistsError, OSError):
@@ -174,6 +177,13 @@ def validate_file(file: UploadFile, allowed_types: set, max_size: int) -> bytes:
     return file_content
 
 
+def check_storage_quota(current_user, file_content: bytes) -> None:
+    """Refuse an upload that would take the user past their plan's storage quota."""
+    quota = get_usage_meter().check(current_user, "storage", len(file_content))
+    if not quota["allowed"]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=quota_exceeded_detail(quota))
+
+
 def save_uploaded_file(file_content: bytes, original_filename: str, directory: Path) -> str:
     """Save uploaded file and return file path"""
     # Sanitize filename
@@ -207,6 +217,7 @@ async def upload_avatar(
     """
     # Validate and get file content
     file_content = validate_file(file, ALLOWED_IMAGE_TYPES, MAX_AVATAR_SIZE)
+    check_storage_quota(current_user, file_content)
     
     # Get current avatar
     old_avatar = get_user_avatar_url(current_user['id'])
@@ -216,16 +227,22 @@ async def upload_avatar(
         try:
             old_path = validate_path(old_avatar, UPLOAD_DIR)
             if old_path.exists() and old_path.is_file():
+                get_usage_meter().record(current_user, "storage", -old_path.stat().st_size)
                 old_path.unlink()
+                get_derivative_pipeline().delete(old_avatar)
         except HTTPException:
             pass  # Ignore invalid paths
     
     # Save new avatar
     relative_path = save_uploaded_file(file_content, file.filename or "avatar.jpg", AVATAR_DIR)
+    get_usage_meter().record(current_user, "storage", len(file_content))
     
     # Update user profile
     update_user_avatar(current_user['id'], relative_path)
     
+    # Resized AVIF/WebP variants are built in the background
+    get_derivative_pipeline().enqueue(relative_path, file_content)
+    
     return {
         "url": f"/uploads/{relative_path}",
         "message": "Avatar uploaded successfully"
@@ -248,9 +265,12 @@ async def upload_portfolio_image(
     """
     # Validate and get file content
     file_content = validate_file(file, ALLOWED_IMAGE_TYPES, MAX_PORTFOLIO_SIZE)
+    check_storage_quota(current_user, file_content)
     
     # Save portfolio image
     relative_path = save_uploaded_file(file_content, file.filename or "portfolio.jpg", PORTFOLIO_DIR)
+    get_usage_meter().record(current_user, "storage", len(file_content))
+    get_derivative_pipeline().enqueue(relative_path, file_content)
     
     return {
         "url": f"/uploads/{relative_path}",
@@ -258,6 +278,35 @@ async def upload_portfolio_image(
     }
 
 
+@router.post("/gig", status_code=status.HTTP_201_CREATED)
+@api_rate_limit
+async def upload_gig_image(
+    file: UploadFile = File(...),
+    current_user = Depends(get_current_user)
+):
+    """
+    Upload gig gallery image.
+    
+    - **file**: Image file (JPEG, PNG, WebP, GIF)
+    - **max_size**: 10MB
+    
+    Returns the URL to store in the gig's images.
+    """
+    # Validate and get file content
+    file_content = validate_file(file, ALLOWED_IMAGE_TYPES, MAX_PORTFOLIO_SIZE)
+    check_storage_quota(current_user, file_content)
+    
+    # Save gig image
+    relative_path = save_uploaded_file(file_content, file.filename or "gig.jpg", GIG_DIR)
+    get_usage_meter().record(current_user, "storage", len(file_content))
+    get_derivative_pipeline().enqueue(relative_path, file_content)
+    
+    return {
+        "url": f"/uploads/{relative_path}",
+        "message": "Gig image uploaded successfully"
+    }
+
+
 @router.post("/document", status_code=status.HTTP_201_CREATED)
 @api_rate_limit
 async def upload_document(
@@ -274,12 +323,14 @@ async def upload_document(
     """
     # Validate and get file content
     file_content = validate_file(file, ALLOWED_DOCUMENT_TYPES, MAX_DOCUMENT_SIZE)
+    check_storage_quota(current_user, file_content)
     
     # Sanitize the original filename for display
     safe_display_name = sanitize_filename(file.filename or "document")
     
     # Save document
     relative_path = save_uploaded_file(file_content, file.filename or "document.pdf", DOCUMENT_DIR)
+    get_usage_meter().record(current_user, "storage", len(file_content))
     
     return {
         "url": f"/uploads/{relative_path}",
@@ -319,7 +370,9 @@ async def delete_uploaded_file(
         # Clear the profile image reference
         clear_user_avatar(current_user['id'])
         # Delete file
+        get_usage_meter().record(current_user, "storage", -full_path.stat().st_size)
         full_path.unlink()
+        get_derivative_pipeline().delete(file_path)
         return {"message": "File deleted successfully"}
     
     # Check if file is in user's portfolio (would need portfolio table check)
@@ -139,22 +139,17 @@ async def request_withdrawal(
 
     reference_id = f"WD-{current_user.id}-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}"
 
-    # Atomic deduction: WHERE available >= amount prevents concurrent over-withdrawal
-    if not wallet_service.deduct_for_withdrawal(current_user.id, request.amount):
+    # One ledger posting: available -> pending plus the transaction record; fails on overdraft
+    if not wallet_service.withdraw_to_pending(
+        current_user.id, request.amount, request.currency,
+        description=f"Withdrawal to {request.method}",
+        reference_id=reference_id,
+        metadata=json.dumps({"method": request.method, "destination": request.destination})
+    ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Insufficient available balance (concurrent withdrawal detected)"
         )
-    wallet_service.create_transaction(
-        user_id=current_user.id,
-        tx_type="withdrawal",
-        amount=request.amount,
-        currency=request.currency,
-        tx_status="processing",
-        description=f"Withdrawal to {request.method}",
-        reference_id=reference_id,
-        metadata=json.dumps({"method": request.method, "destination": request.destination})
-    )
 
     estimated_days = {"bank_transfer": 3, "paypal": 1, "crypto": 0, "wise": 1}
     eta = datetime.now(timezone.utc) + timedelta(days=estimated_days.get(request.method, 3))
@@ -13,6 +13,7 @@ from pydantic import BaseModel
 
 from app.db.session import get_db
 from app.core.security import get_current_active_user
+from app.services.db_utils import get_user_role
 from app.services.workflow_automation import (
     get_workflow_automation_service,
     TriggerType,
@@ -46,6 +47,7 @@ class CreateWorkflowRequest(BaseModel):
     trigger: TriggerConfig
     conditions: List[ConditionConfig] = []
     actions: List[ActionConfig]
+    is_global: bool = False  # admins only: run on every user's events
 
 
 class CreateFromTemplateRequest(BaseModel):
@@ -111,6 +113,8 @@ async def create_workflow(
     current_user = Depends(get_current_active_user)
 ):
     """Create a new workflow."""
+    if request.is_global and get_user_role(current_user) != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required for global workflows")
     service = get_workflow_automation_service(db)
     result = await service.create_workflow(
         user_id=current_user["id"],
@@ -118,7 +122,8 @@ async def create_workflow(
         description=request.description,
         trigger=request.trigger.dict(),
         conditions=[c.dict() for c in request.conditions],
-        actions=[a.dict() for a in request.actions]
+        actions=[a.dict() for a in request.actions],
+        is_global=request.is_global
     )
     
     if "error" in result:
@@ -76,6 +76,8 @@ class Settings(BaseSettings):
     SMTP_PORT: int = 587
     SMTP_USER: Optional[str] = None
     SMTP_PASSWORD: Optional[str] = None
+    SMTP_POOL_SIZE: int = 4  # persistent connections shared by all senders
+    SMTP_IDLE_TIMEOUT: int = 60  # seconds before an idle connection is re-opened
     FROM_EMAIL: str = "noreply@megilance.com"
     FROM_NAME: str = "MegiLance"
     FRONTEND_URL: str = "http://localhost:3000"
@@ -113,6 +115,40 @@ class Settings(BaseSettings):
     sentry_dsn: Optional[str] = None
     log_level: str = "INFO"
     
+    # API startup - endpoint modules are mounted on first request to their paths
+    lazy_routers: bool = True
+    warm_routers: list[str] = ["health", "auth", "users", "projects", "proposals", "notifications"]
+
+    # Skill assessment code sandbox - pre-forked workers (0 = one per CPU), recycled after max_runs submissions
+    code_sandbox_enabled: bool = True
+    code_sandbox_workers: int = 0
+    code_sandbox_max_runs: int = 200
+    code_sandbox_timeout_seconds: float = 2.0
+    code_sandbox_memory_mb: int = 256
+    code_sandbox_require_seccomp: bool = True
+
+    # Uploaded images - resized AVIF/WebP variants built in background processes (0 workers = half the CPUs)
+    image_derivative_enabled: bool = True
+    image_derivative_widths: list[int] = [64, 160, 320, 640, 1280]
+    image_derivative_formats: list[str] = ["avif", "webp"]
+    image_derivative_quality: int = 60
+    image_derivative_workers: int = 0
+
+    # PDF rendering - invoices, contracts, reports and exports rendered by pool processes (0 workers = half the CPUs)
+    pdf_render_workers: int = 0
+    pdf_render_batch_chunk: int = 20
+
+    # Subscription usage metering - counters live in memory, deltas are written to usage_counters in batches
+    usage_meter_flush_seconds: float = 5.0
+    usage_meter_refresh_seconds: float = 60.0  # re-read counters this worker only checks
+
+    # Realtime dashboard metrics - counters updated from write events, pushed to subscribed dashboards
+    realtime_metrics_push_seconds: float = 0.25  # changes within this window go out as one push
+    realtime_metrics_refresh_seconds: float = 300.0  # re-seed boards to pick up writes that were not published
+
+    # Advanced analytics - fitted forecasts are reused until a source table is written or they reach this age
+    analytics_model_max_age_seconds: float = 600.0
+
     # Connection Pool
     turso_pool_connections: int = 10
     turso_pool_maxsize: int = 20
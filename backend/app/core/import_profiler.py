@@ -0,0 +1,100 @@
+# @AI-HINT: Startup import-time profiler - meta path hook timing each module's exec (self and cumulative), reports slowest imports
+"""
+Import Profiler - in-process equivalent of ``python -X importtime``.
+
+When ``IMPORT_PROFILE=1`` is set, ``start_from_env()`` (called first thing in
+``main.py``) installs a meta path finder that wraps the loader of every
+module imported afterwards and times its ``exec_module``: cumulative time,
+and self time excluding nested imports. ``report()`` returns the slowest
+modules; the app logs it at startup, and lazily mounted routers keep being
+profiled after that.
+"""
+
+import importlib.abc
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    def __init__(self):
+        self.timings: Dict[str, Tuple[float, float]] = {}
+        self._local = threading.local()
+        self.active = False
+
+    def start(self) -> None:
+        if not self.active:
+            sys.meta_path.insert(0, self)
+            self.active = True
+
+    def stop(self) -> None:
+        if self.active:
+            sys.meta_path.remove(self)
+            self.active = False
+
+    def start_from_env(self, variable: str = "IMPORT_PROFILE") -> bool:
+        if os.environ.get(variable, "").lower() in ("1", "true", "yes"):
+            self.start()
+        return self.active
+
+    def find_spec(self, name, path, target=None):
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+
+        loader = spec.loader
+        # Built-in and frozen importers are classes shared by many modules; leave them alone
+        if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"):
+            return spec
+        try:
+            loader.exec_module = self._timed(name, loader.exec_module)
+        except AttributeError:
+            pass
+        return spec
+
+    def _timed(self, name: str, exec_module):
+        def exec_timed(module):
+            stack = self._local.__dict__.setdefault("stack", [])
+            stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                total = time.perf_counter() - start
+                nested = stack.pop()
+                if stack:
+                    stack[-1] += total
+                self.timings[name] = (total * 1000, (total - nested) * 1000)
+        return exec_timed
+
+    def report(self, limit: int = 15, by: str = "self_ms") -> List[Dict[str, float]]:
+        """Slowest imports as ``{"module", "total_ms", "self_ms"}``, sorted by ``by``."""
+        rows = [
+            {"module": name, "total_ms": round(total, 1), "self_ms": round(own, 1)}
+            for name, (total, own) in list(self.timings.items())
+        ]
+        rows.sort(key=lambda row: row[by], reverse=True)
+        return rows[:limit]
+
+    def total_ms(self, prefix: Optional[str] = None) -> float:
+        """Summed self time of all profiled modules (optionally those under ``prefix``)."""
+        return round(sum(
+            own for name, (_, own) in list(self.timings.items())
+            if prefix is None or name == prefix or name.startswith(prefix + ".")
+        ), 1)
+
+
+import_profiler = ImportProfiler()
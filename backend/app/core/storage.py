@@ -26,6 +26,23 @@ class StorageBackend:
         
     def get_file_url(self, file_path: str) -> str:
         raise NotImplementedError
+    
+    def write_file(self, file_path: str, file_data: bytes, content_type: Optional[str] = None,
+                   public: bool = True) -> str:
+        """Store bytes at an exact path (overwriting), e.g. derived image variants.
+        ``public=False`` files are only reachable through ``signed_url``."""
+        raise NotImplementedError
+    
+    def read_file(self, file_path: str) -> Optional[bytes]:
+        raise NotImplementedError
+    
+    def local_path(self, file_path: str) -> Optional[str]:
+        """Filesystem path of ``file_path`` when the backend is on local disk, else None"""
+        return None
+
+    def signed_url(self, file_path: str, expires: int = 300) -> str:
+        """Short-lived URL for a private file (backends without signing return the plain URL)"""
+        return self.get_file_url(file_path)
 
 class S3Storage(StorageBackend):
     """S3-compatible storage backend (AWS S3, Cloudflare R2, MinIO)"""
@@ -69,6 +86,34 @@ class S3Storage(StorageBackend):
         endpoint = os.getenv("S3_PUBLIC_URL") or os.getenv("S3_ENDPOINT_URL")
         return f"{endpoint}/{self.bucket_name}/{file_path}"
 
+    def write_file(self, file_path: str, file_data: bytes, content_type: Optional[str] = None,
+                   public: bool = True) -> str:
+        extra = {"ContentType": content_type} if content_type else {}
+        if public:
+            extra["ACL"] = 'public-read'
+        try:
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=file_path,
+                Body=file_data,
+                **extra
+            )
+            return file_path
+        except ClientError as e:
+            print(f"S3 Upload Error: {e}")
+            raise
+
+    def read_file(self, file_path: str) -> Optional[bytes]:
+        try:
+            return self.s3_client.get_object(Bucket=self.bucket_name, Key=file_path)["Body"].read()
+        except ClientError:
+            return None
+
+    def signed_url(self, file_path: str, expires: int = 300) -> str:
+        return self.s3_client.generate_presigned_url(
+            "get_object", Params={"Bucket": self.bucket_name, "Key": file_path}, ExpiresIn=expires
+        )
+
 
 class LocalStorage(StorageBackend):
     """Simple local file storage handler"""
@@ -108,6 +153,51 @@ class LocalStorage(StorageBackend):
         if subfolder:
             return f"{subfolder}/{unique_filename}"
         return unique_filename
+    
+    def _path(self, file_path: str) -> Path:
+        base = self.upload_dir.resolve()
+        full_path = (base / file_path).resolve()
+        if base not in full_path.parents:
+            raise ValueError(f"Path outside upload directory: {file_path}")
+        return full_path
+    
+    def write_file(self, file_path: str, file_data: bytes, content_type: Optional[str] = None,
+                   public: bool = True) -> str:
+        """Write to an exact relative path; readers never see a partial file"""
+        full_path = self._path(file_path)
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = full_path.with_name(f".{full_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(file_data)
+        os.replace(tmp_path, full_path)
+        return file_path
+    
+    def local_path(self, file_path: str) -> Optional[str]:
+        return str(self._path(file_path))
+    
+    def read_file(self, file_path: str) -> Optional[bytes]:
+        try:
+            with open(self._path(file_path), "rb") as f:
+                return f.read()
+        except (OSError, ValueError):
+            return None
+    
+    def delete_file(self, file_path: str) -> bool:
+        try:
+            full_path = self._path(file_path)
+        except ValueError:
+            return False
+        if full_path.is_dir():
+            shutil.rmtree(full_path, ignore_errors=True)
+            return True
+        try:
+            full_path.unlink()
+            return True
+        except OSError:
+            return False
+    
+    def get_file_url(self, file_path: str) -> str:
+        return f"/uploads/{file_path}"
 
 # Factory to get storage backend
 def get_storage_backend() -> StorageBackend:
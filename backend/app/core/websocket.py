@@ -2,7 +2,7 @@
 # Handles real-time messaging, notifications, typing indicators, online status, and project updates
 
 import socketio
-from typing import Dict, Set, Optional, List
+from typing import Awaitable, Callable, Dict, Set, Optional, List
 from datetime import datetime, timezone
 import json
 import os
@@ -20,6 +20,7 @@ class WebSocketManager:
         self.sio = socketio.AsyncServer(
             async_mode='asgi',
             cors_allowed_origins=allowed_origins,
+            client_manager=self._client_manager(),
             logger=True,
             engineio_logger=True
         )
@@ -32,8 +33,27 @@ class WebSocketManager:
         self.project_rooms: Dict[int, Set[str]] = {}  # project_id -> set of session_ids
         self.chat_rooms: Dict[str, Set[str]] = {}  # chat_id -> set of session_ids
         
+        # Extra cleanup run when a client disconnects (e.g. WebRTC signaling)
+        self._disconnect_hooks: List[Callable[[str], Awaitable[None]]] = []
+        
         self._register_events()
     
+    @staticmethod
+    def _client_manager() -> Optional[socketio.AsyncManager]:
+        """Share rooms and emits across workers through a message queue (redis://...) when configured"""
+        url = os.environ.get("WEBSOCKET_MESSAGE_QUEUE")
+        if not url:
+            return None
+        try:
+            return socketio.AsyncRedisManager(url)
+        except Exception as e:
+            print(f"WebSocket message queue unavailable, emits stay on this worker: {e}")
+            return None
+    
+    def on_disconnect(self, hook: Callable[[str], Awaitable[None]]):
+        """Register a coroutine called with the session id of every disconnecting client"""
+        self._disconnect_hooks.append(hook)
+    
     def _register_events(self):
         """Register Socket.IO event handlers"""
         
@@ -54,6 +74,8 @@ class WebSocketManager:
             """Handle client disconnection"""
             print(f"Client disconnected: {sid}")
             await self.remove_user_connection(sid)
+            for hook in self._disconnect_hooks:
+                await hook(sid)
         
         @self.sio.event
         async def join_project(sid, data):
@@ -270,8 +292,8 @@ class WebSocketManager:
 websocket_manager = WebSocketManager()
 
 
-# ASGI app for Socket.IO
+# ASGI app for Socket.IO, mounted at /ws (clients connect with path /ws/socket.io)
 socket_app = socketio.ASGIApp(
     websocket_manager.sio,
-    socketio_path='socket.io'
+    socketio_path='ws/socket.io'
 )
@@ -0,0 +1,76 @@
+# @AI-HINT: Per-table write counters fed by TursoHTTP - lets in-memory indexes detect which tables changed
+"""
+Change Feed - cheap "has this table been written since I last looked?".
+
+``TursoHTTP`` reports every write statement here. Each table gets a
+monotonically increasing version (plus counts per statement kind), so
+in-memory consumers such as the discovery index can remember the versions
+they were built from and refresh only when a table they depend on moved.
+
+This only sees writes made through this process; consumers poll the
+database for writes from other instances (see ``discovery_index``).
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, Optional
+
+_WRITE_RE = re.compile(
+    r"^\s*(?:WITH\b.*?\)\s*)?"
+    r"(INSERT|REPLACE|UPDATE|DELETE)\b"
+    r"(?:\s+OR\s+\w+)?"
+    r"(?:\s+INTO|\s+FROM)?\s+[\"`\[]?(\w+)",
+    re.IGNORECASE | re.DOTALL,
+)
+# Writes that can change existing rows (plain INSERTs only add rows)
+_REWRITE_RE = re.compile(r"^\s*(?:UPDATE|REPLACE)\b|\bOR\s+REPLACE\b|\bDO\s+UPDATE\b", re.IGNORECASE)
+
+_lock = threading.Lock()
+_versions: Dict[str, int] = {}
+_deletes: Dict[str, int] = {}
+_updates: Dict[str, int] = {}
+
+
+def parse_write(sql: str) -> Optional[tuple]:
+    """``(kind, table)`` for a write statement, ``None`` for anything else."""
+    match = _WRITE_RE.match(sql)
+    if not match:
+        return None
+    return match.group(1).upper(), match.group(2).lower()
+
+
+def record(sql: str) -> None:
+    """Bump the version of the table ``sql`` writes to (no-op for reads)."""
+    parsed = parse_write(sql)
+    if parsed is None:
+        return
+    kind, table = parsed
+    with _lock:
+        _versions[table] = _versions.get(table, 0) + 1
+        if kind == "DELETE":
+            _deletes[table] = _deletes.get(table, 0) + 1
+        elif _REWRITE_RE.search(sql):
+            _updates[table] = _updates.get(table, 0) + 1
+
+
+def record_many(statements: Iterable[str]) -> None:
+    for sql in statements:
+        record(sql)
+
+
+def version(table: str) -> int:
+    return _versions.get(table, 0)
+
+
+def delete_version(table: str) -> int:
+    return _deletes.get(table, 0)
+
+
+def update_version(table: str) -> int:
+    return _updates.get(table, 0)
+
+
+def snapshot(tables: Iterable[str]) -> Dict[str, tuple]:
+    """``{table: (version, delete_version, update_version)}`` for the given tables (upserts count as updates)."""
+    with _lock:
+        return {t: (_versions.get(t, 0), _deletes.get(t, 0), _updates.get(t, 0)) for t in tables}
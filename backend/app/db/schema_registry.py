@@ -0,0 +1,270 @@
+# @AI-HINT: Schema bootstrap registry - modules declare DDL once; startup applies it in batched execute_many calls and records versions
+"""
+Schema Registry - one-time DDL bootstrap instead of per-request ``CREATE ... IF NOT EXISTS``.
+
+Modules declare their tables, indexes and virtual tables at import time::
+
+    WALLET_DDL = [...]
+    register_schema("wallet", WALLET_DDL)
+
+``bootstrap_schema()`` runs once at startup. It reads the ``schema_versions``
+table (one row per step with a fingerprint of its statements) in the same
+round-trip that creates it, skips every step whose fingerprint is unchanged,
+and packs the remaining steps into as few ``execute_many`` batches as the
+Turso batch limit allows, each step's version row committed together with
+its DDL. A batch that fails is retried step by step, and a failing step
+statement by statement, so one missing base table cannot block the rest;
+a step that only partly applied is not recorded and is retried next start.
+Each batch and step is timed and reported.
+
+Code paths that may run before or without the startup bootstrap (scripts,
+tests, lazy endpoints) call ``ensure_schema(name)``: it applies the step at
+most once per backend per process and is a dictionary lookup afterwards.
+"""
+
+import hashlib
+import importlib
+import logging
+import threading
+import time
+import weakref
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Sequence, Set
+
+from app.db.turso_http import get_turso_http
+
+logger = logging.getLogger(__name__)
+
+# Turso's HTTP batch endpoint accepts 25 statements per request
+MAX_BATCH_STATEMENTS = 24
+
+SCHEMA_VERSIONS_DDL = """CREATE TABLE IF NOT EXISTS schema_versions (
+    name TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    applied_at TEXT NOT NULL
+)"""
+
+_RECORD_VERSION = (
+    "INSERT INTO schema_versions (name, fingerprint, applied_at) VALUES (?, ?, ?) "
+    "ON CONFLICT(name) DO UPDATE SET fingerprint = excluded.fingerprint, applied_at = excluded.applied_at"
+)
+
+# Modules whose import registers schema steps; imported by bootstrap_schema()
+SCHEMA_MODULES = [
+    "app.services.token_blacklist_service",
+    "app.services.wallet_service",
+    "app.services.ledger",
+    "app.services.audit_log_store",
+    "app.services.workflow_engine",
+    "app.services.bulk_executor",
+    "app.services.external_project_scraper",
+    "app.services.blog_service",
+    "app.services.community_service",
+    "app.services.workroom_service",
+    "app.services.matching_engine",
+    "app.services.search_fts",
+    "app.services.seller_stats_engine",
+    "app.services.market_calibration",
+    "app.services.webrtc_signaling",
+    "app.services.pdf_renderer",
+    "app.services.usage_meter",
+]
+
+
+class SchemaStep(NamedTuple):
+    name: str
+    statements: List[str]
+    fingerprint: str
+
+
+_steps: Dict[str, SchemaStep] = {}
+_applied: "weakref.WeakKeyDictionary[Any, Set[str]]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def register_schema(name: str, statements: Sequence[str]) -> SchemaStep:
+    """Declare the DDL of one schema step (idempotent ``IF NOT EXISTS`` statements)."""
+    statements = [s.strip() for s in statements]
+    fingerprint = hashlib.sha256("\n".join(statements).encode()).hexdigest()[:16]
+    step = SchemaStep(name, statements, fingerprint)
+    _steps[name] = step
+    return step
+
+
+def registered_steps() -> List[SchemaStep]:
+    return list(_steps.values())
+
+
+def _applied_names(backend: Any) -> Set[str]:
+    names = _applied.get(backend)
+    if names is None:
+        names = _applied.setdefault(backend, set())
+    return names
+
+
+def _version_statement(step: SchemaStep, now: str) -> Dict[str, Any]:
+    return {"q": _RECORD_VERSION, "params": [step.name, step.fingerprint, now]}
+
+
+def ensure_schema(*names: str, backend: Any = None) -> None:
+    """Apply the named steps on ``backend`` unless this process already did."""
+    backend = backend or get_turso_http()
+    applied = _applied_names(backend)
+    missing = [n for n in names if n not in applied]
+    if not missing:
+        return
+    with _lock:
+        missing = [n for n in missing if n not in applied]
+        if not missing:
+            return
+        statements = [{"q": SCHEMA_VERSIONS_DDL, "params": []}]
+        now = datetime.now(timezone.utc).isoformat()
+        for name in missing:
+            step = _steps[name]
+            statements.extend({"q": ddl, "params": []} for ddl in step.statements)
+            statements.append(_version_statement(step, now))
+        for start in range(0, len(statements), MAX_BATCH_STATEMENTS):
+            backend.execute_many(statements[start:start + MAX_BATCH_STATEMENTS])
+        applied.update(missing)
+
+
+def bootstrap_schema(
+    backend: Any = None,
+    modules: Iterable[str] = SCHEMA_MODULES,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """
+    Apply every registered step whose DDL changed since it was last recorded.
+
+    Returns a report with the per-step outcome and timings (``ms`` of a
+    packed step is the duration of the batch that applied it).
+    """
+    started = time.perf_counter()
+    for module in modules:
+        importlib.import_module(module)
+    backend = backend or get_turso_http()
+
+    with _lock:
+        result = backend.execute_many([
+            {"q": SCHEMA_VERSIONS_DDL, "params": []},
+            {"q": "SELECT name, fingerprint FROM schema_versions", "params": []},
+        ])
+        recorded = {row[0]: row[1] for row in result[1]["rows"]}
+        applied = _applied_names(backend)
+        report: Dict[str, Any] = {"steps": {}, "batches": []}
+
+        pending = []
+        for step in _steps.values():
+            if not force and recorded.get(step.name) == step.fingerprint:
+                applied.add(step.name)
+                report["steps"][step.name] = {"status": "skipped", "ms": 0.0}
+            else:
+                pending.append(step)
+
+        for batch in _pack(pending):
+            if len(batch[0].statements) >= MAX_BATCH_STATEMENTS:
+                report["steps"][batch[0].name] = _apply_step(backend, batch[0], applied)
+                continue
+            batch_start = time.perf_counter()
+            now = datetime.now(timezone.utc).isoformat()
+            statements = []
+            for step in batch:
+                statements.extend({"q": ddl, "params": []} for ddl in step.statements)
+                statements.append(_version_statement(step, now))
+            try:
+                backend.execute_many(statements)
+                ms = (time.perf_counter() - batch_start) * 1000
+                for step in batch:
+                    applied.add(step.name)
+                    report["steps"][step.name] = {"status": "applied", "ms": round(ms, 2)}
+                report["batches"].append({"steps": [s.name for s in batch], "ms": round(ms, 2)})
+            except Exception as e:
+                logger.warning(f"schema.batch_failed steps={[s.name for s in batch]} error={e}")
+                for step in batch:
+                    report["steps"][step.name] = _apply_step(backend, step, applied)
+
+    report["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    counts: Dict[str, int] = {}
+    for outcome in report["steps"].values():
+        counts[outcome["status"]] = counts.get(outcome["status"], 0) + 1
+    report["counts"] = counts
+    for name, outcome in report["steps"].items():
+        if outcome["status"] != "skipped":
+            logger.info(f"schema.step name={name} status={outcome['status']} ms={outcome['ms']}")
+    return report
+
+
+def _pack(steps: List[SchemaStep]) -> List[List[SchemaStep]]:
+    """
+    Group steps into batches of at most MAX_BATCH_STATEMENTS statements (DDL + version row).
+
+    A step too large for one batch gets a batch of its own.
+    """
+    batches: List[List[SchemaStep]] = []
+    current: List[SchemaStep] = []
+    size = 0
+    for step in steps:
+        needed = len(step.statements) + 1
+        if current and size + needed > MAX_BATCH_STATEMENTS:
+            batches.append(current)
+            current, size = [], 0
+        current.append(step)
+        size += needed
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _apply_step(backend: Any, step: SchemaStep, applied: Set[str]) -> Dict[str, Any]:
+    """Apply one step on its own; fall back to statement-by-statement on failure."""
+    start = time.perf_counter()
+    now = datetime.now(timezone.utc).isoformat()
+    statements = [{"q": ddl, "params": []} for ddl in step.statements]
+    if len(statements) < MAX_BATCH_STATEMENTS:
+        try:
+            backend.execute_many(statements + [_version_statement(step, now)])
+            applied.add(step.name)
+            return {"status": "applied", "ms": round((time.perf_counter() - start) * 1000, 2)}
+        except Exception:
+            pass
+
+    errors = []
+    for statement in statements:
+        try:
+            backend.execute_many([statement])
+        except Exception as e:
+            errors.append(str(e)[:200])
+    ms = round((time.perf_counter() - start) * 1000, 2)
+    if not errors:
+        backend.execute_many([_version_statement(step, now)])
+        applied.add(step.name)
+        return {"status": "applied", "ms": ms}
+    status = "failed" if len(errors) == len(statements) else "partial"
+    logger.warning(f"schema.step_{status} name={step.name} errors={len(errors)}/{len(statements)} first={errors[0]}")
+    return {"status": status, "ms": ms, "errors": errors}
+
+
+# Indexes on the core tables created by the SQLAlchemy models / turso_schema.sql
+register_schema("core_indexes", [
+    "CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)",
+    "CREATE INDEX IF NOT EXISTS idx_users_role ON users(role)",
+    "CREATE INDEX IF NOT EXISTS idx_projects_client_id ON projects(client_id)",
+    "CREATE INDEX IF NOT EXISTS idx_projects_status ON projects(status)",
+    "CREATE INDEX IF NOT EXISTS idx_proposals_project_id ON proposals(project_id)",
+    "CREATE INDEX IF NOT EXISTS idx_proposals_freelancer_id ON proposals(freelancer_id)",
+    "CREATE INDEX IF NOT EXISTS idx_contracts_client_id ON contracts(client_id)",
+    "CREATE INDEX IF NOT EXISTS idx_contracts_freelancer_id ON contracts(freelancer_id)",
+    "CREATE INDEX IF NOT EXISTS idx_contracts_status ON contracts(status)",
+    "CREATE INDEX IF NOT EXISTS idx_milestones_contract_id ON milestones(contract_id)",
+    "CREATE INDEX IF NOT EXISTS idx_messages_sender_id ON messages(sender_id)",
+    "CREATE INDEX IF NOT EXISTS idx_messages_receiver_id ON messages(receiver_id)",
+    # MAX(updated_at) probes from the discovery and autocomplete indexes (other instances' writes)
+    "CREATE INDEX IF NOT EXISTS idx_projects_updated_at ON projects(updated_at)",
+    "CREATE INDEX IF NOT EXISTS idx_proposals_updated_at ON proposals(updated_at)",
+    "CREATE INDEX IF NOT EXISTS idx_users_updated_at ON users(updated_at)",
+    "CREATE INDEX IF NOT EXISTS idx_reviews_updated_at ON reviews(updated_at)",
+    "CREATE INDEX IF NOT EXISTS idx_contracts_updated_at ON contracts(updated_at)",
+    "CREATE INDEX IF NOT EXISTS idx_skills_updated_at ON skills(updated_at)",
+    "CREATE INDEX IF NOT EXISTS idx_user_skills_updated_at ON user_skills(updated_at)",
+    "CREATE INDEX IF NOT EXISTS idx_tags_updated_at ON tags(updated_at)",
+])
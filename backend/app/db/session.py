@@ -9,6 +9,7 @@ from sqlalchemy import create_engine, event, Engine, text
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
 from app.core.config import get_settings
+from app.db.turso_http import TursoStatementError
 import logging
 from typing import Optional, Generator
 
@@ -172,6 +173,10 @@ def execute_query(query: str, params: list = None):
         if turso_client:
             result = turso_client.execute(query, params or [])
             return result
+    except TursoStatementError as e:
+        # The query reached Turso and was rejected: an empty result, as this helper always returned
+        logger.warning(f"Turso statement failed: {e}")
+        return {"columns": [], "rows": []}
     except Exception as e:
         logger.warning(f"Turso HTTP query failed: {e}, falling back to engine")
     
@@ -10,10 +10,13 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from typing import Optional, List, Dict, Any
 from collections import OrderedDict
+from collections.abc import Sequence
+import json
 import time
 import threading
 import logging
 from app.core.config import get_settings
+from app.db import change_feed
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +70,10 @@ class _LRUTTLCache:
 _query_cache = _LRUTTLCache()
 
 
+class TursoStatementError(Exception):
+    """A statement was rejected by the database (the HTTP request itself succeeded)."""
+
+
 class TursoHTTP:
     """Thread-safe synchronous HTTP client for Turso remote database.
     
@@ -168,6 +175,7 @@ class TursoHTTP:
         else:
             # Write query — invalidate read cache to avoid stale data
             _query_cache.invalidate_all()
+            change_feed.record(sql)
         
         return result
 
@@ -191,6 +199,8 @@ class TursoHTTP:
         if not data or len(data) == 0:
             return {"columns": [], "rows": []}
         
+        if "error" in data[0]:
+            raise TursoStatementError(f"Turso statement error: {_error_message(data[0]['error'])}")
         result = data[0].get("results", {})
         return {
             "columns": result.get("columns", []),
@@ -211,12 +221,16 @@ class TursoHTTP:
         data = response.json()
         results = []
         for item in data:
+            if "error" in item:
+                # The batch runs as one transaction: a failed statement rolls back all of it
+                raise TursoStatementError(f"Turso statement error: {_error_message(item['error'])}")
             result = item.get("results", {})
             results.append({
                 "columns": result.get("columns", []),
                 "rows": result.get("rows", [])
             })
         _query_cache.invalidate_all()
+        change_feed.record_many(s.get("q", "") for s in statements)
         return results
     
     def fetch_one(self, sql: str, params: Optional[List[Any]] = None) -> Optional[List[Any]]:
@@ -236,45 +250,256 @@ class TursoHTTP:
         return row[0] if row else None
 
 
+def _error_message(error: Any) -> str:
+    return error.get("message", str(error)) if isinstance(error, dict) else str(error)
+
+
 def get_turso_http() -> TursoHTTP:
     """Get Turso HTTP client instance"""
     client = TursoHTTP.get_instance()
     return client
 
 
+# ============ Typed results ============
+
+class Row:
+    """
+    Read-only view over one raw result row.
+
+    Values stay as Turso returned them; access by position (``row[0]``),
+    column name (``row["title"]``) or attribute (``row.title``; columns
+    named like a method need ``row["..."]``). Dates and JSON are only decoded
+    when asked for (``row.date(...)``, ``row.json(...)``).
+    """
+
+    __slots__ = ("_values", "_index")
+
+    def __init__(self, values: List[Any], index: Dict[str, int]):
+        self._values = values
+        self._index = index
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._values[self._index[key]]
+        return self._values[key]
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[self._index[name]]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __repr__(self) -> str:
+        return f"Row({self.as_dict()!r})"
+
+    def get(self, name: str, default: Any = None) -> Any:
+        i = self._index.get(name)
+        if i is None or i >= len(self._values):
+            return default
+        value = self._values[i]
+        return default if value is None else value
+
+    def keys(self) -> List[str]:
+        return list(self._index)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._index, self._values))
+
+    def text(self, name: str) -> Optional[str]:
+        return to_str(self.get(name))
+
+    def integer(self, name: str) -> Optional[int]:
+        return to_int(self.get(name))
+
+    def number(self, name: str) -> Optional[float]:
+        return to_float(self.get(name))
+
+    def date(self, name: str) -> Optional[Any]:
+        return parse_date(self.get(name))
+
+    def json(self, name: str, default: Any = None) -> Any:
+        value = self.get(name)
+        if value is None:
+            return default
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        if not isinstance(value, str):
+            return value
+        try:
+            return json.loads(value)
+        except ValueError:
+            return default
+
+
+class ResultSet:
+    """
+    Columnar query result: ``columns`` and raw ``rows`` exactly as returned.
+
+    Iterating yields ``Row`` views that share one column index, so no
+    per-row dict or per-cell wrapper is built unless a caller asks for it.
+    """
+
+    __slots__ = ("columns", "rows", "_index")
+
+    def __init__(self, columns: List[str], rows: List[List[Any]]):
+        self.columns = columns
+        self.rows = rows
+        self._index = {name: i for i, name in enumerate(columns)}
+
+    @classmethod
+    def from_result(cls, result: Optional[Dict[str, Any]]) -> "ResultSet":
+        if not result:
+            return cls([], [])
+        return cls(result.get("columns", []), result.get("rows", []))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __bool__(self) -> bool:
+        return bool(self.rows)
+
+    def __iter__(self):
+        index = self._index
+        return (Row(values, index) for values in self.rows)
+
+    def __getitem__(self, i: int) -> Row:
+        return Row(self.rows[i], self._index)
+
+    def first(self) -> Optional[Row]:
+        return Row(self.rows[0], self._index) if self.rows else None
+
+    def scalar(self, default: Any = None) -> Any:
+        if not self.rows or not self.rows[0]:
+            return default
+        value = self.rows[0][0]
+        return default if value is None else value
+
+    def column(self, name: str) -> List[Any]:
+        """All raw values of one column."""
+        i = self._index[name]
+        return [values[i] for values in self.rows]
+
+    def column_array(self, name: str, dtype: Any = float):
+        """One column as a NumPy array (NULLs become NaN for float dtypes)."""
+        try:
+            import numpy as np
+        except ImportError:
+            raise RuntimeError("numpy is required for ResultSet.column_array") from None
+        values = self.column(name)
+        if np.dtype(dtype).kind == "f":
+            values = [np.nan if v is None else v for v in values]
+        return np.asarray(values, dtype=dtype)
+
+    def dicts(self) -> List[Dict[str, Any]]:
+        """Rows as plain dicts (what ``parse_rows`` returns)."""
+        columns = self.columns
+        return [dict(zip(columns, values)) for values in self.rows]
+
+
+def query(sql: str, params: Optional[List[Any]] = None) -> ResultSet:
+    """Run a query and return a typed ``ResultSet``. Errors propagate."""
+    return ResultSet.from_result(TursoHTTP.get_instance().execute(sql, params))
+
+
+def cell_value(cell: Any) -> Any:
+    """Raw value of a cell in either the wrapped ``{"type","value"}`` or raw form."""
+    if isinstance(cell, dict):
+        return cell.get("value")
+    return cell
+
+
+# ============ Compatibility with the wrapped-cell format ============
+
+def _wrap_cell(value: Any) -> Dict[str, Any]:
+    if value is None:
+        return {"type": "null", "value": None}
+    return {"type": "text", "value": value}
+
+
+class _CellRow(Sequence):
+    """One row whose cells are wrapped as ``{"type","value"}`` only when read."""
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: List[Any]):
+        self._values = values
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [_wrap_cell(v) for v in self._values[i]]
+        return _wrap_cell(self._values[i])
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __eq__(self, other: Any) -> bool:
+        return list(self) == list(other) if isinstance(other, (list, tuple, Sequence)) else NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class _CellRows(Sequence):
+    __slots__ = ("_rows",)
+
+    def __init__(self, rows: List[List[Any]]):
+        self._rows = rows
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [_CellRow(r) for r in self._rows[i]]
+        return _CellRow(self._rows[i])
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __eq__(self, other: Any) -> bool:
+        return list(self) == list(other) if isinstance(other, (list, tuple, Sequence)) else NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class _CompatResult(dict):
+    """``execute_query``'s legacy dict, backed by a ``ResultSet``."""
+
+    __slots__ = ("result_set",)
+
+
 # ============ Simple helper functions for direct use ============
 
 def execute_query(sql: str, params: List[Any] = None) -> Optional[Dict[str, Any]]:
     """
     Execute a SQL query and return the result.
+
+    Legacy format: ``{"cols": [{"name"}], "rows": [[{"type","value"}]]}``.
+    Cells are wrapped lazily on access; ``parse_rows`` reads the underlying
+    ``ResultSet`` directly. New code should use ``query()``.
     """
     try:
         client = TursoHTTP.get_instance()
-        result = client.execute(sql, params)
-        
-        # Convert to the format expected by the frontend/helper (cols, rows with types)
-        # This is a bit messy because the original execute_query returned a specific format
-        # mimicking Turso's raw response structure for the frontend.
-        
-        columns = result.get("columns", [])
-        rows_raw = result.get("rows", [])
-        
-        cols = [{"name": col} for col in columns]
-        
-        rows = []
-        for row in rows_raw:
-            row_data = []
-            for val in row:
-                if val is None:
-                    row_data.append({"type": "null", "value": None})
-                else:
-                    row_data.append({"type": "text", "value": val})
-            rows.append(row_data)
-            
-        return {
-            "cols": cols,
-            "rows": rows
-        }
+        try:
+            result_set = ResultSet.from_result(client.execute(sql, params))
+        except TursoStatementError as e:
+            # Callers of this helper have always seen a failed statement as an empty result
+            logger.warning(f"[DB] execute_query statement error: {e}")
+            result_set = ResultSet([], [])
+        compat = _CompatResult(
+            cols=[{"name": col} for col in result_set.columns],
+            rows=_CellRows(result_set.rows),
+        )
+        compat.result_set = result_set
+        return compat
 
     except Exception as e:
         print(f"[DB] execute_query error: {e}")
@@ -285,6 +510,8 @@ def parse_rows(result: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Parse Turso result rows into list of dicts"""
     if not result:
         return []
+    if isinstance(result, _CompatResult):
+        return result.result_set.dicts()
     
     cols = result.get("cols", [])
     rows = result.get("rows", [])
@@ -308,8 +535,8 @@ def parse_rows(result: Dict[str, Any]) -> List[Dict[str, Any]]:
 
 def to_str(value: Any) -> Optional[str]:
     """Convert value to string, handling bytes and Turso dict format"""
-    if value is None:
-        return None
+    if value is None or type(value) is str:
+        return value
     # Handle Turso format: {"type": "text", "value": "..."}
     if isinstance(value, dict):
         if value.get("type") == "null":
@@ -1,170 +1,244 @@
-# @AI-HINT: Advanced analytics service with ML predictions and market intelligence
-"""Advanced Analytics Service - ML-powered analytics and business intelligence."""
+# @AI-HINT: Advanced analytics service with ML predictions and market intelligence - forecasts, cohorts, churn and market trends from grouped SQL aggregates, fitted models cached until their tables change
+"""
+Advanced Analytics Service - ML-powered analytics and business intelligence.
 
+Revenue forecasts, cohorts, churn and market trends never load rows into
+Python: each runs one or two grouped queries through Turso and gets back
+one row per month, cohort period, user or skill-week, so memory does not
+grow with payment or project history. Least-squares trends with 95%
+prediction intervals and seasonal decomposition come from
+``forecast_models``.
+
+Fitted models and aggregates are cached per service. An entry is reused
+until a table it was built from is written (``change_feed``) or it is
+``analytics_model_max_age_seconds`` old, which also covers writes made by
+other instances.
+"""
+
+import asyncio
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Callable, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, or_, desc
 from collections import defaultdict
-import math
-# STUB: Trend analysis uses heuristic fallbacks; replace with ML pipeline
+
+from app.core.config import get_settings
+from app.db import change_feed
+from app.db.turso_http import get_turso_http
+from app.services.forecast_models import fit_trend, fit_trends
+# STUB: Churn scoring is heuristic; replace with a trained model
 
 logger = logging.getLogger(__name__)
 
+FORECAST_HISTORY_MONTHS = 36
+SEASONAL_PERIOD = 12  # months; used once two full years of history exist
+COHORT_PERIODS = 6
+MARKET_DAYS = 90
+TREND_WEEKS = 12  # complete weeks the skill demand trend is fitted on
+
+REVENUE_BY_MONTH = """
+    SELECT substr(created_at, 1, 7) AS month, SUM(amount) AS revenue
+    FROM payments
+    WHERE status = 'completed' AND created_at >= ?
+    GROUP BY month ORDER BY month
+"""
+
+# Cohort key and the date its period 0 starts on, per cohort type
+COHORT_KEYS = {
+    "monthly": ("substr(created_at, 1, 7)", "substr(created_at, 1, 7) || '-01'", 30),
+    "weekly": ("strftime('%Y-W%W', date(created_at, '-6 days', 'weekday 1'))",
+               "date(created_at, '-6 days', 'weekday 1')", 7),
+}
+
+CHURN_FEATURES = """
+    SELECT u.id,
+           CAST(julianday('now') - julianday(u.created_at) AS INTEGER) AS account_age_days,
+           CAST(julianday('now') - julianday(u.last_login) AS INTEGER) AS days_since_last_login,
+           (SELECT COUNT(*) FROM projects p WHERE p.client_id = u.id)
+             + (SELECT COUNT(*) FROM proposals pr WHERE pr.freelancer_id = u.id) AS total_activity
+    FROM users u
+"""
+
+# ``projects.skills`` holds a JSON array or comma-separated text; the
+# latter is rewritten as a JSON array so ``json_each`` can split both
+SKILL_WEEKS = """
+    WITH recent AS (
+        SELECT CAST((julianday(?) - julianday(created_at)) / 7 AS INTEGER) AS weeks_ago,
+               CASE WHEN json_valid(skills) AND json_type(skills) = 'array' THEN skills
+                    ELSE '["' || replace(replace(replace(COALESCE(skills, ''), '\\', ''), '"', ''), ',', '","') || '"]'
+               END AS skill_list
+        FROM projects
+        WHERE created_at >= ?{category}
+    )
+    SELECT lower(trim(j.value)) AS skill, weeks_ago, COUNT(*) AS demand
+    FROM recent, json_each(CASE WHEN json_valid(skill_list) THEN skill_list ELSE '[]' END) AS j
+    WHERE trim(j.value) <> ''
+    GROUP BY skill, weeks_ago
+"""
+
+CATEGORY_DEMAND = """
+    SELECT COALESCE(NULLIF(category, ''), 'uncategorized') AS category,
+           COUNT(*) AS project_count,
+           SUM(CASE WHEN budget_min <> 0 AND budget_max <> 0 THEN (budget_min + budget_max) / 2.0 END) AS budget_total,
+           COUNT(CASE WHEN budget_min <> 0 AND budget_max <> 0 THEN 1 END) AS budget_count
+    FROM projects
+    WHERE created_at >= ?{category}
+    GROUP BY 1
+"""
+
+
+def _month_index(month: str) -> int:
+    year, mon = month.split("-")
+    return int(year) * 12 + int(mon) - 1
+
+
+def _month_label(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+class _ModelCache:
+    """Fitted models keyed by request, valid while their source tables are unchanged."""
+
+    def __init__(self, max_entries: int = 256):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "builds": 0}
+
+    def get(self, key: tuple, tables: Tuple[str, ...], build: Callable[[], Any]) -> Any:
+        feed = change_feed.snapshot(tables)
+        max_age = get_settings().analytics_model_max_age_seconds
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == feed and time.monotonic() - entry[1] < max_age:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[2]
+        value = build()  # feed was read first, so a write landing meanwhile still invalidates
+        with self._lock:
+            self._entries[key] = (feed, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.stats["builds"] += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
 
 class AdvancedAnalyticsService:
     """
     Advanced analytics engine for platform intelligence.
-    
+
     Provides ML-powered predictions, cohort analysis, and
     comprehensive business intelligence.
     """
-    
-    def __init__(self, db: Session):
+
+    def __init__(self, db: Optional[Session] = None, backend_factory: Optional[Callable[[], Any]] = None):
         self.db = db
-    
+        self._backend_factory = backend_factory or get_turso_http
+        self.models = _ModelCache()
+
+    def _query(self, sql: str, params: Optional[List[Any]] = None) -> List[List[Any]]:
+        return self._backend_factory().execute(sql, params or []).get("rows", [])
+
     # =========================================================================
     # Revenue Analytics
     # =========================================================================
-    
+
     async def get_revenue_forecast(
         self,
         months_ahead: int = 6,
         include_confidence: bool = True
     ) -> Dict[str, Any]:
         """
-        Generate revenue forecast using Linear Regression on historical data.
+        Forecast monthly revenue with a least-squares trend (plus monthly
+        seasonality once 24 complete months exist) and 95% prediction intervals.
         """
         try:
-            from app.models.payment import Payment
-            
-            # Get historical revenue data (12 months)
-            end_date = datetime.now(timezone.utc)
-            start_date = end_date - timedelta(days=365)
-            
-            payments = self.db.query(Payment).filter(
-                Payment.created_at >= start_date,
-                Payment.status == "completed"
-            ).all()
-            
-            # Aggregate by month
-            monthly_revenue = defaultdict(float)
-            for payment in payments:
-                month_key = payment.created_at.strftime("%Y-%m")
-                monthly_revenue[month_key] += float(payment.amount or 0)
-            
-            # Prepare data for regression
-            # X = month index (0, 1, 2...), y = revenue
-            sorted_months = sorted(monthly_revenue.keys())
-            
-            # Fill gaps with 0
-            X = []
-            y = []
-            historical = []
-            
-            if sorted_months:
-                # Find range
-                first_month_str = sorted_months[0]
-                first_month = datetime.strptime(first_month_str, "%Y-%m")
-                last_month = datetime.strptime(sorted_months[-1], "%Y-%m")
-                
-                current = first_month
-                idx = 0
-                while current <= last_month:
-                    m_key = current.strftime("%Y-%m")
-                    rev = monthly_revenue.get(m_key, 0.0)
-                    X.append(idx)
-                    y.append(rev)
-                    historical.append({"month": m_key, "revenue": rev})
-                    
-                    # Next month
-                    if current.month == 12:
-                        current = current.replace(year=current.year + 1, month=1)
-                    else:
-                        current = current.replace(month=current.month + 1)
-                    idx += 1
-            else:
-                X = [0]
-                y = [0.0]
-                historical = [{"month": end_date.strftime("%Y-%m"), "revenue": 0.0}]
-
-            # Linear Regression
-            n = len(X)
-            slope = 0
-            intercept = 0
-            mean_x = 0
-            denominator = 0
-            
-            if n > 1:
-                mean_x = sum(X) / n
-                mean_y = sum(y) / n
-                numerator = sum((X[i] - mean_x) * (y[i] - mean_y) for i in range(n))
-                denominator = sum((X[i] - mean_x) ** 2 for i in range(n))
-                
-                if denominator != 0:
-                    slope = numerator / denominator
-                intercept = mean_y - (slope * mean_x)
-            elif n == 1:
-                intercept = y[0]
+            now = datetime.now(timezone.utc)
+            model = await asyncio.to_thread(
+                self.models.get, ("revenue", now.strftime("%Y-%m")), ("payments",), lambda: self._revenue_model(now)
+            )
+            fit = model["fit"]
+            current = _month_index(now.strftime("%Y-%m"))
 
-            # Generate Forecast
             forecast = []
-            last_idx = X[-1] if X else 0
-            
             for i in range(1, months_ahead + 1):
-                future_idx = last_idx + i
-                predicted = (slope * future_idx) + intercept
-                predicted = max(0, predicted) # No negative revenue
-                
-                future_date = end_date + timedelta(days=30 * i)
-                month_key = future_date.strftime("%Y-%m")
-                
-                # Confidence interval based on variance
-                confidence_width = 0
-                if include_confidence:
-                    if n > 2 and denominator > 0:
-                        # Standard Error of Estimate
-                        sse = sum((y[i] - ((slope * X[i]) + intercept)) ** 2 for i in range(n))
-                        see = math.sqrt(sse / (n - 2))
-                        
-                        # Prediction Interval
-                        # 1.96 for 95% confidence
-                        confidence_width = 1.96 * see * math.sqrt(1 + (1/n) + ((future_idx - mean_x)**2 / denominator))
-                    else:
-                        confidence_width = predicted * 0.2 # Fallback 20% margin
-
+                t = model["n"] + i  # t = n is the current, still open month
+                predicted, width = fit.predict(t) if fit else (0.0, None)
+                predicted = max(0.0, predicted)  # No negative revenue
+                if width is None:
+                    width = predicted * 0.2  # Too little history for an interval: 20% margin
                 forecast.append({
-                    "month": month_key,
+                    "month": _month_label(current + i),
                     "predicted_revenue": round(predicted, 2),
-                    "confidence_low": round(max(0, predicted - confidence_width), 2) if include_confidence else None,
-                    "confidence_high": round(predicted + confidence_width, 2) if include_confidence else None,
+                    "confidence_low": round(max(0.0, predicted - width), 2) if include_confidence else None,
+                    "confidence_high": round(predicted + width, 2) if include_confidence else None,
                     "confidence_level": 0.95 if include_confidence else None
                 })
-            
-            # Calculate summary metrics
+
             total_forecast = sum(f["predicted_revenue"] for f in forecast)
             avg_monthly = total_forecast / len(forecast) if forecast else 0
-            
+            slope = fit.slope if fit else 0.0
+
             return {
-                "historical": historical[-6:],  # Last 6 months
+                "historical": model["historical"][-6:],  # Last 6 months
                 "forecast": forecast,
                 "summary": {
                     "total_forecasted_revenue": round(total_forecast, 2),
                     "average_monthly": round(avg_monthly, 2),
-                    "growth_rate": round(slope, 2), # Slope represents monthly growth in currency units
+                    "growth_rate": round(slope, 2),  # Slope represents monthly growth in currency units
                     "trend": "growing" if slope > 0 else "declining" if slope < 0 else "stable"
                 },
                 "model_info": {
-                    "type": "linear_regression",
-                    "last_updated": datetime.now(timezone.utc).isoformat()
+                    "type": model["type"],
+                    "observations": model["n"],
+                    "seasonal_factors": model["seasonal_factors"],
+                    "residual_std": round(fit.sigma, 2) if fit and fit.dof else None,
+                    "fitted_at": model["fitted_at"],
+                    "last_updated": now.isoformat()
                 }
             }
-            
+
         except Exception as e:
             logger.error(f"Revenue forecast error: {str(e)}")
             raise
-    
+
+    def _revenue_model(self, now: datetime) -> Dict[str, Any]:
+        """Monthly revenue series from one grouped query, and the trend fitted to its complete months."""
+        current = _month_index(now.strftime("%Y-%m"))
+        since = _month_label(current - FORECAST_HISTORY_MONTHS) + "-01"
+        revenue = {month: float(total or 0) for month, total in self._query(REVENUE_BY_MONTH, [since]) if month}
+
+        # Complete months from the first one with revenue, gaps as 0; the open month is shown but not fitted
+        first = min((_month_index(m) for m in revenue), default=current)
+        months = [_month_label(i) for i in range(first, current)]
+        series = [revenue.get(m, 0.0) for m in months]
+        historical = [{"month": m, "revenue": round(v, 2)} for m, v in zip(months, series)]
+        historical.append({"month": _month_label(current), "revenue": round(revenue.get(_month_label(current), 0.0), 2)})
+
+        fit = fit_trend(series, period=SEASONAL_PERIOD) if series else None
+        seasonal_factors = None
+        if fit and fit.seasonal:
+            seasonal_factors = {
+                months[t][5:]: round(fit.seasonal[t % SEASONAL_PERIOD], 2) for t in range(SEASONAL_PERIOD)
+            }
+        return {
+            "fit": fit,
+            "n": len(series),
+            "historical": historical,
+            "type": "linear_regression_seasonal" if seasonal_factors else "linear_regression",
+            "seasonal_factors": seasonal_factors,
+            "fitted_at": now.isoformat(),
+        }
+
     async def get_revenue_breakdown(
         self,
         start_date: Optional[datetime] = None,
@@ -229,7 +303,7 @@ class AdvancedAnalyticsService:
     # =========================================================================
     # User Analytics
     # =========================================================================
-    
+
     async def get_cohort_analysis(
         self,
         cohort_type: str = "monthly",  # monthly, weekly
@@ -239,69 +313,18 @@ class AdvancedAnalyticsService:
         Perform cohort analysis for user retention and engagement.
         """
         try:
-            from app.models.user import User
-            from app.models.project import Project
-            
-            # Get users grouped by registration month
-            users = self.db.query(User).filter(
-                User.created_at >= datetime.now(timezone.utc) - timedelta(days=180)
-            ).all()
-            
-            # Group users into cohorts
-            cohorts = defaultdict(list)
-            for user in users:
-                if cohort_type == "monthly":
-                    cohort_key = user.created_at.strftime("%Y-%m")
-                else:
-                    # Weekly cohort
-                    week_start = user.created_at - timedelta(days=user.created_at.weekday())
-                    cohort_key = week_start.strftime("%Y-W%W")
-                cohorts[cohort_key].append(user)
-            
-            # Calculate retention for each cohort
-            cohort_data = []
-            
-            for cohort_key, cohort_users in sorted(cohorts.items()):
-                cohort_size = len(cohort_users)
-                user_ids = [u.id for u in cohort_users]
-                
-                # Calculate retention by period
-                periods = []
-                for period in range(6):  # 6 periods
-                    if cohort_type == "monthly":
-                        period_start = datetime.strptime(cohort_key, "%Y-%m") + timedelta(days=30 * period)
-                        period_end = period_start + timedelta(days=30)
-                    else:
-                        period_start = datetime.strptime(cohort_key + "-1", "%Y-W%W-%w") + timedelta(weeks=period)
-                        period_end = period_start + timedelta(weeks=1)
-                    
-                    # Count active users (users with projects or proposals)
-                    active_count = self.db.query(Project).filter(
-                        Project.client_id.in_(user_ids),
-                        Project.created_at >= period_start,
-                        Project.created_at < period_end
-                    ).distinct(Project.client_id).count()
-                    
-                    retention_rate = (active_count / cohort_size * 100) if cohort_size > 0 else 0
-                    
-                    periods.append({
-                        "period": period,
-                        "active_users": active_count,
-                        "retention_rate": round(retention_rate, 1)
-                    })
-                
-                cohort_data.append({
-                    "cohort": cohort_key,
-                    "size": cohort_size,
-                    "periods": periods
-                })
-            
+            today = datetime.now(timezone.utc).date().isoformat()
+            cohort_data = await asyncio.to_thread(
+                self.models.get, ("cohorts", cohort_type, today), ("users", "projects"),
+                lambda: self._cohort_table(cohort_type)
+            )
+
             # Calculate overall retention curve
             retention_curve = []
-            for period in range(6):
+            for period in range(COHORT_PERIODS):
                 period_retentions = [
-                    c["periods"][period]["retention_rate"] 
-                    for c in cohort_data 
+                    c["periods"][period]["retention_rate"]
+                    for c in cohort_data
                     if period < len(c["periods"])
                 ]
                 avg_retention = sum(period_retentions) / len(period_retentions) if period_retentions else 0
@@ -309,7 +332,7 @@ class AdvancedAnalyticsService:
                     "period": period,
                     "average_retention": round(avg_retention, 1)
                 })
-            
+
             return {
                 "cohort_type": cohort_type,
                 "metric": metric,
@@ -317,113 +340,75 @@ class AdvancedAnalyticsService:
                 "retention_curve": retention_curve,
                 "insights": self._generate_cohort_insights(cohort_data, retention_curve)
             }
-            
+
         except Exception as e:
             logger.error(f"Cohort analysis error: {str(e)}")
             raise
-    
+
+    def _cohort_table(self, cohort_type: str) -> List[Dict[str, Any]]:
+        """
+        Cohort sizes and distinct clients posting projects per period, from
+        two grouped queries. Periods are 30 days (weeks for weekly cohorts)
+        counted from the cohort's first day.
+        """
+        key, start, span = COHORT_KEYS["monthly" if cohort_type == "monthly" else "weekly"]
+        since = (datetime.now(timezone.utc) - timedelta(days=180)).isoformat()
+        sizes = self._query(
+            f"SELECT {key} AS cohort, COUNT(*) AS size FROM users WHERE created_at >= ? GROUP BY cohort ORDER BY cohort",
+            [since],
+        )
+        active = self._query(
+            f"""
+            SELECT c.cohort,
+                   CAST((julianday(p.created_at) - julianday(c.start)) / ? AS INTEGER) AS period,
+                   COUNT(DISTINCT p.client_id) AS active_users
+            FROM (SELECT id, {key} AS cohort, {start} AS start FROM users WHERE created_at >= ?) c
+            JOIN projects p ON p.client_id = c.id
+            WHERE julianday(p.created_at) >= julianday(c.start)
+              AND julianday(p.created_at) < julianday(c.start) + ?
+            GROUP BY c.cohort, period
+            """,
+            [span, since, span * COHORT_PERIODS],
+        )
+        counts = {(cohort, period): n for cohort, period, n in active}
+
+        cohort_data = []
+        for cohort, size in sizes:
+            if cohort is None:
+                continue
+            periods = []
+            for period in range(COHORT_PERIODS):
+                active_count = counts.get((cohort, period), 0)
+                periods.append({
+                    "period": period,
+                    "active_users": active_count,
+                    "retention_rate": round(active_count / size * 100, 1) if size else 0
+                })
+            cohort_data.append({"cohort": cohort, "size": size, "periods": periods})
+        return cohort_data
+
     async def get_churn_prediction(
         self,
         user_id: Optional[int] = None
     ) -> Dict[str, Any]:
         """
-        Predict user churn probability using ML model.
+        Predict user churn probability from login recency, activity and account
+        age, with the features computed for all users in one query.
         """
         try:
-            from app.models.user import User
-            from app.models.project import Project
-            from app.models.proposal import Proposal
-            
-            if user_id:
-                users = [self.db.query(User).filter(User.id == user_id).first()]
-                if not users[0]:
-                    raise ValueError("User not found")
-            else:
-                # Get users for batch prediction
-                users = self.db.query(User).filter(
-                    User.is_active == True
-                ).limit(100).all()
-            
-            predictions = []
-            
-            for user in users:
-                if not user:
-                    continue
-                    
-                # Calculate churn features
-                days_since_registration = (datetime.now(timezone.utc) - user.created_at).days if user.created_at else 0
-                days_since_last_login = (datetime.now(timezone.utc) - user.last_login).days if user.last_login else 30
-                
-                # Count user activity
-                project_count = self.db.query(Project).filter(
-                    Project.client_id == user.id
-                ).count()
-                
-                proposal_count = self.db.query(Proposal).filter(
-                    Proposal.freelancer_id == user.id
-                ).count()
-                
-                # Simple churn scoring (in production, use trained ML model)
-                # Higher score = higher churn risk
-                churn_score = 0
-                
-                # Inactivity increases churn
-                if days_since_last_login > 30:
-                    churn_score += 0.3
-                elif days_since_last_login > 14:
-                    churn_score += 0.15
-                
-                # Low activity increases churn
-                total_activity = project_count + proposal_count
-                if total_activity == 0:
-                    churn_score += 0.3
-                elif total_activity < 3:
-                    churn_score += 0.1
-                
-                # New users have higher churn
-                if days_since_registration < 30 and total_activity == 0:
-                    churn_score += 0.2
-                
-                # Normalize to 0-1
-                churn_probability = min(churn_score, 0.95)
-                
-                # Determine risk level
-                if churn_probability > 0.6:
-                    risk_level = "high"
-                    recommendations = [
-                        "Send re-engagement email",
-                        "Offer promotional credit",
-                        "Personal outreach from support"
-                    ]
-                elif churn_probability > 0.3:
-                    risk_level = "medium"
-                    recommendations = [
-                        "Send feature highlights email",
-                        "Suggest relevant projects/freelancers"
-                    ]
-                else:
-                    risk_level = "low"
-                    recommendations = [
-                        "Continue regular engagement"
-                    ]
-                
-                predictions.append({
-                    "user_id": user.id,
-                    "churn_probability": round(churn_probability, 3),
-                    "risk_level": risk_level,
-                    "factors": {
-                        "days_since_last_login": days_since_last_login,
-                        "total_activity": total_activity,
-                        "account_age_days": days_since_registration
-                    },
-                    "recommendations": recommendations
-                })
-            
+            today = datetime.now(timezone.utc).date().isoformat()
+            predictions = await asyncio.to_thread(
+                self.models.get, ("churn", user_id, today), ("users", "projects", "proposals"),
+                lambda: self._churn_predictions(user_id)
+            )
+            if user_id and not predictions:
+                raise ValueError("User not found")
+
             # Aggregate statistics
             high_risk = sum(1 for p in predictions if p["risk_level"] == "high")
             medium_risk = sum(1 for p in predictions if p["risk_level"] == "medium")
             low_risk = sum(1 for p in predictions if p["risk_level"] == "low")
-            
+
             return {
                 "predictions": predictions if user_id else predictions[:10],
                 "summary": {
@@ -437,106 +422,177 @@ class AdvancedAnalyticsService:
                 },
                 "generated_at": datetime.now(timezone.utc).isoformat()
             }
-            
+
         except Exception as e:
             logger.error(f"Churn prediction error: {str(e)}")
             raise
-    
+
+    def _churn_predictions(self, user_id: Optional[int]) -> List[Dict[str, Any]]:
+        if user_id:
+            rows = self._query(CHURN_FEATURES + " WHERE u.id = ?", [user_id])
+        else:
+            # Batch prediction over the first 100 active users
+            rows = self._query(CHURN_FEATURES + " WHERE u.is_active = 1 ORDER BY u.id LIMIT 100")
+
+        predictions = []
+        for uid, account_age, last_login_days, total_activity in rows:
+            days_since_registration = account_age if account_age is not None else 0
+            days_since_last_login = last_login_days if last_login_days is not None else 30
+            total_activity = total_activity or 0
+
+            # Simple churn scoring (in production, use trained ML model)
+            # Higher score = higher churn risk
+            churn_score = 0
+
+            # Inactivity increases churn
+            if days_since_last_login > 30:
+                churn_score += 0.3
+            elif days_since_last_login > 14:
+                churn_score += 0.15
+
+            # Low activity increases churn
+            if total_activity == 0:
+                churn_score += 0.3
+            elif total_activity < 3:
+                churn_score += 0.1
+
+            # New users have higher churn
+            if days_since_registration < 30 and total_activity == 0:
+                churn_score += 0.2
+
+            # Normalize to 0-1
+            churn_probability = min(churn_score, 0.95)
+
+            # Determine risk level
+            if churn_probability > 0.6:
+                risk_level = "high"
+                recommendations = [
+                    "Send re-engagement email",
+                    "Offer promotional credit",
+                    "Personal outreach from support"
+                ]
+            elif churn_probability > 0.3:
+                risk_level = "medium"
+                recommendations = [
+                    "Send feature highlights email",
+                    "Suggest relevant projects/freelancers"
+                ]
+            else:
+                risk_level = "low"
+                recommendations = [
+                    "Continue regular engagement"
+                ]
+
+            predictions.append({
+                "user_id": uid,
+                "churn_probability": round(churn_probability, 3),
+                "risk_level": risk_level,
+                "factors": {
+                    "days_since_last_login": days_since_last_login,
+                    "total_activity": total_activity,
+                    "account_age_days": days_since_registration
+                },
+                "recommendations": recommendations
+            })
+        return predictions
+
     # =========================================================================
     # Market Analytics
     # =========================================================================
-    
+
     async def get_market_trends(
         self,
         category: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Analyze market trends for skills, categories, and pricing.
+
+        A skill is "growing" or "declining" when the 95% confidence interval
+        of its weekly demand slope (last 12 complete weeks) excludes zero;
+        ``change_percent`` is the fitted change over those weeks relative to
+        the skill's average weekly demand.
         """
         try:
-            from app.models.project import Project
-            from app.models.proposal import Proposal
-            
-            # Get projects from last 90 days
-            start_date = datetime.now(timezone.utc) - timedelta(days=90)
-            
-            projects = self.db.query(Project).filter(
-                Project.created_at >= start_date
+            now = datetime.now(timezone.utc)
+            market = await asyncio.to_thread(
+                self.models.get, ("market", category, now.date().isoformat()), ("projects",),
+                lambda: self._market_model(now, category)
             )
-            if category:
-                projects = projects.filter(Project.category == category)
-            projects = projects.all()
-            
-            # Analyze skill demand
-            skill_demand = defaultdict(int)
-            category_demand = defaultdict(int)
-            budget_by_category = defaultdict(list)
-            
-            for project in projects:
-                # Track category
-                category_demand[project.category or "uncategorized"] += 1
-                
-                if project.budget_min and project.budget_max:
-                    avg_budget = (float(project.budget_min) + float(project.budget_max)) / 2
-                    budget_by_category[project.category or "uncategorized"].append(avg_budget)
-                
-                # Track skills
-                if project.skills_required:
-                    skills = project.skills_required.split(",") if isinstance(project.skills_required, str) else project.skills_required
-                    for skill in skills:
-                        skill_demand[skill.strip().lower()] += 1
-            
-            # Calculate trends
-            top_skills = sorted(skill_demand.items(), key=lambda x: x[1], reverse=True)[:15]
-            top_categories = sorted(category_demand.items(), key=lambda x: x[1], reverse=True)[:10]
-            
-            # Average budgets by category
-            avg_budgets = {
-                cat: round(sum(budgets) / len(budgets), 2)
-                for cat, budgets in budget_by_category.items()
-                if budgets
-            }
-            
-            # STUB: Deterministic fallback until historical data pipeline exists
-            trends = []
-            for skill, count in top_skills:
-                trends.append({
-                    "skill": skill,
-                    "demand_count": count,
-                    "trend": "stable",
-                    "change_percent": 0
-                })
-            
+            top_skills = market["top_skills"]
+            top_categories = market["top_categories"]
+
             return {
                 "period": {
-                    "start": start_date.isoformat(),
-                    "end": datetime.now(timezone.utc).isoformat(),
-                    "days": 90
-                },
-                "top_skills": trends,
-                "top_categories": [
-                    {"category": cat, "project_count": count, "avg_budget": avg_budgets.get(cat, 0)}
-                    for cat, count in top_categories
-                ],
-                "market_summary": {
-                    "total_projects": len(projects),
-                    "unique_skills": len(skill_demand),
-                    "avg_budget_overall": round(
-                        sum(sum(b) for b in budget_by_category.values()) / 
-                        sum(len(b) for b in budget_by_category.values()), 2
-                    ) if budget_by_category else 0
+                    "start": market["start"],
+                    "end": now.isoformat(),
+                    "days": MARKET_DAYS
                 },
+                "top_skills": top_skills,
+                "top_categories": top_categories,
+                "market_summary": market["summary"],
                 "insights": [
-                    f"Top skill: {top_skills[0][0] if top_skills else 'N/A'}",
-                    f"Most active category: {top_categories[0][0] if top_categories else 'N/A'}",
-                    f"Average project budget: ${avg_budgets.get(top_categories[0][0], 0) if top_categories else 0}"
+                    f"Top skill: {top_skills[0]['skill'] if top_skills else 'N/A'}",
+                    f"Most active category: {top_categories[0]['category'] if top_categories else 'N/A'}",
+                    f"Average project budget: ${top_categories[0]['avg_budget'] if top_categories else 0}"
                 ]
             }
-            
+
         except Exception as e:
             logger.error(f"Market trends error: {str(e)}")
             raise
-    
+
+    def _market_model(self, now: datetime, category: Optional[str]) -> Dict[str, Any]:
+        """Category demand and budgets, and per-skill weekly demand with fitted trends."""
+        start = (now - timedelta(days=MARKET_DAYS)).isoformat()
+        where, params = ("", [start]) if not category else (" AND category = ?", [start, category])
+        categories = self._query(CATEGORY_DEMAND.format(category=where), params)
+        skill_weeks = self._query(SKILL_WEEKS.format(category=where), [now.isoformat()] + params)
+
+        demand: Dict[str, int] = defaultdict(int)
+        weekly: Dict[str, List[float]] = defaultdict(lambda: [0.0] * TREND_WEEKS)
+        for skill, weeks_ago, count in skill_weeks:
+            demand[skill] += count
+            if weeks_ago is not None and 0 <= weeks_ago < TREND_WEEKS:
+                weekly[skill][TREND_WEEKS - 1 - weeks_ago] += count  # oldest week first
+
+        top = sorted(demand.items(), key=lambda x: x[1], reverse=True)[:15]
+        top_skills = []
+        for (skill, count), fit in zip(top, fit_trends([weekly[s] for s, _ in top])):
+            series = weekly[skill]
+            mean = sum(series) / TREND_WEEKS
+            interval = fit.slope_interval
+            if interval and interval[0] > 0:
+                trend = "growing"
+            elif interval and interval[1] < 0:
+                trend = "declining"
+            else:
+                trend = "stable"
+            change = fit.slope * (TREND_WEEKS - 1) / mean * 100 if mean else 0
+            top_skills.append({
+                "skill": skill,
+                "demand_count": count,
+                "trend": trend,
+                "change_percent": round(change, 1)
+            })
+
+        ranked = sorted(categories, key=lambda row: row[1], reverse=True)[:10]
+        budget_total = sum(row[2] or 0 for row in categories)
+        budget_count = sum(row[3] or 0 for row in categories)
+        return {
+            "start": start,
+            "top_skills": top_skills,
+            "top_categories": [
+                {"category": cat, "project_count": count,
+                 "avg_budget": round(total / n, 2) if n else 0}
+                for cat, count, total, n in ranked
+            ],
+            "summary": {
+                "total_projects": sum(row[1] for row in categories),
+                "unique_skills": len(demand),
+                "avg_budget_overall": round(budget_total / budget_count, 2) if budget_count else 0
+            },
+        }
+
     # =========================================================================
     # Platform Health
     # =========================================================================
@@ -4,13 +4,15 @@
 import logging
 import secrets
 import json
-import re
 from datetime import datetime, timedelta, timezone
 from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy.orm import Session
 from enum import Enum
 from collections import defaultdict
 
+from app.services.content_scanner import ContentScanner, ScannerBuilder
+from app.services.help_search import search_help
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,6 +51,19 @@ class ConversationState(str, Enum):
     CLOSED = "closed"
 
 
+def _build_message_scanner(
+    intent_patterns: Dict["ChatIntent", List[str]],
+    sentiment_keywords: Dict["SentimentLevel", List[str]]
+) -> ContentScanner:
+    """Compile intent patterns and sentiment keywords into one scanner."""
+    builder = ScannerBuilder()
+    for intent, patterns in intent_patterns.items():
+        builder.patterns(f"intent:{intent.value}", patterns, family="intent")
+    for level, keywords in sentiment_keywords.items():
+        builder.terms(f"sentiment:{level.value}", keywords)
+    return builder.build()
+
+
 class AIChatbotService:
     """
     AI-powered chatbot for customer support and FAQ assistance.
@@ -121,6 +136,9 @@ class AIChatbotService:
         ]
     }
     
+    # Intent and sentiment rules compiled once, scanned once per message
+    _MESSAGE_SCANNER = _build_message_scanner(INTENT_PATTERNS, SENTIMENT_KEYWORDS)
+    
     # FAQ Database
     FAQ_DATABASE = {
         "how_to_create_account": {
@@ -327,37 +345,18 @@ class AIChatbotService:
         category: Optional[str] = None,
         limit: int = 5
     ) -> List[Dict[str, Any]]:
-        """Search FAQ database."""
-        query_lower = query.lower()
-        results = []
-        
-        for faq_id, faq in self.FAQ_DATABASE.items():
-            if category and faq["category"] != category:
-                continue
-            
-            # Score based on keyword matches
-            score = 0
-            for keyword in faq["keywords"]:
-                if keyword in query_lower:
-                    score += 2
-            
-            # Also check question text
-            if any(word in faq["question"].lower() for word in query_lower.split()):
-                score += 1
-            
-            if score > 0:
-                results.append({
-                    "id": faq_id,
-                    "question": faq["question"],
-                    "answer": faq["answer"],
-                    "category": faq["category"],
-                    "relevance_score": score
-                })
-        
-        # Sort by relevance
-        results.sort(key=lambda x: x["relevance_score"], reverse=True)
-        
-        return results[:limit]
+        """Search FAQ database (BM25 over the shared help index)."""
+        hits = search_help(query, ("chatbot_faq",), limit=limit, category=category)
+        return [
+            {
+                "id": meta["id"],
+                "question": meta["item"]["question"],
+                "answer": meta["item"]["answer"],
+                "category": meta["category"],
+                "relevance_score": round(score, 3)
+            }
+            for meta, score in hits
+        ]
     
     async def create_support_ticket(
         self,
@@ -456,14 +455,14 @@ class AIChatbotService:
 
     def _classify_intent(self, message: str) -> ChatIntent:
         """Classify the intent of a message."""
-        message_lower = message.lower()
-        
-        intent_scores = defaultdict(int)
+        matched = self._MESSAGE_SCANNER.rules_matched(message)
         
-        for intent, patterns in self.INTENT_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, message_lower):
-                    intent_scores[intent] += 1
+        # Score = number of distinct patterns that fired; ties keep declaration order
+        intent_scores = {
+            intent: len(matched[f"intent:{intent.value}"])
+            for intent in self.INTENT_PATTERNS
+            if matched.get(f"intent:{intent.value}")
+        }
         
         if intent_scores:
             return max(intent_scores.keys(), key=lambda x: intent_scores[x])
@@ -472,21 +471,13 @@ class AIChatbotService:
     
     def _analyze_sentiment(self, message: str) -> SentimentLevel:
         """Analyze sentiment of a message."""
-        message_lower = message.lower()
+        matched = self._MESSAGE_SCANNER.rules_matched(message)
         
         scores = {
-            SentimentLevel.VERY_NEGATIVE: 0,
-            SentimentLevel.NEGATIVE: 0,
-            SentimentLevel.NEUTRAL: 0,
-            SentimentLevel.POSITIVE: 0,
-            SentimentLevel.VERY_POSITIVE: 0
+            level: len(matched.get(f"sentiment:{level.value}", ()))
+            for level in SentimentLevel
         }
         
-        for level, keywords in self.SENTIMENT_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in message_lower:
-                    scores[level] += 1
-        
         # Get dominant sentiment
         max_score = max(scores.values())
         if max_score == 0:
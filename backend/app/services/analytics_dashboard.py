@@ -5,8 +5,11 @@ from sqlalchemy.orm import Session
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta, timezone
 from enum import Enum
+import asyncio
 import uuid
 
+from app.services.realtime_metrics import get_realtime_metrics
+
 
 class MetricType(str, Enum):
     COUNTER = "counter"
@@ -238,26 +241,12 @@ class AnalyticsDashboardService:
     
     # Real-time Analytics
     async def get_realtime_metrics(self, user_id: int) -> Dict[str, Any]:
-        """Get real-time metrics snapshot."""
-        return {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "metrics": {
-                "active_projects": 5,
-                "pending_proposals": 3,
-                "unread_messages": 12,
-                "pending_payments": 2,
-                "today_earnings": 450.00,
-                "week_earnings": 2500.00,
-                "month_earnings": 8500.00
-            },
-            "alerts": [
-                {"type": "deadline", "message": "Project deadline in 2 days", "priority": "medium"}
-            ],
-            "activity": [
-                {"event": "proposal_accepted", "timestamp": datetime.now(timezone.utc).isoformat()},
-                {"event": "payment_received", "timestamp": datetime.now(timezone.utc).isoformat()}
-            ]
-        }
+        """Get real-time metrics snapshot (from the event-driven counters, see realtime_metrics)."""
+        metrics = get_realtime_metrics()
+        snapshot = metrics.peek(user_id)
+        if snapshot is None:
+            snapshot = await asyncio.to_thread(metrics.snapshot, user_id)
+        return snapshot
     
     # KPI Management
     async def set_kpi_target(
@@ -0,0 +1,797 @@
+# @AI-HINT: Append-only, group-committed audit log store with Merkle checkpoints and secondary indexes
+"""
+Audit Log Store - persistent backing store for AuditTrailService.
+
+Entries are buffered in memory and written to the append-only
+``audit_trail_entries`` table in one ``execute_many`` batch (group commit)
+once the buffer fills up or the oldest entry has waited ``flush_interval``
+seconds; a background thread commits a batch that no further append
+arrives for. Sequence numbers and hash-chain links are
+assigned when a batch commits, not when an entry is appended: every worker
+process writes to the same chain, so the batch is chained onto the last
+entry this process knows of and ``seq`` (the primary key) rejects it if
+another worker got there first. The store then reads the entries it
+missed, re-chains the batch onto them and retries.
+
+Every ``CHECKPOINT_BLOCK_SIZE`` entries the block of leaf hashes is sealed
+into a Merkle tree whose root is persisted to ``audit_trail_checkpoints``.
+Verifying a range of ``k`` entries then only needs the ``k`` recomputed leaf
+hashes plus O(log n) sibling hashes per touched block, instead of rehashing
+the whole log.
+
+Reads are served from in-process secondary indexes (user, category, action,
+severity, IP, resource) and per-day aggregates, so list and statistics
+queries never scan the full log. Reads commit anything still buffered
+first, and at most every ``catch_up_interval`` seconds read the entries
+other workers have committed since.
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.db.schema_registry import ensure_schema, register_schema
+from app.db.turso_http import cell_value, get_turso_http
+
+logger = logging.getLogger(__name__)
+
+GENESIS_HASH = "genesis"
+CHECKPOINT_BLOCK_SIZE = 1024  # Must be a power of two (complete Merkle trees)
+_LOAD_PAGE_SIZE = 5000
+_COMMIT_ATTEMPTS = 3  # a batch losing the race for its seq range is re-chained and retried
+
+_ENTRY_COLUMNS = [
+    "seq", "id", "user_id", "action", "category", "resource_type", "resource_id",
+    "details", "ip_address", "user_agent", "severity", "metadata", "timestamp",
+    "hash", "previous_hash", "pruned",
+]
+
+AUDIT_STORE_DDL = [
+    """CREATE TABLE IF NOT EXISTS audit_trail_entries (
+        seq INTEGER PRIMARY KEY,
+        id TEXT NOT NULL UNIQUE,
+        user_id INTEGER,
+        action TEXT NOT NULL,
+        category TEXT NOT NULL,
+        resource_type TEXT,
+        resource_id TEXT,
+        details TEXT,
+        ip_address TEXT,
+        user_agent TEXT,
+        severity TEXT NOT NULL,
+        metadata TEXT,
+        timestamp TEXT NOT NULL,
+        hash TEXT NOT NULL,
+        previous_hash TEXT NOT NULL,
+        pruned INTEGER DEFAULT 0
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_audit_trail_entries_user ON audit_trail_entries(user_id, seq)",
+    "CREATE INDEX IF NOT EXISTS idx_audit_trail_entries_ts ON audit_trail_entries(timestamp)",
+    """CREATE TABLE IF NOT EXISTS audit_trail_checkpoints (
+        block_index INTEGER PRIMARY KEY,
+        start_seq INTEGER NOT NULL,
+        end_seq INTEGER NOT NULL,
+        root_hash TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    )""",
+]
+register_schema("audit_store", AUDIT_STORE_DDL)
+
+
+def compute_entry_hash(entry: Dict[str, Any]) -> str:
+    """Calculate hash for a log entry (excluding the hash field itself)."""
+    data_to_hash = {k: v for k, v in entry.items() if k not in ("hash", "seq")}
+    data_string = json.dumps(data_to_hash, sort_keys=True)
+    return hashlib.sha256(data_string.encode()).hexdigest()
+
+
+def _hash_pair(left: str, right: str) -> str:
+    return hashlib.sha256(f"{left}{right}".encode()).hexdigest()
+
+
+class MerkleBlock:
+    """Complete Merkle tree over a sealed block of leaf hashes."""
+
+    def __init__(self, leaves: List[str]):
+        self.levels: List[List[str]] = [list(leaves)]
+        level = self.levels[0]
+        while len(level) > 1:
+            level = [_hash_pair(level[i], level[i + 1]) for i in range(0, len(level), 2)]
+            self.levels.append(level)
+
+    @property
+    def root(self) -> str:
+        return self.levels[-1][0]
+
+    def range_root(self, start: int, leaves: List[str]) -> str:
+        """
+        Recompute the root with ``leaves`` substituted at ``start``.
+
+        Only nodes on the paths above the substituted range are rehashed;
+        everything outside the range is taken from the stored tree, which
+        costs O(k + log B) for a range of k leaves in a block of B.
+        """
+        current = {start + i: leaf for i, leaf in enumerate(leaves)}
+        for depth in range(len(self.levels) - 1):
+            stored = self.levels[depth]
+            parents: Dict[int, str] = {}
+            for idx in sorted({j // 2 for j in current}):
+                left = current.get(2 * idx, stored[2 * idx])
+                right = current.get(2 * idx + 1, stored[2 * idx + 1])
+                parents[idx] = _hash_pair(left, right)
+            current = parents
+        return current[0]
+
+
+class _DayStats:
+    """Pre-aggregated counters for one UTC day (or a merged range of days)."""
+
+    __slots__ = ("total", "by_category", "by_action", "by_severity", "by_day",
+                 "users", "ips", "high_risk", "failed_auth")
+
+    def __init__(self):
+        self.total = 0
+        self.by_category: Dict[str, int] = defaultdict(int)
+        self.by_action: Dict[str, int] = defaultdict(int)
+        self.by_severity: Dict[str, int] = defaultdict(int)
+        self.by_day: Dict[str, int] = defaultdict(int)
+        self.users: Set[int] = set()
+        self.ips: Set[str] = set()
+        self.high_risk = 0
+        self.failed_auth = 0
+
+
+class AuditLogStore:
+    """
+    Process-wide append-only audit log.
+
+    The backend object only needs ``execute(sql, params)`` and
+    ``execute_many(statements)`` with TursoHTTP semantics, which keeps the
+    store testable against a local SQLite adapter.
+    """
+
+    def __init__(
+        self,
+        backend_factory: Optional[Callable[[], Any]] = None,
+        batch_size: int = 200,
+        flush_interval: float = 2.0,
+        catch_up_interval: float = 2.0,
+        high_risk_actions: Iterable[str] = (),
+        failed_auth_action: str = "login_failed",
+        background: bool = True,
+    ):
+        self._backend_factory = backend_factory or get_turso_http
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.catch_up_interval = catch_up_interval
+        self._high_risk = set(high_risk_actions)
+        self._failed_auth = failed_auth_action
+
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._loaded = False
+
+        # Log state
+        self._entries: List[Optional[Dict[str, Any]]] = []  # seq -> entry (None once pruned)
+        self._hashes: List[str] = []                          # seq -> leaf hash
+        self._timestamps: List[str] = []                      # seq -> ISO timestamp (running max)
+        self._last_hash = GENESIS_HASH
+
+        # Write buffer (group commit): entries not yet chained or written
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_since: Optional[float] = None
+        self._caught_up_at = 0.0
+
+        # Background flusher: commits a buffered batch once it is flush_interval old
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        if not background:
+            self._stopped.set()
+        self._thread: Optional[threading.Thread] = None
+
+        # Merkle checkpoints
+        self._blocks: Dict[int, MerkleBlock] = {}
+        self._checkpoint_roots: Dict[int, str] = {}
+
+        self._reset_indexes()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _reset_indexes(self) -> None:
+        self._all: List[int] = []
+        self._by_user: Dict[int, List[int]] = defaultdict(list)
+        self._by_category: Dict[str, List[int]] = defaultdict(list)
+        self._by_action: Dict[str, List[int]] = defaultdict(list)
+        self._by_severity: Dict[str, List[int]] = defaultdict(list)
+        self._by_ip: Dict[str, List[int]] = defaultdict(list)
+        self._by_resource_type: Dict[str, List[int]] = defaultdict(list)
+        self._by_resource: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        self._days: Dict[str, _DayStats] = defaultdict(_DayStats)
+
+    def ensure_loaded(self) -> None:
+        """Hydrate indexes and the hash chain head from the database once."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                self._load()
+            except Exception as e:
+                logger.warning(f"Audit store hydration failed, starting empty: {e}")
+            self._loaded = True
+
+    def _load(self) -> None:
+        backend = self._backend_factory()
+        ensure_schema("audit_store", backend=backend)
+
+        self._read_from(backend.execute, 0)
+        self._caught_up_at = time.monotonic()
+        logger.info(f"Audit store loaded {len(self._hashes)} entries, "
+                    f"{len(self._checkpoint_roots)} checkpoints")
+
+    def _catch_up(self, backend) -> int:
+        """Read entries other workers committed past our head. Returns how many."""
+        def uncached(sql, params):
+            # execute() may answer from the SELECT cache, which only other workers' writes leave stale
+            return backend.execute_many([{"q": sql, "params": params}])[0]
+        with self._lock:
+            head = len(self._hashes)
+            self._read_from(uncached, head)
+            return len(self._hashes) - head
+
+    def _read_from(self, run, first_seq: int) -> None:
+        """Restore entries from ``first_seq`` on, then the checkpoints of the blocks they touch."""
+        cols = ", ".join(_ENTRY_COLUMNS)
+        last_seq = first_seq - 1
+        while True:
+            result = run(
+                f"SELECT {cols} FROM audit_trail_entries WHERE seq > ? ORDER BY seq LIMIT ?",
+                [last_seq, _LOAD_PAGE_SIZE],
+            )
+            rows = result.get("rows", [])
+            for row in rows:
+                values = [cell_value(v) for v in row]
+                record = dict(zip(_ENTRY_COLUMNS, values))
+                self._restore(record)
+                last_seq = int(record["seq"])
+            if len(rows) < _LOAD_PAGE_SIZE:
+                break
+
+        result = run(
+            "SELECT block_index, root_hash FROM audit_trail_checkpoints WHERE block_index >= ? ORDER BY block_index",
+            [first_seq // CHECKPOINT_BLOCK_SIZE],
+        )
+        for row in result.get("rows", []):
+            block_index, root = int(cell_value(row[0])), cell_value(row[1])
+            self._checkpoint_roots[block_index] = root
+            start = block_index * CHECKPOINT_BLOCK_SIZE
+            leaves = self._hashes[start:start + CHECKPOINT_BLOCK_SIZE]
+            if len(leaves) == CHECKPOINT_BLOCK_SIZE:
+                self._blocks[block_index] = MerkleBlock(leaves)
+
+        if self._hashes:
+            self._last_hash = self._hashes[-1]
+
+    def _restore(self, record: Dict[str, Any]) -> None:
+        seq = int(record["seq"])
+        # Fill any gap left by a failed write so seq stays a list index
+        while len(self._hashes) < seq:
+            self._entries.append(None)
+            self._hashes.append(GENESIS_HASH)
+            self._timestamps.append(self._timestamps[-1] if self._timestamps else "")
+        self._hashes.append(record["hash"])
+        self._push_timestamp(record["timestamp"])
+        if record.get("pruned"):
+            self._entries.append(None)
+            return
+        entry = {
+            "id": record["id"],
+            "user_id": int(record["user_id"]) if record["user_id"] is not None else None,
+            "action": record["action"],
+            "category": record["category"],
+            "resource_type": record["resource_type"],
+            "resource_id": record["resource_id"],
+            "details": json.loads(record["details"]) if record["details"] else {},
+            "ip_address": record["ip_address"],
+            "user_agent": record["user_agent"],
+            "severity": record["severity"],
+            "metadata": json.loads(record["metadata"]) if record["metadata"] else {},
+            "timestamp": record["timestamp"],
+            "hash": record["hash"],
+            "previous_hash": record["previous_hash"],
+        }
+        self._entries.append(entry)
+        self._index(seq, entry)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Buffer an entry for group commit; commit when due.
+
+        ``previous_hash`` and ``hash`` are filled in on the same dict when
+        its batch commits (see ``flush``).
+        """
+        self.ensure_loaded()
+        self._start()
+        with self._lock:
+            self._pending.append(entry)
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+                self._wake.set()
+            due = (
+                len(self._pending) >= self.batch_size
+                or time.monotonic() - self._pending_since >= self.flush_interval
+            )
+
+        if due:
+            self.flush()
+        return entry
+
+    def _start(self) -> None:
+        if self._thread is None and not self._stopped.is_set():
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="audit-store-flush", daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            since = self._pending_since
+            if since is None:
+                self._wake.wait()
+            else:
+                self._wake.wait(max(0.0, since + self.flush_interval - time.monotonic()))
+            self._wake.clear()
+            since = self._pending_since
+            if since is not None and time.monotonic() - since >= self.flush_interval:
+                try:
+                    self.flush()
+                except Exception as e:
+                    logger.error(f"Audit store background flush failed: {e}")
+
+    def close(self) -> None:
+        """Stop the background flusher and commit what is still buffered."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+
+    def flush(self) -> int:
+        """
+        Chain and write all buffered entries in a single batch. Returns entries written.
+
+        The batch is chained onto the newest entry this process holds. If
+        another worker has committed past it, the insert of the first
+        ``seq`` collides and the whole batch rolls back; the missed entries
+        are read, the batch is re-chained onto them and written again.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                self._pending_since = None
+            if not batch:
+                return 0
+            backend = self._backend_factory()
+            for attempt in range(_COMMIT_ATTEMPTS):
+                try:
+                    if attempt:
+                        self._catch_up(backend)
+                    with self._lock:
+                        seq, statements = self._chain(batch)
+                    backend.execute_many(statements)
+                except Exception as e:
+                    if attempt + 1 < _COMMIT_ATTEMPTS:
+                        logger.info(f"Audit store batch not committed, re-chaining: {e}")
+                        continue
+                    logger.error(f"Audit store flush failed, re-queueing {len(batch)} entries: {e}")
+                    with self._lock:
+                        self._pending = batch + self._pending
+                        self._pending_since = self._pending_since or time.monotonic()
+                    self._wake.set()
+                    return 0
+                with self._lock:
+                    self._commit(seq, batch)
+                return len(batch)
+
+    def _chain(self, batch: List[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]]]:
+        """Link ``batch`` onto the current head. Returns its first seq and the statements writing it."""
+        first = len(self._hashes)
+        previous = self._last_hash
+        hashes = []
+        statements = []
+        for offset, entry in enumerate(batch):
+            entry["previous_hash"] = previous
+            entry["hash"] = previous = compute_entry_hash(entry)
+            hashes.append(previous)
+            statements.append(self._insert_statement(first + offset, entry))
+            seq = first + offset
+            if (seq + 1) % CHECKPOINT_BLOCK_SIZE == 0:
+                block_index = seq // CHECKPOINT_BLOCK_SIZE
+                start = block_index * CHECKPOINT_BLOCK_SIZE
+                leaves = (self._hashes + hashes)[start:start + CHECKPOINT_BLOCK_SIZE]
+                statements.append(self._checkpoint_statement(block_index, MerkleBlock(leaves)))
+        return first, statements
+
+    def _commit(self, first: int, batch: List[Dict[str, Any]]) -> None:
+        """Apply a written batch to the in-memory log and indexes."""
+        for offset, entry in enumerate(batch):
+            seq = first + offset
+            self._entries.append(entry)
+            self._hashes.append(entry["hash"])
+            self._push_timestamp(entry["timestamp"])
+            self._index(seq, entry)
+            if (seq + 1) % CHECKPOINT_BLOCK_SIZE == 0:
+                block_index = seq // CHECKPOINT_BLOCK_SIZE
+                start = block_index * CHECKPOINT_BLOCK_SIZE
+                block = MerkleBlock(self._hashes[start:start + CHECKPOINT_BLOCK_SIZE])
+                self._blocks[block_index] = block
+                self._checkpoint_roots[block_index] = block.root
+        self._last_hash = self._hashes[-1]
+
+    def _push_timestamp(self, timestamp: str) -> None:
+        # Entries from different workers commit slightly out of time order; a
+        # running max keeps the list sorted for the date-bound binary searches
+        if self._timestamps and timestamp < self._timestamps[-1]:
+            timestamp = self._timestamps[-1]
+        self._timestamps.append(timestamp)
+
+    def _committed(self) -> None:
+        """Commit buffered entries and pick up other workers' entries so a read sees them."""
+        self.ensure_loaded()
+        if self._pending:
+            self.flush()
+        if time.monotonic() - self._caught_up_at < self.catch_up_interval:
+            return
+        # Under the flush lock, so a batch being written is not also read back as someone else's
+        if not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            self._caught_up_at = time.monotonic()
+            self._catch_up(self._backend_factory())
+        except Exception as e:
+            logger.warning(f"Audit store catch-up failed: {e}")
+        finally:
+            self._flush_lock.release()
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def _insert_statement(self, seq: int, entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "q": f"INSERT INTO audit_trail_entries ({', '.join(_ENTRY_COLUMNS)}) "
+                 f"VALUES ({', '.join('?' * len(_ENTRY_COLUMNS))})",
+            "params": [
+                seq, entry["id"], entry["user_id"], entry["action"], entry["category"],
+                entry["resource_type"], entry["resource_id"], json.dumps(entry["details"]),
+                entry["ip_address"], entry["user_agent"], entry["severity"],
+                json.dumps(entry["metadata"]), entry["timestamp"], entry["hash"],
+                entry["previous_hash"], 0,
+            ],
+        }
+
+    def _checkpoint_statement(self, block_index: int, block: MerkleBlock) -> Dict[str, Any]:
+        start = block_index * CHECKPOINT_BLOCK_SIZE
+        return {
+            "q": "INSERT OR REPLACE INTO audit_trail_checkpoints "
+                 "(block_index, start_seq, end_seq, root_hash, created_at) VALUES (?, ?, ?, ?, ?)",
+            "params": [block_index, start, start + CHECKPOINT_BLOCK_SIZE - 1, block.root,
+                       datetime.now(timezone.utc).isoformat()],
+        }
+
+    # ------------------------------------------------------------------
+    # Indexes
+    # ------------------------------------------------------------------
+
+    def _index(self, seq: int, entry: Dict[str, Any]) -> None:
+        self._all.append(seq)
+        if entry["user_id"]:
+            self._by_user[entry["user_id"]].append(seq)
+        self._by_category[entry["category"]].append(seq)
+        self._by_action[entry["action"]].append(seq)
+        self._by_severity[entry["severity"]].append(seq)
+        if entry["ip_address"]:
+            self._by_ip[entry["ip_address"]].append(seq)
+        if entry["resource_type"]:
+            self._by_resource_type[entry["resource_type"]].append(seq)
+        if entry["resource_id"] is not None:
+            self._by_resource[(entry["resource_type"], str(entry["resource_id"]))].append(seq)
+
+        day = self._days[entry["timestamp"][:10]]
+        self._accumulate(day, entry)
+
+    def _accumulate(self, stats: _DayStats, entry: Dict[str, Any]) -> None:
+        stats.total += 1
+        stats.by_category[entry["category"]] += 1
+        stats.by_action[entry["action"]] += 1
+        stats.by_severity[entry["severity"]] += 1
+        stats.by_day[entry["timestamp"][:10]] += 1
+        if entry["user_id"]:
+            stats.users.add(entry["user_id"])
+        if entry["ip_address"]:
+            stats.ips.add(entry["ip_address"])
+        if entry["action"] in self._high_risk:
+            stats.high_risk += 1
+        if entry["action"] == self._failed_auth:
+            stats.failed_auth += 1
+
+    def _seq_bound(self, when: Optional[datetime], default: int, right: bool) -> int:
+        if when is None:
+            return default
+        key = _as_utc(when).isoformat()
+        if right:
+            return bisect.bisect_right(self._timestamps, key)
+        return bisect.bisect_left(self._timestamps, key)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def query(
+        self,
+        filters: Dict[str, Any],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Return (newest-first page, total) for the given equality filters.
+
+        The smallest matching posting list drives the scan, date bounds are
+        applied with a binary search over sequence numbers, and the remaining
+        filters are checked per candidate.
+        """
+        self._committed()
+        with self._lock:
+            postings = []
+            checks = []
+            for key, index in (("user_id", self._by_user), ("category", self._by_category),
+                               ("action", self._by_action), ("severity", self._by_severity),
+                               ("ip_address", self._by_ip)):
+                value = filters.get(key)
+                if value:
+                    postings.append(index.get(value, []))
+                    checks.append((key, value))
+            resource_type = filters.get("resource_type")
+            resource_id = filters.get("resource_id")
+            if resource_id is not None:
+                resource_id = str(resource_id)
+                checks.append(("resource_id", resource_id))
+                if resource_type:
+                    postings.append(self._by_resource.get((resource_type, resource_id), []))
+            if resource_type:
+                checks.append(("resource_type", resource_type))
+                if resource_id is None:
+                    postings.append(self._by_resource_type.get(resource_type, []))
+
+            driver = min(postings, key=len) if postings else self._all
+            lo = bisect.bisect_left(driver, self._seq_bound(start_date, 0, right=False))
+            hi = bisect.bisect_left(driver, self._seq_bound(end_date, len(self._hashes), right=True))
+
+            paired_resource = resource_id is not None and bool(resource_type)
+            if len(postings) <= 1 and len(checks) == len(postings) + paired_resource:
+                # The driving posting list already satisfies every filter
+                total = hi - lo
+                first = hi - 1 - offset
+                last = max(first - limit, lo - 1)
+                return [self._entries[driver[i]] for i in range(first, last, -1)], total
+
+            matched = []
+            for i in range(hi - 1, lo - 1, -1):
+                entry = self._entries[driver[i]]
+                if all((str(entry[k]) if k == "resource_id" else entry[k]) == v for k, v in checks):
+                    matched.append(entry)
+            return matched[offset:offset + limit], len(matched)
+
+    def aggregate(self, start_date: datetime, user_id: Optional[int] = None) -> _DayStats:
+        """
+        Aggregate statistics since ``start_date``.
+
+        Whole days come from the per-day buckets; only the partial first day
+        is scanned entry by entry. With ``user_id`` the user's posting list
+        is sliced by sequence range instead.
+        """
+        self._committed()
+        with self._lock:
+            result = _DayStats()
+            lo_seq = self._seq_bound(start_date, 0, right=False)
+
+            if user_id is not None:
+                seqs = self._by_user.get(user_id, [])
+                for s in seqs[bisect.bisect_left(seqs, lo_seq):]:
+                    self._accumulate(result, self._entries[s])
+                return result
+
+            first_day = _as_utc(start_date).date()
+            next_day = (first_day + timedelta(days=1)).isoformat()
+            boundary = bisect.bisect_left(self._timestamps, next_day)
+            for s in range(lo_seq, min(boundary, len(self._entries))):
+                if self._entries[s] is not None:
+                    self._accumulate(result, self._entries[s])
+
+            for day_key, day in self._days.items():
+                if day_key >= next_day:
+                    _merge(result, day)
+            return result
+
+    def get_by_seq(self, seqs: Iterable[int]) -> List[Optional[Dict[str, Any]]]:
+        self._committed()
+        return [self._entries[s] for s in seqs]
+
+    def __len__(self) -> int:
+        self._committed()
+        return len(self._hashes)
+
+    # ------------------------------------------------------------------
+    # Integrity
+    # ------------------------------------------------------------------
+
+    def verify(self, start: int = 0, end: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Verify entries in [start, end).
+
+        Each live entry is rehashed and its chain link checked. The range is
+        then proven against every sealed checkpoint it touches by recomputing
+        only the affected Merkle paths.
+        """
+        self._committed()
+        with self._lock:
+            end = len(self._hashes) if end is None else min(end, len(self._hashes))
+            start = max(0, start)
+            issues = []
+            leaves = []
+            for seq in range(start, end):
+                entry = self._entries[seq]
+                if entry is None:
+                    leaves.append(self._hashes[seq])
+                    continue
+                expected_prev = self._hashes[seq - 1] if seq > 0 else GENESIS_HASH
+                if entry["previous_hash"] != expected_prev:
+                    issues.append({
+                        "index": seq,
+                        "log_id": entry["id"],
+                        "issue": "Hash chain broken",
+                        "expected_previous": expected_prev,
+                        "actual_previous": entry["previous_hash"],
+                    })
+                recomputed = compute_entry_hash(entry)
+                if recomputed != entry["hash"]:
+                    issues.append({
+                        "index": seq,
+                        "log_id": entry["id"],
+                        "issue": "Log hash mismatch (possible tampering)",
+                        "expected_hash": recomputed,
+                        "actual_hash": entry["hash"],
+                    })
+                leaves.append(recomputed)
+
+            checkpoints_checked = 0
+            if end > start:
+                first_block = start // CHECKPOINT_BLOCK_SIZE
+                last_block = (end - 1) // CHECKPOINT_BLOCK_SIZE
+                for block_index in range(first_block, last_block + 1):
+                    block = self._blocks.get(block_index)
+                    root = self._checkpoint_roots.get(block_index)
+                    if block is None or root is None:
+                        continue
+                    block_start = block_index * CHECKPOINT_BLOCK_SIZE
+                    lo = max(start, block_start)
+                    hi = min(end, block_start + CHECKPOINT_BLOCK_SIZE)
+                    recomputed_root = block.range_root(
+                        lo - block_start, leaves[lo - start:hi - start])
+                    checkpoints_checked += 1
+                    if recomputed_root != root:
+                        issues.append({
+                            "index": block_start,
+                            "block_index": block_index,
+                            "issue": "Merkle checkpoint mismatch",
+                            "expected_root": root,
+                            "actual_root": recomputed_root,
+                        })
+
+            return {
+                "verified_count": end - start if end > start else 0,
+                "checkpoints_checked": checkpoints_checked,
+                "integrity_valid": len(issues) == 0,
+                "issues": issues,
+            }
+
+    # ------------------------------------------------------------------
+    # Retention
+    # ------------------------------------------------------------------
+
+    def prune(self, should_prune: Callable[[Dict[str, Any]], bool]) -> int:
+        """
+        Drop payloads matching ``should_prune``.
+
+        Leaf hashes stay in place so the chain and Merkle checkpoints remain
+        verifiable; only the payload columns are cleared in the table.
+        """
+        self._committed()
+        with self._lock:
+            pruned = []
+            for seq, entry in enumerate(self._entries):
+                if entry is not None and should_prune(entry):
+                    self._entries[seq] = None
+                    pruned.append(seq)
+            if not pruned:
+                return 0
+            self._reset_indexes()
+            for seq, entry in enumerate(self._entries):
+                if entry is not None:
+                    self._index(seq, entry)
+
+        statements = [
+            {
+                "q": "UPDATE audit_trail_entries SET details = NULL, metadata = NULL, "
+                     "user_agent = NULL, ip_address = NULL, pruned = 1 "
+                     f"WHERE seq IN ({', '.join('?' * len(chunk))})",
+                "params": chunk,
+            }
+            for chunk in (pruned[i:i + 500] for i in range(0, len(pruned), 500))
+        ]
+        try:
+            self._backend_factory().execute_many(statements)
+        except Exception as e:
+            logger.error(f"Audit store prune write failed: {e}")
+        return len(pruned)
+
+    def live_count(self) -> int:
+        self._committed()
+        return len(self._all)
+
+
+def _merge(target: _DayStats, source: _DayStats) -> None:
+    target.total += source.total
+    for k, v in source.by_category.items():
+        target.by_category[k] += v
+    for k, v in source.by_action.items():
+        target.by_action[k] += v
+    for k, v in source.by_severity.items():
+        target.by_severity[k] += v
+    for k, v in source.by_day.items():
+        target.by_day[k] += v
+    target.users |= source.users
+    target.ips |= source.ips
+    target.high_risk += source.high_risk
+    target.failed_auth += source.failed_auth
+
+
+def _as_utc(when: datetime) -> datetime:
+    if when.tzinfo is None:
+        return when.replace(tzinfo=timezone.utc)
+    return when.astimezone(timezone.utc)
+
+
+# Singleton instance
+_audit_store: Optional[AuditLogStore] = None
+_audit_store_lock = threading.Lock()
+
+
+def get_audit_store() -> AuditLogStore:
+    """Get or create the process-wide audit log store."""
+    global _audit_store
+    if _audit_store is None:
+        with _audit_store_lock:
+            if _audit_store is None:
+                from app.services.audit_trail import AuditTrailService, AuditAction
+                _audit_store = AuditLogStore(
+                    high_risk_actions=[a.value for a in AuditTrailService.HIGH_RISK_ACTIONS],
+                    failed_auth_action=AuditAction.LOGIN_FAILED.value,
+                )
+    return _audit_store
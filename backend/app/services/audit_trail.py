@@ -2,8 +2,6 @@
 """Audit Trail Service - Complete audit logging and compliance system."""
 
 import logging
-import hashlib
-import json
 import secrets
 from datetime import datetime, timedelta, timezone
 from typing import Optional, List, Dict, Any
@@ -11,6 +9,8 @@ from sqlalchemy.orm import Session
 from enum import Enum
 from collections import defaultdict
 
+from app.services.audit_log_store import AuditLogStore, compute_entry_hash, get_audit_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -151,17 +151,11 @@ class AuditTrailService:
         "default": 180
     }
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, store: Optional[AuditLogStore] = None):
         self.db = db
         
-        # In-memory stores
-        self._audit_logs: List[Dict] = []
-        self._log_index: Dict[str, int] = {}  # id -> index
-        self._user_logs: Dict[int, List[str]] = defaultdict(list)
-        self._category_logs: Dict[str, List[str]] = defaultdict(list)
-        
-        # Hash chain for tamper detection
-        self._last_hash: str = "genesis"
+        # Persistent append-only store (shared hash chain across instances)
+        self._store = store if store is not None else get_audit_store()
     
     async def log(
         self,
@@ -212,22 +206,11 @@ class AuditTrailService:
             "metadata": metadata or {},
             "timestamp": timestamp.isoformat(),
             "hash": None,
-            "previous_hash": self._last_hash
+            "previous_hash": None
         }
         
-        # Calculate hash for tamper detection
-        entry["hash"] = self._calculate_hash(entry)
-        self._last_hash = entry["hash"]
-        
-        # Store log
-        log_index = len(self._audit_logs)
-        self._audit_logs.append(entry)
-        self._log_index[log_id] = log_index
-        
-        # Index by user and category
-        if user_id:
-            self._user_logs[user_id].append(log_id)
-        self._category_logs[category.value].append(log_id)
+        # Buffer for group commit; chained and indexed when its batch is written
+        entry = self._store.append(entry)
         
         # Check for high-risk action alerts
         if action in self.HIGH_RISK_ACTIONS:
@@ -251,46 +234,22 @@ class AuditTrailService:
         limit: int = 100,
         offset: int = 0
     ) -> Dict[str, Any]:
-        """Query audit logs with filters."""
-        # Start with all logs or filtered by user/category
-        if user_id:
-            log_ids = self._user_logs.get(user_id, [])
-            logs = [self._audit_logs[self._log_index[lid]] for lid in log_ids]
-        elif category:
-            log_ids = self._category_logs.get(category.value, [])
-            logs = [self._audit_logs[self._log_index[lid]] for lid in log_ids]
-        else:
-            logs = self._audit_logs.copy()
-        
-        # Apply filters
-        if action:
-            logs = [l for l in logs if l["action"] == action.value]
-        
-        if resource_type:
-            logs = [l for l in logs if l["resource_type"] == resource_type]
-        
-        if resource_id:
-            logs = [l for l in logs if l["resource_id"] == resource_id]
-        
-        if severity:
-            logs = [l for l in logs if l["severity"] == severity.value]
-        
-        if ip_address:
-            logs = [l for l in logs if l["ip_address"] == ip_address]
-        
-        if start_date:
-            logs = [l for l in logs 
-                   if datetime.fromisoformat(l["timestamp"]) >= start_date]
-        
-        if end_date:
-            logs = [l for l in logs 
-                   if datetime.fromisoformat(l["timestamp"]) <= end_date]
-        
-        # Sort by timestamp (newest first)
-        logs.sort(key=lambda x: x["timestamp"], reverse=True)
-        
-        total = len(logs)
-        logs = logs[offset:offset + limit]
+        """Query audit logs with filters (served from secondary indexes)."""
+        logs, total = self._store.query(
+            {
+                "user_id": user_id,
+                "category": category.value if category else None,
+                "action": action.value if action else None,
+                "severity": severity.value if severity else None,
+                "ip_address": ip_address,
+                "resource_type": resource_type,
+                "resource_id": resource_id,
+            },
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            offset=offset
+        )
         
         return {
             "logs": logs,
@@ -308,58 +267,38 @@ class AuditTrailService:
         """Get user activity summary."""
         start_date = datetime.now(timezone.utc) - timedelta(days=days)
         
+        # Counters come from the user's posting list; only the newest
+        # entries are materialized for last-login and high-risk details
+        stats = self._store.aggregate(start_date, user_id=user_id)
         result = await self.get_logs(
             user_id=user_id,
             start_date=start_date,
             limit=1000
         )
-        
         logs = result["logs"]
         
-        # Summarize activity
         activity = {
-            "total_actions": len(logs),
-            "by_category": defaultdict(int),
-            "by_action": defaultdict(int),
-            "by_day": defaultdict(int),
-            "unique_ips": set(),
+            "total_actions": stats.total,
+            "by_category": dict(stats.by_category),
+            "by_action": dict(stats.by_action),
+            "by_day": dict(stats.by_day),
+            "unique_ips": list(stats.ips),
             "last_login": None,
-            "last_activity": None,
+            "last_activity": logs[0]["timestamp"] if logs else None,
             "high_risk_actions": []
         }
         
+        high_risk = {a.value for a in self.HIGH_RISK_ACTIONS}
         for log in logs:
-            activity["by_category"][log["category"]] += 1
-            activity["by_action"][log["action"]] += 1
-            
-            date_key = log["timestamp"][:10]  # YYYY-MM-DD
-            activity["by_day"][date_key] += 1
-            
-            if log["ip_address"]:
-                activity["unique_ips"].add(log["ip_address"])
-            
             if log["action"] == AuditAction.LOGIN.value and not activity["last_login"]:
                 activity["last_login"] = log["timestamp"]
             
-            if not activity["last_activity"]:
-                activity["last_activity"] = log["timestamp"]
-            
-            # Check for high risk
-            try:
-                action_enum = AuditAction(log["action"])
-                if action_enum in self.HIGH_RISK_ACTIONS:
-                    activity["high_risk_actions"].append({
-                        "action": log["action"],
-                        "timestamp": log["timestamp"],
-                        "details": log["details"]
-                    })
-            except ValueError:
-                pass
-        
-        activity["unique_ips"] = list(activity["unique_ips"])
-        activity["by_category"] = dict(activity["by_category"])
-        activity["by_action"] = dict(activity["by_action"])
-        activity["by_day"] = dict(activity["by_day"])
+            if log["action"] in high_risk:
+                activity["high_risk_actions"].append({
+                    "action": log["action"],
+                    "timestamp": log["timestamp"],
+                    "details": log["details"]
+                })
         
         return activity
     
@@ -368,44 +307,8 @@ class AuditTrailService:
         start_index: int = 0,
         end_index: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Verify audit log integrity (detect tampering)."""
-        if end_index is None:
-            end_index = len(self._audit_logs)
-        
-        logs = self._audit_logs[start_index:end_index]
-        
-        issues = []
-        previous_hash = logs[0]["previous_hash"] if logs else "genesis"
-        
-        for i, log in enumerate(logs):
-            # Verify hash chain
-            if log["previous_hash"] != previous_hash:
-                issues.append({
-                    "index": start_index + i,
-                    "log_id": log["id"],
-                    "issue": "Hash chain broken",
-                    "expected_previous": previous_hash,
-                    "actual_previous": log["previous_hash"]
-                })
-            
-            # Verify log hash
-            expected_hash = self._calculate_hash(log)
-            if log["hash"] != expected_hash:
-                issues.append({
-                    "index": start_index + i,
-                    "log_id": log["id"],
-                    "issue": "Log hash mismatch (possible tampering)",
-                    "expected_hash": expected_hash,
-                    "actual_hash": log["hash"]
-                })
-            
-            previous_hash = log["hash"]
-        
-        return {
-            "verified_count": len(logs),
-            "integrity_valid": len(issues) == 0,
-            "issues": issues
-        }
+        """Verify audit log integrity (hash chain plus Merkle checkpoints)."""
+        return self._store.verify(start_index, end_index)
     
     async def export_logs(
         self,
@@ -451,98 +354,47 @@ class AuditTrailService:
         self,
         days: int = 30
     ) -> Dict[str, Any]:
-        """Get audit log statistics."""
+        """Get audit log statistics from pre-aggregated daily buckets."""
         start_date = datetime.now(timezone.utc) - timedelta(days=days)
         
-        result = await self.get_logs(start_date=start_date, limit=10000)
-        logs = result["logs"]
+        agg = self._store.aggregate(start_date)
         
-        stats = {
+        return {
             "period_days": days,
-            "total_events": len(logs),
-            "by_category": defaultdict(int),
-            "by_action": defaultdict(int),
-            "by_severity": defaultdict(int),
-            "by_day": defaultdict(int),
-            "unique_users": set(),
-            "unique_ips": set(),
-            "high_risk_count": 0,
-            "failed_auth_count": 0
+            "total_events": agg.total,
+            "by_category": dict(agg.by_category),
+            "by_action": dict(agg.by_action),
+            "by_severity": dict(agg.by_severity),
+            "by_day": dict(agg.by_day),
+            "unique_users": len(agg.users),
+            "unique_ips": len(agg.ips),
+            "high_risk_count": agg.high_risk,
+            "failed_auth_count": agg.failed_auth
         }
-        
-        for log in logs:
-            stats["by_category"][log["category"]] += 1
-            stats["by_action"][log["action"]] += 1
-            stats["by_severity"][log["severity"]] += 1
-            
-            date_key = log["timestamp"][:10]
-            stats["by_day"][date_key] += 1
-            
-            if log["user_id"]:
-                stats["unique_users"].add(log["user_id"])
-            if log["ip_address"]:
-                stats["unique_ips"].add(log["ip_address"])
-            
-            if log["action"] == AuditAction.LOGIN_FAILED.value:
-                stats["failed_auth_count"] += 1
-            
-            try:
-                action_enum = AuditAction(log["action"])
-                if action_enum in self.HIGH_RISK_ACTIONS:
-                    stats["high_risk_count"] += 1
-            except ValueError:
-                pass
-        
-        stats["unique_users"] = len(stats["unique_users"])
-        stats["unique_ips"] = len(stats["unique_ips"])
-        stats["by_category"] = dict(stats["by_category"])
-        stats["by_action"] = dict(stats["by_action"])
-        stats["by_severity"] = dict(stats["by_severity"])
-        stats["by_day"] = dict(stats["by_day"])
-        
-        return stats
     
     async def cleanup_old_logs(
         self,
         category: Optional[AuditCategory] = None
     ) -> Dict[str, Any]:
-        """Clean up logs past retention period."""
-        deleted_count = 0
+        """Clean up logs past retention period (payloads are pruned, hashes kept)."""
         now = datetime.now(timezone.utc)
+        categories = {c.value: c for c in AuditCategory}
         
-        logs_to_keep = []
-        
-        for log in self._audit_logs:
-            log_category = log["category"]
+        def expired(log: Dict[str, Any]) -> bool:
+            if category and log["category"] != category.value:
+                return False
             retention_days = self.RETENTION_DAYS.get(
-                AuditCategory(log_category) if log_category in [c.value for c in AuditCategory] else None,
+                categories.get(log["category"]),
                 self.RETENTION_DAYS["default"]
             )
-            
             log_date = datetime.fromisoformat(log["timestamp"])
-            age_days = (now - log_date).days
-            
-            if age_days <= retention_days:
-                logs_to_keep.append(log)
-            else:
-                deleted_count += 1
+            return (now - log_date).days > retention_days
         
-        # Rebuild indexes
-        self._audit_logs = logs_to_keep
-        self._log_index = {log["id"]: i for i, log in enumerate(self._audit_logs)}
-        
-        # Rebuild user and category indexes
-        self._user_logs = defaultdict(list)
-        self._category_logs = defaultdict(list)
-        
-        for log in self._audit_logs:
-            if log["user_id"]:
-                self._user_logs[log["user_id"]].append(log["id"])
-            self._category_logs[log["category"]].append(log["id"])
+        deleted_count = self._store.prune(expired)
         
         return {
             "deleted_count": deleted_count,
-            "remaining_count": len(self._audit_logs)
+            "remaining_count": self._store.live_count()
         }
     
     async def get_security_alerts(
@@ -596,11 +448,7 @@ class AuditTrailService:
     
     def _calculate_hash(self, entry: Dict) -> str:
         """Calculate hash for log entry (excluding hash field)."""
-        data_to_hash = {
-            k: v for k, v in entry.items() if k != "hash"
-        }
-        data_string = json.dumps(data_to_hash, sort_keys=True)
-        return hashlib.sha256(data_string.encode()).hexdigest()
+        return compute_entry_hash(entry)
     
     async def _trigger_high_risk_alert(self, entry: Dict) -> None:
         """Trigger alert for high-risk actions."""
@@ -106,12 +106,13 @@ def check_email_available(email: str, exclude_user_id: int) -> bool:
     return not (result and result.get("rows"))
 
 
+# account_balance is not here: balances only move through ledger postings
 _ALLOWED_USER_COLUMNS = frozenset({
     "email", "hashed_password", "is_active", "is_verified", "email_verified",
     "name", "user_type", "role", "bio", "skills", "hourly_rate",
     "profile_image_url", "location", "profile_data",
     "two_factor_enabled", "two_factor_secret", "two_factor_backup_codes",
-    "account_balance", "phone", "company", "website", "updated_at",
+    "phone", "company", "website", "updated_at",
     # Enhanced profile fields
     "tagline", "headline", "experience_level", "years_of_experience",
     "languages", "timezone", "availability_status", "education", "certifications",
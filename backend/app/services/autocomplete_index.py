@@ -0,0 +1,555 @@
+# @AI-HINT: In-memory prefix index for search autocomplete - sorted keys, popularity weights, cached top-k per prefix
+"""
+Autocomplete Index - per-keystroke suggestions without a database round-trip.
+
+Every suggestion (open project title, freelancer name, skill, tag) is an
+entry with a popularity weight. Each entry is indexed under every word-start
+suffix of its text ("react native app" -> "react native app", "native app",
+"app"), so typing the start of any word finds it. The keys live in one sorted
+array; a prefix is a ``bisect`` range in it.
+
+- Weights follow the ``get_trending_*`` rankings in ``search_service``
+  (proposals and recency for projects, rating x reviews and completions for
+  freelancers, usage for skills and tags) plus a boost for every search
+  whose query equals the entry's text.
+- The top ``TOP_K`` entries per (prefix, type) are cached. Short prefixes
+  and any prefix spanning more than ``WARM_RANGE`` keys are precomputed at
+  load time. Any change to an entry evicts exactly the cached prefixes of
+  its keys.
+- ``AutocompleteService`` loads the four sources, then applies writes entry
+  by entry. Every ``REMOTE_POLL_SECONDS`` (sooner after a local write in
+  ``change_feed``) one request probes ``MAX(id)``, ``COUNT(*)`` and
+  ``MAX(updated_at)`` of each source table, so other workers' writes show
+  up too. For a table that gained rows or whose probe moved, only rows with
+  a newer id or ``updated_at`` are read, and only the entries they touch
+  are re-read. A delete, or a local update (which need not move
+  ``updated_at``), re-reads that source whole. Other workers' updates that
+  keep ``updated_at`` wait for the full reload every ``FULL_RELOAD_SECONDS``.
+"""
+
+import bisect
+import heapq
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.db import change_feed
+from app.db.turso_http import get_turso_http, parse_date, to_float, to_str
+
+logger = logging.getLogger(__name__)
+
+AUTOCOMPLETE_TYPES = ("project", "freelancer", "skill", "tag")
+TOP_K = 50
+HISTORY_WEIGHT = 1.0
+HISTORY_MAX = 50_000  # distinct remembered queries without a matching entry
+MAX_KEY_WORDS = 6
+CACHE_SIZE = 16384
+WARM_PREFIX_LENGTH = 2
+WARM_RANGE = 256  # keys; wider prefixes are precomputed at load
+REFRESH_MIN_SECONDS = 10
+REMOTE_POLL_SECONDS = 5
+FULL_RELOAD_SECONDS = 600
+_ID_BATCH = 500
+
+_HIGH = "\U0010ffff"
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lower-cased text with runs of whitespace collapsed."""
+    return " ".join((text or "").lower().split())
+
+
+def word_keys(text: str) -> List[str]:
+    """Word-start suffixes of normalized ``text`` (first ``MAX_KEY_WORDS`` words)."""
+    words = normalize(text).split(" ")
+    return [" ".join(words[i:]) for i in range(min(len(words), MAX_KEY_WORDS)) if words[i]]
+
+
+class _Entry:
+    __slots__ = ("kind", "id", "text", "keys", "base", "boost", "weight")
+
+    def __init__(self, kind: str, entry_id: Any, text: str, keys: List[str], base: float, boost: float):
+        self.kind = kind
+        self.id = entry_id
+        self.text = text
+        self.keys = keys
+        self.base = base
+        self.boost = boost
+        self.weight = base + boost
+
+    def as_suggestion(self) -> Dict[str, Any]:
+        return {"id": self.id, "type": self.kind, "text": self.text}
+
+
+def _rank(entry: _Entry) -> Tuple[float, str]:
+    return -entry.weight, entry.text.lower()
+
+
+class PrefixIndex:
+    """Sorted-array prefix index with weighted, cached top-k completions."""
+
+    def __init__(self, cache_size: int = CACHE_SIZE):
+        self._keys: List[str] = []
+        self._refs: List[Tuple[str, Any]] = []  # parallel to _keys
+        self._entries: Dict[Tuple[str, Any], _Entry] = {}
+        self._by_text: Dict[str, set] = defaultdict(set)
+        self._history: Dict[str, float] = defaultdict(float)
+        self._cache: "OrderedDict[str, Dict[Optional[str], List[_Entry]]]" = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, ref: Tuple[str, Any]) -> bool:
+        return ref in self._entries
+
+    def entry(self, kind: str, entry_id: Any) -> Optional[_Entry]:
+        return self._entries.get((kind, entry_id))
+
+    def ids(self, kind: str) -> set:
+        with self._lock:
+            return {entry_id for k, entry_id in self._entries if k == kind}
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def load(self, entries: Iterable[Tuple[str, Any, str, float, Iterable[str]]]) -> None:
+        """Replace everything with ``(kind, id, text, weight, texts_to_index)`` tuples."""
+        pairs = []
+        stored: Dict[Tuple[str, Any], _Entry] = {}
+        by_text: Dict[str, set] = defaultdict(set)
+        for kind, entry_id, text, weight, texts in entries:
+            keys = sorted({k for t in texts for k in word_keys(t)})
+            if not keys:
+                continue
+            ref = (kind, entry_id)
+            normalized = normalize(text)
+            stored[ref] = _Entry(kind, entry_id, text, keys, weight, self._history.get(normalized, 0.0))
+            by_text[normalized].add(ref)
+            pairs.extend((key, ref) for key in keys)
+        pairs.sort(key=lambda pair: pair[0])
+        with self._lock:
+            self._keys = [key for key, _ in pairs]
+            self._refs = [ref for _, ref in pairs]
+            self._entries = stored
+            self._by_text = by_text
+            self._cache.clear()
+            self._warm()
+
+    def upsert(self, kind: str, entry_id: Any, text: str, weight: float, texts: Iterable[str] = ()) -> None:
+        """Add or replace one entry (``texts`` default to ``[text]``)."""
+        keys = sorted({k for t in (texts or [text]) for k in word_keys(t)})
+        ref = (kind, entry_id)
+        with self._lock:
+            old = self._entries.get(ref)
+            if old is not None and old.keys == keys and old.text == text:
+                if old.base != weight:
+                    old.base = weight
+                    old.weight = weight + old.boost
+                    self._evict(keys)
+                return
+            if old is not None:
+                self._remove_locked(old)
+            if not keys:
+                return
+            normalized = normalize(text)
+            entry = _Entry(kind, entry_id, text, keys, weight, self._history.get(normalized, 0.0))
+            self._entries[ref] = entry
+            self._by_text[normalized].add(ref)
+            for key in keys:
+                i = bisect.bisect_left(self._keys, key)
+                self._keys.insert(i, key)
+                self._refs.insert(i, ref)
+            self._evict(keys)
+
+    def remove(self, kind: str, entry_id: Any) -> bool:
+        with self._lock:
+            entry = self._entries.get((kind, entry_id))
+            if entry is None:
+                return False
+            self._remove_locked(entry)
+            return True
+
+    def _remove_locked(self, entry: _Entry) -> None:
+        ref = (entry.kind, entry.id)
+        del self._entries[ref]
+        self._by_text[normalize(entry.text)].discard(ref)
+        for key in entry.keys:
+            i = bisect.bisect_left(self._keys, key)
+            while self._refs[i] != ref:  # equal keys from other entries
+                i += 1
+            del self._keys[i]
+            del self._refs[i]
+        self._evict(entry.keys)
+
+    def boost(self, text: str, amount: float = HISTORY_WEIGHT) -> None:
+        """Raise the weight of entries whose text equals ``text`` (search history)."""
+        normalized = normalize(text)
+        if not normalized:
+            return
+        with self._lock:
+            if normalized in self._history or self._by_text.get(normalized) or len(self._history) < HISTORY_MAX:
+                self._history[normalized] += amount
+            for ref in self._by_text.get(normalized, ()):
+                entry = self._entries[ref]
+                entry.boost += amount
+                entry.weight += amount
+                self._evict(entry.keys)
+
+    def _evict(self, keys: Iterable[str]) -> None:
+        cache = self._cache
+        if not cache:
+            return
+        for key in keys:
+            for length in range(1, len(key) + 1):
+                cache.pop(key[:length], None)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _top(self, lo: int, hi: int, kind: Optional[str]) -> List[_Entry]:
+        entries = self._entries
+        seen = set()
+        candidates = []
+        for ref in self._refs[lo:hi]:
+            if ref in seen or (kind is not None and ref[0] != kind):
+                continue
+            seen.add(ref)
+            candidates.append(entries[ref])
+        if len(candidates) > TOP_K:
+            return heapq.nsmallest(TOP_K, candidates, key=_rank)
+        return sorted(candidates, key=_rank)
+
+    def _warm(self) -> None:
+        # Precompute every prefix whose key range is wide enough to make a cold
+        # lookup slow (plus all short ones), descending one character at a time
+        keys = self._keys
+        stack = [(0, len(keys), 0)]
+        while stack:
+            lo, hi, length = stack.pop()
+            i = lo
+            while i < hi:
+                prefix = keys[i][:length + 1]
+                j = bisect.bisect_left(keys, prefix + _HIGH, i, hi)
+                if len(prefix) == length + 1:
+                    wide = j - i > WARM_RANGE
+                    if wide or length < WARM_PREFIX_LENGTH:
+                        self._cache[prefix] = {k: self._top(i, j, k) for k in AUTOCOMPLETE_TYPES}
+                    if wide:
+                        stack.append((i, j, length + 1))
+                i = max(j, i + 1)
+
+    def complete(self, prefix: str, kind: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """Best ``limit`` suggestions whose words start with ``prefix``."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            per_kind = self._cache.get(prefix)
+            if per_kind is not None:
+                self._cache.move_to_end(prefix)
+            else:
+                per_kind = self._cache[prefix] = {}
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+            top = per_kind.get(kind)
+            if top is None:
+                lo = bisect.bisect_left(self._keys, prefix)
+                hi = bisect.bisect_left(self._keys, prefix + _HIGH, lo)
+                top = per_kind[kind] = self._top(lo, hi, kind)
+        return [entry.as_suggestion() for entry in top[:limit]]
+
+
+# ----------------------------------------------------------------------
+# Sources: rows -> (kind, id, text, weight, texts_to_index)
+# ----------------------------------------------------------------------
+
+def _recent(value: Any, days: int, now: datetime) -> bool:
+    created = parse_date(value)
+    if not isinstance(created, datetime):
+        return False
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=timezone.utc)
+    return created > now - timedelta(days=days)
+
+
+def _project_entries(rows: List[Dict[str, Any]]):
+    # Same score as get_trending_projects: proposals * 2 + recency bonus
+    now = datetime.now(timezone.utc)
+    for row in rows:
+        title = to_str(row["title"])
+        if not title:
+            continue
+        bonus = 5 if _recent(row["created_at"], 7, now) else 2 if _recent(row["created_at"], 30, now) else 0
+        yield "project", row["id"], title, (row["proposal_count"] or 0) * 2 + bonus, [title]
+
+
+def _freelancer_entries(rows: List[Dict[str, Any]]):
+    # Same score as get_trending_freelancers
+    now = datetime.now(timezone.utc)
+    for row in rows:
+        first, last = to_str(row["first_name"]) or "", to_str(row["last_name"]) or ""
+        name = to_str(row["name"]) or f"{first} {last}".strip()
+        if not name:
+            continue
+        weight = (
+            (to_float(row["avg_rating"]) or 0) * (row["review_count"] or 0) * 0.5
+            + (row["completed"] or 0) * 3
+            + (2 if _recent(row["created_at"], 30, now) else 0)
+        )
+        yield "freelancer", row["id"], name, weight, [name, first, last]
+
+
+def _skill_entries(rows: List[Dict[str, Any]]):
+    now = datetime.now(timezone.utc)
+    for row in rows:
+        name = to_str(row["name"])
+        if name:
+            weight = (row["usage_count"] or 0) + (2 if _recent(row["created_at"], 30, now) else 0)
+            yield "skill", row["id"], name, weight, [name]
+
+
+def _tag_entries(rows: List[Dict[str, Any]]):
+    for row in rows:
+        name = to_str(row["name"])
+        if name:
+            yield "tag", row["id"], name, row["usage_count"] or 0, [name]
+
+
+# kind -> ({table: column naming the entry a row of it touches}, entry id column, SQL, build).
+# ``{scope}`` narrows the SQL to some entry ids.
+SOURCES: Dict[str, Tuple[Dict[str, str], str, str, Callable]] = {
+    "project": (
+        {"projects": "id", "proposals": "project_id"},
+        "p.id",
+        """SELECT p.id, p.title, p.created_at, COALESCE(pc.proposal_count, 0) AS proposal_count
+           FROM projects p
+           LEFT JOIN (
+               SELECT project_id, COUNT(*) AS proposal_count
+               FROM proposals WHERE status != 'withdrawn'
+               GROUP BY project_id
+           ) pc ON p.id = pc.project_id
+           WHERE p.status = 'open' {scope}""",
+        _project_entries,
+    ),
+    "freelancer": (
+        {"users": "id", "reviews": "reviewee_id", "contracts": "freelancer_id"},
+        "u.id",
+        """SELECT u.id, u.name, u.first_name, u.last_name, u.created_at,
+                  COALESCE(rv.avg_rating, 0) AS avg_rating,
+                  COALESCE(rv.review_count, 0) AS review_count,
+                  COALESCE(cc.completed, 0) AS completed
+           FROM users u
+           LEFT JOIN (
+               SELECT reviewee_id, AVG(rating) AS avg_rating, COUNT(*) AS review_count
+               FROM reviews GROUP BY reviewee_id
+           ) rv ON u.id = rv.reviewee_id
+           LEFT JOIN (
+               SELECT freelancer_id, COUNT(*) AS completed
+               FROM contracts WHERE status = 'completed'
+               GROUP BY freelancer_id
+           ) cc ON u.id = cc.freelancer_id
+           WHERE LOWER(u.user_type) = 'freelancer' AND u.is_active = 1 {scope}""",
+        _freelancer_entries,
+    ),
+    "skill": (
+        {"skills": "id", "user_skills": "skill_id"},
+        "s.id",
+        """SELECT s.id, s.name, s.created_at, COALESCE(us.usage_count, 0) AS usage_count
+           FROM skills s
+           LEFT JOIN (
+               SELECT skill_id, COUNT(*) AS usage_count FROM user_skills GROUP BY skill_id
+           ) us ON s.id = us.skill_id
+           WHERE 1 {scope}""",
+        _skill_entries,
+    ),
+    "tag": (
+        {"tags": "id"},
+        "id",
+        "SELECT id, name, usage_count FROM tags WHERE 1 {scope}",
+        _tag_entries,
+    ),
+}
+
+_TABLES = tuple(dict.fromkeys(table for touches, _, _, _ in SOURCES.values() for table in touches))
+
+
+class AutocompleteService:
+    """Keeps a ``PrefixIndex`` in step with the database."""
+
+    def __init__(self, backend_factory: Optional[Callable[[], Any]] = None):
+        self._backend_factory = backend_factory or get_turso_http
+        self.index = PrefixIndex()
+        self._feeds: Dict[str, Dict[str, tuple]] = {}
+        self._probe: Dict[str, tuple] = {}
+        self._probed_at = 0.0
+        self._checked_at: Dict[str, float] = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self._feeds)
+
+    def _entries(self, kind: str, ids: Optional[List[Any]] = None) -> List[Tuple[str, Any, str, float, List[str]]]:
+        """Entries of one source; only those with ``ids`` when given."""
+        _, id_column, sql, build = SOURCES[kind]
+        if ids is None:
+            batches: List[Tuple[str, List[Any]]] = [("", [])]
+        else:
+            batches = [
+                (f"AND {id_column} IN ({', '.join('?' for _ in batch)})", batch)
+                for batch in (ids[i:i + _ID_BATCH] for i in range(0, len(ids), _ID_BATCH))
+            ]
+        entries = []
+        for scope, params in batches:
+            result = self._backend_factory().execute(sql.format(scope=scope), params)
+            columns = result.get("columns", [])
+            entries.extend(build([dict(zip(columns, row)) for row in result.get("rows", [])]))
+        return entries
+
+    def _read_probe(self) -> Dict[str, tuple]:
+        """``{table: (max_id, row_count, max_updated_at)}`` for every source table in one request."""
+        columns = []
+        for table in _TABLES:
+            columns += [f"(SELECT MAX(id) FROM {table})", f"(SELECT COUNT(*) FROM {table})",
+                        f"(SELECT MAX(updated_at) FROM {table})"]
+        self._probed_at = time.monotonic()  # a failing probe waits for the next poll
+        row = self._backend_factory().execute("SELECT " + ", ".join(columns), [])["rows"][0]
+        return {table: tuple(row[i * 3:i * 3 + 3]) for i, table in enumerate(_TABLES)}
+
+    def load(self) -> None:
+        """Read all sources and rebuild the index."""
+        started = time.monotonic()
+        feeds = {kind: change_feed.snapshot(SOURCES[kind][0]) for kind in SOURCES}
+        probe = self._read_probe()  # before the rows: a write landing meanwhile shows next poll
+        entries = []
+        for kind in SOURCES:
+            entries.extend(self._entries(kind))
+        self.index.load(entries)
+        self._feeds = feeds
+        self._probe = probe
+        self._loaded_at = time.monotonic()
+        self._checked_at = {}
+        logger.info(
+            "autocomplete.loaded entries=%d ms=%.1f",
+            len(self.index), (time.monotonic() - started) * 1000,
+        )
+
+    def _sync(self, kind: str) -> None:
+        """Re-read one whole source and apply the differences entry by entry."""
+        fresh = self._entries(kind)
+        seen = set()
+        for _, entry_id, text, weight, texts in fresh:
+            seen.add(entry_id)
+            self.index.upsert(kind, entry_id, text, weight, texts)
+        for entry_id in self.index.ids(kind) - seen:
+            self.index.remove(kind, entry_id)
+
+    def _sync_rows(self, kind: str, tables: Iterable[str]) -> None:
+        """Re-read only the entries touched by rows of ``tables`` newer than the last probe."""
+        touches = SOURCES[kind][0]
+        ids = set()
+        for table in tables:
+            max_id, _, watermark = self._probe.get(table, (None, None, None))
+            clause, params = "id > ?", [max_id or 0]
+            if watermark:
+                clause += " OR datetime(updated_at) >= datetime(?)"
+                params.append(watermark)
+            rows = self._backend_factory().execute(
+                f"SELECT DISTINCT {touches[table]} FROM {table} WHERE {clause}", params).get("rows", [])
+            ids.update(row[0] for row in rows if row[0] is not None)
+        if not ids:
+            return
+        seen = set()
+        for _, entry_id, text, weight, texts in self._entries(kind, sorted(ids)):
+            seen.add(entry_id)
+            self.index.upsert(kind, entry_id, text, weight, texts)
+        for entry_id in ids - seen:  # closed, deactivated or renamed to nothing
+            self.index.remove(kind, entry_id)
+
+    def _moved(self, probe: Dict[str, tuple]) -> Tuple[set, set]:
+        """Tables whose probe moved since the last one, and those of them that lost rows."""
+        moved, deleted = set(), set()
+        for table, (max_id, count, watermark) in probe.items():
+            before = self._probe.get(table)
+            if before is None or before == (max_id, count, watermark):
+                continue
+            moved.add(table)
+            added_ids = (max_id or 0) - (before[0] or 0)
+            if (count or 0) - (before[1] or 0) < added_ids or added_ids < 0:
+                deleted.add(table)
+        return moved, deleted
+
+    def ensure_fresh(self) -> bool:
+        """Apply pending writes (throttled); False if the index cannot serve."""
+        now = time.monotonic()
+        if not self.loaded:
+            return False
+        if not self._lock.acquire(blocking=False):
+            return True
+        try:
+            if now - self._loaded_at > FULL_RELOAD_SECONDS:
+                self.load()
+                return True
+            feeds = {}
+            for kind, (tables, _, _, _) in SOURCES.items():
+                if now - self._checked_at.get(kind, 0.0) < REFRESH_MIN_SECONDS:
+                    continue
+                feed = change_feed.snapshot(tables)
+                if feed != self._feeds.get(kind):
+                    feeds[kind] = feed
+            if not feeds and now - self._probed_at < REMOTE_POLL_SECONDS:
+                return True
+
+            # Other workers' writes only show in the tables themselves
+            probe = self._read_probe()
+            moved, deleted = self._moved(probe)
+            for kind, (tables, _, _, _) in SOURCES.items():
+                feed = feeds.get(kind)
+                local = {t for t in tables if feed is not None and feed[t] != self._feeds[kind][t]}
+                if not local and not moved.intersection(tables):
+                    continue
+                self._checked_at[kind] = now
+                # Deletes leave no row to find, and local updates need not move updated_at;
+                # inserts (local or not) and other workers' updates are found by watermark
+                rewritten = any(feed[t][1:] != self._feeds[kind][t][1:] for t in local)
+                if rewritten or deleted.intersection(tables):
+                    self._sync(kind)
+                else:
+                    self._sync_rows(kind, (moved | local).intersection(tables))
+                if feed is not None:
+                    self._feeds[kind] = feed
+            self._probe = probe
+        except Exception as e:
+            logger.warning(f"autocomplete.refresh_failed: {e}")
+        finally:
+            self._lock.release()
+        return True
+
+    def suggest(self, query: str, kind: Optional[str] = None, limit: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """Suggestions grouped by type (project, freelancer, skill, tag), or ``None`` if not loaded."""
+        if not self.ensure_fresh():
+            return None
+        suggestions: List[Dict[str, Any]] = []
+        for k in ((kind,) if kind else AUTOCOMPLETE_TYPES):
+            suggestions.extend(self.index.complete(query, k, limit))
+        return suggestions[:limit]
+
+    def record_search(self, query: Optional[str]) -> None:
+        """Count a submitted search towards the popularity of matching entries."""
+        if query:
+            self.index.boost(query)
+
+
+autocomplete_service = AutocompleteService()
+
+
+def load_autocomplete() -> None:
+    autocomplete_service.load()
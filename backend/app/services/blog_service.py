@@ -3,32 +3,37 @@ import json
 from typing import List, Optional
 from datetime import datetime, timezone
 
+from app.db.schema_registry import ensure_schema, register_schema
 from app.db.turso_http import execute_query, parse_rows
 from app.schemas.blog import BlogPostCreate, BlogPostUpdate, BlogPostInDB
 
 BLOG_COLUMNS = "id, title, slug, excerpt, content, image_url, author, tags, is_published, is_news_trend, views, reading_time, created_at, updated_at"
 
 
+BLOG_DDL = [
+    """CREATE TABLE IF NOT EXISTS blog_posts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        slug TEXT UNIQUE NOT NULL,
+        excerpt TEXT NOT NULL,
+        content TEXT NOT NULL,
+        image_url TEXT,
+        author TEXT NOT NULL,
+        tags TEXT DEFAULT '[]',
+        is_published INTEGER DEFAULT 0,
+        is_news_trend INTEGER DEFAULT 0,
+        views INTEGER DEFAULT 0,
+        reading_time INTEGER DEFAULT 0,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    )""",
+]
+register_schema("blog", BLOG_DDL)
+
+
 def ensure_blog_table():
-    """Create blog_posts table if it doesn't exist."""
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS blog_posts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            slug TEXT UNIQUE NOT NULL,
-            excerpt TEXT NOT NULL,
-            content TEXT NOT NULL,
-            image_url TEXT,
-            author TEXT NOT NULL,
-            tags TEXT DEFAULT '[]',
-            is_published INTEGER DEFAULT 0,
-            is_news_trend INTEGER DEFAULT 0,
-            views INTEGER DEFAULT 0,
-            reading_time INTEGER DEFAULT 0,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL
-        )
-    """, [])
+    """Create blog_posts table if this process has not yet (bootstrapped at startup)."""
+    ensure_schema("blog")
 
 
 def _row_to_post(row: dict) -> BlogPostInDB:
@@ -0,0 +1,345 @@
+# @AI-HINT: Chunked bulk-operation engine - set-based UPDATE ... WHERE id IN (...) per chunk, bounded parallelism, persisted progress
+"""
+Bulk Executor - runs admin bulk operations as set-based SQL.
+
+Item ids are deduplicated and split into chunks of ``chunk_size``. Each chunk
+is one ``execute_many`` batch holding a single set-based statement
+(``UPDATE projects SET ... WHERE id IN (?, ?, ...) RETURNING id``), so 100k
+items cost a few hundred round-trips instead of 100k. Up to ``parallelism``
+chunks are in flight at once; the synchronous backend calls run in worker
+threads.
+
+Operation state lives in ``bulk_operations`` (counters only) and per-item
+failures in ``bulk_operation_failures``; succeeded items are never held in
+memory. An id missing from the ``RETURNING`` rows is recorded as failed (not
+found, or not eligible for the transition); a chunk whose statement errors
+fails as a whole.
+
+The progress write after each chunk is conditional on the operation still
+being ``processing``, so a cancel (from any process) stops the run before
+its next chunk. Chunks already in flight finish.
+"""
+
+import asyncio
+import logging
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from app.db.schema_registry import ensure_schema, register_schema
+from app.db.turso_http import ResultSet, get_turso_http
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_PARALLELISM = 4
+_FAILED_ITEMS_LIMIT = 100
+
+BULK_DDL = [
+    """CREATE TABLE IF NOT EXISTS bulk_operations (
+        id TEXT PRIMARY KEY,
+        type TEXT NOT NULL,
+        operation TEXT NOT NULL,
+        status TEXT NOT NULL,
+        item_count INTEGER NOT NULL,
+        processed INTEGER NOT NULL DEFAULT 0,
+        succeeded INTEGER NOT NULL DEFAULT 0,
+        failed INTEGER NOT NULL DEFAULT 0,
+        created_by TEXT,
+        created_at TEXT NOT NULL,
+        started_at TEXT,
+        completed_at TEXT,
+        cancelled_at TEXT,
+        updated_at TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_bulk_operations_created ON bulk_operations(created_by, created_at)",
+    """CREATE TABLE IF NOT EXISTS bulk_operation_failures (
+        operation_id TEXT NOT NULL,
+        item_id TEXT NOT NULL,
+        error TEXT,
+        PRIMARY KEY (operation_id, item_id)
+    )""",
+]
+register_schema("bulk_operations", BULK_DDL)
+
+_OPERATION_COLUMNS = (
+    "id, type, operation, status, item_count, processed, succeeded, failed, "
+    "created_by, created_at, started_at, completed_at, cancelled_at"
+)
+
+
+class BulkAction(NamedTuple):
+    """
+    One set-based statement template.
+
+    ``sql`` ends with ``IN ({ids})`` (the chunk's ids are bound last) and
+    returns the ids it touched. ``args`` name the leading ``?`` values:
+    ``"now"`` is the batch timestamp, anything else comes from the request
+    params.
+    """
+    sql: str
+    args: Tuple[str, ...] = ("now",)
+
+    @property
+    def required_params(self) -> List[str]:
+        return [a for a in self.args if a != "now"]
+
+    def statement(self, ids: Sequence[str], params: Dict[str, Any], now: str) -> Dict[str, Any]:
+        values = [now if a == "now" else params[a] for a in self.args]
+        return {
+            "q": self.sql.format(ids=", ".join("?" * len(ids))),
+            "params": values + list(ids),
+        }
+
+
+BULK_ACTIONS: Dict[Tuple[str, str], BulkAction] = {
+    ("project_operation", "archive"): BulkAction(
+        "UPDATE projects SET status = 'archived', updated_at = ? WHERE id IN ({ids}) RETURNING id"),
+    ("project_operation", "unarchive"): BulkAction(
+        "UPDATE projects SET status = 'open', updated_at = ? "
+        "WHERE status = 'archived' AND id IN ({ids}) RETURNING id"),
+    ("project_operation", "delete"): BulkAction(
+        "DELETE FROM projects WHERE id IN ({ids}) RETURNING id", ()),
+    ("project_operation", "update_status"): BulkAction(
+        "UPDATE projects SET status = ?, updated_at = ? WHERE id IN ({ids}) RETURNING id", ("status", "now")),
+    ("project_operation", "update_category"): BulkAction(
+        "UPDATE projects SET category = ?, updated_at = ? WHERE id IN ({ids}) RETURNING id", ("category", "now")),
+    ("user_operation", "activate"): BulkAction(
+        "UPDATE users SET is_active = 1, updated_at = ? WHERE id IN ({ids}) RETURNING id"),
+    ("user_operation", "suspend"): BulkAction(
+        "UPDATE users SET is_active = 0, updated_at = ? WHERE id IN ({ids}) RETURNING id"),
+    ("user_operation", "update_role"): BulkAction(
+        "UPDATE users SET role = ?, updated_at = ? WHERE id IN ({ids}) RETURNING id", ("role", "now")),
+    ("user_operation", "send_message"): BulkAction(
+        "INSERT INTO notifications (user_id, notification_type, title, content, is_read, created_at, priority) "
+        "SELECT id, 'admin_message', ?, ?, 0, ?, 'normal' FROM users WHERE id IN ({ids}) RETURNING user_id",
+        ("title", "message", "now")),
+    ("payment_operation", "process"): BulkAction(
+        "UPDATE payments SET status = 'processing', updated_at = ? "
+        "WHERE status = 'pending' AND id IN ({ids}) RETURNING id"),
+    ("payment_operation", "refund"): BulkAction(
+        "UPDATE payments SET status = 'refund_pending', updated_at = ? "
+        "WHERE status = 'completed' AND id IN ({ids}) RETURNING id"),
+    ("payment_operation", "cancel"): BulkAction(
+        "UPDATE payments SET status = 'cancelled', updated_at = ? "
+        "WHERE status IN ('pending', 'processing') AND id IN ({ids}) RETURNING id"),
+    ("payment_operation", "mark_complete"): BulkAction(
+        "UPDATE payments SET status = 'completed', processed_at = ?, updated_at = ? "
+        "WHERE status IN ('pending', 'processing') AND id IN ({ids}) RETURNING id", ("now", "now")),
+}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _record(row) -> Dict[str, Any]:
+    total = row["item_count"] or 0
+    processed = row["processed"] or 0
+    record = {
+        "id": row["id"],
+        "type": row["type"],
+        "operation": row["operation"],
+        "item_count": total,
+        "status": row["status"],
+        "progress": {
+            "processed": processed,
+            "total": total,
+            "percentage": round(processed / total * 100, 1) if total else 0,
+        },
+        "results": {"succeeded": row["succeeded"] or 0, "failed": row["failed"] or 0},
+        "created_by": row["created_by"],
+        "created_at": row["created_at"],
+    }
+    for key in ("started_at", "completed_at", "cancelled_at"):
+        if row[key]:
+            record[key] = row[key]
+    return record
+
+
+class BulkExecutor:
+    """
+    Creates, runs, tracks and cancels bulk operations.
+
+    The backend only needs TursoHTTP's ``execute``/``execute_many``.
+    """
+
+    def __init__(
+        self,
+        backend_factory: Optional[Callable[[], Any]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        parallelism: int = DEFAULT_PARALLELISM,
+    ):
+        self._backend_factory = backend_factory or get_turso_http
+        self.chunk_size = chunk_size
+        self.parallelism = parallelism
+        self._cancelled: Set[str] = set()
+
+    def ensure_tables(self) -> None:
+        ensure_schema("bulk_operations", backend=self._backend_factory())
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def create(self, op_type: str, operation: str, item_count: int, created_by: Optional[str]) -> Dict[str, Any]:
+        """Persist a queued operation and return its record."""
+        if (op_type, operation) not in BULK_ACTIONS:
+            raise ValueError(f"Unsupported bulk operation: {op_type}/{operation}")
+        self.ensure_tables()
+        operation_id = str(uuid.uuid4())
+        now = _now()
+        self._backend_factory().execute_many([{
+            "q": "INSERT INTO bulk_operations (id, type, operation, status, item_count, created_by, created_at, updated_at) "
+                 "VALUES (?, ?, ?, 'queued', ?, ?, ?, ?)",
+            "params": [operation_id, op_type, operation, item_count, created_by, now, now],
+        }])
+        return self.get(operation_id)
+
+    async def run(self, operation_id: str, items: Sequence[Any], params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Execute a queued operation chunk by chunk; returns the final record."""
+        operation = self.get(operation_id)
+        if operation is None:
+            return None
+        action = BULK_ACTIONS[(operation["type"], operation["operation"])]
+        params = params or {}
+
+        started = self._backend_factory().execute_many([{
+            "q": "UPDATE bulk_operations SET status = 'processing', started_at = ?, updated_at = ? "
+                 "WHERE id = ? AND status = 'queued' RETURNING id",
+            "params": [_now(), _now(), operation_id],
+        }])
+        if not started[0]["rows"]:
+            self._cancelled.discard(operation_id)
+            return self.get(operation_id)  # cancelled before it started
+
+        ids = list(dict.fromkeys(str(i) for i in items))
+        chunks = iter([ids[i:i + self.chunk_size] for i in range(0, len(ids), self.chunk_size)])
+
+        async def worker():
+            for chunk in chunks:
+                if operation_id in self._cancelled:
+                    return
+                if not await asyncio.to_thread(self._run_chunk, operation_id, action, chunk, params):
+                    self._cancelled.add(operation_id)
+                    return
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(1, self.parallelism))))
+            self._backend_factory().execute_many([{
+                "q": "UPDATE bulk_operations SET status = 'completed', completed_at = ?, updated_at = ? "
+                     "WHERE id = ? AND status = 'processing'",
+                "params": [_now(), _now(), operation_id],
+            }])
+        except Exception as e:
+            logger.error(f"bulk.run_failed operation={operation_id} error={e}")
+            self._backend_factory().execute_many([{
+                "q": "UPDATE bulk_operations SET status = 'failed', completed_at = ?, updated_at = ? "
+                     "WHERE id = ? AND status = 'processing'",
+                "params": [_now(), _now(), operation_id],
+            }])
+        finally:
+            self._cancelled.discard(operation_id)
+        return self.get(operation_id)
+
+    def _run_chunk(self, operation_id: str, action: BulkAction, chunk: List[str], params: Dict[str, Any]) -> bool:
+        """Apply one chunk and record its progress; False once the operation is no longer processing."""
+        backend = self._backend_factory()
+        now = _now()
+        try:
+            result = backend.execute_many([action.statement(chunk, params, now)])
+            touched = {str(row[0]) for row in result[0]["rows"]}
+            error = "not found or not eligible"
+        except Exception as e:
+            touched = set()
+            error = str(e)[:500]
+        failed = [item for item in chunk if item not in touched]
+
+        statements = [{
+            "q": "UPDATE bulk_operations SET processed = processed + ?, succeeded = succeeded + ?, "
+                 "failed = failed + ?, updated_at = ? WHERE id = ? AND status = 'processing' RETURNING id",
+            "params": [len(chunk), len(chunk) - len(failed), len(failed), now, operation_id],
+        }]
+        if failed:
+            statements.append({
+                "q": "INSERT OR IGNORE INTO bulk_operation_failures (operation_id, item_id, error) VALUES "
+                     + ", ".join("(?, ?, ?)" for _ in failed),
+                "params": [value for item in failed for value in (operation_id, item, error)],
+            })
+        progress = backend.execute_many(statements)
+        return bool(progress[0]["rows"])
+
+    def cancel(self, operation_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a queued or running operation; None if it is not cancellable."""
+        self.ensure_tables()
+        now = _now()
+        result = self._backend_factory().execute_many([{
+            "q": "UPDATE bulk_operations SET status = 'cancelled', cancelled_at = ?, updated_at = ? "
+                 "WHERE id = ? AND status IN ('queued', 'processing') RETURNING id",
+            "params": [now, now, operation_id],
+        }])
+        if not result[0]["rows"]:
+            return None
+        self._cancelled.add(operation_id)
+        return self.get(operation_id)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, operation_id: str, with_failures: bool = False) -> Optional[Dict[str, Any]]:
+        self.ensure_tables()
+        backend = self._backend_factory()
+        row = ResultSet.from_result(backend.execute(
+            f"SELECT {_OPERATION_COLUMNS} FROM bulk_operations WHERE id = ?", [operation_id]
+        )).first()
+        if row is None:
+            return None
+        record = _record(row)
+        if with_failures and record["results"]["failed"]:
+            failures = ResultSet.from_result(backend.execute(
+                "SELECT item_id, error FROM bulk_operation_failures WHERE operation_id = ? LIMIT ?",
+                [operation_id, _FAILED_ITEMS_LIMIT],
+            ))
+            record["results"]["failed_items"] = [{"id": r["item_id"], "error": r["error"]} for r in failures]
+        return record
+
+    def list(
+        self,
+        created_by: Optional[str] = None,
+        status: Optional[str] = None,
+        op_type: Optional[str] = None,
+        limit: int = 20,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Newest operations matching the filters, plus the total match count."""
+        self.ensure_tables()
+        where, params = [], []
+        for column, value in (("created_by", created_by), ("status", status), ("type", op_type)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+        backend = self._backend_factory()
+        total = ResultSet.from_result(backend.execute(
+            f"SELECT COUNT(*) FROM bulk_operations{clause}", params
+        )).scalar(0)
+        rows = ResultSet.from_result(backend.execute(
+            f"SELECT {_OPERATION_COLUMNS} FROM bulk_operations{clause} ORDER BY created_at DESC LIMIT ?",
+            params + [limit],
+        ))
+        return [_record(row) for row in rows], int(total or 0)
+
+
+_executor: Optional[BulkExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_bulk_executor() -> BulkExecutor:
+    """Get or create the process-wide bulk executor."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = BulkExecutor()
+    return _executor
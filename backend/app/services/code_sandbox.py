@@ -0,0 +1,415 @@
+# @AI-HINT: Warm pool of isolated Python sandbox workers for coding questions - parses test cases, runs them under per-test timeouts, compares outputs outside the sandbox
+"""
+Code Sandbox - runs candidate Python against a question's test cases.
+
+``SandboxPool`` keeps up to ``size`` worker processes
+(``sandbox_worker.py``) started ahead of time. Each worker already has the
+stdlib imported. It has no environment, no site packages and no network.
+The worker forks a fresh child for every submission. The child runs under
+rlimits and a seccomp syscall allow-list (see the worker docstring), so a
+submission costs one fork rather than an interpreter start. A worker is
+replaced after ``max_runs`` submissions, or as soon as it misbehaves.
+
+Test cases come from the question bank. They are turned into calls here:
+
+- ``{"input": [args...], "expected": value}`` calls the entry point with
+  ``args``.
+- ``{"input": ["LRUCache(2)", "put(1,1)", "get(1)"], "expected": [...]}``
+  constructs the class, then calls the methods. Outputs are
+  ``[None, <each method's return>]``.
+- ``{"manual": true}`` cannot be auto-graded.
+
+Only calls go to the sandbox, never expected values. Outputs are compared
+here, so a submission cannot report its own verdict. Tests that cannot
+run safely, for example when seccomp is unavailable and
+``require_seccomp`` is set, are flagged for manual review as before.
+"""
+
+import ast
+import json
+import logging
+import math
+import os
+import queue
+import re
+import select
+import struct
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sandbox_worker.py")
+MAX_CODE_BYTES = 64 * 1024
+MAX_TESTS = 50
+SPAWN_TIMEOUT_SECONDS = 10.0
+ACQUIRE_TIMEOUT_SECONDS = 30.0
+DEADLINE_GRACE_SECONDS = 0.5
+_HEADER = struct.Struct(">I")
+_ENTRY_POINT = re.compile(r"^(?:def|class)\s+([A-Za-z_]\w*)", re.MULTILINE)
+
+
+class SandboxError(RuntimeError):
+    """A worker died, timed out on the protocol, or could not be started."""
+
+
+class SandboxUnavailable(SandboxError):
+    """The sandbox is disabled or cannot isolate submissions on this host."""
+
+
+# ---------------------------------------------------------------------------
+# Test case parsing
+# ---------------------------------------------------------------------------
+
+def entry_point_for(question: Dict[str, Any], code: str = "") -> Optional[str]:
+    """Name the tests call: ``entry_point``, else the first def/class of the starter (or submitted) code."""
+    if question.get("entry_point"):
+        return question["entry_point"]
+    for source in (question.get("starter_code") or "", code):
+        match = _ENTRY_POINT.search(source)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _parse_call(text: str) -> Dict[str, Any]:
+    node = ast.parse(text.strip(), mode="eval").body
+    if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Name) or node.keywords:
+        raise ValueError(f"not a plain call: {text!r}")
+    return {"method": node.func.id, "args": [ast.literal_eval(arg) for arg in node.args]}
+
+
+def parse_test_case(test: Dict[str, Any], entry_point: str) -> Optional[Dict[str, Any]]:
+    """The call a test case makes, or None when it needs manual review."""
+    if test.get("manual") or "expected" not in test:
+        return None
+    args = test.get("input", [])
+    if not isinstance(args, list):
+        args = [args]
+    if args and all(isinstance(a, str) for a in args) and args[0].startswith(f"{entry_point}("):
+        operations = [_parse_call(a) for a in args]
+        if operations[0]["method"] != entry_point:
+            raise ValueError(f"operations must start with {entry_point}(...)")
+        return {"operations": operations}
+    return {"args": args}
+
+
+def _normalized(value: Any) -> Any:
+    if isinstance(value, tuple):
+        return [_normalized(v) for v in value]
+    if isinstance(value, list):
+        return [_normalized(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _normalized(v) for k, v in value.items()}
+    return value
+
+
+def outputs_match(output: Any, expected: Any) -> bool:
+    """Structural equality; floats within 1e-9 relative, bools never equal to ints."""
+    if isinstance(expected, bool) or isinstance(output, bool):
+        return type(output) is type(expected) and output == expected
+    if isinstance(expected, float) or isinstance(output, float):
+        return (isinstance(output, (int, float)) and isinstance(expected, (int, float))
+                and math.isclose(output, expected, rel_tol=1e-9, abs_tol=1e-12))
+    if isinstance(expected, list):
+        return (isinstance(output, list) and len(output) == len(expected)
+                and all(outputs_match(o, e) for o, e in zip(output, expected)))
+    if isinstance(expected, dict):
+        return (isinstance(output, dict) and output.keys() == expected.keys()
+                and all(outputs_match(output[k], expected[k]) for k in expected))
+    return type(output) is type(expected) and output == expected
+
+
+def manual_review_result(test_cases: List[Dict], note: str) -> Dict[str, Any]:
+    return {
+        "all_passed": False,
+        "results": [{"test_id": i, "passed": None, "manual_review": True} for i in range(len(test_cases))],
+        "total_tests": len(test_cases),
+        "passed_count": 0,
+        "manual_review_required": True,
+        "note": note,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Worker process
+# ---------------------------------------------------------------------------
+
+class SandboxWorker:
+    """One warm ``sandbox_worker.py`` process and its framed stdin/stdout protocol."""
+
+    def __init__(self):
+        self.runs = 0
+        self.process = subprocess.Popen(
+            [sys.executable, "-I", "-S", WORKER_SCRIPT],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            env={}, cwd="/", bufsize=0, close_fds=True, start_new_session=True,
+        )
+        self._buffer = b""
+        try:
+            hello = self._read_frame(time.monotonic() + SPAWN_TIMEOUT_SECONDS)
+        except SandboxError:
+            self.close()
+            raise
+        self.pid = hello["pid"]
+        self.isolation: Dict[str, bool] = hello["isolation"]
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def run(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one submission and wait for the worker's report (its own deadline plus grace)."""
+        data = json.dumps(request, separators=(",", ":")).encode()
+        try:
+            self.process.stdin.write(_HEADER.pack(len(data)) + data)
+        except OSError as e:
+            raise SandboxError(f"worker stdin closed: {e}")
+        self.runs += 1
+        deadline = time.monotonic() + request["limits"]["deadline_seconds"] + SPAWN_TIMEOUT_SECONDS
+        return self._read_frame(deadline)
+
+    def _read_frame(self, deadline: float) -> Dict[str, Any]:
+        fd = self.process.stdout.fileno()
+        while True:
+            if len(self._buffer) >= _HEADER.size:
+                (length,) = _HEADER.unpack_from(self._buffer)
+                end = _HEADER.size + length
+                if len(self._buffer) >= end:
+                    frame = json.loads(self._buffer[_HEADER.size:end])
+                    self._buffer = self._buffer[end:]
+                    return frame
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise SandboxError("worker did not answer in time")
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if ready:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    raise SandboxError(f"worker exited with {self.process.poll()}")
+                self._buffer += chunk
+
+    def close(self) -> None:
+        if self.alive:
+            self.process.kill()
+        self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+# ---------------------------------------------------------------------------
+# Pool
+# ---------------------------------------------------------------------------
+
+class SandboxPool:
+    """Bounded set of warm workers shared by all grading threads."""
+
+    def __init__(self, size: Optional[int] = None, max_runs: int = 200, timeout_seconds: float = 2.0,
+                 memory_mb: int = 256, require_seccomp: bool = True, enabled: bool = True):
+        self.size = size or os.cpu_count() or 1
+        self.max_runs = max_runs
+        self.timeout_seconds = timeout_seconds
+        self.memory_mb = memory_mb
+        self.require_seccomp = require_seccomp
+        self.enabled = enabled
+        self.isolation: Optional[Dict[str, bool]] = None
+        self.stats = {"submissions": 0, "spawned": 0, "recycled": 0, "failed": 0}
+        self._idle: "queue.Queue[SandboxWorker]" = queue.Queue()
+        self._started = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    # -- workers ------------------------------------------------------------
+
+    def _spawn(self) -> SandboxWorker:
+        worker = SandboxWorker()
+        with self._lock:
+            self.stats["spawned"] += 1
+            if self.isolation is None:
+                self.isolation = worker.isolation
+                logger.info(f"code_sandbox.isolation {worker.isolation}")
+        if self.require_seccomp and not worker.isolation.get("seccomp"):
+            worker.close()
+            self.enabled = False
+            raise SandboxUnavailable("seccomp filter is not supported on this host")
+        return worker
+
+    def _reserve(self) -> bool:
+        with self._lock:
+            if self._closed or self._started >= self.size:
+                return False
+            self._started += 1
+            return True
+
+    def _unreserve(self) -> None:
+        with self._lock:
+            self._started -= 1
+
+    def _spawn_idle(self) -> None:
+        try:
+            self._idle.put(self._spawn())
+        except Exception as e:
+            self._unreserve()
+            logger.warning(f"code_sandbox.spawn_failed: {e}")
+
+    def warm_up(self) -> int:
+        """Start every worker now instead of on first use; returns how many are idle."""
+        while self.enabled and self._reserve():
+            self._spawn_idle()
+        return self._idle.qsize()
+
+    def _acquire(self) -> SandboxWorker:
+        if not self.enabled:
+            raise SandboxUnavailable("code sandbox is disabled")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        if self._reserve():
+            try:
+                return self._spawn()
+            except Exception:
+                self._unreserve()
+                raise
+        try:
+            return self._idle.get(timeout=ACQUIRE_TIMEOUT_SECONDS)
+        except queue.Empty:
+            raise SandboxError("no sandbox worker became free")
+
+    def _release(self, worker: SandboxWorker, healthy: bool) -> None:
+        if healthy and worker.alive and worker.runs < self.max_runs and not self._closed:
+            self._idle.put(worker)
+            return
+        worker.close()
+        with self._lock:
+            self.stats["recycled" if healthy else "failed"] += 1
+            self._started -= 1
+        # Replace it off the request path so the pool stays warm
+        if self._reserve():
+            threading.Thread(target=self._spawn_idle, name="code-sandbox-spawn", daemon=True).start()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    # -- submissions --------------------------------------------------------
+
+    def run(self, code: str, entry_point: str, tests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run parsed calls in one sandboxed child; the worker's raw report."""
+        request = {
+            "code": code,
+            "entry_point": entry_point,
+            "tests": tests,
+            "limits": {
+                "timeout_seconds": self.timeout_seconds,
+                "deadline_seconds": self.timeout_seconds * (len(tests) + 1) + DEADLINE_GRACE_SECONDS,
+                "cpu_seconds": math.ceil(self.timeout_seconds * (len(tests) + 1)) + 1,
+                "memory_mb": self.memory_mb,
+            },
+        }
+        worker = self._acquire()
+        healthy = False
+        try:
+            report = worker.run(request)
+            healthy = True
+            return report
+        finally:
+            with self._lock:
+                self.stats["submissions"] += 1
+            self._release(worker, healthy)
+
+    def execute_python(self, code: str, test_cases: List[Dict], entry_point: Optional[str] = None) -> Dict[str, Any]:
+        """Grade ``code`` against question test cases (result shape of ``CodeExecutor``)."""
+        if not isinstance(code, str) or not code.strip():
+            return self._graded(test_cases, {}, [], "No code submitted")
+        if len(code.encode()) > MAX_CODE_BYTES or len(test_cases) > MAX_TESTS:
+            return self._graded(test_cases, {}, [], "Submission too large")
+        entry_point = entry_point or entry_point_for({}, code)
+        if not entry_point:
+            return manual_review_result(test_cases, "No function or class to call. Submitted for manual review.")
+        try:
+            calls = [parse_test_case(test, entry_point) for test in test_cases]
+        except (ValueError, SyntaxError) as e:
+            logger.warning(f"code_sandbox.unparseable_test_case entry_point={entry_point}: {e}")
+            return manual_review_result(test_cases, "Test cases need manual review.")
+        if any(call is None for call in calls):
+            return manual_review_result(test_cases, "Some tests need manual review.")
+        try:
+            report = self.run(code, entry_point, calls)
+        except SandboxUnavailable as e:
+            return manual_review_result(test_cases, f"Code execution unavailable ({e}). Submitted for manual review.")
+        except SandboxError as e:
+            logger.error(f"code_sandbox.run_failed: {e}")
+            return manual_review_result(test_cases, "Code execution failed. Submitted for manual review.")
+
+        frames = {f.get("test"): f for f in report["frames"] if isinstance(f, dict)}
+        setup_error = next((f["setup_error"] for f in report["frames"] if isinstance(f, dict) and "setup_error" in f), None)
+        if setup_error:
+            return self._graded(test_cases, report, [], setup_error)
+        # Tests without a frame never finished: killed at the deadline or the child died
+        missing = "timeout" if report.get("killed") or report.get("signal") == "SIGXCPU" else "crashed"
+        results = []
+        for index, test in enumerate(test_cases):
+            frame = frames.get(index)
+            if not isinstance(frame, dict):
+                results.append({"test_id": index, "passed": False, "status": missing})
+                continue
+            result = {"test_id": index, "status": frame.get("status"), "ms": frame.get("ms")}
+            if result["status"] == "ok":
+                result["passed"] = outputs_match(frame.get("output"), _normalized(test["expected"]))
+                result["status"] = "passed" if result["passed"] else "wrong_answer"
+            else:
+                result["passed"] = False
+                if frame.get("error"):
+                    result["error"] = str(frame["error"])[:500]
+            results.append(result)
+        return self._graded(test_cases, report, results, None)
+
+    @staticmethod
+    def _graded(test_cases, report, results, error) -> Dict[str, Any]:
+        if error is not None:
+            results = [{"test_id": i, "passed": False, "status": "error", "error": error[:500]}
+                       for i in range(len(test_cases))]
+        passed = sum(1 for r in results if r["passed"])
+        return {
+            "all_passed": bool(results) and passed == len(results),
+            "results": results,
+            "total_tests": len(test_cases),
+            "passed_count": passed,
+            "manual_review_required": False,
+            "ms": report.get("ms"),
+        }
+
+
+_pool: Optional[SandboxPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_sandbox_pool() -> SandboxPool:
+    """Get or create the process-wide sandbox pool from settings."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                from app.core.config import get_settings
+                settings = get_settings()
+                _pool = SandboxPool(
+                    size=settings.code_sandbox_workers,
+                    max_runs=settings.code_sandbox_max_runs,
+                    timeout_seconds=settings.code_sandbox_timeout_seconds,
+                    memory_mb=settings.code_sandbox_memory_mb,
+                    require_seccomp=settings.code_sandbox_require_seccomp,
+                    enabled=settings.code_sandbox_enabled,
+                )
+    return _pool
@@ -6,6 +6,7 @@ from typing import Optional, List
 import json
 import logging
 
+from app.db.schema_registry import ensure_schema, register_schema
 from app.db.turso_http import execute_query
 from app.services.db_utils import get_val as _get_val
 
@@ -139,109 +140,98 @@ def _row_to_office_hours_detail(row: list) -> dict:
 
 # ==================== Table Initialization ====================
 
-def ensure_community_tables():
-    """Create community tables if they don't exist."""
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS community_questions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            title TEXT NOT NULL,
-            content TEXT NOT NULL,
-            tags TEXT,
-            category TEXT,
-            status TEXT DEFAULT 'open',
-            view_count INTEGER DEFAULT 0,
-            upvotes INTEGER DEFAULT 0,
-            downvotes INTEGER DEFAULT 0,
-            answer_count INTEGER DEFAULT 0,
-            accepted_answer_id INTEGER,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    """, [])
+COMMUNITY_DDL = [
+    """CREATE TABLE IF NOT EXISTS community_questions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        tags TEXT,
+        category TEXT,
+        status TEXT DEFAULT 'open',
+        view_count INTEGER DEFAULT 0,
+        upvotes INTEGER DEFAULT 0,
+        downvotes INTEGER DEFAULT 0,
+        answer_count INTEGER DEFAULT 0,
+        accepted_answer_id INTEGER,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS community_answers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        question_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        content TEXT NOT NULL,
+        upvotes INTEGER DEFAULT 0,
+        downvotes INTEGER DEFAULT 0,
+        is_accepted INTEGER DEFAULT 0,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        FOREIGN KEY (question_id) REFERENCES community_questions(id),
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS community_votes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        target_type TEXT NOT NULL,
+        target_id INTEGER NOT NULL,
+        vote_type TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        UNIQUE(user_id, target_type, target_id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS community_playbooks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        author_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        description TEXT NOT NULL,
+        content TEXT NOT NULL,
+        category TEXT NOT NULL,
+        tags TEXT,
+        difficulty_level TEXT DEFAULT 'intermediate',
+        status TEXT DEFAULT 'draft',
+        view_count INTEGER DEFAULT 0,
+        like_count INTEGER DEFAULT 0,
+        bookmark_count INTEGER DEFAULT 0,
+        published_at TEXT,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        FOREIGN KEY (author_id) REFERENCES users(id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS community_office_hours (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        host_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        description TEXT NOT NULL,
+        scheduled_at TEXT NOT NULL,
+        duration_minutes INTEGER DEFAULT 60,
+        max_attendees INTEGER DEFAULT 50,
+        category TEXT,
+        status TEXT DEFAULT 'scheduled',
+        is_public INTEGER DEFAULT 1,
+        recording_url TEXT,
+        attendee_count INTEGER DEFAULT 0,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        FOREIGN KEY (host_id) REFERENCES users(id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS community_oh_registrations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        office_hours_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        registered_at TEXT NOT NULL,
+        attended INTEGER DEFAULT 0,
+        UNIQUE(office_hours_id, user_id),
+        FOREIGN KEY (office_hours_id) REFERENCES community_office_hours(id),
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )""",
+]
+register_schema("community", COMMUNITY_DDL)
 
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS community_answers (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            question_id INTEGER NOT NULL,
-            user_id INTEGER NOT NULL,
-            content TEXT NOT NULL,
-            upvotes INTEGER DEFAULT 0,
-            downvotes INTEGER DEFAULT 0,
-            is_accepted INTEGER DEFAULT 0,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL,
-            FOREIGN KEY (question_id) REFERENCES community_questions(id),
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    """, [])
 
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS community_votes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            target_type TEXT NOT NULL,
-            target_id INTEGER NOT NULL,
-            vote_type TEXT NOT NULL,
-            created_at TEXT NOT NULL,
-            UNIQUE(user_id, target_type, target_id)
-        )
-    """, [])
-
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS community_playbooks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            author_id INTEGER NOT NULL,
-            title TEXT NOT NULL,
-            description TEXT NOT NULL,
-            content TEXT NOT NULL,
-            category TEXT NOT NULL,
-            tags TEXT,
-            difficulty_level TEXT DEFAULT 'intermediate',
-            status TEXT DEFAULT 'draft',
-            view_count INTEGER DEFAULT 0,
-            like_count INTEGER DEFAULT 0,
-            bookmark_count INTEGER DEFAULT 0,
-            published_at TEXT,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL,
-            FOREIGN KEY (author_id) REFERENCES users(id)
-        )
-    """, [])
-
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS community_office_hours (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            host_id INTEGER NOT NULL,
-            title TEXT NOT NULL,
-            description TEXT NOT NULL,
-            scheduled_at TEXT NOT NULL,
-            duration_minutes INTEGER DEFAULT 60,
-            max_attendees INTEGER DEFAULT 50,
-            category TEXT,
-            status TEXT DEFAULT 'scheduled',
-            is_public INTEGER DEFAULT 1,
-            recording_url TEXT,
-            attendee_count INTEGER DEFAULT 0,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL,
-            FOREIGN KEY (host_id) REFERENCES users(id)
-        )
-    """, [])
-
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS community_oh_registrations (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            office_hours_id INTEGER NOT NULL,
-            user_id INTEGER NOT NULL,
-            registered_at TEXT NOT NULL,
-            attended INTEGER DEFAULT 0,
-            UNIQUE(office_hours_id, user_id),
-            FOREIGN KEY (office_hours_id) REFERENCES community_office_hours(id),
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    """, [])
+def ensure_community_tables():
+    """Create community tables if this process has not yet (bootstrapped at startup)."""
+    ensure_schema("community")
 
 
 # ==================== Q&A Service Functions ====================
@@ -0,0 +1,303 @@
+# @AI-HINT: Shared single-pass multi-pattern text scanner (literal trie automaton + one regex per rule family)
+"""
+Content Scanner - compile many keyword/regex rules once, scan text once.
+
+Moderation, fraud detection and the support chatbot all classify text by
+checking it against lists of words, phrases and regular expressions. Doing
+that with one ``re.search``/``in`` per rule re-reads the text dozens of
+times. A ``ContentScanner`` instead:
+
+- routes every literal term (and every regex that is just a ``\\b(a|b|c)\\b``
+  literal alternation) into a single literal automaton, walked once;
+- joins the remaining regexes of each rule family into one alternation of
+  named groups, searched once per family;
+- returns every hit tagged with its category and originating rule.
+
+Scanners are immutable and meant to be built at import time.
+"""
+
+import re
+from collections import defaultdict
+
+try:  # Python 3.11+
+    import re._parser as _sre_parse
+except ImportError:  # pragma: no cover
+    import sre_parse as _sre_parse
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# A regex that is nothing but "\b(lit|lit|...)\b" (or the same without \b)
+_LITERAL_ALTERNATION = re.compile(r"^(\\b)?\(((?:[\w ]|\\')+(?:\|(?:[\w ]|\\')+)*)\)(\\b)?$")
+
+
+_CATEGORY_CLASSES = {"CATEGORY_DIGIT": r"\d", "CATEGORY_WORD": r"\w", "CATEGORY_SPACE": r"\s"}
+
+
+def _first_chars(items) -> Optional[Set[str]]:
+    """
+    Character-class fragments a parsed pattern can start with.
+
+    ``None`` means "unknown or may match empty" - the caller then skips the
+    first-character prefilter rather than risk missing a match.
+    """
+    chars, nullable = _first_chars_seq(items)
+    return None if chars is None or nullable else chars
+
+
+def _first_chars_seq(items) -> Tuple[Optional[Set[str]], bool]:
+    # Returns (possible first characters, whether the sequence can match empty)
+    chars: Set[str] = set()
+    for op, arg in items:
+        op = str(op)
+        if op == "AT":
+            continue  # zero-width (\b, ^, ...)
+        if op == "LITERAL":
+            item, nullable = {re.escape(chr(arg))}, False
+        elif op == "IN":
+            item, nullable = set(), False
+            for member_op, member in arg:
+                member_op = str(member_op)
+                if member_op == "LITERAL":
+                    item.add(re.escape(chr(member)))
+                elif member_op == "RANGE":
+                    item.add(f"{re.escape(chr(member[0]))}-{re.escape(chr(member[1]))}")
+                elif member_op == "CATEGORY" and str(member) in _CATEGORY_CLASSES:
+                    item.add(_CATEGORY_CLASSES[str(member)])
+                else:
+                    return None, True
+        elif op == "BRANCH":
+            item, nullable = set(), False
+            for alternative in arg[1]:
+                first, empty = _first_chars_seq(alternative)
+                if first is None:
+                    return None, True
+                item |= first
+                nullable = nullable or empty
+        elif op == "SUBPATTERN":
+            item, nullable = _first_chars_seq(arg[-1])
+        elif op in ("MAX_REPEAT", "MIN_REPEAT"):
+            item, nullable = _first_chars_seq(arg[2])
+            nullable = nullable or arg[0] == 0
+        else:
+            return None, True
+        if item is None:
+            return None, True
+        chars |= item
+        if not nullable:
+            return chars, False
+    return chars, True
+
+
+class ScanHit(NamedTuple):
+    """One match: category it belongs to, rule that produced it and span."""
+    category: str
+    rule: str
+    start: int
+    end: int
+    text: str
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class LiteralAutomaton:
+    """
+    Trie over lower-cased literal terms, executed by the C regex engine.
+
+    The trie is emitted as one nested, longest-first regex inside a
+    lookahead, so a single ``finditer`` visits every start position once and
+    reports the longest term starting there. Shorter terms starting at the
+    same position are necessarily prefixes of that term, so they are looked
+    up in a precomputed prefix table - every occurrence is still reported,
+    overlaps included, without a per-character Python loop.
+    """
+
+    def __init__(self, terms: Iterable[Tuple[str, int]]):
+        # terms: (literal, payload_id); payload ids are reported on match
+        payloads: Dict[str, List[int]] = defaultdict(list)
+        for literal, payload in terms:
+            if literal:
+                payloads[literal].append(payload)
+
+        trie: Dict = {}
+        for literal in payloads:
+            node = trie
+            for ch in literal:
+                node = node.setdefault(ch, {})
+            node[""] = True
+
+        # literal -> ((payload_id, length), ...) for itself and every shorter term it starts with
+        self._outputs: Dict[str, Tuple[Tuple[int, int], ...]] = {}
+        for literal in payloads:
+            out = []
+            for length in range(1, len(literal) + 1):
+                for payload in payloads.get(literal[:length], ()):
+                    out.append((payload, length))
+            self._outputs[literal] = tuple(out)
+
+        self._regex = re.compile(f"(?=({self._render(trie)}))") if trie else None
+        self.size = len(payloads)
+
+    @classmethod
+    def _render(cls, node: Dict) -> str:
+        branches = [re.escape(ch) + cls._render(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # Greedy optional: the longest term wins, backtracking to this one
+            return f"(?:{body})?" if len(branches) == 1 else body + "?"
+        return body
+
+    def iter_matches(self, text: str):
+        """Yield (payload_id, start, end) for every occurrence, overlaps included."""
+        if self._regex is None:
+            return
+        outputs = self._outputs
+        for match in self._regex.finditer(text):
+            start = match.start()
+            for payload, length in outputs[match.group(1)]:
+                yield payload, start, start + length
+
+
+class _Term(NamedTuple):
+    category: str
+    rule: str
+    whole_word: bool
+
+
+class ContentScanner:
+    """Compiled multi-pattern scanner. Build with ``ScannerBuilder``."""
+
+    def __init__(
+        self,
+        terms: List[Tuple[str, _Term]],
+        families: List[Tuple[re.Pattern, Dict[str, Tuple[str, str]]]],
+    ):
+        self._terms = [t for _, t in terms]
+        self._automaton = LiteralAutomaton((literal, i) for i, (literal, _) in enumerate(terms)) if terms else None
+        self._families = families
+        self.categories: Set[str] = {t.category for t in self._terms} | {
+            cat for _, groups in families for cat, _ in groups.values()
+        }
+
+    def scan(self, text: str, categories: Optional[Set[str]] = None) -> List[ScanHit]:
+        """Return every hit in ``text``, optionally restricted to some categories."""
+        if not text:
+            return []
+        hits: List[ScanHit] = []
+
+        if self._automaton is not None:
+            lowered = text.lower()
+            # Lower-casing can change length for a few code points; report spans on the lowered text then
+            source = text if len(lowered) == len(text) else lowered
+            n = len(lowered)
+            for payload, start, end in self._automaton.iter_matches(lowered):
+                term = self._terms[payload]
+                if categories is not None and term.category not in categories:
+                    continue
+                if term.whole_word and (
+                    (start > 0 and _is_word_char(lowered[start - 1]))
+                    or (end < n and _is_word_char(lowered[end]))
+                ):
+                    continue
+                hits.append(ScanHit(term.category, term.rule, start, end, source[start:end]))
+
+        for regex, groups in self._families:
+            if categories is not None and not any(c in categories for c, _ in groups.values()):
+                continue
+            for match in regex.finditer(text):
+                category, rule = groups[match.lastgroup]
+                if categories is not None and category not in categories:
+                    continue
+                hits.append(ScanHit(category, rule, match.start(), match.end(), match.group()))
+
+        return hits
+
+    def group(self, text: str, categories: Optional[Set[str]] = None) -> Dict[str, List[ScanHit]]:
+        """Scan and bucket hits by category."""
+        grouped: Dict[str, List[ScanHit]] = defaultdict(list)
+        for hit in self.scan(text, categories):
+            grouped[hit.category].append(hit)
+        return grouped
+
+    def rules_matched(self, text: str, categories: Optional[Set[str]] = None) -> Dict[str, Set[str]]:
+        """Distinct rules matched per category (for "how many patterns fired" scoring)."""
+        matched: Dict[str, Set[str]] = defaultdict(set)
+        for hit in self.scan(text, categories):
+            matched[hit.category].add(hit.rule)
+        return matched
+
+
+class ScannerBuilder:
+    """Collects rules and compiles them into a ``ContentScanner``."""
+
+    def __init__(self):
+        self._terms: List[Tuple[str, _Term]] = []
+        self._families: List[List[Tuple[str, str]]] = []  # [(category, pattern)]
+        self._family_flags: List[int] = []
+        self._family_index: Dict[str, int] = {}
+
+    def terms(self, category: str, terms: Iterable[str], whole_word: bool = False) -> "ScannerBuilder":
+        """Add literal terms (matched case-insensitively)."""
+        for term in terms:
+            self._terms.append((term.lower(), _Term(category, term, whole_word)))
+        return self
+
+    def patterns(
+        self,
+        category: str,
+        patterns: Iterable[str],
+        flags: int = re.IGNORECASE,
+        family: Optional[str] = None,
+    ) -> "ScannerBuilder":
+        """
+        Add regex rules for ``category``.
+
+        Pure literal alternations are moved into the automaton (each literal
+        reports the original pattern as its rule); everything else joins the
+        combined regex of ``family`` (default: a new family for this call).
+        """
+        regexes = []
+        for pattern in patterns:
+            literal = _LITERAL_ALTERNATION.match(pattern)
+            if literal and flags & re.IGNORECASE:
+                whole_word = bool(literal.group(1)) and bool(literal.group(3))
+                if bool(literal.group(1)) == bool(literal.group(3)):
+                    for alt in literal.group(2).split("|"):
+                        self._terms.append((alt.replace("\\'", "'").lower(), _Term(category, pattern, whole_word)))
+                    continue
+            regexes.append((category, pattern))
+        if regexes:
+            key = family or f"_family{len(self._families)}"
+            index = self._family_index.get(key)
+            if index is None:
+                self._family_index[key] = len(self._families)
+                self._families.append(regexes)
+                self._family_flags.append(flags)
+            else:
+                if self._family_flags[index] != flags:
+                    raise ValueError(f"Rule family '{key}' mixes regex flags")
+                self._families[index].extend(regexes)
+        return self
+
+    def build(self) -> ContentScanner:
+        families = []
+        for rules, flags in zip(self._families, self._family_flags):
+            groups: Dict[str, Tuple[str, str]] = {}
+            parts = []
+            first: Optional[Set[str]] = set()
+            for i, (category, pattern) in enumerate(rules):
+                name = f"r{i}"
+                groups[name] = (category, pattern)
+                parts.append(f"(?P<{name}>{pattern})")
+                if first is not None:
+                    chars = _first_chars(_sre_parse.parse(pattern, flags))
+                    first = None if chars is None else first | chars
+            combined = "|".join(parts)
+            if first:
+                # Cheap first-character gate: the engine only tries the
+                # alternation at positions where some rule could start
+                combined = f"(?=[{''.join(sorted(first))}])(?:{combined})"
+            families.append((re.compile(combined, flags), groups))
+        return ContentScanner(self._terms, families)
@@ -390,7 +390,19 @@ class ContractBuilderService:
         user_id: int,
         format: str = "pdf"  # pdf, docx, html
     ) -> Dict[str, Any]:
-        """Export contract to file."""
+        """Export contract to file. PDFs are queued on the render pool and return its job handle."""
+        if format == "pdf":
+            from app.services.pdf_renderer import get_pdf_renderer, sections_document
+            # Drafts share their template's sections until edited
+            template = await self.get_template_details(contract_id)
+            sections = sorted(template.get("sections", []), key=lambda sec: sec.get("order", 0))
+            spec = sections_document(
+                "contract", template.get("name", "Contract"), sections,
+                meta=[["Contract", contract_id], ["Type", template.get("type", "custom").replace("_", " ").title()]]
+            )
+            job = get_pdf_renderer().submit(spec, owner_id=user_id, kind="contract",
+                                            filename=f"contract-{contract_id}.pdf")
+            return {"contract_id": contract_id, "format": format, **job}
         return {
             "contract_id": contract_id,
             "format": format,
@@ -261,9 +261,9 @@ def update_contract_fields(contract_id: str, set_parts: List[str], values: List)
 
 
 def fetch_contract_status(contract_id: str) -> Optional[dict]:
-    """Fetch contract status and client_id for delete validation."""
+    """Fetch contract status and parties for delete validation."""
     result = execute_query(
-        "SELECT id, client_id, status FROM contracts WHERE id = ?",
+        "SELECT id, client_id, status, freelancer_id FROM contracts WHERE id = ?",
         [contract_id]
     )
     if not result or not result.get("rows"):
@@ -271,7 +271,8 @@ def fetch_contract_status(contract_id: str) -> Optional[dict]:
     row = result["rows"][0]
     return {
         "client_id": int(_get_val(row, 1) or 0),
-        "status": _safe_str(_get_val(row, 2))
+        "status": _safe_str(_get_val(row, 2)),
+        "freelancer_id": int(_get_val(row, 3) or 0)
     }
 
 
@@ -0,0 +1,566 @@
+# @AI-HINT: Facet indexes behind /search/projects and /search/freelancers, kept fresh from the DB change feed
+"""
+Discovery Index - open projects and public freelancers held in ``FacetIndex``es.
+
+The SQL search path costs three round-trips per request (COUNT, page, facet
+GROUP BY), each re-aggregating proposals/reviews. Here the searchable rows
+are loaded once and every filtered count, facet breakdown and sorted page is
+computed in-process from the same bitmap.
+
+Freshness:
+
+- Projects refresh incrementally when ``projects`` (rows with a newer id or
+  ``updated_at`` are re-read) or ``proposals`` (only the touched projects
+  are recounted) were written. A delete triggers a full reload.
+- Freelancers depend on users, reviews and contracts and are rebuilt as a
+  whole, at most every ``FREELANCER_REBUILD_SECONDS`` while writes keep
+  arriving.
+
+Writes made through this process show up in ``change_feed`` immediately.
+Writes made by other instances are found by a probe every
+``REMOTE_POLL_SECONDS``: one request reading ``MAX(id)``, ``COUNT(*)`` and
+``MAX(updated_at)`` per table. A table whose probe moved is treated like a
+local write. A count that grew by less than the id range means rows were
+deleted. A full reload every ``FULL_RELOAD_SECONDS`` remains the backstop,
+e.g. for an update stamped earlier than the newest ``updated_at``.
+
+``search`` returns ``None`` whenever the index cannot serve a request
+(never loaded, load failed); callers then use the SQL path.
+"""
+
+import json
+import logging
+import threading
+import time
+from datetime import timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.db import change_feed
+from app.db.turso_http import get_turso_http, parse_date, to_float, to_str
+from app.services.facet_index import FacetIndex
+
+logger = logging.getLogger(__name__)
+
+FULL_RELOAD_SECONDS = 300
+REMOTE_POLL_SECONDS = 5
+FREELANCER_REBUILD_SECONDS = 30
+RETRY_AFTER_FAILURE_SECONDS = 60
+_ID_BATCH = 500
+
+_PROJECT_SELECT = """
+    SELECT p.id, p.title, p.description, p.category, p.budget_type,
+           p.budget_min, p.budget_max, p.experience_level,
+           p.estimated_duration, p.status, p.skills, p.client_id,
+           p.created_at, p.updated_at, datetime(p.updated_at) AS updated_norm
+    FROM projects p
+"""
+
+_PROPOSAL_STATS = """
+    SELECT project_id,
+           SUM(CASE WHEN status != 'withdrawn' THEN 1 ELSE 0 END) AS proposal_count,
+           MAX(id) AS max_id,
+           MAX(datetime(updated_at)) AS max_updated
+    FROM proposals
+"""
+
+_FREELANCER_SELECT = """
+    SELECT u.id, u.email, u.name, u.first_name, u.last_name,
+           u.bio, u.hourly_rate, u.location, u.skills, u.user_type,
+           u.is_active, u.created_at, u.experience_level, u.availability_status,
+           COALESCE(rv.avg_rating, 0) AS avg_rating,
+           COALESCE(rv.review_count, 0) AS review_count,
+           COALESCE(cc.completed, 0) AS completed_projects
+    FROM users u
+    LEFT JOIN (
+        SELECT reviewee_id, AVG(rating) AS avg_rating, COUNT(*) AS review_count
+        FROM reviews GROUP BY reviewee_id
+    ) rv ON u.id = rv.reviewee_id
+    LEFT JOIN (
+        SELECT freelancer_id, COUNT(*) AS completed
+        FROM contracts WHERE status = 'completed'
+        GROUP BY freelancer_id
+    ) cc ON u.id = cc.freelancer_id
+    WHERE LOWER(u.user_type) = 'freelancer' AND u.is_active = 1
+      AND (u.profile_visibility IS NULL OR u.profile_visibility != 'private')
+"""
+
+# sort name -> (index sort key, descending); mirrors search_service's SORT_MAPs
+PROJECT_SORTS = {
+    "newest": ("created_at", True),
+    "oldest": ("created_at", False),
+    "budget_high": ("budget_max", True),
+    "budget_low": ("budget_min", False),
+    "most_proposals": ("proposal_count", True),
+}
+
+FREELANCER_SORTS = {
+    "newest": ("created_at", True),
+    "rate_high": ("hourly_rate", True),
+    "rate_low": ("hourly_rate", False),
+    "rating_high": ("avg_rating", True),
+    "most_reviews": ("review_count", True),
+}
+
+
+def _records(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    columns = result.get("columns", [])
+    return [dict(zip(columns, row)) for row in result.get("rows", [])]
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    parsed = parse_date(value)
+    if not hasattr(parsed, "timestamp"):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def skill_tokens(raw: Any) -> List[str]:
+    """Lower-cased skills from a JSON array or comma-separated string."""
+    text = to_str(raw)
+    if not text:
+        return []
+    values: Iterable[Any] = ()
+    if text.lstrip().startswith("["):
+        try:
+            values = json.loads(text)
+        except ValueError:
+            values = text.strip("[]").replace('"', "").split(",")
+    else:
+        values = text.split(",")
+    return [str(v).strip().lower() for v in values if str(v).strip()]
+
+
+def _blank_to_none(value: Any) -> Optional[str]:
+    text = to_str(value)
+    return text or None
+
+
+def _containing(index: FacetIndex, facet: str, needle: str) -> List[Any]:
+    """Indexed values containing ``needle`` case-insensitively (SQL ``LIKE %needle%``)."""
+    needle = needle.lower()
+    return [v for v in index.values(facet) if needle in str(v).lower()]
+
+
+def _with_missing(counts: Dict[Any, int], total: int, label: str) -> Dict[Any, int]:
+    # Documents without a value for a single-valued facet are the remainder
+    missing = total - sum(counts.values())
+    if missing > 0:
+        counts[label] = counts.get(label, 0) + missing
+    return counts
+
+
+class _Discovery:
+    """Shared load/refresh bookkeeping; subclasses define the rows."""
+
+    tables: Tuple[str, ...] = ()
+    watermark_columns: Dict[str, str] = {}  # table -> column every update sets, read by the probe
+    name = "discovery"
+    min_reload_seconds = 0.0  # serve the current index at least this long after a load
+
+    def __init__(self, backend_factory: Optional[Callable[[], Any]] = None):
+        self._backend_factory = backend_factory or get_turso_http
+        self.index = self._new_index()
+        self._lock = threading.Lock()
+        self._feed: Optional[Dict[str, tuple]] = None
+        self._probe: Dict[str, tuple] = {}
+        self._probed_at = 0.0
+        self._loaded_at = 0.0
+        self._failed_at = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self._feed is not None
+
+    def _new_index(self) -> FacetIndex:
+        raise NotImplementedError
+
+    def _query(self, sql: str, params: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
+        return _records(self._backend_factory().execute(sql, params or []))
+
+    def _read_probe(self) -> Dict[str, tuple]:
+        """``{table: (max_id, row_count, max_watermark)}`` for all tables in one request."""
+        columns = []
+        for table in self.tables:
+            watermark = self.watermark_columns.get(table)
+            columns += [f"(SELECT MAX(id) FROM {table})", f"(SELECT COUNT(*) FROM {table})",
+                        f"(SELECT MAX({watermark}) FROM {table})" if watermark else "NULL"]
+        self._probed_at = time.monotonic()  # a failing probe waits for the next poll
+        row = self._backend_factory().execute("SELECT " + ", ".join(columns), [])["rows"][0]
+        return {table: tuple(row[i * 3:i * 3 + 3]) for i, table in enumerate(self.tables)}
+
+    def _remote_changes(self, probe: Dict[str, tuple]) -> Tuple[set, bool]:
+        """Tables whose probe moved since the last one, and whether any of them lost rows."""
+        changed, deleted = set(), False
+        for table, (max_id, count, watermark) in probe.items():
+            before = self._probe.get(table)
+            if before is None or before == (max_id, count, watermark):
+                continue
+            changed.add(table)
+            added_ids = (max_id or 0) - (before[0] or 0)
+            if (count or 0) - (before[1] or 0) < added_ids or added_ids < 0:
+                deleted = True
+        return changed, deleted
+
+    def load(self) -> None:
+        """Full (re)load from the database."""
+        feed = change_feed.snapshot(self.tables)
+        started = time.monotonic()
+        self._probe = self._read_probe()  # before the rows: a write landing meanwhile shows next poll
+        self._load()
+        self._feed = feed
+        self._loaded_at = time.monotonic()
+        logger.info(
+            "%s.loaded documents=%d ms=%.1f",
+            self.name, len(self.index), (self._loaded_at - started) * 1000,
+        )
+
+    def _load(self) -> None:
+        raise NotImplementedError
+
+    def _refresh(self, changed: set) -> bool:
+        """Apply writes (no deletes) to the ``changed`` tables; False if a full reload is needed."""
+        return False
+
+    def _up_to_date(self, now: float) -> bool:
+        return (change_feed.snapshot(self.tables) == self._feed
+                and now - self._loaded_at < FULL_RELOAD_SECONDS
+                and now - self._probed_at < REMOTE_POLL_SECONDS)
+
+    def ensure_fresh(self) -> bool:
+        """Bring the index up to date if needed; False if it cannot serve."""
+        now = time.monotonic()
+        if not self.loaded:
+            if self._failed_at and now - self._failed_at < RETRY_AFTER_FAILURE_SECONDS:
+                return False
+        elif now - self._loaded_at < self.min_reload_seconds or self._up_to_date(now):
+            return True
+
+        # Only one refresher at a time; other requests keep reading the current index
+        if not self._lock.acquire(blocking=not self.loaded):
+            return True
+        try:
+            if not self.loaded or now - self._loaded_at >= FULL_RELOAD_SECONDS:
+                self.load()
+                return True
+            if self._up_to_date(now):
+                return True
+            feed = change_feed.snapshot(self.tables)
+            changed = {t for t in self.tables if feed[t][0] != self._feed[t][0]}
+            deleted = any(feed[t][1] != self._feed[t][1] for t in self.tables)
+            if now - self._probed_at >= REMOTE_POLL_SECONDS:
+                probe = self._read_probe()
+                remote, remote_deleted = self._remote_changes(probe)
+                changed |= remote
+                deleted = deleted or remote_deleted
+                self._probe = probe
+            if not changed:
+                self._feed = feed
+                return True
+            if not deleted and self._refresh(changed):
+                self._feed = feed
+                return True
+            self.load()
+            return True
+        except Exception as e:
+            logger.warning(f"{self.name}.refresh_failed: {e}")
+            if not self.loaded:
+                self._failed_at = time.monotonic()
+            return self.loaded
+        finally:
+            self._lock.release()
+
+
+class ProjectDiscovery(_Discovery):
+    """Open projects: category, experience level, budget type, skills, budget ranges."""
+
+    tables = ("projects", "proposals")
+    watermark_columns = {"projects": "updated_at", "proposals": "updated_at"}
+    name = "project_discovery"
+
+    def __init__(self, backend_factory: Optional[Callable[[], Any]] = None):
+        super().__init__(backend_factory)
+        self._max_id: Any = None
+        self._watermark: Optional[str] = None
+        self._proposal_max_id: Any = None
+        self._proposal_watermark: Optional[str] = None
+
+    def _new_index(self) -> FacetIndex:
+        return FacetIndex(
+            facets=("category", "experience_level", "budget_type"),
+            multi_facets=("skills",),
+            ranges={"budget_min": 100, "budget_max": 100},  # cents
+            sorts=("created_at", "budget_min", "budget_max", "proposal_count"),
+        )
+
+    @staticmethod
+    def _document(row: Dict[str, Any], proposal_count: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        skills = to_str(row["skills"])
+        created_at = parse_date(row["created_at"])
+        payload = {
+            "id": row["id"],
+            "title": to_str(row["title"]),
+            "description": to_str(row["description"]),
+            "category": to_str(row["category"]),
+            "budget_type": to_str(row["budget_type"]),
+            "budget_min": to_float(row["budget_min"]),
+            "budget_max": to_float(row["budget_max"]),
+            "experience_level": to_str(row["experience_level"]),
+            "estimated_duration": to_str(row["estimated_duration"]),
+            "status": to_str(row["status"]),
+            "skills": skills.split(",") if skills else [],
+            "client_id": row["client_id"],
+            "created_at": created_at,
+            "updated_at": parse_date(row["updated_at"]),
+            "proposal_count": proposal_count,
+        }
+        values = {
+            "category": _blank_to_none(row["category"]),
+            "experience_level": _blank_to_none(row["experience_level"]),
+            "budget_type": to_str(row["budget_type"]),
+            "skills": skill_tokens(row["skills"]),
+            "budget_min": payload["budget_min"],
+            "budget_max": payload["budget_max"],
+            "created_at": _timestamp(row["created_at"]),
+            "proposal_count": proposal_count,
+        }
+        return values, payload
+
+    def _advance(self, rows: Iterable[Dict[str, Any]], id_key: str, updated_key: str, proposals: bool) -> None:
+        max_id = self._proposal_max_id if proposals else self._max_id
+        watermark = self._proposal_watermark if proposals else self._watermark
+        for row in rows:
+            if row[id_key] is not None and (max_id is None or row[id_key] > max_id):
+                max_id = row[id_key]
+            if row[updated_key] and (watermark is None or row[updated_key] > watermark):
+                watermark = row[updated_key]
+        if proposals:
+            self._proposal_max_id, self._proposal_watermark = max_id, watermark
+        else:
+            self._max_id, self._watermark = max_id, watermark
+
+    def _since_clause(self, max_id: Any, watermark: Optional[str], alias: str = "") -> Tuple[str, List[Any]]:
+        if max_id is None:
+            return "1=1", []
+        clause, params = f"{alias}id > ?", [max_id]
+        if watermark:
+            clause += f" OR datetime({alias}updated_at) >= datetime(?)"
+            params.append(watermark)
+        return f"({clause})", params
+
+    def _proposal_stats(self, project_ids: Optional[Sequence[Any]] = None) -> List[Dict[str, Any]]:
+        if project_ids is None:
+            return self._query(_PROPOSAL_STATS + " GROUP BY project_id")
+        stats = []
+        for i in range(0, len(project_ids), _ID_BATCH):
+            batch = list(project_ids[i:i + _ID_BATCH])
+            placeholders = ",".join("?" * len(batch))
+            stats.extend(self._query(
+                _PROPOSAL_STATS + f" WHERE project_id IN ({placeholders}) GROUP BY project_id", batch,
+            ))
+        return stats
+
+    def _load(self) -> None:
+        self._max_id = self._watermark = None
+        self._proposal_max_id = self._proposal_watermark = None
+        stats = self._proposal_stats()
+        self._advance(stats, "max_id", "max_updated", proposals=True)
+        counts = {s["project_id"]: int(s["proposal_count"] or 0) for s in stats}
+
+        rows = self._query(_PROJECT_SELECT + " WHERE p.status = 'open'")
+        self._advance(rows, "id", "updated_norm", proposals=False)
+        documents = []
+        for row in rows:
+            values, payload = self._document(row, counts.get(row["id"], 0))
+            documents.append((row["id"], values, payload))
+        index = self._new_index()
+        index.bulk_load(documents)
+        self.index = index
+
+    def _refresh(self, changed: set) -> bool:
+        if "projects" in changed:
+            clause, params = self._since_clause(self._max_id, self._watermark, "p.")
+            rows = self._query(_PROJECT_SELECT + f" WHERE {clause}", params)
+            self._advance(rows, "id", "updated_norm", proposals=False)
+            fresh = [r["id"] for r in rows if r["id"] not in self.index and to_str(r["status"]) == "open"]
+            counts = {s["project_id"]: int(s["proposal_count"] or 0) for s in self._proposal_stats(fresh)}
+            for row in rows:
+                if to_str(row["status"]) != "open":
+                    self.index.remove(row["id"])
+                    continue
+                current = self.index.get(row["id"])
+                count = current["proposal_count"] if current else counts.get(row["id"], 0)
+                values, payload = self._document(row, count)
+                self.index.upsert(row["id"], values, payload)
+
+        if "proposals" in changed:
+            clause, params = self._since_clause(self._proposal_max_id, self._proposal_watermark)
+            touched = self._query(f"SELECT DISTINCT project_id FROM proposals WHERE {clause}", params)
+            ids = [r["project_id"] for r in touched if r["project_id"] in self.index]
+            stats = self._proposal_stats(ids)
+            self._advance(stats, "max_id", "max_updated", proposals=True)
+            counts = {s["project_id"]: int(s["proposal_count"] or 0) for s in stats}
+            for project_id in ids:
+                count = counts.get(project_id, 0)
+                payload = self.index.get(project_id)
+                if payload is not None and payload["proposal_count"] != count:
+                    payload["proposal_count"] = count
+                    self.index.update_sort_key(project_id, "proposal_count", count)
+        return True
+
+    def search(
+        self,
+        category: Optional[str] = None,
+        skills: Sequence[str] = (),
+        budget_min: Optional[float] = None,
+        budget_max: Optional[float] = None,
+        budget_type: Optional[str] = None,
+        experience_level: Optional[str] = None,
+        sort: str = "newest",
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Optional[Dict[str, Any]]:
+        """Same result shape as ``search_projects_advanced`` for open projects."""
+        if not self.ensure_fresh():
+            return None
+        index = self.index
+        clauses = []
+        if category:
+            clauses.append(("category", _containing(index, "category", category)))
+        if budget_type:
+            clauses.append(("budget_type", [budget_type]))
+        if experience_level:
+            clauses.append(("experience_level", [experience_level]))
+        for skill in skills:
+            clauses.append(("skills", _containing(index, "skills", skill)))
+        ranges = {}
+        if budget_min is not None:
+            ranges["budget_min"] = (budget_min, None)
+        if budget_max is not None:
+            ranges["budget_max"] = (None, budget_max)
+
+        key, descending = PROJECT_SORTS.get(sort, PROJECT_SORTS["newest"])
+        result = index.search(
+            clauses, ranges, key, descending, offset, limit,
+            facets=("category", "experience_level"),
+        )
+        total = result["total_count"]
+        return {
+            "items": [dict(item) for item in result["items"]],
+            "total_count": total,
+            "facets": {
+                "categories": _with_missing(result["facets"]["category"], total, "uncategorized"),
+                "experience_levels": _with_missing(result["facets"]["experience_level"], total, "unspecified"),
+            },
+        }
+
+
+class FreelancerDiscovery(_Discovery):
+    """Active, non-private freelancers: location, skills, levels, rate and rating ranges."""
+
+    tables = ("users", "reviews", "contracts")
+    watermark_columns = {"users": "updated_at", "reviews": "updated_at", "contracts": "updated_at"}
+    name = "freelancer_discovery"
+    # Ratings and visibility span three tables; rebuild, but not on every write
+    min_reload_seconds = FREELANCER_REBUILD_SECONDS
+
+    def _new_index(self) -> FacetIndex:
+        return FacetIndex(
+            facets=("location", "experience_level", "availability_status"),
+            multi_facets=("skills",),
+            ranges={"hourly_rate": 100, "avg_rating": 100},
+            sorts=("created_at", "hourly_rate", "avg_rating", "review_count"),
+        )
+
+    @staticmethod
+    def _document(row: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        avg_rating = round(to_float(row["avg_rating"]) or 0.0, 2)
+        payload = {
+            "id": row["id"],
+            "email": to_str(row["email"]),
+            "name": to_str(row["name"]),
+            "first_name": to_str(row["first_name"]),
+            "last_name": to_str(row["last_name"]),
+            "bio": to_str(row["bio"]),
+            "hourly_rate": to_float(row["hourly_rate"]),
+            "location": to_str(row["location"]),
+            "skills": to_str(row["skills"]),
+            "user_type": to_str(row["user_type"]),
+            "is_active": bool(row["is_active"]) if row["is_active"] is not None else True,
+            "joined_at": parse_date(row["created_at"]),
+            "avg_rating": avg_rating,
+            "review_count": row["review_count"] or 0,
+            "completed_projects": row["completed_projects"] or 0,
+        }
+        values = {
+            "location": to_str(row["location"]),
+            "experience_level": to_str(row["experience_level"]),
+            "availability_status": to_str(row["availability_status"]),
+            "skills": skill_tokens(row["skills"]),
+            "hourly_rate": payload["hourly_rate"],
+            "avg_rating": avg_rating,
+            "created_at": _timestamp(row["created_at"]),
+            "review_count": payload["review_count"],
+        }
+        return values, payload
+
+    def _load(self) -> None:
+        index = self._new_index()
+        documents = []
+        for row in self._query(_FREELANCER_SELECT):
+            values, payload = self._document(row)
+            documents.append((row["id"], values, payload))
+        index.bulk_load(documents)
+        self.index = index
+
+    def search(
+        self,
+        location: Optional[str] = None,
+        skills: Sequence[str] = (),
+        min_rate: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        min_rating: Optional[float] = None,
+        experience_level: Optional[str] = None,
+        availability_status: Optional[str] = None,
+        sort: str = "newest",
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Optional[Dict[str, Any]]:
+        """Same result shape as ``search_freelancers_advanced``; ``min_rating`` filters before paging."""
+        if not self.ensure_fresh():
+            return None
+        index = self.index
+        clauses = []
+        if location:
+            clauses.append(("location", _containing(index, "location", location)))
+        if experience_level:
+            clauses.append(("experience_level", [experience_level]))
+        if availability_status:
+            clauses.append(("availability_status", [availability_status]))
+        for skill in skills:
+            clauses.append(("skills", _containing(index, "skills", skill)))
+        ranges = {}
+        if min_rate is not None or max_rate is not None:
+            ranges["hourly_rate"] = (min_rate, max_rate)
+        if min_rating is not None:
+            ranges["avg_rating"] = (min_rating, None)
+
+        key, descending = FREELANCER_SORTS.get(sort, FREELANCER_SORTS["newest"])
+        result = index.search(clauses, ranges, key, descending, offset, limit, facets=("location",))
+        total = result["total_count"]
+        return {
+            "items": [dict(item) for item in result["items"]],
+            "total_count": total,
+            "facets": {"locations": _with_missing(result["facets"]["location"], total, "unspecified")},
+        }
+
+
+project_discovery = ProjectDiscovery()
+freelancer_discovery = FreelancerDiscovery()
+
+
+def load_discovery_indexes() -> None:
+    """Load both indexes (called at startup; failures fall back to SQL search)."""
+    project_discovery.load()
+    freelancer_discovery.load()
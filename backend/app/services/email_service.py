@@ -1,18 +1,19 @@
 # @AI-HINT: Email sending service using SMTP for transactional emails and notifications
 # Email Service Configuration
-# This module provides email sending capabilities using SMTP
+# This module provides email sending capabilities over a pooled async SMTP transport
 
 from typing import List, Optional, Dict, Any
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
-import smtplib
 import os
 import logging
+import threading
 from pathlib import Path
 from jinja2 import Environment, FileSystemLoader
 from app.core.config import get_settings
+from app.services.smtp_transport import MailDispatcher, MailResult, SMTPPool
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
@@ -34,7 +35,66 @@ class EmailService:
         # Setup Jinja2 template environment
         template_dir = Path(__file__).parent.parent / "templates" / "emails"
         self.template_env = Environment(loader=FileSystemLoader(str(template_dir)))
+
+        # Pooled SMTP transport, started on first real send
+        self._mail_dispatcher: Optional[MailDispatcher] = None
+        self._dispatcher_lock = threading.Lock()
     
+    @property
+    def mock_mode(self) -> bool:
+        """No SMTP credentials configured: log messages instead of sending them."""
+        return self.smtp_server == "smtp.gmail.com" and not self.smtp_username
+
+    def _dispatcher(self) -> MailDispatcher:
+        if self._mail_dispatcher is None:
+            with self._dispatcher_lock:
+                if self._mail_dispatcher is None:
+                    self._mail_dispatcher = MailDispatcher(SMTPPool(
+                        self.smtp_server, self.smtp_port, self.smtp_username, self.smtp_password,
+                        size=settings.SMTP_POOL_SIZE, idle_timeout=settings.SMTP_IDLE_TIMEOUT,
+                    ))
+        return self._mail_dispatcher
+
+    def build_message(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+        attachments: Optional[List[Dict[str, Any]]] = None
+    ) -> MIMEMultipart:
+        """Build the MIME message for an email (HTML with optional text part and attachments)."""
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = f"{self.from_name} <{self.from_email}>"
+        msg['To'] = to_email
+
+        # Add text part if provided
+        if text_content:
+            text_part = MIMEText(text_content, 'plain')
+            msg.attach(text_part)
+
+        # Add HTML part
+        html_part = MIMEText(html_content, 'html')
+        msg.attach(html_part)
+
+        # Add attachments if any
+        if attachments:
+            for attachment in attachments:
+                part = MIMEBase('application', 'octet-stream')
+                part.set_payload(attachment['content'])
+                encoders.encode_base64(part)
+                part.add_header(
+                    'Content-Disposition',
+                    f"attachment; filename= {attachment['filename']}"
+                )
+                msg.attach(part)
+        return msg
+
+    def _mock_result(self, msg: MIMEMultipart) -> MailResult:
+        logger.info("[MOCK EMAIL] To: %s, Subject: %s", msg['To'], msg['Subject'])
+        return MailResult(recipients=[msg['To']], ok=True, response="mock")
+
     def send_email(
         self,
         to_email: str,
@@ -44,7 +104,7 @@ class EmailService:
         attachments: Optional[List[Dict[str, Any]]] = None
     ) -> bool:
         """
-        Send an email using SMTP.
+        Send an email over the pooled SMTP transport.
         
         Args:
             to_email: Recipient email address
@@ -57,51 +117,49 @@ class EmailService:
             bool: True if email sent successfully, False otherwise
         """
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{self.from_name} <{self.from_email}>"
-            msg['To'] = to_email
-            
-            # Add text part if provided
-            if text_content:
-                text_part = MIMEText(text_content, 'plain')
-                msg.attach(text_part)
-            
-            # Add HTML part
-            html_part = MIMEText(html_content, 'html')
-            msg.attach(html_part)
-            
-            # Add attachments if any
-            if attachments:
-                for attachment in attachments:
-                    part = MIMEBase('application', 'octet-stream')
-                    part.set_payload(attachment['content'])
-                    encoders.encode_base64(part)
-                    part.add_header(
-                        'Content-Disposition',
-                        f"attachment; filename= {attachment['filename']}"
-                    )
-                    msg.attach(part)
-            
-            # Send email
-            if self.smtp_server == "smtp.gmail.com" and not self.smtp_username:
-                # Mock email sending if not configured
-                logger.info("[MOCK EMAIL] To: %s, Subject: %s", to_email, subject)
+            msg = self.build_message(to_email, subject, html_content, text_content, attachments)
+            if self.mock_mode:
                 logger.debug("[MOCK EMAIL] Content: %s...", (text_content or html_content[:100]))
-                return True
+                return self._mock_result(msg).ok
+
+            result = self._dispatcher().send(msg)
+            if not result.ok:
+                logger.error("Failed to send email to %s: %s %s", to_email, result.code, result.response)
+            return result.ok
 
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                if self.smtp_username and self.smtp_password:
-                    server.login(self.smtp_username, self.smtp_password)
-                server.send_message(msg)
-            
-            return True
-            
         except Exception as e:
             logger.error("Failed to send email: %s", e)
             return False
+
+    async def send_email_async(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+        attachments: Optional[List[Dict[str, Any]]] = None
+    ) -> MailResult:
+        """Send an email without blocking the event loop; returns the delivery result."""
+        msg = self.build_message(to_email, subject, html_content, text_content, attachments)
+        if self.mock_mode:
+            return self._mock_result(msg)
+        return await self._dispatcher().send_async(msg)
+
+    def send_bulk(self, messages: List[MIMEMultipart]) -> List[MailResult]:
+        """
+        Deliver many messages (see ``build_message``) over the connection pool.
+
+        Returns one ``MailResult`` per message, in order.
+        """
+        if self.mock_mode:
+            return [self._mock_result(msg) for msg in messages]
+        return self._dispatcher().send_many(messages)
+
+    def close(self) -> None:
+        """Close pooled SMTP connections."""
+        if self._mail_dispatcher is not None:
+            self._mail_dispatcher.shutdown()
+            self._mail_dispatcher = None
     
     def render_template(self, template_name: str, context: Dict[str, Any]) -> str:
         """
@@ -2,12 +2,14 @@
 """Email Templates Service - Customizable email templates."""
 
 from sqlalchemy.orm import Session
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, NamedTuple
 from datetime import datetime, timezone
 from enum import Enum
 from pydantic import BaseModel
 import uuid
 
+from app.services.template_compiler import CompiledTemplate, TemplateCache
+
 
 class EmailTemplateType(str, Enum):
     # Auth related
@@ -332,6 +334,34 @@ View in Dashboard: {{dashboard_url}}
 }
 
 
+class CompiledEmail(NamedTuple):
+    """Subject and bodies of one template version, parsed once."""
+    subject: CompiledTemplate
+    html_body: CompiledTemplate
+    text_body: CompiledTemplate
+
+
+# Compiled templates keyed by (template id, version); shared across the
+# per-request service instances so defaults are parsed once per process.
+_compiled_templates = TemplateCache(max_size=1024)
+
+
+def _compile_email(template: EmailTemplate) -> CompiledEmail:
+    return CompiledEmail(
+        CompiledTemplate(template.subject),
+        CompiledTemplate(template.html_body),
+        CompiledTemplate(template.text_body),
+    )
+
+
+def _matches(compiled: CompiledEmail, template: EmailTemplate) -> bool:
+    return (
+        compiled.subject.source == template.subject
+        and compiled.html_body.source == template.html_body
+        and compiled.text_body.source == template.text_body
+    )
+
+
 class EmailTemplatesService:
     """Service for managing email templates."""
     
@@ -356,6 +386,23 @@ class EmailTemplatesService:
                 updated_at=datetime.now(timezone.utc)
             )
             self._templates[template.id] = template
+            self._compiled(template)
+    
+    def _compiled(self, template: EmailTemplate, recompile: bool = False) -> CompiledEmail:
+        """Compiled form of a template version (compiled on save, cached by id/version)."""
+        key = (template.id, template.version)
+        if recompile:
+            return _compiled_templates.put(key, _compile_email(template))
+        return _compiled_templates.get_or_compile(
+            key, lambda: _compile_email(template), lambda c: _matches(c, template)
+        )
+    
+    @staticmethod
+    def _with_common_variables(variables: Dict[str, Any]) -> Dict[str, Any]:
+        variables.setdefault("year", datetime.now(timezone.utc).year)
+        variables.setdefault("support_url", "https://megilance.com/support")
+        variables.setdefault("dashboard_url", "https://megilance.com/dashboard")
+        return variables
     
     async def get_template(
         self,
@@ -411,6 +458,7 @@ class EmailTemplatesService:
         )
         
         self._templates[template_id] = template
+        self._compiled(template, recompile=True)
         return template
     
     async def update_template(
@@ -435,6 +483,7 @@ class EmailTemplatesService:
         
         updated_template = EmailTemplate(**template_dict)
         self._templates[template_id] = updated_template
+        self._compiled(updated_template, recompile=True)
         return updated_template
     
     async def delete_template(self, template_id: str) -> bool:
@@ -444,6 +493,7 @@ class EmailTemplatesService:
             return False
         
         del self._templates[template_id]
+        _compiled_templates.discard((template_id, template.version))
         return True
     
     async def render_template(
@@ -457,27 +507,37 @@ class EmailTemplatesService:
             return None
         
         # Add common variables
-        variables.setdefault("year", datetime.now(timezone.utc).year)
-        variables.setdefault("support_url", "https://megilance.com/support")
-        variables.setdefault("dashboard_url", "https://megilance.com/dashboard")
-        
-        subject = template.subject
-        html_body = template.html_body
-        text_body = template.text_body
-        
-        # Replace variables
-        for var_name, var_value in variables.items():
-            placeholder = f"{{{{{var_name}}}}}"
-            subject = subject.replace(placeholder, str(var_value))
-            html_body = html_body.replace(placeholder, str(var_value))
-            text_body = text_body.replace(placeholder, str(var_value))
+        self._with_common_variables(variables)
+        compiled = self._compiled(template)
         
         return {
-            "subject": subject,
-            "html_body": html_body,
-            "text_body": text_body
+            "subject": compiled.subject.render(variables),
+            "html_body": compiled.html_body.render(variables),
+            "text_body": compiled.text_body.render(variables)
         }
     
+    async def render_batch(
+        self,
+        template_type: EmailTemplateType,
+        variables_list: List[Dict[str, Any]]
+    ) -> Optional[List[Dict[str, str]]]:
+        """Render one template for many recipients (bulk notifications)."""
+        template = await self.get_template(template_type)
+        if not template:
+            return None
+        
+        compiled = self._compiled(template)
+        common = self._with_common_variables({})
+        rendered = []
+        for variables in variables_list:
+            values = {**common, **variables}
+            rendered.append({
+                "subject": compiled.subject.render(values),
+                "html_body": compiled.html_body.render(values),
+                "text_body": compiled.text_body.render(values)
+            })
+        return rendered
+    
     async def preview_template(
         self,
         template_id: str,
@@ -6,17 +6,20 @@ Handles escrow creation, listing, release, refund, and balance checks via Turso.
 from datetime import datetime, timezone
 from typing import List, Optional
 
-from app.db.turso_http import execute_query, to_str, parse_date
+from app.db.turso_http import execute_query, parse_date, to_float, to_int, to_str
+from app.services.ledger import (
+    escrow_account, get_ledger, latest_escrow_account, user_account,
+)
 
 
 def _row_to_escrow(row) -> dict:
-    """Convert Turso row to escrow dict"""
+    """Convert Turso row (raw values or wrapped cells) to escrow dict"""
     return {
-        "id": int(row[0].get("value")) if row[0].get("type") != "null" else None,
-        "contract_id": int(row[1].get("value")) if row[1].get("type") != "null" else None,
-        "client_id": int(row[2].get("value")) if row[2].get("type") != "null" else None,
-        "amount": float(row[3].get("value")) if row[3].get("type") != "null" else 0.0,
-        "released_amount": float(row[4].get("value")) if row[4].get("type") != "null" else 0.0,
+        "id": to_int(row[0]),
+        "contract_id": to_int(row[1]),
+        "client_id": to_int(row[2]),
+        "amount": to_float(row[3]) or 0.0,
+        "released_amount": to_float(row[4]) or 0.0,
         "status": to_str(row[5]) or "pending",
         "expires_at": parse_date(row[6]),
         "notes": to_str(row[7]),
@@ -42,7 +45,10 @@ def get_contract_parties(contract_id: int) -> Optional[dict]:
 
 
 def get_user_balance(user_id: int) -> float:
-    """Get user's account balance."""
+    """Get user's account balance (ledger running total, legacy column until the account is opened)."""
+    balance = get_ledger().balance(user_account(user_id), default=None)
+    if balance is not None:
+        return balance
     result = execute_query("SELECT account_balance FROM users WHERE id = ?", [user_id])
     if result and result.get("rows"):
         val = result["rows"][0][0]
@@ -50,30 +56,31 @@ def get_user_balance(user_id: int) -> float:
     return 0.0
 
 
-def update_user_balance(user_id: int, new_balance: float):
-    """Set user's account balance."""
-    execute_query("UPDATE users SET account_balance = ? WHERE id = ?", [new_balance, user_id])
-
-
 def create_escrow(contract_id: int, client_id: int, amount: float,
                   expires_at: Optional[str], notes: Optional[str]) -> dict:
-    """Insert a new escrow record, deduct client balance, and return the created escrow."""
-    now = datetime.now(timezone.utc).isoformat()
-    execute_query("""
-        INSERT INTO escrow (contract_id, client_id, amount, released_amount, status, expires_at, notes, created_at, updated_at)
-        VALUES (?, ?, ?, 0.0, 'active', ?, ?, ?, ?)
-    """, [contract_id, client_id, amount, expires_at, notes, now, now])
-
-    balance = get_user_balance(client_id)
-    update_user_balance(client_id, balance - amount)
+    """Insert a new escrow and move the funds from the client in one ledger posting.
 
-    result = execute_query(f"""
-        SELECT {ESCROW_SELECT_COLS}
-        FROM escrow WHERE contract_id = ? AND client_id = ? ORDER BY id DESC LIMIT 1
-    """, [contract_id, client_id])
-    if not result or not result.get("rows"):
+    Raises ``InsufficientFunds`` (nothing is written) if the client balance is too low.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    results = get_ledger().post(
+        "escrow_fund",
+        [(user_account(client_id), -amount), (latest_escrow_account(contract_id, client_id), amount)],
+        reference=f"contract:{contract_id}",
+        before=[{
+            "q": """INSERT INTO escrow (contract_id, client_id, amount, released_amount, status, expires_at, notes, created_at, updated_at)
+                    VALUES (?, ?, ?, 0.0, 'active', ?, ?, ?, ?)""",
+            "params": [contract_id, client_id, amount, expires_at, notes, now, now],
+        }],
+        after=[{
+            "q": f"SELECT {ESCROW_SELECT_COLS} FROM escrow WHERE contract_id = ? AND client_id = ? ORDER BY id DESC LIMIT 1",
+            "params": [contract_id, client_id],
+        }],
+    )
+    rows = results[-1].get("rows") if results else None
+    if not rows:
         return None
-    return _row_to_escrow(result["rows"][0])
+    return _row_to_escrow(rows[0])
 
 
 def expire_stale_escrows():
@@ -187,33 +194,41 @@ def get_freelancer_id_for_contract(contract_id: int) -> Optional[int]:
     return int(result["rows"][0][0].get("value"))
 
 
-def release_escrow_funds(escrow_id: int, release_amount: float,
-                         freelancer_id: int, current_released: float, total_amount: float):
-    """Transfer funds from escrow to freelancer."""
-    freelancer_balance = get_user_balance(freelancer_id)
-    new_freelancer_balance = freelancer_balance + release_amount
-    new_released = current_released + release_amount
-    new_status = "released" if new_released >= total_amount else "active"
-    now = datetime.now(timezone.utc).isoformat()
-
-    update_user_balance(freelancer_id, new_freelancer_balance)
-    execute_query("""
-        UPDATE escrow SET released_amount = ?, status = ?, updated_at = ? WHERE id = ?
-    """, [new_released, new_status, now, escrow_id])
-
+def release_escrow_funds(escrow_id: int, release_amount: float, freelancer_id: int):
+    """Transfer funds from escrow to freelancer in one ledger posting.
 
-def refund_escrow_funds(escrow_id: int, refund_amount: float,
-                        client_id: int, current_released: float):
-    """Refund escrow funds back to client."""
-    client_balance = get_user_balance(client_id)
-    new_client_balance = client_balance + refund_amount
-    new_released = current_released + refund_amount
+    Balances and ``released_amount`` are updated relatively, so concurrent
+    releases cannot overwrite each other; releasing more than the escrow
+    holds raises ``InsufficientFunds``.
+    """
     now = datetime.now(timezone.utc).isoformat()
-
-    update_user_balance(client_id, new_client_balance)
-    execute_query("""
-        UPDATE escrow SET released_amount = ?, status = 'refunded', updated_at = ? WHERE id = ?
-    """, [new_released, now, escrow_id])
+    get_ledger().post(
+        "escrow_release",
+        [(escrow_account(escrow_id), -release_amount), (user_account(freelancer_id), release_amount)],
+        reference=f"escrow:{escrow_id}",
+        after=[{
+            "q": """UPDATE escrow SET released_amount = COALESCE(released_amount, 0) + ?,
+                        status = CASE WHEN COALESCE(released_amount, 0) + ? >= amount - 0.005 THEN 'released' ELSE status END,
+                        updated_at = ?
+                    WHERE id = ?""",
+            "params": [release_amount, release_amount, now, escrow_id],
+        }],
+    )
+
+
+def refund_escrow_funds(escrow_id: int, refund_amount: float, client_id: int):
+    """Refund escrow funds back to client in one ledger posting."""
+    now = datetime.now(timezone.utc).isoformat()
+    get_ledger().post(
+        "escrow_refund",
+        [(escrow_account(escrow_id), -refund_amount), (user_account(client_id), refund_amount)],
+        reference=f"escrow:{escrow_id}",
+        after=[{
+            "q": """UPDATE escrow SET released_amount = COALESCE(released_amount, 0) + ?, status = 'refunded', updated_at = ?
+                    WHERE id = ?""",
+            "params": [refund_amount, now, escrow_id],
+        }],
+    )
 
 
 def get_escrow_ownership(escrow_id: int) -> Optional[dict]:
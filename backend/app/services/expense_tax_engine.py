@@ -9,6 +9,8 @@ import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
+from app.services.tax_kernel import bracket_tables
+
 logger = logging.getLogger("megilance")
 
 # ============================================================================
@@ -181,6 +183,8 @@ TAX_REGIONS: Dict[str, Dict[str, Any]] = {
     },
 }
 
+FEDERAL_TAX_TABLES = bracket_tables(TAX_REGIONS, "federal_brackets")
+
 # ============================================================================
 # Deduction Categories
 # ============================================================================
@@ -287,6 +291,7 @@ def calculate_taxes(
         expenses = {}
 
     region_data = TAX_REGIONS.get(region, TAX_REGIONS["us"])
+    federal_table = FEDERAL_TAX_TABLES.get(region, FEDERAL_TAX_TABLES["us"])
     currency = region_data["currency"]
 
     # ===== STEP 1: Total Income =====
@@ -335,7 +340,7 @@ def calculate_taxes(
     taxable_income = max(agi - deduction_amount, 0)
 
     # ===== STEP 6: Federal Income Tax =====
-    federal_tax = _calc_progressive_tax(taxable_income, region_data["federal_brackets"])
+    federal_tax = federal_table.tax(taxable_income)
 
     # ===== STEP 7: State/Provincial Tax =====
     state_tax = 0
@@ -439,7 +444,7 @@ def calculate_taxes(
             "state_label": state_label,
             "total_tax": round(total_tax, 2),
             "effective_rate": round(effective_rate, 1),
-            "marginal_rate": _get_marginal_rate(taxable_income, region_data["federal_brackets"]),
+            "marginal_rate": round(federal_table.marginal_rate(taxable_income) * 100, 1),
         },
         "quarterly": {
             "estimated_quarterly": round(quarterly_tax, 2),
@@ -467,37 +472,6 @@ def calculate_taxes(
     }
 
 
-def _calc_progressive_tax(income: float, brackets: List[Dict]) -> float:
-    """Calculate progressive income tax."""
-    tax = 0
-    for bracket in brackets:
-        b_min = bracket["min"]
-        b_max = bracket["max"]
-        rate = bracket["rate"]
-
-        if income <= b_min:
-            break
-
-        taxable_in = income - b_min
-        if b_max is not None:
-            taxable_in = min(taxable_in, b_max - b_min)
-
-        tax += taxable_in * rate
-
-    return tax
-
-
-def _get_marginal_rate(income: float, brackets: List[Dict]) -> float:
-    """Get the marginal tax rate for a given income."""
-    rate = 0
-    for bracket in brackets:
-        if income >= bracket["min"]:
-            rate = bracket["rate"]
-        else:
-            break
-    return round(rate * 100, 1)
-
-
 def _get_tax_recommendations(
     region, total_income, total_expenses, total_tax, effective_rate,
     retirement_contribution, health_insurance_premium, expenses,
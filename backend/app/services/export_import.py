@@ -1,6 +1,7 @@
 # @AI-HINT: Comprehensive data export/import system for user data portability
 """Export/Import Service - Data portability and backup system."""
 
+import asyncio
 import logging
 import json
 import csv
@@ -381,8 +382,15 @@ class ExportImportService:
             return output.getvalue().encode()
         
         elif format == ExportFormat.PDF:
-            # Would generate actual PDF in production
-            return b"PDF export placeholder"
+            # Export jobs already run in the background, so wait on the render pool for the bytes
+            from app.services.pdf_renderer import data_blocks, get_pdf_renderer
+            spec = {
+                "template": "export",
+                "title": "Data export",
+                "meta": [["Exported", datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")]],
+                "blocks": data_blocks(data),
+            }
+            return await asyncio.to_thread(get_pdf_renderer().render, spec)
         
         return json.dumps(data).encode()
     
@@ -5,15 +5,18 @@ This service powers the platform's project discovery feature, providing real opp
 to freelancers even before organic listings are available on MegiLance.
 """
 
-import requests
+import asyncio
+import httpx
 import json
 import re
 import hashlib
 import logging
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterable, NamedTuple
 from html import unescape
 
+from app.db.schema_registry import ensure_schema, register_schema
+
 logger = logging.getLogger("megilance.external_projects")
 
 
@@ -336,376 +339,469 @@ def calculate_trust_score(project: Dict[str, Any]) -> Tuple[float, bool, Optiona
 
 
 # ============================================================================
-# PROJECT SCRAPERS - One per source
+# SOURCE NORMALIZERS - One per source (raw API item -> project dict)
 # ============================================================================
 
-def scrape_remoteok() -> List[Dict[str, Any]]:
-    """
-    Scrape projects from RemoteOK free JSON API.
-    API: https://remoteok.com/api
-    Rate limit: Be respectful, cache results
-    """
-    projects = []
+def _parse_iso(date_str: Any) -> Optional[datetime]:
+    if not date_str:
+        return None
     try:
-        logger.info("Scraping RemoteOK...")
-        headers = {
-            "User-Agent": "MegiLance/1.0 (freelance platform aggregator)",
-            "Accept": "application/json"
-        }
-        resp = requests.get("https://remoteok.com/api", headers=headers, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
-        
-        # First item is legal notice, skip it
-        for item in data[1:]:
-            if not isinstance(item, dict):
-                continue
-            
-            tags = item.get("tags", [])
-            if isinstance(tags, str):
-                tags = [t.strip() for t in tags.split(",") if t.strip()]
-            
-            description = item.get("description", "")
-            title = item.get("position", "") or item.get("title", "")
-            company = item.get("company", "Unknown")
-            
-            # Parse posted date
-            posted_at = None
-            date_str = item.get("date", "")
-            if date_str:
-                try:
-                    posted_at = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                except Exception:
-                    pass
-            
-            budget_min = item.get("salary_min", 0)
-            budget_max = item.get("salary_max", 0)
-            
-            # Generate unique source ID
-            source_id = f"remoteok_{item.get('id', item.get('slug', ''))}"
-            
-            project = {
-                "source": "remoteok",
-                "source_id": source_id,
-                "source_url": item.get("url", f"https://remoteok.com/remote-jobs/{item.get('slug', '')}"),
-                "title": title,
-                "company": company,
-                "company_logo": item.get("company_logo", "") or item.get("logo", ""),
-                "description": description,
-                "description_plain": strip_html(description),
-                "tags": tags,
-                "category": categorize_project(title, tags, description),
-                "project_type": "remote",
-                "experience_level": detect_experience_level(title, description),
-                "budget_min": budget_min if budget_min and budget_min > 0 else None,
-                "budget_max": budget_max if budget_max and budget_max > 0 else None,
-                "budget_currency": "USD",
-                "budget_period": "yearly",
-                "location": item.get("location", "Remote") or "Remote",
-                "geo": None,
-                "apply_url": item.get("apply_url", item.get("url", "")),
-                "posted_at": posted_at,
-            }
-            
-            # Skip non-English projects
-            if not is_likely_english(title, description):
-                continue
+        parsed = datetime.fromisoformat(str(date_str).replace("Z", "+00:00"))
+    except Exception:
+        return None
+    # Feeds without an offset (e.g. Jobicy's pubDate) are UTC
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
 
-            trust_score, is_flagged, flag_reason = calculate_trust_score(project)
-            project["trust_score"] = trust_score
-            project["is_flagged"] = is_flagged
-            project["flag_reason"] = flag_reason
-            
-            projects.append(project)
-        
-        logger.info(f"RemoteOK: scraped {len(projects)} English projects")
-    except Exception as e:
-        logger.error(f"RemoteOK scraping error: {e}")
-    
-    return projects
 
+def normalize_remoteok(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """RemoteOK item (https://remoteok.com/api) -> project dict."""
+    if not isinstance(item, dict) or "legal" in item:
+        return None  # First item of the feed is a legal notice
 
-def scrape_jobicy() -> List[Dict[str, Any]]:
-    """
-    Scrape projects from Jobicy free API.
-    API: https://jobicy.com/api/v2/remote-jobs
-    Free tier, no API key needed, structured JSON response
-    """
-    projects = []
-    try:
-        logger.info("Scraping Jobicy...")
-        headers = {
-            "User-Agent": "MegiLance/1.0 (freelance platform aggregator)",
-            "Accept": "application/json"
-        }
-        # Get 50 projects at a time
-        resp = requests.get(
-            "https://jobicy.com/api/v2/remote-jobs?count=50",
-            headers=headers,
-            timeout=30
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        
-        for item in data.get("jobs", []):
-            title = item.get("jobTitle", "")
-            company = item.get("companyName", "Unknown")
-            description = item.get("jobDescription", "")
-            excerpt = item.get("jobExcerpt", "")
-            
-            # Parse tags from industry
-            industries = item.get("jobIndustry", [])
-            tags = []
-            if isinstance(industries, list):
-                tags = [i.replace("&amp;", "&") for i in industries]
-            
-            # Posted date
-            posted_at = None
-            pub_date = item.get("pubDate", "")
-            if pub_date:
-                try:
-                    posted_at = datetime.fromisoformat(pub_date.replace("Z", "+00:00"))
-                except Exception:
-                    pass
-            
-            source_id = f"jobicy_{item.get('id', '')}"
-            
-            project = {
-                "source": "jobicy",
-                "source_id": source_id,
-                "source_url": item.get("url", ""),
-                "title": title,
-                "company": company,
-                "company_logo": item.get("companyLogo", ""),
-                "description": description or excerpt,
-                "description_plain": strip_html(description or excerpt),
-                "tags": tags,
-                "category": categorize_project(title, tags, description),
-                "project_type": "remote",
-                "experience_level": detect_experience_level(title, description),
-                "budget_min": item.get("salaryMin"),
-                "budget_max": item.get("salaryMax"),
-                "budget_currency": item.get("salaryCurrency", "USD"),
-                "budget_period": item.get("salaryPeriod", "yearly"),
-                "location": item.get("jobGeo", "Remote") or "Remote",
-                "geo": item.get("jobGeo"),
-                "apply_url": item.get("url", ""),
-                "posted_at": posted_at,
-            }
-            
-            # Skip non-English projects
-            if not is_likely_english(title, description):
-                continue
+    tags = item.get("tags", [])
+    if isinstance(tags, str):
+        tags = [t.strip() for t in tags.split(",") if t.strip()]
 
-            trust_score, is_flagged, flag_reason = calculate_trust_score(project)
-            project["trust_score"] = trust_score
-            project["is_flagged"] = is_flagged
-            project["flag_reason"] = flag_reason
-            
-            projects.append(project)
-        
-        logger.info(f"Jobicy: scraped {len(projects)} English projects")
-    except Exception as e:
-        logger.error(f"Jobicy scraping error: {e}")
-    
-    return projects
+    description = item.get("description", "")
+    title = item.get("position", "") or item.get("title", "")
+    budget_min = item.get("salary_min", 0)
+    budget_max = item.get("salary_max", 0)
 
+    return {
+        "source": "remoteok",
+        "source_id": f"remoteok_{item.get('id', item.get('slug', ''))}",
+        "source_url": item.get("url", f"https://remoteok.com/remote-jobs/{item.get('slug', '')}"),
+        "title": title,
+        "company": item.get("company", "Unknown"),
+        "company_logo": item.get("company_logo", "") or item.get("logo", ""),
+        "description": description,
+        "description_plain": strip_html(description),
+        "tags": tags,
+        "category": categorize_project(title, tags, description),
+        "project_type": "remote",
+        "experience_level": detect_experience_level(title, description),
+        "budget_min": budget_min if budget_min and budget_min > 0 else None,
+        "budget_max": budget_max if budget_max and budget_max > 0 else None,
+        "budget_currency": "USD",
+        "budget_period": "yearly",
+        "location": item.get("location", "Remote") or "Remote",
+        "geo": None,
+        "apply_url": item.get("apply_url", item.get("url", "")),
+        "posted_at": _parse_iso(item.get("date", "")),
+    }
 
-def scrape_arbeitnow() -> List[Dict[str, Any]]:
-    """
-    Scrape projects from Arbeitnow free API.
-    API: https://www.arbeitnow.com/api/job-board-api
-    Free, no API key needed
-    """
-    projects = []
-    try:
-        logger.info("Scraping Arbeitnow...")
-        headers = {
-            "User-Agent": "MegiLance/1.0 (freelance platform aggregator)",
-            "Accept": "application/json"
-        }
-        resp = requests.get(
-            "https://www.arbeitnow.com/api/job-board-api",
-            headers=headers,
-            timeout=30
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        
-        for item in data.get("data", []):
-            title = item.get("title", "")
-            company = item.get("company_name", "Unknown")
-            description = item.get("description", "")
-            
-            tags = item.get("tags", [])
-            if isinstance(tags, str):
-                tags = [t.strip() for t in tags.split(",") if t.strip()]
-            
-            posted_at = None
-            created = item.get("created_at")
-            if created:
-                try:
-                    posted_at = datetime.fromtimestamp(created, tz=timezone.utc)
-                except Exception:
-                    pass
-            
-            source_id = f"arbeitnow_{item.get('slug', hashlib.md5(title.encode()).hexdigest()[:10])}"
-            
-            project = {
-                "source": "arbeitnow",
-                "source_id": source_id,
-                "source_url": item.get("url", ""),
-                "title": title,
-                "company": company,
-                "company_logo": item.get("company_logo", ""),
-                "description": description,
-                "description_plain": strip_html(description),
-                "tags": tags,
-                "category": categorize_project(title, tags, description),
-                "project_type": "remote" if item.get("remote", False) else "onsite",
-                "experience_level": detect_experience_level(title, description),
-                "budget_min": None,
-                "budget_max": None,
-                "budget_currency": "EUR",
-                "budget_period": "fixed",
-                "location": item.get("location", "Remote") or "Remote",
-                "geo": None,
-                "apply_url": item.get("url", ""),
-                "posted_at": posted_at,
-            }
-            
-            # Skip non-English projects (Arbeitnow returns many German listings)
-            if not is_likely_english(title, description):
-                continue
 
-            trust_score, is_flagged, flag_reason = calculate_trust_score(project)
-            project["trust_score"] = trust_score
-            project["is_flagged"] = is_flagged
-            project["flag_reason"] = flag_reason
-            
-            projects.append(project)
-        
-        logger.info(f"Arbeitnow: scraped {len(projects)} English projects")
-    except Exception as e:
-        logger.error(f"Arbeitnow scraping error: {e}")
-    
-    return projects
+def normalize_jobicy(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Jobicy item (https://jobicy.com/api/v2/remote-jobs) -> project dict."""
+    title = item.get("jobTitle", "")
+    description = item.get("jobDescription", "")
+    excerpt = item.get("jobExcerpt", "")
+
+    # Parse tags from industry
+    industries = item.get("jobIndustry", [])
+    tags = [i.replace("&amp;", "&") for i in industries] if isinstance(industries, list) else []
+
+    return {
+        "source": "jobicy",
+        "source_id": f"jobicy_{item.get('id', '')}",
+        "source_url": item.get("url", ""),
+        "title": title,
+        "company": item.get("companyName", "Unknown"),
+        "company_logo": item.get("companyLogo", ""),
+        "description": description or excerpt,
+        "description_plain": strip_html(description or excerpt),
+        "tags": tags,
+        "category": categorize_project(title, tags, description),
+        "project_type": "remote",
+        "experience_level": detect_experience_level(title, description),
+        "budget_min": item.get("salaryMin"),
+        "budget_max": item.get("salaryMax"),
+        "budget_currency": item.get("salaryCurrency", "USD"),
+        "budget_period": item.get("salaryPeriod", "yearly"),
+        "location": item.get("jobGeo", "Remote") or "Remote",
+        "geo": item.get("jobGeo"),
+        "apply_url": item.get("url", ""),
+        "posted_at": _parse_iso(item.get("pubDate", "")),
+    }
+
+
+def normalize_arbeitnow(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Arbeitnow item (https://www.arbeitnow.com/api/job-board-api) -> project dict."""
+    title = item.get("title", "")
+    description = item.get("description", "")
+
+    tags = item.get("tags", [])
+    if isinstance(tags, str):
+        tags = [t.strip() for t in tags.split(",") if t.strip()]
+
+    posted_at = None
+    created = item.get("created_at")
+    if created:
+        try:
+            posted_at = datetime.fromtimestamp(created, tz=timezone.utc)
+        except Exception:
+            pass
+
+    return {
+        "source": "arbeitnow",
+        "source_id": f"arbeitnow_{item.get('slug', hashlib.md5(title.encode()).hexdigest()[:10])}",
+        "source_url": item.get("url", ""),
+        "title": title,
+        "company": item.get("company_name", "Unknown"),
+        "company_logo": item.get("company_logo", ""),
+        "description": description,
+        "description_plain": strip_html(description),
+        "tags": tags,
+        "category": categorize_project(title, tags, description),
+        "project_type": "remote" if item.get("remote", False) else "onsite",
+        "experience_level": detect_experience_level(title, description),
+        "budget_min": None,
+        "budget_max": None,
+        "budget_currency": "EUR",
+        "budget_period": "fixed",
+        "location": item.get("location", "Remote") or "Remote",
+        "geo": None,
+        "apply_url": item.get("url", ""),
+        "posted_at": posted_at,
+    }
+
+
+class ScrapeSource(NamedTuple):
+    """One external feed: where to fetch it and how to read its items."""
+    name: str
+    url: str
+    items: Callable[[Any], Iterable[Any]]
+    normalize: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+SOURCES: List[ScrapeSource] = [
+    ScrapeSource("remoteok", "https://remoteok.com/api", lambda data: data, normalize_remoteok),
+    ScrapeSource("jobicy", "https://jobicy.com/api/v2/remote-jobs?count=50",
+                 lambda data: data.get("jobs", []), normalize_jobicy),
+    ScrapeSource("arbeitnow", "https://www.arbeitnow.com/api/job-board-api",
+                 lambda data: data.get("data", []), normalize_arbeitnow),
+]
+
+
+def score_project(project: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach trust score, flag and content hash to a normalized project."""
+    trust_score, is_flagged, flag_reason = calculate_trust_score(project)
+    project["trust_score"] = trust_score
+    project["is_flagged"] = is_flagged
+    project["flag_reason"] = flag_reason
+    project["content_hash"] = project_content_hash(project)
+    return project
+
+
+def project_content_hash(project: Dict[str, Any]) -> str:
+    """Stable hash of everything we store for a project (not counters/timestamps)."""
+    payload = {k: v for k, v in project.items() if k != "content_hash"}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
 
 
 # ============================================================================
-# MAIN SCRAPING ORCHESTRATOR
+# PERSISTENCE - incremental upserts keyed by source_id + content hash
 # ============================================================================
 
-def scrape_all_sources() -> Dict[str, Any]:
+EXTERNAL_PROJECTS_DDL = [
+    """CREATE TABLE IF NOT EXISTS external_projects (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source TEXT NOT NULL,
+        source_id TEXT UNIQUE NOT NULL,
+        source_url TEXT NOT NULL,
+        title TEXT NOT NULL,
+        company TEXT NOT NULL,
+        company_logo TEXT,
+        description TEXT NOT NULL,
+        description_plain TEXT,
+        category TEXT DEFAULT 'Other',
+        tags TEXT DEFAULT '[]',
+        project_type TEXT DEFAULT 'remote',
+        experience_level TEXT DEFAULT 'any',
+        budget_min REAL,
+        budget_max REAL,
+        budget_currency TEXT DEFAULT 'USD',
+        budget_period TEXT DEFAULT 'fixed',
+        location TEXT DEFAULT 'Remote',
+        geo TEXT,
+        apply_url TEXT NOT NULL,
+        trust_score REAL DEFAULT 0.5,
+        is_verified INTEGER DEFAULT 0,
+        is_flagged INTEGER DEFAULT 0,
+        flag_reason TEXT,
+        posted_at TEXT,
+        scraped_at TEXT DEFAULT (datetime('now')),
+        expires_at TEXT,
+        views_count INTEGER DEFAULT 0,
+        clicks_count INTEGER DEFAULT 0,
+        saves_count INTEGER DEFAULT 0
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_ext_projects_category ON external_projects(category)",
+    "CREATE INDEX IF NOT EXISTS idx_ext_projects_source ON external_projects(source)",
+    "CREATE INDEX IF NOT EXISTS idx_ext_projects_posted ON external_projects(posted_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_ext_projects_trust ON external_projects(trust_score DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_ext_projects_flagged ON external_projects(is_flagged)",
+]
+register_schema("external_projects", EXTERNAL_PROJECTS_DDL)
+
+SCRAPER_STATE_DDL = [
+    """CREATE TABLE IF NOT EXISTS external_scrape_state (
+        source TEXT PRIMARY KEY,
+        etag TEXT,
+        last_modified TEXT,
+        fetched_at TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS external_project_hashes (
+        source_id TEXT PRIMARY KEY,
+        content_hash TEXT NOT NULL,
+        updated_at TEXT
+    )""",
+]
+register_schema("external_scraper_state", SCRAPER_STATE_DDL)
+
+_STORED_COLUMNS = [
+    "source", "source_id", "source_url",
+    "title", "company", "company_logo",
+    "description", "description_plain",
+    "category", "tags", "project_type", "experience_level",
+    "budget_min", "budget_max", "budget_currency", "budget_period",
+    "location", "geo", "apply_url",
+    "trust_score", "is_flagged", "flag_reason",
+    "posted_at", "scraped_at",
+]
+
+# Engagement counters and manual verification survive re-scrapes
+_UPSERT_PROJECT_SQL = (
+    f"INSERT INTO external_projects ({', '.join(_STORED_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _STORED_COLUMNS)}) "
+    "ON CONFLICT(source_id) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c in _STORED_COLUMNS if c != "source_id")
+)
+
+_UPSERT_HASH_SQL = (
+    "INSERT INTO external_project_hashes (source_id, content_hash, updated_at) VALUES (?, ?, ?) "
+    "ON CONFLICT(source_id) DO UPDATE SET content_hash = excluded.content_hash, updated_at = excluded.updated_at"
+)
+
+_WRITE_BATCH_LISTINGS = 12  # Turso HTTP API batch limit is 25 statements; two per listing
+_TOUCH_CHUNK = 200
+
+
+def ensure_scraper_tables(turso) -> None:
+    ensure_schema("external_scraper_state", backend=turso)
+
+
+def _project_statements(project: Dict[str, Any], now: str) -> List[Dict[str, Any]]:
+    posted_at = project.get("posted_at")
+    if isinstance(posted_at, datetime):
+        posted_at = posted_at.isoformat()
+    row = {
+        **project,
+        "description": project["description"][:10000],
+        "description_plain": project.get("description_plain", "")[:5000],
+        "tags": json.dumps(project.get("tags", [])),
+        "budget_currency": project.get("budget_currency", "USD"),
+        "budget_period": project.get("budget_period", "fixed"),
+        "trust_score": project.get("trust_score", 0.5),
+        "is_flagged": 1 if project.get("is_flagged", False) else 0,
+        "posted_at": posted_at,
+        "scraped_at": now,
+    }
+    return [
+        {"q": _UPSERT_PROJECT_SQL, "params": [row.get(c) for c in _STORED_COLUMNS]},
+        {"q": _UPSERT_HASH_SQL, "params": [project["source_id"], project["content_hash"], now]},
+    ]
+
+
+def _execute_batch(turso, listings: List[List[Dict[str, Any]]]) -> List[int]:
     """
-    Scrape all project sources and return combined results with stats.
-    This is the main entry point called by the API endpoint.
+    Write listings in one batch; if it fails, retry each listing as its own
+    transaction so a bad row doesn't sink the others. A listing's row and its
+    content hash always commit together. Returns the positions that failed.
     """
-    all_projects = []
-    errors = []
-    sources_scraped = []
-    
-    # Scrape each source
-    scrapers = [
-        ("remoteok", scrape_remoteok),
-        ("jobicy", scrape_jobicy),
-        ("arbeitnow", scrape_arbeitnow),
-    ]
-    
-    for source_name, scraper_fn in scrapers:
+    try:
+        turso.execute_many([statement for statements in listings for statement in statements])
+        return []
+    except Exception as e:
+        logger.error(f"Batch save error: {e}")
+    failed = []
+    for i, statements in enumerate(listings):
         try:
-            projects = scraper_fn()
-            all_projects.extend(projects)
-            sources_scraped.append(source_name)
-        except Exception as e:
-            errors.append(f"{source_name}: {str(e)}")
-            logger.error(f"Scraper {source_name} failed: {e}")
-    
-    # Filter out flagged projects (but keep them for admin review)
-    verified_projects = [p for p in all_projects if not p.get("is_flagged", False)]
-    flagged_projects = [p for p in all_projects if p.get("is_flagged", False)]
-    
-    return {
-        "all_projects": all_projects,
-        "verified_projects": verified_projects,
-        "flagged_projects": flagged_projects,
-        "stats": {
-            "total_scraped": len(all_projects),
-            "verified": len(verified_projects),
-            "flagged": len(flagged_projects),
-            "sources": sources_scraped,
-            "errors": errors,
-        }
+            turso.execute_many(statements)
+        except Exception as e2:
+            logger.error(f"Individual save error: {e2}")
+            failed.append(i)
+    return failed
+
+
+def _touch_projects(turso, source_ids: List[str], now: str) -> None:
+    """Bump scraped_at for listings that are still live but unchanged."""
+    for i in range(0, len(source_ids), _TOUCH_CHUNK):
+        chunk = source_ids[i:i + _TOUCH_CHUNK]
+        turso.execute(
+            f"UPDATE external_projects SET scraped_at = ? WHERE source_id IN ({', '.join('?' for _ in chunk)})",
+            [now, *chunk],
+        )
+
+
+def _load_state(turso) -> Tuple[Dict[str, Tuple[Optional[str], Optional[str]]], Dict[str, str]]:
+    validators = {
+        row[0]: (row[1], row[2])
+        for row in (turso.execute("SELECT source, etag, last_modified FROM external_scrape_state") or {}).get("rows", [])
+    }
+    hashes = {
+        row[0]: row[1]
+        for row in (turso.execute("SELECT source_id, content_hash FROM external_project_hashes") or {}).get("rows", [])
     }
+    return validators, hashes
+
+
+def forget_project_hashes(turso) -> None:
+    """Drop content hashes of listings no longer in external_projects (after cleanup)."""
+    ensure_scraper_tables(turso)
+    turso.execute(
+        "DELETE FROM external_project_hashes WHERE source_id NOT IN (SELECT source_id FROM external_projects)"
+    )
+
+
+# ============================================================================
+# MAIN SCRAPING PIPELINE
+# ============================================================================
+
+_QUEUE_SIZE = 200
+_DONE = object()
 
 
-def save_projects_to_db(turso, projects: List[Dict[str, Any]]) -> Dict[str, int]:
+async def scrape_all_sources(
+    turso,
+    sources: Optional[List[ScrapeSource]] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> Dict[str, Any]:
     """
-    Save scraped projects to Turso database using batch INSERT OR REPLACE
-    for maximum performance (single HTTP request per batch of 25).
-    Returns counts of inserted and updated projects.
+    Fetch every source concurrently and persist only new or changed listings.
+
+    Stages run as a bounded pipeline (queues of ``_QUEUE_SIZE``):
+    fetch + parse (one task per source) -> normalize, language filter, trust
+    score and hash -> batched DB writes. Conditional requests (ETag /
+    If-Modified-Since) skip unchanged feeds entirely; per-listing content
+    hashes skip unchanged rows.
     """
-    saved = 0
-    errors = 0
-    batch_size = 25  # Turso HTTP API batch limit
+    sources = SOURCES if sources is None else sources
+    ensure_scraper_tables(turso)
+    validators, known_hashes = await asyncio.to_thread(_load_state, turso)
     now = datetime.now(timezone.utc).isoformat()
 
-    # Build all statements for batch execution
-    statements = []
-    for project in projects:
+    stats: Dict[str, Any] = {
+        "total_scraped": 0, "verified": 0, "flagged": 0,
+        "inserted": 0, "updated": 0, "unchanged": 0, "write_errors": 0,
+        "sources": [], "not_modified": [], "errors": [],
+    }
+    raw_queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+    write_queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+    unchanged: List[str] = []
+    new_validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+    failed_sources: set = set()
+
+    async def fetch(http: httpx.AsyncClient, source: ScrapeSource) -> None:
+        etag, last_modified = validators.get(source.name, (None, None))
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
         try:
-            tags_json = json.dumps(project.get("tags", []))
-            posted_at = project.get("posted_at")
-            if posted_at and isinstance(posted_at, datetime):
-                posted_at = posted_at.isoformat()
-
-            statements.append({
-                "q": """INSERT OR REPLACE INTO external_projects (
-                    source, source_id, source_url,
-                    title, company, company_logo,
-                    description, description_plain,
-                    category, tags, project_type, experience_level,
-                    budget_min, budget_max, budget_currency, budget_period,
-                    location, geo, apply_url,
-                    trust_score, is_verified, is_flagged, flag_reason,
-                    posted_at, scraped_at,
-                    views_count, clicks_count, saves_count
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                "params": [
-                    project["source"], project["source_id"], project["source_url"],
-                    project["title"], project["company"], project.get("company_logo"),
-                    project["description"][:10000], project.get("description_plain", "")[:5000],
-                    project["category"], tags_json, project["project_type"], project["experience_level"],
-                    project.get("budget_min"), project.get("budget_max"),
-                    project.get("budget_currency", "USD"), project.get("budget_period", "fixed"),
-                    project["location"], project.get("geo"), project["apply_url"],
-                    project.get("trust_score", 0.5), 0,
-                    1 if project.get("is_flagged", False) else 0,
-                    project.get("flag_reason"),
-                    posted_at, now,
-                    0, 0, 0
-                ]
-            })
+            logger.info(f"Scraping {source.name}...")
+            resp = await http.get(source.url, headers=headers)
+            if resp.status_code == 304:
+                stats["not_modified"].append(source.name)
+                await asyncio.to_thread(
+                    turso.execute, "UPDATE external_projects SET scraped_at = ? WHERE source = ?", [now, source.name]
+                )
+                return
+            resp.raise_for_status()
+            data = resp.json()
+            for item in source.items(data):
+                await raw_queue.put((source, item))
+            stats["sources"].append(source.name)
+            new_validators[source.name] = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
         except Exception as e:
-            logger.error(f"Error preparing project {project.get('source_id')}: {e}")
-            errors += 1
+            stats["errors"].append(f"{source.name}: {str(e)}")
+            logger.error(f"{source.name} scraping error: {e}")
 
-    # Execute in batches
-    for i in range(0, len(statements), batch_size):
-        batch = statements[i:i + batch_size]
+    async def fetch_all() -> None:
+        http = client or httpx.AsyncClient(
+            timeout=30.0,
+            headers={"User-Agent": "MegiLance/1.0 (freelance platform aggregator)", "Accept": "application/json"},
+        )
         try:
-            turso.execute_many(batch)
-            saved += len(batch)
-            logger.info(f"Batch saved {len(batch)} projects ({i + len(batch)}/{len(statements)})")
-        except Exception as e:
-            logger.error(f"Batch save error at offset {i}: {e}")
-            # Fallback: try one-by-one for this batch
-            for stmt in batch:
-                try:
-                    turso.execute(stmt["q"], stmt["params"])
-                    saved += 1
-                except Exception as e2:
-                    logger.error(f"Individual save error: {e2}")
-                    errors += 1
-
-    return {"inserted": saved, "updated": 0, "errors": errors}
+            await asyncio.gather(*(fetch(http, source) for source in sources))
+        finally:
+            if client is None:
+                await http.aclose()
+            await raw_queue.put(_DONE)
+
+    async def process() -> None:
+        while (entry := await raw_queue.get()) is not _DONE:
+            source, item = entry
+            try:
+                project = source.normalize(item)
+                # Skip non-English projects (Arbeitnow returns many German listings)
+                if project is None or not is_likely_english(project["title"], project["description"]):
+                    continue
+                score_project(project)
+            except Exception as e:
+                logger.error(f"{source.name} item parse error: {e}")
+                continue
+            stats["total_scraped"] += 1
+            stats["flagged" if project["is_flagged"] else "verified"] += 1
+            previous = known_hashes.get(project["source_id"])
+            if previous == project["content_hash"]:
+                unchanged.append(project["source_id"])
+                continue
+            known_hashes[project["source_id"]] = project["content_hash"]
+            await write_queue.put((source.name, project, previous is not None))
+        await write_queue.put(_DONE)
+
+    async def flush(batch: List[Tuple[str, Dict[str, Any], bool]]) -> None:
+        listings = [_project_statements(project, now) for _, project, _ in batch]
+        failed = set(await asyncio.to_thread(_execute_batch, turso, listings))
+        for i, (name, _, existed) in enumerate(batch):
+            if i in failed:
+                stats["write_errors"] += 1
+                failed_sources.add(name)
+            else:
+                stats["updated" if existed else "inserted"] += 1
+
+    async def write() -> None:
+        batch: List[Tuple[str, Dict[str, Any], bool]] = []
+        while (entry := await write_queue.get()) is not _DONE:
+            batch.append(entry)
+            if len(batch) >= _WRITE_BATCH_LISTINGS:
+                await flush(batch)
+                batch = []
+        if batch:
+            await flush(batch)
+
+    await asyncio.gather(fetch_all(), process(), write())
+
+    if unchanged:
+        await asyncio.to_thread(_touch_projects, turso, unchanged, now)
+    # A source with failed writes keeps its old validators, so the next run refetches it in full
+    saved = {name: v for name, v in new_validators.items() if name not in failed_sources}
+    if saved:
+        await asyncio.to_thread(turso.execute_many, [
+            {
+                "q": "INSERT INTO external_scrape_state (source, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?) "
+                     "ON CONFLICT(source) DO UPDATE SET etag = excluded.etag, "
+                     "last_modified = excluded.last_modified, fetched_at = excluded.fetched_at",
+                "params": [name, etag, last_modified, now],
+            }
+            for name, (etag, last_modified) in saved.items()
+        ])
+
+    stats["unchanged"] = len(unchanged)
+    logger.info(
+        f"Scrape complete: {stats['total_scraped']} listings, {stats['inserted']} new, "
+        f"{stats['updated']} changed, {stats['unchanged']} unchanged, not modified: {stats['not_modified']}"
+    )
+    return stats
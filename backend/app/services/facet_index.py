@@ -0,0 +1,406 @@
+# @AI-HINT: In-memory faceted index - per-value bitmaps, bit-sliced range filters, presorted top-k pages
+"""
+Facet Index - filtered counts, facet counts and sorted pages without SQL.
+
+Every document occupies a slot. For each facet value the index keeps a
+bitmap (a Python ``int`` used as a bitset) of the slots holding it, so a
+filter is a handful of big-integer ANDs/ORs and a count is ``bit_count()``.
+
+- Categorical facets (single- or multi-valued) map value -> bitmap.
+- Numeric range filters use a bit-sliced index: one bitmap per bit of the
+  (scaled, integer) value, so ``value >= c`` costs O(bits) bitmap ops no
+  matter how many documents match.
+- Sort keys are held per slot and in presorted (key, slot) arrays. A page
+  either walks the presorted array testing membership (dense filters) or
+  enumerates the matching slots and sorts them (sparse filters), whichever
+  touches fewer entries.
+
+Documents can be loaded in bulk (bitmaps assembled column by column in
+bytearrays) and then upserted/removed one at a time.
+"""
+
+import bisect
+import heapq
+import math
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+_NEG_INF = float("-inf")
+
+
+def _sort_key(value: Any) -> float:
+    # SQLite orders NULL below every number; keep that for ASC/DESC parity
+    if value is None:
+        return _NEG_INF
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return _NEG_INF
+
+
+class RangeField:
+    """Bit-sliced index over a non-negative numeric field (scaled to integers)."""
+
+    def __init__(self, scale: int = 1, bits: int = 40):
+        self.scale = scale
+        self.bits = bits
+        self.max_value = (1 << bits) - 1
+        self.present = 0
+        self.slices: List[int] = [0] * bits
+
+    def encode(self, value: Any) -> Optional[int]:
+        if value is None:
+            return None
+        try:
+            scaled = int(round(float(value) * self.scale))
+        except (TypeError, ValueError):
+            return None
+        return min(max(scaled, 0), self.max_value)
+
+    def set(self, slot: int, encoded: Optional[int]) -> None:
+        if encoded is None:
+            return
+        mask = 1 << slot
+        self.present |= mask
+        for i in range(self.bits):
+            if (encoded >> i) & 1:
+                self.slices[i] |= mask
+
+    def clear(self, slot: int, encoded: Optional[int]) -> None:
+        if encoded is None:
+            return
+        mask = ~(1 << slot)
+        self.present &= mask
+        for i in range(self.bits):
+            if (encoded >> i) & 1:
+                self.slices[i] &= mask
+
+    def at_least(self, value: float) -> int:
+        threshold = math.ceil(round(value * self.scale, 6))
+        if threshold <= 0:
+            return self.present
+        if threshold > self.max_value:
+            return 0
+        greater, equal = 0, self.present
+        for i in reversed(range(self.bits)):
+            bitmap = self.slices[i]
+            if (threshold >> i) & 1:
+                equal &= bitmap
+            else:
+                greater |= equal & bitmap
+                equal &= ~bitmap
+        return greater | equal
+
+    def at_most(self, value: float) -> int:
+        threshold = math.floor(round(value * self.scale, 6))
+        if threshold < 0:
+            return 0
+        if threshold >= self.max_value:
+            return self.present
+        less, equal = 0, self.present
+        for i in reversed(range(self.bits)):
+            bitmap = self.slices[i]
+            if (threshold >> i) & 1:
+                less |= equal & ~bitmap
+                equal &= bitmap
+            else:
+                equal &= ~bitmap
+        return less | equal
+
+
+class FacetIndex:
+    """
+    Bitmap index over documents with categorical facets, ranges and sort keys.
+
+    - ``facets``: single-valued categorical fields.
+    - ``multi_facets``: list-valued categorical fields (e.g. skills).
+    - ``ranges``: numeric fields filterable by bounds, mapped to their scale
+      (``{"budget_min": 100}`` stores cents).
+    - ``sorts``: numeric fields pages can be ordered by.
+    """
+
+    def __init__(
+        self,
+        facets: Sequence[str] = (),
+        multi_facets: Sequence[str] = (),
+        ranges: Optional[Dict[str, int]] = None,
+        sorts: Sequence[str] = (),
+    ):
+        self.facets = tuple(facets)
+        self.multi_facets = tuple(multi_facets)
+        self.sorts = tuple(sorts)
+        self._ranges: Dict[str, RangeField] = {name: RangeField(scale) for name, scale in (ranges or {}).items()}
+        self._bitmaps: Dict[str, Dict[Any, int]] = {f: {} for f in self.facets + self.multi_facets}
+        self._live = 0
+        self._slot_of: Dict[Any, int] = {}
+        self._ids: List[Any] = []
+        self._payloads: List[Any] = []
+        self._values: List[Optional[Dict[str, Any]]] = []
+        self._free: List[int] = []
+        self._keys: Dict[str, List[float]] = {s: [] for s in self.sorts}
+        self._orders: Dict[str, List[Tuple[float, int]]] = {s: [] for s in self.sorts}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, doc_id: Any) -> bool:
+        return doc_id in self._slot_of
+
+    def get(self, doc_id: Any) -> Any:
+        slot = self._slot_of.get(doc_id)
+        return None if slot is None else self._payloads[slot]
+
+    def values(self, facet: str) -> List[Any]:
+        """Distinct values currently indexed for ``facet``."""
+        return [v for v, bitmap in self._bitmaps[facet].items() if bitmap]
+
+    # ------------------------------------------------------------------
+    # Loading and updates
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _facet_values(value: Any) -> Iterable[Any]:
+        if value is None:
+            return ()
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return set(v for v in value if v is not None)
+        return (value,)
+
+    def bulk_load(self, documents: Iterable[Tuple[Any, Dict[str, Any], Any]]) -> None:
+        """Replace the whole index with ``(doc_id, values, payload)`` triples."""
+        docs = list(documents)
+        size = len(docs)
+        nbytes = (size + 7) // 8
+        ids = [doc_id for doc_id, _, _ in docs]
+        payloads = [payload for _, _, payload in docs]
+        rows = [values for _, values, _ in docs]
+        stored: List[Dict[str, Any]] = [{} for _ in range(size)]
+
+        # Column at a time: bits are set in bytearrays, converted to ints once
+        bitmaps: Dict[str, Dict[Any, int]] = {}
+        for facet in self._bitmaps:
+            arrays: Dict[Any, bytearray] = {}
+            for slot, values in enumerate(rows):
+                value = values.get(facet)
+                stored[slot][facet] = value
+                if value is None:
+                    continue
+                byte, mask = slot >> 3, 1 << (slot & 7)
+                for v in self._facet_values(value):
+                    array = arrays.get(v)
+                    if array is None:
+                        array = arrays[v] = bytearray(nbytes)
+                    array[byte] |= mask
+            bitmaps[facet] = {v: int.from_bytes(a, "little") for v, a in arrays.items()}
+
+        slices: Dict[str, Tuple[List[int], int]] = {}
+        for name, field in self._ranges.items():
+            encoded = [field.encode(values.get(name)) for values in rows]
+            for slot, value in enumerate(encoded):
+                stored[slot][name] = value
+            present = int("".join(["0" if v is None else "1" for v in reversed(encoded)]) or "0", 2)
+            # Transpose: one fixed-width binary string per slot (highest slot
+            # first), so bit i of every slot is a single extended slice
+            width = max((v.bit_length() for v in encoded if v is not None), default=0)
+            column = "".join([format(v or 0, f"0{width}b") for v in reversed(encoded)]) if width else ""
+            bit_slices = [int(column[width - 1 - i::width], 2) if i < width else 0 for i in range(field.bits)]
+            slices[name] = (bit_slices, present)
+
+        keys = {s: [_sort_key(values.get(s)) for values in rows] for s in self.sorts}
+        orders = {s: sorted(zip(keys[s], range(size))) for s in self.sorts}
+
+        with self._lock:
+            self._bitmaps = bitmaps
+            for name, (bit_slices, present_bitmap) in slices.items():
+                self._ranges[name].slices = bit_slices
+                self._ranges[name].present = present_bitmap
+            self._live = (1 << size) - 1
+            self._ids, self._payloads, self._values = ids, payloads, stored
+            self._slot_of = {doc_id: slot for slot, doc_id in enumerate(ids)}
+            self._free = []
+            self._keys = keys
+            self._orders = orders
+
+    def upsert(self, doc_id: Any, values: Dict[str, Any], payload: Any = None) -> None:
+        """Insert or replace one document."""
+        with self._lock:
+            slot = self._slot_of.get(doc_id)
+            if slot is not None:
+                self._unindex(slot)
+            elif self._free:
+                slot = self._free.pop()
+            else:
+                slot = len(self._ids)
+                self._ids.append(None)
+                self._payloads.append(None)
+                self._values.append(None)
+                for s in self.sorts:
+                    self._keys[s].append(_NEG_INF)
+
+            mask = 1 << slot
+            kept = {}
+            for facet, per_value in self._bitmaps.items():
+                for v in self._facet_values(values.get(facet)):
+                    per_value[v] = per_value.get(v, 0) | mask
+                kept[facet] = values.get(facet)
+            for name, field in self._ranges.items():
+                encoded = kept[name] = field.encode(values.get(name))
+                field.set(slot, encoded)
+            for s in self.sorts:
+                key = self._keys[s][slot] = _sort_key(values.get(s))
+                bisect.insort(self._orders[s], (key, slot))
+
+            self._ids[slot] = doc_id
+            self._payloads[slot] = payload
+            self._values[slot] = kept
+            self._slot_of[doc_id] = slot
+            self._live |= mask
+
+    def update_sort_key(self, doc_id: Any, field: str, value: Any) -> bool:
+        """Change one sort key in place (e.g. a proposal count)."""
+        with self._lock:
+            slot = self._slot_of.get(doc_id)
+            if slot is None:
+                return False
+            order = self._orders[field]
+            old = self._keys[field][slot]
+            del order[bisect.bisect_left(order, (old, slot))]
+            key = self._keys[field][slot] = _sort_key(value)
+            bisect.insort(order, (key, slot))
+            return True
+
+    def remove(self, doc_id: Any) -> bool:
+        with self._lock:
+            slot = self._slot_of.pop(doc_id, None)
+            if slot is None:
+                return False
+            self._unindex(slot)
+            self._ids[slot] = None
+            self._payloads[slot] = None
+            self._values[slot] = None
+            self._free.append(slot)
+            return True
+
+    def _unindex(self, slot: int) -> None:
+        mask = ~(1 << slot)
+        kept = self._values[slot] or {}
+        for facet, per_value in self._bitmaps.items():
+            for v in self._facet_values(kept.get(facet)):
+                if v in per_value:
+                    per_value[v] &= mask
+        for name, field in self._ranges.items():
+            field.clear(slot, kept.get(name))
+        for s in self.sorts:
+            order = self._orders[s]
+            del order[bisect.bisect_left(order, (self._keys[s][slot], slot))]
+            self._keys[s][slot] = _NEG_INF
+        self._live &= mask
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def match(
+        self,
+        clauses: Iterable[Tuple[str, Iterable[Any]]] = (),
+        ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+    ) -> int:
+        """
+        Bitmap of documents satisfying every clause.
+
+        Each clause ``(facet, values)`` matches documents holding any of the
+        values; clauses are ANDed. ``ranges`` maps a range field to
+        inclusive ``(low, high)`` bounds, either of which may be ``None``.
+        """
+        bitmap = self._live
+        for facet, values in clauses:
+            per_value = self._bitmaps[facet]
+            union = 0
+            for v in values:
+                union |= per_value.get(v, 0)
+            bitmap &= union
+            if not bitmap:
+                return 0
+        for name, (low, high) in (ranges or {}).items():
+            field = self._ranges[name]
+            if low is not None:
+                bitmap &= field.at_least(low)
+            if high is not None:
+                bitmap &= field.at_most(high)
+        return bitmap
+
+    def facet_counts(self, bitmap: int, facet: str, top: Optional[int] = None) -> Dict[Any, int]:
+        """Per-value counts of ``facet`` within ``bitmap`` (non-zero only)."""
+        counts = {}
+        for value, value_bitmap in self._bitmaps[facet].items():
+            count = (bitmap & value_bitmap).bit_count()
+            if count:
+                counts[value] = count
+        if top is not None and len(counts) > top:
+            counts = dict(heapq.nlargest(top, counts.items(), key=lambda item: item[1]))
+        return counts
+
+    def _slots(self, bitmap: int) -> List[int]:
+        bits = bin(bitmap)[:1:-1]  # little-endian bit string
+        slots = []
+        position = bits.find("1")
+        while position != -1:
+            slots.append(position)
+            position = bits.find("1", position + 1)
+        return slots
+
+    def page(
+        self,
+        bitmap: int,
+        sort: str,
+        descending: bool = True,
+        offset: int = 0,
+        limit: int = 20,
+        total: Optional[int] = None,
+    ) -> List[Any]:
+        """Payloads of the ``limit`` matches after ``offset`` in sort order."""
+        if total is None:
+            total = bitmap.bit_count()
+        wanted = offset + limit
+        if not total or offset >= total:
+            return []
+        order = self._orders[sort]
+        payloads = self._payloads
+
+        # Walking the presorted order costs ~ wanted * n / total membership
+        # tests; enumerating the matches costs ~ total (+ a sort of those).
+        if wanted * len(order) / total <= total:
+            membership = bitmap.to_bytes((len(self._ids) + 7) // 8 or 1, "little")
+            found = []
+            walk = reversed(order) if descending else order
+            for _, slot in walk:
+                if membership[slot >> 3] >> (slot & 7) & 1:
+                    found.append(slot)
+                    if len(found) == wanted:
+                        break
+        else:
+            keys = self._keys[sort]
+            slots = self._slots(bitmap)
+            pick = heapq.nlargest if descending else heapq.nsmallest
+            found = pick(wanted, slots, key=lambda slot: (keys[slot], slot))
+        return [payloads[slot] for slot in found[offset:wanted]]
+
+    def search(
+        self,
+        clauses: Iterable[Tuple[str, Iterable[Any]]] = (),
+        ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        sort: Optional[str] = None,
+        descending: bool = True,
+        offset: int = 0,
+        limit: int = 20,
+        facets: Sequence[str] = (),
+        facet_top: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Filter once, then derive total, facet counts and the requested page."""
+        with self._lock:
+            bitmap = self.match(clauses, ranges)
+            total = bitmap.bit_count()
+            items = self.page(bitmap, sort or self.sorts[0], descending, offset, limit, total)
+            facet_counts = {f: self.facet_counts(bitmap, f, facet_top) for f in facets}
+        return {"items": items, "total_count": total, "facets": facet_counts}
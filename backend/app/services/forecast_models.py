@@ -0,0 +1,169 @@
+# @AI-HINT: Small forecasting kernel for analytics - least-squares trend with prediction intervals, classical additive seasonal decomposition, batched slope fits; NumPy when installed
+"""
+Forecast Models - least-squares trends over short aggregated series.
+
+Analytics callers aggregate in SQL (one value per month or week) and hand
+the series here, so inputs are tens of points, never raw rows.
+
+- ``fit_trend(y, period)`` fits ``y = a + b·t`` by ordinary least squares.
+  With ``period`` set and at least two full periods of data, a classical
+  additive seasonal component (centred moving average, mean detrended
+  value per position) is removed first and added back on prediction.
+- ``TrendFit.predict(t)`` returns the point forecast and the half-width of
+  the 95% prediction interval,
+  ``t₀.₉₇₅(dof) · s · sqrt(1 + 1/n + (t - t̄)² / Sxx)``. Seasonal offsets
+  are treated as known, so intervals on seasonal fits are slightly narrow.
+- ``fit_trends(rows)`` fits one line per row of a matrix of series sharing
+  the same time axis (one ``lstsq`` call with NumPy).
+
+NumPy is used when installed; the pure-Python paths give the same numbers
+up to float rounding.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+# Two-sided 95% Student t critical values for 1..30 degrees of freedom
+_T95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+_Z95 = 1.959964
+
+
+def t95(dof: int) -> float:
+    """Two-sided 95% critical value of Student's t with ``dof`` degrees of freedom."""
+    if dof < 1:
+        return math.inf
+    if dof <= len(_T95):
+        return _T95[dof - 1]
+    # Cornish-Fisher expansion around the normal quantile; < 1e-4 off past 30 dof
+    z = _Z95
+    return (z + (z ** 3 + z) / (4 * dof) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * dof ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * dof ** 3))
+
+
+@dataclass(frozen=True)
+class TrendFit:
+    """Fitted ``a + b·t (+ seasonal[t % period])`` over ``t = 0..n-1``."""
+
+    intercept: float
+    slope: float
+    n: int
+    dof: int
+    sigma: float  # residual standard error, NaN when dof == 0
+    t_mean: float
+    sxx: float
+    seasonal: Tuple[float, ...] = ()
+
+    def predict(self, t: float) -> Tuple[float, Optional[float]]:
+        """``(point, half_width)`` at time ``t``; ``half_width`` is None without residual dof."""
+        point = self.intercept + self.slope * t
+        if self.seasonal:
+            point += self.seasonal[int(t) % len(self.seasonal)]
+        if self.dof < 1 or self.sxx <= 0:
+            return point, None
+        spread = math.sqrt(1 + 1 / self.n + (t - self.t_mean) ** 2 / self.sxx)
+        return point, t95(self.dof) * self.sigma * spread
+
+    @property
+    def slope_interval(self) -> Optional[Tuple[float, float]]:
+        """95% confidence interval of the slope, None without residual dof."""
+        if self.dof < 1 or self.sxx <= 0:
+            return None
+        half = t95(self.dof) * self.sigma / math.sqrt(self.sxx)
+        return self.slope - half, self.slope + half
+
+
+def seasonal_component(y: Sequence[float], period: int) -> List[float]:
+    """
+    Additive seasonal offsets per position ``t % period`` (summing to zero).
+
+    Classical decomposition: centred moving average of length ``period``
+    (a 2×``period`` average for even periods) as the trend, then the mean
+    detrended value at each position. Needs ``len(y) >= 2 * period``.
+    """
+    n = len(y)
+    if period < 2 or n < 2 * period:
+        raise ValueError("seasonal decomposition needs at least two full periods")
+    half = period // 2
+    if period % 2:
+        weights = [1.0 / period] * period
+    else:
+        weights = [0.5 / period] + [1.0 / period] * (period - 1) + [0.5 / period]
+    np = _numpy()
+    if np is not None:
+        trend = np.convolve(np.asarray(y, dtype=float), weights, mode="valid")
+    else:
+        trend = [sum(w * y[i + j] for j, w in enumerate(weights)) for i in range(n - len(weights) + 1)]
+    sums = [0.0] * period
+    counts = [0] * period
+    for i, level in enumerate(trend):
+        t = i + half
+        sums[t % period] += y[t] - float(level)
+        counts[t % period] += 1
+    offsets = [s / c for s, c in zip(sums, counts)]
+    mean = sum(offsets) / period
+    return [o - mean for o in offsets]
+
+
+def fit_trend(y: Sequence[float], period: Optional[int] = None) -> TrendFit:
+    """Least-squares line through ``y`` over ``t = 0..n-1``, deseasonalised when ``period`` allows."""
+    n = len(y)
+    if n == 0:
+        raise ValueError("cannot fit an empty series")
+    seasonal: Tuple[float, ...] = ()
+    extra = 0
+    if period and n >= 2 * period:
+        seasonal = tuple(seasonal_component(y, period))
+        extra = period - 1
+        y = [v - seasonal[t % period] for t, v in enumerate(y)]
+    t_mean = (n - 1) / 2
+    sxx = sum((t - t_mean) ** 2 for t in range(n))
+    np = _numpy()
+    if np is not None and n > 1:
+        t = np.arange(n, dtype=float)
+        design = np.column_stack([np.ones(n), t])
+        (intercept, slope), *_ = np.linalg.lstsq(design, np.asarray(y, dtype=float), rcond=None)
+        sse = float(np.sum((np.asarray(y) - (intercept + slope * t)) ** 2))
+        intercept, slope = float(intercept), float(slope)
+    else:
+        y_mean = sum(y) / n
+        slope = sum((t - t_mean) * (v - y_mean) for t, v in enumerate(y)) / sxx if sxx else 0.0
+        intercept = y_mean - slope * t_mean
+        sse = sum((v - intercept - slope * t) ** 2 for t, v in enumerate(y))
+    dof = n - 2 - extra
+    sigma = math.sqrt(sse / dof) if dof > 0 else math.nan
+    return TrendFit(intercept, slope, n, max(dof, 0), sigma, t_mean, sxx, seasonal)
+
+
+def fit_trends(rows: Sequence[Sequence[float]]) -> List[TrendFit]:
+    """One ``fit_trend`` per row, all rows sharing the time axis ``0..n-1``."""
+    if not rows:
+        return []
+    np = _numpy()
+    n = len(rows[0])
+    if np is None or n < 2:
+        return [fit_trend(row) for row in rows]
+    t = np.arange(n, dtype=float)
+    design = np.column_stack([np.ones(n), t])
+    values = np.asarray(rows, dtype=float).T  # one column per series
+    coef, *_ = np.linalg.lstsq(design, values, rcond=None)
+    sse = np.sum((values - design @ coef) ** 2, axis=0)
+    t_mean = (n - 1) / 2
+    sxx = float(np.sum((t - t_mean) ** 2))
+    dof = n - 2
+    return [
+        TrendFit(float(a), float(b), n, dof, math.sqrt(float(e) / dof) if dof > 0 else math.nan, t_mean, sxx)
+        for a, b, e in zip(coef[0], coef[1], sse)
+    ]
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
@@ -11,8 +11,8 @@ from sqlalchemy import func
 from datetime import datetime, timedelta, timezone
 import logging
 import json
-import re
 
+from app.services.content_scanner import ScannerBuilder
 from app.models.user import User
 from app.models.project import Project
 from app.models.proposal import Proposal
@@ -68,6 +68,16 @@ class FraudDetectionService:
         (r'(western\s*union|moneygram|wire\s*transfer\s*only)\b', 15, 'payment_scam'),
     ]
 
+    URGENCY_WORDS = ['urgent', 'asap', 'immediately', 'right now', 'today only']
+
+    # All content rules compiled into one scanner (single pass per text)
+    _CONTENT_SCANNER = (
+        ScannerBuilder()
+        .patterns('suspicious', [p for p, _, _ in SUSPICIOUS_PATTERNS], family='suspicious')
+        .terms('urgency', URGENCY_WORDS)
+        .build()
+    )
+
     def __init__(self, db: Session):
         self.db = db
 
@@ -345,11 +355,10 @@ class FraudDetectionService:
 
         # Check for suspicious keywords in user content
         all_text = ' '.join(cover_letters)
-        for pattern, pattern_score, fraud_type in self.SUSPICIOUS_PATTERNS:
-            if re.search(pattern, all_text, re.IGNORECASE):
-                score += min(pattern_score, 10)  # Cap per-pattern contribution
-                flags.append(f'Suspicious content detected ({fraud_type})')
-                break  # Only flag once for content
+        for pattern, pattern_score, fraud_type in self._suspicious_matches(all_text):
+            score += min(pattern_score, 10)  # Cap per-pattern contribution
+            flags.append(f'Suspicious content detected ({fraud_type})')
+            break  # Only flag once for content
 
         return {'score': score, 'flags': flags}
 
@@ -432,9 +441,10 @@ class FraudDetectionService:
         title = project.title or ''
         combined = f"{title} {description}".lower()
 
-        # Suspicious pattern matching
+        # Suspicious pattern matching (one scan covers patterns and urgency words)
+        matched = self._CONTENT_SCANNER.rules_matched(combined)
         for pattern, pattern_score, fraud_type in self.SUSPICIOUS_PATTERNS:
-            if re.search(pattern, combined, re.IGNORECASE):
+            if pattern in matched['suspicious']:
                 score += pattern_score
                 flags.append(f'Suspicious content: {fraud_type}')
 
@@ -444,8 +454,7 @@ class FraudDetectionService:
             flags.append('Very short or missing project description')
 
         # Check for excessive urgency signals
-        urgency_words = ['urgent', 'asap', 'immediately', 'right now', 'today only']
-        urgency_count = sum(1 for w in urgency_words if w in combined)
+        urgency_count = len(matched['urgency'])
         if urgency_count >= 3:
             score += 10
             flags.append('Excessive urgency language detected')
@@ -551,14 +560,18 @@ class FraudDetectionService:
             flags.append('Very short or missing cover letter')
 
         # Check for suspicious patterns in cover letter
-        for pattern, pattern_score, fraud_type in self.SUSPICIOUS_PATTERNS:
-            if re.search(pattern, letter, re.IGNORECASE):
-                score += min(pattern_score, 10)
-                flags.append(f'Suspicious content in cover letter ({fraud_type})')
-                break
+        for pattern, pattern_score, fraud_type in self._suspicious_matches(letter):
+            score += min(pattern_score, 10)
+            flags.append(f'Suspicious content in cover letter ({fraud_type})')
+            break
 
         return {'score': score, 'flags': flags}
 
+    def _suspicious_matches(self, text: str) -> List[Tuple[str, int, str]]:
+        """SUSPICIOUS_PATTERNS entries found in text, in declaration order."""
+        matched = self._CONTENT_SCANNER.rules_matched(text, {'suspicious'})['suspicious']
+        return [entry for entry in self.SUSPICIOUS_PATTERNS if entry[0] in matched]
+
     def _get_risk_level(self, risk_score: int) -> str:
         """Determine risk level from score."""
         for level, (min_score, max_score) in self.RISK_LEVELS.items():
@@ -0,0 +1,118 @@
+# @AI-HINT: Shared BM25 index over chatbot FAQs, knowledge-base FAQs and help articles
+"""
+Help Search - one in-process ``TextIndex`` for all help content.
+
+Built once (at startup, or lazily on first query) from
+``AIChatbotService.FAQ_DATABASE`` and the knowledge base's ``FAQ_ENTRIES``
+and ``HELP_ARTICLES``; new articles are added incrementally through
+``index_article``. Every document carries ``kind`` ("chatbot_faq", "faq" or
+"article"), ``category`` and the source ``item`` dict in its metadata so
+callers can filter and return results without a second lookup.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.text_index import TextIndex
+
+logger = logging.getLogger(__name__)
+
+HELP_FIELD_WEIGHTS = {"title": 3.0, "tags": 2.0, "excerpt": 1.5, "body": 1.0}
+
+_help_index: Optional[TextIndex] = None
+_help_index_lock = threading.Lock()
+
+
+def _value(category: Any) -> Any:
+    return getattr(category, "value", category)
+
+
+def index_chatbot_faq(index: TextIndex, faq_id: str, faq: Dict[str, Any]) -> None:
+    index.add(
+        f"chatbot_faq:{faq_id}",
+        {"title": faq["question"], "tags": faq.get("keywords", []), "body": faq["answer"]},
+        {"kind": "chatbot_faq", "id": faq_id, "category": faq["category"], "item": faq},
+    )
+
+
+def index_faq(index: TextIndex, faq: Dict[str, Any]) -> None:
+    index.add(
+        f"faq:{faq['id']}",
+        {"title": faq["question"], "tags": faq.get("tags", []), "body": faq["answer"]},
+        {"kind": "faq", "id": faq["id"], "category": _value(faq["category"]), "item": faq},
+    )
+
+
+def index_article(index: TextIndex, article: Dict[str, Any]) -> None:
+    index.add(
+        f"article:{article['id']}",
+        {
+            "title": article["title"],
+            "tags": article.get("tags", []),
+            "excerpt": article.get("excerpt", ""),
+            "body": article.get("content", ""),
+        },
+        {
+            "kind": "article",
+            "id": article["id"],
+            "category": _value(article["category"]),
+            "content_type": _value(article.get("content_type")),
+            "item": article,
+        },
+    )
+
+
+def build_help_index() -> TextIndex:
+    """Index every built-in help source."""
+    from app.services.ai_chatbot import AIChatbotService
+    from app.services.knowledge_base import FAQ_ENTRIES, HELP_ARTICLES
+
+    index = TextIndex(HELP_FIELD_WEIGHTS)
+    for faq_id, faq in AIChatbotService.FAQ_DATABASE.items():
+        index_chatbot_faq(index, faq_id, faq)
+    for faq in FAQ_ENTRIES:
+        index_faq(index, faq)
+    for article in HELP_ARTICLES:
+        index_article(index, article)
+    return index
+
+
+def get_help_index() -> TextIndex:
+    """Get the shared help index, building it on first use."""
+    global _help_index
+    if _help_index is None:
+        with _help_index_lock:
+            if _help_index is None:
+                _help_index = build_help_index()
+                logger.info("help_search.index_built documents=%d", len(_help_index))
+    return _help_index
+
+
+def search_help(
+    query: str,
+    kinds: Tuple[str, ...],
+    limit: int = 10,
+    category: Optional[str] = None,
+    content_type: Optional[str] = None,
+) -> List[Tuple[Dict[str, Any], float]]:
+    """Ranked (metadata, score) pairs of the given kinds matching ``query``."""
+    category = _value(category)
+    content_type = _value(content_type)
+
+    def where(meta: Dict[str, Any]) -> bool:
+        return (
+            meta["kind"] in kinds
+            and (not category or meta["category"] == category)
+            and (not content_type or meta.get("content_type") == content_type)
+        )
+
+    index = get_help_index()
+    return [(index.get(doc_id), score) for doc_id, score in index.search(query, limit, where)]
+
+
+def related_help(doc_id: str, kinds: Tuple[str, ...], limit: int = 5) -> List[Dict[str, Any]]:
+    """Metadata of the documents most similar to ``doc_id``."""
+    index = get_help_index()
+    hits = index.more_like_this(doc_id, limit, where=lambda meta: meta["kind"] in kinds)
+    return [index.get(hit_id) for hit_id, _ in hits]
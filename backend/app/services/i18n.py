@@ -8,6 +8,8 @@ from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
 from enum import Enum
 
+from app.services.template_compiler import BRACES, compile_cached
+
 logger = logging.getLogger(__name__)
 
 
@@ -373,6 +375,7 @@ class InternationalizationService:
             if lang_code not in self._custom_translations:
                 self._custom_translations[lang_code] = {}
             self._custom_translations[lang_code][key] = text
+            compile_cached(text, BRACES)
         
         return {
             "key": key,
@@ -539,10 +542,7 @@ class InternationalizationService:
         if not params:
             return text
         
-        for key, value in params.items():
-            text = text.replace(f"{{{key}}}", str(value))
-        
-        return text
+        return compile_cached(text, BRACES).render(params)
 
 
 # Singleton instance
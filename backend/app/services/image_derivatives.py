@@ -0,0 +1,324 @@
+# @AI-HINT: Background image derivatives for avatars, portfolio and gig media - resized AVIF/WebP variants built in a process pool, stored through app.core.storage, negotiated per request by Accept and w=
+"""
+Image Derivatives - responsive variants of uploaded images.
+
+After an avatar, portfolio or gig image upload, the upload endpoint calls
+``enqueue``. That returns at once. A thread hands the original to a process
+pool. There it is decoded once (JPEG in draft mode at the size actually
+needed), rotated by its EXIF orientation, and resized to each configured
+width no larger than the original. Each width is encoded as AVIF, WebP and
+a JPEG fallback (PNG if the image has transparency). No metadata is written,
+so GPS and camera EXIF never leave the server.
+
+The pool returns encoded bytes. The parent writes them through the storage
+backend:
+
+    _variants/<original path>/w<width>.<ext>
+    _variants/<original path>/manifest.json
+
+The manifest is written last, so a reader that finds it can trust every
+file it lists. Each variant carries a strong ETag (sha256 of its bytes).
+
+``select`` picks the variant for a request: the smallest width that covers
+``w``, in whichever format the client's ``Accept`` allows is smallest at
+that width (usually AVIF, then WebP, then the fallback). Until the manifest exists, the original is served.
+Animated GIFs are left alone.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+VARIANT_ROOT = "_variants"
+MANIFEST_NAME = "manifest.json"
+DEFAULT_WIDTHS = (64, 160, 320, 640, 1280)
+DEFAULT_FORMATS = ("avif", "webp")
+FORMAT_MIME = {
+    "avif": "image/avif",
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+}
+FORMAT_EXT = {"avif": "avif", "webp": "webp", "jpeg": "jpg", "png": "png"}
+MANIFEST_TTL_SECONDS = 30.0  # also how long "no manifest yet" is remembered, unless this process builds it
+MAX_PIXELS = 40_000_000
+
+
+def variant_dir(rel_path: str) -> str:
+    """Storage prefix holding every derivative of ``rel_path``."""
+    return f"{VARIANT_ROOT}/{rel_path.strip('/')}"
+
+
+def _strong_etag(data: bytes) -> str:
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+def encode_variants(data: bytes, widths: Sequence[int], formats: Sequence[str],
+                    quality: int) -> Dict[str, Any]:
+    """
+    Decode ``data`` once and encode every (width, format) variant.
+
+    Runs in a pool process. Returns ``{"width", "height", "variants":
+    [(width, height, format, bytes), ...]}``, or ``{"skipped": reason}``.
+    """
+    from PIL import Image, ImageOps
+
+    Image.MAX_IMAGE_PIXELS = MAX_PIXELS
+    img = Image.open(io.BytesIO(data))
+    if getattr(img, "is_animated", False):
+        return {"skipped": "animated"}
+
+    # JPEG only: decode at 1/2, 1/4 or 1/8 scale while both sides still cover
+    # the largest width (square request so a 90 degree EXIF rotation is safe)
+    largest = max(widths)
+    img.draft("RGB", (largest, largest))
+    img = ImageOps.exif_transpose(img)
+
+    alpha = img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+    img = img.convert("RGBA" if alpha else "RGB")
+    fallback = "png" if alpha else "jpeg"
+    full_width, full_height = img.size
+
+    variants = []
+    for width in sorted({min(w, full_width) for w in widths}):
+        height = max(1, round(full_height * width / full_width))
+        resized = img if width == full_width else img.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+        for fmt in (*formats, fallback):
+            out = io.BytesIO()
+            if fmt == "png":
+                resized.save(out, "PNG", optimize=True)
+            elif fmt == "jpeg":
+                resized.save(out, "JPEG", quality=quality, optimize=True, progressive=True)
+            else:
+                resized.save(out, fmt.upper(), quality=quality)
+            variants.append((width, height, fmt, out.getvalue()))
+    return {"width": full_width, "height": full_height, "variants": variants}
+
+
+def _accepted(accept: str, fmt: str) -> bool:
+    """Whether the Accept header explicitly allows ``fmt`` (q > 0)."""
+    mime = FORMAT_MIME[fmt]
+    for part in accept.lower().split(","):
+        media, _, params = part.strip().partition(";")
+        if media.strip() != mime:
+            continue
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+def select_variant(manifest: Dict[str, Any], accept: str = "",
+                   width: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Pick the variant to serve.
+
+    The width is the smallest stored one that is at least ``width``, or the
+    largest if none is (or no ``width`` was asked for). At that width, the
+    smallest file in a format the client accepts wins. The fallback format
+    is always acceptable.
+    """
+    variants = manifest.get("variants") or []
+    if not variants:
+        return None
+    widths = sorted({v["width"] for v in variants})
+    chosen_width = next((w for w in widths if width and w >= width), widths[-1])
+    fallback = manifest.get("fallback")
+    candidates = [
+        v for v in variants
+        if v["width"] == chosen_width and (v["format"] == fallback or _accepted(accept or "", v["format"]))
+    ]
+    return min(candidates, key=lambda v: v["bytes"]) if candidates else None
+
+
+class DerivativePipeline:
+    """
+    Builds and looks up image derivatives.
+
+    ``workers`` pool processes do the decoding and encoding. The same number
+    of threads wait on them and write results to storage. Uploads never wait
+    on either.
+    """
+
+    def __init__(self, storage=None, widths: Sequence[int] = DEFAULT_WIDTHS,
+                 formats: Sequence[str] = DEFAULT_FORMATS, quality: int = 60,
+                 workers: int = 0, enabled: bool = True):
+        self._storage = storage
+        self.widths = tuple(sorted(set(int(w) for w in widths if int(w) > 0))) or DEFAULT_WIDTHS
+        self.formats = tuple(f for f in formats if f in ("avif", "webp") and self._encoder_available(f))
+        self.quality = quality
+        self.workers = workers if workers > 0 else max(1, (os.cpu_count() or 2) // 2)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._manifests: Dict[str, Tuple[float, Optional[Dict[str, Any]]]] = {}
+        self.stats = {"queued": 0, "built": 0, "skipped": 0, "failed": 0, "variants": 0}
+
+    @staticmethod
+    def _encoder_available(fmt: str) -> bool:
+        try:
+            from PIL import features
+            return bool(features.check(fmt))
+        except Exception:
+            return False
+
+    @property
+    def storage(self):
+        if self._storage is None:
+            from app.core.storage import get_storage
+            self._storage = get_storage()
+        return self._storage
+
+    def _executors(self) -> Tuple[ProcessPoolExecutor, ThreadPoolExecutor]:
+        if self._processes is None:
+            with self._lock:
+                if self._processes is None:
+                    # spawn: the API process runs threads, and forking those is unsafe
+                    self._threads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="img-deriv")
+                    self._processes = ProcessPoolExecutor(max_workers=self.workers,
+                                                          mp_context=multiprocessing.get_context("spawn"))
+        return self._processes, self._threads
+
+    def enqueue(self, rel_path: str, data: Optional[bytes] = None) -> Optional[Future]:
+        """Build derivatives of ``rel_path`` in the background. Never raises."""
+        if not self.enabled:
+            return None
+        try:
+            _, threads = self._executors()
+            self.stats["queued"] += 1
+            return threads.submit(self._build_logged, rel_path, data)
+        except Exception as e:
+            logger.warning(f"image_derivatives.enqueue_failed path={rel_path}: {e}")
+            return None
+
+    def _build_logged(self, rel_path: str, data: Optional[bytes]) -> Optional[Dict[str, Any]]:
+        try:
+            return self.build(rel_path, data)
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.warning(f"image_derivatives.build_failed path={rel_path}: {e}")
+            return None
+
+    def build(self, rel_path: str, data: Optional[bytes] = None) -> Optional[Dict[str, Any]]:
+        """Encode and store every variant of ``rel_path``, then its manifest. Returns the manifest."""
+        rel_path = rel_path.strip("/")
+        if data is None:
+            data = self.storage.read_file(rel_path)
+            if data is None:
+                raise FileNotFoundError(rel_path)
+        processes, _ = self._executors()
+        started = time.perf_counter()
+        result = processes.submit(encode_variants, data, self.widths, self.formats, self.quality).result()
+        if "skipped" in result:
+            self.stats["skipped"] += 1
+            return None
+
+        prefix = variant_dir(rel_path)
+        variants: List[Dict[str, Any]] = []
+        fallback = None
+        for width, height, fmt, encoded in result["variants"]:
+            path = f"{prefix}/w{width}.{FORMAT_EXT[fmt]}"
+            self.storage.write_file(path, encoded, FORMAT_MIME[fmt])
+            variants.append({"width": width, "height": height, "format": fmt, "path": path,
+                             "bytes": len(encoded), "etag": _strong_etag(encoded)})
+            if fmt not in self.formats:
+                fallback = fmt
+        manifest = {
+            "source": rel_path,
+            "source_etag": _strong_etag(data),
+            "width": result["width"],
+            "height": result["height"],
+            "formats": [*self.formats, fallback],
+            "fallback": fallback,
+            "variants": variants,
+            "built_at": time.time(),
+        }
+        self.storage.write_file(f"{prefix}/{MANIFEST_NAME}", json.dumps(manifest).encode(), "application/json")
+        self._manifests[rel_path] = (time.monotonic() + MANIFEST_TTL_SECONDS, manifest)
+        self.stats["built"] += 1
+        self.stats["variants"] += len(variants)
+        logger.info(f"image_derivatives.built path={rel_path} variants={len(variants)} "
+                    f"ms={(time.perf_counter() - started) * 1000:.0f}")
+        return manifest
+
+    def manifest(self, rel_path: str) -> Optional[Dict[str, Any]]:
+        """The stored manifest for ``rel_path``, or None until it has been built.
+
+        Both outcomes are cached for ``MANIFEST_TTL_SECONDS``, so images
+        without derivatives do not hit storage on every request.
+        """
+        rel_path = rel_path.strip("/")
+        cached = self._manifests.get(rel_path)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        raw = self.storage.read_file(f"{variant_dir(rel_path)}/{MANIFEST_NAME}")
+        manifest = None
+        if raw is not None:
+            try:
+                manifest = json.loads(raw)
+            except ValueError:
+                manifest = None
+        self._manifests[rel_path] = (time.monotonic() + MANIFEST_TTL_SECONDS, manifest)
+        return manifest
+
+    def select(self, rel_path: str, accept: str = "", width: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Best stored variant of ``rel_path`` for this request, or None."""
+        manifest = self.manifest(rel_path)
+        return select_variant(manifest, accept, width) if manifest else None
+
+    def delete(self, rel_path: str) -> None:
+        """Remove every derivative of ``rel_path`` (call when the original goes)."""
+        rel_path = rel_path.strip("/")
+        prefix = variant_dir(rel_path)
+        manifest = self.manifest(rel_path)
+        # Manifest first, so readers fall back to the original while files go
+        self._manifests.pop(rel_path, None)
+        self.storage.delete_file(f"{prefix}/{MANIFEST_NAME}")
+        for v in (manifest or {}).get("variants", []):
+            self.storage.delete_file(v["path"])
+        self.storage.delete_file(prefix)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._threads is not None:
+                self._threads.shutdown(wait=False, cancel_futures=True)
+            if self._processes is not None:
+                self._processes.shutdown(wait=False, cancel_futures=True)
+            self._threads = self._processes = None
+
+
+_pipeline: Optional[DerivativePipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def get_derivative_pipeline() -> DerivativePipeline:
+    """Get or create the process-wide derivative pipeline from settings."""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                from app.core.config import get_settings
+                settings = get_settings()
+                _pipeline = DerivativePipeline(
+                    widths=settings.image_derivative_widths,
+                    formats=settings.image_derivative_formats,
+                    quality=settings.image_derivative_quality,
+                    workers=settings.image_derivative_workers,
+                    enabled=settings.image_derivative_enabled,
+                )
+    return _pipeline
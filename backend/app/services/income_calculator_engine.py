@@ -5,10 +5,13 @@ No authentication required. Projects annual/monthly income, calculates effective
 factors in taxes, expenses, retirement, and provides financial health insights.
 """
 
+import inspect
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence
 from datetime import datetime
 
+from app.services.tax_kernel import bracket_tables
+
 logger = logging.getLogger("megilance")
 
 # ============================================================================
@@ -187,6 +190,8 @@ TAX_BRACKETS: Dict[str, Dict[str, Any]] = {
     },
 }
 
+INCOME_TAX_TABLES = bracket_tables(TAX_BRACKETS, "income_tax")
+
 # ============================================================================
 # Expense Categories
 # ============================================================================
@@ -292,20 +297,9 @@ def calculate_income(
     ]
 
     # STEP 3: Calculate taxable income and taxes
-    taxable_income = max(gross["annual"] - annual_expenses - country_data["standard_deduction"], 0)
-
-    # Self-employment tax
-    se_tax = taxable_income * country_data["self_employment_tax"]
-    se_deduction = se_tax * country_data["self_employment_deduction"]
-    adjusted_taxable = max(taxable_income - se_deduction, 0)
-
-    # Income tax
-    income_tax = _calculate_progressive_tax(adjusted_taxable, country_data["income_tax"])
-
-    # State/provincial tax
-    state_tax = adjusted_taxable * (state_tax_rate / 100)
-
-    total_tax = income_tax + se_tax + state_tax
+    taxes = _calculate_taxes([gross["annual"]], [annual_expenses], country, state_tax_rate)[0]
+    income_tax, se_tax, state_tax = taxes["income_tax"], taxes["se_tax"], taxes["state_tax"]
+    total_tax = taxes["total_tax"]
 
     # STEP 4: Net income
     net_annual = gross["annual"] - annual_expenses - total_tax
@@ -401,6 +395,107 @@ def calculate_income(
     }
 
 
+MAX_SWEEP_SCENARIOS = 2500
+MAX_PROJECTION_YEARS = 10
+
+
+def calculate_income_sweep(
+    rates: Sequence[float],
+    hours_options: Sequence[float],
+    projection_years: int = 0,
+    income_growth_percent: float = 0,
+    expense_growth_percent: float = 0,
+    **inputs: Any,
+) -> Dict[str, Any]:
+    """
+    Net income for every rate x hours-per-week combination, plus a
+    year-over-year projection of the base scenario.
+
+    ``inputs`` are ``calculate_income`` arguments; every grid cell has the
+    figures ``calculate_income`` gives for that rate and hours. Taxes for
+    all cells are evaluated in one batch. The projection grows the base
+    scenario's gross income and expenses by the yearly percentages and keeps
+    this year's brackets.
+    """
+    if len(rates) * len(hours_options) > MAX_SWEEP_SCENARIOS:
+        raise ValueError(f"sweep has {len(rates) * len(hours_options)} scenarios, the maximum is {MAX_SWEEP_SCENARIOS}")
+    if not 0 <= projection_years <= MAX_PROJECTION_YEARS:
+        raise ValueError(f"projection_years must be between 0 and {MAX_PROJECTION_YEARS}")
+
+    bound = inspect.signature(calculate_income).bind(**inputs)
+    bound.apply_defaults()
+    args = bound.arguments
+    country_data = TAX_BRACKETS.get(args["country"], TAX_BRACKETS["us"])
+    annual_expenses = sum((args["monthly_expenses"] or {}).values()) * 12
+    billable_weeks = args["weeks_per_year"] - args["vacation_weeks"]
+
+    def gross_annual(rate: float, hours_per_week: float) -> float:
+        return _calculate_gross_income(
+            income_type=args["income_type"],
+            rate=rate,
+            hours_per_week=hours_per_week,
+            weeks_per_year=args["weeks_per_year"],
+            days_per_week=args["days_per_week"],
+            projects_per_year=args["projects_per_year"],
+            avg_project_value=args["avg_project_value"],
+            monthly_retainer=args["monthly_retainer"],
+            retainer_clients=args["retainer_clients"],
+            additional_income=args["additional_income"],
+            vacation_weeks=args["vacation_weeks"],
+        )["annual"]
+
+    def summarize(gross: float, expenses: float, taxes: Dict[str, float], billable_hours: float) -> Dict[str, Any]:
+        net_annual = gross - expenses - taxes["total_tax"]
+        return {
+            "gross_annual": round(gross, 2),
+            "expenses": round(expenses, 2),
+            "total_tax": round(taxes["total_tax"], 2),
+            "net_annual": round(net_annual, 2),
+            "net_monthly": round(net_annual / 12, 2),
+            "effective_hourly": round(net_annual / billable_hours if billable_hours > 0 else 0, 2),
+            "effective_tax_rate": round((taxes["total_tax"] / gross * 100) if gross > 0 else 0, 1),
+            "marginal_rate": round(taxes["marginal_rate"] * 100, 1),
+        }
+
+    # Grid: rate-major, one batched tax evaluation
+    cells = [(rate, hours) for rate in rates for hours in hours_options]
+    grosses = [gross_annual(rate, hours) for rate, hours in cells]
+    taxes = _calculate_taxes(grosses, [annual_expenses] * len(cells), args["country"], args["state_tax_rate"])
+    grid = [
+        {"rate": rate, "hours_per_week": hours,
+         **summarize(gross, annual_expenses, cell_taxes, billable_weeks * hours)}
+        for (rate, hours), gross, cell_taxes in zip(cells, grosses, taxes)
+    ]
+
+    # Year-over-year projection of the base scenario
+    base_gross = gross_annual(args["rate"], args["hours_per_week"])
+    billable_hours = billable_weeks * args["hours_per_week"]
+    years = range(projection_years + 1 if projection_years else 0)
+    projected_gross = [base_gross * (1 + income_growth_percent / 100) ** y for y in years]
+    projected_expenses = [annual_expenses * (1 + expense_growth_percent / 100) ** y for y in years]
+    projection = []
+    cumulative_net = 0.0
+    this_year = datetime.utcnow().year
+    taxes = _calculate_taxes(projected_gross, projected_expenses, args["country"], args["state_tax_rate"])
+    for y, gross, expenses, year_taxes in zip(years, projected_gross, projected_expenses, taxes):
+        row = {"year": this_year + y, **summarize(gross, expenses, year_taxes, billable_hours)}
+        cumulative_net += gross - expenses - year_taxes["total_tax"]
+        row["cumulative_net"] = round(cumulative_net, 2)
+        projection.append(row)
+
+    return {
+        "grid": {"rates": list(rates), "hours_options": list(hours_options), "rows": grid},
+        "projection": projection,
+        "meta": {
+            "currency": country_data["currency"],
+            "country": country_data["label"],
+            "income_type": args["income_type"],
+            "scenarios": len(grid),
+            "generated_at": datetime.utcnow().isoformat(),
+        },
+    }
+
+
 def _calculate_gross_income(
     income_type, rate, hours_per_week, weeks_per_year, days_per_week,
     projects_per_year, avg_project_value, monthly_retainer, retainer_clients,
@@ -453,24 +548,34 @@ def _calculate_gross_income(
     return {"annual": total, "breakdown": breakdown}
 
 
-def _calculate_progressive_tax(income: float, brackets: List[Dict]) -> float:
-    """Calculate progressive income tax."""
-    tax = 0
-    for bracket in brackets:
-        bracket_min = bracket["min"]
-        bracket_max = bracket["max"]
-        rate = bracket["rate"]
-
-        if income <= bracket_min:
-            break
-
-        taxable_in_bracket = income - bracket_min
-        if bracket_max is not None:
-            taxable_in_bracket = min(taxable_in_bracket, bracket_max - bracket_min)
-
-        tax += taxable_in_bracket * rate
-
-    return tax
+def _calculate_taxes(
+    gross_annual: Sequence[float],
+    annual_expenses: Sequence[float],
+    country: str,
+    state_tax_rate: float,
+) -> List[Dict[str, float]]:
+    """Self-employment, income and state tax for each (gross, expenses) pair."""
+    country_data = TAX_BRACKETS.get(country, TAX_BRACKETS["us"])
+    table = INCOME_TAX_TABLES.get(country, INCOME_TAX_TABLES["us"])
+
+    rows = []
+    for gross, expenses in zip(gross_annual, annual_expenses):
+        taxable_income = max(gross - expenses - country_data["standard_deduction"], 0)
+        # Self-employment tax
+        se_tax = taxable_income * country_data["self_employment_tax"]
+        se_deduction = se_tax * country_data["self_employment_deduction"]
+        adjusted_taxable = max(taxable_income - se_deduction, 0)
+        rows.append({"adjusted_taxable": adjusted_taxable, "se_tax": se_tax})
+
+    # Income tax for all rows in one pass over the cumulative bracket table
+    adjusted = [row["adjusted_taxable"] for row in rows]
+    for row, income_tax, marginal in zip(rows, table.tax_many(adjusted), table.marginal_rate_many(adjusted)):
+        # State/provincial tax
+        row["state_tax"] = row["adjusted_taxable"] * (state_tax_rate / 100)
+        row["income_tax"] = income_tax
+        row["total_tax"] = income_tax + row["se_tax"] + row["state_tax"]
+        row["marginal_rate"] = marginal
+    return rows
 
 
 def _analyze_financial_health(
@@ -446,14 +446,17 @@ class InvoiceTaxService:
         self,
         invoice_id: str,
         user_id: int
-    ) -> Dict[str, Any]:
-        """Export invoice as PDF."""
-        return {
-            "invoice_id": invoice_id,
-            "format": "pdf",
-            "download_url": f"/api/invoices/{invoice_id}/download/pdf",
-            "expires_at": (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
-        }
+    ) -> Optional[Dict[str, Any]]:
+        """Queue the invoice on the PDF render pool; returns the render job handle."""
+        from app.services.pdf_renderer import get_pdf_renderer, invoice_document
+        invoice = await self.get_invoice(invoice_id, user_id)
+        if not invoice:
+            return None
+        job = get_pdf_renderer().submit(
+            invoice_document(invoice), owner_id=user_id, kind="invoice",
+            filename=f"{invoice['invoice_number']}.pdf"
+        )
+        return {"invoice_id": invoice_id, "format": "pdf", **job}
     
     async def export_to_accounting(
         self,
@@ -112,6 +112,26 @@ def get_invoice_by_id(invoice_id: int) -> Optional[dict]:
     return _row_to_invoice(result["rows"][0])
 
 
+def list_invoices_for_period(start: datetime, end: datetime) -> List[dict]:
+    """Every invoice created in [start, end) with both parties' names, oldest first (month-end PDF batch)."""
+    columns = ", ".join(f"i.{c.strip()}" for c in _INVOICE_COLUMNS.split(","))
+    result = execute_query(f"""
+        SELECT {columns}, fu.name, tu.name
+        FROM invoices i
+        LEFT JOIN users fu ON fu.id = i.from_user_id
+        LEFT JOIN users tu ON tu.id = i.to_user_id
+        WHERE i.created_at >= ? AND i.created_at < ?
+        ORDER BY i.id
+    """, [start.isoformat(), end.isoformat()])
+    invoices = []
+    for row in (result or {}).get("rows") or []:
+        invoice = _row_to_invoice(row)
+        invoice["from_name"] = to_str(row[16])
+        invoice["to_name"] = to_str(row[17])
+        invoices.append(invoice)
+    return invoices
+
+
 def mark_overdue_invoices():
     """Update pending invoices past due date to 'overdue'."""
     today = date.today().isoformat()
@@ -3,11 +3,13 @@
 
 from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 import logging
+import re
 
 from app.models.user import User
+from app.services.help_search import get_help_index, index_article, related_help, search_help
 
 logger = logging.getLogger(__name__)
 
@@ -192,20 +194,15 @@ class KnowledgeBaseService:
         limit: int = 50
     ) -> List[Dict[str, Any]]:
         """Get FAQ entries"""
+        if search_query:
+            hits = search_help(search_query, ("faq",), limit=limit, category=category)
+            return [meta["item"] for meta, _ in hits]
+        
         faqs = FAQ_ENTRIES.copy()
         
         if category:
             faqs = [f for f in faqs if f["category"] == category]
         
-        if search_query:
-            query_lower = search_query.lower()
-            faqs = [
-                f for f in faqs
-                if query_lower in f["question"].lower()
-                or query_lower in f["answer"].lower()
-                or any(query_lower in tag for tag in f.get("tags", []))
-            ]
-        
         return faqs[:limit]
     
     async def get_faq(self, faq_id: str) -> Optional[Dict[str, Any]]:
@@ -228,6 +225,12 @@ class KnowledgeBaseService:
         limit: int = 20
     ) -> List[Dict[str, Any]]:
         """Get help articles"""
+        if search_query:
+            hits = search_help(
+                search_query, ("article",), limit=limit, category=category, content_type=content_type
+            )
+            return [meta["item"] for meta, _ in hits]
+        
         articles = HELP_ARTICLES.copy()
         
         if category:
@@ -236,15 +239,6 @@ class KnowledgeBaseService:
         if content_type:
             articles = [a for a in articles if a["content_type"] == content_type]
         
-        if search_query:
-            query_lower = search_query.lower()
-            articles = [
-                a for a in articles
-                if query_lower in a["title"].lower()
-                or query_lower in a.get("excerpt", "").lower()
-                or any(query_lower in tag for tag in a.get("tags", []))
-            ]
-        
         return articles[:limit]
     
     async def get_article(self, article_id: str) -> Optional[Dict[str, Any]]:
@@ -289,9 +283,10 @@ class KnowledgeBaseService:
         query: str,
         limit: int = 20
     ) -> Dict[str, Any]:
-        """Search across all content"""
-        faqs = await self.get_faqs(search_query=query)
-        articles = await self.get_articles(search_query=query)
+        """Search across all content (one ranked BM25 query)"""
+        hits = search_help(query, ("faq", "article"), limit=limit)
+        faqs = [meta["item"] for meta, _ in hits if meta["kind"] == "faq"]
+        articles = [meta["item"] for meta, _ in hits if meta["kind"] == "article"]
         
         return {
             "query": query,
@@ -331,37 +326,10 @@ class KnowledgeBaseService:
         content_id: str,
         content_type: str
     ) -> List[Dict[str, Any]]:
-        """Get related content based on tags/category"""
-        # Find the content
-        if content_type == "faq":
-            content = await self.get_faq(content_id)
-        else:
-            content = await self.get_article(content_id)
-        
-        if not content:
-            return []
-        
-        tags = set(content.get("tags", []))
-        category = content.get("category")
-        
-        related = []
-        
-        # Find content with matching tags or category
-        for article in HELP_ARTICLES:
-            if article["id"] == content_id:
-                continue
-            article_tags = set(article.get("tags", []))
-            if tags & article_tags or article.get("category") == category:
-                related.append({"type": "article", **article})
-        
-        for faq in FAQ_ENTRIES:
-            if faq["id"] == content_id:
-                continue
-            faq_tags = set(faq.get("tags", []))
-            if tags & faq_tags or faq.get("category") == category:
-                related.append({"type": "faq", **faq})
-        
-        return related[:5]
+        """Get related content ("more like this" over the help index)"""
+        doc_id = f"{'faq' if content_type == 'faq' else 'article'}:{content_id}"
+        related = related_help(doc_id, ("faq", "article"), limit=5)
+        return [{"type": meta["kind"], **meta["item"]} for meta in related]
     
     # Suggestions
     async def get_suggestions(
@@ -391,10 +359,31 @@ class KnowledgeBaseService:
         admin_id: int,
         article_data: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Create a new article (admin)"""
+        """Create a new article (admin) and add it to the search index"""
+        title = article_data["title"]
+        content = article_data.get("content", "")
+        next_number = max((int(a["id"].rsplit("-", 1)[-1]) for a in HELP_ARTICLES), default=0) + 1
+        article = {
+            "id": f"article-{next_number}",
+            "title": title,
+            "slug": article_data.get("slug") or re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-"),
+            "category": ArticleCategory(article_data["category"]),
+            "content_type": KnowledgeContentType(article_data.get("content_type", KnowledgeContentType.ARTICLE)),
+            "excerpt": article_data.get("excerpt") or content.strip()[:160],
+            "content": content,
+            "tags": list(article_data.get("tags", [])),
+            "read_time_minutes": max(1, len(content.split()) // 200),
+            "views": 0,
+            "helpful_count": 0,
+            "created_by": admin_id,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+        HELP_ARTICLES.append(article)
+        index_article(get_help_index(), article)
+        
         return {
-            "message": "Article creation not yet implemented",
-            "article_data": article_data
+            "message": "Article created",
+            "article": article
         }
     
     async def update_article(
@@ -0,0 +1,470 @@
+# @AI-HINT: Double-entry money ledger - each posting is one transactional execute_many batch with relative balance updates
+"""
+Ledger - double-entry postings for escrow and wallet money movements.
+
+A posting is a set of legs ``(account, amount)`` that sums to zero. It is
+written as a single ``execute_many`` batch (one HTTP round-trip, one
+transaction) containing:
+
+* one ``ledger_entries`` row per leg (append-only journal),
+* a relative update of each account's materialized running total in
+  ``ledger_balances`` (``balance_cents = balance_cents + ?``),
+* relative updates of the legacy balance columns the rest of the app still
+  reads (``users.account_balance``, ``wallet_balances.available/pending``),
+* any domain statements the caller adds (escrow row, wallet transaction...).
+
+Nothing is read-modify-written in Python, so concurrent postings cannot lose
+updates. Overdrafts are rejected by the ``ledger_non_negative`` CHECK on
+``ledger_balances``: the failing statement aborts the whole batch and
+``post`` raises ``InsufficientFunds``.
+
+Accounts are plain strings: ``user:<id>``, ``escrow:<id>``,
+``wallet:<id>:available``, ``wallet:<id>:pending``, ``hold:<reference>``
+(funds reserved while an external transfer is in flight) and
+``external:<name>`` (money entering or leaving the platform; the only
+accounts allowed to go negative). Amounts are stored as integer cents.
+
+Balances that predate the ledger are picked up lazily: the first posting
+to a user, wallet or escrow account opens it at the value of its legacy
+column, journaled as an ``opening`` entry against ``external:adjustments``
+in the same batch. Later postings skip this because the account already
+has a running total.
+
+``reconcile`` is the periodic consistency job: it checks that every posting
+balances, that running totals match the journal, and that the legacy columns
+match the ledger. With ``repair=True`` it rebuilds running totals from the
+journal and adopts balances written outside the ledger as ``adjustment``
+postings against ``external:adjustments``.
+"""
+
+import logging
+import threading
+import uuid
+from datetime import datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from app.db.schema_registry import ensure_schema, register_schema
+from app.db.turso_http import ResultSet, get_turso_http
+
+logger = logging.getLogger(__name__)
+
+EXTERNAL_PREFIX = "external:"
+ADJUSTMENTS_ACCOUNT = "external:adjustments"
+
+LEDGER_DDL = [
+    """CREATE TABLE IF NOT EXISTS ledger_entries (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        posting_id TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        account TEXT NOT NULL,
+        amount_cents INTEGER NOT NULL,
+        reference TEXT,
+        created_at TEXT NOT NULL
+    )""",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_ledger_entries_posting_account ON ledger_entries(posting_id, account)",
+    "CREATE INDEX IF NOT EXISTS idx_ledger_entries_account ON ledger_entries(account, id)",
+    """CREATE TABLE IF NOT EXISTS ledger_balances (
+        account TEXT PRIMARY KEY,
+        balance_cents INTEGER NOT NULL DEFAULT 0,
+        allow_negative INTEGER NOT NULL DEFAULT 0,
+        updated_at TEXT,
+        CONSTRAINT ledger_non_negative CHECK (allow_negative = 1 OR balance_cents >= 0)
+    )""",
+]
+register_schema("ledger", LEDGER_DDL)
+
+# Open at zero, then add: SQLite checks CHECK constraints on the candidate row before an
+# upsert's conflict is resolved, so a debit cannot ride on INSERT ... ON CONFLICT.
+_OPEN_BALANCE = (
+    "INSERT INTO ledger_balances (account, balance_cents, allow_negative, updated_at) "
+    "SELECT {account}, 0, ?, ? WHERE 1 ON CONFLICT(account) DO NOTHING"
+)
+_ADD_BALANCE = "UPDATE ledger_balances SET balance_cents = balance_cents + ?, updated_at = ? WHERE account = {account}"
+_INSERT_ENTRY = (
+    "INSERT INTO ledger_entries (posting_id, kind, account, amount_cents, reference, created_at) "
+    "SELECT ?, ?, {account}, ?, ?, ?"
+)
+
+# Legacy balance columns kept in step with the ledger: (table, key column, value column, accounts SQL)
+_USER_SOURCE = ("users", "id", "account_balance", "'user:' || {key}")
+_WALLET_SOURCES = [
+    ("wallet_balances", "user_id", "available", "'wallet:' || {key} || ':available'"),
+    ("wallet_balances", "user_id", "pending", "'wallet:' || {key} || ':pending'"),
+]
+_ESCROW_SOURCE = ("escrow", "id", "amount - COALESCE(released_amount, 0)", "'escrow:' || {key}")
+
+# An account's first posting opens it at its legacy balance: an ``opening`` entry against
+# external:adjustments, written only while the account has no ledger_balances row yet.
+_OPENING_ENTRY = (
+    "INSERT INTO ledger_entries (posting_id, kind, account, amount_cents, reference, created_at) "
+    "SELECT 'opening:' || ?, 'opening', ?, cents, 'legacy', ? "
+    "FROM (SELECT CAST(ROUND(COALESCE({value}, 0) * 100) AS INTEGER) AS cents FROM {table} WHERE {key} = ?) "
+    "WHERE cents > 0 AND NOT EXISTS (SELECT 1 FROM ledger_balances WHERE account = ?)"
+)
+_OPENING_OFFSET = (
+    "INSERT INTO ledger_entries (posting_id, kind, account, amount_cents, reference, created_at) "
+    "SELECT posting_id, 'opening', ?, -amount_cents, 'legacy', ? FROM ledger_entries "
+    "WHERE posting_id = 'opening:' || ? AND account = ? "
+    "AND NOT EXISTS (SELECT 1 FROM ledger_balances WHERE account = ?)"
+)
+_OPENING_OFFSET_BALANCE = (
+    "INSERT INTO ledger_balances (account, balance_cents, allow_negative, updated_at) "
+    "SELECT ?, -amount_cents, 1, ? FROM ledger_entries "
+    "WHERE posting_id = 'opening:' || ? AND account = ? "
+    "AND NOT EXISTS (SELECT 1 FROM ledger_balances WHERE account = ?) "
+    "ON CONFLICT(account) DO UPDATE SET balance_cents = balance_cents + excluded.balance_cents, "
+    "updated_at = excluded.updated_at"
+)
+_OPENING_BALANCE = (
+    "INSERT INTO ledger_balances (account, balance_cents, allow_negative, updated_at) "
+    "SELECT ?, amount_cents, 0, ? FROM ledger_entries WHERE posting_id = 'opening:' || ? AND account = ? "
+    "ON CONFLICT(account) DO NOTHING"
+)
+
+
+class LedgerError(Exception):
+    """A posting could not be written."""
+
+
+class InsufficientFunds(LedgerError):
+    """A posting would take a non-external account below zero."""
+
+
+class AccountExpr(NamedTuple):
+    """Account name computed in SQL inside the batch (e.g. the id of a row inserted earlier)."""
+    sql: str
+    params: List[Any]
+
+
+Account = Union[str, AccountExpr]
+Statement = Dict[str, Any]
+
+
+def to_cents(amount: Union[float, int, str, Decimal]) -> int:
+    """Convert a currency amount to integer cents (half-up)."""
+    return int((Decimal(str(amount)) * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def user_account(user_id: int) -> str:
+    return f"user:{int(user_id)}"
+
+
+def escrow_account(escrow_id: int) -> str:
+    return f"escrow:{int(escrow_id)}"
+
+
+def wallet_account(user_id: int, bucket: str = "available") -> str:
+    if bucket not in ("available", "pending"):
+        raise ValueError(f"Unknown wallet bucket: {bucket}")
+    return f"wallet:{int(user_id)}:{bucket}"
+
+
+def external_account(name: str) -> str:
+    return f"{EXTERNAL_PREFIX}{name}"
+
+
+def hold_account(reference: str) -> str:
+    """Funds reserved for a transfer that is still in flight outside the platform."""
+    return f"hold:{reference}"
+
+
+def latest_escrow_account(contract_id: int, client_id: int) -> AccountExpr:
+    """Account of the newest escrow for a contract/client, for postings that insert it in the same batch."""
+    return AccountExpr(
+        "(SELECT 'escrow:' || MAX(id) FROM escrow WHERE contract_id = ? AND client_id = ?)",
+        [contract_id, client_id],
+    )
+
+
+def _account_sql(account: Account) -> Tuple[str, List[Any]]:
+    if isinstance(account, AccountExpr):
+        return account.sql, list(account.params)
+    return "?", [account]
+
+
+def _legacy_source(account: Account) -> Optional[Tuple[str, str, str, int]]:
+    """(table, key column, value column, key) of the legacy balance an account mirrors."""
+    if not isinstance(account, str):
+        return None  # computed accounts are rows inserted by the same posting
+    kind, _, rest = account.partition(":")
+    if kind == "user":
+        table, key, value, _ = _USER_SOURCE
+        return table, key, value, int(rest)
+    if kind == "wallet":
+        user_id, _, bucket = rest.partition(":")
+        table, key, value, _ = next(s for s in _WALLET_SOURCES if s[2] == bucket)
+        return table, key, value, int(user_id)
+    if kind == "escrow":
+        table, key, value, _ = _ESCROW_SOURCE
+        return table, key, value, int(rest)
+    return None
+
+
+def _opening_statements(account: Account, now: str) -> List[Statement]:
+    """Open a not-yet-posted account at its legacy balance (no-op once it has a ledger row)."""
+    source = _legacy_source(account)
+    if source is None:
+        return []
+    table, key, value, key_value = source
+    return [
+        {
+            "q": _OPENING_ENTRY.format(table=table, key=key, value=value),
+            "params": [account, account, now, key_value, account],
+        },
+        {"q": _OPENING_OFFSET, "params": [ADJUSTMENTS_ACCOUNT, now, account, account, account]},
+        {"q": _OPENING_OFFSET_BALANCE, "params": [ADJUSTMENTS_ACCOUNT, now, account, account, account]},
+        {"q": _OPENING_BALANCE, "params": [account, now, account, account]},
+    ]
+
+
+def _legacy_statements(account: Account, cents: int, now: str) -> List[Statement]:
+    """Relative updates of the legacy balance column mirrored by ``account``."""
+    if not isinstance(account, str):
+        return []
+    kind, _, rest = account.partition(":")
+    amount = cents / 100
+    if kind == "user":
+        return [{
+            "q": "UPDATE users SET account_balance = COALESCE(account_balance, 0) + ? WHERE id = ?",
+            "params": [amount, int(rest)],
+        }]
+    if kind == "wallet":
+        user_id, _, bucket = rest.partition(":")
+        return [
+            {
+                "q": "INSERT INTO wallet_balances (user_id, available, pending, escrow, currency, updated_at) "
+                     "VALUES (?, 0, 0, 0, 'USD', ?) ON CONFLICT(user_id) DO NOTHING",
+                "params": [int(user_id), now],
+            },
+            {
+                "q": f"UPDATE wallet_balances SET {bucket} = {bucket} + ?, updated_at = ? WHERE user_id = ?",
+                "params": [amount, now, int(user_id)],
+            },
+        ]
+    return []
+
+
+def posting_statements(
+    kind: str,
+    legs: Sequence[Tuple[Account, int]],
+    posting_id: str,
+    reference: Optional[str],
+    now: str,
+) -> List[Statement]:
+    """Journal, running-total and legacy-column statements for one balanced posting (amounts in cents)."""
+    if not legs:
+        raise LedgerError("A posting needs at least one leg")
+    if sum(cents for _, cents in legs) != 0:
+        raise LedgerError(f"Unbalanced {kind} posting: legs sum to {sum(c for _, c in legs)} cents")
+
+    statements: List[Statement] = []
+    for account, cents in legs:
+        sql, params = _account_sql(account)
+        allow_negative = 1 if isinstance(account, str) and account.startswith(EXTERNAL_PREFIX) else 0
+        statements.extend(_opening_statements(account, now))
+        statements.append({
+            "q": _INSERT_ENTRY.format(account=sql),
+            "params": [posting_id, kind, *params, cents, reference, now],
+        })
+        statements.append({"q": _OPEN_BALANCE.format(account=sql), "params": [*params, allow_negative, now]})
+        statements.append({"q": _ADD_BALANCE.format(account=sql), "params": [cents, now, *params]})
+        statements.extend(_legacy_statements(account, cents, now))
+    return statements
+
+
+class Ledger:
+    """
+    Posts balanced money movements and answers balance queries.
+
+    The backend object only needs ``execute(sql, params)`` and
+    ``execute_many(statements)`` with TursoHTTP semantics (the batch runs as
+    one transaction and raises if any statement fails).
+    """
+
+    def __init__(self, backend_factory: Optional[Callable[[], Any]] = None):
+        self._backend_factory = backend_factory or get_turso_http
+
+    def ensure_tables(self) -> None:
+        ensure_schema("ledger", backend=self._backend_factory())
+
+    # ------------------------------------------------------------------
+    # Postings
+    # ------------------------------------------------------------------
+
+    def post(
+        self,
+        kind: str,
+        legs: Iterable[Tuple[Account, Union[float, int, str, Decimal]]],
+        *,
+        reference: Optional[str] = None,
+        posting_id: Optional[str] = None,
+        before: Sequence[Statement] = (),
+        after: Sequence[Statement] = (),
+    ) -> List[Dict[str, Any]]:
+        """
+        Write one balanced posting (amounts in currency units) in a single batch.
+
+        ``before``/``after`` statements run in the same transaction; the
+        results of every statement are returned so callers can read back rows
+        selected in ``after``. A repeated ``posting_id`` is rejected.
+        """
+        self.ensure_tables()
+        now = datetime.now(timezone.utc).isoformat()
+        posting_id = posting_id or f"{kind}:{uuid.uuid4().hex}"
+        legs = [(account, to_cents(amount)) for account, amount in legs]
+        statements = [*before, *posting_statements(kind, legs, posting_id, reference, now), *after]
+        try:
+            return self._backend_factory().execute_many(statements)
+        except Exception as e:
+            if "ledger_non_negative" in str(e):
+                raise InsufficientFunds(f"Insufficient funds for {kind} posting") from e
+            raise LedgerError(f"{kind} posting failed: {e}") from e
+
+    # ------------------------------------------------------------------
+    # Balances
+    # ------------------------------------------------------------------
+
+    def balances(self, accounts: Sequence[str]) -> Dict[str, float]:
+        """Materialized balances of the given accounts (accounts never posted to are omitted)."""
+        if not accounts:
+            return {}
+        self.ensure_tables()
+        placeholders = ",".join("?" for _ in accounts)
+        result = ResultSet.from_result(self._backend_factory().execute(
+            f"SELECT account, balance_cents FROM ledger_balances WHERE account IN ({placeholders})",
+            list(accounts),
+        ))
+        return {row.account: row.balance_cents / 100 for row in result}
+
+    def balance(self, account: str, default: Optional[float] = 0.0) -> Optional[float]:
+        return self.balances([account]).get(account, default)
+
+    # ------------------------------------------------------------------
+    # Reconciliation
+    # ------------------------------------------------------------------
+
+    def _existing_tables(self, backend) -> set:
+        result = ResultSet.from_result(backend.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('users', 'wallet_balances', 'escrow')",
+            [],
+        ))
+        return set(result.column("name"))
+
+    def _sources(self, backend) -> List[Tuple[str, str, str, str]]:
+        tables = self._existing_tables(backend)
+        sources = []
+        if "users" in tables:
+            sources.append(_USER_SOURCE)
+        if "wallet_balances" in tables:
+            sources.extend(_WALLET_SOURCES)
+        if "escrow" in tables:
+            sources.append(_ESCROW_SOURCE)
+        return sources
+
+    @staticmethod
+    def _drift_sql(source: Tuple[str, str, str, str]) -> str:
+        table, key, value, account_sql = source
+        account = account_sql.format(key=f"t.{key}")
+        # An account never posted to will open at its positive legacy balance, so that is not drift
+        return (
+            f"SELECT account, recorded, ledger FROM ("
+            f"SELECT account, recorded, "
+            f"CASE WHEN balance_cents IS NULL AND recorded > 0 THEN recorded ELSE COALESCE(balance_cents, 0) END "
+            f"AS ledger FROM ("
+            f"SELECT {account} AS account, "
+            f"CAST(ROUND(COALESCE(t.{value}, 0) * 100) AS INTEGER) AS recorded, b.balance_cents "
+            f"FROM {table} t LEFT JOIN ledger_balances b ON b.account = {account}"
+            f")) WHERE recorded != ledger"
+        )
+
+    def reconcile(self, repair: bool = False) -> Dict[str, Any]:
+        """
+        Check journal, running totals and legacy columns against each other.
+
+        Returns a report of unbalanced postings, running totals that differ
+        from the journal, and legacy balances that differ from the ledger.
+        With ``repair=True`` running totals are rebuilt from the journal and
+        non-negative legacy balances are adopted via ``adjustment`` postings.
+        """
+        self.ensure_tables()
+        backend = self._backend_factory()
+
+        unbalanced = ResultSet.from_result(backend.execute(
+            "SELECT posting_id, SUM(amount_cents) AS total FROM ledger_entries "
+            "GROUP BY posting_id HAVING SUM(amount_cents) != 0",
+            [],
+        ))
+        totals_drift = ResultSet.from_result(backend.execute(
+            "SELECT j.account, j.total, b.balance_cents FROM "
+            "(SELECT account, SUM(amount_cents) AS total FROM ledger_entries GROUP BY account) j "
+            "LEFT JOIN ledger_balances b ON b.account = j.account "
+            "WHERE b.balance_cents IS NULL OR b.balance_cents != j.total",
+            [],
+        ))
+        sources = self._sources(backend)
+        legacy_drift = []
+        for source in sources:
+            legacy_drift.extend(ResultSet.from_result(backend.execute(self._drift_sql(source), [])))
+
+        report = {
+            "unbalanced_postings": [
+                {"posting_id": row.posting_id, "imbalance": row.total / 100} for row in unbalanced
+            ],
+            "balance_drift": [
+                {"account": row.account, "journal": row.total / 100, "balance": (row.balance_cents or 0) / 100}
+                for row in totals_drift
+            ],
+            "legacy_drift": [
+                {"account": row.account, "recorded": row.recorded / 100, "ledger": row.ledger / 100}
+                for row in legacy_drift
+            ],
+            "repaired": False,
+        }
+        if repair and (totals_drift or legacy_drift):
+            self._repair(backend, sources)
+            report["repaired"] = True
+        return report
+
+    def _repair(self, backend, sources) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        run = uuid.uuid4().hex
+        rebuild = {
+            "q": "INSERT INTO ledger_balances (account, balance_cents, allow_negative, updated_at) "
+                 "SELECT account, SUM(amount_cents), CASE WHEN account LIKE 'external:%' THEN 1 ELSE 0 END, ? "
+                 "FROM ledger_entries WHERE 1 GROUP BY account "
+                 "ON CONFLICT(account) DO UPDATE SET balance_cents = excluded.balance_cents, "
+                 "updated_at = excluded.updated_at",
+            "params": [now],
+        }
+        statements = [rebuild]
+        for source in sources:
+            statements.append({
+                "q": "INSERT INTO ledger_entries (posting_id, kind, account, amount_cents, reference, created_at) "
+                     "SELECT 'adjustment:' || ? || ':' || account, 'adjustment', account, recorded - ledger, "
+                     f"'reconcile', ? FROM ({self._drift_sql(source)}) WHERE recorded >= 0",
+                "params": [run, now],
+            })
+        statements.append({
+            "q": "INSERT INTO ledger_entries (posting_id, kind, account, amount_cents, reference, created_at) "
+                 "SELECT posting_id, 'adjustment', ?, -amount_cents, 'reconcile', ? "
+                 "FROM ledger_entries WHERE posting_id LIKE 'adjustment:' || ? || ':%'",
+            "params": [ADJUSTMENTS_ACCOUNT, now, run],
+        })
+        statements.append(rebuild)
+        backend.execute_many(statements)
+        logger.info(f"ledger.reconcile_repaired run={run}")
+
+
+_ledger: Optional[Ledger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger() -> Ledger:
+    """Get or create the process-wide ledger."""
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = Ledger()
+    return _ledger
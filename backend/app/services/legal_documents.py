@@ -438,7 +438,20 @@ class LegalDocumentService:
         document_id: str,
         format: str = "pdf"
     ) -> Dict[str, Any]:
-        """Export document to PDF or other format"""
+        """Export document to PDF or other format; PDFs are queued on the render pool"""
+        if format == "pdf":
+            document = await self.get_document(user_id, document_id)
+            if not document or "content" not in document:
+                return {"document_id": document_id, "format": format, "error": "Document not found"}
+            from app.services.pdf_renderer import get_pdf_renderer, sections_document
+            spec = sections_document(
+                "legal", document.get("title") or "Legal document", [{"content": document["content"].strip()}],
+                meta=[["Document", document_id], ["Version", str(document.get("version", ""))],
+                      ["SHA-256", str(document.get("hash", ""))[:16]]]
+            )
+            job = get_pdf_renderer().submit(spec, owner_id=user_id, kind="legal",
+                                            filename=f"{document.get('type', 'document')}-{document_id}.pdf")
+            return {"document_id": document_id, "format": format, **job}
         return {
             "document_id": document_id,
             "format": format,
@@ -0,0 +1,420 @@
+# @AI-HINT: Offline market-rate calibration - percentile tables per category/service/country from platform data, stored as versioned snapshots, hot-swapped in memory
+"""
+Market Calibration - platform-derived rate tables for the price estimator.
+
+``calibrate()`` is an offline job (``scripts/calibrate_market_rates.py``).
+It reads hourly rates and project budgets from ``contracts``, ``projects``,
+``gigs`` and freelancer profiles in ``users``. Each sample is mapped to an
+estimator (category, service type) by the words of its category, title or
+skills, and to the freelancer's country by the profile location. The job
+then computes p10/p50/p90 tables per cell.
+
+A cell is keyed ``category|service_type|country``. ``*`` marks the
+roll-up over all service types or all countries. Samples with no known
+freelancer country only count toward the ``*`` country cells. Cells with
+fewer than ``MIN_CELL_SAMPLES`` samples are dropped. The whole table is
+one compact JSON payload, stored as a new row (version) of
+``market_rate_snapshots``.
+
+``MarketRateStore`` holds the current snapshot. It loads the latest
+version at startup and checks for a newer one every ``refresh_seconds``
+from a background task, swapping the reference when one appears. Lookups
+are dictionary reads and never query the database.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.db.schema_registry import ensure_schema, register_schema
+from app.db.turso_http import ResultSet, get_turso_http, to_float, to_str
+from app.services.price_estimator_engine import COUNTRY_DATA, MARKET_RATES
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+ANY = "*"
+METRICS = ("hourly", "budget")
+PERCENTILES = (10, 50, 90)
+MIN_CELL_SAMPLES = 5
+KEEP_VERSIONS = 5
+REFRESH_SECONDS = 300.0
+
+MARKET_RATES_DDL = [
+    """CREATE TABLE IF NOT EXISTS market_rate_snapshots (
+        version INTEGER PRIMARY KEY AUTOINCREMENT,
+        format INTEGER NOT NULL,
+        built_at TEXT NOT NULL,
+        samples INTEGER NOT NULL,
+        cells INTEGER NOT NULL,
+        payload TEXT NOT NULL
+    )""",
+]
+
+register_schema("market_rates", MARKET_RATES_DDL)
+
+
+# ---------------------------------------------------------------------------
+# Classification: free text -> (category, service type), location -> country
+# ---------------------------------------------------------------------------
+
+_WORD = re.compile(r"[a-z0-9]+")
+_WORD_ALIASES = {"website": "web", "machine": "ml", "learning": "ml"}
+_COUNTRY_ALIASES = {
+    "usa": "US", "united states of america": "US", "america": "US",
+    "uk": "GB", "england": "GB", "scotland": "GB", "great britain": "GB",
+    "uae": "AE", "emirates": "AE",
+}
+
+
+def _words(text: str) -> List[str]:
+    words = []
+    for word in _WORD.findall(text.lower()):
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(_WORD_ALIASES.get(word, word))
+    return words
+
+
+class ServiceClassifier:
+    """
+    Maps free text ("Mobile App Development", a gig's category and title) to
+    an estimator (category, service type).
+
+    Each service type is known by the words of its key, each weighted by
+    inverse frequency across all keys. So "web development" goes to
+    ``web_application`` rather than ``api_development``. Text that matches
+    no service word but names a category ("Data & Analytics") maps to
+    ``(category, None)``.
+    """
+
+    def __init__(self, rates: Dict[str, Dict[str, Any]]):
+        self.services: List[Tuple[str, str, frozenset]] = [
+            (category, service, frozenset(_words(service.replace("_", " "))))
+            for category, services in rates.items() for service in services
+        ]
+        self.categories: List[Tuple[str, frozenset]] = [
+            (category, frozenset(_words(category.replace("_", " ")))) for category in rates
+        ]
+        counts: Dict[str, int] = defaultdict(int)
+        for _, _, words in self.services:
+            for word in words:
+                counts[word] += 1
+        self.weights = {word: math.log(1 + len(self.services) / n) for word, n in counts.items()}
+
+    def classify(self, *texts: Optional[str]) -> Optional[Tuple[str, Optional[str]]]:
+        words = set()
+        for text in texts:
+            if text:
+                words.update(_words(text))
+        if not words:
+            return None
+        best, best_score = None, 0.0
+        for category, service, keys in self.services:
+            score = sum(self.weights[w] for w in keys & words)
+            if score > best_score:
+                best, best_score = (category, service), score
+        if best:
+            return best
+        for category, keys in self.categories:
+            if keys & words:
+                return category, None
+        return None
+
+
+_COUNTRY_NAMES = {data["name"].lower(): code for code, data in COUNTRY_DATA.items()}
+_COUNTRY_NAMES.update(_COUNTRY_ALIASES)
+
+
+def country_code(location: Optional[str]) -> Optional[str]:
+    """ISO code of a profile location ("Lahore, Pakistan", "Berlin, DE") if it names a known country."""
+    if not location:
+        return None
+    for part in reversed(location.split(",")):
+        part = part.strip()
+        if part.upper() in COUNTRY_DATA and len(part) == 2:
+            return part.upper()
+        code = _COUNTRY_NAMES.get(part.lower())
+        if code:
+            return code
+    return None
+
+
+def percentile(ordered: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile of an ascending sequence."""
+    position = (len(ordered) - 1) * q / 100
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+# ---------------------------------------------------------------------------
+# Snapshot
+# ---------------------------------------------------------------------------
+
+def cell_key(category: str, service_type: str = ANY, country: str = ANY) -> str:
+    return f"{category}|{service_type}|{country}"
+
+
+class MarketRateSnapshot:
+    """
+    One calibration: ``cells[key][metric] = [samples, p10, p50, p90]``.
+
+    Immutable once built; the store replaces the whole object on refresh.
+    """
+
+    def __init__(self, version: int, built_at: Optional[str], cells: Dict[str, Dict[str, List[float]]]):
+        self.version = version
+        self.built_at = built_at
+        self.cells = cells
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    @classmethod
+    def build(cls, samples: Iterable[Tuple[str, Optional[str], Optional[str], str, float]],
+              min_samples: int = MIN_CELL_SAMPLES) -> "MarketRateSnapshot":
+        """Percentile tables from ``(category, service_type, country, metric, value)`` samples."""
+        values: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+        for category, service, country, metric, value in samples:
+            countries = {country or ANY, ANY}
+            keys = [cell_key(category, svc, cc) for svc in {service or ANY, ANY} for cc in countries]
+            if category != ANY:
+                keys += [cell_key(ANY, ANY, cc) for cc in countries]
+            for key in keys:
+                values[key][metric].append(value)
+
+        cells: Dict[str, Dict[str, List[float]]] = {}
+        for key, metrics in values.items():
+            cell = {}
+            for metric, series in metrics.items():
+                if len(series) >= min_samples:
+                    series.sort()
+                    cell[metric] = [len(series)] + [round(percentile(series, q), 2) for q in PERCENTILES]
+            if cell:
+                cells[key] = cell
+        return cls(0, datetime.now(timezone.utc).isoformat(), cells)
+
+    def to_payload(self) -> str:
+        return json.dumps({"format": SNAPSHOT_FORMAT, "cells": self.cells}, separators=(",", ":"), sort_keys=True)
+
+    @classmethod
+    def from_payload(cls, version: int, built_at: Optional[str], payload: str) -> "MarketRateSnapshot":
+        data = json.loads(payload)
+        if data.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"market rate snapshot {version} has format {data.get('format')}, expected {SNAPSHOT_FORMAT}")
+        return cls(version, built_at, data["cells"])
+
+    def lookup(self, category: str, service_type: Optional[str] = None,
+               country: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Percentiles for a service, most specific cell first per metric:
+        service in country, service anywhere, category in country, category anywhere.
+        """
+        candidates = []
+        for svc in ([service_type] if service_type else []) + [ANY]:
+            for cc in ([country] if country else []) + [ANY]:
+                candidates.append((svc, cc))
+        result: Dict[str, Any] = {"version": self.version, "built_at": self.built_at}
+        for metric in METRICS:
+            result[metric] = None
+            for svc, cc in candidates:
+                cell = self.cells.get(cell_key(category, svc, cc), {}).get(metric)
+                if cell:
+                    samples, *values = cell
+                    result[metric] = {
+                        "samples": samples,
+                        **{f"p{q}": v for q, v in zip(PERCENTILES, values)},
+                        "service_type": svc,
+                        "country": cc,
+                    }
+                    break
+        return result
+
+
+EMPTY_SNAPSHOT = MarketRateSnapshot(0, None, {})
+
+
+# ---------------------------------------------------------------------------
+# Sampling
+# ---------------------------------------------------------------------------
+
+_CONTRACT_SAMPLES = """
+    SELECT c.contract_type, c.amount, c.hourly_rate, p.category, p.title, u.location
+    FROM contracts c
+    JOIN projects p ON p.id = c.project_id
+    LEFT JOIN users u ON u.id = c.freelancer_id
+    WHERE c.status IN ('active', 'completed')
+"""
+
+# Projects without a contract: the client's posted budget (no freelancer country yet)
+_PROJECT_SAMPLES = """
+    SELECT p.budget_type, p.budget_min, p.budget_max, p.category, p.title
+    FROM projects p
+    WHERE p.status IN ('open', 'in_progress', 'completed')
+      AND NOT EXISTS (SELECT 1 FROM contracts c WHERE c.project_id = p.id)
+"""
+
+_GIG_SAMPLES = """
+    SELECT g.standard_price, g.subcategory, g.title, cat.name AS category, u.location
+    FROM gigs g
+    LEFT JOIN categories cat ON cat.id = g.category_id
+    LEFT JOIN users u ON u.id = g.seller_id
+    WHERE g.status = 'active' AND g.standard_price > 0
+"""
+
+_FREELANCER_SAMPLES = """
+    SELECT hourly_rate, skills, location
+    FROM users
+    WHERE user_type = 'Freelancer' AND hourly_rate > 0 AND is_active = 1
+"""
+
+
+def _positive(value: Any) -> Optional[float]:
+    number = to_float(value)
+    return number if number and number > 0 else None
+
+
+def _classified(classifier: ServiceClassifier, *texts: Any) -> Tuple[str, Optional[str]]:
+    return classifier.classify(*(to_str(t) for t in texts)) or (ANY, None)
+
+
+def collect_samples(backend) -> List[Tuple[str, Optional[str], Optional[str], str, float]]:
+    """``(category, service_type, country, metric, value)`` for every usable platform record."""
+    classifier = ServiceClassifier(MARKET_RATES)
+    samples = []
+
+    def rows(sql):
+        return ResultSet.from_result(backend.execute(sql, [])).dicts()
+
+    for row in rows(_CONTRACT_SAMPLES):
+        category, service = _classified(classifier, row["category"], row["title"])
+        country = country_code(to_str(row["location"]))
+        rate = _positive(row["hourly_rate"])
+        if to_str(row["contract_type"]) == "hourly" and rate:
+            samples.append((category, service, country, "hourly", rate))
+        elif to_str(row["contract_type"]) != "hourly" and _positive(row["amount"]):
+            samples.append((category, service, country, "budget", _positive(row["amount"])))
+
+    for row in rows(_PROJECT_SAMPLES):
+        low, high = _positive(row["budget_min"]), _positive(row["budget_max"])
+        if not (low or high):
+            continue
+        value = ((low or high) + (high or low)) / 2
+        category, service = _classified(classifier, row["category"], row["title"])
+        metric = "hourly" if (to_str(row["budget_type"]) or "").lower() == "hourly" else "budget"
+        samples.append((category, service, None, metric, value))
+
+    for row in rows(_GIG_SAMPLES):
+        category, service = _classified(classifier, row["category"], row["subcategory"], row["title"])
+        samples.append((category, service, country_code(to_str(row["location"])), "budget", _positive(row["standard_price"])))
+
+    for row in rows(_FREELANCER_SAMPLES):
+        category, service = _classified(classifier, row["skills"])
+        samples.append((category, service, country_code(to_str(row["location"])), "hourly", _positive(row["hourly_rate"])))
+
+    return samples
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class MarketRateStore:
+    """The current snapshot plus loading, publishing and background refresh."""
+
+    def __init__(self, backend_factory: Optional[Callable[[], Any]] = None,
+                 refresh_seconds: float = REFRESH_SECONDS):
+        self._backend_factory = backend_factory or get_turso_http
+        self.refresh_seconds = refresh_seconds
+        self.snapshot: MarketRateSnapshot = EMPTY_SNAPSHOT
+        self._lock = threading.Lock()
+
+    def _backend(self):
+        backend = self._backend_factory()
+        ensure_schema("market_rates", backend=backend)
+        return backend
+
+    def swap(self, snapshot: MarketRateSnapshot) -> None:
+        with self._lock:
+            if snapshot.version >= self.snapshot.version:
+                self.snapshot = snapshot
+        logger.info(f"market_rates.swapped version={snapshot.version} cells={len(snapshot)}")
+
+    def refresh(self) -> bool:
+        """Load the latest published snapshot if it is newer than the current one."""
+        backend = self._backend()
+        latest = ResultSet.from_result(backend.execute(
+            "SELECT MAX(version) AS version FROM market_rate_snapshots", []
+        )).scalar()
+        if not latest or int(latest) <= self.snapshot.version:
+            return False
+        row = ResultSet.from_result(backend.execute(
+            "SELECT version, built_at, payload FROM market_rate_snapshots WHERE version = ?", [int(latest)]
+        )).first()
+        self.swap(MarketRateSnapshot.from_payload(int(row["version"]), to_str(row["built_at"]), to_str(row["payload"])))
+        return True
+
+    def calibrate(self, publish: bool = True, min_samples: int = MIN_CELL_SAMPLES) -> Dict[str, Any]:
+        """Rebuild the percentile tables from platform data; publish and swap them in."""
+        started = time.perf_counter()
+        backend = self._backend()
+        samples = collect_samples(backend)
+        snapshot = MarketRateSnapshot.build(samples, min_samples=min_samples)
+        report = {
+            "samples": len(samples),
+            "classified": sum(1 for s in samples if s[0] != ANY),
+            "with_country": sum(1 for s in samples if s[2]),
+            "cells": len(snapshot),
+            "version": None,
+        }
+        if publish:
+            payload = snapshot.to_payload()
+            inserted = backend.execute_many([
+                {
+                    "q": "INSERT INTO market_rate_snapshots (format, built_at, samples, cells, payload) "
+                         "VALUES (?, ?, ?, ?, ?) RETURNING version",
+                    "params": [SNAPSHOT_FORMAT, snapshot.built_at, len(samples), len(snapshot), payload],
+                },
+                {
+                    "q": "DELETE FROM market_rate_snapshots WHERE version <= "
+                         "(SELECT MAX(version) FROM market_rate_snapshots) - ?",
+                    "params": [KEEP_VERSIONS],
+                },
+            ])
+            snapshot.version = int(ResultSet.from_result(inserted[0]).scalar())
+            self.swap(snapshot)
+            report["version"] = snapshot.version
+            report["payload_bytes"] = len(payload)
+        report["ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return report
+
+    async def run(self) -> None:
+        """Background task: pick up snapshots published by the offline job."""
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                logger.warning(f"market_rates.refresh_failed: {e}")
+
+
+_store: Optional[MarketRateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_market_rate_store() -> MarketRateStore:
+    """Get or create the process-wide market rate store."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = MarketRateStore()
+    return _store
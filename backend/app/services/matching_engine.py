@@ -19,8 +19,43 @@ import logging
 import math
 from collections import defaultdict
 
+from app.db.schema_registry import register_schema
+
 logger = logging.getLogger(__name__)
 
+# Matching tables, created once by the startup schema bootstrap
+MATCHING_DDL = [
+    """CREATE TABLE IF NOT EXISTS skill_embeddings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        skill_name VARCHAR(100) NOT NULL UNIQUE,
+        embedding_vector TEXT NOT NULL,
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS match_scores (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        project_id INTEGER NOT NULL,
+        freelancer_id INTEGER NOT NULL,
+        score FLOAT NOT NULL,
+        factors TEXT,
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(project_id) REFERENCES projects(id),
+        FOREIGN KEY(freelancer_id) REFERENCES users(id),
+        UNIQUE(project_id, freelancer_id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS recommendation_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        item_type VARCHAR(20) NOT NULL,
+        item_id INTEGER NOT NULL,
+        score FLOAT NOT NULL,
+        shown_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        clicked BOOLEAN DEFAULT FALSE,
+        FOREIGN KEY(user_id) REFERENCES users(id)
+    )""",
+]
+register_schema("matching", MATCHING_DDL)
+
 # ============================================================================
 # Skill Synonym Graph — resolves equivalent skill names
 # ============================================================================
@@ -123,55 +158,6 @@ class MatchingEngine:
     
     def __init__(self, db: Session):
         self.db = db
-        self._ensure_matching_tables()
-    
-    def _ensure_matching_tables(self):
-        """Create matching-related tables if they don't exist"""
-        try:
-            # Skill embeddings table for ML-based matching
-            self.db.execute(text("""
-                CREATE TABLE IF NOT EXISTS skill_embeddings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    skill_name VARCHAR(100) NOT NULL UNIQUE,
-                    embedding_vector TEXT NOT NULL,
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
-                )
-            """))
-            
-            # Match scores cache table
-            self.db.execute(text("""
-                CREATE TABLE IF NOT EXISTS match_scores (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    project_id INTEGER NOT NULL,
-                    freelancer_id INTEGER NOT NULL,
-                    score FLOAT NOT NULL,
-                    factors TEXT,
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY(project_id) REFERENCES projects(id),
-                    FOREIGN KEY(freelancer_id) REFERENCES users(id),
-                    UNIQUE(project_id, freelancer_id)
-                )
-            """))
-            
-            # Recommendation history
-            self.db.execute(text("""
-                CREATE TABLE IF NOT EXISTS recommendation_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    item_type VARCHAR(20) NOT NULL,
-                    item_id INTEGER NOT NULL,
-                    score FLOAT NOT NULL,
-                    shown_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    clicked BOOLEAN DEFAULT FALSE,
-                    FOREIGN KEY(user_id) REFERENCES users(id)
-                )
-            """))
-            
-            self.db.commit()
-        except Exception as e:
-            self.db.rollback()
-            logger.error("Failed to create matching tables: %s", e)
     
     def calculate_skill_match_score(self, project_skills: List[str], freelancer_skills: List[str]) -> Dict[str, Any]:
         """
@@ -302,9 +302,9 @@ def mark_single_message_read(message_id: int, now: str):
 
 
 def get_message_ownership(message_id: int) -> Optional[dict]:
-    """Get message sender_id and receiver_id for permission checks."""
+    """Get message sender_id, receiver_id and read/deleted flags for permission checks."""
     result = execute_query(
-        "SELECT id, sender_id, receiver_id FROM messages WHERE id = ?",
+        "SELECT id, sender_id, receiver_id, is_read, is_deleted FROM messages WHERE id = ?",
         [message_id]
     )
     if not result or not result.get("rows"):
@@ -8,6 +8,7 @@ from datetime import datetime, timezone
 from typing import List, Optional
 
 from app.db.turso_http import execute_query, to_str, parse_date
+from app.services.realtime_metrics import publish as publish_metrics
 
 
 def _row_to_milestone(row) -> dict:
@@ -203,6 +204,7 @@ def create_payment_record(contract_id: int, milestone_id: int, client_id: int,
         VALUES (?, ?, ?, ?, ?, ?, ?, 'milestone', 'escrow', 'pending', ?, ?, ?)
     """, [contract_id, milestone_id, client_id, freelancer_id, amount, platform_fee,
           freelancer_amount, f"Payment for milestone: {title}", now, now])
+    publish_metrics("payment_created", from_user_id=client_id, to_user_id=freelancer_id)
 
     result = execute_query("SELECT id FROM payments WHERE milestone_id = ? ORDER BY id DESC LIMIT 1",
                            [milestone_id])
@@ -237,10 +239,20 @@ def check_and_complete_contract(contract_id: int):
         approved = int(row[1].get("value", 0))
         if total > 0 and total == approved:
             now = datetime.now(timezone.utc).isoformat()
-            execute_query(
-                "UPDATE contracts SET status = 'completed', updated_at = ? WHERE id = ? AND status != 'completed'",
+            closed = execute_query(
+                "UPDATE contracts SET status = 'completed', updated_at = ? WHERE id = ? "
+                "AND status IN ('active', 'in_progress') RETURNING freelancer_id, client_id",
                 [now, contract_id]
             )
+            if closed and closed.get("rows"):
+                row = closed["rows"][0]
+                publish_metrics("contract_ended", freelancer_id=row[0].get("value"), client_id=row[1].get("value"),
+                                status="completed")
+            else:
+                execute_query(
+                    "UPDATE contracts SET status = 'completed', updated_at = ? WHERE id = ? AND status != 'completed'",
+                    [now, contract_id]
+                )
 
 
 def reject_milestone(milestone_id: int, rejection_notes: str):
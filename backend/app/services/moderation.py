@@ -2,7 +2,6 @@
 """Content Moderation Service - AI-powered content safety."""
 
 import logging
-import re
 from datetime import datetime, timedelta, timezone
 from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
@@ -10,6 +9,8 @@ from enum import Enum
 from collections import defaultdict
 import secrets
 
+from app.services.content_scanner import ScannerBuilder
+
 logger = logging.getLogger(__name__)
 
 
@@ -60,12 +61,15 @@ PROFANITY_WORDS = {
 }
 
 # Spam patterns
+# Multiple links
+LINK_SPAM_PATTERN = r'(?:https?://)?(?:www\.)?(?:[a-z0-9-]+\.)+[a-z]{2,}(?:/[^\s]*)?(?:\s+){0,2}(?:https?://)?(?:www\.)?(?:[a-z0-9-]+\.)+[a-z]{2,}'
+
 SPAM_PATTERNS = [
     r'buy\s+now',
     r'click\s+here',
     r'make\s+money\s+fast',
     r'work\s+from\s+home\s+\$\d+',
-    r'(?:https?://)?(?:www\.)?(?:[a-z0-9-]+\.)+[a-z]{2,}(?:/[^\s]*)?(?:\s+){0,2}(?:https?://)?(?:www\.)?(?:[a-z0-9-]+\.)+[a-z]{2,}',  # Multiple links
+    LINK_SPAM_PATTERN,
 ]
 
 # Personal info patterns
@@ -75,6 +79,35 @@ PII_PATTERNS = [
     r'\b\d{3}[-]?\d{2}[-]?\d{4}\b',  # SSN
 ]
 
+# Scam indicator phrases (substring match)
+SCAM_PHRASES = [
+    "send money",
+    "wire transfer",
+    "western union",
+    "gift card",
+    "advance payment",
+    "pay upfront",
+    "too good to be true",
+    "guaranteed income",
+    "work from home $",
+    "make money fast"
+]
+
+# All moderation rules compiled once; each text is scanned in a single pass
+MODERATION_SCANNER = (
+    ScannerBuilder()
+    .terms(ViolationType.PROFANITY.value, PROFANITY_WORDS, whole_word=True)
+    .terms(ViolationType.SCAM.value, SCAM_PHRASES)
+    .patterns(ViolationType.SPAM.value, [p for p in SPAM_PATTERNS if p != LINK_SPAM_PATTERN])
+    # The link pattern can start almost anywhere; alone it keeps the phrase family's prefilter selective
+    .patterns(ViolationType.SPAM.value, [LINK_SPAM_PATTERN], family="links")
+    .patterns(ViolationType.PERSONAL_INFO.value, PII_PATTERNS, flags=0)
+    .build()
+)
+
+# PII is only flagged in public contexts
+_PII_CONTENT_TYPES = {"project", "profile", "review"}
+
 
 class ContentModerationService:
     """
@@ -118,8 +151,11 @@ class ContentModerationService:
         violations = []
         risk_score = 0.0
         
+        # Single scan for every rule family
+        hits = MODERATION_SCANNER.group(text)
+        
         # Check profanity
-        profanity_found = self._check_profanity(text)
+        profanity_found = [h.text.lower() for h in hits.get(ViolationType.PROFANITY.value, [])]
         if profanity_found:
             violations.append({
                 "type": ViolationType.PROFANITY.value,
@@ -129,7 +165,7 @@ class ContentModerationService:
             risk_score += 30.0
         
         # Check spam patterns
-        spam_matches = self._check_spam(text)
+        spam_matches = {h.rule for h in hits.get(ViolationType.SPAM.value, [])}
         if spam_matches:
             violations.append({
                 "type": ViolationType.SPAM.value,
@@ -139,7 +175,9 @@ class ContentModerationService:
             risk_score += 50.0
         
         # Check for PII
-        pii_found = self._check_pii(text, content_type)
+        pii_found = []
+        if content_type.value in _PII_CONTENT_TYPES:
+            pii_found = [h.text for h in hits.get(ViolationType.PERSONAL_INFO.value, [])]
         if pii_found:
             violations.append({
                 "type": ViolationType.PERSONAL_INFO.value,
@@ -149,7 +187,7 @@ class ContentModerationService:
             risk_score += 20.0
         
         # Check for scam indicators
-        if self._check_scam_indicators(text):
+        if hits.get(ViolationType.SCAM.value):
             violations.append({
                 "type": ViolationType.SCAM.value,
                 "severity": "high",
@@ -359,27 +397,13 @@ class ContentModerationService:
     
     def _check_profanity(self, text: str) -> List[str]:
         """Check text for profanity."""
-        words = text.lower().split()
-        found = []
-        
-        for word in words:
-            # Remove punctuation
-            clean_word = re.sub(r'[^\w]', '', word)
-            if clean_word in PROFANITY_WORDS:
-                found.append(clean_word)
-        
-        return found
+        hits = MODERATION_SCANNER.scan(text, {ViolationType.PROFANITY.value})
+        return [h.text.lower() for h in hits]
     
     def _check_spam(self, text: str) -> List[str]:
         """Check text for spam patterns."""
-        matches = []
-        text_lower = text.lower()
-        
-        for pattern in SPAM_PATTERNS:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                matches.append(pattern)
-        
-        return matches
+        hits = MODERATION_SCANNER.scan(text, {ViolationType.SPAM.value})
+        return list(dict.fromkeys(h.rule for h in hits))
     
     def _check_pii(
         self,
@@ -388,34 +412,15 @@ class ContentModerationService:
     ) -> List[str]:
         """Check for personal information."""
         # Only flag PII in public contexts
-        if content_type not in [ModerationContentType.PROJECT, ModerationContentType.PROFILE, ModerationContentType.REVIEW]:
+        if content_type.value not in _PII_CONTENT_TYPES:
             return []
         
-        found = []
-        for pattern in PII_PATTERNS:
-            matches = re.findall(pattern, text)
-            if matches:
-                found.extend(matches)
-        
-        return found
+        hits = MODERATION_SCANNER.scan(text, {ViolationType.PERSONAL_INFO.value})
+        return [h.text for h in hits]
     
     def _check_scam_indicators(self, text: str) -> bool:
         """Check for scam indicators."""
-        scam_phrases = [
-            "send money",
-            "wire transfer",
-            "western union",
-            "gift card",
-            "advance payment",
-            "pay upfront",
-            "too good to be true",
-            "guaranteed income",
-            "work from home $",
-            "make money fast"
-        ]
-        
-        text_lower = text.lower()
-        return any(phrase in text_lower for phrase in scam_phrases)
+        return bool(MODERATION_SCANNER.scan(text, {ViolationType.SCAM.value}))
     
     async def _track_user_violation(
         self,
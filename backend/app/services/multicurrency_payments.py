@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 from fastapi import Depends
 import httpx
 import json
+import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -614,45 +615,72 @@ class MultiCurrencyPaymentService:
         - Payoneer
         """
         from app.db.session import execute_query
+        from app.services.ledger import (
+            InsufficientFunds, LedgerError, external_account, get_ledger, hold_account, user_account,
+        )
         
-        # Verify user balance
-        balance_result = execute_query("""
-            SELECT account_balance FROM users WHERE id = ?
+        # Verify user exists
+        user_result = execute_query("""
+            SELECT id FROM users WHERE id = ?
         """, [user_id])
         
-        if not balance_result or not balance_result.get("rows"):
+        if not user_result or not user_result.get("rows"):
             return {"error": "User not found"}
         
-        balance = Decimal(str(balance_result["rows"][0][0].get("value", 0)))
-        
-        if balance < amount:
-            return {"error": "Insufficient balance"}
-        
-        # Process payout based on method
         if payout_method == "crypto":
-            result = await self._crypto_payout(user_id, amount, currency)
+            send = self._crypto_payout
         elif payout_method == "stripe":
-            result = await self._stripe_instant_payout(user_id, amount, currency)
+            send = self._stripe_instant_payout
         else:
             return {"error": "Unsupported payout method"}
         
-        if "error" not in result:
-            # Atomic balance deduction to prevent race conditions
-            execute_query("""
-                UPDATE users SET account_balance = account_balance - ? WHERE id = ? AND account_balance >= ?
-            """, [float(amount), user_id, float(amount)])
-            
-            # Record payout
-            execute_query("""
-                INSERT INTO payouts (
-                    user_id, amount, currency, payout_method,
-                    status, transaction_id, created_at
-                ) VALUES (?, ?, ?, ?, 'completed', ?, ?)
-            """, [
-                user_id, float(amount), currency, payout_method,
-                result.get("transaction_id"),
-                datetime.now(timezone.utc).isoformat()
-            ])
+        # Reserve the funds before anything leaves the platform (overdraft-checked), then
+        # confirm the reservation into external:payouts or void it back to the user
+        ledger = get_ledger()
+        reservation = f"payout:{uuid.uuid4().hex}"
+        hold = hold_account(reservation)
+        try:
+            ledger.post("payout_reserve", [(user_account(user_id), -amount), (hold, amount)],
+                        reference=reservation, posting_id=f"{reservation}:reserve")
+        except InsufficientFunds:
+            return {"error": "Insufficient balance"}
+        
+        def void():
+            ledger.post("payout_void", [(hold, -amount), (user_account(user_id), amount)],
+                        reference=reservation, posting_id=f"{reservation}:void")
+        
+        try:
+            result = await send(user_id, amount, currency)
+        except Exception:
+            void()
+            raise
+        if "error" in result:
+            void()
+            return result
+        
+        try:
+            ledger.post(
+                "payout",
+                [(hold, -amount), (external_account("payouts"), amount)],
+                reference=result.get("transaction_id"),
+                posting_id=f"{reservation}:confirm",
+                after=[{
+                    "q": """
+                        INSERT INTO payouts (
+                            user_id, amount, currency, payout_method,
+                            status, transaction_id, created_at
+                        ) VALUES (?, ?, ?, ?, 'completed', ?, ?)
+                    """,
+                    "params": [
+                        user_id, float(amount), currency, payout_method,
+                        result.get("transaction_id"),
+                        datetime.now(timezone.utc).isoformat()
+                    ],
+                }],
+            )
+        except LedgerError as e:
+            # The money has left: it stays reserved in the hold account for reconciliation
+            logger.error(f"Payout {result.get('transaction_id')} sent but not confirmed, funds held in {hold}: {e}")
         
         return result
 
@@ -0,0 +1,520 @@
+# @AI-HINT: Streaming PDF writer and layout templates for invoices, contracts, reports and exports - stdlib only, base-14 Helvetica with cached metrics, pages written as soon as they are laid out
+"""
+PDF Document - lays out a document spec and streams it out as PDF 1.4.
+
+A spec is plain JSON-able data, so it can cross a process boundary:
+
+    {
+        "template": "invoice" | "report" | "contract" | "legal" | "export",
+        "title": "Invoice INV-2026-10-0001",
+        "subtitle": "optional grey line under the title",
+        "meta": [["Issued", "2026-10-01"], ["Due", "2026-10-31"]],
+        "blocks": [
+            {"type": "heading", "text": "..."},
+            {"type": "paragraph", "text": "..."},
+            {"type": "keyvalue", "items": [["Client", "Acme"], ...]},
+            {"type": "table", "columns": [{"key": "amount", "label": "Amount",
+                                           "width": 1, "align": "right"}, ...],
+             "rows": [{...} or [...], ...], "totals": [["Total", "3,600.00"]]},
+            {"type": "page_break"},
+        ],
+    }
+
+Fonts are the standard Helvetica and Helvetica-Bold, so nothing is embedded.
+Text uses WinAnsi (cp1252) encoding. Text is measured with the AFM advance
+widths, so wrapping, truncation and right alignment are exact.
+
+Each worker process builds two things once and reuses them for every
+document it renders: the width tables for measuring text, and a compiled
+layout template for each document kind. A compiled template holds the page
+geometry and its letterhead, a Form XObject that every page draws with a
+single ``Do``.
+
+``render_document`` writes each page (Flate-compressed) to the output as
+soon as it is full. Only the current page and the xref offsets stay in
+memory, so ``rows`` can be a generator of any length.
+"""
+
+import io
+import os
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Sequence, Tuple
+
+PAGE_SIZES = {"letter": (612.0, 792.0), "a4": (595.28, 841.89)}
+BRAND = "MegiLance"
+FOOTER_TEXT = "MegiLance - megilance.site"
+
+# AFM advance widths (1/1000 em) for WinAnsi 32..126
+_HELVETICA_ASCII = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_BOLD_ASCII = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+FONTS = {"F1": ("Helvetica", _HELVETICA_ASCII), "F2": ("Helvetica-Bold", _HELVETICA_BOLD_ASCII)}
+REGULAR, BOLD = "F1", "F2"
+ELLIPSIS = "\u2026"
+
+# Fixed object numbers; pages and their content streams follow
+_CATALOG, _PAGES, _RESOURCES, _LETTERHEAD, _INFO = 1, 2, 3, 4, 5
+_FONT_OBJECTS = {"F1": 6, "F2": 7}
+_FIRST_FREE = 8
+
+TEXT = (0.13, 0.15, 0.2)
+MUTED = (0.45, 0.48, 0.53)
+RULE = (0.82, 0.84, 0.87)
+STRIPE = (0.96, 0.97, 0.98)
+
+
+@dataclass(frozen=True)
+class Template:
+    """Page setup and look of one document kind."""
+    label: str
+    page: str = "a4"
+    margin: float = 48.0
+    accent: Tuple[float, float, float] = (0.16, 0.38, 0.85)
+    body_size: float = 10.0
+    table_size: float = 9.0
+
+
+TEMPLATES: Dict[str, Template] = {
+    "invoice": Template(label="INVOICE", accent=(0.16, 0.38, 0.85)),
+    "report": Template(label="REPORT", accent=(0.09, 0.56, 0.45), margin=40.0, table_size=8.5),
+    "contract": Template(label="CONTRACT", accent=(0.27, 0.27, 0.35), body_size=10.5),
+    "legal": Template(label="LEGAL DOCUMENT", accent=(0.27, 0.27, 0.35), body_size=10.5),
+    "export": Template(label="DATA EXPORT", accent=(0.45, 0.33, 0.8), margin=36.0, table_size=8.0),
+}
+
+
+@lru_cache(maxsize=None)
+def _widths(font: str) -> Tuple[int, ...]:
+    """256-entry advance width table for ``font`` in WinAnsi encoding."""
+    ascii_widths = FONTS[font][1]
+    table = [556] * 256
+    table[32:127] = ascii_widths
+    table[0x85] = 1000  # ellipsis
+    table[0x95] = 350  # bullet
+    table[0x96], table[0x97] = 556, 1000  # en and em dash
+    table[0xA0] = 278  # no-break space
+    return tuple(table)
+
+
+def encode(text: str) -> bytes:
+    return text.encode("cp1252", "replace")
+
+
+@lru_cache(maxsize=16384)
+def _units(text: str, font: str) -> int:
+    table = _widths(font)
+    return sum(table[b] for b in encode(text))
+
+
+def text_width(text: str, font: str, size: float) -> float:
+    """Width of ``text`` in points."""
+    return _units(text, font) * size / 1000.0
+
+
+def _escape(data: bytes) -> bytes:
+    return data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)").replace(b"\r", b"\\r")
+
+
+def _num(value: float) -> bytes:
+    return (b"%.2f" % value).rstrip(b"0").rstrip(b".") or b"0"
+
+
+def _color(rgb: Sequence[float], op: bytes) -> bytes:
+    return b" ".join(_num(c) for c in rgb) + b" " + op + b"\n"
+
+
+def _text_op(x: float, y: float, text: str, font: str, size: float) -> bytes:
+    return b"BT /%s %s Tf %s %s Td (%s) Tj ET\n" % (
+        font.encode(), _num(size), _num(x), _num(y), _escape(encode(text)))
+
+
+def fit(text: str, font: str, size: float, width: float) -> str:
+    """``text`` cut with an ellipsis so it fits in ``width`` points."""
+    if text_width(text, font, size) <= width:
+        return text
+    limit = width * 1000.0 / size - _widths(font)[0x85]
+    table = _widths(font)
+    used = 0
+    for i, b in enumerate(encode(text)):
+        used += table[b]
+        if used > limit:
+            return text[:i] + ELLIPSIS
+    return text
+
+
+def wrap(text: str, font: str, size: float, width: float) -> List[str]:
+    """Greedy word wrap to ``width`` points; explicit newlines are kept."""
+    lines: List[str] = []
+    space = text_width(" ", font, size)
+    for raw in str(text).split("\n"):
+        line, used = "", 0.0
+        for word in raw.split():
+            w = text_width(word, font, size)
+            while w > width:  # a word longer than the line is split across lines
+                if line:
+                    lines.append(line)
+                    line, used = "", 0.0
+                head = fit(word, font, size, width)[:-1] or word[:1]
+                lines.append(head)
+                word = word[len(head):]
+                w = text_width(word, font, size)
+            if line and used + space + w > width:
+                lines.append(line)
+                line, used = word, w
+            else:
+                line, used = (f"{line} {word}", used + space + w) if line else (word, w)
+        lines.append(line)
+    return lines
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A template resolved to page geometry, plus its letterhead content stream."""
+    name: str
+    template: Template
+    width: float
+    height: float
+    left: float
+    right: float
+    top: float
+    bottom: float
+    letterhead: bytes
+
+    @property
+    def content_width(self) -> float:
+        return self.right - self.left
+
+
+@lru_cache(maxsize=None)
+def compiled_template(name: str) -> CompiledTemplate:
+    """Geometry and letterhead XObject for ``name``, built once per process."""
+    tpl = TEMPLATES.get(name) or TEMPLATES["report"]
+    width, height = PAGE_SIZES[tpl.page]
+    m = tpl.margin
+    ops = [
+        _color(tpl.accent, b"rg"),
+        b"0 %s %s 6 re f\n" % (_num(height - 6), _num(width)),
+        _color(TEXT, b"rg"),
+        _text_op(m, height - 34, BRAND, BOLD, 14),
+        _color(tpl.accent, b"rg"),
+        _text_op(width - m - text_width(tpl.label, BOLD, 9), height - 32, tpl.label, BOLD, 9),
+        _color(RULE, b"RG"),
+        b"0.75 w %s %s m %s %s l S\n" % (_num(m), _num(height - 44), _num(width - m), _num(height - 44)),
+        b"%s 40 m %s 40 l S\n" % (_num(m), _num(width - m)),
+        _color(MUTED, b"rg"),
+        _text_op(m, 28, FOOTER_TEXT, REGULAR, 7.5),
+    ]
+    return CompiledTemplate(
+        name=name, template=tpl, width=width, height=height,
+        left=m, right=width - m, top=height - 64, bottom=56.0,
+        letterhead=zlib.compress(b"".join(ops), 6),
+    )
+
+
+class PdfStreamWriter:
+    """Writes PDF objects to ``out`` as they are produced; pages tree and xref at close."""
+
+    def __init__(self, out: BinaryIO, template: CompiledTemplate, title: str = ""):
+        self.out = out
+        self.template = template
+        self.offsets: Dict[int, int] = {}
+        self.page_ids: List[int] = []
+        self._next = _FIRST_FREE
+        self._pos = 0
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        for font, num in _FONT_OBJECTS.items():
+            self._object(num, b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>"
+                         % FONTS[font][0].encode())
+        fonts = b" ".join(b"/%s %d 0 R" % (f.encode(), n) for f, n in _FONT_OBJECTS.items())
+        self._object(_RESOURCES, b"<< /Font << %s >> /XObject << /LH %d 0 R >> >>" % (fonts, _LETTERHEAD))
+        self._object(_LETTERHEAD, b"<< /Type /XObject /Subtype /Form /BBox [0 0 %s %s] "
+                                  b"/Resources << /Font << %s >> >> /Filter /FlateDecode /Length %d >>\n"
+                                  b"stream\n%s\nendstream"
+                     % (_num(template.width), _num(template.height), fonts, len(template.letterhead),
+                        template.letterhead))
+        self._object(_INFO, b"<< /Title (%s) /Producer (%s) >>" % (_escape(encode(title)), BRAND.encode()))
+
+    def _write(self, data: bytes) -> None:
+        self.out.write(data)
+        self._pos += len(data)
+
+    def _object(self, num: int, body: bytes) -> None:
+        self.offsets[num] = self._pos
+        self._write(b"%d 0 obj\n%s\nendobj\n" % (num, body))
+
+    def _allocate(self) -> int:
+        num = self._next
+        self._next += 1
+        return num
+
+    def add_page(self, content: bytes) -> None:
+        data = zlib.compress(b"q /LH Do Q\n" + content, 6)
+        content_id, page_id = self._allocate(), self._allocate()
+        self._object(content_id, b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(data), data))
+        self._object(page_id, b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %s %s] /Resources %d 0 R "
+                              b"/Contents %d 0 R >>"
+                     % (_PAGES, _num(self.template.width), _num(self.template.height), _RESOURCES, content_id))
+        self.page_ids.append(page_id)
+
+    def close(self) -> int:
+        """Finish the file; returns the page count."""
+        kids = b" ".join(b"%d 0 R" % p for p in self.page_ids)
+        self._object(_PAGES, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self.page_ids)))
+        self._object(_CATALOG, b"<< /Type /Catalog /Pages %d 0 R >>" % _PAGES)
+        xref_at = self._pos
+        size = self._next
+        entries = [b"0000000000 65535 f \n"]
+        for num in range(1, size):
+            entries.append(b"%010d 00000 n \n" % self.offsets[num] if num in self.offsets
+                           else b"0000000000 65535 f \n")
+        self._write(b"xref\n0 %d\n%s" % (size, b"".join(entries)))
+        self._write(b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                    % (size, _CATALOG, _INFO, xref_at))
+        return len(self.page_ids)
+
+
+class _Layout:
+    """Flows blocks down the page, starting a new page when one is full."""
+
+    def __init__(self, writer: PdfStreamWriter, spec: Dict[str, Any]):
+        self.writer = writer
+        self.t = writer.template
+        self.title = str(spec.get("title") or "")
+        self.ops: List[bytes] = []
+        self.page_no = 0
+        self.y = 0.0
+
+    # -- pages ---------------------------------------------------------
+
+    def _flush(self) -> None:
+        if self.page_no:
+            self.ops.append(_color(MUTED, b"rg"))
+            label = f"Page {self.page_no}"
+            self.ops.append(_text_op(self.t.right - text_width(label, REGULAR, 7.5), 28, label, REGULAR, 7.5))
+            self.writer.add_page(b"".join(self.ops))
+            self.ops = []
+
+    def new_page(self) -> None:
+        self._flush()
+        self.page_no += 1
+        self.y = self.t.top
+        if self.page_no > 1 and self.title:
+            self.text(self.t.left, self.y, fit(self.title, BOLD, 9, self.t.content_width), BOLD, 9, MUTED)
+            self.y -= 20
+
+    def ensure(self, height: float) -> bool:
+        """Start a new page unless ``height`` points fit; True if it did."""
+        if self.y - height < self.t.bottom:
+            self.new_page()
+            return True
+        return False
+
+    def finish(self) -> None:
+        self._flush()
+
+    # -- drawing -------------------------------------------------------
+
+    def text(self, x: float, y: float, s: str, font: str, size: float,
+             color: Sequence[float] = TEXT) -> None:
+        self.ops.append(_color(color, b"rg"))
+        self.ops.append(_text_op(x, y, s, font, size))
+
+    def rect(self, x: float, y: float, w: float, h: float, color: Sequence[float]) -> None:
+        self.ops.append(_color(color, b"rg") + b"%s %s %s %s re f\n" % (_num(x), _num(y), _num(w), _num(h)))
+
+    def rule(self, y: float, color: Sequence[float] = RULE) -> None:
+        self.ops.append(_color(color, b"RG") + b"0.5 w %s %s m %s %s l S\n"
+                        % (_num(self.t.left), _num(y), _num(self.t.right), _num(y)))
+
+    # -- blocks --------------------------------------------------------
+
+    def title_block(self, spec: Dict[str, Any]) -> None:
+        width = self.t.content_width
+        for line in wrap(self.title, BOLD, 18, width):
+            self.y -= 18
+            self.text(self.t.left, self.y, line, BOLD, 18)
+            self.y -= 4
+        if spec.get("subtitle"):
+            for line in wrap(str(spec["subtitle"]), REGULAR, 10, width):
+                self.y -= 13
+                self.text(self.t.left, self.y, line, REGULAR, 10, MUTED)
+        meta = spec.get("meta") or []
+        if meta:
+            self.y -= 12
+            per_row = 4
+            col = width / per_row
+            for start in range(0, len(meta), per_row):
+                self.ensure(28)
+                for i, (label, value) in enumerate(meta[start:start + per_row]):
+                    x = self.t.left + i * col
+                    self.text(x, self.y - 8, fit(str(label).upper(), BOLD, 7, col - 8), BOLD, 7, MUTED)
+                    self.text(x, self.y - 21, fit(str(value), REGULAR, 10, col - 8), REGULAR, 10)
+                self.y -= 30
+        self.y -= 6
+        self.rule(self.y)
+        self.y -= 14
+
+    def heading(self, text: str) -> None:
+        size = 12.0
+        self.ensure(size + 2 * self.t.template.body_size * 1.4 + 10)
+        self.y -= 8
+        for line in wrap(text, BOLD, size, self.t.content_width):
+            self.y -= size
+            self.text(self.t.left, self.y, line, BOLD, size)
+            self.y -= 3
+        self.y -= 4
+
+    def paragraph(self, text: str) -> None:
+        size = self.t.template.body_size
+        leading = size * 1.4
+        for line in wrap(text, REGULAR, size, self.t.content_width):
+            self.ensure(leading)
+            self.y -= leading
+            self.text(self.t.left, self.y + 3, line, REGULAR, size)
+        self.y -= size * 0.6
+
+    def keyvalue(self, items: Iterable[Sequence[Any]]) -> None:
+        size = self.t.template.body_size
+        leading = size * 1.4
+        label_w = self.t.content_width * 0.3
+        value_w = self.t.content_width - label_w
+        for label, value in items:
+            lines = wrap(str(value), REGULAR, size, value_w - 6)
+            self.ensure(leading * min(len(lines), 3))
+            self.text(self.t.left, self.y - leading + 3, fit(str(label), BOLD, size, label_w - 8), BOLD, size, MUTED)
+            for line in lines:
+                self.ensure(leading)
+                self.y -= leading
+                self.text(self.t.left + label_w, self.y + 3, line, REGULAR, size)
+        self.y -= size * 0.6
+
+    def table(self, block: Dict[str, Any]) -> None:
+        columns = block.get("columns") or []
+        if not columns:
+            return
+        size = self.t.template.table_size
+        row_h = size * 1.9
+        pad = 4.0
+        weights = [float(c.get("width", 1)) for c in columns]
+        scale = self.t.content_width / sum(weights)
+        xs = [self.t.left]
+        for w in weights:
+            xs.append(xs[-1] + w * scale)
+        keys = [c.get("key", i) for i, c in enumerate(columns)]
+        align_right = [c.get("align") == "right" for c in columns]
+        labels = [fit(str(c.get("label", c.get("key", ""))), BOLD, size, xs[i + 1] - xs[i] - 2 * pad)
+                  for i, c in enumerate(columns)]
+
+        def cell(i: int, value: Any, font: str, y: float) -> None:
+            s = fit("" if value is None else str(value), font, size, xs[i + 1] - xs[i] - 2 * pad)
+            x = xs[i + 1] - pad - text_width(s, font, size) if align_right[i] else xs[i] + pad
+            self.ops.append(_text_op(x, y, s, font, size))
+
+        def header() -> None:
+            self.rect(self.t.left, self.y - row_h, self.t.content_width, row_h, STRIPE)
+            self.ops.append(_color(MUTED, b"rg"))
+            for i, label in enumerate(labels):
+                cell(i, label, BOLD, self.y - row_h + size * 0.65)
+            self.y -= row_h
+            self.rule(self.y, self.t.template.accent)
+
+        self.ensure(row_h * 3)
+        header()
+        for n, row in enumerate(block.get("rows") or ()):
+            if self.ensure(row_h):
+                header()
+            if n % 2:
+                self.rect(self.t.left, self.y - row_h, self.t.content_width, row_h, STRIPE)
+            self.ops.append(_color(TEXT, b"rg"))
+            values = [row.get(k) for k in keys] if isinstance(row, dict) else list(row)
+            baseline = self.y - row_h + size * 0.65
+            for i, value in enumerate(values[:len(columns)]):
+                cell(i, value, REGULAR, baseline)
+            self.y -= row_h
+        self.rule(self.y)
+
+        totals = block.get("totals") or []
+        label_right = xs[-2] - pad if len(xs) > 2 else self.t.right - 80
+        for i, (label, value) in enumerate(totals):
+            font = BOLD if i == len(totals) - 1 else REGULAR
+            self.ensure(row_h)
+            self.y -= row_h
+            label = str(label)
+            self.text(label_right - text_width(label, font, size), self.y + size * 0.65, label, font, size, MUTED)
+            value = str(value)
+            self.text(self.t.right - pad - text_width(value, font, size), self.y + size * 0.65, value, font, size)
+        self.y -= size
+
+
+def render_document(spec: Dict[str, Any], out: BinaryIO) -> int:
+    """Lay out ``spec`` and stream it to ``out``; returns the page count."""
+    template = compiled_template(spec.get("template") or "report")
+    writer = PdfStreamWriter(out, template, str(spec.get("title") or ""))
+    layout = _Layout(writer, spec)
+    layout.new_page()
+    layout.title_block(spec)
+    for block in spec.get("blocks") or ():
+        kind = block.get("type")
+        if kind == "heading":
+            layout.heading(str(block.get("text", "")))
+        elif kind == "paragraph":
+            layout.paragraph(str(block.get("text", "")))
+        elif kind == "keyvalue":
+            layout.keyvalue(block.get("items") or [])
+        elif kind == "table":
+            layout.table(block)
+        elif kind == "page_break":
+            layout.new_page()
+    layout.finish()
+    return writer.close()
+
+
+def render_bytes(spec: Dict[str, Any]) -> bytes:
+    out = io.BytesIO()
+    render_document(spec, out)
+    return out.getvalue()
+
+
+def render_to_file(spec: Dict[str, Any], path: str) -> Dict[str, int]:
+    """Render to ``path`` through a temp file beside it, so readers never see a partial PDF."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    try:
+        with open(tmp, "wb", buffering=256 * 1024) as f:
+            pages = render_document(spec, f)
+            size = f.tell()
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    return {"pages": pages, "bytes": size}
+
+
+def render_many(items: Sequence[Tuple[Dict[str, Any], str]]) -> List[Dict[str, Any]]:
+    """
+    Render a chunk of ``(spec, path)`` pairs in one pool task (batch jobs).
+
+    A failed document does not stop the rest: its result carries ``error``.
+    """
+    results = []
+    for spec, path in items:
+        try:
+            results.append(render_to_file(spec, path))
+        except Exception as e:
+            results.append({"error": f"{type(e).__name__}: {e}"})
+    return results
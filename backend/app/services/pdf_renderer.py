@@ -0,0 +1,450 @@
+# @AI-HINT: Pooled PDF rendering - invoices, contracts, reports and exports rendered in worker processes; callers get a job handle, batches (month-end invoices) go out in chunks; job state shared in Turso
+"""
+PDF Renderer - one rendering service for every PDF the platform produces.
+
+Callers build a document spec (see ``app.services.pdf_document``). The
+helpers below cover invoices, contracts, legal documents and plain report or
+export data. The spec goes to ``submit``, which returns right away with a
+job handle:
+
+    {"job_id", "status": "queued", "status_url", "download_url", ...}
+
+The job row lives in ``pdf_render_jobs``, so any worker can answer the status
+and download endpoints (``/api/pdf-jobs``). A dispatch thread hands the spec
+to a process pool. There ``render_many`` streams the PDF straight to its
+storage path: with local storage that is the final file, otherwise a temp
+file that is uploaded afterwards (without a public ACL). Each pool process
+keeps its font metrics and compiled templates for its whole life, so only
+the first document a process renders pays for building them.
+
+Rendered files are private to their owner: ``/uploads`` refuses
+``RENDER_ROOT`` and the only way to fetch one is the authenticated download
+endpoint (a short-lived signed URL on object storage).
+
+``submit_batch`` queues many documents at once, such as month-end invoices
+for every user. It inserts all rows in one round trip and renders them in
+chunks of ``chunk_size`` per pool task. Each chunk costs one IPC round trip
+and one status write, not one per document. ``batch_status`` reports
+progress.
+"""
+
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.db.schema_registry import ensure_schema, register_schema
+from app.db.turso_http import ResultSet, get_turso_http
+from app.services.pdf_document import render_bytes, render_many
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ("queued", "rendering", "completed", "failed")
+RENDER_ROOT = "pdf"  # private: /uploads refuses it, downloads go through /api/pdf-jobs
+
+PDF_JOBS_DDL = [
+    """CREATE TABLE IF NOT EXISTS pdf_render_jobs (
+        id TEXT PRIMARY KEY,
+        batch_id TEXT,
+        owner_id INTEGER,
+        kind TEXT NOT NULL,
+        filename TEXT NOT NULL,
+        status TEXT NOT NULL,
+        path TEXT NOT NULL,
+        pages INTEGER,
+        bytes INTEGER,
+        error TEXT,
+        created_at TEXT NOT NULL,
+        finished_at TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_pdf_render_jobs_batch ON pdf_render_jobs(batch_id)",
+]
+
+register_schema("pdf_renderer", PDF_JOBS_DDL)
+
+_JOB_COLUMNS = "id, batch_id, owner_id, kind, filename, status, path, pages, bytes, error, created_at, finished_at"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def job_handle(job: Dict[str, Any]) -> Dict[str, Any]:
+    """What the API returns for a job: state plus where to poll and download."""
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "kind": job["kind"],
+        "filename": job["filename"],
+        "pages": job.get("pages"),
+        "bytes": job.get("bytes"),
+        "error": job.get("error"),
+        "status_url": f"/api/pdf-jobs/{job['id']}",
+        "download_url": f"/api/pdf-jobs/{job['id']}/download",
+    }
+
+
+# ---------------------------------------------------------------------------
+# Document specs
+# ---------------------------------------------------------------------------
+
+def money(value: Any, currency: str = "") -> str:
+    try:
+        amount = f"{float(value or 0):,.2f}"
+    except (TypeError, ValueError):
+        return str(value)
+    return f"{amount} {currency}".strip()
+
+
+def _date(value: Any) -> str:
+    return str(value or "")[:10]
+
+
+def invoice_document(invoice: Dict[str, Any]) -> Dict[str, Any]:
+    """Spec for an invoice from either invoice store (``invoices`` rows or invoice_tax dicts)."""
+    currency = invoice.get("currency") or "USD"
+    rows = []
+    for item in invoice.get("items") or []:
+        quantity = item.get("quantity", 1) or 1
+        unit_price = item.get("unit_price", item.get("rate", item.get("amount", 0))) or 0
+        total = item.get("total", item.get("amount"))
+        rows.append({
+            "description": item.get("description") or item.get("name") or "",
+            "quantity": f"{quantity:g}" if isinstance(quantity, (int, float)) else str(quantity),
+            "unit_price": money(unit_price),
+            "total": money(total if total is not None else float(quantity) * float(unit_price)),
+        })
+    totals = [["Subtotal", money(invoice.get("subtotal"), currency)]]
+    for tax in invoice.get("tax_breakdown") or []:
+        totals.append([f"{tax.get('name', 'Tax')} ({tax.get('rate', 0)}%)", money(tax.get("amount"), currency)])
+    if not invoice.get("tax_breakdown") and invoice.get("tax"):
+        totals.append(["Tax", money(invoice.get("tax"), currency)])
+    totals.append(["Total", money(invoice.get("total"), currency)])
+
+    meta = [["Issued", _date(invoice.get("issue_date") or invoice.get("created_at"))],
+            ["Due", _date(invoice.get("due_date"))],
+            ["Status", str(invoice.get("status") or "").replace("_", " ").title()]]
+    if invoice.get("contract_id"):
+        meta.append(["Contract", f"#{invoice['contract_id']}"])
+    parties = [[label, str(invoice[key])] for label, key in
+               (("From", "from_name"), ("Bill to", "to_name"), ("From user", "from_user_id"), ("Bill to user", "to_user_id"))
+               if invoice.get(key)]
+    blocks: List[Dict[str, Any]] = []
+    if parties:
+        blocks.append({"type": "keyvalue", "items": parties})
+    blocks.append({
+        "type": "table",
+        "columns": [
+            {"key": "description", "label": "Description", "width": 4},
+            {"key": "quantity", "label": "Qty", "width": 0.8, "align": "right"},
+            {"key": "unit_price", "label": "Unit price", "width": 1.4, "align": "right"},
+            {"key": "total", "label": "Amount", "width": 1.4, "align": "right"},
+        ],
+        "rows": rows,
+        "totals": totals,
+    })
+    if invoice.get("notes"):
+        blocks += [{"type": "heading", "text": "Notes"}, {"type": "paragraph", "text": str(invoice["notes"])}]
+    return {
+        "template": "invoice",
+        "title": f"Invoice {invoice.get('invoice_number') or invoice.get('id')}",
+        "meta": meta,
+        "blocks": blocks,
+    }
+
+
+def sections_document(template: str, title: str, sections: Sequence[Dict[str, Any]],
+                      subtitle: Optional[str] = None, meta: Optional[List[List[str]]] = None) -> Dict[str, Any]:
+    """Spec for titled prose sections (contracts, legal documents)."""
+    blocks: List[Dict[str, Any]] = []
+    for section in sections:
+        if section.get("title"):
+            blocks.append({"type": "heading", "text": str(section["title"])})
+        blocks.append({"type": "paragraph", "text": str(section.get("content") or "")})
+    return {"template": template, "title": title, "subtitle": subtitle, "meta": meta or [], "blocks": blocks}
+
+
+def _label(key: Any) -> str:
+    return str(key).replace("_", " ").title()
+
+
+def _cell(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    if isinstance(value, (dict, list)):
+        return ", ".join(f"{k}: {v}" for k, v in value.items()) if isinstance(value, dict) else ", ".join(map(str, value))
+    return "" if value is None else str(value)
+
+
+def data_blocks(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Report or export data as blocks: scalars and dicts as key/value lists, lists of dicts as tables."""
+    blocks: List[Dict[str, Any]] = []
+    loose = [[_label(k), _cell(v)] for k, v in data.items() if not isinstance(v, (dict, list))]
+    if loose:
+        blocks.append({"type": "keyvalue", "items": loose})
+    for key, value in data.items():
+        if isinstance(value, dict):
+            blocks.append({"type": "heading", "text": _label(key)})
+            blocks.append({"type": "keyvalue", "items": [[_label(k), _cell(v)] for k, v in value.items()]})
+        elif isinstance(value, list) and value:
+            blocks.append({"type": "heading", "text": f"{_label(key)} ({len(value)})"})
+            if isinstance(value[0], dict):
+                keys = list(dict.fromkeys(k for row in value for k in row))
+                numeric = {k for k in keys if all(isinstance(r.get(k), (int, float)) or r.get(k) is None for r in value)}
+                blocks.append({
+                    "type": "table",
+                    "columns": [{"key": k, "label": _label(k), "align": "right" if k in numeric else "left"}
+                                for k in keys],
+                    "rows": [[_cell(row.get(k)) for k in keys] for row in value],
+                })
+            else:
+                blocks.append({"type": "paragraph", "text": "\n".join(_cell(v) for v in value)})
+    return blocks
+
+
+# ---------------------------------------------------------------------------
+# Render jobs
+# ---------------------------------------------------------------------------
+
+class PdfRenderService:
+    """
+    Queues documents for the render pool and tracks them in ``pdf_render_jobs``.
+
+    ``workers`` pool processes render. The same number of dispatch threads
+    feed them and record results, so callers never block on a render.
+    """
+
+    def __init__(self, backend_factory: Optional[Callable[[], Any]] = None, storage=None,
+                 workers: int = 0, chunk_size: int = 20):
+        self._backend_factory = backend_factory or get_turso_http
+        self._storage = storage
+        self.workers = workers if workers > 0 else max(1, (os.cpu_count() or 2) // 2)
+        self.chunk_size = max(1, chunk_size)
+        self._lock = threading.Lock()
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+        self.stats = {"jobs": 0, "completed": 0, "failed": 0, "pages": 0, "chunks": 0}
+
+    @property
+    def storage(self):
+        if self._storage is None:
+            from app.core.storage import get_storage
+            self._storage = get_storage()
+        return self._storage
+
+    def _backend(self):
+        backend = self._backend_factory()
+        ensure_schema("pdf_renderer", backend=backend)
+        return backend
+
+    def _executors(self) -> Tuple[ProcessPoolExecutor, ThreadPoolExecutor]:
+        if self._processes is None:
+            with self._lock:
+                if self._processes is None:
+                    # spawn: the API process runs threads, and forking those is unsafe
+                    self._threads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pdf-render")
+                    self._processes = ProcessPoolExecutor(max_workers=self.workers,
+                                                          mp_context=multiprocessing.get_context("spawn"))
+        return self._processes, self._threads
+
+    # -- submitting ----------------------------------------------------
+
+    def _new_job(self, kind: str, owner_id: Optional[int], filename: Optional[str],
+                 batch_id: Optional[str]) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        name = filename or f"{kind}-{job_id[:8]}.pdf"
+        if not name.lower().endswith(".pdf"):
+            name += ".pdf"
+        return {"id": job_id, "batch_id": batch_id, "owner_id": owner_id, "kind": kind, "filename": name,
+                "status": "queued", "path": f"{RENDER_ROOT}/{job_id}.pdf", "created_at": _now()}
+
+    def _insert(self, jobs: List[Dict[str, Any]]) -> None:
+        self._backend().execute_many([
+            {
+                "q": "INSERT INTO pdf_render_jobs (id, batch_id, owner_id, kind, filename, status, path, created_at) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                "params": [j["id"], j["batch_id"], j["owner_id"], j["kind"], j["filename"], j["status"],
+                           j["path"], j["created_at"]],
+            }
+            for j in jobs
+        ])
+        self.stats["jobs"] += len(jobs)
+
+    def submit(self, spec: Dict[str, Any], owner_id: Optional[int] = None, kind: str = "document",
+               filename: Optional[str] = None) -> Dict[str, Any]:
+        """Queue one document; returns its job handle immediately."""
+        job = self._new_job(kind, owner_id, filename, None)
+        self._insert([job])
+        self._dispatch([(job, spec)])
+        return job_handle(job)
+
+    def submit_batch(self, items: Iterable[Tuple[Dict[str, Any], Optional[int], Optional[str]]],
+                     kind: str = "document") -> Dict[str, Any]:
+        """Queue ``(spec, owner_id, filename)`` items as one batch, rendered ``chunk_size`` per pool task."""
+        batch_id = uuid.uuid4().hex
+        pairs = [(self._new_job(kind, owner_id, filename, batch_id), spec) for spec, owner_id, filename in items]
+        if pairs:
+            self._insert([job for job, _ in pairs])
+        for start in range(0, len(pairs), self.chunk_size):
+            self._dispatch(pairs[start:start + self.chunk_size])
+        return {"batch_id": batch_id, "jobs": len(pairs), "status": "queued" if pairs else "completed",
+                "status_url": f"/api/pdf-jobs/batches/{batch_id}"}
+
+    def _dispatch(self, pairs: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+        try:
+            _, threads = self._executors()
+            future = threads.submit(self._run_chunk, pairs)
+        except Exception as e:
+            logger.error(f"pdf_renderer.dispatch_failed jobs={len(pairs)}: {e}")
+            self._finish([(job, {"error": f"dispatch failed: {e}"}) for job, _ in pairs])
+            return
+        for job, _ in pairs:
+            self._futures[job["id"]] = future
+        future.add_done_callback(lambda f, ids=[job["id"] for job, _ in pairs]: [self._futures.pop(i, None) for i in ids])
+
+    # -- rendering -----------------------------------------------------
+
+    def _run_chunk(self, pairs: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+        ids = [job["id"] for job, _ in pairs]
+        started = time.perf_counter()
+        try:
+            self._backend().execute(
+                f"UPDATE pdf_render_jobs SET status = 'rendering' WHERE id IN ({', '.join('?' for _ in ids)})", ids)
+            targets = []
+            for job, _ in pairs:
+                local = self.storage.local_path(job["path"])
+                targets.append(local or os.path.join(tempfile.gettempdir(), f"pdf-render-{job['id']}.pdf"))
+                job["_upload"] = local is None
+            processes, _ = self._executors()
+            results = processes.submit(render_many, [(spec, target) for (_, spec), target in zip(pairs, targets)]).result()
+            for (job, _), target, result in zip(pairs, targets, results):
+                if job.pop("_upload") and "error" not in result:
+                    try:
+                        with open(target, "rb") as f:
+                            self.storage.write_file(job["path"], f.read(), "application/pdf", public=False)
+                    finally:
+                        os.unlink(target)
+        except Exception as e:
+            logger.error(f"pdf_renderer.render_failed jobs={len(pairs)}: {e}")
+            results = [{"error": str(e)}] * len(pairs)
+        self._finish([(job, result) for (job, _), result in zip(pairs, results)])
+        self.stats["chunks"] += 1
+        pages = sum(r.get("pages", 0) for r in results)
+        logger.info(f"pdf_renderer.chunk jobs={len(pairs)} pages={pages} "
+                    f"ms={(time.perf_counter() - started) * 1000:.0f}")
+
+    def _finish(self, outcomes: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+        finished_at = _now()
+        statements = []
+        for job, result in outcomes:
+            if "error" in result:
+                self.stats["failed"] += 1
+                statements.append({"q": "UPDATE pdf_render_jobs SET status = 'failed', error = ?, finished_at = ? "
+                                        "WHERE id = ?", "params": [result["error"][:500], finished_at, job["id"]]})
+            else:
+                self.stats["completed"] += 1
+                self.stats["pages"] += result["pages"]
+                statements.append({"q": "UPDATE pdf_render_jobs SET status = 'completed', pages = ?, bytes = ?, "
+                                        "finished_at = ? WHERE id = ?",
+                                   "params": [result["pages"], result["bytes"], finished_at, job["id"]]})
+        try:
+            self._backend().execute_many(statements)
+        except Exception as e:
+            logger.error(f"pdf_renderer.status_write_failed jobs={len(outcomes)}: {e}")
+
+    def render(self, spec: Dict[str, Any]) -> bytes:
+        """Render one document through the pool and return the bytes (for callers that store them elsewhere)."""
+        processes, _ = self._executors()
+        return processes.submit(render_bytes, spec).result()
+
+    # -- lookups -------------------------------------------------------
+
+    def _rows(self, where: str, params: List[Any]) -> List[Dict[str, Any]]:
+        # Batches bypass the per-worker SELECT cache; another worker may have just finished the job
+        result = self._backend().execute_many([{"q": f"SELECT {_JOB_COLUMNS} FROM pdf_render_jobs WHERE {where}",
+                                                "params": params}])[0]
+        return ResultSet.from_result(result).dicts()
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        # A finished job never changes again, so a cached row is good enough for it
+        cached = ResultSet.from_result(self._backend().execute(
+            f"SELECT {_JOB_COLUMNS} FROM pdf_render_jobs WHERE id = ?", [job_id])).dicts()
+        if cached and cached[0]["status"] in ("completed", "failed"):
+            return cached[0]
+        rows = self._rows("id = ?", [job_id])
+        return rows[0] if rows else None
+
+    def wait(self, job_id: str, timeout: float = 30.0) -> Optional[Dict[str, Any]]:
+        """Block until the job finishes (scripts and tests; the API polls ``status_url`` instead)."""
+        future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout=timeout)
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get_job(job_id)
+            if job is None or job["status"] in ("completed", "failed") or time.monotonic() > deadline:
+                return job
+            time.sleep(0.05)
+
+    def batch_status(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        jobs = self._rows("batch_id = ?", [batch_id])
+        if not jobs:
+            return None
+        counts = {s: 0 for s in JOB_STATUSES}
+        for job in jobs:
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        done = counts["completed"] + counts["failed"]
+        return {
+            "batch_id": batch_id,
+            "jobs": len(jobs),
+            "status": "completed" if done == len(jobs) else "rendering",
+            "counts": counts,
+            "pages": sum(int(j["pages"] or 0) for j in jobs),
+            "failed": [job_handle(j) for j in jobs if j["status"] == "failed"][:50],
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._threads is not None:
+                self._threads.shutdown(wait=False, cancel_futures=True)
+            if self._processes is not None:
+                self._processes.shutdown(wait=False, cancel_futures=True)
+            self._threads = self._processes = None
+
+
+def render_month_end_invoices(year: int, month: int, service: Optional[PdfRenderService] = None) -> Dict[str, Any]:
+    """Queue a PDF for every invoice created in the month as one batch; each freelancer owns their invoices' jobs."""
+    from app.services import invoices_service
+    start = datetime(year, month, 1, tzinfo=timezone.utc)
+    end = datetime(year + (month == 12), month % 12 + 1, 1, tzinfo=timezone.utc)
+    invoices = invoices_service.list_invoices_for_period(start, end)
+    return (service or get_pdf_renderer()).submit_batch(
+        ((invoice_document(inv), inv["from_user_id"], f"{inv['invoice_number']}.pdf") for inv in invoices),
+        kind="invoice",
+    )
+
+
+_service: Optional[PdfRenderService] = None
+_service_lock = threading.Lock()
+
+
+def get_pdf_renderer() -> PdfRenderService:
+    """Get or create the process-wide render service from settings."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                from app.core.config import get_settings
+                settings = get_settings()
+                _service = PdfRenderService(
+                    workers=settings.pdf_render_workers,
+                    chunk_size=settings.pdf_render_batch_chunk,
+                )
+    return _service
@@ -7,6 +7,7 @@ from typing import Optional, List
 
 from app.db.turso_http import execute_query, to_str, parse_date, get_turso_http
 from app.services.db_utils import get_val as _get_val, safe_str as _safe_str
+from app.services.ledger import InsufficientFunds, external_account, get_ledger, user_account
 
 logger = logging.getLogger(__name__)
 
@@ -499,24 +500,31 @@ def get_freelancer_portfolio_items(freelancer_id: int) -> List[dict]:
     return items
 
 
-def create_withdrawal(freelancer_id: int, amount: float, now: str) -> bool:
-    """Create a withdrawal payment record. Returns True on success."""
-    result = execute_query(
-        """INSERT INTO payments (from_user_id, to_user_id, amount, payment_type, payment_method,
-           status, description, platform_fee, freelancer_amount, created_at, updated_at)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        [freelancer_id, freelancer_id, amount, "withdrawal", "bank_transfer",
-         "pending", f"Withdrawal of ", 0, amount, now, now]
-    )
-    return bool(result)
+def create_withdrawal(freelancer_id: int, amount: float, now: str) -> Optional[float]:
+    """Debit the balance and create the withdrawal payment record in one ledger posting.
 
-
-def update_user_balance(user_id: int, new_balance: float):
-    """Update user's account balance."""
-    execute_query(
-        "UPDATE users SET account_balance = ? WHERE id = ?",
-        [new_balance, user_id]
-    )
+    Returns the new balance, or None if the balance is insufficient (nothing is written).
+    """
+    try:
+        results = get_ledger().post(
+            "withdrawal",
+            [(user_account(freelancer_id), -amount), (external_account("withdrawals"), amount)],
+            reference=f"user:{freelancer_id}",
+            after=[
+                {
+                    "q": """INSERT INTO payments (from_user_id, to_user_id, amount, payment_type, payment_method,
+                            status, description, platform_fee, freelancer_amount, created_at, updated_at)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    "params": [freelancer_id, freelancer_id, amount, "withdrawal", "bank_transfer",
+                               "pending", f"Withdrawal of {amount:.2f}", 0, amount, now, now],
+                },
+                {"q": "SELECT account_balance FROM users WHERE id = ?", "params": [freelancer_id]},
+            ],
+        )
+    except InsufficientFunds:
+        return None
+    rows = results[-1].get("rows") if results else None
+    return float(rows[0][0] or 0) if rows else 0.0
 
 
 def list_all_freelancers(limit: int, skip: int) -> dict:
@@ -7,11 +7,11 @@ Covers: software, design, marketing, writing, video, consulting, engineering, an
 
 import math
 import logging
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from itertools import product
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from datetime import datetime
 
-from app.db.turso_http import execute_query, to_str
-
 logger = logging.getLogger("megilance")
 
 # ============================================================================
@@ -771,37 +771,13 @@ def estimate_price(
     ISO codes for precise regional calculations.
     """
     # 1. Look up base hourly rate
-    category_rates = MARKET_RATES.get(category, {})
-    service_rates = category_rates.get(service_type, None)
-
-    if not service_rates:
-        # Fallback: use category average
-        if category_rates:
-            all_rates = list(category_rates.values())
-            service_rates = {
-                "junior": sum(r["junior"] for r in all_rates) / len(all_rates),
-                "mid": sum(r["mid"] for r in all_rates) / len(all_rates),
-                "senior": sum(r["senior"] for r in all_rates) / len(all_rates),
-                "expert": sum(r["expert"] for r in all_rates) / len(all_rates),
-            }
-        else:
-            service_rates = {"junior": 30, "mid": 55, "senior": 100, "expert": 175}
-
+    service_rates = _service_rates(category, service_type)
     base_rate = service_rates.get(experience_level, service_rates["mid"])
 
     # 2. Apply multipliers — use country-level data if available
     client_data = COUNTRY_DATA.get(client_country, None) if client_country else None
     freelancer_data = COUNTRY_DATA.get(freelancer_country, None) if freelancer_country else None
-
-    # Determine effective regional multiplier
-    if freelancer_data:
-        # Freelancer country directly sets the rate multiplier
-        regional_mult = freelancer_data["rate_mult"]
-    elif client_data:
-        # If only client country, use client budget multiplier for price expectations
-        regional_mult = client_data["client_budget_mult"]
-    else:
-        regional_mult = REGIONAL_MULTIPLIERS.get(region, 0.65)
+    regional_mult = _regional_multiplier(region, client_data, freelancer_data)
 
     urgency_mult = URGENCY_MULTIPLIERS.get(urgency, 1.0)
     quality_mult = QUALITY_MULTIPLIERS.get(quality_tier, 1.0)
@@ -810,50 +786,11 @@ def estimate_price(
     effective_rate = base_rate * regional_mult * urgency_mult * quality_mult
 
     # 3. Calculate hours
-    if estimated_hours and estimated_hours > 0:
-        total_hours = estimated_hours
-    else:
-        # Estimate hours from scope and service type templates
-        templates = DELIVERABLE_TEMPLATES.get(service_type)
-        if templates:
-            total_hours = sum(d["hours"] for d in templates)
-            total_hours = int(total_hours * scope_mult)
-        else:
-            # Generic hour estimation based on scope
-            scope_hours = {
-                "minimal": 10, "small": 25, "medium": 60,
-                "large": 120, "enterprise": 250
-            }
-            total_hours = scope_hours.get(scope, 60)
-
-    # Adjust for team size
-    if team_size > 1:
-        total_hours = int(total_hours * (1 + (team_size - 1) * 0.7))
+    total_hours = _project_hours(service_type, scope, estimated_hours, team_size)
 
-    # 4. Description complexity bonus
-    desc_bonus = 1.0
-    if description:
-        word_count = len(description.split())
-        if word_count > 200:
-            desc_bonus = 1.15
-        elif word_count > 100:
-            desc_bonus = 1.08
-
-    # 5. Features bonus
-    features_bonus = 1.0
-    if features:
-        features_bonus = 1 + len(features) * 0.03
-        features_bonus = min(features_bonus, 1.5)  # Cap at 50% increase
-
-    # 6. Demand adjustment
+    # 4-6. Description complexity, features and demand adjustments
     demand = DEMAND_INDICATORS.get(service_type, "moderate")
-    demand_mult = {
-        "very_high": 1.15,
-        "high": 1.08,
-        "moderate": 1.0,
-        "low": 0.90,
-        "saturated": 0.80,
-    }.get(demand, 1.0)
+    demand_mult, desc_bonus, features_bonus = _rate_adjustments(service_type, description, features)
 
     effective_rate *= demand_mult * desc_bonus * features_bonus
 
@@ -927,6 +864,305 @@ def estimate_price(
     }
 
 
+DEMAND_MULTIPLIERS: Dict[str, float] = {
+    "very_high": 1.15,
+    "high": 1.08,
+    "moderate": 1.0,
+    "low": 0.90,
+    "saturated": 0.80,
+}
+
+EXPERIENCE_LEVELS = ("junior", "mid", "senior", "expert")
+GENERIC_SCOPE_HOURS = {"minimal": 10, "small": 25, "medium": 60, "large": 120, "enterprise": 250}
+
+
+def _service_rates(category: str, service_type: str) -> Dict[str, float]:
+    """Rates by experience level for a service, calibrated from platform data when possible.
+
+    When the current market snapshot has an hourly cell for this exact
+    category and service (all countries - the regional multiplier is applied
+    later), junior/mid/senior are its p10/p50/p90 and expert keeps the static
+    expert-to-senior ratio above p90. Otherwise the static ``MARKET_RATES``
+    apply. Treat the returned dict as read-only.
+    """
+    from app.services.market_calibration import get_market_rate_store
+
+    static = _static_service_rates(category, service_type)
+    hourly = get_market_rate_store().snapshot.lookup(category, service_type)["hourly"]
+    if not hourly or hourly["service_type"] != service_type:
+        return static
+    return {
+        "junior": hourly["p10"],
+        "mid": hourly["p50"],
+        "senior": hourly["p90"],
+        "expert": hourly["p90"] * static["expert"] / static["senior"],
+    }
+
+
+@lru_cache(maxsize=None)
+def _static_service_rates(category: str, service_type: str) -> Dict[str, float]:
+    """Static rates by experience level (category average, then generic, as fallback).
+
+    Cached and shared between calls - treat the returned dict as read-only.
+    """
+    category_rates = MARKET_RATES.get(category, {})
+    service_rates = category_rates.get(service_type, None)
+    if service_rates:
+        return service_rates
+    if category_rates:
+        all_rates = list(category_rates.values())
+        return {
+            level: sum(r[level] for r in all_rates) / len(all_rates)
+            for level in EXPERIENCE_LEVELS
+        }
+    return {"junior": 30, "mid": 55, "senior": 100, "expert": 175}
+
+
+def _regional_multiplier(
+    region: str,
+    client_data: Optional[Dict[str, Any]],
+    freelancer_data: Optional[Dict[str, Any]],
+) -> float:
+    if freelancer_data:
+        # Freelancer country directly sets the rate multiplier
+        return freelancer_data["rate_mult"]
+    if client_data:
+        # If only client country, use client budget multiplier for price expectations
+        return client_data["client_budget_mult"]
+    return REGIONAL_MULTIPLIERS.get(region, 0.65)
+
+
+def _project_hours(
+    service_type: str, scope: str, estimated_hours: Optional[int], team_size: int
+) -> int:
+    if estimated_hours and estimated_hours > 0:
+        total_hours = estimated_hours
+    else:
+        # Estimate hours from scope and service type templates
+        templates = DELIVERABLE_TEMPLATES.get(service_type)
+        if templates:
+            total_hours = sum(d["hours"] for d in templates)
+            total_hours = int(total_hours * SCOPE_MULTIPLIERS.get(scope, 1.0))
+        else:
+            total_hours = GENERIC_SCOPE_HOURS.get(scope, 60)
+
+    # Adjust for team size
+    if team_size > 1:
+        total_hours = int(total_hours * (1 + (team_size - 1) * 0.7))
+    return total_hours
+
+
+def _rate_adjustments(
+    service_type: str, description: str, features: Optional[List[str]]
+) -> Tuple[float, float, float]:
+    """Demand, description-complexity and features multipliers on the hourly rate."""
+    desc_bonus = 1.0
+    if description:
+        word_count = len(description.split())
+        if word_count > 200:
+            desc_bonus = 1.15
+        elif word_count > 100:
+            desc_bonus = 1.08
+
+    features_bonus = 1.0
+    if features:
+        features_bonus = 1 + len(features) * 0.03
+        features_bonus = min(features_bonus, 1.5)  # Cap at 50% increase
+
+    demand = DEMAND_INDICATORS.get(service_type, "moderate")
+    return DEMAND_MULTIPLIERS.get(demand, 1.0), desc_bonus, features_bonus
+
+
+# ============================================================================
+# Scenario grid - many option combinations of one project at once
+# ============================================================================
+
+MAX_GRID_SCENARIOS = 20000
+
+GRID_AXES = ("experience_level", "location", "urgency", "quality_tier")
+
+
+class PriceGrid:
+    """
+    Rates and totals for every combination of experience level, location,
+    urgency and quality tier of one project.
+
+    Scenarios are numbered in row-major order over ``GRID_AXES``. Values are
+    NumPy arrays when NumPy is installed, plain lists otherwise; ``rows()``
+    returns them rounded like ``estimate_price`` and ``detail()`` runs the
+    full estimate for a single scenario.
+    """
+
+    def __init__(self, axes: Dict[str, List[Any]], hourly_rate, total_hours: int,
+                 project: Dict[str, Any], vectorized: bool):
+        self.axes = axes
+        self.shape = tuple(len(axes[name]) for name in GRID_AXES)
+        self.hourly_rate = hourly_rate
+        self.total_hours = total_hours
+        self.total_estimate = hourly_rate * total_hours if vectorized else [r * total_hours for r in hourly_rate]
+        self.project = project
+        self.vectorized = vectorized
+
+    def __len__(self) -> int:
+        return len(self.hourly_rate)
+
+    def scenario(self, index: int) -> Dict[str, Any]:
+        """Option values of scenario ``index``, as ``estimate_price`` keyword arguments."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"scenario {index} is outside the grid of {len(self)}")
+        picks = {}
+        for name, size in zip(reversed(GRID_AXES), reversed(self.shape)):
+            index, position = divmod(index, size)
+            picks[name] = self.axes[name][position]
+        region, client_country, freelancer_country = picks.pop("location")
+        return {
+            "experience_level": picks["experience_level"],
+            "region": region,
+            "client_country": client_country,
+            "freelancer_country": freelancer_country,
+            "urgency": picks["urgency"],
+            "quality_tier": picks["quality_tier"],
+        }
+
+    def row(self, index: int) -> Dict[str, Any]:
+        total = float(self.total_estimate[index])
+        return {
+            "index": index,
+            **self.scenario(index),
+            "hourly_rate": round(float(self.hourly_rate[index]), 2),
+            "total_estimate": round(total, 2),
+            "low_estimate": round(total * 0.75, 2),
+            "high_estimate": round(total * 1.35, 2),
+        }
+
+    def rows(self, indexes: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        return [self.row(i) for i in (range(len(self)) if indexes is None else indexes)]
+
+    def cheapest(self, n: int = 5) -> List[int]:
+        """Indexes of the ``n`` lowest totals (ties in grid order)."""
+        if self.vectorized:
+            return self.total_estimate.argsort(kind="stable")[:n].tolist()
+        return sorted(range(len(self)), key=self.total_estimate.__getitem__)[:n]
+
+    def detail(self, index: int) -> Dict[str, Any]:
+        """The full ``estimate_price`` result for one scenario."""
+        return estimate_price(**self.project, **self.scenario(index))
+
+    def summary(self) -> Dict[str, Any]:
+        totals = self.total_estimate
+        if self.vectorized:
+            cheapest, most_expensive = int(totals.argmin()), int(totals.argmax())
+        else:
+            cheapest, most_expensive = totals.index(min(totals)), totals.index(max(totals))
+        return {
+            "scenarios": len(self),
+            "total_hours": self.total_hours,
+            "min_total": round(float(totals[cheapest]), 2),
+            "max_total": round(float(totals[most_expensive]), 2),
+            "cheapest": cheapest,
+            "most_expensive": most_expensive,
+        }
+
+
+def _grid_locations(
+    regions: Sequence[str],
+    client_country: Optional[str],
+    freelancer_country: Optional[str],
+    client_countries: Optional[Sequence[str]],
+    freelancer_countries: Optional[Sequence[str]],
+) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """The location axis as ``(region, client_country, freelancer_country)`` triples."""
+    region = regions[0] if regions else "global_remote"
+    if freelancer_countries:
+        return [(region, client_country, code) for code in freelancer_countries]
+    if client_countries:
+        return [(region, code, freelancer_country) for code in client_countries]
+    return [(r, client_country, freelancer_country) for r in regions or [region]]
+
+
+def estimate_price_grid(
+    category: str,
+    service_type: str,
+    experience_levels: Sequence[str] = EXPERIENCE_LEVELS,
+    regions: Sequence[str] = ("global_remote",),
+    urgencies: Sequence[str] = ("standard",),
+    quality_tiers: Sequence[str] = ("standard",),
+    scope: str = "medium",
+    estimated_hours: Optional[int] = None,
+    description: str = "",
+    features: Optional[List[str]] = None,
+    team_size: int = 1,
+    client_country: Optional[str] = None,
+    freelancer_country: Optional[str] = None,
+    client_countries: Optional[Sequence[str]] = None,
+    freelancer_countries: Optional[Sequence[str]] = None,
+) -> PriceGrid:
+    """
+    Price every combination of the given options for one project.
+
+    Equivalent to calling ``estimate_price`` once per combination, but only
+    the rate arithmetic is repeated: hours and the description, features and
+    demand adjustments are the same for every scenario and are computed once,
+    and each option list becomes a vector of multipliers. The location axis
+    is ``freelancer_countries`` if given, else ``client_countries``, else
+    ``regions``.
+    """
+    locations = _grid_locations(regions, client_country, freelancer_country,
+                                client_countries, freelancer_countries)
+    axes = {
+        "experience_level": list(experience_levels),
+        "location": locations,
+        "urgency": list(urgencies),
+        "quality_tier": list(quality_tiers),
+    }
+    size = math.prod(len(values) for values in axes.values())
+    if size == 0:
+        raise ValueError("every option list needs at least one value")
+    if size > MAX_GRID_SCENARIOS:
+        raise ValueError(f"grid has {size} scenarios, the maximum is {MAX_GRID_SCENARIOS}")
+
+    service_rates = _service_rates(category, service_type)
+    vectors = (
+        [service_rates.get(level, service_rates["mid"]) for level in axes["experience_level"]],
+        [
+            _regional_multiplier(region, COUNTRY_DATA.get(client) if client else None,
+                                 COUNTRY_DATA.get(freelancer) if freelancer else None)
+            for region, client, freelancer in locations
+        ],
+        [URGENCY_MULTIPLIERS.get(u, 1.0) for u in axes["urgency"]],
+        [QUALITY_MULTIPLIERS.get(q, 1.0) for q in axes["quality_tier"]],
+    )
+    demand_mult, desc_bonus, features_bonus = _rate_adjustments(service_type, description, features)
+    adjustment = demand_mult * desc_bonus * features_bonus
+    total_hours = _project_hours(service_type, scope, estimated_hours, team_size)
+
+    # Same multiplication order as estimate_price, so both give identical floats
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is not None:
+        base, regional, urgency, quality = (np.asarray(v, dtype=np.float64) for v in vectors)
+        rate = (
+            base[:, None, None, None] * regional[None, :, None, None]
+            * urgency[None, None, :, None] * quality[None, None, None, :]
+        ) * adjustment
+        hourly_rate = rate.ravel()
+    else:
+        hourly_rate = [b * r * u * q * adjustment for b, r, u, q in product(*vectors)]
+
+    project = {
+        "category": category,
+        "service_type": service_type,
+        "scope": scope,
+        "estimated_hours": estimated_hours,
+        "description": description,
+        "features": features,
+        "team_size": team_size,
+    }
+    return PriceGrid(axes, hourly_rate, total_hours, project, vectorized=np is not None)
+
+
 def _build_breakdown(
     service_type: str,
     total_estimate: float,
@@ -1412,48 +1648,28 @@ def _build_regional_analysis(
     return analysis
 
 
-def get_platform_market_data(category: str, service_type: str) -> Dict[str, Any]:
+def get_platform_market_data(
+    category: str, service_type: str, country: Optional[str] = None
+) -> Dict[str, Any]:
     """
-    Fetch real market data from our platform database to enhance estimates.
-    Pulls actual project budgets and freelancer rates from MegiLance data.
+    Real market data from MegiLance contracts, projects, gigs and freelancer rates.
+
+    Read from the calibrated percentile snapshot (see ``market_calibration``),
+    so no database query runs per estimate. ``avg_*`` are medians of the most
+    specific cell with enough samples; the full p10/p50/p90 and the cell they
+    come from are in ``hourly_rate_percentiles`` and ``budget_percentiles``.
     """
-    data = {
-        "avg_project_budget": None,
-        "avg_hourly_rate": None,
-        "total_projects": 0,
-        "total_freelancers": 0,
-    }
+    from app.services.market_calibration import get_market_rate_store
 
-    try:
-        # Get average budget for similar projects
-        result = execute_query(
-            """SELECT AVG((budget_min + budget_max) / 2) as avg_budget, COUNT(*) as cnt
-               FROM projects
-               WHERE category LIKE ? AND status IN ('completed', 'in_progress')""",
-            [f"%{service_type.replace('_', ' ')}%"]
-        )
-        if result and result.get("rows"):
-            row = result["rows"][0]
-            if row[0].get("type") != "null":
-                data["avg_project_budget"] = float(row[0].get("value", 0))
-            if row[1].get("type") != "null":
-                data["total_projects"] = int(row[1].get("value", 0))
-
-        # Get average freelancer rate for relevant skills
-        result = execute_query(
-            """SELECT AVG(hourly_rate) as avg_rate, COUNT(*) as cnt
-               FROM users
-               WHERE user_type = 'Freelancer' AND hourly_rate > 0 AND is_active = 1""",
-            []
-        )
-        if result and result.get("rows"):
-            row = result["rows"][0]
-            if row[0].get("type") != "null":
-                data["avg_hourly_rate"] = float(row[0].get("value", 0))
-            if row[1].get("type") != "null":
-                data["total_freelancers"] = int(row[1].get("value", 0))
-
-    except Exception as e:
-        logger.warning(f"Failed to fetch platform market data: {e}")
-
-    return data
+    market = get_market_rate_store().snapshot.lookup(category, service_type, country)
+    hourly, budget = market["hourly"], market["budget"]
+    return {
+        "avg_project_budget": budget["p50"] if budget else None,
+        "avg_hourly_rate": hourly["p50"] if hourly else None,
+        "total_projects": budget["samples"] if budget else 0,
+        "total_freelancers": hourly["samples"] if hourly else 0,
+        "hourly_rate_percentiles": hourly,
+        "budget_percentiles": budget,
+        "snapshot_version": market["version"],
+        "calibrated_at": market["built_at"],
+    }
@@ -11,6 +11,8 @@ import json
 
 from app.db.turso_http import execute_query, to_str, parse_date
 from app.services.db_utils import get_val as _get_val, safe_str as _safe_str
+from app.services.realtime_metrics import publish as publish_metrics
+from app.services.workflow_automation import TriggerType, fire_trigger
 
 logger = logging.getLogger(__name__)
 
@@ -221,12 +223,13 @@ def get_project_client_id(project_id: int) -> Optional[int]:
     return int(_get_val(proj_result["rows"][0], 0) or 0)
 
 
-def get_project_status(project_id: int) -> Optional[str]:
-    """Get project ID and status. Returns status string or None."""
-    result = execute_query("SELECT id, status FROM projects WHERE id = ?", [project_id])
+def get_project_status(project_id: int) -> Optional[dict]:
+    """Get project status and client_id. Returns dict or None."""
+    result = execute_query("SELECT id, status, client_id FROM projects WHERE id = ?", [project_id])
     if not result or not result.get("rows"):
         return None
-    return _safe_str(_get_val(result["rows"][0], 1))
+    row = result["rows"][0]
+    return {"status": _safe_str(_get_val(row, 1)), "client_id": int(_get_val(row, 2) or 0)}
 
 
 def has_submitted_proposal(project_id: int, freelancer_id: int) -> bool:
@@ -317,7 +320,7 @@ def update_proposal(proposal_id: int, update_data: dict) -> Optional[dict]:
 def get_proposal_for_delete(proposal_id: int) -> Optional[dict]:
     """Get proposal fields needed for delete validation."""
     result = execute_query(
-        "SELECT id, freelancer_id, status FROM proposals WHERE id = ?",
+        "SELECT id, freelancer_id, status, project_id FROM proposals WHERE id = ?",
         [proposal_id]
     )
     if not result or not result.get("rows"):
@@ -326,7 +329,8 @@ def get_proposal_for_delete(proposal_id: int) -> Optional[dict]:
     return {
         "id": int(_get_val(row, 0) or 0),
         "freelancer_id": int(_get_val(row, 1) or 0),
-        "status": _safe_str(_get_val(row, 2))
+        "status": _safe_str(_get_val(row, 2)),
+        "project_id": int(_get_val(row, 3) or 0)
     }
 
 
@@ -393,10 +397,17 @@ def accept_proposal(proposal_id: int, proposal: dict, client_id: int) -> Optiona
     )
 
     # Reject other proposals
-    execute_query(
-        "UPDATE proposals SET status = ?, updated_at = ? WHERE project_id = ? AND id != ? AND status = ?",
+    rejected = execute_query(
+        "UPDATE proposals SET status = ?, updated_at = ? WHERE project_id = ? AND id != ? AND status = ? "
+        "RETURNING freelancer_id",
         ["rejected", now, project_id, proposal_id, "submitted"]
     )
+    publish_metrics("proposal_closed", freelancer_id=freelancer_id, client_id=client_id, status="accepted")
+    fire_trigger(TriggerType.PROPOSAL_ACCEPTED, user_id=freelancer_id, client_id=client_id,
+                 project_id=project_id, project_title=project_title, proposal_id=proposal_id)
+    for row in (rejected.get("rows") if rejected else None) or []:
+        publish_metrics("proposal_closed", freelancer_id=int(_get_val(row, 0) or 0), client_id=client_id,
+                        status="rejected")
 
     # Create contract with tiered fee
     contract_amount = bid_amount if bid_amount > 0 else hourly_rate
@@ -436,6 +447,10 @@ def accept_proposal(proposal_id: int, proposal: dict, client_id: int) -> Optiona
             ]
         )
         logger.info(f"Contract created for project {project_id} on proposal {proposal_id} acceptance")
+        publish_metrics("contract_started", freelancer_id=freelancer_id, client_id=client_id)
+        for party in (client_id, freelancer_id):
+            fire_trigger(TriggerType.CONTRACT_STARTED, user_id=party, client_id=client_id,
+                         freelancer_id=freelancer_id, project_id=project_id, project_title=project_title)
     except Exception as e:
         logger.error(f"Contract creation error on proposal {proposal_id}: {str(e)}")
 
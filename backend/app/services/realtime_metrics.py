@@ -0,0 +1,586 @@
+# @AI-HINT: Event-driven realtime dashboard metrics - per-user counters and daily earnings buckets kept in memory, updated from proposal/message/payment/contract writes, pushed to open dashboards over Socket.IO, O(1) snapshots for polling
+"""
+Realtime Metrics - the numbers on the realtime dashboard, kept current by
+the writes that change them instead of by aggregate queries on every poll.
+
+Per user this worker holds a ``_Board``:
+
+* counters: ``active_projects`` (contracts active or in progress, either
+  side), ``pending_proposals`` (submitted or shortlisted, as the freelancer
+  or on the client's projects), ``unread_messages``, ``pending_payments``
+  (pending or processing, either direction);
+* earnings in daily buckets (UTC) of completed incoming payments, which give
+  today / this week (from Monday) / this month in at most 31 additions;
+* the last few events, for the activity list.
+
+A board is seeded once from the database (one ``execute_many`` of two
+statements) the first time a user is asked for. After that, write paths call
+``publish(event, **fields)`` (see ``EVENTS``). Each event becomes a few
+counter deltas applied in memory, with no query. ``snapshot`` reads the board,
+so polling costs O(1).
+
+Users with an open dashboard join the Socket.IO room ``dashboard:<user_id>``
+with ``dashboard_subscribe {token}``. A background thread coalesces changes
+and emits one ``dashboard_metrics`` snapshot per user every
+``push_interval`` seconds at most.
+
+Boards are per worker. When the Socket.IO message queue is configured
+(``WEBSOCKET_MESSAGE_QUEUE``), every published event is also relayed to the
+other workers over the same Redis server (``RedisRelay``) and applied there
+like a local one. A relayed event can arrive after this worker seeded the
+board from a read that already included its write; each board records the
+wall-clock time its seed query started, and relayed events stamped (``at``)
+before it are dropped for that board. This assumes worker clocks are in
+sync (NTP). If the relay drops its connection, events may have been
+missed, so every board is marked stale and re-seeded on its next read.
+Writes by code paths that do not publish show up when the board is
+re-seeded. That happens after ``refresh_interval`` seconds: in the background
+for subscribed users, and on the next poll for everyone else.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.db.turso_http import ResultSet, get_turso_http
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ("active_projects", "pending_proposals", "unread_messages", "pending_payments")
+ACTIVE_CONTRACT_STATUSES = ("active", "in_progress")
+ACTIVITY_SIZE = 20
+_SEED_RETRIES = 3
+_LOAD_BATCH = 50  # users per background seed batch (two statements each)
+RELAY_CHANNEL = "realtime_metrics:events"
+
+SEED_COUNTERS = """SELECT
+    (SELECT COUNT(*) FROM contracts WHERE (freelancer_id = ? OR client_id = ?)
+        AND status IN ('active', 'in_progress')),
+    (SELECT COUNT(*) FROM proposals WHERE freelancer_id = ? AND status IN ('submitted', 'shortlisted'))
+        + (SELECT COUNT(*) FROM proposals pr JOIN projects p ON pr.project_id = p.id
+           WHERE p.client_id = ? AND pr.status IN ('submitted', 'shortlisted')),
+    (SELECT COUNT(*) FROM messages WHERE receiver_id = ? AND is_read = 0 AND is_deleted = 0),
+    (SELECT COUNT(*) FROM payments WHERE (from_user_id = ? OR to_user_id = ?)
+        AND status IN ('pending', 'processing'))"""
+
+SEED_EARNINGS = """SELECT substr(COALESCE(processed_at, updated_at), 1, 10) AS day, SUM(amount)
+    FROM payments WHERE to_user_id = ? AND status = 'completed' AND COALESCE(processed_at, updated_at) >= ?
+    GROUP BY day"""
+
+
+def _both(metric: str, delta: int, *roles: str):
+    return lambda e: [(e.get(role), metric, delta) for role in roles]
+
+
+def _payment_completed(e: Dict[str, Any]) -> List[Tuple[Any, str, Any]]:
+    return [(e.get("from_user_id"), "pending_payments", -1), (e.get("to_user_id"), "pending_payments", -1),
+            (e.get("to_user_id"), "earnings", float(e.get("amount") or 0))]
+
+
+# event -> the (user_id, metric, delta) changes it makes; "earnings" deltas land in the bucket of ``at``
+EVENTS: Dict[str, Callable[[Dict[str, Any]], List[Tuple[Any, str, Any]]]] = {
+    "proposal_submitted": _both("pending_proposals", 1, "freelancer_id", "client_id"),
+    "proposal_closed": _both("pending_proposals", -1, "freelancer_id", "client_id"),  # accepted/rejected/withdrawn/deleted
+    "message_sent": _both("unread_messages", 1, "receiver_id"),
+    "messages_read": lambda e: [(e.get("receiver_id"), "unread_messages", -int(e.get("count", 1)))],
+    "message_unread": _both("unread_messages", 1, "receiver_id"),
+    "message_deleted": _both("unread_messages", -1, "receiver_id"),  # publish only for unread messages
+    "payment_created": _both("pending_payments", 1, "from_user_id", "to_user_id"),
+    "payment_completed": _payment_completed,
+    "contract_started": _both("active_projects", 1, "freelancer_id", "client_id"),
+    "contract_ended": _both("active_projects", -1, "freelancer_id", "client_id"),  # completed/cancelled/disputed
+}
+
+
+def _epoch(at: Any) -> Optional[float]:
+    """POSIX time of an event's ISO ``at`` (naive means UTC), None if it does not parse."""
+    try:
+        stamp = datetime.fromisoformat(str(at).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if stamp.tzinfo is None:
+        stamp = stamp.replace(tzinfo=timezone.utc)
+    return stamp.timestamp()
+
+
+def _periods(now: datetime) -> Tuple[str, str, str]:
+    """Start days (YYYY-MM-DD) of today, this week and this month."""
+    today = now.date()
+    return (today.isoformat(), (today - timedelta(days=today.weekday())).isoformat(),
+            today.replace(day=1).isoformat())
+
+
+@dataclass
+class _Board:
+    counters: Dict[str, int]
+    earnings: Dict[str, float]
+    loaded_at: float
+    seeded_at: float = 0.0  # time.time() when the seed query started; earlier relayed events are in it
+    activity: Deque[Dict[str, Any]] = field(default_factory=lambda: deque(maxlen=ACTIVITY_SIZE))
+
+
+class RealtimeMetrics:
+    """
+    Per-user dashboard counters updated from domain events.
+
+    ``push`` receives ``(user_id, snapshot)`` for every user whose numbers
+    changed; by default it emits to the user's dashboard room once
+    ``attach`` has bound a Socket.IO server. ``relay`` (``send``/``start``/
+    ``close``, see ``RedisRelay``) carries events to and from other workers.
+    With ``background=False`` no thread runs; callers drive ``load`` and
+    ``push_pending`` (scripts and tests).
+    """
+
+    def __init__(self, backend_factory: Optional[Callable[[], Any]] = None,
+                 push: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+                 push_interval: float = 0.25, refresh_interval: float = 300.0,
+                 max_users: int = 10000, background: bool = True, relay=None):
+        self._backend_factory = backend_factory or get_turso_http
+        self._push = push or self._emit
+        self.push_interval = push_interval
+        self.refresh_interval = refresh_interval
+        self.max_users = max_users
+        self.sio = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._boards: "OrderedDict[int, _Board]" = OrderedDict()
+        self._seeding: Dict[int, bool] = {}  # user_id -> an event arrived while the seed query ran
+        self._to_load: Set[int] = set()
+        self._changed: Set[int] = set()
+        self._subscribers: Dict[str, int] = {}  # sid -> user_id
+        self._watched: Dict[int, int] = {}      # user_id -> subscribed sids on this worker
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        if not background:
+            self._stopped.set()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"events": 0, "remote_events": 0, "remote_seeded": 0, "seeds": 0, "seed_queries": 0,
+                      "reseeds": 0, "pushes": 0, "snapshots": 0}
+        self._relay = relay
+        if relay is not None:
+            relay.start(self._receive, self.expire)
+
+    def _start(self) -> None:
+        if self._thread is None and not self._stopped.is_set():
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="realtime-metrics", daemon=True)
+                    self._thread.start()
+
+    # -- events --------------------------------------------------------
+
+    def publish(self, event: str, **fields: Any) -> None:
+        """Apply a domain event to the boards it touches on every worker. Call after the write has committed."""
+        fields["at"] = fields.get("at") or datetime.now(timezone.utc).isoformat()
+        self._apply(event, fields)
+        if self._relay is not None:
+            self._relay.send(event, fields)
+
+    def _receive(self, event: str, fields: Dict[str, Any]) -> None:
+        """An event published by another worker."""
+        if event not in EVENTS or not fields.get("at"):
+            return
+        self.stats["remote_events"] += 1
+        self._apply(event, fields, written_before=_epoch(fields["at"]))
+
+    def _apply(self, event: str, fields: Dict[str, Any], written_before: Optional[float] = None) -> None:
+        """
+        Apply the event's deltas to the boards held here.
+
+        ``written_before`` (relayed events) is when the write had already
+        committed; boards whose seed query started later already count it.
+        """
+        changes = EVENTS[event](fields)
+        at = fields["at"]
+        entry = {"event": event, "timestamp": at,
+                 **{k: v for k, v in fields.items() if k in ("status", "amount") and v is not None}}
+        touched: Set[int] = set()
+        with self._lock:
+            self.stats["events"] += 1
+            for user_id, metric, delta in changes:
+                if user_id is None:
+                    continue
+                user_id = int(user_id)
+                if user_id in self._seeding:
+                    self._seeding[user_id] = True
+                    continue
+                board = self._boards.get(user_id)
+                if board is None:
+                    continue  # not held here; the seed will read the committed write
+                if written_before is not None and written_before < board.seeded_at:
+                    self.stats["remote_seeded"] += 1
+                    continue
+                if metric == "earnings":
+                    day = at[:10]
+                    board.earnings[day] = board.earnings.get(day, 0.0) + delta
+                else:
+                    board.counters[metric] = max(0, board.counters[metric] + delta)
+                if user_id not in touched:
+                    board.activity.appendleft(entry)
+                    touched.add(user_id)
+            self._changed.update(touched)
+        if touched:
+            self._start()
+            self._wake.set()
+
+    def expire(self) -> None:
+        """Mark every board stale (events may have been missed); each is re-seeded on its next read."""
+        with self._lock:
+            for board in self._boards.values():
+                board.loaded_at = 0.0
+            self._to_load.update(u for u in self._watched if u in self._boards)
+        if self._to_load:
+            self._start()
+            self._wake.set()
+
+    # -- snapshots -----------------------------------------------------
+
+    def peek(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """The user's snapshot if this worker holds their board, else None. Never queries."""
+        user_id = int(user_id)
+        with self._lock:
+            board = self._boards.get(user_id)
+            if board is None:
+                return None
+            self._boards.move_to_end(user_id)
+            if time.monotonic() - board.loaded_at > self.refresh_interval and user_id not in self._to_load:
+                self._to_load.add(user_id)
+                self._wake.set()
+            self.stats["snapshots"] += 1
+            snapshot = self._build(user_id, board)
+        self._start()
+        return snapshot
+
+    def snapshot(self, user_id: int) -> Dict[str, Any]:
+        """The user's realtime metrics; seeds the board first if this worker does not hold it yet."""
+        snapshot = self.peek(user_id)
+        if snapshot is None:
+            self.load([int(user_id)])
+            snapshot = self.peek(user_id)
+        return snapshot or self._build(int(user_id), _Board(dict.fromkeys(COUNTERS, 0), {}, 0.0))
+
+    def _build(self, user_id: int, board: _Board) -> Dict[str, Any]:
+        now = datetime.now(timezone.utc)
+        today, week, month = _periods(now)
+        earnings = {"today_earnings": 0.0, "week_earnings": 0.0, "month_earnings": 0.0}
+        for day, amount in board.earnings.items():
+            if day >= month:
+                earnings["month_earnings"] += amount
+            if day >= week:
+                earnings["week_earnings"] += amount
+            if day >= today:
+                earnings["today_earnings"] += amount
+        return {
+            "user_id": user_id,
+            "timestamp": now.isoformat(),
+            "metrics": {**board.counters, **{k: round(v, 2) for k, v in earnings.items()}},
+            "alerts": [],
+            "activity": list(board.activity),
+        }
+
+    # -- seeding -------------------------------------------------------
+
+    def load(self, user_ids: Optional[Iterable[int]] = None) -> int:
+        """Seed boards from the database (default: every user queued for a refresh). Returns boards installed."""
+        with self._lock:
+            if user_ids is None:
+                users = sorted(self._to_load)[:_LOAD_BATCH]
+            else:
+                users = sorted({int(u) for u in user_ids} - set(self._seeding))
+            self._to_load.difference_update(users)
+            for user_id in users:
+                self._seeding[user_id] = False
+        installed = 0
+        for attempt in range(_SEED_RETRIES):
+            if not users:
+                break
+            seeded_at = time.time()
+            seeded = self._query(users)
+            last = seeded is None or attempt == _SEED_RETRIES - 1
+            retry = []
+            with self._lock:
+                for user_id in users:
+                    raced = self._seeding.pop(user_id, False)
+                    if seeded is None:
+                        continue
+                    if raced and not last:  # a write landed mid-query: it may or may not be in the read
+                        self._seeding[user_id] = False
+                        retry.append(user_id)
+                        continue
+                    self._install(user_id, *seeded[user_id], seeded_at)
+                    if raced:
+                        self._boards[user_id].loaded_at = 0.0  # still racing writes: refresh on the next read
+                    installed += 1
+            self.stats["reseeds"] += len(retry)
+            users = retry
+        self.stats["seeds"] += installed
+        return installed
+
+    def _query(self, users: List[int]) -> Optional[Dict[int, Tuple[Dict[str, int], Dict[str, float]]]]:
+        since = min(_periods(datetime.now(timezone.utc))[1:])
+        statements = []
+        for user_id in users:
+            statements.append({"q": SEED_COUNTERS, "params": [user_id] * 7})
+            statements.append({"q": SEED_EARNINGS, "params": [user_id, since]})
+        try:
+            results = self._backend_factory().execute_many(statements)
+        except Exception as e:
+            logger.error(f"realtime_metrics.seed_failed users={len(users)}: {e}")
+            return None
+        self.stats["seed_queries"] += 1
+        seeded = {}
+        for i, user_id in enumerate(users):
+            row = ResultSet.from_result(results[2 * i]).first() or [0] * len(COUNTERS)
+            counters = {name: int(value or 0) for name, value in zip(COUNTERS, row)}
+            earnings = {str(r[0]): float(r[1] or 0) for r in ResultSet.from_result(results[2 * i + 1]) if r[0]}
+            seeded[user_id] = (counters, earnings)
+        return seeded
+
+    def _install(self, user_id: int, counters: Dict[str, int], earnings: Dict[str, float],
+                 seeded_at: float) -> None:
+        """Replace the user's numbers, keeping their activity. Call with the lock held."""
+        board = self._boards.get(user_id)
+        changed = board is not None and (board.counters != counters or board.earnings != earnings)
+        if board is None:
+            board = self._boards[user_id] = _Board(counters, earnings, time.monotonic(), seeded_at)
+        else:
+            board.counters, board.earnings, board.loaded_at = counters, earnings, time.monotonic()
+            board.seeded_at = seeded_at
+        self._boards.move_to_end(user_id)
+        if changed:
+            self._changed.add(user_id)
+        while len(self._boards) > self.max_users:
+            oldest = next((u for u in self._boards if u not in self._watched), None)
+            if oldest is None:
+                break
+            del self._boards[oldest]
+
+    # -- pushes --------------------------------------------------------
+
+    def push_pending(self) -> int:
+        """Send one snapshot to each user whose numbers changed since the last call."""
+        with self._lock:
+            users, self._changed = self._changed, set()
+            snapshots = [(u, self._build(u, self._boards[u])) for u in users if u in self._boards]
+        for user_id, snapshot in snapshots:
+            try:
+                self._push(user_id, snapshot)
+                self.stats["pushes"] += 1
+            except Exception as e:
+                logger.warning(f"realtime_metrics.push_failed user={user_id}: {e}")
+        return len(snapshots)
+
+    def _emit(self, user_id: int, snapshot: Dict[str, Any]) -> None:
+        if self.sio is None or self._loop is None or self._loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(
+            self.sio.emit("dashboard_metrics", snapshot, room=dashboard_room(user_id)), self._loop)
+
+    def _run(self) -> None:
+        next_refresh = time.monotonic() + self.refresh_interval
+        while not self._stopped.is_set():
+            self._wake.wait(max(0.0, next_refresh - time.monotonic()))
+            self._wake.clear()
+            try:
+                if time.monotonic() >= next_refresh:
+                    with self._lock:
+                        stale = time.monotonic() - self.refresh_interval
+                        self._to_load.update(u for u in self._watched
+                                             if u in self._boards and self._boards[u].loaded_at < stale)
+                    next_refresh = time.monotonic() + self.refresh_interval
+                while self._to_load and not self._stopped.is_set():
+                    self.load()
+                if self._changed:
+                    self.push_pending()
+                    self._stopped.wait(self.push_interval)  # later changes coalesce into the next push
+            except Exception as e:
+                logger.error(f"realtime_metrics.background_failed: {e}")
+
+    # -- dashboard subscriptions ---------------------------------------
+
+    def attach(self, manager) -> None:
+        """Handle the ``dashboard_*`` events of a ``WebSocketManager``'s Socket.IO server."""
+        self.sio = manager.sio
+
+        async def dashboard_subscribe(sid, data):
+            user_id = _token_user((data or {}).get("token"))
+            if user_id is None:
+                return {"ok": False, "error": "Invalid or expired token"}
+            self._loop = asyncio.get_running_loop()
+            await self.unsubscribe(sid)
+            with self._lock:
+                self._subscribers[sid] = user_id
+                self._watched[user_id] = self._watched.get(user_id, 0) + 1
+            await self.sio.enter_room(sid, dashboard_room(user_id))
+            return {"ok": True, **await asyncio.to_thread(self.snapshot, user_id)}
+
+        async def dashboard_unsubscribe(sid, data=None):
+            await self.unsubscribe(sid)
+            return {"ok": True}
+
+        for handler in (dashboard_subscribe, dashboard_unsubscribe):
+            self.sio.on(handler.__name__, handler)
+        manager.on_disconnect(self.unsubscribe)
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Emit pushes on ``loop`` (the server's), so workers without subscribers still reach other workers' rooms."""
+        self._loop = loop
+
+    async def unsubscribe(self, sid: str) -> None:
+        with self._lock:
+            user_id = self._subscribers.pop(sid, None)
+            if user_id is None:
+                return
+            self._watched[user_id] -= 1
+            if not self._watched[user_id]:
+                del self._watched[user_id]
+        if self.sio is not None:
+            await self.sio.leave_room(sid, dashboard_room(user_id))
+
+    def close(self) -> None:
+        """Stop the background thread and the relay."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._relay is not None:
+            self._relay.close()
+
+
+class RedisRelay:
+    """
+    Carries published events between workers over a Redis pub/sub channel.
+
+    ``send`` only queues the event; a sender thread publishes it, so the
+    request that made the write never waits on Redis. A listener thread
+    hands events from other workers to ``deliver`` and calls ``on_gap``
+    after reconnecting, since pub/sub does not replay what was missed.
+    """
+
+    def __init__(self, url: str, channel: str = RELAY_CHANNEL, max_pending: int = 10000):
+        import redis  # only needed when a message queue is configured
+
+        self._client = redis.Redis.from_url(url)
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._outbox: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=max_pending)
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self, deliver: Callable[[str, Dict[str, Any]], None], on_gap: Callable[[], None]) -> None:
+        self._threads = [
+            threading.Thread(target=self._send_loop, name="realtime-metrics-relay-out", daemon=True),
+            threading.Thread(target=self._listen_loop, args=(deliver, on_gap), name="realtime-metrics-relay-in",
+                             daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def send(self, event: str, fields: Dict[str, Any]) -> None:
+        message = json.dumps({"origin": self.origin, "event": event, "fields": fields}, default=str)
+        try:
+            self._outbox.put_nowait(message)
+        except queue.Full:
+            logger.warning(f"realtime_metrics.relay_dropped event={event}")
+
+    def _send_loop(self) -> None:
+        while True:
+            message = self._outbox.get()
+            if message is None:
+                return
+            try:
+                self._client.publish(self.channel, message)
+            except Exception as e:
+                logger.warning(f"realtime_metrics.relay_send_failed: {e}")
+
+    def _listen_loop(self, deliver: Callable[[str, Dict[str, Any]], None], on_gap: Callable[[], None]) -> None:
+        connected = False
+        while not self._stopped.is_set():
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                if connected:
+                    on_gap()
+                connected = True
+                while not self._stopped.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is None:
+                        continue
+                    data = json.loads(message["data"])
+                    if data.get("origin") != self.origin:
+                        deliver(data["event"], data.get("fields") or {})
+            except Exception as e:
+                logger.warning(f"realtime_metrics.relay_listen_failed: {e}")
+                self._stopped.wait(1.0)
+
+    def close(self) -> None:
+        self._stopped.set()
+        self._outbox.put(None)
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+
+def dashboard_room(user_id: int) -> str:
+    return f"dashboard:{user_id}"
+
+
+def _token_user(token: Optional[str]) -> Optional[int]:
+    """User id of a valid, unrevoked access token, else None."""
+    if not token:
+        return None
+    from app.core.security import decode_token, is_token_blacklisted
+    try:
+        payload = decode_token(token)
+    except Exception:
+        return None
+    if payload.get("type") != "access" or not payload.get("user_id") or is_token_blacklisted(token):
+        return None
+    return int(payload["user_id"])
+
+
+_metrics: Optional[RealtimeMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_realtime_metrics() -> RealtimeMetrics:
+    """Get or create the process-wide realtime metrics, attached to the app's Socket.IO manager."""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                from app.core.config import get_settings
+                from app.core.websocket import websocket_manager
+                settings = get_settings()
+                relay = None
+                url = os.environ.get("WEBSOCKET_MESSAGE_QUEUE")  # the Socket.IO message queue (redis://...)
+                if url:
+                    try:
+                        relay = RedisRelay(url)
+                    except Exception as e:
+                        logger.warning(f"realtime_metrics.relay_unavailable, boards stay per worker: {e}")
+                metrics = RealtimeMetrics(
+                    push_interval=settings.realtime_metrics_push_seconds,
+                    refresh_interval=settings.realtime_metrics_refresh_seconds,
+                    relay=relay,
+                )
+                metrics.attach(websocket_manager)
+                _metrics = metrics
+    return _metrics
+
+
+def publish(event: str, **fields: Any) -> None:
+    """Apply a domain event to the realtime dashboards; never fails the write that caused it."""
+    try:
+        get_realtime_metrics().publish(event, **fields)
+    except Exception as e:
+        logger.warning(f"realtime_metrics.publish_failed event={event}: {e}")
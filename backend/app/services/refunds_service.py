@@ -3,6 +3,7 @@ from datetime import datetime, timezone
 from typing import Optional
 
 from app.db.turso_http import execute_query, to_str, parse_date
+from app.services.ledger import external_account, get_ledger, user_account
 
 
 def _row_to_refund(row) -> dict:
@@ -181,7 +182,10 @@ def get_refund_for_processing(refund_id: int) -> Optional[dict]:
 
 
 def get_user_balance(user_id: int) -> float:
-    """Get user's account_balance."""
+    """Get user's account balance (ledger running total, legacy column until the account is opened)."""
+    balance = get_ledger().balance(user_account(user_id), default=None)
+    if balance is not None:
+        return balance
     result = execute_query("SELECT account_balance FROM users WHERE id = ?", [user_id])
     if result and result.get("rows"):
         return float(result["rows"][0][0].get("value")) if result["rows"][0][0].get("type") != "null" else 0.0
@@ -190,14 +194,23 @@ def get_user_balance(user_id: int) -> float:
 
 def process_refund(refund_id: int, payment_id: int, requested_by: int,
                    amount: float, current_balance: float):
-    """Execute the refund: update user balance, payment status, and refund status."""
+    """Credit the refund to the requester in one ledger posting, with the payment and
+    refund status updates in the same transaction. The posting id is per refund, so
+    processing a refund twice raises ``LedgerError`` and writes nothing."""
     now = datetime.now(timezone.utc).isoformat()
-    # Atomic balance update to prevent race conditions
-    execute_query("UPDATE users SET account_balance = account_balance + ? WHERE id = ?", [amount, requested_by])
-    execute_query("UPDATE payments SET status = 'refunded' WHERE id = ?", [payment_id])
-    execute_query("""
-        UPDATE refunds SET status = 'processed', processed_at = ?, updated_at = ? WHERE id = ?
-    """, [now, now, refund_id])
+    get_ledger().post(
+        "refund",
+        [(external_account("refunds"), -amount), (user_account(requested_by), amount)],
+        reference=f"payment:{payment_id}",
+        posting_id=f"refund:{refund_id}",
+        after=[
+            {"q": "UPDATE payments SET status = 'refunded' WHERE id = ?", "params": [payment_id]},
+            {
+                "q": "UPDATE refunds SET status = 'processed', processed_at = ?, updated_at = ? WHERE id = ?",
+                "params": [now, now, refund_id],
+            },
+        ],
+    )
 
 
 def delete_refund(refund_id: int):
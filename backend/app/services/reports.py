@@ -173,15 +173,20 @@ class ReportGenerationService:
             elif format == ReportFormat.EXCEL:
                 output = self._format_excel(data, report_type)
             else:
-                output = self._format_pdf(data, report_type)
+                output = self._format_pdf(data, report_type, user_id, report_id)
             
             report["data"] = output
-            report["status"] = ReportStatus.COMPLETED.value
-            report["completed_at"] = datetime.now(timezone.utc).isoformat()
-            report["file_size"] = len(str(output))
-            
-            # Generate download URL (would be actual file in production)
-            report["file_url"] = f"/api/v1/reports/download/{report_id}"
+            if format == ReportFormat.PDF:
+                # Rendered by the PDF pool; the job handle says when the file is ready
+                report["status"] = ReportStatus.GENERATING.value
+                report["file_url"] = output["download_url"]
+            else:
+                report["status"] = ReportStatus.COMPLETED.value
+                report["completed_at"] = datetime.now(timezone.utc).isoformat()
+                report["file_size"] = len(str(output))
+                
+                # Generate download URL (would be actual file in production)
+                report["file_url"] = f"/api/v1/reports/download/{report_id}"
             
         except Exception as e:
             logger.error(f"Report generation failed: {str(e)}")
@@ -430,17 +435,20 @@ class ReportGenerationService:
     def _format_pdf(
         self,
         data: Dict[str, Any],
-        report_type: ReportType
+        report_type: ReportType,
+        user_id: int,
+        report_id: str
     ) -> Dict[str, Any]:
-        """Format data for PDF (would use reportlab in production)."""
+        """Queue the report on the PDF render pool; returns the render job handle."""
+        from app.services.pdf_renderer import data_blocks, get_pdf_renderer
         template = self._templates.get(report_type.value, {})
-        
-        return {
-            "format": "pdf",
+        spec = {
+            "template": "report",
             "title": template.get("title", report_type.value.replace("_", " ").title()),
-            "sections": template.get("sections", ["data"]),
-            "data": data
+            "meta": [["Report", report_id], ["Generated", datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")]],
+            "blocks": data_blocks(data),
         }
+        return get_pdf_renderer().submit(spec, owner_id=user_id, kind="report", filename=f"{report_id}.pdf")
     
     def _calculate_next_run(self, schedule: str) -> str:
         """Calculate next run time for schedule."""
@@ -0,0 +1,358 @@
+# @AI-HINT: Code sandbox worker (stdlib only, run as a script) - forks one child per submission under rlimits, seccomp allow-list and no network
+"""
+Code Sandbox Worker - one slot of the ``code_sandbox`` pool.
+
+``SandboxPool`` starts this file as ``python -I -S sandbox_worker.py``. The
+process gets an empty environment, no site packages and its own user and
+network namespace where the kernel allows it. It imports the stdlib modules
+candidates may use, then serves requests on stdin/stdout. Each frame is
+JSON behind a 4-byte length.
+
+The worker never runs candidate code itself. For every submission it
+forks a child, and the child:
+
+- lowers its rlimits: address space, CPU seconds, no new files or
+  processes, no core dumps;
+- points fds 0-2 at /dev/null, keeping only the result pipe;
+- installs a seccomp filter that allows memory, signal, clock and plain
+  read/write syscalls and fails everything else (open, socket, clone,
+  execve, kill, ...) with EPERM;
+- execs the code and calls the entry point once per test under an
+  interval timer. It sends one frame per test back to the worker.
+
+The worker kills the child at the hard deadline, so code that catches the
+timer cannot outlive it. Tests with no result frame are reported as
+timed out or crashed. Expected values are never sent here. The pool
+compares outputs itself, so candidate code cannot change the verdict.
+"""
+
+import builtins
+import ctypes
+import io
+import json
+import os
+import platform
+import resource
+import select
+import signal
+import struct
+import sys
+import time
+
+# Importable by submissions (imports of anything else fail under the filter)
+PRELOAD = (
+    "math", "cmath", "itertools", "functools", "collections", "heapq", "bisect", "re",
+    "string", "operator", "random", "statistics", "decimal", "fractions", "typing",
+    "dataclasses", "copy", "datetime", "enum", "array", "textwrap", "unicodedata",
+)
+MAX_FRAME = 1 << 20
+MAX_OUTPUT_FRAME = 64 * 1024
+MAX_STDOUT = 2000
+_HEADER = struct.Struct(">I")
+
+# --- seccomp -----------------------------------------------------------------
+
+_AUDIT_ARCH_X86_64 = 0xC000003E
+_SECCOMP_RET_ALLOW = 0x7FFF0000
+_SECCOMP_RET_ERRNO = 0x00050000
+_SECCOMP_RET_KILL_PROCESS = 0x80000000
+_PR_SET_NO_NEW_PRIVS = 38
+_PR_SET_SECCOMP = 22
+_SECCOMP_MODE_FILTER = 2
+_BPF_LD_W_ABS = 0x20
+_BPF_JEQ_K = 0x15
+_BPF_RET_K = 0x06
+_CLONE_NEWUSER = 0x10000000
+_CLONE_NEWNET = 0x40000000
+
+# x86_64 syscall numbers a running interpreter needs once everything is imported
+ALLOWED_SYSCALLS_X86_64 = {
+    "read": 0, "write": 1, "close": 3, "fstat": 5, "lseek": 8, "mmap": 9, "mprotect": 10,
+    "munmap": 11, "brk": 12, "rt_sigaction": 13, "rt_sigprocmask": 14, "rt_sigreturn": 15,
+    "pread64": 17, "readv": 19, "writev": 20, "sched_yield": 24, "mremap": 25, "madvise": 28,
+    "nanosleep": 35, "getitimer": 36, "setitimer": 38, "getpid": 39, "exit": 60,
+    "gettimeofday": 96, "getrusage": 98, "times": 100, "sigaltstack": 131, "gettid": 186,
+    "time": 201, "futex": 202, "clock_gettime": 228, "clock_getres": 229,
+    "clock_nanosleep": 230, "exit_group": 231, "getrandom": 318,
+}
+
+
+class _SockFprog(ctypes.Structure):
+    _fields_ = [("len", ctypes.c_ushort), ("filter", ctypes.c_void_p)]
+
+
+def _seccomp_program(allowed):
+    def op(code, k, jt=0, jf=0):
+        return struct.pack("=HBBI", code, jt, jf, k)
+
+    program = [
+        op(_BPF_LD_W_ABS, 4),  # seccomp_data.arch
+        op(_BPF_JEQ_K, _AUDIT_ARCH_X86_64, 1, 0),
+        op(_BPF_RET_K, _SECCOMP_RET_KILL_PROCESS),
+        op(_BPF_LD_W_ABS, 0),  # seccomp_data.nr
+    ]
+    for nr in sorted(allowed.values()):
+        program += [op(_BPF_JEQ_K, nr, 0, 1), op(_BPF_RET_K, _SECCOMP_RET_ALLOW)]
+    program.append(op(_BPF_RET_K, _SECCOMP_RET_ERRNO | 1))  # EPERM
+    return b"".join(program)
+
+
+_libc = ctypes.CDLL(None, use_errno=True)
+_SECCOMP_SUPPORTED = platform.machine() == "x86_64"
+if _SECCOMP_SUPPORTED:
+    _FILTER = ctypes.create_string_buffer(_seccomp_program(ALLOWED_SYSCALLS_X86_64))
+    _FPROG = _SockFprog(len(_FILTER.raw) // 8, ctypes.cast(_FILTER, ctypes.c_void_p))
+
+
+def _install_seccomp():
+    if _libc.prctl(_PR_SET_NO_NEW_PRIVS, 1, 0, 0, 0) != 0:
+        raise OSError(ctypes.get_errno(), "PR_SET_NO_NEW_PRIVS failed")
+    if _libc.prctl(_PR_SET_SECCOMP, _SECCOMP_MODE_FILTER, ctypes.byref(_FPROG), 0, 0) != 0:
+        raise OSError(ctypes.get_errno(), "PR_SET_SECCOMP failed")
+
+
+def _isolate_network():
+    # An unprivileged process can only take a new network namespace inside a new user namespace
+    for flags in (_CLONE_NEWNET, _CLONE_NEWUSER | _CLONE_NEWNET):
+        if _libc.unshare(flags) == 0:
+            return True
+    return False
+
+
+def _probe_seccomp():
+    """Install the filter in a throwaway child to find out whether this kernel accepts it."""
+    if not _SECCOMP_SUPPORTED:
+        return False
+    pid = os.fork()
+    if pid == 0:
+        try:
+            _install_seccomp()
+            os._exit(0)
+        except BaseException:
+            os._exit(1)
+    return os.waitpid(pid, 0)[1] == 0
+
+
+# --- framing -----------------------------------------------------------------
+
+def _write_frame(fd, payload):
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    data = _HEADER.pack(len(data)) + data
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def _read_exact(fd, n):
+    chunks = []
+    while n:
+        chunk = os.read(fd, n)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        n -= len(chunk)
+    return b"".join(chunks)
+
+
+def _read_frame(fd):
+    header = _read_exact(fd, _HEADER.size)
+    if header is None:
+        return None
+    (length,) = _HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ValueError("frame too large")
+    return json.loads(_read_exact(fd, length))
+
+
+# --- child -------------------------------------------------------------------
+
+class _Timeout(BaseException):
+    """Raised by the interval timer; a BaseException so ``except Exception`` cannot swallow it."""
+
+
+def _on_alarm(signum, frame):
+    raise _Timeout()
+
+
+def _plain(value, depth=0):
+    """JSON-safe copy of a return value using exact builtin types only."""
+    kind = type(value)
+    if value is None or kind in (bool, int, float, str):
+        return value
+    if depth > 50:
+        raise ValueError("nested too deeply")
+    if kind in (list, tuple):
+        return [_plain(v, depth + 1) for v in value]
+    if kind is dict and all(type(k) is str for k in value):
+        return {k: _plain(v, depth + 1) for k, v in value.items()}
+    raise TypeError(f"return value of type {kind.__name__} is not comparable")
+
+
+def _error(exc):
+    return f"{type(exc).__name__}: {exc}"[:500]
+
+
+def _call(entry, test):
+    if "operations" in test:
+        # Class design problems: construct, then call methods in order
+        operations = test["operations"]
+        instance = entry(*operations[0]["args"])
+        outputs = [None]
+        for operation in operations[1:]:
+            outputs.append(getattr(instance, operation["method"])(*operation["args"]))
+        return outputs
+    return entry(*test["args"])
+
+
+def _run_child(request, result_fd):
+    limits = request["limits"]
+    memory = limits["memory_mb"] * 1024 * 1024
+    cpu = limits["cpu_seconds"]
+    resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (0, 0))
+    resource.setrlimit(resource.RLIMIT_NOFILE, (8, 8))
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    os.close(devnull)
+
+    captured = io.StringIO()
+    sys.stdout = sys.stderr = captured
+    sys.stdin = io.StringIO()
+    signal.signal(signal.SIGALRM, _on_alarm)
+    timeout = limits["timeout_seconds"]
+    namespace = {"__name__": "__submission__", "__builtins__": builtins}
+
+    try:
+        code = compile(request["code"], "<submission>", "exec")
+    except SyntaxError as e:
+        _write_frame(result_fd, {"setup_error": _error(e)})
+        return
+    if request["seccomp"]:
+        _install_seccomp()
+
+    try:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        exec(code, namespace)
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        entry = namespace.get(request["entry_point"])
+        if not callable(entry):
+            raise NameError(f"{request['entry_point']} is not defined")
+    except _Timeout:
+        _write_frame(result_fd, {"setup_error": "Timeout: module code did not finish"})
+        return
+    except BaseException as e:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        _write_frame(result_fd, {"setup_error": _error(e)})
+        return
+
+    for index, test in enumerate(request["tests"]):
+        frame = {"test": index, "status": "ok"}
+        started = time.perf_counter()
+        try:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+            try:
+                frame["output"] = _plain(_call(entry, test))
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        except _Timeout:
+            frame["status"] = "timeout"
+        except MemoryError:
+            frame["status"] = "memory"
+        except BaseException as e:
+            frame["status"] = "error"
+            frame["error"] = _error(e)
+        frame["ms"] = round((time.perf_counter() - started) * 1000, 2)
+        stdout = captured.getvalue()
+        if stdout:
+            frame["stdout"] = stdout[-MAX_STDOUT:]
+            captured.seek(0)
+            captured.truncate()
+        try:
+            if len(json.dumps(frame)) > MAX_OUTPUT_FRAME:
+                frame = {"test": index, "status": "error", "error": "output too large", "ms": frame["ms"]}
+        except (TypeError, ValueError) as e:
+            frame = {"test": index, "status": "error", "error": _error(e), "ms": frame["ms"]}
+        _write_frame(result_fd, frame)
+
+
+# --- worker ------------------------------------------------------------------
+
+def _supervise(request):
+    """Fork a child for one submission and collect its frames until done or the hard deadline."""
+    started = time.monotonic()
+    deadline = started + request["limits"]["deadline_seconds"]
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        code = 0
+        try:
+            _run_child(request, write_fd)
+        except BaseException:
+            code = 70
+        os._exit(code)
+
+    os.close(write_fd)
+    frames, buffer, killed = [], b"", False
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            os.kill(pid, signal.SIGKILL)
+            killed = True
+            break
+        ready, _, _ = select.select([read_fd], [], [], remaining)
+        if not ready:
+            continue
+        chunk = os.read(read_fd, 65536)
+        if not chunk:
+            break
+        buffer += chunk
+        while len(buffer) >= _HEADER.size:
+            (length,) = _HEADER.unpack_from(buffer)
+            if length > MAX_OUTPUT_FRAME + 1024:
+                os.kill(pid, signal.SIGKILL)
+                killed = True
+                break
+            if len(buffer) < _HEADER.size + length:
+                break
+            try:
+                frame = json.loads(buffer[_HEADER.size:_HEADER.size + length])
+            except ValueError:
+                # Submissions can write to the result pipe; garbage ends the run
+                os.kill(pid, signal.SIGKILL)
+                killed = True
+                break
+            frames.append(frame)
+            buffer = buffer[_HEADER.size + length:]
+        if killed:
+            break
+    os.close(read_fd)
+    _, status = os.waitpid(pid, 0)
+
+    response = {"frames": frames, "killed": killed, "ms": round((time.monotonic() - started) * 1000, 2)}
+    if os.WIFSIGNALED(status) and not killed:
+        response["signal"] = signal.Signals(os.WTERMSIG(status)).name
+    elif os.WIFEXITED(status) and os.WEXITSTATUS(status):
+        response["exit_code"] = os.WEXITSTATUS(status)
+    return response
+
+
+def main():
+    for name in PRELOAD:
+        __import__(name)
+    isolation = {"network": _isolate_network(), "seccomp": _probe_seccomp()}
+    _write_frame(1, {"ready": True, "pid": os.getpid(), "isolation": isolation})
+    while True:
+        request = _read_frame(0)
+        if request is None:
+            return
+        request["seccomp"] = isolation["seccomp"]
+        _write_frame(1, _supervise(request))
+
+
+if __name__ == "__main__":
+    main()
@@ -299,6 +299,11 @@ class SavedSearchesService:
         # Keep only last 100 searches
         self._search_history[user_id].insert(0, history_entry)
         self._search_history[user_id] = self._search_history[user_id][:100]
+
+        from app.services.autocomplete_index import autocomplete_service
+        autocomplete_service.record_search(
+            criteria.get("query") or criteria.get("q") or criteria.get("keywords")
+        )
         
         return {"tracked": True, "entry_id": history_entry["id"]}
     
@@ -14,58 +14,44 @@ from datetime import datetime
 import json
 import logging
 
+from app.db.schema_registry import register_schema
+
 logger = logging.getLogger(__name__)
 
+# FTS5 virtual tables, created once by the startup schema bootstrap
+SEARCH_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+        project_id UNINDEXED,
+        title,
+        description,
+        category,
+        skills,
+        tokenize = 'porter unicode61'
+    )""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+        user_id UNINDEXED,
+        name,
+        bio,
+        skills,
+        location,
+        tokenize = 'porter unicode61'
+    )""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS skills_fts USING fts5(
+        skill_id UNINDEXED,
+        name,
+        category,
+        description,
+        tokenize = 'porter unicode61'
+    )""",
+]
+register_schema("search_fts", SEARCH_FTS_DDL)
+
 
 class SearchService:
     """Advanced search service leveraging Turso's FTS5 for high-performance full-text search"""
     
     def __init__(self, db: Session):
         self.db = db
-        self._ensure_fts_tables()
-    
-    def _ensure_fts_tables(self):
-        """Create FTS5 virtual tables if they don't exist"""
-        try:
-            # Projects FTS table
-            self.db.execute(text("""
-                CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
-                    project_id UNINDEXED,
-                    title,
-                    description,
-                    category,
-                    skills,
-                    tokenize = 'porter unicode61'
-                )
-            """))
-            
-            # Users FTS table
-            self.db.execute(text("""
-                CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
-                    user_id UNINDEXED,
-                    name,
-                    bio,
-                    skills,
-                    location,
-                    tokenize = 'porter unicode61'
-                )
-            """))
-            
-            # Skills FTS table
-            self.db.execute(text("""
-                CREATE VIRTUAL TABLE IF NOT EXISTS skills_fts USING fts5(
-                    skill_id UNINDEXED,
-                    name,
-                    category,
-                    description,
-                    tokenize = 'porter unicode61'
-                )
-            """))
-            
-            self.db.commit()
-        except Exception as e:
-            # Tables might already exist
-            self.db.rollback()
     
     def index_project(self, project: Project):
         """Index a project for full-text search"""
@@ -365,6 +351,15 @@ class SearchService:
         """
         Autocomplete suggestions for search queries
         """
+        from app.services.autocomplete_index import autocomplete_service
+
+        # Served by the shared in-memory prefix index when it is loaded
+        kinds = {"all": ("project", "skill"), "projects": ("project",), "skills": ("skill",)}.get(type, ())
+        indexed = [autocomplete_service.suggest(query, kind, limit) for kind in kinds]
+        if kinds and all(s is not None for s in indexed):
+            texts = [s["text"] for group in indexed for s in group]
+            return list(dict.fromkeys(texts))[:limit]
+
         suggestions = []
         
         if type in ["all", "projects"]:
@@ -8,7 +8,13 @@ from typing import Optional, List, Dict, Any
 import re
 import json
 
-from app.db.turso_http import execute_query, parse_rows, to_str, parse_date
+import logging
+
+from app.db.turso_http import (
+    ResultSet, cell_value, execute_query, parse_date, parse_rows, query, to_float, to_str,
+)
+
+logger = logging.getLogger(__name__)
 
 
 # ── Relevance scoring helpers ──
@@ -68,44 +74,55 @@ def _extract_snippet(text: str, query: str, max_len: int = 200) -> str:
     return snippet
 
 
-def row_to_project(row: list) -> dict:
-    """Convert a database row to a project dict."""
+def row_to_project(row) -> dict:
+    """Convert a database row (raw ``Row`` view or wrapped cells) to a project dict."""
+    skills = to_str(row[10]) if len(row) > 10 else None
     return {
-        "id": row[0].get("value") if row[0].get("type") != "null" else None,
+        "id": cell_value(row[0]),
         "title": to_str(row[1]),
         "description": to_str(row[2]),
         "category": to_str(row[3]),
         "budget_type": to_str(row[4]),
-        "budget_min": float(row[5].get("value")) if row[5].get("type") != "null" else None,
-        "budget_max": float(row[6].get("value")) if row[6].get("type") != "null" else None,
+        "budget_min": to_float(row[5]),
+        "budget_max": to_float(row[6]),
         "experience_level": to_str(row[7]),
         "estimated_duration": to_str(row[8]) if len(row) > 8 else "Not specified",
         "status": to_str(row[9]) if len(row) > 9 else "open",
-        "skills": to_str(row[10]).split(",") if len(row) > 10 and to_str(row[10]) else [],
-        "client_id": row[11].get("value") if len(row) > 11 and row[11].get("type") != "null" else None,
+        "skills": skills.split(",") if skills else [],
+        "client_id": cell_value(row[11]) if len(row) > 11 else None,
         "created_at": parse_date(row[12]) if len(row) > 12 else None,
         "updated_at": parse_date(row[13]) if len(row) > 13 else None
     }
 
 
-def row_to_user(row: list) -> dict:
-    """Convert a database row to a user dict."""
+def row_to_user(row) -> dict:
+    """Convert a database row (raw ``Row`` view or wrapped cells) to a user dict."""
+    is_active = cell_value(row[10])
     return {
-        "id": row[0].get("value") if row[0].get("type") != "null" else None,
+        "id": cell_value(row[0]),
         "email": to_str(row[1]),
         "name": to_str(row[2]),
         "first_name": to_str(row[3]),
         "last_name": to_str(row[4]),
         "bio": to_str(row[5]),
-        "hourly_rate": float(row[6].get("value")) if row[6].get("type") != "null" else None,
+        "hourly_rate": to_float(row[6]),
         "location": to_str(row[7]),
         "skills": to_str(row[8]),
         "user_type": to_str(row[9]),
-        "is_active": bool(row[10].get("value")) if row[10].get("type") != "null" else True,
+        "is_active": bool(is_active) if is_active is not None else True,
         "joined_at": parse_date(row[11])
     }
 
 
+def _query(sql: str, params: List) -> ResultSet:
+    """Typed query that degrades to an empty result like ``execute_query``."""
+    try:
+        return query(sql, params)
+    except Exception as e:
+        logger.warning(f"search_service.query_failed: {e}")
+        return ResultSet([], [])
+
+
 # ── Sorting maps ──
 PROJECT_SORT_MAP = {
     "newest": "p.created_at DESC",
@@ -144,7 +161,7 @@ def search_projects_advanced(where_clause: str, params: List,
             total = rows[0].get("cnt", 0)
 
     # -- items with proposal count --
-    result = execute_query(
+    result = _query(
         f"""SELECT p.id, p.title, p.description, p.category, p.budget_type,
                    p.budget_min, p.budget_max, p.experience_level,
                    p.estimated_duration, p.status, p.skills, p.client_id,
@@ -162,13 +179,10 @@ def search_projects_advanced(where_clause: str, params: List,
         params,
     )
     items = []
-    if result and result.get("rows"):
-        for row in result["rows"]:
-            proj = row_to_project(row)
-            proj["proposal_count"] = (
-                row[14].get("value") if len(row) > 14 and row[14].get("type") != "null" else 0
-            )
-            items.append(proj)
+    for row in result:
+        proj = row_to_project(row)
+        proj["proposal_count"] = row.get("proposal_count", 0)
+        items.append(proj)
 
     # -- facets (category counts + experience level counts) --
     facet_result = execute_query(
@@ -221,7 +235,7 @@ def search_freelancers_advanced(where_clause: str, params: List,
             total = rows[0].get("cnt", 0)
 
     # -- items with rating + completed projects --
-    result = execute_query(
+    result = _query(
         f"""SELECT u.id, u.email, u.name, u.first_name, u.last_name,
                    u.bio, u.hourly_rate, u.location, u.skills, u.user_type,
                    u.is_active, u.created_at,
@@ -244,22 +258,13 @@ def search_freelancers_advanced(where_clause: str, params: List,
         params,
     )
     items = []
-    if result and result.get("rows"):
-        for row in result["rows"]:
-            user = row_to_user(row)
-            user["avg_rating"] = (
-                round(float(row[12].get("value")), 2)
-                if len(row) > 12 and row[12].get("type") != "null" else 0
-            )
-            user["review_count"] = (
-                row[13].get("value")
-                if len(row) > 13 and row[13].get("type") != "null" else 0
-            )
-            user["completed_projects"] = (
-                row[14].get("value")
-                if len(row) > 14 and row[14].get("type") != "null" else 0
-            )
-            items.append(user)
+    for row in result:
+        user = row_to_user(row)
+        avg_rating = row.number("avg_rating")
+        user["avg_rating"] = round(avg_rating, 2) if avg_rating is not None else 0
+        user["review_count"] = row.get("review_count", 0)
+        user["completed_projects"] = row.get("completed_projects", 0)
+        items.append(user)
 
     # -- facets (location counts) --
     facet_result = execute_query(
@@ -281,7 +286,7 @@ def search_freelancers_advanced(where_clause: str, params: List,
 
 def search_projects_db(where_clause: str, params: List) -> List[dict]:
     """Execute project search query and return parsed project dicts (legacy)."""
-    result = execute_query(
+    result = _query(
         f"""SELECT id, title, description, category, budget_type, budget_min, budget_max, experience_level, estimated_duration, status, skills, client_id, created_at, updated_at
             FROM projects
             WHERE {where_clause}
@@ -289,14 +294,12 @@ def search_projects_db(where_clause: str, params: List) -> List[dict]:
             LIMIT ? OFFSET ?""",
         params
     )
-    if not result or not result.get("rows"):
-        return []
-    return [row_to_project(row) for row in result["rows"]]
+    return [row_to_project(row) for row in result]
 
 
 def search_freelancers_db(where_clause: str, params: List) -> List[dict]:
     """Execute freelancer search query and return parsed user dicts (legacy)."""
-    result = execute_query(
+    result = _query(
         f"""SELECT id, email, name, first_name, last_name, bio, hourly_rate, location, skills, user_type, is_active, created_at
             FROM users
             WHERE {where_clause}
@@ -304,9 +307,7 @@ def search_freelancers_db(where_clause: str, params: List) -> List[dict]:
             LIMIT ? OFFSET ?""",
         params
     )
-    if not result or not result.get("rows"):
-        return []
-    return [row_to_user(row) for row in result["rows"]]
+    return [row_to_user(row) for row in result]
 
 
 def global_search_projects(search_term: str, limit: int) -> List[dict]:
@@ -478,7 +479,7 @@ def autocomplete_tags(search_term: str, limit: int) -> List[dict]:
 
 def get_trending_projects(limit: int) -> List[dict]:
     """Get trending projects ranked by engagement (proposals + recency)."""
-    result = execute_query(
+    result = _query(
         """SELECT p.id, p.title, p.description, p.category, p.budget_type,
                   p.budget_min, p.budget_max, p.experience_level,
                   p.estimated_duration, p.status, p.skills, p.client_id,
@@ -499,21 +500,17 @@ def get_trending_projects(limit: int) -> List[dict]:
            LIMIT ?""",
         [limit]
     )
-    if not result or not result.get("rows"):
-        return []
     items = []
-    for row in result["rows"]:
+    for row in result:
         proj = row_to_project(row)
-        proj["proposal_count"] = (
-            row[14].get("value") if len(row) > 14 and row[14].get("type") != "null" else 0
-        )
+        proj["proposal_count"] = row.get("proposal_count", 0)
         items.append(proj)
     return items
 
 
 def get_trending_freelancers(limit: int) -> List[dict]:
     """Get trending freelancers ranked by rating, completions, and recency."""
-    result = execute_query(
+    result = _query(
         """SELECT u.id, u.email, u.name, u.first_name, u.last_name, u.bio,
                   u.hourly_rate, u.location, u.skills, u.user_type,
                   u.is_active, u.created_at,
@@ -537,23 +534,13 @@ def get_trending_freelancers(limit: int) -> List[dict]:
            LIMIT ?""",
         [limit]
     )
-    if not result or not result.get("rows"):
-        return []
     items = []
-    for row in result["rows"]:
+    for row in result:
         user = row_to_user(row)
-        user["avg_rating"] = (
-            round(float(row[12].get("value")), 2)
-            if len(row) > 12 and row[12].get("type") != "null" else 0
-        )
-        user["review_count"] = (
-            row[13].get("value")
-            if len(row) > 13 and row[13].get("type") != "null" else 0
-        )
-        user["completed_projects"] = (
-            row[14].get("value")
-            if len(row) > 14 and row[14].get("type") != "null" else 0
-        )
+        avg_rating = row.number("avg_rating")
+        user["avg_rating"] = round(avg_rating, 2) if avg_rating is not None else 0
+        user["review_count"] = row.get("review_count", 0)
+        user["completed_projects"] = row.get("completed_projects", 0)
         items.append(user)
     return items
 
@@ -0,0 +1,592 @@
+# @AI-HINT: Incremental seller stats - per-seller counters bumped on order events, derived JSS/level, in-memory ranked leaderboard, offline reconcile
+"""
+Seller Stats Engine - seller stats maintained from order events.
+
+Raw per-seller counters (orders, completions, on-time completions, earnings,
+distinct buyers, review count and rating sum) live in
+``seller_stat_counters``; completed orders per (seller, buyer) pair live in
+``seller_buyers`` so the distinct-client count moves by one on a buyer's
+first completion. Each order event is one ``execute_many`` batch of relative
+``col = col + ?`` updates that bumps the row's ``version`` and returns the
+new counters, from which the published ``seller_stats`` row (rates, average
+rating, JSS, level) is derived and written in one upsert. The upsert only
+applies while the counters are still at that version, so when two events for
+a seller race, the older one's stats never overwrite the newer one's. Nothing
+is rescanned per event.
+
+``Leaderboard`` keeps sellers sorted by (JSS desc, completed orders desc,
+user id) overall and per level, so top-N reads and rank lookups are a
+bisection. It is loaded from ``seller_stats`` on first use, updated in place
+on every event handled by this process, and reloaded after
+``refresh_seconds`` to pick up events handled by other workers.
+
+Counters for sellers whose orders predate them are seeded once by
+``backfill()`` (``scripts/reconcile_seller_stats.py --backfill``), run when
+the engine is first deployed, so a seller's first event adds to their
+history instead of starting at zero.
+
+``reconcile()`` is the full recomputation from ``gig_orders`` and
+``gig_reviews`` (grouped SQL, not per-order Python). It rebuilds the
+counters, republishes every seller and reports which sellers had drifted;
+run it offline via ``scripts/reconcile_seller_stats.py``.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.db.schema_registry import ensure_schema, register_schema
+from app.db.turso_http import ResultSet, get_turso_http
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_REFRESH_SECONDS = 60.0
+FIVE_STAR_THRESHOLD = 4.5
+_PUBLISH_BATCH = 24
+_DRIFT_REPORT_LIMIT = 100
+
+LEVEL_REQUIREMENTS = {
+    "new_seller": {
+        "min_orders": 0,
+        "min_earnings": 0,
+        "min_rating": 0,
+        "min_completion_rate": 0,
+        "min_on_time_rate": 0,
+    },
+    "bronze": {
+        "min_orders": 5,
+        "min_earnings": 100,
+        "min_rating": 4.0,
+        "min_completion_rate": 80,
+        "min_on_time_rate": 80,
+    },
+    "silver": {
+        "min_orders": 20,
+        "min_earnings": 500,
+        "min_rating": 4.5,
+        "min_completion_rate": 90,
+        "min_on_time_rate": 85,
+    },
+    "gold": {
+        "min_orders": 50,
+        "min_earnings": 2000,
+        "min_rating": 4.7,
+        "min_completion_rate": 95,
+        "min_on_time_rate": 90,
+    },
+    "platinum": {
+        "min_orders": 100,
+        "min_earnings": 10000,
+        "min_rating": 4.9,
+        "min_completion_rate": 98,
+        "min_on_time_rate": 95,
+    }
+}
+
+LEVEL_ORDER = ["new_seller", "bronze", "silver", "gold", "platinum"]
+
+COUNTER_COLUMNS = [
+    "total_orders", "completed_orders", "cancelled_orders", "disputed_orders",
+    "on_time_orders", "total_earnings", "unique_clients",
+    "total_reviews", "rating_sum", "five_star_reviews",
+]
+
+SELLER_STATS_DDL = [
+    """CREATE TABLE IF NOT EXISTS seller_stat_counters (
+        user_id INTEGER PRIMARY KEY,
+        total_orders INTEGER NOT NULL DEFAULT 0,
+        completed_orders INTEGER NOT NULL DEFAULT 0,
+        cancelled_orders INTEGER NOT NULL DEFAULT 0,
+        disputed_orders INTEGER NOT NULL DEFAULT 0,
+        on_time_orders INTEGER NOT NULL DEFAULT 0,
+        total_earnings REAL NOT NULL DEFAULT 0,
+        unique_clients INTEGER NOT NULL DEFAULT 0,
+        total_reviews INTEGER NOT NULL DEFAULT 0,
+        rating_sum REAL NOT NULL DEFAULT 0,
+        five_star_reviews INTEGER NOT NULL DEFAULT 0,
+        version INTEGER NOT NULL DEFAULT 0,
+        updated_at TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS seller_buyers (
+        seller_id INTEGER NOT NULL,
+        buyer_id INTEGER NOT NULL,
+        completed_orders INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (seller_id, buyer_id)
+    )""",
+]
+
+register_schema("seller_stats", SELLER_STATS_DDL)
+
+# Counter rows rebuilt from the order and review history; ``{scope}`` narrows to one seller
+_COUNTERS_FROM_ORDERS = (
+    f"(user_id, {', '.join(COUNTER_COLUMNS)}, updated_at) "
+    "SELECT o.seller_id, o.total_orders, o.completed_orders, o.cancelled_orders, o.disputed_orders, "
+    "o.on_time_orders, o.total_earnings, o.unique_clients, "
+    "COALESCE(r.total_reviews, 0), COALESCE(r.rating_sum, 0), COALESCE(r.five_star_reviews, 0), {updated_at} "
+    "FROM (SELECT seller_id, COUNT(*) AS total_orders, "
+    "SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) AS completed_orders, "
+    "SUM(CASE WHEN status = 'cancelled' THEN 1 ELSE 0 END) AS cancelled_orders, "
+    "SUM(CASE WHEN status = 'disputed' THEN 1 ELSE 0 END) AS disputed_orders, "
+    "SUM(CASE WHEN status = 'completed' AND julianday(completed_at) <= julianday(deadline) "
+    "THEN 1 ELSE 0 END) AS on_time_orders, "
+    "SUM(CASE WHEN status = 'completed' THEN COALESCE(total_price, 0) ELSE 0 END) AS total_earnings, "
+    "COUNT(DISTINCT CASE WHEN status = 'completed' THEN buyer_id END) AS unique_clients "
+    "FROM gig_orders WHERE 1 {scope} GROUP BY seller_id) o "
+    "LEFT JOIN (SELECT seller_id, COUNT(*) AS total_reviews, "
+    "SUM(COALESCE(rating_overall, 0)) AS rating_sum, "
+    f"SUM(CASE WHEN rating_overall >= {FIVE_STAR_THRESHOLD} THEN 1 ELSE 0 END) AS five_star_reviews "
+    "FROM gig_reviews WHERE 1 {scope} GROUP BY seller_id) r ON r.seller_id = o.seller_id"
+)
+
+_BUYERS_FROM_ORDERS = (
+    "(seller_id, buyer_id, completed_orders) "
+    "SELECT seller_id, buyer_id, COUNT(*) FROM gig_orders WHERE status = 'completed' {scope} "
+    "GROUP BY seller_id, buyer_id"
+)
+
+
+def calculate_jss(stats: dict) -> float:
+    """Calculate Job Success Score (0-100)"""
+    # Weighted components:
+    # - Completion rate: 30%
+    # - Ratings: 30%
+    # - On-time delivery: 20%
+    # - Repeat clients: 10%
+    # - Disputes: 10% (penalty)
+
+    completion_score = (stats.get("completion_rate", 0) / 100) * 30
+
+    rating = stats.get("average_rating", 0)
+    rating_score = (rating / 5.0) * 30 if rating > 0 else 0
+
+    on_time_score = (stats.get("on_time_delivery_rate", 0) / 100) * 20
+
+    repeat_score = (stats.get("repeat_client_rate", 0) / 100) * 10
+
+    # Dispute penalty
+    total_orders = stats.get("total_orders", 0)
+    disputed = stats.get("disputed_orders", 0)
+    dispute_rate = (disputed / total_orders * 100) if total_orders > 0 else 0
+    dispute_penalty = min(dispute_rate * 2, 10)  # Max 10% penalty
+
+    jss = completion_score + rating_score + on_time_score + repeat_score - dispute_penalty
+    return max(0, min(100, jss))
+
+
+def calculate_level(stats: dict) -> str:
+    """Determine seller level based on stats"""
+    for level in reversed(LEVEL_ORDER):
+        reqs = LEVEL_REQUIREMENTS[level]
+        if (
+            stats.get("completed_orders", 0) >= reqs["min_orders"] and
+            stats.get("total_earnings", 0) >= reqs["min_earnings"] and
+            stats.get("average_rating", 0) >= reqs["min_rating"] and
+            stats.get("completion_rate", 0) >= reqs["min_completion_rate"] and
+            stats.get("on_time_delivery_rate", 0) >= reqs["min_on_time_rate"]
+        ):
+            return level
+    return "new_seller"
+
+
+def derive_stats(counters: Dict[str, Any]) -> Dict[str, Any]:
+    """Published seller stats (rates, average rating, JSS, level) from raw counters."""
+    c = {col: counters.get(col) or 0 for col in COUNTER_COLUMNS}
+    total, completed = c["total_orders"], c["completed_orders"]
+    repeat_clients = max(completed - c["unique_clients"], 0)
+    stats = {
+        "total_orders": total,
+        "completed_orders": completed,
+        "cancelled_orders": c["cancelled_orders"],
+        "disputed_orders": c["disputed_orders"],
+        "on_time_delivery_rate": round(c["on_time_orders"] / completed * 100, 1) if completed else 100,
+        "completion_rate": round(completed / total * 100, 1) if total else 100,
+        "total_earnings": c["total_earnings"],
+        "unique_clients": c["unique_clients"],
+        "repeat_clients": repeat_clients,
+        "repeat_client_rate": round(repeat_clients / completed * 100, 1) if completed else 0,
+        "total_reviews": c["total_reviews"],
+        "average_rating": round(c["rating_sum"] / c["total_reviews"], 2) if c["total_reviews"] else 0,
+        "five_star_reviews": c["five_star_reviews"],
+    }
+    stats["jss_score"] = calculate_jss(stats)
+    stats["level"] = calculate_level(stats)
+    return stats
+
+
+_PUBLISHED_COLUMNS = [
+    "level", "total_orders", "completed_orders", "cancelled_orders", "disputed_orders",
+    "on_time_delivery_rate", "completion_rate", "total_earnings", "unique_clients",
+    "repeat_clients", "repeat_client_rate", "total_reviews", "average_rating",
+    "five_star_reviews", "jss_score",
+]
+
+_PUBLISH_INTO = (
+    f"INSERT INTO seller_stats (user_id, {', '.join(_PUBLISHED_COLUMNS)}, "
+    "level_updated_at, jss_calculated_at, created_at, updated_at) "
+)
+_PUBLISH_VALUES = f"?, {', '.join('?' for _ in _PUBLISHED_COLUMNS)}, ?, ?, ?, ?"
+_PUBLISH_UPSERT = (
+    " ON CONFLICT(user_id) DO UPDATE SET "
+    + ", ".join(f"{col} = excluded.{col}" for col in _PUBLISHED_COLUMNS)
+    + ", level_updated_at = CASE WHEN seller_stats.level IS excluded.level "
+      "THEN seller_stats.level_updated_at ELSE excluded.level_updated_at END"
+    + ", jss_calculated_at = excluded.jss_calculated_at, updated_at = excluded.updated_at"
+)
+_PUBLISH_SQL = _PUBLISH_INTO + f"VALUES ({_PUBLISH_VALUES})" + _PUBLISH_UPSERT
+# Event publish: a no-op (no row returned) once a later event has bumped the counters
+_PUBLISH_IF_CURRENT_SQL = (
+    _PUBLISH_INTO + f"SELECT {_PUBLISH_VALUES} FROM seller_stat_counters WHERE user_id = ? AND version = ?"
+    + _PUBLISH_UPSERT + " RETURNING user_id"
+)
+
+
+def _publish_statement(
+    user_id: int, stats: Dict[str, Any], now: str, version: Optional[int] = None
+) -> Dict[str, Any]:
+    """Upsert ``stats``; with ``version``, only while the counters are still at that version."""
+    params = [user_id, *(stats[col] for col in _PUBLISHED_COLUMNS), now, now, now, now]
+    if version is None:
+        return {"q": _PUBLISH_SQL, "params": params}
+    return {"q": _PUBLISH_IF_CURRENT_SQL, "params": [*params, user_id, version]}
+
+
+def _is_on_time(deadline: Any, completed_at: datetime) -> bool:
+    if not deadline:
+        return False
+    if isinstance(deadline, str):
+        deadline = datetime.fromisoformat(deadline.replace("Z", "+00:00"))
+    if deadline.tzinfo is None:
+        deadline = deadline.replace(tzinfo=timezone.utc)
+    return completed_at <= deadline
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# ---------------------------------------------------------------------------
+# Leaderboard
+# ---------------------------------------------------------------------------
+
+LeaderboardKey = Tuple[float, int, int]
+
+
+class Leaderboard:
+    """Sellers with completed orders, sorted by (JSS desc, completed desc, user id) overall and per level."""
+
+    def __init__(self):
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self._keys: List[LeaderboardKey] = []
+        self._by_level: Dict[str, List[LeaderboardKey]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(entry: Dict[str, Any]) -> LeaderboardKey:
+        return (-(entry["jss_score"] or 0), -(entry["completed_orders"] or 0), entry["user_id"])
+
+    def _remove(self, user_id: int) -> None:
+        old = self._entries.pop(user_id, None)
+        if old is None:
+            return
+        key = self._key(old)
+        for keys in (self._keys, self._by_level.get(old["level"], [])):
+            i = bisect.bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                del keys[i]
+
+    def update(self, entry: Dict[str, Any]) -> None:
+        """
+        Insert or reposition a seller (``user_id``, ``level``, ``jss_score``, ``completed_orders``, ...).
+
+        An entry carrying a counters ``version`` older than the one already
+        held is ignored, so racing events cannot leave the older stats ranked.
+        """
+        with self._lock:
+            old = self._entries.get(entry["user_id"])
+            if old is not None and (old.get("version") or 0) > (entry.get("version") or 0):
+                return
+            self._remove(entry["user_id"])
+            if not entry.get("completed_orders"):
+                return
+            key = self._key(entry)
+            self._entries[entry["user_id"]] = entry
+            bisect.insort(self._keys, key)
+            bisect.insort(self._by_level.setdefault(entry["level"], []), key)
+
+    def load(self, entries: List[Dict[str, Any]]) -> None:
+        """Replace the contents with ``entries`` (one sort instead of n inserts)."""
+        entries = [e for e in entries if e.get("completed_orders")]
+        by_level: Dict[str, List[LeaderboardKey]] = {}
+        for entry in entries:
+            by_level.setdefault(entry["level"], []).append(self._key(entry))
+        for keys in by_level.values():
+            keys.sort()
+        with self._lock:
+            self._entries = {e["user_id"]: e for e in entries}
+            self._keys = sorted(self._key(e) for e in entries)
+            self._by_level = by_level
+
+    def top(self, limit: int, level: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            keys = self._by_level.get(level, []) if level else self._keys
+            return [self._entries[key[2]] for key in keys[:limit]]
+
+    def rank(self, user_id: int, level: Optional[str] = None) -> Optional[int]:
+        """1-based position of ``user_id`` (overall, or within ``level``), ``None`` if not ranked."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or (level and entry["level"] != level):
+                return None
+            keys = self._by_level.get(level, []) if level else self._keys
+            return bisect.bisect_left(keys, self._key(entry)) + 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _leaderboard_entry(user_id: int, stats: Dict[str, Any], version: Optional[int] = None) -> Dict[str, Any]:
+    entry = {
+        "user_id": user_id,
+        "level": stats["level"],
+        "jss_score": stats["jss_score"],
+        "completed_orders": stats["completed_orders"],
+        "average_rating": stats["average_rating"],
+        "total_earnings": stats["total_earnings"],
+    }
+    if version is not None:
+        entry["version"] = version
+    return entry
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+class SellerStatsEngine:
+    """
+    Applies order events to seller counters and keeps the leaderboard current.
+
+    The backend object only needs ``execute(sql, params)`` and
+    ``execute_many(statements)`` with TursoHTTP semantics.
+    """
+
+    def __init__(
+        self,
+        backend_factory: Optional[Callable[[], Any]] = None,
+        refresh_seconds: float = LEADERBOARD_REFRESH_SECONDS,
+    ):
+        self._backend_factory = backend_factory or get_turso_http
+        self.refresh_seconds = refresh_seconds
+        self._board = Leaderboard()
+        self._loaded_at: Optional[float] = None
+        self._load_lock = threading.Lock()
+
+    def ensure_tables(self) -> None:
+        ensure_schema("seller_stats", backend=self._backend_factory())
+
+    def backfill(self) -> Dict[str, Any]:
+        """
+        Seed counters for sellers whose orders predate them (one-time deploy job).
+
+        Sellers that already have counters are left alone, so running it
+        again is harmless; a seller whose first event landed before the
+        backfill keeps only post-deploy counts until ``reconcile()``.
+        """
+        self.ensure_tables()
+        results = self._backend_factory().execute_many([
+            {"q": "INSERT OR IGNORE INTO seller_buyers " + _BUYERS_FROM_ORDERS.format(scope=""), "params": []},
+            {
+                "q": "INSERT OR IGNORE INTO seller_stat_counters "
+                     + _COUNTERS_FROM_ORDERS.format(updated_at="?", scope="") + " RETURNING user_id",
+                "params": [_now()],
+            },
+        ])
+        return {"sellers": len(ResultSet.from_result(results[-1]))}
+
+    # ------------------------------------------------------------------
+    # Order events
+    # ------------------------------------------------------------------
+
+    def order_placed(self, seller_id: int) -> Dict[str, Any]:
+        return self._apply(seller_id, {"total_orders": 1})
+
+    def order_completed(
+        self,
+        seller_id: int,
+        buyer_id: int,
+        amount: Optional[float],
+        deadline: Any = None,
+        completed_at: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        completed_at = completed_at or datetime.now(timezone.utc)
+        return self._apply(seller_id, {
+            "completed_orders": 1,
+            "on_time_orders": 1 if _is_on_time(deadline, completed_at) else 0,
+            "total_earnings": amount or 0,
+        }, buyer_id=buyer_id)
+
+    def order_cancelled(self, seller_id: int) -> Dict[str, Any]:
+        return self._apply(seller_id, {"cancelled_orders": 1})
+
+    def order_disputed(self, seller_id: int) -> Dict[str, Any]:
+        return self._apply(seller_id, {"disputed_orders": 1})
+
+    def review_added(self, seller_id: int, rating: float) -> Dict[str, Any]:
+        return self._apply(seller_id, {
+            "total_reviews": 1,
+            "rating_sum": rating,
+            "five_star_reviews": 1 if rating >= FIVE_STAR_THRESHOLD else 0,
+        })
+
+    def _apply(self, seller_id: int, deltas: Dict[str, Any], buyer_id: Optional[int] = None) -> Dict[str, Any]:
+        """Bump counters in one batch, then publish the derived stats row unless a later event beat us."""
+        self.ensure_tables()
+        backend = self._backend_factory()
+        now = _now()
+        statements = [{
+            "q": "INSERT INTO seller_stat_counters (user_id, updated_at) VALUES (?, ?) ON CONFLICT(user_id) DO NOTHING",
+            "params": [seller_id, now],
+        }]
+        assignments = [f"{col} = {col} + ?" for col in deltas]
+        params: List[Any] = list(deltas.values())
+        if buyer_id is not None:
+            statements.append({
+                "q": "INSERT INTO seller_buyers (seller_id, buyer_id, completed_orders) VALUES (?, ?, 1) "
+                     "ON CONFLICT(seller_id, buyer_id) DO UPDATE SET completed_orders = completed_orders + 1",
+                "params": [seller_id, buyer_id],
+            })
+            assignments.append(
+                "unique_clients = unique_clients + (SELECT COUNT(*) FROM seller_buyers "
+                "WHERE seller_id = ? AND buyer_id = ? AND completed_orders = 1)"
+            )
+            params.extend([seller_id, buyer_id])
+        statements.append({
+            "q": f"UPDATE seller_stat_counters SET {', '.join(assignments)}, version = version + 1, updated_at = ? "
+                 f"WHERE user_id = ? RETURNING {', '.join(COUNTER_COLUMNS)}, version",
+            "params": [*params, now, seller_id],
+        })
+        results = backend.execute_many(statements)
+        counters = ResultSet.from_result(results[-1]).first().as_dict()
+
+        stats = derive_stats(counters)
+        version = counters["version"]
+        published = backend.execute_many([_publish_statement(seller_id, stats, now, version)])
+        if ResultSet.from_result(published[0]).first() is not None and self._loaded_at is not None:
+            self._board.update(_leaderboard_entry(seller_id, stats, version))
+        return stats
+
+    # ------------------------------------------------------------------
+    # Leaderboard
+    # ------------------------------------------------------------------
+
+    def _leaderboard(self) -> Leaderboard:
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.refresh_seconds:
+            with self._load_lock:
+                if self._loaded_at is loaded_at:
+                    self.reload_leaderboard()
+        return self._board
+
+    def reload_leaderboard(self) -> int:
+        rows = ResultSet.from_result(self._backend_factory().execute(
+            "SELECT user_id, level, jss_score, completed_orders, average_rating, total_earnings "
+            "FROM seller_stats WHERE completed_orders > 0",
+            [],
+        ))
+        self._board.load(rows.dicts())
+        self._loaded_at = time.monotonic()
+        return len(self._board)
+
+    def leaderboard(self, limit: int = 10, level: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._leaderboard().top(limit, level)
+
+    def rank(self, user_id: int, level: Optional[str] = None) -> Optional[int]:
+        return self._leaderboard().rank(user_id, level)
+
+    # ------------------------------------------------------------------
+    # Reconciliation
+    # ------------------------------------------------------------------
+
+    def reconcile(self, seller_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Recompute counters from ``gig_orders``/``gig_reviews`` and republish.
+
+        Scoped to one seller when ``seller_id`` is given (the report then
+        includes that seller's ``stats``). Returns the number of sellers
+        published and the ids whose counters had drifted.
+        """
+        started = time.perf_counter()
+        self.ensure_tables()
+        backend = self._backend_factory()
+        now = _now()
+        scope, scope_params = ("WHERE user_id = ?", [seller_id]) if seller_id is not None else ("", [])
+        order_scope = "AND seller_id = ?" if seller_id is not None else ""
+
+        select_counters = {
+            "q": f"SELECT user_id, {', '.join(COUNTER_COLUMNS)} FROM seller_stat_counters {scope}",
+            "params": scope_params,
+        }
+        results = backend.execute_many([
+            select_counters,
+            {"q": f"DELETE FROM seller_buyers {scope.replace('user_id', 'seller_id')}", "params": scope_params},
+            {"q": "INSERT INTO seller_buyers " + _BUYERS_FROM_ORDERS.format(scope=order_scope), "params": scope_params},
+            {"q": f"DELETE FROM seller_stat_counters {scope}", "params": scope_params},
+            {
+                "q": "INSERT INTO seller_stat_counters "
+                     + _COUNTERS_FROM_ORDERS.format(updated_at="?", scope=order_scope),
+                "params": [now, *scope_params, *scope_params],
+            },
+            select_counters,
+        ])
+        before = {row["user_id"]: row.as_dict() for row in ResultSet.from_result(results[0])}
+        after = {row["user_id"]: row.as_dict() for row in ResultSet.from_result(results[-1])}
+        if seller_id is not None and seller_id not in after:
+            after[seller_id] = {"user_id": seller_id}
+
+        drifted = []
+        published: Dict[int, Dict[str, Any]] = {}
+        for user_id in sorted(set(before) | set(after)):
+            counters = after.get(user_id, {"user_id": user_id})
+            old = before.get(user_id, {})
+            if any((old.get(col) or 0) != (counters.get(col) or 0) for col in COUNTER_COLUMNS):
+                drifted.append(user_id)
+            published[user_id] = derive_stats(counters)
+
+        statements = [_publish_statement(user_id, stats, now) for user_id, stats in published.items()]
+        for start in range(0, len(statements), _PUBLISH_BATCH):
+            backend.execute_many(statements[start:start + _PUBLISH_BATCH])
+
+        if seller_id is None:
+            self._board.load([_leaderboard_entry(user_id, stats) for user_id, stats in published.items()])
+            self._loaded_at = time.monotonic()
+        elif self._loaded_at is not None:
+            self._board.update(_leaderboard_entry(seller_id, published[seller_id]))
+
+        report = {
+            "sellers": len(published),
+            "drifted": len(drifted),
+            "drifted_sellers": drifted[:_DRIFT_REPORT_LIMIT],
+            "ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        if seller_id is not None:
+            report["stats"] = published[seller_id]
+        if drifted:
+            logger.info(f"seller_stats.reconcile sellers={report['sellers']} drifted={report['drifted']}")
+        return report
+
+
+_engine: Optional[SellerStatsEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_seller_stats_engine() -> SellerStatsEngine:
+    """Get or create the process-wide seller stats engine."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = SellerStatsEngine()
+    return _engine
@@ -64,38 +64,25 @@ QUESTION_BANK: Dict[str, List[Dict[str, Any]]] = _load_question_bank()
 class CodeExecutor:
     """
     Sandboxed code execution for skill assessments
-    In production, use Docker containers or isolated VMs
+    Python runs in the pre-forked worker pool of app.services.code_sandbox
     """
     
     TIMEOUT_SECONDS = 10
     MAX_OUTPUT_LENGTH = 10000
     
     @staticmethod
-    def execute_python(code: str, test_cases: List[Dict]) -> Dict[str, Any]:
+    def execute_python(code: str, test_cases: List[Dict], entry_point: Optional[str] = None) -> Dict[str, Any]:
         """
         Execute Python code against test cases.
         
-        SECURITY: Actual code execution is disabled — running arbitrary user code
-        via subprocess without a proper sandbox (Docker/gVisor/Firecracker) is an
-        arbitrary-code-execution vulnerability. All submissions are flagged for
-        manual review instead.
+        Each submission runs in a forked child of a warm sandbox worker: no
+        network, rlimits on memory/CPU/files/processes, a seccomp syscall
+        allow-list and a per-test timeout. Outputs are compared outside the
+        sandbox. When the host cannot isolate code (or the sandbox is
+        disabled in settings) submissions are flagged for manual review.
         """
-        results = []
-        for i, test in enumerate(test_cases):
-            results.append({
-                "test_id": i,
-                "passed": None,
-                "manual_review": True
-            })
-        
-        return {
-            "all_passed": False,
-            "results": results,
-            "total_tests": len(test_cases),
-            "passed_count": 0,
-            "manual_review_required": True,
-            "note": "Code execution requires sandboxed environment. Submitted for manual review."
-        }
+        from app.services.code_sandbox import get_sandbox_pool
+        return get_sandbox_pool().execute_python(code, test_cases, entry_point=entry_point)
     
     @staticmethod
     def execute_javascript(code: str, test_cases: List[Dict]) -> Dict[str, Any]:
@@ -418,24 +405,27 @@ class SkillAssessmentEngine:
             test_cases = question.get("test_cases", [])
             
             if question["id"].startswith("py_"):
-                result = CodeExecutor.execute_python(answer, test_cases)
+                from app.services.code_sandbox import entry_point_for
+                result = CodeExecutor.execute_python(
+                    answer, test_cases, entry_point=entry_point_for(question, answer if isinstance(answer, str) else "")
+                )
             elif question["id"].startswith("js_"):
                 result = CodeExecutor.execute_javascript(answer, test_cases)
             else:
                 result = {"manual_review": True}
             
-            if result.get("manual_review"):
+            if result.get("manual_review") or result.get("manual_review_required"):
                 return {
                     "correct": None,
                     "points_earned": 0,  # Manual review needed
                     "max_points": points,
                     "manual_review": True,
-                    "code_submitted": answer[:500]
+                    "code_submitted": answer[:500] if isinstance(answer, str) else answer
                 }
             
             # Partial credit for passing some tests
             passed = result.get("passed_count", 0)
-            total = result.get("total_count", 1)
+            total = result.get("total_tests", 1)
             earned = (passed / total) * points if total > 0 else 0
             
             return {
@@ -0,0 +1,407 @@
+# @AI-HINT: Async SMTP transport - pool of persistent authenticated connections, pipelined sends, per-message results
+"""
+SMTP Transport - asyncio mail delivery for EmailService.
+
+``SMTPPool`` keeps up to ``size`` persistent SMTP connections, each one
+greeted, upgraded with STARTTLS (or implicit TLS on port 465) and
+authenticated once, then reused for many messages. A connection is opened
+lazily, recycled after ``max_messages`` messages, and dropped and re-opened
+when it has been idle longer than ``idle_timeout`` (servers close idle
+sessions) or when the server hangs up mid-transaction.
+
+When the server advertises PIPELINING (RFC 2920) the envelope commands
+(MAIL FROM, RCPT TO..., DATA) are written in one go and their replies read
+back together, so each message costs two round-trips instead of 3 + the
+recipient count.
+
+Every send returns a ``MailResult``; ``send_many`` delivers a batch over
+the pool with bounded concurrency and returns results in input order.
+
+``MailDispatcher`` runs a pool on a background event loop so synchronous
+code (``EmailService.send_email`` from sync routes and threads) shares the
+same connections as async callers.
+"""
+
+import asyncio
+import base64
+import logging
+import re
+import ssl
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from email.message import Message
+from email.policy import SMTP as SMTP_POLICY
+from email.utils import getaddresses
+from typing import Any, Coroutine, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_DOT_STUFF = re.compile(rb"(?m)^\.")
+
+
+class SMTPReplyError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+        self.message = message
+
+
+class SMTPDisconnected(ConnectionError):
+    pass
+
+
+@dataclass
+class MailResult:
+    """Outcome of one message."""
+    recipients: List[str]
+    ok: bool
+    code: Optional[int] = None
+    response: str = ""
+    refused: Optional[List[str]] = None
+    attempts: int = 1
+    elapsed_ms: float = 0.0
+
+
+def message_envelope(message: Message, sender: Optional[str] = None) -> Tuple[str, List[str], bytes]:
+    """Envelope sender, recipients and CRLF/dot-stuffed DATA payload for a message."""
+    if sender is None:
+        sender = getaddresses(message.get_all("From", []))[0][1]
+    recipients = [addr for _, addr in getaddresses(
+        message.get_all("To", []) + message.get_all("Cc", []) + message.get_all("Bcc", [])
+    ) if addr]
+    if "Bcc" in message:
+        del message["Bcc"]
+    data = message.as_bytes(policy=SMTP_POLICY)
+    if not data.endswith(b"\r\n"):
+        data += b"\r\n"
+    return sender, recipients, _DOT_STUFF.sub(b"..", data)
+
+
+class SMTPConnection:
+    """One SMTP session over asyncio streams."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = True,
+        implicit_tls: Optional[bool] = None,
+        timeout: float = 30.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        local_hostname: str = "megilance.local",
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.implicit_tls = port == 465 if implicit_tls is None else implicit_tls
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self.local_hostname = local_hostname
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self.extensions: dict = {}
+        self.last_used = 0.0
+        self.sent = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    def _tls_context(self) -> ssl.SSLContext:
+        return self.ssl_context or ssl.create_default_context()
+
+    async def connect(self) -> None:
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                self.host, self.port,
+                ssl=self._tls_context() if self.implicit_tls else None,
+            ),
+            self.timeout,
+        )
+        self.sent = 0
+        await self._expect(220)
+        await self._ehlo()
+        if self.starttls and not self.implicit_tls and "starttls" in self.extensions:
+            await self.command(b"STARTTLS", 220)
+            await self._writer.start_tls(self._tls_context(), server_hostname=self.host)
+            await self._ehlo()
+        if self.username and self.password:
+            await self._login()
+        self.last_used = time.monotonic()
+
+    async def _ehlo(self) -> None:
+        _, lines = await self.command(f"EHLO {self.local_hostname}".encode(), 250)
+        self.extensions = {}
+        for line in lines[1:]:
+            keyword, _, params = line.partition(" ")
+            self.extensions[keyword.lower()] = params
+
+    async def _login(self) -> None:
+        mechanisms = self.extensions.get("auth", "").upper().split()
+        if "PLAIN" in mechanisms or not mechanisms:
+            token = base64.b64encode(f"\0{self.username}\0{self.password}".encode()).decode()
+            await self.command(f"AUTH PLAIN {token}".encode(), 235)
+        else:
+            await self.command(b"AUTH LOGIN", 334)
+            await self.command(base64.b64encode(self.username.encode()), 334)
+            await self.command(base64.b64encode(self.password.encode()), 235)
+
+    async def _read_reply(self) -> Tuple[int, List[str]]:
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self._reader.readline(), self.timeout)
+            if not line:
+                raise SMTPDisconnected("Connection closed by server")
+            text = line.decode("utf-8", "replace").rstrip("\r\n")
+            lines.append(text[4:])
+            if len(text) < 4 or text[3] != "-":
+                try:
+                    return int(text[:3]), lines
+                except ValueError:
+                    raise SMTPDisconnected(f"Malformed reply: {text!r}") from None
+
+    async def _expect(self, expected: int) -> Tuple[int, List[str]]:
+        code, lines = await self._read_reply()
+        if code != expected:
+            raise SMTPReplyError(code, " ".join(lines))
+        return code, lines
+
+    async def command(self, line: bytes, expected: Optional[int] = None) -> Tuple[int, List[str]]:
+        self._writer.write(line + b"\r\n")
+        await self._writer.drain()
+        if expected is None:
+            return await self._read_reply()
+        return await self._expect(expected)
+
+    async def send(self, sender: str, recipients: Sequence[str], data: bytes) -> Tuple[int, str, List[str]]:
+        """
+        Run one mail transaction. Returns (code, reply, refused recipients).
+
+        Raises ``SMTPReplyError`` if the server rejects the transaction and
+        ``SMTPDisconnected`` if it hangs up before the body is sent (safe to
+        retry on a fresh connection).
+        """
+        envelope = [f"MAIL FROM:<{sender}>".encode()] + [f"RCPT TO:<{r}>".encode() for r in recipients]
+        refused: List[str] = []
+        if "pipelining" in self.extensions:
+            self._writer.write(b"".join(line + b"\r\n" for line in envelope + [b"DATA"]))
+            await self._writer.drain()
+            replies = [await self._read_reply() for _ in range(len(envelope) + 1)]
+        else:
+            replies = []
+            for line in envelope:
+                replies.append(await self.command(line))
+                if replies[0][0] != 250:
+                    break
+            if replies[0][0] == 250 and any(code in (250, 251) for code, _ in replies[1:]):
+                replies.append(await self.command(b"DATA"))
+
+        mail_code, mail_lines = replies[0]
+        for recipient, (code, _) in zip(recipients, replies[1:len(envelope)]):
+            if code not in (250, 251):
+                refused.append(recipient)
+        data_reply = replies[len(envelope)] if len(replies) > len(envelope) else None
+
+        if mail_code != 250:
+            failure = (mail_code, mail_lines)
+        elif len(refused) == len(recipients):
+            failure = next(reply for reply in replies[1:len(envelope)] if reply[0] not in (250, 251))
+        elif data_reply is None or data_reply[0] != 354:
+            failure = data_reply or (554, ["No reply to DATA"])
+        else:
+            failure = None
+        if failure is not None:
+            if data_reply is not None and data_reply[0] == 354:
+                # Pipelined DATA was accepted even though the envelope was not: end it empty
+                await self.command(b".")
+            await self.command(b"RSET")
+            raise SMTPReplyError(failure[0], " ".join(failure[1]))
+
+        self._writer.write(data + b".\r\n")
+        await self._writer.drain()
+        try:
+            code, lines = await self._read_reply()
+        except SMTPDisconnected as e:
+            # The body went out: delivery is unknown, so this must not be retried
+            raise SMTPReplyError(451, f"Connection lost after message body: {e}") from e
+        self.last_used = time.monotonic()
+        self.sent += 1
+        if code != 250:
+            raise SMTPReplyError(code, " ".join(lines))
+        return code, " ".join(lines), refused
+
+    async def close(self) -> None:
+        if not self.connected:
+            self._writer = None
+            return
+        try:
+            self._writer.write(b"QUIT\r\n")
+            await asyncio.wait_for(self._writer.drain(), 2)
+            self._writer.close()
+            await asyncio.wait_for(self._writer.wait_closed(), 2)
+        except Exception:
+            pass
+        self._writer = None
+
+
+class SMTPPool:
+    """Bounded pool of persistent SMTP connections."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        size: int = 4,
+        idle_timeout: float = 60.0,
+        max_messages: int = 200,
+        **connection_options: Any,
+    ):
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.max_messages = max_messages
+        self._connections = [
+            SMTPConnection(host, port, username, password, **connection_options) for _ in range(size)
+        ]
+        self._idle: Optional[asyncio.LifoQueue] = None
+
+    def _queue(self) -> asyncio.LifoQueue:
+        # Created on first use so the pool binds to the loop that actually runs it
+        if self._idle is None:
+            self._idle = asyncio.LifoQueue()
+            for connection in self._connections:
+                self._idle.put_nowait(connection)
+        return self._idle
+
+    async def _ready(self, connection: SMTPConnection) -> SMTPConnection:
+        stale = (
+            time.monotonic() - connection.last_used > self.idle_timeout
+            or connection.sent >= self.max_messages
+        )
+        if connection.connected and stale:
+            await connection.close()
+        if not connection.connected:
+            try:
+                await connection.connect()
+            except BaseException:
+                # A session that failed STARTTLS or AUTH must not go back to the pool open
+                await connection.close()
+                raise
+        return connection
+
+    async def send(self, message: Message, sender: Optional[str] = None) -> MailResult:
+        """Deliver one message, reconnecting once if the pooled session was dropped."""
+        sender, recipients, data = message_envelope(message, sender)
+        start = time.perf_counter()
+        queue = self._queue()
+        connection = await queue.get()
+        attempts = 0
+        try:
+            while True:
+                attempts += 1
+                try:
+                    await self._ready(connection)
+                    code, reply, refused = await connection.send(sender, recipients, data)
+                    return MailResult(recipients, True, code, reply, refused or None, attempts,
+                                      (time.perf_counter() - start) * 1000)
+                except (SMTPDisconnected, ConnectionError, asyncio.TimeoutError, ssl.SSLError) as e:
+                    await connection.close()
+                    if attempts >= 2:
+                        return MailResult(recipients, False, None, str(e), None, attempts,
+                                          (time.perf_counter() - start) * 1000)
+                except SMTPReplyError as e:
+                    if e.code == 421 and attempts < 2:  # service closing the session
+                        await connection.close()
+                        continue
+                    return MailResult(recipients, False, e.code, e.message, None, attempts,
+                                      (time.perf_counter() - start) * 1000)
+        finally:
+            queue.put_nowait(connection)
+
+    async def send_many(self, messages: Iterable[Message], sender: Optional[str] = None) -> List[MailResult]:
+        """Deliver a batch over all pooled connections; results keep the input order."""
+        return list(await asyncio.gather(*(self.send(m, sender) for m in messages)))
+
+    async def close(self) -> None:
+        for connection in self._connections:
+            await connection.close()
+
+
+class MailDispatcher:
+    """
+    Runs an ``SMTPPool`` on a private event loop thread.
+
+    ``submit`` queues a message and returns a ``concurrent.futures.Future``
+    resolving to its ``MailResult``; at most ``max_pending`` messages are
+    queued or in flight, further submits block (back-pressure).
+    ``send_async`` waits for a slot in a worker thread instead, so a full
+    queue never blocks the caller's event loop.
+    """
+
+    def __init__(self, pool: SMTPPool, max_pending: int = 1000):
+        self.pool = pool
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(target=loop.run_forever, name="smtp-dispatcher", daemon=True)
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+
+    def run(self, coro: Coroutine) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def submit(self, message: Message, sender: Optional[str] = None) -> Future:
+        self._slots.acquire()
+        return self._dispatch(message, sender)
+
+    def _dispatch(self, message: Message, sender: Optional[str]) -> Future:
+        """Queue a message on the dispatcher loop; the caller already holds a slot."""
+        try:
+            future = self.run(self.pool.send(message, sender))
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def send(self, message: Message, sender: Optional[str] = None, timeout: Optional[float] = None) -> MailResult:
+        """Blocking send for synchronous callers."""
+        return self.submit(message, sender).result(timeout)
+
+    async def send_async(self, message: Message, sender: Optional[str] = None) -> MailResult:
+        if not self._slots.acquire(blocking=False):
+            acquiring = asyncio.ensure_future(asyncio.to_thread(self._slots.acquire))
+            try:
+                await asyncio.shield(acquiring)
+            except asyncio.CancelledError:
+                # The thread still takes the slot; hand it back once it does
+                acquiring.add_done_callback(lambda _: self._slots.release())
+                raise
+        return await asyncio.wrap_future(self._dispatch(message, sender))
+
+    def send_many(self, messages: Sequence[Message], sender: Optional[str] = None) -> List[MailResult]:
+        return [future.result() for future in [self.submit(m, sender) for m in messages]]
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        if self._loop is None:
+            return
+        self.run(self.pool.close()).result(timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._loop = None
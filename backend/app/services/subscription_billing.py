@@ -9,6 +9,7 @@ from enum import Enum
 import logging
 
 from app.models.user import User
+from app.services.usage_meter import METERS, METER_BY_FEATURE, get_usage_meter
 
 logger = logging.getLogger(__name__)
 
@@ -286,6 +287,7 @@ class SubscriptionBillingService:
             profile_data["subscription"] = subscription
             user.profile_data = profile_data
             self.db.commit()
+            get_usage_meter().invalidate(user_id)
             
             return subscription
             
@@ -425,6 +427,7 @@ class SubscriptionBillingService:
             profile_data["subscription"] = subscription
             user.profile_data = profile_data
             self.db.commit()
+            get_usage_meter().invalidate(user_id)
             
             return {
                 "message": "Subscription cancelled" if immediate else "Cancellation scheduled",
@@ -482,6 +485,18 @@ class SubscriptionBillingService:
         if isinstance(feature_value, bool):
             return {"has_access": feature_value, "feature": feature}
         elif isinstance(feature_value, (int, float)):
+            meter = METER_BY_FEATURE.get(feature)
+            if meter:
+                usage = get_usage_meter().check(user_id, meter.name)
+                return {
+                    "has_access": usage["allowed"],
+                    "feature": feature,
+                    "limit": feature_value,
+                    "unlimited": usage["unlimited"],
+                    "used": usage["used"],
+                    "remaining": usage["remaining"],
+                    "period_end": usage["period_end"]
+                }
             return {
                 "has_access": feature_value != 0,
                 "feature": feature,
@@ -560,44 +575,44 @@ class SubscriptionBillingService:
         usage_type: str,
         amount: int = 1
     ) -> Dict[str, Any]:
-        """Track feature usage against limits"""
-        limits = await self.get_feature_limits(user_id)
-        if "error" in limits:
-            return limits
-        
-        features = limits.get("features", {})
-        limit_value = features.get(usage_type)
-        
-        if limit_value is None:
+        """Record usage of a metered feature (meter name or plan feature) and return the updated counter"""
+        meter = METERS.get(usage_type) or METER_BY_FEATURE.get(usage_type)
+        if meter is None:
             return {"error": f"Unknown usage type: {usage_type}"}
         
-        # Placeholder - would track actual usage
+        usage_meter = get_usage_meter()
+        usage_meter.record(user_id, meter.name, amount)
+        usage = usage_meter.check(user_id, meter.name, 0)
         return {
-            "usage_type": usage_type,
-            "amount_used": amount,
-            "limit": limit_value,
-            "unlimited": limit_value == -1,
-            "remaining": None if limit_value == -1 else max(0, limit_value - amount)
+            "usage_type": meter.name,
+            "amount_recorded": amount,
+            "used": usage["used"],
+            "limit": usage["limit"],
+            "unlimited": usage["unlimited"],
+            "remaining": usage["remaining"],
+            "over_limit": not usage["unlimited"] and usage["used"] > usage["limit"]
         }
     
     async def get_usage_summary(self, user_id: int) -> Dict[str, Any]:
         """Get usage summary for current billing period"""
-        limits = await self.get_feature_limits(user_id)
-        if "error" in limits:
-            return limits
-        
-        # Placeholder - would calculate actual usage
+        summary = get_usage_meter().summary(user_id)
+        usage = summary["usage"]
+        storage = usage["storage"]
+        mb = METERS["storage"].scale
         return {
             "user_id": user_id,
-            "tier": limits.get("tier"),
+            "tier": summary["tier"],
             "billing_period": {
-                "start": None,
-                "end": None
+                "start": summary["period_start"],
+                "end": summary["period_end"]
             },
             "usage": {
-                "projects": {"used": 0, "limit": limits["features"].get("max_projects", 0)},
-                "proposals": {"used": 0, "limit": limits["features"].get("max_proposals_per_month", 0)},
-                "storage_mb": {"used": 0, "limit": limits["features"].get("max_file_storage_mb", 0)}
+                "projects": {"used": usage["projects"]["used"], "limit": usage["projects"]["limit"]},
+                "proposals": {"used": usage["proposals"]["used"], "limit": usage["proposals"]["limit"]},
+                "storage_mb": {
+                    "used": round(storage["used"] / mb, 2),
+                    "limit": storage["limit"] // mb if storage["limit"] > 0 else storage["limit"]
+                }
             }
         }
 
@@ -0,0 +1,112 @@
+# @AI-HINT: Shared placeholder-template compiler - parse once into segments, render with one join, LRU cache by id/version
+"""
+Template Compiler - precompiled ``{{name}}`` / ``{name}`` interpolation.
+
+A template is parsed once into a list of literal segments with placeholder
+slots. Rendering copies that list, fills the slots from the values mapping
+and joins once, instead of running ``str.replace`` per variable over the
+whole text. Placeholders without a value are left as written, and values
+are inserted verbatim (a value that itself looks like a placeholder is not
+expanded again).
+
+Two syntaxes are supported: ``MUSTACHE`` (``{{name}}``, email templates) and
+``BRACES`` (``{name}``, i18n strings). ``TemplateCache`` keeps compiled
+templates keyed by the caller's identity (e.g. template id and version);
+``compile_cached`` keys by the source text itself.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+MUSTACHE = re.compile(r"\{\{([^{}]*)\}\}")
+BRACES = re.compile(r"\{([^{}]*)\}")
+
+
+class CompiledTemplate:
+    """A template parsed into literal segments and placeholder slots."""
+
+    __slots__ = ("source", "_parts", "_slots")
+
+    def __init__(self, source: str, syntax: re.Pattern = MUSTACHE):
+        self.source = source
+        parts: List[Optional[str]] = []
+        slots: List[Tuple[int, str, str]] = []
+        pos = 0
+        for match in syntax.finditer(source):
+            if match.start() > pos:
+                parts.append(source[pos:match.start()])
+            slots.append((len(parts), match.group(1), match.group(0)))
+            parts.append(None)
+            pos = match.end()
+        if pos < len(source):
+            parts.append(source[pos:])
+        self._parts = parts
+        self._slots = slots
+
+    @property
+    def names(self) -> List[str]:
+        """Placeholder names in order of first appearance."""
+        return list(dict.fromkeys(name for _, name, _ in self._slots))
+
+    def render(self, values: Optional[Mapping[str, Any]] = None) -> str:
+        if not self._slots:
+            return self.source
+        if values is None:
+            values = {}
+        parts = self._parts.copy()
+        for index, name, raw in self._slots:
+            try:
+                parts[index] = str(values[name])
+            except KeyError:
+                parts[index] = raw
+        return "".join(parts)
+
+    def render_many(self, values_list: Iterable[Mapping[str, Any]]) -> List[str]:
+        return [self.render(values) for values in values_list]
+
+
+@lru_cache(maxsize=4096)
+def compile_cached(source: str, syntax: re.Pattern = MUSTACHE) -> CompiledTemplate:
+    """Compile a template, memoized by its source text."""
+    return CompiledTemplate(source, syntax)
+
+
+class TemplateCache:
+    """Thread-safe LRU of compiled artifacts keyed by e.g. ``(template_id, version)``."""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+            return item
+
+    def put(self, key: Hashable, item: Any) -> Any:
+        with self._lock:
+            self._items[key] = item
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        return item
+
+    def get_or_compile(self, key: Hashable, compile_fn: Callable[[], Any],
+                       is_current: Callable[[Any], bool] = lambda item: True) -> Any:
+        item = self.get(key)
+        if item is None or not is_current(item):
+            item = self.put(key, compile_fn())
+        return item
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,322 @@
+# @AI-HINT: In-process inverted index with BM25 ranking, light stemming, prefix and typo-tolerant lookup
+"""
+Text Index - small in-memory search engine for curated content.
+
+Documents are analysed once (lower-case, tokenise, drop stop words, stem)
+into per-term postings, so a query touches only the postings of its own
+terms instead of substring-checking every document.
+
+- Ranking is BM25 over a weighted bag of fields (title terms count more
+  than body terms).
+- Query words with no exact term are expanded by prefix ("verif" ->
+  "verification") and, failing that, by one-edit typo tolerance ("pasword"
+  -> "password") through a deletion index.
+- ``more_like_this`` turns a stored document's most distinctive terms into
+  a query, for "related content" suggestions.
+
+Documents can be added, replaced and removed incrementally.
+"""
+
+import bisect
+import math
+import re
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset(
+    "a an and are as at be but by can do does for from has have how i if in into is it its "
+    "me my no not of on or our so that the their them then there these they this to too was "
+    "we what when where which who why will with you your".split()
+)
+
+# (suffix, replacement), first match wins; the stem must keep >= 3 characters
+_SUFFIXES = (
+    ("ications", "y"), ("ication", "y"),
+    ("ations", "ate"), ("ation", "ate"),
+    ("fulness", "ful"), ("iveness", "ive"),
+    ("nesses", ""), ("ness", ""),
+    ("ments", ""), ("ment", ""),
+    ("ings", ""), ("ing", ""),
+    ("ies", "y"), ("ied", "y"),
+    ("edly", ""), ("ed", ""),
+    ("ers", ""), ("er", ""),
+    ("als", ""), ("al", ""),
+    ("ly", ""),
+)
+
+_PREFIX_MIN_LENGTH = 3
+_MAX_EXPANSIONS = 20
+_PREFIX_WEIGHT = 0.8
+_FUZZY_WEIGHT = 0.6
+_FUZZY_MIN_LENGTH = 4
+
+
+def stem(word: str) -> str:
+    """Light suffix-stripping stemmer (Porter-style subset, no dictionary)."""
+    if len(word) <= 3 or word.isdigit():
+        return word
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[: -len(suffix)] + replacement
+            if suffix in ("ing", "ed", "er") and word[-1] == word[-2] and word[-1] not in "lsz":
+                word = word[:-1]  # running -> run
+            break
+    else:
+        if word.endswith("s") and not word.endswith(("ss", "us", "is")) and len(word) > 3:
+            word = word[:-1]
+    if word.endswith("e") and len(word) > 4:
+        word = word[:-1]  # create / creating / creation -> creat
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens with stop words removed (unstemmed)."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOP_WORDS]
+
+
+def analyze(text: str) -> List[str]:
+    """Index terms for ``text``: tokenised, stop words removed, stemmed."""
+    return [stem(t) for t in tokenize(text)]
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """Damerau-Levenshtein distance <= 1 (insert, delete, substitute, swap)."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la > lb:
+        a, b, la, lb = b, a, lb, la
+    i = 0
+    while i < la and a[i] == b[i]:
+        i += 1
+    if la == lb:
+        return a[i + 1:] == b[i + 1:] or (
+            i + 1 < la and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]
+        )
+    return a[i:] == b[i + 1:]
+
+
+def _deletions(word: str) -> Set[str]:
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+class _Document:
+    __slots__ = ("meta", "terms", "length")
+
+    def __init__(self, meta: Dict[str, Any], terms: Dict[str, float], length: float):
+        self.meta = meta
+        self.terms = terms
+        self.length = length
+
+
+class TextIndex:
+    """
+    Inverted index with BM25 scoring over weighted fields.
+
+    ``field_weights`` maps field name to its term-frequency multiplier;
+    fields not listed count with weight 1.
+    """
+
+    def __init__(self, field_weights: Optional[Dict[str, float]] = None, k1: float = 1.2, b: float = 0.75):
+        self.field_weights = dict(field_weights or {})
+        self.k1 = k1
+        self.b = b
+        self._docs: Dict[str, _Document] = {}
+        self._postings: Dict[str, Dict[str, float]] = defaultdict(dict)  # term -> {doc_id: weighted tf}
+        self._total_length = 0.0
+        # Surface vocabulary (unstemmed words) for prefix / typo expansion
+        self._surface: Dict[str, str] = {}  # word -> its stem
+        self._surface_sorted: Optional[List[str]] = None
+        self._deletes: Dict[str, Set[str]] = defaultdict(set)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._docs
+
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        doc = self._docs.get(doc_id)
+        return doc.meta if doc else None
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def add(self, doc_id: str, fields: Dict[str, Any], meta: Optional[Dict[str, Any]] = None) -> None:
+        """Index (or re-index) a document. List-valued fields are joined."""
+        terms: Dict[str, float] = defaultdict(float)
+        words: Set[str] = set()
+        length = 0.0
+        for name, value in fields.items():
+            if not value:
+                continue
+            if not isinstance(value, str):
+                value = " ".join(str(v) for v in value)
+            weight = self.field_weights.get(name, 1.0)
+            for word in tokenize(value):
+                terms[stem(word)] += weight
+                words.add(word)
+                length += weight
+
+        with self._lock:
+            if doc_id in self._docs:
+                self._remove_locked(doc_id)
+            self._docs[doc_id] = _Document(meta or {}, dict(terms), length)
+            self._total_length += length
+            for term, tf in terms.items():
+                self._postings[term][doc_id] = tf
+            for word in words:
+                if word not in self._surface:
+                    self._surface[word] = stem(word)
+                    self._surface_sorted = None
+                    if len(word) >= _FUZZY_MIN_LENGTH:
+                        for variant in _deletions(word):
+                            self._deletes[variant].add(word)
+
+    def remove(self, doc_id: str) -> bool:
+        with self._lock:
+            if doc_id not in self._docs:
+                return False
+            self._remove_locked(doc_id)
+            return True
+
+    def _remove_locked(self, doc_id: str) -> None:
+        doc = self._docs.pop(doc_id)
+        self._total_length -= doc.length
+        for term in doc.terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        # Surface words whose stem vanished from the index are dropped lazily
+        # at expansion time (see _live_stem), which keeps removal O(terms).
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def _live_stem(self, word: str) -> Optional[str]:
+        term = self._surface.get(word)
+        return term if term in self._postings else None
+
+    def _prefix_words(self, prefix: str) -> List[str]:
+        words = self._surface_sorted
+        if words is None:
+            with self._lock:
+                words = self._surface_sorted = sorted(self._surface)
+        start = bisect.bisect_left(words, prefix)
+        found = []
+        for i in range(start, min(start + _MAX_EXPANSIONS * 4, len(words))):
+            if not words[i].startswith(prefix):
+                break
+            found.append(words[i])
+        return found
+
+    def _fuzzy_words(self, word: str) -> Set[str]:
+        candidates = set(self._deletes.get(word, ()))  # one insertion
+        for variant in _deletions(word):
+            if variant in self._surface:
+                candidates.add(variant)  # one deletion
+            candidates |= self._deletes.get(variant, set())  # substitution / swap
+        return {c for c in candidates if _within_one_edit(word, c)}
+
+    def expand(self, word: str, prefix: bool = True, fuzzy: bool = True) -> Dict[str, float]:
+        """Index terms a query word stands for, with their weights."""
+        exact = stem(word)
+        if exact in self._postings:
+            return {exact: 1.0}
+        expansions: Dict[str, float] = {}
+        if prefix and len(word) >= _PREFIX_MIN_LENGTH:
+            for surface in self._prefix_words(word):
+                term = self._live_stem(surface)
+                if term is not None:
+                    expansions.setdefault(term, _PREFIX_WEIGHT)
+                    if len(expansions) >= _MAX_EXPANSIONS:
+                        break
+        if not expansions and fuzzy and len(word) >= _FUZZY_MIN_LENGTH:
+            for surface in self._fuzzy_words(word):
+                term = self._live_stem(surface)
+                if term is not None:
+                    expansions.setdefault(term, _FUZZY_WEIGHT)
+        return expansions
+
+    def _idf(self, term: str) -> float:
+        df = len(self._postings.get(term, ()))
+        n = len(self._docs)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def _score(
+        self,
+        query_terms: Iterable[Dict[str, float]],
+        where: Optional[Callable[[Dict[str, Any]], bool]],
+        exclude: Optional[str] = None,
+    ) -> Dict[str, float]:
+        docs = self._docs
+        avg_length = (self._total_length / len(docs)) if docs else 1.0
+        k1, b = self.k1, self.b
+        scores: Dict[str, float] = defaultdict(float)
+        allowed: Dict[str, bool] = {}
+        for expansions in query_terms:
+            # One query word contributes its best-matching expansion per document
+            best: Dict[str, float] = {}
+            for term, weight in expansions.items():
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = self._idf(term) * weight
+                for doc_id, tf in postings.items():
+                    if doc_id == exclude:
+                        continue
+                    if where is not None:
+                        ok = allowed.get(doc_id)
+                        if ok is None:
+                            ok = allowed[doc_id] = bool(where(docs[doc_id].meta))
+                        if not ok:
+                            continue
+                    norm = tf + k1 * (1 - b + b * docs[doc_id].length / avg_length)
+                    score = idf * tf * (k1 + 1) / norm
+                    if score > best.get(doc_id, 0.0):
+                        best[doc_id] = score
+            for doc_id, score in best.items():
+                scores[doc_id] += score
+        return scores
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        prefix: bool = True,
+        fuzzy: bool = True,
+    ) -> List[Tuple[str, float]]:
+        """Top ``limit`` (doc_id, score) pairs for ``query``, best first."""
+        words = list(dict.fromkeys(tokenize(query)))
+        if not words or not self._docs:
+            return []
+        query_terms = [self.expand(w, prefix=prefix, fuzzy=fuzzy) for w in words]
+        scores = self._score(query_terms, where)
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    def more_like_this(
+        self,
+        doc_id: str,
+        limit: int = 5,
+        where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        max_terms: int = 12,
+    ) -> List[Tuple[str, float]]:
+        """Documents sharing the most distinctive terms of ``doc_id``."""
+        doc = self._docs.get(doc_id)
+        if doc is None:
+            return []
+        ranked = sorted(doc.terms.items(), key=lambda item: -item[1] * self._idf(item[0]))
+        query_terms = [{term: 1.0} for term, _ in ranked[:max_terms]]
+        scores = self._score(query_terms, where, exclude=doc_id)
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
@@ -6,6 +6,7 @@ import logging
 from datetime import datetime, timezone
 from typing import Optional
 
+from app.db.schema_registry import ensure_schema, register_schema
 from app.db.turso_http import execute_query, parse_rows
 
 logger = logging.getLogger(__name__)
@@ -18,25 +19,25 @@ _CACHE_MAX_SIZE = 1000
 _CLEAN_CACHE_TTL = 300  # 5 min: non-blacklisted tokens cached this long
 
 
+REVOKED_TOKENS_DDL = [
+    """CREATE TABLE IF NOT EXISTS revoked_tokens (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        token_hash TEXT NOT NULL UNIQUE,
+        expires_at TEXT NOT NULL,
+        revoked_at TEXT NOT NULL DEFAULT (datetime('now')),
+        reason TEXT DEFAULT 'logout'
+    )""",
+    # Index for fast lookups and cleanup
+    "CREATE INDEX IF NOT EXISTS idx_revoked_tokens_hash ON revoked_tokens(token_hash)",
+    "CREATE INDEX IF NOT EXISTS idx_revoked_tokens_expires ON revoked_tokens(expires_at)",
+]
+register_schema("revoked_tokens", REVOKED_TOKENS_DDL)
+
+
 def _ensure_table_exists() -> None:
-    """Create revoked_tokens table if it doesn't exist."""
+    """Create revoked_tokens table if this process has not yet (bootstrapped at startup)."""
     try:
-        execute_query(
-            """CREATE TABLE IF NOT EXISTS revoked_tokens (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                token_hash TEXT NOT NULL UNIQUE,
-                expires_at TEXT NOT NULL,
-                revoked_at TEXT NOT NULL DEFAULT (datetime('now')),
-                reason TEXT DEFAULT 'logout'
-            )"""
-        )
-        # Index for fast lookups and cleanup
-        execute_query(
-            "CREATE INDEX IF NOT EXISTS idx_revoked_tokens_hash ON revoked_tokens(token_hash)"
-        )
-        execute_query(
-            "CREATE INDEX IF NOT EXISTS idx_revoked_tokens_expires ON revoked_tokens(expires_at)"
-        )
+        ensure_schema("revoked_tokens")
     except Exception as e:
         logger.warning(f"Could not ensure revoked_tokens table: {e}")
 
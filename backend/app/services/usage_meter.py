@@ -0,0 +1,559 @@
+# @AI-HINT: Buffered subscription usage metering - per-user, per-billing-period counters in memory, deltas flushed to usage_counters in batches; quota checks never touch the DB on the request path
+"""
+Usage Meter - counts what each user consumes against their plan's quotas.
+
+Metered quotas (see ``METERS``): projects posted and proposals submitted per
+billing period, and file storage in use (never resets). The plan comes from
+the subscription stored in ``users.profile_data``. The authenticated user
+object already carries that, so a check needs no query for the plan.
+
+Every (user, meter) pair has an in-memory counter:
+
+    used = synced (last total read from usage_counters) + unflushed deltas
+
+``check`` compares ``used`` with the plan limit and ``record`` adds a delta;
+neither touches the database. A background thread flushes all deltas every
+``flush_interval`` seconds: one ``execute_many`` of upserts that also reads
+back the new totals, so counters on every worker converge.
+
+Quota checks are therefore approximate, and the overshoot is bounded:
+
+* a user this worker has not seen yet is loaded in the background; until
+  then up to the meter's ``cold_allowance`` is admitted on trust (beyond
+  that the check loads synchronously);
+* usage recorded on other workers shows up at their next flush, or after
+  ``refresh_interval`` for counters this worker only reads.
+
+Counters start from what the user already has. The first load of a counter
+with no ``usage_counters`` row seeds the row (``SEED_QUERIES``) from the
+projects or proposals created in the period, or from the size of the
+user's avatar and portfolio images, counting only what existed before this
+worker created the counter (later writes arrive as deltas). Releases never
+take a counter below zero, in memory or in the table.
+
+Periods follow the subscription: the window is stepped from
+``current_period_start`` in steps of the subscription's period length, so a
+counter rolls over on the user's own billing date. Users without a paid
+subscription roll over on the first of each calendar month (UTC).
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.db.schema_registry import ensure_schema, register_schema
+from app.db.turso_http import ResultSet, get_turso_http
+
+logger = logging.getLogger(__name__)
+
+LIFETIME = "lifetime"  # period_start of meters that never reset
+_FAR_FUTURE = datetime.max.replace(tzinfo=timezone.utc)
+_LOAD_BATCH = 500   # counters per background load query
+_READ_BACK = 300    # counters per flush read-back query (3 parameters each)
+MB = 1024 * 1024
+
+USAGE_METER_DDL = [
+    """CREATE TABLE IF NOT EXISTS usage_counters (
+        user_id INTEGER NOT NULL,
+        meter TEXT NOT NULL,
+        period_start TEXT NOT NULL,
+        used INTEGER NOT NULL DEFAULT 0,
+        updated_at TEXT NOT NULL,
+        PRIMARY KEY (user_id, meter, period_start)
+    )""",
+]
+
+register_schema("usage_meter", USAGE_METER_DDL)
+
+# Existing usage a counter is seeded with when it has no row yet. Period meters take
+# (user_id, period_start, cutoff); storage lists the user's stored files.
+SEED_QUERIES = {
+    "projects": "SELECT COUNT(*) FROM projects WHERE client_id = ? "
+                "AND julianday(created_at) >= julianday(?) AND julianday(created_at) < julianday(?)",
+    "proposals": "SELECT COUNT(*) FROM proposals WHERE freelancer_id = ? "
+                 "AND julianday(created_at) >= julianday(?) AND julianday(created_at) < julianday(?)",
+    "storage": "SELECT profile_image_url FROM users WHERE id = ? "
+               "UNION SELECT image_url FROM portfolio_items WHERE freelancer_id = ?",
+}
+
+_UPSERT = (
+    "INSERT INTO usage_counters (user_id, meter, period_start, used, updated_at) "
+    "VALUES (?, ?, ?, MAX(?, 0), ?) ON CONFLICT(user_id, meter, period_start) "
+)
+
+
+@dataclass(frozen=True)
+class Meter:
+    name: str
+    feature: str          # plan feature holding the limit (-1 = unlimited)
+    resets: bool          # counts per billing period, or a running total
+    scale: int = 1        # units per unit of the feature value (storage limits are in MB, usage in bytes)
+    cold_allowance: int = 1
+
+
+METERS: Dict[str, Meter] = {
+    "projects": Meter("projects", "max_projects", resets=True),
+    "proposals": Meter("proposals", "max_proposals_per_month", resets=True),
+    "storage": Meter("storage", "max_file_storage_mb", resets=False, scale=MB, cold_allowance=10 * MB),
+}
+METER_BY_FEATURE = {m.feature: m for m in METERS.values()}
+
+
+@dataclass(frozen=True)
+class Plan:
+    tier: str
+    features: Dict[str, Any]
+    period_start: datetime
+    period_end: datetime
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def billing_period(subscription: Dict[str, Any], now: datetime) -> Tuple[datetime, datetime]:
+    """The billing window containing ``now``, stepped forward from the subscription's current period."""
+    start = _parse_time(subscription.get("current_period_start"))
+    end = _parse_time(subscription.get("current_period_end"))
+    if start and end and end > start:
+        length = end - start
+        steps = (now - start) // length
+        start += length * steps
+        return start, start + length
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    year, month = (month_start.year + 1, 1) if month_start.month == 12 else (month_start.year, month_start.month + 1)
+    return month_start, month_start.replace(year=year, month=month)
+
+
+def plan_from_profile(profile_data: Any, now: Optional[datetime] = None) -> Plan:
+    """Resolve the plan and current billing window from a user's ``profile_data`` (JSON text or dict)."""
+    from app.services.subscription_billing import SUBSCRIPTION_PLANS, PlanTier
+    now = now or datetime.now(timezone.utc)
+    if isinstance(profile_data, str):
+        try:
+            profile_data = json.loads(profile_data)
+        except ValueError:
+            profile_data = None
+    subscription = (profile_data.get("subscription") if isinstance(profile_data, dict) else None) or {}
+    try:
+        tier = PlanTier(subscription.get("tier") or PlanTier.FREE.value)
+    except ValueError:
+        tier = PlanTier.FREE
+    features = dict(SUBSCRIPTION_PLANS[tier]["features"])
+    features.update(subscription.get("features") or {})
+    if tier == PlanTier.FREE:
+        subscription = {}
+    start, end = billing_period(subscription, now)
+    return Plan(tier.value, features, start, end)
+
+
+class _Counter:
+    __slots__ = ("period_start", "period_end", "limit", "synced", "checked_at", "created")
+
+    def __init__(self, period_start: str, period_end: datetime, limit: int):
+        self.period_start = period_start
+        self.period_end = period_end
+        self.limit = limit
+        self.synced: Optional[int] = None  # None until loaded from usage_counters
+        self.checked_at = 0.0
+        self.created = datetime.now(timezone.utc)  # deltas cover writes from here on; the seed covers the rest
+
+
+class UsageMeter:
+    """
+    Process-wide usage counters with periodic batched persistence.
+
+    ``user`` arguments accept the authenticated user object (``.id`` and
+    ``.profile_data``) or a bare user id. A bare id whose plan is not cached
+    costs one query, which is fine for summaries but not for request paths.
+    With ``background=False`` nothing runs on its own; callers drive
+    ``load`` and ``flush`` (scripts and tests).
+    """
+
+    def __init__(self, backend_factory: Optional[Callable[[], Any]] = None,
+                 flush_interval: float = 5.0, refresh_interval: float = 60.0, background: bool = True,
+                 storage=None):
+        self._backend_factory = backend_factory or get_turso_http
+        self._storage = storage
+        self.flush_interval = flush_interval
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # held by flush and load, so a load never installs a stale total
+        self._plans: Dict[int, Tuple[Any, Plan]] = {}
+        self._counters: Dict[Tuple[int, str], _Counter] = {}
+        self._deltas: Dict[Tuple[int, str, str], int] = {}
+        self._inflight: Dict[Tuple[int, str, str], int] = {}
+        self._to_load: Set[Tuple[int, str]] = set()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        if not background:
+            self._stopped.set()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"flushes": 0, "rows_flushed": 0, "loads": 0, "sync_loads": 0, "seeds": 0, "flush_errors": 0}
+
+    @property
+    def storage(self):
+        if self._storage is None:
+            from app.core.storage import get_storage
+            self._storage = get_storage()
+        return self._storage
+
+    def _backend(self):
+        backend = self._backend_factory()
+        ensure_schema("usage_meter", backend=backend)
+        return backend
+
+    def _start(self) -> None:
+        if self._thread is None and not self._stopped.is_set():
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="usage-meter-flush", daemon=True)
+                    self._thread.start()
+
+    # -- plans and counters --------------------------------------------
+
+    def _plan(self, user: Any, now: datetime) -> Tuple[int, Plan]:
+        if isinstance(user, (int, str)):
+            user_id, profile_data, known = int(user), None, False
+        else:
+            user_id, profile_data, known = int(user.id), getattr(user, "profile_data", None), True
+        cached = self._plans.get(user_id)
+        if cached and (not known or cached[0] == profile_data) and now < cached[1].period_end:
+            return user_id, cached[1]
+        if not known:
+            profile_data = self._load_profile(user_id)
+        plan = plan_from_profile(profile_data, now)
+        self._plans[user_id] = (profile_data, plan)
+        return user_id, plan
+
+    def _load_profile(self, user_id: int) -> Any:
+        row = ResultSet.from_result(self._backend().execute(
+            "SELECT profile_data FROM users WHERE id = ?", [user_id])).first()
+        return row[0] if row else None
+
+    def _counter(self, user: Any, meter: Meter) -> Tuple[int, _Counter]:
+        """The counter for the current period; rolls over and queues a background load as needed. Call with the lock held."""
+        now = datetime.now(timezone.utc)
+        user_id, plan = self._plan(user, now)
+        limit = int(plan.features.get(meter.feature, 0) or 0)
+        limit = limit * meter.scale if limit > 0 else limit
+        period_start = plan.period_start.isoformat() if meter.resets else LIFETIME
+        period_end = plan.period_end if meter.resets else _FAR_FUTURE
+        key = (user_id, meter.name)
+        counter = self._counters.get(key)
+        if counter is None or counter.period_start != period_start:
+            counter = self._counters[key] = _Counter(period_start, period_end, limit)
+        counter.limit, counter.period_end = limit, period_end
+        if counter.synced is None or time.monotonic() - counter.checked_at > self.refresh_interval:
+            if key not in self._to_load:
+                self._to_load.add(key)
+                self._wake.set()
+        return user_id, counter
+
+    def _used(self, user_id: int, meter: Meter, counter: _Counter) -> int:
+        key = (user_id, meter.name, counter.period_start)
+        return max(0, (counter.synced or 0) + self._deltas.get(key, 0) + self._inflight.get(key, 0))
+
+    # -- request path --------------------------------------------------
+
+    def check(self, user: Any, meter: str, amount: int = 1) -> Dict[str, Any]:
+        """Would ``amount`` more fit the user's quota? Answered from memory."""
+        spec = METERS[meter]
+        self._start()
+        with self._lock:
+            user_id, counter = self._counter(user, spec)
+            cold = counter.synced is None
+            used = self._used(user_id, spec, counter)
+        if cold and counter.limit > 0 and used + amount > spec.cold_allowance:
+            self.load([user_id])  # too much to take on trust; pay for the read once
+            self.stats["sync_loads"] += 1
+            with self._lock:
+                used = self._used(user_id, spec, counter)
+        limit = counter.limit
+        unlimited = limit < 0
+        return {
+            "meter": meter,
+            "allowed": unlimited or used + amount <= limit,
+            "used": used,
+            "limit": limit,
+            "unlimited": unlimited,
+            "remaining": None if unlimited else max(0, limit - used),
+            "period_start": None if counter.period_start == LIFETIME else counter.period_start,
+            "period_end": None if counter.period_end == _FAR_FUTURE else counter.period_end.isoformat(),
+        }
+
+    def record(self, user: Any, meter: str, amount: int = 1) -> None:
+        """
+        Add ``amount`` (negative to release) to the current period; persisted at the next flush.
+
+        A release is capped at what the counter holds, so it loads the counter
+        first when this worker has not yet.
+        """
+        if not amount:
+            return
+        spec = METERS[meter]
+        self._start()
+        with self._lock:
+            user_id, counter = self._counter(user, spec)
+            cold = counter.synced is None
+        if amount < 0 and cold:
+            self.load([user_id])
+            self.stats["sync_loads"] += 1
+        with self._lock:
+            user_id, counter = self._counter(user, spec)
+            if amount < 0:
+                amount = max(amount, -self._used(user_id, spec, counter))
+                if not amount:
+                    return
+            key = (user_id, spec.name, counter.period_start)
+            self._deltas[key] = self._deltas.get(key, 0) + amount
+
+    def invalidate(self, user_id: int) -> None:
+        """Forget a user's plan and counters after their subscription changes (unflushed deltas are kept)."""
+        with self._lock:
+            self._plans.pop(user_id, None)
+            for name in METERS:
+                self._counters.pop((user_id, name), None)
+
+    # -- persistence ---------------------------------------------------
+
+    def load(self, user_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Read stored totals for the given users' counters (default: every counter queued for a load).
+
+        Waits for a flush in progress: a total read before the flush commits
+        and installed after it would drop the flushed deltas from ``used``.
+        """
+        with self._flush_lock:
+            return self._load(user_ids)
+
+    def _load(self, user_ids: Optional[Iterable[int]]) -> int:
+        """``load`` body. Call with the flush lock held."""
+        with self._lock:
+            if user_ids is None:
+                keys = list(self._to_load)[:_LOAD_BATCH]
+            else:
+                wanted = set(user_ids)
+                keys = [k for k in self._counters if k[0] in wanted]
+            self._to_load.difference_update(keys)
+            targets = {k: self._counters[k].period_start for k in keys if k in self._counters}
+            created = {k: self._counters[k].created for k in targets}
+        if not targets:
+            return 0
+        users = sorted({u for u, _ in targets})
+        periods = sorted(set(targets.values()))
+        try:
+            result = self._backend().execute_many([{
+                "q": f"SELECT user_id, meter, period_start, used FROM usage_counters "
+                     f"WHERE user_id IN ({', '.join('?' * len(users))}) "
+                     f"AND period_start IN ({', '.join('?' * len(periods))})",
+                "params": users + periods,
+            }])[0]
+        except Exception as e:
+            logger.error(f"usage_meter.load_failed users={len(users)}: {e}")
+            with self._lock:
+                self._to_load.update(targets)
+            return 0
+        stored = {(int(r[0]), r[1], r[2]): int(r[3] or 0) for r in ResultSet.from_result(result)}
+        missing = [(u, name, period_start, created[(u, name)]) for (u, name), period_start in targets.items()
+                   if (u, name, period_start) not in stored]
+        if missing:
+            seeded = self._seed(missing)
+            if seeded is None:
+                with self._lock:
+                    self._to_load.update((u, name) for u, name, _, _ in missing)
+                for u, name, _, _ in missing:
+                    targets.pop((u, name))
+            else:
+                stored.update(seeded)
+        now = time.monotonic()
+        with self._lock:
+            for (user_id, name), period_start in targets.items():
+                counter = self._counters.get((user_id, name))
+                if counter is not None and counter.period_start == period_start:
+                    counter.synced = stored.get((user_id, name, period_start), 0)
+                    counter.checked_at = now
+        self.stats["loads"] += 1
+        return len(targets)
+
+    def _seed(self, missing: List[Tuple[int, str, str, datetime]]) -> Optional[Dict[Tuple[int, str, str], int]]:
+        """
+        Create the rows of counters that have none, from existing usage before each counter's creation.
+
+        Returns the stored totals (a row another worker created meanwhile wins),
+        or None when the source data could not be read.
+        """
+        queries = []
+        for user_id, name, period_start, created in missing:
+            params = [user_id, user_id] if name == "storage" else [user_id, period_start, created.isoformat()]
+            queries.append({"q": SEED_QUERIES[name], "params": params})
+        now = datetime.now(timezone.utc).isoformat()
+        try:
+            backend = self._backend()
+            results = backend.execute_many(queries)
+            statements = []
+            for (user_id, name, period_start, created), result in zip(missing, results):
+                rows = ResultSet.from_result(result)
+                if name == "storage":
+                    used = self._files_size([row[0] for row in rows], created)
+                else:
+                    first = rows.first()
+                    used = int(first[0] or 0) if first else 0
+                statements.append({"q": _UPSERT + "DO NOTHING", "params": [user_id, name, period_start, used, now]})
+            keys = [(u, name, period_start) for u, name, period_start, _ in missing]
+            reads = [keys[i:i + _READ_BACK] for i in range(0, len(keys), _READ_BACK)]
+            statements += [_read_back(chunk) for chunk in reads]
+            totals = backend.execute_many(statements)[-len(reads):]
+        except Exception as e:
+            logger.error(f"usage_meter.seed_failed counters={len(missing)}: {e}")
+            return None
+        self.stats["seeds"] += len(missing)
+        return {(int(r[0]), r[1], r[2]): int(r[3] or 0) for result in totals for r in ResultSet.from_result(result)}
+
+    def _files_size(self, paths: Iterable[Any], before: datetime) -> int:
+        """Bytes of the stored files among ``paths`` written before ``before`` (local storage only)."""
+        total = 0
+        for path in {str(p) for p in paths if p}:
+            relative = path.split("/uploads/", 1)[-1].lstrip("/")
+            try:
+                local = self.storage.local_path(relative)
+                if local is None:
+                    continue
+                stat = os.stat(local)
+            except (OSError, ValueError):
+                continue
+            if stat.st_mtime < before.timestamp():
+                total += stat.st_size
+        return total
+
+    def flush(self) -> int:
+        """Write all buffered deltas in one batch and refresh the touched counters. Returns rows written."""
+        with self._flush_lock:
+            with self._lock:
+                cold = {user_id for user_id, name, _ in self._deltas
+                        if getattr(self._counters.get((user_id, name)), "synced", None) is None}
+            if cold:
+                self._load(cold)  # seed first: a row created by the flush would start from the delta alone
+            with self._lock:
+                batch, self._deltas = {k: v for k, v in self._deltas.items() if v}, {}
+                self._inflight = batch
+            if not batch:
+                return 0
+            now = datetime.now(timezone.utc).isoformat()
+            keys = list(batch)
+            statements = [
+                {
+                    "q": _UPSERT + "DO UPDATE SET used = MAX(used + ?, 0), updated_at = excluded.updated_at",
+                    "params": [user_id, name, period_start, delta, now, delta],
+                }
+                for (user_id, name, period_start), delta in batch.items()
+            ]
+            reads = [keys[i:i + _READ_BACK] for i in range(0, len(keys), _READ_BACK)]
+            statements += [_read_back(chunk) for chunk in reads]
+            try:
+                results = self._backend().execute_many(statements)[-len(reads):]
+            except Exception as e:
+                logger.error(f"usage_meter.flush_failed rows={len(batch)}: {e}")
+                self.stats["flush_errors"] += 1
+                with self._lock:
+                    for key, delta in batch.items():
+                        self._deltas[key] = self._deltas.get(key, 0) + delta
+                    self._inflight = {}
+                return 0
+            totals = {(int(r[0]), r[1], r[2]): int(r[3] or 0)
+                      for result in results for r in ResultSet.from_result(result)}
+            checked = time.monotonic()
+            with self._lock:
+                for (user_id, name, period_start), total in totals.items():
+                    counter = self._counters.get((user_id, name))
+                    if counter is not None and counter.period_start == period_start:
+                        counter.synced = total
+                        counter.checked_at = checked
+                self._inflight = {}
+            self.stats["flushes"] += 1
+            self.stats["rows_flushed"] += len(batch)
+            return len(batch)
+
+    def _run(self) -> None:
+        next_flush = time.monotonic() + self.flush_interval
+        while not self._stopped.is_set():
+            self._wake.wait(max(0.0, next_flush - time.monotonic()))
+            self._wake.clear()
+            try:
+                if self._to_load:
+                    self.load()
+                if time.monotonic() >= next_flush:
+                    self.flush()
+                    next_flush = time.monotonic() + self.flush_interval
+            except Exception as e:
+                logger.error(f"usage_meter.background_failed: {e}")
+
+    def close(self) -> None:
+        """Stop the flush thread and write what is still buffered."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+
+    # -- reporting -----------------------------------------------------
+
+    def summary(self, user: Any) -> Dict[str, Any]:
+        """Usage of every meter for the current period (loads the user's counters first)."""
+        with self._lock:
+            user_id, plan = self._plan(user, datetime.now(timezone.utc))
+            for spec in METERS.values():
+                self._counter(user_id, spec)
+        self.load([user_id])
+        usage = {name: self.check(user_id, name, 0) for name in METERS}
+        return {"user_id": user_id, "tier": plan.tier, "period_start": plan.period_start.isoformat(),
+                "period_end": plan.period_end.isoformat(), "usage": usage}
+
+
+def _read_back(keys: List[Tuple[int, str, str]]) -> Dict[str, Any]:
+    return {
+        "q": "SELECT user_id, meter, period_start, used FROM usage_counters WHERE "
+             + " OR ".join("(user_id = ? AND meter = ? AND period_start = ?)" for _ in keys),
+        "params": [p for key in keys for p in key],
+    }
+
+
+def quota_exceeded_detail(decision: Dict[str, Any]) -> str:
+    """Message for a 403 when ``check`` says no."""
+    meter = decision["meter"]
+    if meter == "storage":
+        return (f"Storage limit reached: {decision['used'] / MB:.1f} of {decision['limit'] // MB} MB used. "
+                "Delete files or upgrade your plan.")
+    return (f"Plan limit reached: {decision['used']} of {decision['limit']} {meter} used this billing period. "
+            "Upgrade your plan to add more.")
+
+
+_meter: Optional[UsageMeter] = None
+_meter_lock = threading.Lock()
+
+
+def get_usage_meter() -> UsageMeter:
+    """Get or create the process-wide usage meter."""
+    global _meter
+    if _meter is None:
+        with _meter_lock:
+            if _meter is None:
+                from app.core.config import get_settings
+                settings = get_settings()
+                _meter = UsageMeter(
+                    flush_interval=settings.usage_meter_flush_seconds,
+                    refresh_interval=settings.usage_meter_refresh_seconds,
+                )
+    return _meter
@@ -1,16 +1,20 @@
 # @AI-HINT: Video interview service with WebRTC signaling and scheduling
 """Video Interview Service - WebRTC-based video calling for client-freelancer interviews."""
 
+import asyncio
 import logging
 import json
 import hashlib
 import secrets
 from datetime import datetime, timedelta, timezone
+from datetime import timezone as dt_timezone
 from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 from enum import Enum
 
+from app.services.webrtc_signaling import WebRTCSignalingServer, get_signaling_server
+
 logger = logging.getLogger(__name__)
 
 
@@ -97,8 +101,8 @@ class VideoInterviewService:
             if not client or not freelancer:
                 raise ValueError("Invalid client or freelancer ID")
             
-            # Validate scheduled time is in the future
-            if scheduled_time <= datetime.now(timezone.utc):
+            # Validate scheduled time is in the future (`timezone` is the argument here)
+            if scheduled_time <= datetime.now(dt_timezone.utc):
                 raise ValueError("Interview must be scheduled for a future time")
             
             # Check for scheduling conflicts (simple check - 1 hour buffer)
@@ -125,7 +129,7 @@ class VideoInterviewService:
                 "end_time": (scheduled_time + timedelta(minutes=duration_minutes)).isoformat(),
                 "status": InterviewStatus.SCHEDULED,
                 "timezone": timezone,
-                "created_at": datetime.now(timezone.utc).isoformat(),
+                "created_at": datetime.now(dt_timezone.utc).isoformat(),
                 "tokens": {
                     "client": client_token,
                     "freelancer": freelancer_token
@@ -145,6 +149,15 @@ class VideoInterviewService:
                 "recording": False
             }
             
+            # Let any worker authorize Socket.IO signaling joins for this room
+            try:
+                await asyncio.to_thread(
+                    get_signaling_server().registry.open_room,
+                    room_id, client_id, freelancer_id, interview["tokens"]
+                )
+            except Exception as e:
+                logger.warning(f"Signaling room registration failed for {room_id}: {e}")
+            
             logger.info(f"Interview scheduled: {room_id} at {scheduled_time}")
             
             return interview
@@ -352,22 +365,28 @@ class VideoInterviewService:
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
         
-        # Queue message for recipient (would be sent via WebSocket in real implementation)
-        if to_user_id not in self._signaling_queue:
-            self._signaling_queue[to_user_id] = []
-        self._signaling_queue[to_user_id].append(message)
+        # Push over Socket.IO when the recipient joined signaling there; queue for pollers otherwise
+        try:
+            pushed = await get_signaling_server().push(room_id, from_user_id, to_user_id, signal_type, signal_data)
+        except Exception as e:
+            logger.warning(f"Signal push failed for room {room_id}, queueing: {e}")
+            pushed = False
+        if not pushed:
+            if to_user_id not in self._signaling_queue:
+                self._signaling_queue[to_user_id] = []
+            self._signaling_queue[to_user_id].append(message)
         
         # Get recipient socket ID for routing
         recipient_socket = room["participants"][to_user_id]["socket_id"]
         
         return {
-            "status": "queued",
+            "status": "delivered" if pushed else "queued",
             "recipient_socket": recipient_socket,
             "message": message
         }
     
     async def get_pending_signals(self, user_id: int) -> List[Dict[str, Any]]:
-        """Get pending signaling messages for a user."""
+        """Get pending signaling messages for a user (clients not joined over Socket.IO)."""
         if user_id in self._signaling_queue:
             messages = self._signaling_queue[user_id]
             self._signaling_queue[user_id] = []
@@ -513,6 +532,11 @@ class VideoInterviewService:
         interview["cancelled_at"] = datetime.now(timezone.utc).isoformat()
         interview["cancellation_reason"] = reason
         
+        try:
+            await asyncio.to_thread(get_signaling_server().registry.close_room, room_id)
+        except Exception as e:
+            logger.warning(f"Signaling room close failed for {room_id}: {e}")
+        
         logger.info(f"Interview {room_id} cancelled by user {user_id}")
         
         return {
@@ -695,107 +719,8 @@ class VideoInterviewService:
         return hashlib.sha256(data.encode()).hexdigest()[:32]
 
 
-# ============================================================================
-# WebRTC Signaling Server (for WebSocket integration)
-# ============================================================================
-
-class WebRTCSignalingServer:
-    """
-    WebRTC signaling server for coordinating peer connections.
-    
-    Handles SDP offer/answer exchange and ICE candidate negotiation.
-    """
-    
-    def __init__(self):
-        self.connections: Dict[str, Dict] = {}  # socket_id -> user info
-        self.rooms: Dict[str, set] = {}  # room_id -> set of socket_ids
-    
-    async def register_connection(
-        self,
-        socket_id: str,
-        user_id: int,
-        room_id: str
-    ) -> Dict[str, Any]:
-        """Register a WebSocket connection for signaling."""
-        self.connections[socket_id] = {
-            "user_id": user_id,
-            "room_id": room_id,
-            "connected_at": datetime.now(timezone.utc)
-        }
-        
-        if room_id not in self.rooms:
-            self.rooms[room_id] = set()
-        self.rooms[room_id].add(socket_id)
-        
-        # Get other participants in room
-        other_sockets = [s for s in self.rooms[room_id] if s != socket_id]
-        
-        return {
-            "socket_id": socket_id,
-            "room_id": room_id,
-            "other_participants": [
-                {"socket_id": s, "user_id": self.connections[s]["user_id"]}
-                for s in other_sockets
-            ]
-        }
-    
-    async def unregister_connection(self, socket_id: str) -> None:
-        """Unregister a WebSocket connection."""
-        if socket_id in self.connections:
-            room_id = self.connections[socket_id]["room_id"]
-            del self.connections[socket_id]
-            
-            if room_id in self.rooms:
-                self.rooms[room_id].discard(socket_id)
-                if not self.rooms[room_id]:
-                    del self.rooms[room_id]
-    
-    async def route_signal(
-        self,
-        from_socket: str,
-        to_socket: str,
-        signal_type: str,
-        data: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Route a signaling message to the target socket."""
-        if from_socket not in self.connections:
-            raise ValueError("Sender not registered")
-        
-        if to_socket not in self.connections:
-            raise ValueError("Recipient not registered")
-        
-        message = {
-            "type": signal_type,
-            "from_socket": from_socket,
-            "from_user_id": self.connections[from_socket]["user_id"],
-            "data": data,
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
-        
-        return {
-            "status": "routed",
-            "to_socket": to_socket,
-            "message": message
-        }
-    
-    async def broadcast_to_room(
-        self,
-        room_id: str,
-        exclude_socket: str,
-        message_type: str,
-        data: Dict[str, Any]
-    ) -> List[str]:
-        """Broadcast a message to all participants in a room."""
-        if room_id not in self.rooms:
-            return []
-        
-        targets = [s for s in self.rooms[room_id] if s != exclude_socket]
-        return targets
-
-
 # Singleton instances
 _interview_service: Optional[VideoInterviewService] = None
-_signaling_server: Optional[WebRTCSignalingServer] = None
 
 
 def get_interview_service(db: Session) -> VideoInterviewService:
@@ -806,11 +731,3 @@ def get_interview_service(db: Session) -> VideoInterviewService:
     else:
         _interview_service.db = db
     return _interview_service
-
-
-def get_signaling_server() -> WebRTCSignalingServer:
-    """Get or create signaling server instance."""
-    global _signaling_server
-    if _signaling_server is None:
-        _signaling_server = WebRTCSignalingServer()
-    return _signaling_server
@@ -2,78 +2,58 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+from app.db.schema_registry import ensure_schema, register_schema
 from app.db.turso_http import execute_query
 from app.services.db_utils import get_val as _get_val
+from app.services.ledger import InsufficientFunds, get_ledger, wallet_account
+
+
+WALLET_DDL = [
+    """CREATE TABLE IF NOT EXISTS wallet_balances (
+        user_id INTEGER PRIMARY KEY,
+        available REAL DEFAULT 0,
+        pending REAL DEFAULT 0,
+        escrow REAL DEFAULT 0,
+        currency TEXT DEFAULT 'USD',
+        updated_at TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS wallet_transactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        type TEXT NOT NULL,
+        amount REAL NOT NULL,
+        currency TEXT DEFAULT 'USD',
+        status TEXT DEFAULT 'pending',
+        description TEXT,
+        reference_id TEXT,
+        metadata TEXT,
+        created_at TEXT,
+        completed_at TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_wallet_transactions_user_id ON wallet_transactions(user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_wallet_transactions_status ON wallet_transactions(status)",
+    "CREATE INDEX IF NOT EXISTS idx_wallet_transactions_user_status ON wallet_transactions(user_id, status)",
+    "CREATE INDEX IF NOT EXISTS idx_wallet_transactions_created ON wallet_transactions(created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_wallet_transactions_user_created ON wallet_transactions(user_id, created_at DESC)",
+    """CREATE TABLE IF NOT EXISTS payout_schedules (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER UNIQUE NOT NULL,
+        frequency TEXT DEFAULT 'weekly',
+        minimum_amount REAL DEFAULT 100,
+        destination_type TEXT,
+        destination_details TEXT,
+        is_active INTEGER DEFAULT 1,
+        next_payout_at TEXT,
+        created_at TEXT,
+        updated_at TEXT
+    )""",
+]
+register_schema("wallet", WALLET_DDL)
 
 
 def ensure_wallet_tables():
-    """Create wallet tables if they don't exist"""
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS wallet_balances (
-            user_id INTEGER PRIMARY KEY,
-            available REAL DEFAULT 0,
-            pending REAL DEFAULT 0,
-            escrow REAL DEFAULT 0,
-            currency TEXT DEFAULT 'USD',
-            updated_at TEXT
-        )
-    """)
-
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS wallet_transactions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            type TEXT NOT NULL,
-            amount REAL NOT NULL,
-            currency TEXT DEFAULT 'USD',
-            status TEXT DEFAULT 'pending',
-            description TEXT,
-            reference_id TEXT,
-            metadata TEXT,
-            created_at TEXT,
-            completed_at TEXT
-        )
-    """)
-
-    execute_query("""
-        CREATE INDEX IF NOT EXISTS idx_wallet_transactions_user_id 
-        ON wallet_transactions(user_id)
-    """)
-
-    execute_query("""
-        CREATE INDEX IF NOT EXISTS idx_wallet_transactions_status 
-        ON wallet_transactions(status)
-    """)
-
-    execute_query("""
-        CREATE INDEX IF NOT EXISTS idx_wallet_transactions_user_status 
-        ON wallet_transactions(user_id, status)
-    """)
-
-    execute_query("""
-        CREATE INDEX IF NOT EXISTS idx_wallet_transactions_created 
-        ON wallet_transactions(created_at DESC)
-    """)
-
-    execute_query("""
-        CREATE INDEX IF NOT EXISTS idx_wallet_transactions_user_created 
-        ON wallet_transactions(user_id, created_at DESC)
-    """)
-
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS payout_schedules (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER UNIQUE NOT NULL,
-            frequency TEXT DEFAULT 'weekly',
-            minimum_amount REAL DEFAULT 100,
-            destination_type TEXT,
-            destination_details TEXT,
-            is_active INTEGER DEFAULT 1,
-            next_payout_at TEXT,
-            created_at TEXT,
-            updated_at TEXT
-        )
-    """)
+    """Create wallet tables if this process has not yet (bootstrapped at startup)."""
+    ensure_schema("wallet")
 
 
 def get_or_create_balance(user_id: int) -> dict:
@@ -149,32 +129,36 @@ def get_transaction_history(user_id: int, skip: int, limit: int,
     return transactions
 
 
-def deduct_for_withdrawal(user_id: int, amount: float) -> bool:
-    """Deduct from available, add to pending for a withdrawal.
-    Returns True if deduction succeeded, False if insufficient balance (atomic check)."""
+def withdraw_to_pending(user_id: int, amount: float, currency: str,
+                        description: str, reference_id: str, metadata: str) -> bool:
+    """Move a withdrawal from available to pending and record it, in one ledger posting.
+    Returns False (and writes nothing) if the available balance is insufficient."""
     now = datetime.now(timezone.utc).isoformat()
-    result = execute_query(
-        "UPDATE wallet_balances SET available = available - ?, pending = pending + ?, updated_at = ? WHERE user_id = ? AND available >= ?",
-        [amount, amount, now, user_id, amount]
-    )
-    # Turso HTTP returns rows_affected for UPDATE statements
-    rows_affected = 0
-    if isinstance(result, dict):
-        rows_affected = result.get("rows_affected", 0)
-    elif isinstance(result, int):
-        rows_affected = result
-    return rows_affected > 0
+    try:
+        get_ledger().post(
+            "wallet_withdrawal",
+            [(wallet_account(user_id, "available"), -amount), (wallet_account(user_id, "pending"), amount)],
+            reference=reference_id,
+            after=[{
+                "q": """INSERT INTO wallet_transactions (user_id, type, amount, currency, status, description, reference_id, metadata, created_at)
+                        VALUES (?, 'withdrawal', ?, ?, 'processing', ?, ?, ?, ?)""",
+                "params": [user_id, amount, currency, description, reference_id, metadata, now],
+            }],
+        )
+    except InsufficientFunds:
+        return False
+    return True
 
 
 def create_transaction(user_id: int, tx_type: str, amount: float, currency: str,
-                       status: str, description: str, reference_id: str,
+                       tx_status: str, description: str, reference_id: str,
                        metadata: str):
     """Insert a wallet transaction record."""
     now = datetime.now(timezone.utc).isoformat()
     execute_query("""
         INSERT INTO wallet_transactions (user_id, type, amount, currency, status, description, reference_id, metadata, created_at)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, [user_id, tx_type, amount, currency, status, description, reference_id, metadata, now])
+    """, [user_id, tx_type, amount, currency, tx_status, description, reference_id, metadata, now])
 
 
 def get_wallet_analytics(user_id: int, start_date: str) -> dict:
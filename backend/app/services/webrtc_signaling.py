@@ -0,0 +1,407 @@
+# @AI-HINT: Push-based WebRTC signaling over the Socket.IO server - shared room registry in Turso, per-sender ordered delivery, coalesced ICE candidate trickle
+"""
+WebRTC Signaling - offers, answers and ICE candidates pushed over Socket.IO.
+
+Participants connect to the Socket.IO server of ``app.core.websocket``. They
+join an interview with ``webrtc_join {room_id, token}`` using the room
+access token from scheduling. Then they send
+``webrtc_signal {room_id, to_user_id, type, data}``. The recipient gets a
+``webrtc_signal`` event right away, with no polling.
+
+Delivery targets the Socket.IO room ``webrtc:<room_id>:<user_id>``. The
+sender's worker does not need to hold the recipient's connection. With a
+message queue configured on the Socket.IO server (see ``app.core.websocket``),
+the emit reaches whichever worker does. Room state lives in
+``SignalingRegistry`` (Turso), so any worker can authorize a join and list
+the other participants:
+
+- ``signaling_rooms``: who may join, with hashed access tokens.
+- ``signaling_participants``: who is connected, by Socket.IO sid.
+
+Ordering: each sender connection numbers its messages (``seq``) in the
+order they arrived. A single drain task per connection emits them in that
+order, so candidates never overtake the offer or answer they belong to.
+
+Coalescing: ICE candidates from one sender to one recipient wait up to
+``coalesce_ms`` and go out as a single ``ice-candidates`` message. Gathering
+bursts (host, srflx and relay candidates within a few ms) cost one emit,
+not one per candidate. An offer, an answer, an end-of-candidates marker or
+a full batch flushes the wait.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.db.schema_registry import ensure_schema, register_schema
+from app.db.turso_http import ResultSet, get_turso_http, to_str
+
+logger = logging.getLogger(__name__)
+
+SIGNAL_TYPES = ("offer", "answer", "ice-candidate", "end-of-candidates", "renegotiate", "bye")
+COALESCE_MS = 15.0
+MAX_BATCH = 16
+
+SIGNALING_DDL = [
+    """CREATE TABLE IF NOT EXISTS signaling_rooms (
+        room_id TEXT PRIMARY KEY,
+        client_id INTEGER NOT NULL,
+        freelancer_id INTEGER NOT NULL,
+        client_token_hash TEXT NOT NULL,
+        freelancer_token_hash TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        closed_at TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS signaling_participants (
+        room_id TEXT NOT NULL,
+        user_id INTEGER NOT NULL,
+        sid TEXT NOT NULL,
+        role TEXT NOT NULL,
+        joined_at TEXT NOT NULL,
+        PRIMARY KEY (room_id, user_id)
+    )""",
+]
+
+register_schema("webrtc_signaling", SIGNALING_DDL)
+
+
+def _token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# ---------------------------------------------------------------------------
+# Shared room registry
+# ---------------------------------------------------------------------------
+
+class SignalingRegistry:
+    """Room access and participant presence shared by every worker."""
+
+    def __init__(self, backend_factory: Optional[Callable[[], Any]] = None):
+        self._backend_factory = backend_factory or get_turso_http
+
+    def _backend(self):
+        backend = self._backend_factory()
+        ensure_schema("webrtc_signaling", backend=backend)
+        return backend
+
+    def _read(self, sql: str, params: List[Any]) -> ResultSet:
+        # Batches bypass the per-worker SELECT cache; another worker may have just written
+        return ResultSet.from_result(self._backend().execute_many([{"q": sql, "params": params}])[0])
+
+    def open_room(self, room_id: str, client_id: int, freelancer_id: int, tokens: Dict[str, str]) -> None:
+        self._backend().execute(
+            "INSERT OR REPLACE INTO signaling_rooms (room_id, client_id, freelancer_id, client_token_hash, "
+            "freelancer_token_hash, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            [room_id, client_id, freelancer_id, _token_hash(tokens["client"]),
+             _token_hash(tokens["freelancer"]), _now()],
+        )
+
+    def close_room(self, room_id: str) -> None:
+        self._backend().execute_many([
+            {"q": "UPDATE signaling_rooms SET closed_at = ? WHERE room_id = ?", "params": [_now(), room_id]},
+            {"q": "DELETE FROM signaling_participants WHERE room_id = ?", "params": [room_id]},
+        ])
+
+    def authorize(self, room_id: str, token: str) -> Optional[Tuple[int, str]]:
+        """``(user_id, role)`` the access token grants in an open room, else None."""
+        room = self._read(
+            "SELECT client_id, freelancer_id, client_token_hash, freelancer_token_hash, closed_at "
+            "FROM signaling_rooms WHERE room_id = ?", [room_id]
+        ).first()
+        if not room or room["closed_at"] or not token:
+            return None
+        digest = _token_hash(token)
+        if digest == to_str(room["client_token_hash"]):
+            return int(room["client_id"]), "client"
+        if digest == to_str(room["freelancer_token_hash"]):
+            return int(room["freelancer_id"]), "freelancer"
+        return None
+
+    def join(self, room_id: str, user_id: int, role: str, sid: str) -> List[Dict[str, Any]]:
+        """Record the connection (replacing an older one of the same user); the other participants."""
+        results = self._backend().execute_many([
+            {
+                "q": "INSERT OR REPLACE INTO signaling_participants (room_id, user_id, sid, role, joined_at) "
+                     "VALUES (?, ?, ?, ?, ?)",
+                "params": [room_id, user_id, sid, role, _now()],
+            },
+            {
+                "q": "SELECT user_id, role, joined_at FROM signaling_participants WHERE room_id = ? AND user_id != ?",
+                "params": [room_id, user_id],
+            },
+        ])
+        return [
+            {"user_id": int(r["user_id"]), "role": to_str(r["role"]), "joined_at": to_str(r["joined_at"])}
+            for r in ResultSet.from_result(results[1]).dicts()
+        ]
+
+    def leave(self, room_id: str, user_id: int, sid: str) -> None:
+        # Only this connection: a reconnect on another worker may already have replaced it
+        self._backend().execute(
+            "DELETE FROM signaling_participants WHERE room_id = ? AND user_id = ? AND sid = ?",
+            [room_id, user_id, sid],
+        )
+
+    def is_connected(self, room_id: str, user_id: int) -> bool:
+        return self._read(
+            "SELECT 1 FROM signaling_participants WHERE room_id = ? AND user_id = ?", [room_id, user_id]
+        ).first() is not None
+
+
+# ---------------------------------------------------------------------------
+# Relay
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _Connection:
+    sid: str
+    room_id: str
+    user_id: int
+    role: str
+    seq: int = 0
+    outbox: Deque[Tuple[str, Dict[str, Any]]] = field(default_factory=deque)
+    candidates: Dict[int, List[Any]] = field(default_factory=dict)
+    timers: Dict[int, asyncio.TimerHandle] = field(default_factory=dict)
+    draining: bool = False
+
+
+def user_room(room_id: str, user_id: int) -> str:
+    return f"webrtc:{room_id}:{user_id}"
+
+
+def interview_room(room_id: str) -> str:
+    return f"webrtc:{room_id}"
+
+
+class WebRTCSignalingServer:
+    """
+    WebRTC signaling server for coordinating peer connections.
+
+    Relays SDP offer/answer exchange and trickled ICE candidates between the
+    participants of an interview over Socket.IO.
+    """
+
+    def __init__(self, sio=None, registry: Optional[SignalingRegistry] = None,
+                 coalesce_ms: float = COALESCE_MS, max_batch: int = MAX_BATCH):
+        self.sio = sio
+        self.registry = registry or SignalingRegistry()
+        self.coalesce_ms = coalesce_ms
+        self.max_batch = max_batch
+        self.connections: Dict[str, _Connection] = {}
+        # Plain (non Socket.IO) websockets joined on this worker: (room_id, user_id) -> sid -> send
+        self._local: Dict[Tuple[str, int], Dict[str, Callable[[Dict[str, Any]], Awaitable[None]]]] = {}
+        self.stats = {"signals": 0, "candidates": 0, "emits": 0}
+
+    def attach(self, manager) -> None:
+        """Handle the ``webrtc_*`` events of a ``WebSocketManager``'s Socket.IO server."""
+        self.sio = manager.sio
+
+        async def webrtc_join(sid, data):
+            try:
+                return {"ok": True, **await self.join(sid, data.get("room_id"), data.get("token"))}
+            except ValueError as e:
+                return {"ok": False, "error": str(e)}
+
+        async def webrtc_signal(sid, data):
+            try:
+                seq = self.signal(sid, data.get("room_id"), data.get("to_user_id"), data.get("type"), data.get("data"))
+                return {"ok": True, "seq": seq}
+            except ValueError as e:
+                return {"ok": False, "error": str(e)}
+
+        async def webrtc_leave(sid, data=None):
+            await self.leave(sid)
+            return {"ok": True}
+
+        for handler in (webrtc_join, webrtc_signal, webrtc_leave):
+            self.sio.on(handler.__name__, handler)
+        manager.on_disconnect(self.leave)
+
+    # -- membership ---------------------------------------------------------
+
+    async def join(self, sid: str, room_id: Optional[str], token: Optional[str],
+                   send: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None) -> Dict[str, Any]:
+        """
+        Join ``sid`` to an interview's signaling. ``send`` delivers to a plain
+        websocket instead of a Socket.IO connection (this worker only).
+        """
+        if not room_id or not token:
+            raise ValueError("room_id and token are required")
+        access = await asyncio.to_thread(self.registry.authorize, room_id, token)
+        if access is None:
+            raise ValueError("Invalid room or access token")
+        user_id, role = access
+        if sid in self.connections:
+            await self.leave(sid)
+        others = await asyncio.to_thread(self.registry.join, room_id, user_id, role, sid)
+        self.connections[sid] = _Connection(sid, room_id, user_id, role)
+        if send is not None:
+            self._local.setdefault((room_id, user_id), {})[sid] = send
+        else:
+            await self.sio.enter_room(sid, interview_room(room_id))
+            await self.sio.enter_room(sid, user_room(room_id, user_id))
+        await self._emit("webrtc_peer_joined", {"room_id": room_id, "user_id": user_id, "role": role},
+                         [o["user_id"] for o in others], room_id)
+        return {"room_id": room_id, "user_id": user_id, "role": role, "other_participants": others}
+
+    async def leave(self, sid: str) -> None:
+        connection = self.connections.pop(sid, None)
+        if connection is None:
+            return
+        for timer in connection.timers.values():
+            timer.cancel()
+        local = self._local.get((connection.room_id, connection.user_id))
+        if local is not None:
+            local.pop(sid, None)
+            if not local:
+                del self._local[(connection.room_id, connection.user_id)]
+        try:
+            await asyncio.to_thread(self.registry.leave, connection.room_id, connection.user_id, sid)
+        except Exception as e:
+            logger.warning(f"webrtc.leave_failed room={connection.room_id}: {e}")
+        if self.sio is not None and local is None:
+            await self.sio.leave_room(sid, interview_room(connection.room_id))
+            await self.sio.leave_room(sid, user_room(connection.room_id, connection.user_id))
+        await self._broadcast("webrtc_peer_left", {"room_id": connection.room_id, "user_id": connection.user_id})
+
+    # -- signals ------------------------------------------------------------
+
+    def signal(self, sid: str, room_id: Optional[str], to_user_id: Any, signal_type: Optional[str],
+               data: Any) -> Optional[int]:
+        """
+        Queue one signal from a joined connection; returns its sequence number
+        (None for a candidate waiting to be coalesced).
+
+        Synchronous on purpose: Socket.IO runs each event in its own task, and
+        numbering before the first ``await`` keeps arrival order.
+        """
+        connection = self.connections.get(sid)
+        if connection is None or connection.room_id != room_id:
+            raise ValueError("Join the room before signaling")
+        if signal_type not in SIGNAL_TYPES:
+            raise ValueError(f"Unknown signal type: {signal_type}")
+        try:
+            to_user_id = int(to_user_id)
+        except (TypeError, ValueError):
+            raise ValueError("to_user_id is required")
+        self.stats["signals"] += 1
+
+        if signal_type == "ice-candidate" and data is not None:
+            self.stats["candidates"] += 1
+            batch = connection.candidates.setdefault(to_user_id, [])
+            batch.append(data)
+            if len(batch) >= self.max_batch:
+                self._flush_candidates(connection, to_user_id)
+            elif to_user_id not in connection.timers:
+                connection.timers[to_user_id] = asyncio.get_running_loop().call_later(
+                    self.coalesce_ms / 1000, self._flush_candidates, connection, to_user_id
+                )
+            return None
+
+        # Candidates gathered so far go first (a null candidate ends gathering)
+        self._flush_candidates(connection, to_user_id)
+        return self._enqueue(connection, to_user_id, signal_type, data)
+
+    def _flush_candidates(self, connection: _Connection, to_user_id: int) -> None:
+        timer = connection.timers.pop(to_user_id, None)
+        if timer is not None:
+            timer.cancel()
+        batch = connection.candidates.pop(to_user_id, None)
+        if batch and connection.sid in self.connections:
+            self._enqueue(connection, to_user_id, "ice-candidates", {"candidates": batch})
+
+    def _enqueue(self, connection: _Connection, to_user_id: int, signal_type: str, data: Any) -> int:
+        connection.seq += 1
+        connection.outbox.append((user_room(connection.room_id, to_user_id), {
+            "room_id": connection.room_id,
+            "from_user_id": connection.user_id,
+            "to_user_id": to_user_id,
+            "seq": connection.seq,
+            "type": signal_type,
+            "data": data,
+            "sent_at": time.time(),
+        }))
+        if not connection.draining:
+            connection.draining = True
+            asyncio.get_running_loop().create_task(self._drain(connection))
+        return connection.seq
+
+    async def _drain(self, connection: _Connection) -> None:
+        try:
+            while connection.outbox:
+                target, message = connection.outbox.popleft()
+                await self._emit("webrtc_signal", message, [message["to_user_id"]], connection.room_id, target)
+        except Exception as e:
+            logger.error(f"webrtc.drain_failed room={connection.room_id}: {e}", exc_info=True)
+        finally:
+            connection.draining = False
+
+    async def flush(self, sid: str) -> None:
+        """Send everything queued for a connection now (candidate waits included)."""
+        connection = self.connections.get(sid)
+        if connection is None:
+            return
+        for to_user_id in list(connection.candidates):
+            self._flush_candidates(connection, to_user_id)
+        while connection.draining or connection.outbox:
+            await asyncio.sleep(0)
+
+    async def push(self, room_id: str, from_user_id: int, to_user_id: int, signal_type: str,
+                   data: Any) -> bool:
+        """Deliver a signal that arrived over REST; False when the recipient has no signaling connection."""
+        if not await asyncio.to_thread(self.registry.is_connected, room_id, to_user_id):
+            return False
+        await self._emit("webrtc_signal", {
+            "room_id": room_id, "from_user_id": from_user_id, "to_user_id": to_user_id,
+            "seq": None, "type": signal_type, "data": data, "sent_at": time.time(),
+        }, [to_user_id], room_id)
+        return True
+
+    # -- delivery -----------------------------------------------------------
+
+    async def _emit(self, event: str, message: Dict[str, Any], user_ids: List[int], room_id: str,
+                    target: Optional[str] = None) -> None:
+        for user_id in user_ids:
+            local = self._local.get((room_id, user_id))
+            if local:
+                for send in list(local.values()):
+                    await send({"event": event, **message})
+            elif self.sio is not None:
+                await self.sio.emit(event, message, room=target or user_room(room_id, user_id))
+            self.stats["emits"] += 1
+
+    async def _broadcast(self, event: str, message: Dict[str, Any]) -> None:
+        room_id = message["room_id"]
+        for (local_room, user_id), sends in list(self._local.items()):
+            if local_room == room_id and user_id != message["user_id"]:
+                for send in list(sends.values()):
+                    await send({"event": event, **message})
+        if self.sio is not None:
+            await self.sio.emit(event, message, room=interview_room(room_id))
+
+
+_server: Optional[WebRTCSignalingServer] = None
+_server_lock = threading.Lock()
+
+
+def get_signaling_server() -> WebRTCSignalingServer:
+    """Get or create the signaling server, attached to the app's Socket.IO manager."""
+    global _server
+    if _server is None:
+        with _server_lock:
+            if _server is None:
+                from app.core.websocket import websocket_manager
+                server = WebRTCSignalingServer()
+                server.attach(websocket_manager)
+                _server = server
+    return _server
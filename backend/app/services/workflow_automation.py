@@ -9,6 +9,7 @@ import logging
 import uuid
 
 from app.models.user import User
+from app.services.workflow_engine import GLOBAL_SCOPE, CompiledWorkflow, WorkflowEngine, get_workflow_engine
 
 logger = logging.getLogger(__name__)
 
@@ -234,8 +235,9 @@ WORKFLOW_TEMPLATES = [
 class WorkflowAutomationService:
     """Service for workflow automation"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, engine: Optional["WorkflowEngine"] = None):
         self.db = db
+        self.engine = engine if engine is not None else get_workflow_engine()
     
     # Workflow Templates
     async def get_templates(
@@ -272,24 +274,35 @@ class WorkflowAutomationService:
         description: Optional[str],
         trigger: Dict[str, Any],
         conditions: List[Dict[str, Any]],
-        actions: List[Dict[str, Any]]
+        actions: List[Dict[str, Any]],
+        is_global: bool = False
     ) -> Dict[str, Any]:
-        """Create a new workflow"""
+        """Create a new workflow (compiled and validated on save).
+
+        Global workflows (admins only) run on every user's events, not just the owner's.
+        """
+        now = datetime.now(timezone.utc).isoformat()
         workflow = {
             "id": str(uuid.uuid4()),
             "user_id": user_id,
             "name": name,
             "description": description,
             "status": WorkflowStatus.DRAFT.value,
-            "trigger": trigger,
-            "conditions": conditions,
-            "actions": actions,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "scope": GLOBAL_SCOPE if is_global else "user",
+            "trigger": _plain(trigger),
+            "conditions": _plain(conditions),
+            "actions": _plain(actions),
+            "created_at": now,
+            "updated_at": now,
             "execution_count": 0,
             "last_executed_at": None
         }
         
+        try:
+            self.engine.save(workflow)
+        except ValueError as e:
+            return {"error": str(e)}
+        
         return {"workflow": workflow}
     
     async def create_from_template(
@@ -322,11 +335,14 @@ class WorkflowAutomationService:
         limit: int = 50
     ) -> List[Dict[str, Any]]:
         """Get user's workflows"""
-        # Placeholder - would query workflow storage
+        workflows = self.engine.list_for_user(user_id)
+        if status_filter:
+            workflows = [w for w in workflows if w["status"] == status_filter.value]
+        workflows.sort(key=lambda w: w["created_at"], reverse=True)
+        
         return {
-            "workflows": [],
-            "total": 0,
-            "message": "Workflow storage not yet implemented"
+            "workflows": workflows[:limit],
+            "total": len(workflows)
         }
     
     async def get_workflow(
@@ -335,7 +351,10 @@ class WorkflowAutomationService:
         workflow_id: str
     ) -> Optional[Dict[str, Any]]:
         """Get a specific workflow"""
-        return {"error": "Workflow not found"}
+        workflow = self.engine.get(workflow_id)
+        if not workflow or workflow["user_id"] != user_id:
+            return {"error": "Workflow not found"}
+        return workflow
     
     async def update_workflow(
         self,
@@ -343,10 +362,26 @@ class WorkflowAutomationService:
         workflow_id: str,
         updates: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Update a workflow"""
+        """Update a workflow (recompiled before it replaces the old rules)"""
+        workflow = await self.get_workflow(user_id, workflow_id)
+        if "error" in workflow:
+            return workflow
+        
+        updated = dict(workflow)
+        for key in ("name", "description", "trigger", "conditions", "actions"):
+            if key in updates:
+                updated[key] = _plain(updates[key])
+        updated["updated_at"] = datetime.now(timezone.utc).isoformat()
+        
+        try:
+            self.engine.save(updated)
+        except ValueError as e:
+            return {"error": str(e)}
+        
         return {
             "message": "Workflow updated",
-            "workflow_id": workflow_id
+            "workflow_id": workflow_id,
+            "workflow": updated
         }
     
     async def delete_workflow(
@@ -355,6 +390,11 @@ class WorkflowAutomationService:
         workflow_id: str
     ) -> Dict[str, Any]:
         """Delete a workflow"""
+        workflow = await self.get_workflow(user_id, workflow_id)
+        if "error" in workflow:
+            return workflow
+        
+        self.engine.remove(workflow_id)
         return {
             "message": "Workflow deleted",
             "workflow_id": workflow_id
@@ -366,11 +406,7 @@ class WorkflowAutomationService:
         workflow_id: str
     ) -> Dict[str, Any]:
         """Activate a workflow"""
-        return {
-            "message": "Workflow activated",
-            "workflow_id": workflow_id,
-            "status": WorkflowStatus.ACTIVE.value
-        }
+        return await self._set_status(user_id, workflow_id, WorkflowStatus.ACTIVE, "Workflow activated")
     
     async def pause_workflow(
         self,
@@ -378,10 +414,28 @@ class WorkflowAutomationService:
         workflow_id: str
     ) -> Dict[str, Any]:
         """Pause a workflow"""
+        return await self._set_status(user_id, workflow_id, WorkflowStatus.PAUSED, "Workflow paused")
+    
+    async def _set_status(
+        self,
+        user_id: int,
+        workflow_id: str,
+        new_status: WorkflowStatus,
+        message: str
+    ) -> Dict[str, Any]:
+        workflow = await self.get_workflow(user_id, workflow_id)
+        if "error" in workflow:
+            return workflow
+        
+        updated = dict(workflow)
+        updated["status"] = new_status.value
+        updated["updated_at"] = datetime.now(timezone.utc).isoformat()
+        self.engine.save(updated)
+        
         return {
-            "message": "Workflow paused",
+            "message": message,
             "workflow_id": workflow_id,
-            "status": WorkflowStatus.PAUSED.value
+            "status": new_status.value
         }
     
     # Trigger Handling
@@ -390,13 +444,18 @@ class WorkflowAutomationService:
         trigger_type: TriggerType,
         context: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Process a trigger event"""
-        # Find matching workflows and execute them
+        """Process a trigger event against the workflows subscribed to it (see ``fire_trigger``)"""
+        matched = self.engine.match(trigger_type, context)
+        executions = [
+            self.engine.dispatch(workflow, trigger_type, context)
+            for workflow in matched
+        ]
+        
         return {
             "trigger_type": trigger_type.value,
-            "workflows_matched": 0,
-            "workflows_executed": 0,
-            "message": "Trigger processing not yet implemented"
+            "workflows_matched": len(matched),
+            "workflows_executed": len(executions),
+            "execution_ids": [e["id"] for e in executions]
         }
     
     # Execution History
@@ -407,10 +466,10 @@ class WorkflowAutomationService:
         limit: int = 50
     ) -> List[Dict[str, Any]]:
         """Get workflow execution history"""
+        executions = self.engine.executions_for_user(user_id, workflow_id, limit)
         return {
-            "executions": [],
-            "total": 0,
-            "message": "Execution history not yet implemented"
+            "executions": executions,
+            "total": len(executions)
         }
     
     async def get_execution_details(
@@ -419,7 +478,10 @@ class WorkflowAutomationService:
         execution_id: str
     ) -> Optional[Dict[str, Any]]:
         """Get details of a workflow execution"""
-        return {"error": "Execution not found"}
+        execution = self.engine.get_execution(user_id, execution_id)
+        if not execution:
+            return {"error": "Execution not found"}
+        return execution
     
     # Manual Execution
     async def execute_workflow(
@@ -428,12 +490,23 @@ class WorkflowAutomationService:
         workflow_id: str,
         test_data: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        """Manually execute a workflow"""
+        """Manually execute an active workflow (conditions are reported, not enforced)"""
+        workflow = await self.get_workflow(user_id, workflow_id)
+        if "error" in workflow:
+            return workflow
+        if workflow["status"] != WorkflowStatus.ACTIVE.value:
+            return {"error": f"Workflow is {workflow['status']}; activate it before running it"}
+        
+        compiled = CompiledWorkflow(workflow)
+        context = dict(test_data or {})
+        context.setdefault("user_id", user_id)
+        
+        execution = self.engine.dispatch(compiled, compiled.trigger_type, context)
         return {
-            "execution_id": str(uuid.uuid4()),
+            "execution_id": execution["id"],
             "workflow_id": workflow_id,
-            "status": ExecutionStatus.PENDING.value,
-            "message": "Manual execution not yet implemented"
+            "status": execution["status"],
+            "conditions_met": compiled.predicate(context)
         }
     
     # Trigger Types
@@ -508,18 +581,47 @@ class WorkflowAutomationService:
         period_days: int = 30
     ) -> Dict[str, Any]:
         """Get workflow statistics"""
+        since = (datetime.now(timezone.utc) - timedelta(days=period_days)).isoformat()
+        workflows = self.engine.list_for_user(user_id)
+        executions = [
+            e for e in self.engine.executions_for_user(user_id, limit=1000)
+            if e["started_at"] >= since
+        ]
+        
         return {
             "period_days": period_days,
-            "total_workflows": 0,
-            "active_workflows": 0,
-            "total_executions": 0,
-            "successful_executions": 0,
-            "failed_executions": 0,
-            "actions_performed": 0,
+            "total_workflows": len(workflows),
+            "active_workflows": sum(1 for w in workflows if w["status"] == WorkflowStatus.ACTIVE.value),
+            "total_executions": len(executions),
+            "successful_executions": sum(1 for e in executions if e["status"] == ExecutionStatus.COMPLETED.value),
+            "failed_executions": sum(1 for e in executions if e["status"] == ExecutionStatus.FAILED.value),
+            "actions_performed": sum(len(e["action_results"]) for e in executions),
             "time_saved_hours": 0.0
         }
 
 
+def _plain(value: Any) -> Any:
+    """Strip enums out of request payloads so definitions serialize cleanly."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+def fire_trigger(trigger_type: TriggerType, **context: Any) -> None:
+    """Run the workflows subscribed to a domain event; never fails the write that caused it."""
+    try:
+        engine = get_workflow_engine()
+        if not engine.has_subscribers(trigger_type):
+            return
+        engine.submit(WorkflowAutomationService(None, engine).process_trigger(trigger_type, context))
+    except Exception as e:
+        logger.warning(f"workflow.trigger_failed trigger={trigger_type.value}: {e}")
+
+
 def get_workflow_automation_service(db: Session) -> WorkflowAutomationService:
     """Get workflow automation service instance"""
     return WorkflowAutomationService(db)
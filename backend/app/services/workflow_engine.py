@@ -0,0 +1,686 @@
+# @AI-HINT: Compiled, trigger-indexed rules engine backing WorkflowAutomationService
+"""
+Workflow Engine - compiled trigger matching and async action execution.
+
+Workflow definitions are compiled once (on create/update/load) into a single
+predicate closure built from their ``ConditionOperator`` conditions. Active
+workflows are indexed by ``TriggerType`` and owner, so an event is evaluated
+only against the rules subscribed to that trigger (and, when the event names
+a user, only that user's rules plus the global ones admins create).
+
+Matched workflows run their actions as background tasks. Each owner has its
+own semaphore so one noisy account cannot starve the rest; actions that only
+wait (``DELAY``) give their slot back while they wait. Finished
+executions are persisted to ``workflow_executions``. An action type without
+a registered handler fails the execution rather than being skipped.
+
+Domain events arrive through ``submit`` from request threads; it hands them
+to the server's event loop (``bind_loop``) where the actions run.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.db.schema_registry import ensure_schema, register_schema
+from app.db.turso_http import cell_value, get_turso_http
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENT_PER_USER = 4
+MAX_HISTORY_IN_MEMORY = 1000
+GLOBAL_SCOPE = "global"  # workflow["scope"] of admin rules that apply to every user's events
+
+WORKFLOW_DDL = [
+    """CREATE TABLE IF NOT EXISTS workflows (
+        id TEXT PRIMARY KEY,
+        user_id INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        description TEXT,
+        status TEXT NOT NULL DEFAULT 'draft',
+        trigger_type TEXT NOT NULL,
+        definition TEXT NOT NULL,
+        execution_count INTEGER DEFAULT 0,
+        last_executed_at TEXT,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_workflows_user ON workflows(user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_workflows_status_trigger ON workflows(status, trigger_type)",
+    """CREATE TABLE IF NOT EXISTS workflow_executions (
+        id TEXT PRIMARY KEY,
+        workflow_id TEXT NOT NULL,
+        user_id INTEGER NOT NULL,
+        trigger_type TEXT,
+        status TEXT NOT NULL,
+        context TEXT,
+        action_results TEXT,
+        error TEXT,
+        started_at TEXT NOT NULL,
+        completed_at TEXT,
+        duration_ms INTEGER
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_workflow_executions_user ON workflow_executions(user_id, started_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_workflow_executions_workflow ON workflow_executions(workflow_id, started_at DESC)",
+]
+register_schema("workflows", WORKFLOW_DDL)
+
+_PLACEHOLDER = re.compile(r"\{\{\s*([\w.]+)\s*\}\}")
+_MISSING = object()
+
+Predicate = Callable[[Dict[str, Any]], bool]
+ActionHandler = Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Any]]
+
+
+# ============================================================================
+# Compilation
+# ============================================================================
+
+def _compile_getter(path: str) -> Callable[[Dict[str, Any]], Any]:
+    """Compile a dotted field path into a context lookup."""
+    parts = path.split(".")
+    if len(parts) == 1:
+        key = parts[0]
+        return lambda ctx: ctx.get(key, _MISSING)
+
+    def getter(ctx: Dict[str, Any]) -> Any:
+        value: Any = ctx
+        for part in parts:
+            if not isinstance(value, dict):
+                return _MISSING
+            value = value.get(part, _MISSING)
+            if value is _MISSING:
+                return _MISSING
+        return value
+    return getter
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def compile_condition(condition: Dict[str, Any]) -> Predicate:
+    """Compile one ``{field, operator, value}`` condition into a predicate."""
+    from app.services.workflow_automation import ConditionOperator
+
+    field = condition.get("field")
+    if not field:
+        raise ValueError("Condition is missing 'field'")
+    try:
+        op = ConditionOperator(condition.get("operator"))
+    except ValueError:
+        raise ValueError(f"Unknown condition operator: {condition.get('operator')}")
+    expected = condition.get("value")
+    get = _compile_getter(field)
+
+    if op in (ConditionOperator.EQUALS, ConditionOperator.NOT_EQUALS):
+        expected_str = str(expected)
+        negate = op == ConditionOperator.NOT_EQUALS
+
+        def pred(ctx):
+            actual = get(ctx)
+            return (actual == expected or str(actual) == expected_str) != negate
+        return pred
+
+    if op in (ConditionOperator.GREATER_THAN, ConditionOperator.LESS_THAN):
+        threshold = _to_float(expected)
+        if threshold is None:
+            raise ValueError(f"Condition on '{field}' needs a numeric value")
+        if op == ConditionOperator.GREATER_THAN:
+            def pred(ctx):
+                actual = _to_float(get(ctx))
+                return actual is not None and actual > threshold
+        else:
+            def pred(ctx):
+                actual = _to_float(get(ctx))
+                return actual is not None and actual < threshold
+        return pred
+
+    if op in (ConditionOperator.CONTAINS, ConditionOperator.NOT_CONTAINS):
+        needle = str(expected).lower()
+        negate = op == ConditionOperator.NOT_CONTAINS
+
+        def pred(ctx):
+            actual = get(ctx)
+            if isinstance(actual, (list, tuple, set)):
+                found = expected in actual
+            elif actual is _MISSING or actual is None:
+                found = False
+            else:
+                found = needle in str(actual).lower()
+            return found != negate
+        return pred
+
+    if op in (ConditionOperator.IS_EMPTY, ConditionOperator.IS_NOT_EMPTY):
+        negate = op == ConditionOperator.IS_NOT_EMPTY
+
+        def pred(ctx):
+            actual = get(ctx)
+            empty = actual is _MISSING or actual is None or actual == "" or actual == [] or actual == {}
+            return empty != negate
+        return pred
+
+    # IN_LIST / NOT_IN_LIST
+    if not isinstance(expected, (list, tuple, set)):
+        raise ValueError(f"Condition on '{field}' needs a list value")
+    members = frozenset(str(v) for v in expected)
+    negate = op == ConditionOperator.NOT_IN_LIST
+
+    def pred(ctx):
+        actual = get(ctx)
+        return (actual is not _MISSING and str(actual) in members) != negate
+    return pred
+
+
+def compile_conditions(conditions: List[Dict[str, Any]]) -> Predicate:
+    """AND together compiled conditions into one closure."""
+    preds = [compile_condition(c) for c in conditions]
+    if not preds:
+        return lambda ctx: True
+    if len(preds) == 1:
+        return preds[0]
+    preds = tuple(preds)
+
+    def pred(ctx):
+        for p in preds:
+            if not p(ctx):
+                return False
+        return True
+    return pred
+
+
+def render_value(value: Any, context: Dict[str, Any]) -> Any:
+    """Substitute ``{{field}}`` placeholders in strings (recursively)."""
+    if isinstance(value, str):
+        if "{{" not in value:
+            return value
+
+        def substitute(match):
+            found = _compile_getter(match.group(1))(context)
+            return "" if found is _MISSING else str(found)
+        return _PLACEHOLDER.sub(substitute, value)
+    if isinstance(value, dict):
+        return {k: render_value(v, context) for k, v in value.items()}
+    if isinstance(value, list):
+        return [render_value(v, context) for v in value]
+    return value
+
+
+class CompiledWorkflow:
+    """Immutable, pre-compiled view of a workflow definition."""
+
+    __slots__ = ("id", "user_id", "is_global", "trigger_type", "trigger_config", "predicate", "actions",
+                 "definition")
+
+    def __init__(self, workflow: Dict[str, Any]):
+        from app.services.workflow_automation import ActionType, TriggerType
+
+        trigger = workflow.get("trigger") or {}
+        self.id = workflow["id"]
+        self.user_id = workflow["user_id"]
+        self.is_global = workflow.get("scope") == GLOBAL_SCOPE
+        self.trigger_type = TriggerType(trigger.get("type"))
+        self.trigger_config = trigger.get("config") or {}
+        self.predicate = compile_conditions(workflow.get("conditions") or [])
+        self.actions = [
+            (ActionType(a.get("type")), a.get("config") or {})
+            for a in workflow.get("actions") or []
+        ]
+        self.definition = workflow
+
+
+# ============================================================================
+# Engine
+# ============================================================================
+
+class WorkflowEngine:
+    """
+    Process-wide registry of compiled workflows plus the action runner.
+
+    The backend object needs TursoHTTP's ``execute``/``execute_many``
+    interface; it is injected so tests and benchmarks can run offline.
+    """
+
+    def __init__(
+        self,
+        backend_factory: Optional[Callable[[], Any]] = None,
+        max_concurrent_per_user: int = MAX_CONCURRENT_PER_USER,
+        persist: bool = True,
+    ):
+        self._backend_factory = backend_factory or get_turso_http
+        self.max_concurrent_per_user = max_concurrent_per_user
+        self.persist = persist
+
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._workflows: Dict[str, Dict[str, Any]] = {}                 # id -> stored workflow
+        self._compiled: Dict[str, CompiledWorkflow] = {}               # id -> compiled (active only)
+        # trigger -> owner (None for global workflows) -> id -> compiled
+        self._by_trigger: Dict[Any, Dict[Optional[int], Dict[str, CompiledWorkflow]]] = defaultdict(
+            lambda: defaultdict(dict))
+
+        self._handlers: Dict[Any, ActionHandler] = {}
+        self._waiting_actions: set = set()  # action types run without holding the owner's slot
+        self._user_semaphores: Dict[int, asyncio.Semaphore] = {}
+        self._tasks: set = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._executions: Dict[str, Dict[str, Any]] = {}
+        self._user_executions: Dict[int, List[str]] = defaultdict(list)
+        self._register_default_handlers()
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def ensure_loaded(self) -> None:
+        """Load stored workflows once and compile the active ones."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not self.persist:
+                return
+            try:
+                backend = self._backend_factory()
+                ensure_schema("workflows", backend=backend)
+                result = backend.execute(
+                    "SELECT id, user_id, name, description, status, definition, execution_count, "
+                    "last_executed_at, created_at, updated_at FROM workflows", []
+                )
+                for row in result.get("rows", []):
+                    values = [cell_value(v) for v in row]
+                    workflow = json.loads(values[5])
+                    workflow.update({
+                        "id": values[0], "user_id": int(values[1]), "name": values[2],
+                        "description": values[3], "status": values[4],
+                        "execution_count": int(values[6] or 0), "last_executed_at": values[7],
+                        "created_at": values[8], "updated_at": values[9],
+                    })
+                    self._put(workflow)
+                logger.info(f"Workflow engine loaded {len(self._workflows)} workflows "
+                            f"({len(self._compiled)} active)")
+            except Exception as e:
+                logger.warning(f"Workflow engine load failed, starting empty: {e}")
+
+    def _write(self, statements: List[Dict[str, Any]]) -> None:
+        if not self.persist:
+            return
+        try:
+            self._backend_factory().execute_many(statements)
+        except Exception as e:
+            logger.error(f"Workflow engine write failed: {e}")
+
+    def _upsert_statement(self, workflow: Dict[str, Any]) -> Dict[str, Any]:
+        definition = {k: workflow[k] for k in ("trigger", "conditions", "actions")}
+        if workflow.get("scope"):
+            definition["scope"] = workflow["scope"]
+        return {
+            "q": "INSERT OR REPLACE INTO workflows (id, user_id, name, description, status, trigger_type, "
+                 "definition, execution_count, last_executed_at, created_at, updated_at) "
+                 "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            "params": [
+                workflow["id"], workflow["user_id"], workflow["name"], workflow.get("description"),
+                workflow["status"], _trigger_value(workflow), json.dumps(definition, default=_enum_value),
+                workflow.get("execution_count", 0), workflow.get("last_executed_at"),
+                workflow["created_at"], workflow["updated_at"],
+            ],
+        }
+
+    # ------------------------------------------------------------------
+    # Registry
+    # ------------------------------------------------------------------
+
+    def _put(self, workflow: Dict[str, Any]) -> None:
+        """Store a workflow and (re)index it if active. Raises ValueError if invalid."""
+        from app.services.workflow_automation import WorkflowStatus
+
+        compiled = CompiledWorkflow(workflow)  # validate before touching the indexes
+        with self._lock:
+            self._unindex(workflow["id"])
+            self._workflows[workflow["id"]] = workflow
+            if workflow["status"] == WorkflowStatus.ACTIVE.value:
+                self._compiled[workflow["id"]] = compiled
+                self._by_trigger[compiled.trigger_type][_owner_key(compiled)][compiled.id] = compiled
+
+    def _unindex(self, workflow_id: str) -> None:
+        compiled = self._compiled.pop(workflow_id, None)
+        if compiled is None:
+            return
+        owners = self._by_trigger[compiled.trigger_type]
+        owner = _owner_key(compiled)
+        owners[owner].pop(workflow_id, None)
+        if not owners[owner]:
+            del owners[owner]
+
+    def save(self, workflow: Dict[str, Any]) -> Dict[str, Any]:
+        """Compile, index and persist a workflow definition."""
+        self.ensure_loaded()
+        self._put(workflow)
+        if self.persist:
+            self._write([self._upsert_statement(workflow)])
+        return workflow
+
+    def remove(self, workflow_id: str) -> bool:
+        self.ensure_loaded()
+        with self._lock:
+            if self._workflows.pop(workflow_id, None) is None:
+                return False
+            self._unindex(workflow_id)
+        self._write([{"q": "DELETE FROM workflows WHERE id = ?", "params": [workflow_id]}])
+        return True
+
+    def get(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        self.ensure_loaded()
+        return self._workflows.get(workflow_id)
+
+    def list_for_user(self, user_id: Optional[int]) -> List[Dict[str, Any]]:
+        self.ensure_loaded()
+        with self._lock:
+            return [w for w in self._workflows.values() if user_id is None or w["user_id"] == user_id]
+
+    @property
+    def active_count(self) -> int:
+        return len(self._compiled)
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    def has_subscribers(self, trigger_type: Any) -> bool:
+        """Whether any active workflow listens for ``trigger_type`` (the index is loaded at startup)."""
+        return bool(self._by_trigger.get(trigger_type))
+
+    def match(self, trigger_type: Any, context: Dict[str, Any]) -> List[CompiledWorkflow]:
+        """Return the active workflows whose conditions accept ``context``."""
+        self.ensure_loaded()
+        owners = self._by_trigger.get(trigger_type)
+        if not owners:
+            return []
+        user_id = context.get("user_id")
+        if user_id is not None:
+            candidates = list(owners.get(user_id, {}).values()) + list(owners.get(None, {}).values())
+        else:
+            candidates = [wf for bucket in list(owners.values()) for wf in bucket.values()]
+        return [wf for wf in candidates if wf.predicate(context)]
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def register_action_handler(self, action_type: Any, handler: ActionHandler, holds_slot: bool = True) -> None:
+        """Set the handler of ``action_type``; ``holds_slot=False`` for handlers that only wait (delays)."""
+        self._handlers[action_type] = handler
+        if holds_slot:
+            self._waiting_actions.discard(action_type)
+        else:
+            self._waiting_actions.add(action_type)
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Run workflows submitted from other threads on ``loop`` (the server's)."""
+        self._loop = loop
+
+    def submit(self, coro: Awaitable[Any]) -> bool:
+        """Schedule ``coro`` on the current loop, or on the bound loop when called from a worker thread."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            task = loop.create_task(coro)
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            return True
+        if self._loop is None or self._loop.is_closed():
+            coro.close()
+            return False
+        asyncio.run_coroutine_threadsafe(coro, self._loop)
+        return True
+
+    def dispatch(self, compiled: CompiledWorkflow, trigger_type: Any, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Schedule a workflow run in the background and return its pending execution record."""
+        from app.services.workflow_automation import ExecutionStatus
+
+        execution = {
+            "id": str(uuid.uuid4()),
+            "workflow_id": compiled.id,
+            "user_id": compiled.user_id,
+            "trigger_type": getattr(trigger_type, "value", trigger_type),
+            "status": ExecutionStatus.PENDING.value,
+            "context": context,
+            "action_results": [],
+            "error": None,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "completed_at": None,
+            "duration_ms": None,
+        }
+        self._remember(execution)
+        task = asyncio.get_running_loop().create_task(self.run(compiled, execution))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return execution
+
+    async def run(self, compiled: CompiledWorkflow, execution: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a workflow's actions under its owner's concurrency limit."""
+        from app.services.workflow_automation import ExecutionStatus
+
+        # Global workflows are limited per user they run for, not per admin who owns them
+        limit_key = compiled.user_id
+        if compiled.is_global:
+            limit_key = execution["context"].get("user_id", compiled.user_id)
+        semaphore = self._user_semaphores.get(limit_key)
+        if semaphore is None:
+            semaphore = self._user_semaphores.setdefault(
+                limit_key, asyncio.Semaphore(self.max_concurrent_per_user))
+
+        await semaphore.acquire()
+        holding = True
+        execution["status"] = ExecutionStatus.RUNNING.value
+        started = time.perf_counter()
+        context = execution["context"]
+        try:
+            for action_type, config in compiled.actions:
+                handler = self._handlers.get(action_type)
+                if handler is None:
+                    execution["action_results"].append({"type": action_type.value, "status": "failed"})
+                    raise LookupError(f"No handler for action type '{action_type.value}'")
+                if action_type in self._waiting_actions:
+                    # Let the owner's other executions run while this one only waits
+                    semaphore.release()
+                    holding = False
+                    result = await handler(render_value(config, context), context)
+                    await semaphore.acquire()
+                    holding = True
+                else:
+                    result = await handler(render_value(config, context), context)
+                execution["action_results"].append({
+                    "type": action_type.value,
+                    "status": "completed",
+                    "result": result,
+                })
+            execution["status"] = ExecutionStatus.COMPLETED.value
+        except asyncio.CancelledError:
+            execution["status"] = ExecutionStatus.CANCELLED.value
+            raise
+        except Exception as e:
+            logger.warning(f"Workflow {compiled.id} failed: {e}")
+            execution["status"] = ExecutionStatus.FAILED.value
+            execution["error"] = str(e)
+        finally:
+            if holding:
+                semaphore.release()
+            execution["completed_at"] = datetime.now(timezone.utc).isoformat()
+            execution["duration_ms"] = int((time.perf_counter() - started) * 1000)
+            self._record_completion(compiled, execution)
+        return execution
+
+    async def drain(self) -> None:
+        """Wait for all in-flight executions (used on shutdown and in tests)."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def _remember(self, execution: Dict[str, Any]) -> None:
+        with self._lock:
+            self._executions[execution["id"]] = execution
+            ids = self._user_executions[execution["user_id"]]
+            ids.append(execution["id"])
+            if len(ids) > MAX_HISTORY_IN_MEMORY:
+                for old in ids[:-MAX_HISTORY_IN_MEMORY]:
+                    self._executions.pop(old, None)
+                del ids[:-MAX_HISTORY_IN_MEMORY]
+
+    def _record_completion(self, compiled: CompiledWorkflow, execution: Dict[str, Any]) -> None:
+        workflow = self._workflows.get(compiled.id)
+        statements = [{
+            "q": "INSERT OR REPLACE INTO workflow_executions (id, workflow_id, user_id, trigger_type, status, "
+                 "context, action_results, error, started_at, completed_at, duration_ms) "
+                 "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            "params": [
+                execution["id"], execution["workflow_id"], execution["user_id"], execution["trigger_type"],
+                execution["status"], json.dumps(execution["context"], default=str),
+                json.dumps(execution["action_results"], default=str), execution["error"],
+                execution["started_at"], execution["completed_at"], execution["duration_ms"],
+            ],
+        }]
+        if workflow is not None:
+            workflow["execution_count"] = workflow.get("execution_count", 0) + 1
+            workflow["last_executed_at"] = execution["completed_at"]
+            statements.append({
+                "q": "UPDATE workflows SET execution_count = execution_count + 1, last_executed_at = ? WHERE id = ?",
+                "params": [execution["completed_at"], compiled.id],
+            })
+        self._write(statements)
+
+    def executions_for_user(self, user_id: int, workflow_id: Optional[str] = None,
+                            limit: int = 50) -> List[Dict[str, Any]]:
+        """Newest-first execution history (memory first, database for older runs)."""
+        with self._lock:
+            ids = list(reversed(self._user_executions.get(user_id, [])))
+            recent = [self._executions[i] for i in ids if i in self._executions]
+        if workflow_id:
+            recent = [e for e in recent if e["workflow_id"] == workflow_id]
+        if len(recent) >= limit or not self.persist:
+            return recent[:limit]
+
+        sql = ("SELECT id, workflow_id, user_id, trigger_type, status, context, action_results, error, "
+               "started_at, completed_at, duration_ms FROM workflow_executions WHERE user_id = ?")
+        params: List[Any] = [user_id]
+        if workflow_id:
+            sql += " AND workflow_id = ?"
+            params.append(workflow_id)
+        sql += " ORDER BY started_at DESC LIMIT ?"
+        params.append(limit)
+        try:
+            result = self._backend_factory().execute(sql, params)
+        except Exception as e:
+            logger.warning(f"Workflow history query failed: {e}")
+            return recent[:limit]
+
+        seen = {e["id"] for e in recent}
+        for row in result.get("rows", []):
+            record = _execution_from_row([cell_value(v) for v in row])
+            if record["id"] not in seen:
+                recent.append(record)
+        recent.sort(key=lambda e: e["started_at"], reverse=True)
+        return recent[:limit]
+
+    def get_execution(self, user_id: int, execution_id: str) -> Optional[Dict[str, Any]]:
+        execution = self._executions.get(execution_id)
+        if execution is None and self.persist:
+            try:
+                result = self._backend_factory().execute(
+                    "SELECT id, workflow_id, user_id, trigger_type, status, context, action_results, error, "
+                    "started_at, completed_at, duration_ms FROM workflow_executions WHERE id = ?",
+                    [execution_id],
+                )
+                rows = result.get("rows", [])
+                if rows:
+                    execution = _execution_from_row([cell_value(v) for v in rows[0]])
+            except Exception as e:
+                logger.warning(f"Workflow execution lookup failed: {e}")
+        if execution is None or execution["user_id"] != user_id:
+            return None
+        return execution
+
+    # ------------------------------------------------------------------
+    # Default action handlers
+    # ------------------------------------------------------------------
+
+    def _register_default_handlers(self) -> None:
+        from app.services.workflow_automation import ActionType
+
+        async def send_in_app(config, context):
+            from app.services.notifications_service import send_notification
+            user_id = config.get("user_id") or context.get("user_id")
+            if not user_id:
+                return {"skipped": "no recipient"}
+            notification = await asyncio.to_thread(
+                send_notification, user_id, config.get("notification_type", "workflow"),
+                config.get("title", "Workflow notification"), config.get("body", config.get("message", "")),
+                {"workflow_context": context.get("event_id")},
+            )
+            return {"notification_id": notification["id"] if notification else None}
+
+        async def delay(config, context):
+            seconds = float(config.get("minutes", 0)) * 60 + float(config.get("seconds", 0))
+            await asyncio.sleep(seconds)
+            return {"delayed_seconds": seconds}
+
+        async def log_activity(config, context):
+            logger.info(f"Workflow activity: {config.get('message', '')}")
+            return {"message": config.get("message", "")}
+
+        self._handlers[ActionType.SEND_IN_APP] = send_in_app
+        self._handlers[ActionType.SEND_PUSH] = send_in_app
+        self.register_action_handler(ActionType.DELAY, delay, holds_slot=False)
+        self._handlers[ActionType.LOG_ACTIVITY] = log_activity
+
+
+def _execution_from_row(values: List[Any]) -> Dict[str, Any]:
+    return {
+        "id": values[0], "workflow_id": values[1], "user_id": int(values[2]),
+        "trigger_type": values[3], "status": values[4],
+        "context": json.loads(values[5]) if values[5] else {},
+        "action_results": json.loads(values[6]) if values[6] else [],
+        "error": values[7], "started_at": values[8], "completed_at": values[9],
+        "duration_ms": values[10],
+    }
+
+
+def _owner_key(compiled: CompiledWorkflow) -> Optional[int]:
+    return None if compiled.is_global else compiled.user_id
+
+
+def _trigger_value(workflow: Dict[str, Any]) -> str:
+    return _enum_value((workflow.get("trigger") or {}).get("type"))
+
+
+def _enum_value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+# Singleton instance
+_engine: Optional[WorkflowEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_workflow_engine() -> WorkflowEngine:
+    """Get or create the process-wide workflow engine."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = WorkflowEngine()
+    return _engine
@@ -5,6 +5,7 @@ import logging
 from datetime import datetime, timezone
 from typing import Optional, List, Tuple
 
+from app.db.schema_registry import ensure_schema, register_schema
 from app.db.turso_http import execute_query
 from app.services.db_utils import get_val as _get_val
 
@@ -13,128 +14,105 @@ logger = logging.getLogger(__name__)
 
 # ==================== Table Initialization ====================
 
-_workroom_tables_initialized = False
+WORKROOM_DDL = [
+    """CREATE TABLE IF NOT EXISTS workroom_tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        contract_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        description TEXT,
+        column_name TEXT DEFAULT 'todo',
+        priority TEXT DEFAULT 'medium',
+        assignee_id INTEGER,
+        created_by INTEGER NOT NULL,
+        due_date TEXT,
+        labels TEXT,
+        order_index INTEGER DEFAULT 0,
+        is_completed INTEGER DEFAULT 0,
+        completed_at TEXT,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        FOREIGN KEY (contract_id) REFERENCES contracts(id),
+        FOREIGN KEY (assignee_id) REFERENCES users(id),
+        FOREIGN KEY (created_by) REFERENCES users(id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS workroom_task_comments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        task_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        content TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        FOREIGN KEY (task_id) REFERENCES workroom_tasks(id),
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS workroom_files (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        contract_id INTEGER NOT NULL,
+        uploaded_by INTEGER NOT NULL,
+        filename TEXT NOT NULL,
+        original_name TEXT NOT NULL,
+        file_path TEXT NOT NULL,
+        file_size INTEGER,
+        mime_type TEXT,
+        description TEXT,
+        version INTEGER DEFAULT 1,
+        parent_file_id INTEGER,
+        download_count INTEGER DEFAULT 0,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        FOREIGN KEY (contract_id) REFERENCES contracts(id),
+        FOREIGN KEY (uploaded_by) REFERENCES users(id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS workroom_discussions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        contract_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        is_pinned INTEGER DEFAULT 0,
+        reply_count INTEGER DEFAULT 0,
+        last_reply_at TEXT,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        FOREIGN KEY (contract_id) REFERENCES contracts(id),
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS workroom_discussion_replies (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        discussion_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        parent_id INTEGER,
+        content TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        FOREIGN KEY (discussion_id) REFERENCES workroom_discussions(id),
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS workroom_activity (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        contract_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        activity_type TEXT NOT NULL,
+        entity_type TEXT,
+        entity_id INTEGER,
+        description TEXT,
+        metadata TEXT,
+        created_at TEXT NOT NULL,
+        FOREIGN KEY (contract_id) REFERENCES contracts(id),
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )""",
+]
+register_schema("workroom", WORKROOM_DDL)
 
 
 def ensure_workroom_tables():
-    """Create workroom tables if they don't exist."""
-    global _workroom_tables_initialized
-    if _workroom_tables_initialized:
-        return
+    """Create workroom tables if this process has not yet (bootstrapped at startup)."""
     try:
-        _create_workroom_tables()
-        _workroom_tables_initialized = True
+        ensure_schema("workroom")
     except Exception as e:
         logger.warning(f"Could not initialize workroom tables: {e}")
 
 
-def _create_workroom_tables():
-    """Create all workroom tables."""
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS workroom_tasks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            contract_id INTEGER NOT NULL,
-            title TEXT NOT NULL,
-            description TEXT,
-            column_name TEXT DEFAULT 'todo',
-            priority TEXT DEFAULT 'medium',
-            assignee_id INTEGER,
-            created_by INTEGER NOT NULL,
-            due_date TEXT,
-            labels TEXT,
-            order_index INTEGER DEFAULT 0,
-            is_completed INTEGER DEFAULT 0,
-            completed_at TEXT,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL,
-            FOREIGN KEY (contract_id) REFERENCES contracts(id),
-            FOREIGN KEY (assignee_id) REFERENCES users(id),
-            FOREIGN KEY (created_by) REFERENCES users(id)
-        )
-    """, [])
-
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS workroom_task_comments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            task_id INTEGER NOT NULL,
-            user_id INTEGER NOT NULL,
-            content TEXT NOT NULL,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL,
-            FOREIGN KEY (task_id) REFERENCES workroom_tasks(id),
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    """, [])
-
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS workroom_files (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            contract_id INTEGER NOT NULL,
-            uploaded_by INTEGER NOT NULL,
-            filename TEXT NOT NULL,
-            original_name TEXT NOT NULL,
-            file_path TEXT NOT NULL,
-            file_size INTEGER,
-            mime_type TEXT,
-            description TEXT,
-            version INTEGER DEFAULT 1,
-            parent_file_id INTEGER,
-            download_count INTEGER DEFAULT 0,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL,
-            FOREIGN KEY (contract_id) REFERENCES contracts(id),
-            FOREIGN KEY (uploaded_by) REFERENCES users(id)
-        )
-    """, [])
-
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS workroom_discussions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            contract_id INTEGER NOT NULL,
-            user_id INTEGER NOT NULL,
-            title TEXT NOT NULL,
-            content TEXT NOT NULL,
-            is_pinned INTEGER DEFAULT 0,
-            reply_count INTEGER DEFAULT 0,
-            last_reply_at TEXT,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL,
-            FOREIGN KEY (contract_id) REFERENCES contracts(id),
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    """, [])
-
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS workroom_discussion_replies (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            discussion_id INTEGER NOT NULL,
-            user_id INTEGER NOT NULL,
-            parent_id INTEGER,
-            content TEXT NOT NULL,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL,
-            FOREIGN KEY (discussion_id) REFERENCES workroom_discussions(id),
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    """, [])
-
-    execute_query("""
-        CREATE TABLE IF NOT EXISTS workroom_activity (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            contract_id INTEGER NOT NULL,
-            user_id INTEGER NOT NULL,
-            activity_type TEXT NOT NULL,
-            entity_type TEXT,
-            entity_id INTEGER,
-            description TEXT,
-            metadata TEXT,
-            created_at TEXT NOT NULL,
-            FOREIGN KEY (contract_id) REFERENCES contracts(id),
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    """, [])
-
-
 # ==================== Contract Access ====================
 
 def get_contract_parties(contract_id: int) -> Optional[dict]:
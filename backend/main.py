@@ -1,10 +1,15 @@
 # @AI-HINT: This is the main entry point for the MegiLance FastAPI backend.
 
+import asyncio
 import logging
 import json
 import time
 import uuid
 from contextlib import asynccontextmanager
+
+from app.core.import_profiler import import_profiler
+import_profiler.start_from_env()  # IMPORT_PROFILE=1 times every import from here on
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
@@ -14,7 +19,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
-from app.api.routers import api_router
+from app.api.routers import api_routes
 from app.core.config import get_settings
 from app.core.rate_limit import limiter
 from app.db.init_db import init_db
@@ -63,6 +68,14 @@ async def lifespan(app: FastAPI):
                 logger.warning("startup.turso_http_test_failed")
         logger.info("startup.mongodb_disabled - using Turso/SQLite only")
         
+        # Apply registered DDL once (skips steps whose recorded version is current)
+        try:
+            from app.db.schema_registry import bootstrap_schema
+            report = bootstrap_schema()
+            logger.info(f"startup.schema_bootstrapped counts={report['counts']} ms={report['total_ms']}")
+        except Exception as e:
+            logger.warning(f"startup.schema_warning: {e}")
+
         # Initialize persistent token blacklist table and cleanup expired entries
         try:
             from app.services.token_blacklist_service import init_token_blacklist
@@ -71,35 +84,123 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"startup.token_blacklist_init_warning: {e}")
 
-        # Ensure database indexes exist for common query patterns
+        # Hydrate the audit log store (hash chain head, indexes, checkpoints)
         try:
-            from app.db.turso_http import execute_query
-            indexes = [
-                "CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)",
-                "CREATE INDEX IF NOT EXISTS idx_users_role ON users(role)",
-                "CREATE INDEX IF NOT EXISTS idx_projects_client_id ON projects(client_id)",
-                "CREATE INDEX IF NOT EXISTS idx_projects_status ON projects(status)",
-                "CREATE INDEX IF NOT EXISTS idx_proposals_project_id ON proposals(project_id)",
-                "CREATE INDEX IF NOT EXISTS idx_proposals_freelancer_id ON proposals(freelancer_id)",
-                "CREATE INDEX IF NOT EXISTS idx_contracts_client_id ON contracts(client_id)",
-                "CREATE INDEX IF NOT EXISTS idx_contracts_freelancer_id ON contracts(freelancer_id)",
-                "CREATE INDEX IF NOT EXISTS idx_contracts_status ON contracts(status)",
-                "CREATE INDEX IF NOT EXISTS idx_milestones_contract_id ON milestones(contract_id)",
-                "CREATE INDEX IF NOT EXISTS idx_messages_sender_id ON messages(sender_id)",
-                "CREATE INDEX IF NOT EXISTS idx_messages_receiver_id ON messages(receiver_id)",
-            ]
-            for idx_sql in indexes:
-                try:
-                    execute_query(idx_sql)
-                except Exception:
-                    pass  # Table may not exist yet
-            logger.info("startup.indexes_ensured")
+            from app.services.audit_log_store import get_audit_store
+            get_audit_store().ensure_loaded()
+            logger.info("startup.audit_store_loaded")
         except Exception as e:
-            logger.warning(f"startup.indexes_warning: {e}")
+            logger.warning(f"startup.audit_store_warning: {e}")
+
+        # Compile active workflows into the trigger index
+        try:
+            from app.services.workflow_engine import get_workflow_engine
+            get_workflow_engine().ensure_loaded()
+            get_workflow_engine().bind_loop(asyncio.get_running_loop())  # triggers fired from worker threads
+            logger.info("startup.workflow_engine_loaded")
+        except Exception as e:
+            logger.warning(f"startup.workflow_engine_warning: {e}")
+
+        # Build the BM25 index over FAQs and help articles
+        try:
+            from app.services.help_search import get_help_index
+            get_help_index()
+            logger.info("startup.help_index_built")
+        except Exception as e:
+            logger.warning(f"startup.help_index_warning: {e}")
+
+        # Load the project/freelancer facet indexes behind /search
+        try:
+            from app.services.discovery_index import load_discovery_indexes
+            load_discovery_indexes()
+            logger.info("startup.discovery_indexes_loaded")
+        except Exception as e:
+            logger.warning(f"startup.discovery_indexes_warning: {e}")
+
+        # Load the autocomplete prefix index (titles, names, skills, tags)
+        try:
+            from app.services.autocomplete_index import load_autocomplete
+            load_autocomplete()
+            logger.info("startup.autocomplete_loaded")
+        except Exception as e:
+            logger.warning(f"startup.autocomplete_warning: {e}")
+
+        # Check the money ledger; report only - repairs are an explicit admin action
+        # (scripts/reconcile_ledger.py --repair) so drift is looked at, not booked away
+        try:
+            from app.services.ledger import get_ledger
+            report = get_ledger().reconcile()
+            drift = len(report["unbalanced_postings"]) + len(report["balance_drift"]) + len(report["legacy_drift"])
+            log = logger.warning if drift else logger.info
+            log(
+                f"startup.ledger_reconciled unbalanced={len(report['unbalanced_postings'])} "
+                f"balance_drift={len(report['balance_drift'])} legacy_drift={len(report['legacy_drift'])}"
+            )
+        except Exception as e:
+            logger.warning(f"startup.ledger_warning: {e}")
+
+        # Load the latest calibrated market rate snapshot for the price estimator
+        try:
+            from app.services.market_calibration import get_market_rate_store
+            market_rates = get_market_rate_store()
+            market_rates.refresh()
+            logger.info(f"startup.market_rates_loaded version={market_rates.snapshot.version}")
+        except Exception as e:
+            logger.warning(f"startup.market_rates_warning: {e}")
     except Exception as e:
         logger.error(f"startup.database_failed error={e}")
+
+    if import_profiler.active:
+        logger.info(f"startup.slowest_imports {json.dumps(import_profiler.report(limit=15))}")
+    # Preload the hottest endpoint modules in the background; the rest mount on first request
+    warm_up = asyncio.create_task(api_routes.warm_up(settings.warm_routers)) if settings.lazy_routers else None
+    # Pick up market rate snapshots published by scripts/calibrate_market_rates.py
+    from app.services.market_calibration import get_market_rate_store
+    market_refresh = asyncio.create_task(get_market_rate_store().run())
+    # Pre-fork the code sandbox workers used to grade coding questions
+    from app.services.code_sandbox import get_sandbox_pool
+    sandbox_warm_up = asyncio.create_task(asyncio.to_thread(get_sandbox_pool().warm_up))
+    # Dashboard pushes are scheduled from worker threads onto this loop
+    from app.services.realtime_metrics import get_realtime_metrics
+    get_realtime_metrics().bind_loop(asyncio.get_running_loop())
     yield
+    for task in (warm_up, market_refresh, sandbox_warm_up):
+        if task is not None and not task.done():
+            task.cancel()
     # Shutdown
+    try:
+        from app.services.audit_log_store import get_audit_store
+        get_audit_store().close()
+    except Exception as e:
+        logger.warning(f"shutdown.audit_flush_warning: {e}")
+    try:
+        get_sandbox_pool().close()
+    except Exception as e:
+        logger.warning(f"shutdown.code_sandbox_close_warning: {e}")
+    try:
+        from app.services.image_derivatives import get_derivative_pipeline
+        get_derivative_pipeline().close()
+    except Exception as e:
+        logger.warning(f"shutdown.image_derivatives_close_warning: {e}")
+    try:
+        from app.services.pdf_renderer import get_pdf_renderer
+        get_pdf_renderer().close()
+    except Exception as e:
+        logger.warning(f"shutdown.pdf_renderer_close_warning: {e}")
+    try:
+        from app.services.usage_meter import get_usage_meter
+        get_usage_meter().close()
+    except Exception as e:
+        logger.warning(f"shutdown.usage_meter_flush_warning: {e}")
+    try:
+        get_realtime_metrics().close()
+    except Exception as e:
+        logger.warning(f"shutdown.realtime_metrics_close_warning: {e}")
+    try:
+        from app.services.email_service import email_service
+        email_service.close()
+    except Exception as e:
+        logger.warning(f"shutdown.smtp_close_warning: {e}")
     logger.info("shutdown.complete")
 
 
@@ -344,14 +445,25 @@ def health_ready():
 
 
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi import Query, Request
+from fastapi.responses import FileResponse, RedirectResponse, Response
 from pathlib import Path
+from typing import Optional
 import os
 import mimetypes
 
 # ... existing imports ...
 
-app.include_router(api_router, prefix="/api")
+api_routes.mount(app, prefix="/api", lazy=settings.lazy_routers)
+
+# Socket.IO (notifications, chat, WebRTC signaling for interviews)
+from app.core.websocket import socket_app
+from app.services.realtime_metrics import get_realtime_metrics
+from app.services.webrtc_signaling import get_signaling_server
+
+get_signaling_server()  # registers the webrtc_* events
+get_realtime_metrics()  # registers the dashboard_* events
+app.mount("/ws", socket_app)
 
 # Upload directory setup
 uploads_dir = os.path.join(os.path.dirname(__file__), "uploads")
@@ -359,34 +471,79 @@ if not os.path.exists(uploads_dir):
     os.makedirs(uploads_dir)
 
 _UPLOADS_BASE = Path(uploads_dir).resolve()
-_INLINE_MIME_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
+_INLINE_MIME_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif", "image/avif"}
+_DERIVED_MIME_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
+
+
+def _original_etag(path: Path) -> str:
+    """ETag of a file on disk from its mtime and size - one stat, no read on the event loop."""
+    st = path.stat()
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
 
 
 @app.get("/uploads/{file_path:path}")
-async def serve_upload(file_path: str):
-    """Serve uploaded files with proper Content-Disposition and security headers."""
+async def serve_upload(file_path: str, request: Request, w: Optional[int] = Query(None, ge=1, le=4096)):
+    """
+    Serve uploaded files with proper Content-Disposition and security headers.
+
+    Images with built derivatives are negotiated: the smallest stored width
+    that covers ``w``, in the smallest format the ``Accept`` header allows
+    (AVIF, WebP or the original type). Every response carries a strong ETag,
+    and a matching ``If-None-Match`` gets a 304.
+    """
+    from app.services.pdf_renderer import RENDER_ROOT
+
     resolved = (_UPLOADS_BASE / file_path).resolve()
     # Prevent path traversal
     if not str(resolved).startswith(str(_UPLOADS_BASE)) or not resolved.is_file():
         raise HTTPException(status_code=404, detail="File not found")
+    # Rendered PDFs are served only to their owner, by /api/pdf-jobs/{id}/download
+    if resolved.relative_to(_UPLOADS_BASE).parts[0] == RENDER_ROOT:
+        raise HTTPException(status_code=404, detail="File not found")
 
     content_type, _ = mimetypes.guess_type(str(resolved))
     content_type = content_type or "application/octet-stream"
+    headers = {
+        "X-Content-Type-Options": "nosniff",
+        "Cache-Control": "private, max-age=3600",
+    }
+
+    etag = None
+    if content_type in _DERIVED_MIME_TYPES:
+        from app.core.storage import LocalStorage
+        from app.services.image_derivatives import FORMAT_MIME, get_derivative_pipeline
+        headers["Vary"] = "Accept"
+        pipeline = get_derivative_pipeline()
+        variant = pipeline.select(file_path, request.headers.get("accept", ""), w)
+        if variant:
+            if not isinstance(pipeline.storage, LocalStorage):
+                return RedirectResponse(pipeline.storage.get_file_url(variant["path"]), headers=headers)
+            variant_path = (_UPLOADS_BASE / variant["path"]).resolve()
+            if str(variant_path).startswith(str(_UPLOADS_BASE)) and variant_path.is_file():
+                resolved, content_type, etag = variant_path, FORMAT_MIME[variant["format"]], variant["etag"]
+    headers["ETag"] = etag or _original_etag(resolved)
+
+    if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
 
     # Images render inline; everything else forces download
     if content_type in _INLINE_MIME_TYPES:
         disposition = "inline"
     else:
         disposition = "attachment"
+    headers["Content-Disposition"] = f'{disposition}; filename="{resolved.name}"'
 
     return FileResponse(
         path=str(resolved),
         media_type=content_type,
-        headers={
-            "Content-Disposition": f'{disposition}; filename="{resolved.name}"',
-            "X-Content-Type-Options": "nosniff",
-            "Cache-Control": "private, max-age=3600",
-        },
+        headers=headers,
     )
 
 if __name__ == "__main__":
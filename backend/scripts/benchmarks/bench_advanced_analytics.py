@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Benchmark: revenue forecast, payment rows bucketed in Python vs grouped SQL with cached fits.
+
+Fills a database ``--latency`` ms away with ``--payments`` completed
+payments spread over three years, then serves ``--calls`` forecasts. The
+"rows" strategy fetches every payment of the last year and buckets it by
+month in Python on each call, which is what the service did before. The
+"grouped" strategy calls ``AdvancedAnalyticsService.get_revenue_forecast``,
+which sums per month in SQL and reuses its fitted model until
+``payments`` is written.
+
+Reports time per forecast, database requests, and peak Python memory per
+forecast (tracemalloc), for each payment count given.
+
+Usage:
+    python scripts/benchmarks/bench_advanced_analytics.py [--payments 10000 100000] [--calls 50] [--latency 20]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+os.environ.setdefault("TURSO_DATABASE_URL", "libsql://bench.turso.io")
+os.environ.setdefault("TURSO_AUTH_TOKEN", "bench")
+
+from app.services.advanced_analytics import AdvancedAnalyticsService  # noqa: E402
+from app.services.forecast_models import fit_trend  # noqa: E402
+
+
+class LatencySQLite:
+    """TursoHTTP stand-in with a fixed network delay per request."""
+
+    def __init__(self, latency: float, payments: int):
+        self.latency = latency
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+        self.conn.execute("CREATE TABLE payments (id INTEGER PRIMARY KEY, amount REAL, status TEXT, created_at TEXT)")
+        rng = random.Random(11)
+        now = datetime.now(timezone.utc)
+        self.conn.executemany(
+            "INSERT INTO payments (amount, status, created_at) VALUES (?, 'completed', ?)",
+            ((round(rng.uniform(20, 2000), 2), (now - timedelta(minutes=rng.uniform(0, 3 * 525600))).isoformat())
+             for _ in range(payments)),
+        )
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def execute(self, sql, params=None):
+        time.sleep(self.latency)
+        with self.lock:
+            self.requests += 1
+            cur = self.conn.execute(sql, params or [])
+            cols = [d[0] for d in cur.description] if cur.description else []
+            return {"columns": cols, "rows": [list(r) for r in cur.fetchall()]}
+
+
+def forecast_from_rows(db):
+    """The previous approach: every payment of the last year into Python, bucketed by month."""
+    since = (datetime.now(timezone.utc) - timedelta(days=365)).isoformat()
+    rows = db.execute("SELECT amount, created_at FROM payments WHERE status = 'completed' AND created_at >= ?",
+                      [since])["rows"]
+    monthly = defaultdict(float)
+    for amount, created_at in rows:
+        monthly[created_at[:7]] += float(amount or 0)
+    fit = fit_trend([monthly[m] for m in sorted(monthly)])
+    return [fit.predict(len(monthly) + i) for i in range(1, 7)]
+
+
+def measure(call, calls):
+    tracemalloc.start()
+    peak = 0
+    started = time.perf_counter()
+    for _ in range(calls):
+        tracemalloc.reset_peak()
+        call()
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    spent = time.perf_counter() - started
+    tracemalloc.stop()
+    return spent, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--payments", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=20.0, help="simulated Turso round trip in ms")
+    args = parser.parse_args()
+
+    for payments in args.payments:
+        db = LatencySQLite(args.latency / 1000, payments)
+        spent, peak = measure(lambda: forecast_from_rows(db), args.calls)
+        print(f"{payments:>8} payments  {'rows':<8} {spent / args.calls * 1000:8.2f} ms/forecast  "
+              f"{db.requests:5d} db requests  peak {peak / 1024:9.1f} KiB")
+
+        db.requests = 0
+        service = AdvancedAnalyticsService(backend_factory=lambda: db)
+        spent, peak = measure(lambda: asyncio.run(service.get_revenue_forecast()), args.calls)
+        print(f"{payments:>8} payments  {'grouped':<8} {spent / args.calls * 1000:8.2f} ms/forecast  "
+              f"{db.requests:5d} db requests  peak {peak / 1024:9.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Benchmark: per-keystroke autocomplete latency from the in-memory PrefixIndex.
+
+Loads N synthetic suggestions (project titles, freelancer names, skills,
+tags) and replays typed queries one keystroke at a time ("p", "py", "pyt",
+...), reporting per-keystroke latency in microseconds for cached prefixes
+and for prefixes seen for the first time, plus the cost of an incremental
+update.
+
+Usage:
+    python scripts/benchmarks/bench_autocomplete.py [--entries 200000] [--queries 2000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from app.services.autocomplete_index import AUTOCOMPLETE_TYPES, PrefixIndex  # noqa: E402
+
+SYLLABLES = "ka ri to na mi ro sa lu de an el py th on re ac go ja va sc ul ex pe rt ui ux".split()
+
+
+def word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def make_entries(n: int, rng: random.Random):
+    for i in range(n):
+        kind = AUTOCOMPLETE_TYPES[i % 4]
+        text = " ".join(word(rng) for _ in range(rng.randint(1, 5) if kind == "project" else rng.randint(1, 2)))
+        yield kind, i, text, rng.paretovariate(1.2), [text]
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    entries = list(make_entries(args.entries, rng))
+    index = PrefixIndex()
+    start = time.perf_counter()
+    index.load(entries)
+    print(f"load: {len(index):,} entries in {time.perf_counter() - start:.2f}s")
+
+    queries = [rng.choice(entries)[2].split(" ")[-1] for _ in range(args.queries)]
+    for label in ("first pass", "second pass (cached)"):
+        samples = []
+        for query in queries:
+            for length in range(1, len(query) + 1):
+                kind = AUTOCOMPLETE_TYPES[length % 4]
+                t0 = time.perf_counter()
+                index.complete(query[:length], kind, 10)
+                samples.append((time.perf_counter() - t0) * 1e6)
+        print(
+            f"{label:<22} keystrokes={len(samples):,}  p50={statistics.median(samples):.1f}us  "
+            f"p99={percentile(samples, 0.99):.1f}us  max={max(samples):.1f}us"
+        )
+
+    samples = []
+    for i in range(1000):
+        kind, entry_id, text, weight, texts = entries[rng.randrange(len(entries))]
+        t0 = time.perf_counter()
+        index.upsert(kind, entry_id, text, weight + 1, texts)
+        samples.append((time.perf_counter() - t0) * 1e6)
+    print(f"weight update          p50={statistics.median(samples):.1f}us")
+
+    samples = []
+    for i in range(1000):
+        text = f"{word(rng)} {word(rng)}"
+        t0 = time.perf_counter()
+        index.upsert("project", args.entries + i, text, 1.0)
+        samples.append((time.perf_counter() - t0) * 1e6)
+    print(f"insert                 p50={statistics.median(samples):.1f}us")
+
+
+if __name__ == "__main__":
+    main()
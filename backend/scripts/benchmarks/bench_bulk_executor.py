@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Benchmark: bulk-archiving projects.
+
+Compares the old shape - one awaited UPDATE round-trip per item - with the
+chunked, set-based ``BulkExecutor`` against an in-memory SQLite database
+behind a TursoHTTP-like adapter that adds a fixed per-request latency
+(default 20 ms, a typical Turso HTTP round-trip). The per-item path is timed
+on a sample and extrapolated to the full item count.
+
+Usage:
+    python scripts/benchmarks/bench_bulk_executor.py [--items 100000] [--latency-ms 20] [--sample 200]
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from app.services.bulk_executor import BulkExecutor  # noqa: E402
+
+
+class LatencySQLite:
+    """TursoHTTP stand-in with a fixed network delay per request."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def _run(self, sql, params):
+        cur = self.conn.execute(sql, params or [])
+        cols = [d[0] for d in cur.description] if cur.description else []
+        return {"columns": cols, "rows": [list(r) for r in cur.fetchall()]}
+
+    def execute(self, sql, params=None):
+        time.sleep(self.latency)
+        with self.lock:
+            self.requests += 1
+            return self._run(sql, params)
+
+    def execute_many(self, statements):
+        time.sleep(self.latency)
+        with self.lock:
+            self.requests += 1
+            self.conn.execute("BEGIN")
+            try:
+                results = [self._run(s["q"], s.get("params")) for s in statements]
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+            return results
+
+
+def make_db(n: int, latency: float) -> LatencySQLite:
+    db = LatencySQLite(latency)
+    db.conn.execute("CREATE TABLE projects (id INTEGER PRIMARY KEY, status TEXT, category TEXT, updated_at TEXT)")
+    db.conn.executemany("INSERT INTO projects VALUES (?, 'open', 'Web', NULL)", ((i,) for i in range(1, n + 1)))
+    return db
+
+
+async def per_item(db: LatencySQLite, ids):
+    for item_id in ids:
+        await asyncio.to_thread(
+            db.execute, "UPDATE projects SET status = 'archived', updated_at = ? WHERE id = ?", ["now", item_id]
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--sample", type=int, default=200)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--parallelism", type=int, default=4)
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+    ids = [str(i) for i in range(1, args.items + 1)]
+
+    db = make_db(args.items, latency)
+    start = time.perf_counter()
+    asyncio.run(per_item(db, ids[:args.sample]))
+    sample = time.perf_counter() - start
+    print(f"per-item awaits : {sample:7.2f}s for {args.sample:,} items -> "
+          f"~{sample / args.sample * args.items:,.0f}s extrapolated for {args.items:,}")
+
+    db = make_db(args.items, latency)
+    executor = BulkExecutor(backend_factory=lambda: db, chunk_size=args.chunk_size, parallelism=args.parallelism)
+    op = executor.create("project_operation", "archive", args.items, "bench")
+    db.requests = 0
+    start = time.perf_counter()
+    final = asyncio.run(executor.run(op["id"], ids, {}))
+    elapsed = time.perf_counter() - start
+    archived = db.conn.execute("SELECT COUNT(*) FROM projects WHERE status = 'archived'").fetchone()[0]
+    print(f"bulk executor   : {elapsed:7.2f}s for {args.items:,} items "
+          f"({db.requests} requests, chunk={args.chunk_size}, parallelism={args.parallelism}, "
+          f"status={final['status']}, archived={archived:,})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Benchmark: code sandbox throughput for coding-question submissions.
+
+Grades the py_004 (fibonacci) question bank tests through a ``SandboxPool``
+from several threads at once. The stream of submissions mixes correct,
+wrong and hostile answers (infinite loops, memory bombs, file and network
+access, forks). It reports submissions per second, latency percentiles
+and how many workers were recycled. It also shows the cost of starting a
+fresh interpreter per submission for comparison.
+
+Usage:
+    python scripts/benchmarks/bench_code_sandbox.py [--submissions 2000] [--threads 8] [--workers 0] [--hostile 0.05]
+"""
+import argparse
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from app.services.code_sandbox import SandboxPool  # noqa: E402
+from app.services.skill_assessment import QUESTION_BANK  # noqa: E402
+
+CORRECT = "def fibonacci(n):\n    a, b = 0, 1\n    for _ in range(n):\n        a, b = b, a + b\n    return a\n"
+WRONG = "def fibonacci(n):\n    return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 3)\n"
+HOSTILE = [
+    "def fibonacci(n):\n    while True:\n        pass\n",
+    "def fibonacci(n):\n    x = []\n    while True:\n        x.append(bytearray(1 << 24))\n",
+    "def fibonacci(n):\n    return open('/etc/passwd').read()\n",
+    "import socket\ndef fibonacci(n):\n    return socket.create_connection(('1.1.1.1', 53))\n",
+    "import os\ndef fibonacci(n):\n    return os.fork()\n",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--submissions", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=0, help="0 = one per CPU")
+    parser.add_argument("--hostile", type=float, default=0.05, help="share of hostile submissions")
+    parser.add_argument("--timeout", type=float, default=0.25, help="per-test timeout seconds")
+    args = parser.parse_args()
+
+    tests = next(q for q in QUESTION_BANK["python"] if q["id"] == "py_004")["test_cases"]
+    rng = random.Random(7)
+    submissions = [
+        rng.choice(HOSTILE) if rng.random() < args.hostile else rng.choice((CORRECT, WRONG))
+        for _ in range(args.submissions)
+    ]
+
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-I", "-S", "-c", "pass"], check=True)
+    print(f"fresh interpreter per submission: {(time.perf_counter() - started) * 1000:.1f} ms (start-up alone)")
+
+    pool = SandboxPool(size=args.workers or None, timeout_seconds=args.timeout)
+    started = time.perf_counter()
+    pool.warm_up()
+    print(f"warm-up: {pool.size} workers in {(time.perf_counter() - started) * 1000:.0f} ms, isolation {pool.isolation}")
+    if not pool.enabled:
+        sys.exit("sandbox isolation unavailable on this host")
+
+    latencies, statuses, lock = [], {}, threading.Lock()
+    cursor = iter(range(len(submissions)))
+
+    def grade():
+        while True:
+            with lock:
+                index = next(cursor, None)
+            if index is None:
+                return
+            t = time.perf_counter()
+            result = pool.execute_python(submissions[index], tests, entry_point="fibonacci")
+            elapsed = (time.perf_counter() - t) * 1000
+            with lock:
+                latencies.append(elapsed)
+                for r in result["results"]:
+                    statuses[r.get("status")] = statuses.get(r.get("status"), 0) + 1
+
+    threads = [threading.Thread(target=grade) for _ in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    pool.close()
+
+    latencies.sort()
+    print(f"{len(submissions)} submissions x {len(tests)} tests in {elapsed:.2f}s = {len(submissions) / elapsed:.0f}/s")
+    print(f"latency ms p50 {statistics.median(latencies):.1f}  p99 {latencies[int(len(latencies) * 0.99) - 1]:.1f}")
+    print(f"test statuses {dict(sorted(statuses.items()))}")
+    print(f"pool stats {pool.stats}")
+
+
+if __name__ == "__main__":
+    main()
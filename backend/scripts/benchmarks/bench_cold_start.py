@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+Benchmark: API cold start, import of ``main`` to first responses.
+
+Starts a fresh interpreter per run (so nothing is cached in ``sys.modules``)
+with lazy router mounting on and off. Each run times the import of ``main``,
+the first response from an app-level route, the first response from an
+endpoint module (which mounts it when lazy) and the OpenAPI schema (which
+mounts everything).
+
+Usage:
+    python scripts/benchmarks/bench_cold_start.py [--runs 3] [--path /api/seller-stats/levels]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND = os.path.join(os.path.dirname(__file__), "..", "..")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from starlette.testclient import TestClient
+client = TestClient(main.app, raise_server_exceptions=False)
+client.get("/api/health/live")
+first = time.perf_counter()
+modules = len(sys.modules)
+status = client.get(sys.argv[1]).status_code
+endpoint = time.perf_counter()
+client.get("/api/openapi.json")
+schema = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - start, "first_response_s": first - start,
+    "endpoint_first_s": endpoint - first, "endpoint_status": status,
+    "openapi_s": schema - endpoint, "modules": modules,
+}))
+"""
+
+
+def run(lazy: bool, path: str) -> dict:
+    env = dict(os.environ, LAZY_ROUTERS="true" if lazy else "false")
+    env.setdefault("TURSO_DATABASE_URL", "libsql://bench.turso.io")
+    env.setdefault("TURSO_AUTH_TOKEN", "bench")
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE, path], cwd=BACKEND, env=env,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--path", default="/api/seller-stats/levels")
+    args = parser.parse_args()
+
+    for lazy in (False, True):
+        results = [run(lazy, args.path) for _ in range(args.runs)]
+
+        def median(key):
+            return statistics.median(r[key] for r in results)
+
+        print(
+            f"{'lazy ' if lazy else 'eager'}  import {median('import_s'):6.2f}s  "
+            f"first response {median('first_response_s'):6.2f}s  "
+            f"{args.path} first hit {median('endpoint_first_s'):5.2f}s  "
+            f"openapi {median('openapi_s'):5.2f}s  modules at first response {results[0]['modules']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
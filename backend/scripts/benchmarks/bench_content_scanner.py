@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""
+Benchmark: shared ContentScanner vs. the previous per-pattern loops.
+
+Runs moderation, fraud and chatbot classification over ~10 KB texts with
+the original approach (one re.search / substring test / word loop per rule)
+and with the compiled single-pass scanners, and checks both agree.
+
+Usage:
+    python scripts/benchmarks/bench_content_scanner.py [--size 10240] [--iterations 200]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from app.services.moderation import (  # noqa: E402
+    MODERATION_SCANNER, PROFANITY_WORDS, SPAM_PATTERNS, PII_PATTERNS, SCAM_PHRASES, ViolationType,
+)
+from app.services.fraud_detection import FraudDetectionService  # noqa: E402
+from app.services.ai_chatbot import AIChatbotService  # noqa: E402
+
+WORDS = (
+    "project budget deliver client freelancer milestone payment design api website mobile "
+    "the and with for this that have from will please great help account error thanks "
+    "contract proposal review quality timeline urgent asap login password escrow fee"
+).split()
+SPICE = [
+    "click here", "buy now", "send money via western union", "call 555-123-4567",
+    "mail me at someone@example.com", "brute force", "hacking", "spam", "terrible", "awesome",
+    "what's up", "i need help", "gift card", "money laundering", "wire transfer only",
+]
+
+
+def make_text(rng: random.Random, size: int) -> str:
+    parts = []
+    length = 0
+    while length < size:
+        token = rng.choice(SPICE) if rng.random() < 0.01 else rng.choice(WORDS)
+        parts.append(token)
+        length += len(token) + 1
+    return " ".join(parts)[:size]
+
+
+# --- Previous implementations (kept here as the baseline) -------------------
+
+def legacy_moderation(text: str):
+    words = text.lower().split()
+    profanity = [w for w in (re.sub(r"[^\w]", "", w) for w in words) if w in PROFANITY_WORDS]
+    spam = [p for p in SPAM_PATTERNS if re.search(p, text.lower(), re.IGNORECASE)]
+    pii = [m for p in PII_PATTERNS for m in re.findall(p, text)]
+    scam = any(phrase in text.lower() for phrase in SCAM_PHRASES)
+    return bool(profanity), bool(spam), bool(pii), scam
+
+
+def legacy_fraud(text: str):
+    return [entry for entry in FraudDetectionService.SUSPICIOUS_PATTERNS
+            if re.search(entry[0], text, re.IGNORECASE)]
+
+
+def legacy_intent_and_sentiment(text: str):
+    lower = text.lower()
+    intents = {i: sum(1 for p in ps if re.search(p, lower))
+               for i, ps in AIChatbotService.INTENT_PATTERNS.items()}
+    sentiments = {l: sum(1 for k in ks if k in lower)
+                  for l, ks in AIChatbotService.SENTIMENT_KEYWORDS.items()}
+    return intents, sentiments
+
+
+# --- Scanner-based equivalents ----------------------------------------------
+
+def scanner_moderation(text: str):
+    hits = MODERATION_SCANNER.group(text)
+    return (
+        bool(hits.get(ViolationType.PROFANITY.value)),
+        bool(hits.get(ViolationType.SPAM.value)),
+        bool(hits.get(ViolationType.PERSONAL_INFO.value)),
+        bool(hits.get(ViolationType.SCAM.value)),
+    )
+
+
+FRAUD = FraudDetectionService(db=None)
+
+
+def scanner_fraud(text: str):
+    return FRAUD._suspicious_matches(text)
+
+
+def scanner_intent_and_sentiment(text: str):
+    matched = AIChatbotService._MESSAGE_SCANNER.rules_matched(text)
+    intents = {i: len(matched.get(f"intent:{i.value}", ())) for i in AIChatbotService.INTENT_PATTERNS}
+    sentiments = {l: len(matched.get(f"sentiment:{l.value}", ())) for l in AIChatbotService.SENTIMENT_KEYWORDS}
+    return intents, sentiments
+
+
+def timed(fn, texts, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(texts[i % len(texts)])
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=10 * 1024)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    texts = [make_text(rng, args.size) for _ in range(20)]
+
+    for text in texts:
+        assert legacy_moderation(text) == scanner_moderation(text)
+        assert legacy_fraud(text) == scanner_fraud(text)
+        assert legacy_intent_and_sentiment(text) == scanner_intent_and_sentiment(text)
+    print(f"results agree on {len(texts)} texts of {args.size:,} chars\n")
+
+    legacy_total = scanner_total = 0.0
+    print(f"{'check':<22}{'legacy ms':>12}{'scanner ms':>12}{'speedup':>10}")
+    for name, legacy, scanner in (
+        ("moderation", legacy_moderation, scanner_moderation),
+        ("fraud patterns", legacy_fraud, scanner_fraud),
+        ("intent + sentiment", legacy_intent_and_sentiment, scanner_intent_and_sentiment),
+    ):
+        a = timed(legacy, texts, args.iterations)
+        b = timed(scanner, texts, args.iterations)
+        legacy_total += a
+        scanner_total += b
+        print(f"{name:<22}{a:>12.3f}{b:>12.3f}{a / b:>9.1f}x")
+    print(f"{'all four':<22}{legacy_total:>12.3f}{scanner_total:>12.3f}{legacy_total / scanner_total:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+"""
+Benchmark: faceted project search from the in-memory FacetIndex.
+
+Loads N synthetic open projects (default 1M) and times typical /search
+queries - total count + category/experience facets + one sorted page - for
+a mix of broad and narrow filters. With ``--compare-sql`` the same rows go
+into an in-memory SQLite database and the three SQL statements of
+``search_projects_advanced`` are timed too (a lower bound for Turso, which
+adds a network round-trip per statement).
+
+Usage:
+    python scripts/benchmarks/bench_facet_index.py [--projects 1000000] [--iterations 20] [--compare-sql]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from app.services.facet_index import FacetIndex  # noqa: E402
+
+CATEGORIES = [
+    "Web Development", "Mobile Development", "Data Science", "Design", "Writing",
+    "Marketing", "DevOps", "Blockchain", "AI/ML", "QA & Testing", "Video", "Translation",
+]
+LEVELS = ["entry", "intermediate", "expert"]
+SKILLS = [f"skill{i}" for i in range(400)] + ["python", "react", "sql", "go", "rust", "figma"]
+
+QUERIES = {
+    "all, newest": dict(clauses=[], ranges=None, sort="created_at", descending=True),
+    "category": dict(clauses=[("category", ["Web Development"])], ranges=None, sort="created_at", descending=True),
+    "category+level+budget": dict(
+        clauses=[("category", ["Data Science"]), ("experience_level", ["expert"])],
+        ranges={"budget_min": (2000, None)}, sort="budget_max", descending=True,
+    ),
+    "2 skills, most proposals": dict(
+        clauses=[("skills", ["python"]), ("skills", ["sql"])],
+        ranges=None, sort="proposal_count", descending=True,
+    ),
+    "narrow budget band": dict(
+        clauses=[], ranges={"budget_min": (4990, None), "budget_max": (None, 10000)},
+        sort="budget_min", descending=False,
+    ),
+}
+
+
+def make_rows(n: int, seed: int = 42):
+    rng = random.Random(seed)
+    popular = SKILLS[-6:]
+    for i in range(n):
+        skills = rng.sample(SKILLS, rng.randint(1, 5))
+        if rng.random() < 0.3:
+            skills.append(rng.choice(popular))
+        budget_min = round(rng.uniform(50, 5000), 2)
+        yield {
+            "id": i + 1,
+            "category": rng.choice(CATEGORIES),
+            "experience_level": rng.choice(LEVELS),
+            "budget_type": rng.choice(["fixed", "hourly"]),
+            "skills": sorted(set(skills)),
+            "budget_min": budget_min,
+            "budget_max": round(budget_min * rng.uniform(1, 3), 2),
+            "created_at": 1_700_000_000 + i * 30,
+            "proposal_count": rng.randint(0, 40),
+        }
+
+
+def build_index(rows):
+    index = FacetIndex(
+        facets=("category", "experience_level", "budget_type"),
+        multi_facets=("skills",),
+        ranges={"budget_min": 100, "budget_max": 100},
+        sorts=("created_at", "budget_min", "budget_max", "proposal_count"),
+    )
+    index.bulk_load((row["id"], row, {"id": row["id"]}) for row in rows)
+    return index
+
+
+def build_sqlite(rows):
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(
+        """
+        CREATE TABLE projects (id INTEGER PRIMARY KEY, category TEXT, experience_level TEXT,
+            budget_type TEXT, skills TEXT, budget_min REAL, budget_max REAL, status TEXT, created_at INTEGER);
+        CREATE TABLE proposals (id INTEGER PRIMARY KEY, project_id INTEGER, status TEXT);
+        """
+    )
+    conn.executemany(
+        "INSERT INTO projects VALUES (?, ?, ?, ?, ?, ?, ?, 'open', ?)",
+        ((r["id"], r["category"], r["experience_level"], r["budget_type"], ",".join(r["skills"]),
+          r["budget_min"], r["budget_max"], r["created_at"]) for r in rows),
+    )
+    conn.executemany(
+        "INSERT INTO proposals (project_id, status) VALUES (?, 'pending')",
+        ((r["id"],) for r in rows for _ in range(r["proposal_count"] // 8)),
+    )
+    return conn
+
+
+SQL_QUERIES = {
+    "all, newest": ("1=1", [], "p.created_at DESC"),
+    "category": ("p.category LIKE ?", ["%Web Development%"], "p.created_at DESC"),
+    "category+level+budget": (
+        "p.category LIKE ? AND p.experience_level = ? AND p.budget_min >= ?",
+        ["%Data Science%", "expert", 2000], "p.budget_max DESC",
+    ),
+    "2 skills, most proposals": (
+        "LOWER(p.skills) LIKE ? AND LOWER(p.skills) LIKE ?", ["%python%", "%sql%"], "proposal_count DESC",
+    ),
+    "narrow budget band": ("p.budget_min >= ? AND p.budget_max <= ?", [4990, 10000], "p.budget_min ASC"),
+}
+
+
+def run_sql(conn, where, params, order):
+    where = f"p.status = 'open' AND {where}"
+    conn.execute(f"SELECT COUNT(*) FROM projects p WHERE {where}", params).fetchall()
+    conn.execute(
+        f"""SELECT p.id, COALESCE(pc.proposal_count, 0) AS proposal_count FROM projects p
+            LEFT JOIN (SELECT project_id, COUNT(*) AS proposal_count FROM proposals
+                       WHERE status != 'withdrawn' GROUP BY project_id) pc ON p.id = pc.project_id
+            WHERE {where} ORDER BY {order} LIMIT 20 OFFSET 0""",
+        params,
+    ).fetchall()
+    conn.execute(
+        f"SELECT category, experience_level, COUNT(*) FROM projects p WHERE {where} "
+        "GROUP BY category, experience_level",
+        params,
+    ).fetchall()
+
+
+def timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--compare-sql", action="store_true")
+    args = parser.parse_args()
+
+    rows = list(make_rows(args.projects))
+    start = time.perf_counter()
+    index = build_index(rows)
+    print(f"bulk load: {len(index):,} projects in {time.perf_counter() - start:.1f}s")
+
+    conn = None
+    if args.compare_sql:
+        start = time.perf_counter()
+        conn = build_sqlite(rows)
+        print(f"sqlite load: {time.perf_counter() - start:.1f}s")
+
+    print(f"\n{'query':<28}{'matches':>10}{'index p50':>12}{'index max':>12}" + (f"{'sqlite p50':>13}" if conn else ""))
+    for name, query in QUERIES.items():
+        def search():
+            return index.search(limit=20, facets=("category", "experience_level"), **query)
+
+        total = search()["total_count"]
+        p50, worst = timed(search, args.iterations)
+        line = f"{name:<28}{total:>10,}{p50:>10.1f}ms{worst:>10.1f}ms"
+        if conn is not None:
+            where, params, order = SQL_QUERIES[name]
+            sql_p50, _ = timed(lambda: run_sql(conn, where, params, order), max(3, args.iterations // 5))
+            line += f"{sql_p50:>11.1f}ms"
+        print(line)
+
+    # Incremental maintenance cost
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for _ in range(1000):
+        row = dict(rows[rng.randrange(len(rows))], budget_min=round(rng.uniform(50, 5000), 2))
+        index.upsert(row["id"], row, {"id": row["id"]})
+    print(f"\nupsert: {(time.perf_counter() - start):.3f}ms per project (1000 updates)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+Benchmark: image bytes per page view, originals vs negotiated derivatives.
+
+Synthesises phone-camera uploads (``--width`` px JPEG at quality 92, with
+grain so they compress like photos). Builds their variants through a
+``DerivativePipeline`` writing to a temporary local storage. Then it prices
+a gig listing page: ``--cards`` cover images shown at 320 CSS px and the
+same number of seller avatars at 48 CSS px, at ``--dpr`` device pixels.
+
+The "before" page sends every original. The "after" page sends what
+``select`` would negotiate for a modern browser (AVIF), a WebP-only browser
+and a JPEG-only client. The run also reports build throughput.
+
+Usage:
+    python scripts/benchmarks/bench_image_derivatives.py [--images 12] [--cards 24] [--dpr 2] [--workers 0]
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+os.environ.setdefault("TURSO_DATABASE_URL", "libsql://bench.turso.io")
+os.environ.setdefault("TURSO_AUTH_TOKEN", "bench")
+
+from PIL import Image, ImageFilter  # noqa: E402
+
+from app.core.storage import LocalStorage  # noqa: E402
+from app.services.image_derivatives import DerivativePipeline  # noqa: E402
+
+BROWSERS = {
+    "avif browser": "image/avif,image/webp,image/apng,image/*,*/*;q=0.8",
+    "webp browser": "image/webp,*/*",
+    "jpeg only": "image/jpeg",
+}
+
+
+def synth_photo(rng: random.Random, width: int) -> bytes:
+    height = width * 3 // 4
+    small = Image.new("RGB", (32, 24))
+    small.putdata([tuple(rng.randrange(256) for _ in range(3)) for _ in range(32 * 24)])
+    img = small.resize((width, height), Image.BICUBIC).filter(ImageFilter.GaussianBlur(4))
+    grain = Image.effect_noise((width, height), 18).convert("RGB")
+    img = Image.blend(img, grain, 0.12)
+    out = io.BytesIO()
+    img.save(out, "JPEG", quality=92)
+    return out.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--images", type=int, default=12, help="distinct uploads to build")
+    parser.add_argument("--width", type=int, default=3000, help="upload width in px")
+    parser.add_argument("--cards", type=int, default=24, help="gig cards on the page")
+    parser.add_argument("--dpr", type=float, default=2.0, help="device pixel ratio")
+    parser.add_argument("--workers", type=int, default=0, help="0 = half the CPUs")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    originals = [synth_photo(rng, args.width) for _ in range(args.images)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalStorage()
+        storage.upload_dir = Path(tmp)
+        pipeline = DerivativePipeline(storage=storage, workers=args.workers)
+        print(f"formats {list(pipeline.formats)}  widths {list(pipeline.widths)}  workers {pipeline.workers}")
+
+        pipeline.build("gigs/warm-up.jpg", originals[0])  # pool start-up is not build cost
+        started = time.perf_counter()
+        futures = [pipeline.enqueue(f"gigs/{i}.jpg", data) for i, data in enumerate(originals)]
+        for f in futures:
+            f.result()
+        elapsed = time.perf_counter() - started
+        print(f"built {args.images} uploads in {elapsed:.2f} s "
+              f"({args.images / elapsed:.2f} images/s, {pipeline.stats['variants'] - len(pipeline.manifest('gigs/warm-up.jpg')['variants'])} variants)")
+
+        # Cover images and avatars cycle through the uploads
+        slots = [(f"gigs/{i % args.images}.jpg", 320) for i in range(args.cards)]
+        slots += [(f"gigs/{(i + 5) % args.images}.jpg", 48) for i in range(args.cards)]
+        before = sum(len(originals[int(p.split("/")[1].split(".")[0])]) for p, _ in slots)
+        print(f"{'originals':<14} {before / 1e6:8.2f} MB per page view")
+        for label, accept in BROWSERS.items():
+            after = sum(pipeline.select(path, accept, int(css * args.dpr))["bytes"] for path, css in slots)
+            print(f"{label:<14} {after / 1e6:8.2f} MB per page view  ({before / after:5.1f}x fewer bytes)")
+        pipeline.close()
+
+
+if __name__ == "__main__":
+    main()
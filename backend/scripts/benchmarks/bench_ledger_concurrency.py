@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+"""
+Benchmark: concurrent escrow releases, read-modify-write vs ledger postings.
+
+Funds E escrows for one contract and fires N releases (default 500) at them
+from a thread pool. Every database call pays a simulated HTTP round-trip
+(``--latency-ms``) against an in-memory SQLite stand-in for Turso whose
+``execute_many`` runs as one transaction.
+
+* legacy: the previous sequence - read the freelancer balance, add in Python,
+  write it back, then write the escrow's new released_amount (4 round-trips,
+  lost updates under concurrency);
+* ledger: ``escrow_service.release_escrow_funds`` - one batched posting with
+  relative updates.
+
+Reports throughput and the balance drift (expected minus actual) of the
+freelancer balance and the escrows' released amounts.
+
+Usage:
+    python scripts/benchmarks/bench_ledger_concurrency.py [--releases 500] [--workers 64] [--latency-ms 5]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import app.db.turso_http as turso_module  # noqa: E402
+import app.services.ledger as ledger_module  # noqa: E402
+from app.services import escrow_service  # noqa: E402
+from app.services.ledger import InsufficientFunds, Ledger  # noqa: E402
+
+FREELANCER_ID = 2
+CLIENT_ID = 1
+CONTRACT_ID = 10
+
+
+class SQLiteTurso:
+    def __init__(self, latency: float):
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+        self.lock = threading.Lock()
+        self.latency = latency
+        self.round_trips = 0
+
+    def _run(self, sql, params):
+        cur = self.conn.execute(sql, params or [])
+        cols = [d[0] for d in cur.description] if cur.description else []
+        return {"columns": cols, "rows": [list(r) for r in cur.fetchall()]}
+
+    def execute(self, sql, params=None):
+        time.sleep(self.latency)
+        with self.lock:
+            self.round_trips += 1
+            return self._run(sql, params)
+
+    def execute_many(self, statements):
+        time.sleep(self.latency)
+        with self.lock:
+            self.round_trips += 1
+            self.conn.execute("BEGIN")
+            try:
+                results = [self._run(s["q"], s.get("params")) for s in statements]
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+            return results
+
+
+def setup(latency: float, escrows: int, escrow_amount: float) -> SQLiteTurso:
+    db = SQLiteTurso(0)
+    db.conn.executescript(
+        """
+        CREATE TABLE users (id INTEGER PRIMARY KEY, account_balance REAL DEFAULT 0);
+        CREATE TABLE contracts (id INTEGER PRIMARY KEY, client_id INTEGER, freelancer_id INTEGER);
+        CREATE TABLE escrow (id INTEGER PRIMARY KEY AUTOINCREMENT, contract_id INTEGER, client_id INTEGER,
+            amount REAL, released_amount REAL, status TEXT, expires_at TEXT, notes TEXT,
+            created_at TEXT, updated_at TEXT);
+        """
+    )
+    db.conn.execute("INSERT INTO users VALUES (?, ?), (?, 0)", [CLIENT_ID, escrows * escrow_amount, FREELANCER_ID])
+    db.conn.execute("INSERT INTO contracts VALUES (?, ?, ?)", [CONTRACT_ID, CLIENT_ID, FREELANCER_ID])
+    turso_module.TursoHTTP._instance = db
+    ledger_module._ledger = Ledger(backend_factory=lambda: db)
+    ledger_module._ledger.reconcile(repair=True)
+    for _ in range(escrows):
+        escrow_service.create_escrow(CONTRACT_ID, CLIENT_ID, escrow_amount, None, None)
+    db.latency = latency
+    return db
+
+
+def legacy_release(db: SQLiteTurso, escrow_id: int, amount: float):
+    """The pre-ledger release: read, add in Python, write back."""
+    balance = db.execute("SELECT account_balance FROM users WHERE id = ?", [FREELANCER_ID])["rows"][0][0]
+    released = db.execute("SELECT released_amount FROM escrow WHERE id = ?", [escrow_id])["rows"][0][0]
+    db.execute("UPDATE users SET account_balance = ? WHERE id = ?", [balance + amount, FREELANCER_ID])
+    db.execute("UPDATE escrow SET released_amount = ? WHERE id = ?", [released + amount, escrow_id])
+
+
+def ledger_release(db: SQLiteTurso, escrow_id: int, amount: float):
+    escrow_service.release_escrow_funds(escrow_id, amount, FREELANCER_ID)
+
+
+def run(label, release, args):
+    db = setup(args.latency_ms / 1000, args.escrows, args.escrow_amount)
+    rng = random.Random(5)
+    jobs = [(rng.randint(1, args.escrows), args.amount) for _ in range(args.releases)]
+    rejected = 0
+
+    def one(job):
+        nonlocal rejected
+        try:
+            release(db, *job)
+        except InsufficientFunds:
+            rejected += 1
+
+    db.round_trips = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(one, jobs))
+    elapsed = time.perf_counter() - start
+
+    expected = (args.releases - rejected) * args.amount
+    paid = db._run("SELECT account_balance FROM users WHERE id = ?", [FREELANCER_ID])["rows"][0][0]
+    released = db._run("SELECT SUM(released_amount) FROM escrow", [])["rows"][0][0]
+    print(
+        f"{label:<8}{args.releases / elapsed:>10.0f}/s{db.round_trips:>12,}"
+        f"{expected - paid:>16.2f}{expected - released:>16.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--releases", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=64)
+    parser.add_argument("--escrows", type=int, default=20)
+    parser.add_argument("--escrow-amount", type=float, default=1000.0)
+    parser.add_argument("--amount", type=float, default=10.0)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'path':<8}{'throughput':>12}{'round-trips':>12}{'payee drift':>16}{'escrow drift':>16}")
+    run("legacy", legacy_release, args)
+    run("ledger", ledger_release, args)
+
+
+if __name__ == "__main__":
+    main()
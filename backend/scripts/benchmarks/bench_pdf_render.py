@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+"""
+Benchmark: PDF pages per second, single process vs the render pool.
+
+Builds ``--docs`` month-end style invoices, each with ``--items`` line items
+(several pages once the item table overflows). It renders them three ways:
+
+* serially in this process, the throughput of one request thread;
+* one ``submit`` per invoice on a ``PdfRenderService``, one pool task each;
+* one ``submit_batch``, rendered ``--chunk`` invoices per pool task.
+
+Job rows go to an in-memory SQLite database behind ``--latency`` ms of
+simulated Turso round trip per request, so per-document status writes show
+up next to render time. The run also prints what the first document in a
+fresh process pays for building font metrics and templates.
+
+Usage:
+    python scripts/benchmarks/bench_pdf_render.py [--docs 400] [--items 60] [--workers 0] [--chunk 20] [--latency 20]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+os.environ.setdefault("TURSO_DATABASE_URL", "libsql://bench.turso.io")
+os.environ.setdefault("TURSO_AUTH_TOKEN", "bench")
+
+from app.core.storage import LocalStorage  # noqa: E402
+from app.services.pdf_document import render_to_file  # noqa: E402
+from app.services.pdf_renderer import PdfRenderService, invoice_document  # noqa: E402
+
+COLD_START = """
+import io, time
+t = time.perf_counter()
+from app.services.pdf_document import render_bytes
+spec = {spec!r}
+a = time.perf_counter(); render_bytes(spec); b = time.perf_counter(); render_bytes(spec); c = time.perf_counter()
+print(f"{{(a - t) * 1000:.1f}} {{(b - a) * 1000:.2f}} {{(c - b) * 1000:.2f}}")
+"""
+
+
+class LatencySQLite:
+    """TursoHTTP stand-in with a fixed network delay per request."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def _run(self, sql, params):
+        cur = self.conn.execute(sql, params or [])
+        cols = [d[0] for d in cur.description] if cur.description else []
+        return {"columns": cols, "rows": [list(r) for r in cur.fetchall()]}
+
+    def execute(self, sql, params=None):
+        time.sleep(self.latency)
+        with self.lock:
+            self.requests += 1
+            return self._run(sql, params)
+
+    def execute_many(self, statements):
+        time.sleep(self.latency)
+        with self.lock:
+            self.requests += 1
+            return [self._run(s["q"], s.get("params")) for s in statements]
+
+
+def invoices(count: int, items: int):
+    rng = random.Random(11)
+    for n in range(count):
+        lines = [{"description": f"{rng.choice(['Design', 'Build', 'Review', 'Support'])} work - sprint {i + 1}",
+                  "quantity": rng.randint(1, 40), "rate": rng.choice([25.0, 40.0, 65.0])}
+                 for i in range(rng.randint(items // 2, items))]
+        for line in lines:
+            line["amount"] = line["quantity"] * line["rate"]
+        subtotal = sum(line["amount"] for line in lines)
+        yield invoice_document({
+            "id": n, "invoice_number": f"INV-202506-{n:05d}", "from_name": f"Freelancer {n % 97}",
+            "to_name": f"Client {n % 31}", "status": "sent", "created_at": "2025-06-30", "due_date": "2025-07-30",
+            "items": lines, "subtotal": subtotal, "tax": subtotal * 0.1, "total": subtotal * 1.1,
+            "notes": "Payment by bank transfer within 30 days. Thank you for your business.",
+        })
+
+
+def wait_all(service, job_ids):
+    for job_id in job_ids:
+        service.wait(job_id, timeout=600)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--docs", type=int, default=400, help="invoices to render")
+    parser.add_argument("--items", type=int, default=60, help="max line items per invoice")
+    parser.add_argument("--workers", type=int, default=0, help="pool processes, 0 = half the CPUs")
+    parser.add_argument("--chunk", type=int, default=20, help="invoices per pool task in batch mode")
+    parser.add_argument("--latency", type=float, default=20.0, help="simulated Turso round trip in ms")
+    args = parser.parse_args()
+
+    specs = list(invoices(args.docs, args.items))
+    sample = specs[0]
+    root = Path(__file__).resolve().parents[2]
+    out = subprocess.run([sys.executable, "-c", COLD_START.format(spec=sample)], cwd=root,
+                         capture_output=True, text=True, check=True).stdout.split()
+    print(f"fresh process: import {out[0]} ms, first document {out[1]} ms, warm document {out[2]} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        pages = sum(render_to_file(spec, os.path.join(tmp, f"serial-{i}.pdf"))["pages"] for i, spec in enumerate(specs))
+        serial = time.perf_counter() - started
+        print(f"{'single process':<22} {args.docs} docs {pages} pages in {serial:6.2f} s  "
+              f"{pages / serial:8.1f} pages/s")
+
+        storage = LocalStorage()
+        storage.upload_dir = Path(tmp)
+        for mode in ("submit per document", "batch"):
+            db = LatencySQLite(args.latency / 1000)
+            service = PdfRenderService(backend_factory=lambda: db, storage=storage,
+                                       workers=args.workers, chunk_size=args.chunk)
+            service.wait(service.submit(sample)["job_id"], timeout=120)  # pool start-up is not render cost
+            service.stats.update(pages=0, chunks=0)
+            db.requests = 0
+            started = time.perf_counter()
+            if mode == "batch":
+                batch = service.submit_batch(((spec, None, None) for spec in specs), kind="invoice")
+                while service.batch_status(batch["batch_id"])["status"] != "completed":
+                    time.sleep(0.05)
+            else:
+                wait_all(service, [service.submit(spec, kind="invoice")["job_id"] for spec in specs])
+            elapsed = time.perf_counter() - started
+            pages = service.stats["pages"]
+            print(f"{mode:<22} {args.docs} docs {pages} pages in {elapsed:6.2f} s  {pages / elapsed:8.1f} pages/s  "
+                  f"({serial / elapsed:4.1f}x, {service.workers} workers, {service.stats['chunks']} pool tasks, "
+                  f"{db.requests} db requests)")
+            service.close()
+
+
+if __name__ == "__main__":
+    main()
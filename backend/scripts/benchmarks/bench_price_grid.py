@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Benchmark: price estimator scenario grid vs one estimate_price call per scenario.
+
+Prices one project for every experience level x freelancer country x urgency x
+quality tier (4 x N x 5 x 4 scenarios; the default 63 countries give 5,040),
+first by looping ``estimate_price`` as the pricing page did, then with
+``estimate_price_grid`` (rates only, and rates plus the rounded rows the
+endpoint returns), and checks that both give the same totals.
+
+Usage:
+    python scripts/benchmarks/bench_price_grid.py [--countries 63] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from app.services import price_estimator_engine as engine  # noqa: E402
+
+
+def median_ms(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--countries", type=int, default=63)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    options = dict(
+        experience_levels=list(engine.EXPERIENCE_LEVELS),
+        freelancer_countries=list(engine.COUNTRY_DATA)[:args.countries],
+        urgencies=list(engine.URGENCY_MULTIPLIERS),
+        quality_tiers=list(engine.QUALITY_MULTIPLIERS),
+    )
+    project = dict(category="software_development", service_type="web_application",
+                   features=["auth", "payments", "search"], client_country="US")
+
+    def loop():
+        return [
+            engine.estimate_price(experience_level=level, freelancer_country=country,
+                                  urgency=urgency, quality_tier=tier, **project)["estimate"]
+            for level in options["experience_levels"]
+            for country in options["freelancer_countries"]
+            for urgency in options["urgencies"]
+            for tier in options["quality_tiers"]
+        ]
+
+    def grid():
+        return engine.estimate_price_grid(**project, **options)
+
+    def grid_rows():
+        return grid().rows()
+
+    loop_ms, estimates = median_ms(loop, args.runs)
+    grid_ms, priced = median_ms(grid, args.runs)
+    rows_ms, rows = median_ms(grid_rows, args.runs)
+
+    mismatches = sum(
+        1 for estimate, row in zip(estimates, rows)
+        if estimate["total_estimate"] != row["total_estimate"] or estimate["hourly_rate"] != row["hourly_rate"]
+    )
+    print(f"scenarios      {len(priced):>9}   (numpy {'yes' if priced.vectorized else 'no'})")
+    print(f"estimate loop  {loop_ms:9.2f} ms")
+    print(f"grid           {grid_ms:9.2f} ms   x{loop_ms / grid_ms:.0f}")
+    print(f"grid + rows    {rows_ms:9.2f} ms   x{loop_ms / rows_ms:.0f}")
+    print(f"mismatched     {mismatches:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+Benchmark: realtime dashboard polls, aggregate queries vs event-driven counters.
+
+Simulates ``--users`` open dashboards polling ``--polls`` times in total,
+interleaved with ``--events`` domain writes (proposals, messages, payments,
+contracts), against a database ``--latency`` ms away. The "aggregate"
+strategy runs the dashboard's aggregate queries on every poll, which is what
+serving real numbers without the counters would take. The "events"
+strategy publishes each write to ``RealtimeMetrics`` and answers polls from
+``snapshot``.
+
+Reports time per poll, database requests, and whether both strategies
+finish with the same numbers.
+
+Usage:
+    python scripts/benchmarks/bench_realtime_metrics.py [--users 200] [--polls 5000] [--events 2000] [--latency 20]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+os.environ.setdefault("TURSO_DATABASE_URL", "libsql://bench.turso.io")
+os.environ.setdefault("TURSO_AUTH_TOKEN", "bench")
+
+from app.services.realtime_metrics import RealtimeMetrics  # noqa: E402
+
+SCHEMA = [
+    "CREATE TABLE projects (id INTEGER PRIMARY KEY, client_id INTEGER)",
+    "CREATE TABLE proposals (id INTEGER PRIMARY KEY, project_id INTEGER, freelancer_id INTEGER, status TEXT)",
+    "CREATE TABLE contracts (id INTEGER PRIMARY KEY, freelancer_id INTEGER, client_id INTEGER, status TEXT)",
+    "CREATE TABLE messages (id INTEGER PRIMARY KEY, receiver_id INTEGER, is_read INTEGER, is_deleted INTEGER)",
+    "CREATE TABLE payments (id INTEGER PRIMARY KEY, from_user_id INTEGER, to_user_id INTEGER, amount REAL, "
+    "status TEXT, processed_at TEXT, updated_at TEXT)",
+]
+
+
+class LatencySQLite:
+    """TursoHTTP stand-in with a fixed network delay per request."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+        for ddl in SCHEMA:
+            self.conn.execute(ddl)
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def _run(self, sql, params):
+        cur = self.conn.execute(sql, params or [])
+        cols = [d[0] for d in cur.description] if cur.description else []
+        return {"columns": cols, "rows": [list(r) for r in cur.fetchall()]}
+
+    def execute_many(self, statements):
+        time.sleep(self.latency)
+        with self.lock:
+            self.requests += 1
+            return [self._run(s["q"], s.get("params")) for s in statements]
+
+
+def write(db, rng, users, metrics=None):
+    """Apply one random domain write to the database, and publish it when ``metrics`` is given."""
+    freelancer, client = rng.sample(users, 2)
+    kind = rng.choice(["proposal", "message", "payment", "contract"])
+    now = datetime.now(timezone.utc).isoformat()
+    if kind == "proposal":
+        project = db.conn.execute("INSERT INTO projects (client_id) VALUES (?)", [client]).lastrowid
+        db.conn.execute("INSERT INTO proposals (project_id, freelancer_id, status) VALUES (?, ?, 'submitted')",
+                        [project, freelancer])
+        event = ("proposal_submitted", {"freelancer_id": freelancer, "client_id": client})
+    elif kind == "message":
+        db.conn.execute("INSERT INTO messages (receiver_id, is_read, is_deleted) VALUES (?, 0, 0)", [freelancer])
+        event = ("message_sent", {"receiver_id": freelancer, "sender_id": client})
+    elif kind == "payment":
+        amount = rng.choice([50.0, 120.0, 400.0])
+        db.conn.execute("INSERT INTO payments (from_user_id, to_user_id, amount, status, processed_at, updated_at) "
+                        "VALUES (?, ?, ?, 'completed', ?, ?)", [client, freelancer, amount, now, now])
+        db.conn.execute("INSERT INTO payments (from_user_id, to_user_id, amount, status, updated_at) "
+                        "VALUES (?, ?, ?, 'pending', ?)", [client, freelancer, amount, now])
+        if metrics is not None:
+            metrics.publish("payment_completed", from_user_id=client, to_user_id=freelancer, amount=amount, at=now)
+        event = ("payment_created", {"from_user_id": client, "to_user_id": freelancer})
+    else:
+        db.conn.execute("INSERT INTO contracts (freelancer_id, client_id, status) VALUES (?, ?, 'active')",
+                        [freelancer, client])
+        event = ("contract_started", {"freelancer_id": freelancer, "client_id": client})
+    if metrics is not None:
+        metrics.publish(event[0], **event[1])
+
+
+def run(strategy, args):
+    rng = random.Random(3)
+    users = list(range(1, args.users + 1))
+    db = LatencySQLite(args.latency / 1000)
+    steps = ["poll"] * args.polls + ["write"] * args.events
+    rng.shuffle(steps)
+    metrics = RealtimeMetrics(backend_factory=lambda: db, background=False)
+    spent = 0.0
+    for step in steps:
+        if step == "write":
+            write(db, rng, users, metrics if strategy == "events" else None)
+            continue
+        user_id = rng.choice(users)
+        started = time.perf_counter()
+        if strategy == "events":
+            metrics.snapshot(user_id)
+        else:
+            metrics.load([user_id])  # the same aggregate queries, run for every poll
+            metrics.peek(user_id)
+        spent += time.perf_counter() - started
+    metrics.load(users)
+    final = {u: metrics.peek(u)["metrics"] for u in users}
+    return spent, db.requests, final
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--polls", type=int, default=5000)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=20.0, help="simulated Turso round trip in ms")
+    args = parser.parse_args()
+
+    results = {}
+    for strategy in ("aggregate", "events"):
+        spent, requests, final = run(strategy, args)
+        results[strategy] = final
+        print(f"{strategy:<10} {spent / args.polls * 1000:8.3f} ms/poll  {requests:6d} db requests")
+    print(f"final numbers match: {results['aggregate'] == results['events']}")
+
+
+if __name__ == "__main__":
+    main()
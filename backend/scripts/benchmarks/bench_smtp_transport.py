@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Benchmark: email throughput, per-message smtplib sessions vs the pooled transport.
+
+Starts a local SMTP stub server (ESMTP with AUTH PLAIN and PIPELINING) that
+delays every reply by ``--rtt-ms`` to emulate the network round-trip to a
+real relay, then sends N messages:
+
+* smtplib: the previous EmailService behaviour - connect, EHLO, login,
+  send, quit per message (sequentially, and from ``--workers`` threads);
+* pool: ``SMTPPool.send_many`` over ``--pool-size`` persistent
+  authenticated connections with pipelined envelopes.
+
+Usage:
+    python scripts/benchmarks/bench_smtp_transport.py [--messages 500] [--rtt-ms 5] [--pool-size 4]
+"""
+import argparse
+import asyncio
+import os
+import smtplib
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from app.services.smtp_transport import SMTPPool  # noqa: E402
+
+
+class StubServer:
+    """Sends every reply ``rtt`` seconds after its command arrived (pipelined replies overlap)."""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.connections = 0
+        self.delivered = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._session, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def _reply(self, writer, data: bytes):
+        asyncio.get_running_loop().call_later(self.rtt, writer.write, data)
+
+    async def _session(self, reader, writer):
+        self.connections += 1
+        self._reply(writer, b"220 stub ESMTP\r\n")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                verb = line[:4].upper()
+                if verb == b"EHLO":
+                    self._reply(writer, b"250-stub\r\n250-AUTH PLAIN\r\n250 PIPELINING\r\n")
+                elif verb == b"AUTH":
+                    self._reply(writer, b"235 ok\r\n")
+                elif verb == b"DATA":
+                    self._reply(writer, b"354 go ahead\r\n")
+                    while await reader.readline() != b".\r\n":
+                        pass
+                    self.delivered += 1
+                    self._reply(writer, b"250 queued\r\n")
+                elif verb == b"QUIT":
+                    writer.write(b"221 bye\r\n")
+                    writer.close()
+                    return
+                else:
+                    self._reply(writer, b"250 ok\r\n")
+        except ConnectionError:
+            return
+
+
+def make_message(i: int) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = "MegiLance <noreply@megilance.test>"
+    msg["To"] = f"user{i}@example.test"
+    msg["Subject"] = f"Your proposal #{i} was accepted"
+    msg.add_alternative("<p>" + "Congratulations! " * 40 + "</p>", subtype="html")
+    return msg
+
+
+def smtplib_send(port: int, msg: EmailMessage):
+    with smtplib.SMTP("127.0.0.1", port) as server:
+        server.login("user", "secret")
+        server.send_message(msg)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--rtt-ms", type=float, default=5.0)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    stub = StubServer(args.rtt_ms / 1000)
+    loop.run_until_complete(stub.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    messages = [make_message(i) for i in range(args.messages)]
+
+    def report(label, elapsed, connections):
+        print(f"{label:<28}{args.messages / elapsed:>10.0f} msg/s{connections:>14,} connections")
+
+    start = time.perf_counter()
+    for msg in messages:
+        smtplib_send(stub.port, msg)
+    report("smtplib, sequential", time.perf_counter() - start, stub.connections)
+
+    stub.connections = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.workers) as pool:
+        list(pool.map(lambda m: smtplib_send(stub.port, m), messages))
+    report(f"smtplib, {args.workers} threads", time.perf_counter() - start, stub.connections)
+
+    async def pooled():
+        pool = SMTPPool("127.0.0.1", stub.port, "user", "secret", size=args.pool_size, starttls=False)
+        start = time.perf_counter()
+        results = await pool.send_many(messages)
+        elapsed = time.perf_counter() - start
+        await pool.close()
+        assert all(r.ok for r in results)
+        return elapsed
+
+    stub.connections = 0
+    elapsed = asyncio.run(pooled())
+    report(f"pool, {args.pool_size} connections", elapsed, stub.connections)
+    asyncio.run_coroutine_threadsafe(stub.stop(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+
+
+if __name__ == "__main__":
+    main()
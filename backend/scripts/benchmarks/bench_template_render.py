@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Benchmark: rendering email templates for a bulk notification.
+
+Renders every default email template for N recipients (default 20k) with the
+legacy per-variable ``str.replace`` loop and with the precompiled
+``CompiledTemplate`` path, and times i18n interpolation both ways.
+
+Usage:
+    python scripts/benchmarks/bench_template_render.py [--recipients 20000] [--repeat 3]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from app.services.email_templates import DEFAULT_TEMPLATES  # noqa: E402
+from app.services.template_compiler import BRACES, CompiledTemplate, compile_cached  # noqa: E402
+
+PARTS = ("subject", "html_body", "text_body")
+
+
+def make_variables(n: int):
+    rows = []
+    for i in range(n):
+        rows.append({
+            "user_name": f"User {i}", "client_name": f"Client {i % 97}", "freelancer_name": f"Dev {i % 89}",
+            "freelancer_initials": "DV", "freelancer_title": "Engineer", "project_title": f"Project {i % 500}",
+            "amount": f"{(i % 1000) * 3.5:,.2f}", "bid_amount": "1,200.00", "delivery_time": "7 days",
+            "cover_letter_preview": "Happy to help...", "payment_date": "October 18, 2026",
+            "transaction_id": f"TXN-{i:06d}", "from_name": "Acme", "reset_url": f"https://x/reset/{i}",
+            "reset_code": f"{i % 999999:06d}", "expiry_hours": "24", "proposal_url": f"https://x/p/{i}",
+            "year": 2026, "support_url": "https://megilance.com/support",
+            "dashboard_url": "https://megilance.com/dashboard",
+        })
+    return rows
+
+
+def legacy_render(config, variables):
+    out = {}
+    for part in PARTS:
+        text = config[part]
+        for name, value in variables.items():
+            text = text.replace(f"{{{{{name}}}}}", str(value))
+        out[part] = text
+    return out
+
+
+def compiled_render(compiled, variables):
+    return {part: tpl.render(variables) for part, tpl in compiled.items()}
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--recipients", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    variables = make_variables(args.recipients)
+    configs = list(DEFAULT_TEMPLATES.values())
+    compiled = [{part: CompiledTemplate(c[part]) for part in PARTS} for c in configs]
+
+    for c, comp in zip(configs, compiled):
+        assert legacy_render(c, variables[0]) == compiled_render(comp, variables[0])
+
+    total = args.recipients * len(configs)
+    legacy = timed(lambda: [legacy_render(c, v) for c in configs for v in variables], args.repeat)
+    fast = timed(lambda: [compiled_render(c, v) for c in compiled for v in variables], args.repeat)
+    print(f"email renders: {total:,} ({len(configs)} templates x {args.recipients:,} recipients)")
+    print(f"  str.replace loop : {legacy:7.3f}s  {total / legacy:12,.0f} renders/s")
+    print(f"  compiled         : {fast:7.3f}s  {total / fast:12,.0f} renders/s  ({legacy / fast:.1f}x)")
+
+    text = "Hi {name}, you have {count} new messages about {project}"
+    params = [{"name": v["user_name"], "count": i % 9, "project": v["project_title"]}
+              for i, v in enumerate(variables)]
+
+    def legacy_i18n():
+        for p in params:
+            t = text
+            for key, value in p.items():
+                t = t.replace(f"{{{key}}}", str(value))
+
+    legacy = timed(legacy_i18n, args.repeat)
+    fast = timed(lambda: [compile_cached(text, BRACES).render(p) for p in params], args.repeat)
+    print(f"i18n interpolations: {len(params):,}")
+    print(f"  str.replace loop : {legacy:7.3f}s")
+    print(f"  compiled         : {fast:7.3f}s  ({legacy / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
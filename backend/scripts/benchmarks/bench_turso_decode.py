@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""
+Benchmark: decoding a Turso HTTP result into application dicts.
+
+Builds a synthetic N-row result (default 100k) shaped like the project search
+query and compares the legacy path - every cell wrapped as
+``{"type","value"}`` and read back through ``to_str``/``to_float`` - with the
+typed ``ResultSet``/``Row`` path that reads raw values in place. Also times
+``parse_rows`` on both result shapes.
+
+Usage:
+    python scripts/benchmarks/bench_turso_decode.py [--rows 100000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from app.db.turso_http import ResultSet, _wrap_cell, parse_rows  # noqa: E402
+from app.services.search_service import row_to_project  # noqa: E402
+
+COLUMNS = [
+    "id", "title", "description", "category", "budget_type", "budget_min", "budget_max",
+    "experience_level", "estimated_duration", "status", "skills", "client_id",
+    "created_at", "updated_at", "proposal_count",
+]
+
+
+def make_result(n: int):
+    rng = random.Random(7)
+    rows = []
+    for i in range(n):
+        budget_min = round(rng.uniform(50, 5000), 2)
+        rows.append([
+            i + 1, f"Project {i}", "Build something useful " * 4, rng.choice(["Design", "Web", "Data"]),
+            rng.choice(["fixed", "hourly"]), budget_min, round(budget_min * 2, 2), "expert",
+            None if i % 5 == 0 else "1-3 months", "open", "python,sql,react", rng.randint(1, 5000),
+            "2024-05-01T10:00:00", None, rng.randint(0, 40),
+        ])
+    return {"columns": COLUMNS, "rows": rows}
+
+
+def legacy_decode(raw):
+    """What execute_query + row_to_project did before: wrap every cell, then unwrap."""
+    rows = [[_wrap_cell(v) for v in values] for values in raw["rows"]]
+    items = []
+    for row in rows:
+        item = row_to_project(row)
+        item["proposal_count"] = row[14].get("value") if row[14].get("type") != "null" else 0
+        items.append(item)
+    return items
+
+
+def typed_decode(raw):
+    items = []
+    for row in ResultSet.from_result(raw):
+        item = row_to_project(row)
+        item["proposal_count"] = row.get("proposal_count", 0)
+        items.append(item)
+    return items
+
+
+def legacy_parse_rows(raw):
+    return parse_rows({
+        "cols": [{"name": c} for c in raw["columns"]],
+        "rows": [[_wrap_cell(v) for v in values] for values in raw["rows"]],
+    })
+
+
+def typed_parse_rows(raw):
+    return ResultSet.from_result(raw).dicts()
+
+
+def measure(fn, raw, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(raw)
+        samples.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    fn(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(samples), peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    raw = make_result(args.rows)
+    sample = {"columns": COLUMNS, "rows": raw["rows"][:100]}
+    assert legacy_decode(sample) == typed_decode(sample)
+
+    print(f"{'path':<28}{'p50':>10}{'peak alloc':>14}")
+    for label, fn in (
+        ("row_to_project (wrapped)", legacy_decode),
+        ("row_to_project (Row)", typed_decode),
+        ("parse_rows (wrapped)", legacy_parse_rows),
+        ("ResultSet.dicts", typed_parse_rows),
+    ):
+        p50, peak = measure(fn, raw, args.repeat)
+        print(f"{label:<28}{p50:>8.0f}ms{peak:>11.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
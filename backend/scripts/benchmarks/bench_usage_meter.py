@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Benchmark: quota enforcement cost on the proposal path, DB count vs usage meter.
+
+Simulates ``--users`` freelancers submitting ``--proposals`` proposals in
+total against a database ``--latency`` ms away. The "count" strategy runs a
+``COUNT(*)`` on every submission, which is what enforcing quotas without the
+meter would take. The "meter" strategy calls ``UsageMeter.check`` and
+``record``. Counters load in the background and deltas flush every
+``--flush`` seconds.
+
+Reports time spent on quota checks per submission, database requests, and
+the worst overshoot past any user's limit.
+
+Usage:
+    python scripts/benchmarks/bench_usage_meter.py [--users 200] [--proposals 4000] [--latency 20] [--flush 1]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+os.environ.setdefault("TURSO_DATABASE_URL", "libsql://bench.turso.io")
+os.environ.setdefault("TURSO_AUTH_TOKEN", "bench")
+
+from app.services.usage_meter import UsageMeter  # noqa: E402
+
+FREE_LIMIT = 10  # proposals per month on the free plan
+
+
+class LatencySQLite:
+    """TursoHTTP stand-in with a fixed network delay per request."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+        self.conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, profile_data TEXT)")
+        self.conn.execute("CREATE TABLE proposals (id INTEGER PRIMARY KEY, freelancer_id INTEGER, created_at TEXT)")
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def _run(self, sql, params):
+        cur = self.conn.execute(sql, params or [])
+        cols = [d[0] for d in cur.description] if cur.description else []
+        return {"columns": cols, "rows": [list(r) for r in cur.fetchall()]}
+
+    def execute(self, sql, params=None):
+        time.sleep(self.latency)
+        with self.lock:
+            self.requests += 1
+            return self._run(sql, params)
+
+    def execute_many(self, statements):
+        time.sleep(self.latency)
+        with self.lock:
+            self.requests += 1
+            return [self._run(s["q"], s.get("params")) for s in statements]
+
+
+class Freelancer:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.profile_data = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--proposals", type=int, default=4000)
+    parser.add_argument("--latency", type=float, default=20.0, help="simulated Turso round trip in ms")
+    parser.add_argument("--flush", type=float, default=1.0, help="meter flush interval in seconds")
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    users = [Freelancer(i + 1) for i in range(args.users)]
+    submissions = [rng.choice(users) for _ in range(args.proposals)]
+    month = time.strftime("%Y-%m-01")
+
+    db = LatencySQLite(args.latency / 1000)
+    accepted, spent = {}, 0.0
+    for user in submissions:
+        started = time.perf_counter()
+        used = db.execute("SELECT COUNT(*) FROM proposals WHERE freelancer_id = ? AND created_at >= ?",
+                          [user.id, month])["rows"][0][0]
+        spent += time.perf_counter() - started
+        if used < FREE_LIMIT:
+            db.conn.execute("INSERT INTO proposals (freelancer_id, created_at) VALUES (?, ?)", [user.id, month])
+            accepted[user.id] = accepted.get(user.id, 0) + 1
+    print(f"{'count per call':<15} {spent / args.proposals * 1000:7.3f} ms/check  {db.requests:6d} db requests  "
+          f"max overshoot {max(accepted.values()) - FREE_LIMIT:+d}")
+
+    db = LatencySQLite(args.latency / 1000)
+    meter = UsageMeter(backend_factory=lambda: db, flush_interval=args.flush)
+    accepted, spent = {}, 0.0
+    for user in submissions:
+        started = time.perf_counter()
+        allowed = meter.check(user, "proposals")["allowed"]
+        if allowed:
+            meter.record(user, "proposals")
+        spent += time.perf_counter() - started
+        if allowed:
+            accepted[user.id] = accepted.get(user.id, 0) + 1
+    meter.close()
+    print(f"{'usage meter':<15} {spent / args.proposals * 1000:7.3f} ms/check  {db.requests:6d} db requests  "
+          f"max overshoot {max(accepted.values()) - FREE_LIMIT:+d}  "
+          f"({meter.stats['sync_loads']} synchronous loads, {meter.stats['flushes']} flushes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+"""
+Benchmark: WebRTC call setup time, Socket.IO push vs REST polling.
+
+Two participants run the usual trickle-ICE exchange:
+1. The caller sends an offer and gathers ``--candidates`` ICE candidates,
+   one every ``--gather-ms``.
+2. The callee answers once the offer arrives, then gathers its own.
+
+The run reports two times. "ICE start" is when both sides have the
+remote description and at least one remote candidate, so connectivity
+checks can begin. "Complete" is when every candidate has arrived.
+
+* push: real Socket.IO clients against the app's signaling relay on a
+  local uvicorn server (``webrtc_join`` / ``webrtc_signal`` events). The
+  room registry lives in an in-memory SQLite stand-in for Turso whose calls
+  pay ``--db-ms``.
+* polling: ``VideoInterviewService.handle_signaling`` to send. Each side
+  calls ``get_pending_signals`` every ``--poll-ms``, and each REST call
+  pays ``--http-ms``.
+
+Usage:
+    python scripts/benchmarks/bench_webrtc_signaling.py [--runs 20] [--poll-ms 500] [--candidates 6]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import sqlite3
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+os.environ.setdefault("TURSO_DATABASE_URL", "libsql://bench.turso.io")
+os.environ.setdefault("TURSO_AUTH_TOKEN", "bench")
+
+import socketio  # noqa: E402
+import uvicorn  # noqa: E402
+
+from app.core.websocket import WebSocketManager  # noqa: E402
+from app.services import webrtc_signaling  # noqa: E402
+from app.services.video_interview import VideoInterviewService  # noqa: E402
+from app.services.webrtc_signaling import SignalingRegistry, WebRTCSignalingServer  # noqa: E402
+
+TOKENS = {"client": "bench-client-token", "freelancer": "bench-freelancer-token"}
+CLIENT, FREELANCER = 1, 2
+
+
+class SQLiteTurso:
+    def __init__(self, latency: float):
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+        self.lock = threading.Lock()
+        self.latency = latency
+
+    def _run(self, sql, params):
+        cur = self.conn.execute(sql, params or [])
+        cols = [d[0] for d in cur.description] if cur.description else []
+        return {"columns": cols, "rows": [list(r) for r in cur.fetchall()]}
+
+    def execute(self, sql, params=None):
+        time.sleep(self.latency)
+        with self.lock:
+            return self._run(sql, params)
+
+    def execute_many(self, statements):
+        time.sleep(self.latency)
+        with self.lock:
+            self.conn.execute("BEGIN")
+            results = [self._run(s["q"], s.get("params")) for s in statements]
+            self.conn.execute("COMMIT")
+            return results
+
+
+class Peer:
+    """Call-setup progress of one side."""
+
+    def __init__(self, expected_candidates: int):
+        self.expected = expected_candidates
+        self.remote_description = False
+        self.remote_candidates = 0
+        self.ice_start = None
+        self.complete = None
+
+    def receive(self, kind: str, count: int = 0) -> None:
+        now = time.perf_counter()
+        if kind in ("offer", "answer"):
+            self.remote_description = True
+        self.remote_candidates += count
+        if self.ice_start is None and self.remote_description and self.remote_candidates:
+            self.ice_start = now
+        if self.complete is None and self.remote_description and self.remote_candidates >= self.expected:
+            self.complete = now
+
+
+async def gather(send, args) -> None:
+    for i in range(args.candidates):
+        await asyncio.sleep(args.gather_ms / 1000)
+        await send("ice-candidate", {"candidate": f"candidate:{i} 1 udp 2122260223 10.0.0.{i} 5000{i} typ host"})
+
+
+async def push_run(url: str, args) -> tuple:
+    caller, callee = Peer(args.candidates), Peer(args.candidates)
+    clients = {CLIENT: socketio.AsyncClient(), FREELANCER: socketio.AsyncClient()}
+    offered = asyncio.Event()
+
+    def handler(peer, user_id):
+        async def on_signal(message):
+            if message["type"] == "ice-candidates":
+                peer.receive("candidates", len(message["data"]["candidates"]))
+            elif message["type"] == "ice-candidate":
+                peer.receive("candidate", 1 if message["data"] else 0)
+            else:
+                peer.receive(message["type"])
+                if message["type"] == "offer":
+                    offered.set()
+        clients[user_id].on("webrtc_signal", on_signal)
+
+    handler(caller, CLIENT)
+    handler(callee, FREELANCER)
+    for user_id, client in clients.items():
+        await client.connect(url, socketio_path="ws/socket.io", transports=["websocket"])
+        role = "client" if user_id == CLIENT else "freelancer"
+        joined = await client.call("webrtc_join", {"room_id": "bench", "token": TOKENS[role]})
+        assert joined["ok"], joined
+
+    def sender(user_id, to_user_id):
+        async def send(kind, data):
+            await clients[user_id].emit("webrtc_signal", {"room_id": "bench", "to_user_id": to_user_id,
+                                                          "type": kind, "data": data})
+        return send
+
+    started = time.perf_counter()
+    await sender(CLIENT, FREELANCER)("offer", {"sdp": "v=0 offer"})
+    caller_gathering = asyncio.create_task(gather(sender(CLIENT, FREELANCER), args))
+    await offered.wait()
+    await sender(FREELANCER, CLIENT)("answer", {"sdp": "v=0 answer"})
+    await gather(sender(FREELANCER, CLIENT), args)
+    await caller_gathering
+    while caller.complete is None or callee.complete is None:
+        await asyncio.sleep(0.001)
+    for client in clients.values():
+        await client.disconnect()
+    return max(caller.ice_start, callee.ice_start) - started, max(caller.complete, callee.complete) - started
+
+
+async def polling_run(service: VideoInterviewService, args) -> tuple:
+    caller, callee = Peer(args.candidates), Peer(args.candidates)
+    http = args.http_ms / 1000
+    offered = asyncio.Event()
+    done = asyncio.Event()
+
+    def sender(user_id, to_user_id):
+        async def send(kind, data):
+            await asyncio.sleep(http)
+            await service.handle_signaling("bench", user_id, to_user_id, kind, data)
+        return send
+
+    async def poll(peer, user_id):
+        while not done.is_set():
+            await asyncio.sleep(args.poll_ms / 1000)
+            await asyncio.sleep(http)
+            for message in await service.get_pending_signals(user_id):
+                peer.receive(message["type"], 1 if message["type"] == "ice-candidate" else 0)
+                if message["type"] == "offer":
+                    offered.set()
+
+    pollers = [asyncio.create_task(poll(caller, CLIENT)), asyncio.create_task(poll(callee, FREELANCER))]
+    started = time.perf_counter()
+    await sender(CLIENT, FREELANCER)("offer", {"sdp": "v=0 offer"})
+    caller_gathering = asyncio.create_task(gather(sender(CLIENT, FREELANCER), args))
+    await offered.wait()
+    await sender(FREELANCER, CLIENT)("answer", {"sdp": "v=0 answer"})
+    await gather(sender(FREELANCER, CLIENT), args)
+    await caller_gathering
+    while caller.complete is None or callee.complete is None:
+        await asyncio.sleep(0.001)
+    done.set()
+    await asyncio.gather(*pollers)
+    return max(caller.ice_start, callee.ice_start) - started, max(caller.complete, callee.complete) - started
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def main_async(args):
+    registry = SignalingRegistry(backend_factory=lambda db=SQLiteTurso(args.db_ms / 1000): db)
+    registry.open_room("bench", CLIENT, FREELANCER, TOKENS)
+    manager = WebSocketManager()
+    relay = WebRTCSignalingServer(registry=registry)
+    relay.attach(manager)
+    webrtc_signaling._server = relay  # handle_signaling checks presence through the module server
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(socketio.ASGIApp(manager.sio, socketio_path="ws/socket.io"),
+                                           host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    service = VideoInterviewService(db=None)
+    participants = {uid: {"socket_id": f"rest-{uid}"} for uid in (CLIENT, FREELANCER)}
+    service._active_rooms["bench"] = {"interview": {}, "participants": participants, "started_at": None,
+                                      "recording": False}
+
+    for label, run in (("push", lambda: push_run(f"http://127.0.0.1:{port}", args)),
+                       (f"poll {args.poll_ms:.0f}ms", lambda: polling_run(service, args))):
+        results = [await run() for _ in range(args.runs)]
+        ice = [r[0] * 1000 for r in results]
+        complete = [r[1] * 1000 for r in results]
+        print(f"{label:<12} ICE start p50 {statistics.median(ice):7.1f} ms  max {max(ice):7.1f} ms   "
+              f"complete p50 {statistics.median(complete):7.1f} ms  max {max(complete):7.1f} ms")
+    print(f"relay stats {relay.stats}")
+
+    server.should_exit = True
+    await serving
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--candidates", type=int, default=6)
+    parser.add_argument("--gather-ms", type=float, default=5.0)
+    parser.add_argument("--poll-ms", type=float, default=500.0)
+    parser.add_argument("--http-ms", type=float, default=20.0, help="simulated REST round-trip")
+    parser.add_argument("--db-ms", type=float, default=20.0, help="simulated Turso round-trip")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+Image derivative backfill.
+
+Builds the resized AVIF/WebP variants (see
+``app/services/image_derivatives.py``) for avatars, portfolio and gig images
+uploaded before the pipeline existed, reading originals from
+``settings.upload_dir``. Images that already have a manifest
+are skipped unless ``--force`` is given. Prints one JSON line per image and
+a summary.
+
+Usage:
+    python scripts/build_image_derivatives.py [--force]
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.config import get_settings  # noqa: E402
+from app.services.image_derivatives import get_derivative_pipeline  # noqa: E402
+
+IMAGE_DIRS = ("avatars", "portfolio", "gigs")
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--force", action="store_true", help="rebuild images that already have variants")
+    args = parser.parse_args()
+
+    base = Path(get_settings().upload_dir)
+    pipeline = get_derivative_pipeline()
+    summary = {"built": 0, "existing": 0, "skipped": 0, "failed": 0}
+    try:
+        for folder in IMAGE_DIRS:
+            for path in sorted((base / folder).glob("*")):
+                if path.suffix.lower() not in IMAGE_SUFFIXES or not path.is_file():
+                    continue
+                rel_path = path.relative_to(base).as_posix()
+                if not args.force and pipeline.manifest(rel_path):
+                    summary["existing"] += 1
+                    continue
+                try:
+                    manifest = pipeline.build(rel_path, path.read_bytes())
+                except Exception as e:
+                    summary["failed"] += 1
+                    print(json.dumps({"path": rel_path, "error": str(e)}))
+                    continue
+                summary["built" if manifest else "skipped"] += 1
+                print(json.dumps({"path": rel_path, "variants": len(manifest["variants"]) if manifest else 0}))
+    finally:
+        pipeline.close()
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+"""
+Market rate calibration job.
+
+Recomputes the price estimator's platform percentile tables (p10/p50/p90
+hourly rate and project budget per category, service type and freelancer
+country) from contracts, projects, gigs and freelancer profiles, publishes
+them as a new ``market_rate_snapshots`` version and prints the report as
+JSON. Running API workers pick the new version up within
+``REFRESH_SECONDS``. Run it from cron; ``--dry-run`` builds the tables
+without publishing them.
+
+Usage:
+    python scripts/calibrate_market_rates.py [--dry-run] [--min-samples 5]
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.market_calibration import MIN_CELL_SAMPLES, get_market_rate_store  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--min-samples", type=int, default=MIN_CELL_SAMPLES)
+    args = parser.parse_args()
+
+    report = get_market_rate_store().calibrate(publish=not args.dry_run, min_samples=args.min_samples)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+"""
+Ledger reconciliation job.
+
+Checks that every posting balances, that the materialized running totals in
+``ledger_balances`` match the journal, and that the legacy balance columns
+(users, wallet_balances, escrow) match the ledger. Prints the report as JSON
+and exits non-zero when anything is out of line. Run it from cron; add
+``--repair`` to rebuild running totals and adopt balances written outside
+the ledger as adjustment postings.
+
+Usage:
+    python scripts/reconcile_ledger.py [--repair]
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.ledger import get_ledger  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repair", action="store_true")
+    args = parser.parse_args()
+
+    report = get_ledger().reconcile(repair=args.repair)
+    print(json.dumps(report, indent=2))
+    clean = not (report["unbalanced_postings"] or report["balance_drift"] or report["legacy_drift"])
+    sys.exit(0 if clean or report["repaired"] else 1)
+
+
+if __name__ == "__main__":
+    main()
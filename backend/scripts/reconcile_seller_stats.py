@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+"""
+Seller stats reconciliation job.
+
+Order events keep seller counters, JSS, levels and the leaderboard current
+incrementally; this job recomputes every seller's counters from
+``gig_orders`` and ``gig_reviews``, republishes ``seller_stats`` and prints
+the report (sellers published, sellers whose counters had drifted) as JSON.
+Run it from cron; pass ``--seller`` to reconcile a single seller.
+
+``--backfill`` is the one-time deploy job instead: it seeds counters for
+sellers whose orders predate them and prints how many were seeded. Run it
+before order events start updating the counters.
+
+Usage:
+    python scripts/reconcile_seller_stats.py [--seller USER_ID]
+    python scripts/reconcile_seller_stats.py --backfill
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.seller_stats_engine import get_seller_stats_engine  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seller", type=int, default=None)
+    parser.add_argument("--backfill", action="store_true", help="seed counters for sellers with older orders")
+    args = parser.parse_args()
+
+    engine = get_seller_stats_engine()
+    report = engine.backfill() if args.backfill else engine.reconcile(seller_id=args.seller)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+Month-end invoice PDFs.
+
+Queues a PDF for every invoice created in the given month (default: the
+previous month) as one render batch (see ``app/services/pdf_renderer.py``),
+waits for the batch to finish and prints its status as JSON. The same batch
+can be started from the API with
+``POST /api/pdf-jobs/batches/month-end-invoices``.
+
+Usage:
+    python scripts/render_month_end_invoices.py [--year 2025 --month 6] [--timeout 600]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.pdf_renderer import get_pdf_renderer, render_month_end_invoices  # noqa: E402
+
+
+def main():
+    today = datetime.now(timezone.utc)
+    last_year, last_month = (today.year, today.month - 1) if today.month > 1 else (today.year - 1, 12)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--year", type=int, default=last_year)
+    parser.add_argument("--month", type=int, default=last_month, choices=range(1, 13))
+    parser.add_argument("--timeout", type=float, default=600.0, help="seconds to wait for the batch")
+    args = parser.parse_args()
+
+    service = get_pdf_renderer()
+    started = time.perf_counter()
+    try:
+        batch = render_month_end_invoices(args.year, args.month, service)
+        print(json.dumps(batch))
+        status = batch
+        deadline = time.monotonic() + args.timeout
+        while batch["jobs"] and time.monotonic() < deadline:
+            status = service.batch_status(batch["batch_id"])
+            if status and status["status"] == "completed":
+                break
+            time.sleep(1.0)
+        elapsed = time.perf_counter() - started
+        pages = status.get("pages", 0) if status else 0
+        print(json.dumps({**(status or {}), "seconds": round(elapsed, 2),
+                          "pages_per_second": round(pages / elapsed, 1) if elapsed else None}))
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
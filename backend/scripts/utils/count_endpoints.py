@@ -2,6 +2,9 @@
 import sys
 sys.path.insert(0, '.')
 from main import app
+from app.api.routers import api_routes
+
+api_routes.load_all()
 
 endpoint_count = 0
 methods_count = {}
@@ -4,7 +4,9 @@
 import pytest
 import sys
 import os
-from typing import Generator
+import sqlite3
+import threading
+from typing import Generator, Iterable, Optional
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
@@ -14,6 +16,7 @@ from datetime import datetime, timedelta, timezone
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from main import app
+from app.db import change_feed
 from app.db.base import Base
 from app.db.session import get_db
 from app.core.security import create_access_token, create_refresh_token, get_password_hash
@@ -147,6 +150,71 @@ def admin_headers(admin_user: User) -> dict:
     }
 
 
+# ==================== Turso Stand-in ====================
+
+class SQLiteTurso:
+    """
+    TursoHTTP stand-in over an in-memory SQLite database.
+
+    ``execute_many`` runs as one transaction like the HTTP batch endpoint,
+    and writes are reported to ``change_feed`` as TursoHTTP does. Counts
+    requests (``execute`` and ``execute_many`` calls), batches and
+    statements; ``during_query`` is called once after the next batch.
+    """
+
+    def __init__(self, schema: Iterable[str] = (), conn: Optional[sqlite3.Connection] = None):
+        self.conn = conn or sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+        for ddl in schema:
+            self.conn.execute(ddl)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.batches = 0
+        self.statements = 0
+        self.during_query = None
+
+    def _run(self, sql, params):
+        self.statements += 1
+        cur = self.conn.execute(sql, params or [])
+        cols = [d[0] for d in cur.description] if cur.description else []
+        return {"columns": cols, "rows": [list(r) for r in cur.fetchall()]}
+
+    def execute(self, sql, params=None):
+        with self.lock:
+            self.requests += 1
+            result = self._run(sql, params)
+        change_feed.record(sql)
+        return result
+
+    def execute_many(self, statements):
+        with self.lock:
+            self.requests += 1
+            self.batches += 1
+            self.conn.execute("BEGIN")
+            try:
+                results = [self._run(s["q"], s.get("params")) for s in statements]
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+        change_feed.record_many(s["q"] for s in statements)
+        if self.during_query is not None:
+            hook, self.during_query = self.during_query, None
+            hook()
+        return results
+
+    def scalar(self, sql, params=None):
+        return self.execute(sql, params)["rows"][0][0]
+
+    def tables(self):
+        return {r[0] for r in self.conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'index')")}
+
+
+@pytest.fixture
+def sqlite_turso():
+    """Factory for ``SQLiteTurso`` backends: ``sqlite_turso(schema=(), conn=None)``."""
+    return SQLiteTurso
+
+
 # ==================== Configuration ====================
 
 def pytest_configure(config):
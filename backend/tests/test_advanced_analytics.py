@@ -0,0 +1,161 @@
+# @AI-HINT: Advanced analytics tests - forecasts, cohorts, churn and market trends come from grouped queries, fits match closed-form least squares and recover seasonality, cached models rebuild only after a write
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.advanced_analytics import AdvancedAnalyticsService, _month_index, _month_label
+from app.services.forecast_models import fit_trend, t95
+
+SCHEMA = [
+    "CREATE TABLE users (id INTEGER PRIMARY KEY, created_at TEXT, last_login TEXT, is_active INTEGER)",
+    "CREATE TABLE projects (id INTEGER PRIMARY KEY, client_id INTEGER, category TEXT, skills TEXT, "
+    "budget_min REAL, budget_max REAL, created_at TEXT)",
+    "CREATE TABLE proposals (id INTEGER PRIMARY KEY, freelancer_id INTEGER, created_at TEXT)",
+    "CREATE TABLE payments (id INTEGER PRIMARY KEY, amount REAL, status TEXT, created_at TEXT)",
+]
+
+
+@pytest.fixture
+def db(sqlite_turso):
+    return sqlite_turso(SCHEMA)
+
+
+def _service(db):
+    return AdvancedAnalyticsService(backend_factory=lambda: db)
+
+
+def _iso(dt):
+    return dt.isoformat()
+
+
+def _month_start(month):
+    return datetime.strptime(month + "-15T12:00:00", "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+
+
+def test_trend_fit_matches_least_squares_and_recovers_seasonality():
+    y = [3.0, 5.0, 4.0, 8.0, 9.0, 12.0]
+    fit = fit_trend(y)
+    t_mean, y_mean = 2.5, sum(y) / 6
+    sxx = sum((t - t_mean) ** 2 for t in range(6))
+    slope = sum((t - t_mean) * (v - y_mean) for t, v in enumerate(y)) / sxx
+    assert fit.slope == pytest.approx(slope) and fit.intercept == pytest.approx(y_mean - slope * t_mean)
+    sigma = (sum((v - fit.intercept - fit.slope * t) ** 2 for t, v in enumerate(y)) / 4) ** 0.5
+    point, half = fit.predict(8)
+    assert point == pytest.approx(fit.intercept + 8 * slope)
+    assert half == pytest.approx(t95(4) * sigma * (1 + 1 / 6 + (8 - t_mean) ** 2 / sxx) ** 0.5)
+
+    season = [10, -4, 6, 0, -8, 2, 12, -10, 4, -6, 0, -6]  # sums to zero
+    series = [50 + 2 * t + season[t % 12] for t in range(36)]
+    seasonal = fit_trend(series, period=12)
+    assert seasonal.slope == pytest.approx(2.0) and seasonal.intercept == pytest.approx(50.0)
+    assert list(seasonal.seasonal) == pytest.approx(season)
+    assert seasonal.predict(40)[0] == pytest.approx(50 + 80 + season[4])
+    assert seasonal.dof == 36 - 2 - 11
+    assert fit_trend(series[:20], period=12).seasonal == ()  # under two periods: plain line
+
+
+async def test_revenue_forecast_from_monthly_aggregates_and_cached_until_write(db):
+    now = datetime.now(timezone.utc)
+    current = _month_index(now.strftime("%Y-%m"))
+    for k in range(1, 13):  # 12 complete months, revenue 100 + 10·t split over two payments
+        month = _month_label(current - k)
+        revenue = 100 + 10 * (12 - k)
+        for amount in (revenue * 0.25, revenue * 0.75):
+            db.conn.execute("INSERT INTO payments (amount, status, created_at) VALUES (?, 'completed', ?)",
+                            [amount, _iso(_month_start(month))])
+        db.conn.execute("INSERT INTO payments (amount, status, created_at) VALUES (999, 'pending', ?)",
+                        [_iso(_month_start(month))])
+    db.conn.execute("INSERT INTO payments (amount, status, created_at) VALUES (40, 'completed', ?)", [_iso(now)])
+    service = _service(db)
+
+    result = await service.get_revenue_forecast(months_ahead=3)
+    assert db.requests == 1
+    assert [h["revenue"] for h in result["historical"]] == [170.0, 180.0, 190.0, 200.0, 210.0, 40.0]
+    assert result["historical"][-1]["month"] == now.strftime("%Y-%m")
+    assert [f["month"] for f in result["forecast"]] == [_month_label(current + i) for i in (1, 2, 3)]
+    assert [f["predicted_revenue"] for f in result["forecast"]] == [230.0, 240.0, 250.0]
+    first = result["forecast"][0]
+    assert first["confidence_low"] == pytest.approx(230.0) and first["confidence_high"] == pytest.approx(230.0)
+    assert result["summary"] == {"total_forecasted_revenue": 720.0, "average_monthly": 240.0,
+                                 "growth_rate": 10.0, "trend": "growing"}
+    assert result["model_info"]["type"] == "linear_regression" and result["model_info"]["observations"] == 12
+
+    await service.get_revenue_forecast(months_ahead=6, include_confidence=False)
+    assert db.requests == 1 and service.models.stats["hits"] == 1
+
+    db.execute("INSERT INTO payments (amount, status, created_at) VALUES (1000, 'completed', ?)",
+               [_iso(_month_start(_month_label(current - 1)))])
+    rebuilt = await service.get_revenue_forecast(months_ahead=1)
+    assert db.requests == 3
+    assert rebuilt["historical"][-2]["revenue"] == 1210.0
+
+
+async def test_cohorts_and_churn_come_from_grouped_queries(db):
+    now = datetime.now(timezone.utc)
+    cohort = _month_label(_month_index(now.strftime("%Y-%m")) - 2)
+    start = datetime.strptime(cohort + "-01", "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    users = [
+        (1, start + timedelta(days=1), now - timedelta(days=2), 1),
+        (2, start + timedelta(days=3), now - timedelta(days=20), 1),
+        (3, start + timedelta(days=5), None, 1),
+        (4, now - timedelta(hours=1), now - timedelta(days=40), 1),
+        (5, now - timedelta(hours=1), None, 0),
+    ]
+    db.conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?)",
+                        [(i, _iso(c), _iso(l) if l else None, a) for i, c, l, a in users])
+    db.conn.executemany("INSERT INTO projects (client_id, created_at) VALUES (?, ?)", [
+        (1, _iso(start + timedelta(days=2))), (1, _iso(start + timedelta(days=4))),
+        (2, _iso(start + timedelta(days=10))), (1, _iso(start + timedelta(days=31))),
+    ])
+    db.conn.executemany("INSERT INTO proposals (freelancer_id, created_at) VALUES (?, ?)", [(2, _iso(now))] * 3)
+    service = _service(db)
+
+    cohorts = await service.get_cohort_analysis()
+    older = cohorts["cohorts"][0]
+    assert older["cohort"] == cohort and older["size"] == 3
+    assert [p["active_users"] for p in older["periods"]] == [2, 1, 0, 0, 0, 0]
+    assert older["periods"][0]["retention_rate"] == 66.7
+    assert sum(c["size"] for c in cohorts["cohorts"]) == 5
+    assert db.requests == 2
+
+    churn = await service.get_churn_prediction()
+    probabilities = {p["user_id"]: p["churn_probability"] for p in churn["predictions"]}
+    assert probabilities == {1: 0.0, 2: 0.15, 3: 0.45, 4: 0.8}
+    factors = churn["predictions"][2]["factors"]
+    assert factors["days_since_last_login"] == 30 and factors["total_activity"] == 0
+    assert churn["summary"]["high_risk_count"] == 1 and churn["summary"]["total_users_analyzed"] == 4
+    single = await service.get_churn_prediction(user_id=5)
+    assert single["predictions"][0]["risk_level"] == "high"
+    with pytest.raises(ValueError):
+        await service.get_churn_prediction(user_id=99)
+
+
+async def test_market_trends_split_json_and_comma_skills_and_fit_weekly_demand(db):
+    now = datetime.now(timezone.utc)
+    rows = []
+    for weeks_ago in range(12):  # react demand grows every week, php is flat
+        when = _iso(now - timedelta(days=7 * weeks_ago + 1))
+        for _ in range(12 - weeks_ago):
+            rows.append(("web", json.dumps(["React", " python"]), 100, 300, when))
+        rows.append(("web", "php, Python", 0, 500, when))
+    rows.append(("", "[]", 50, 150, _iso(now - timedelta(days=2))))
+    rows.append(("data", json.dumps(["sql"]), 1000, 3000, _iso(now - timedelta(days=200))))  # outside 90 days
+    db.conn.executemany("INSERT INTO projects (category, skills, budget_min, budget_max, created_at) "
+                        "VALUES (?, ?, ?, ?, ?)", rows)
+    service = _service(db)
+
+    market = await service.get_market_trends()
+    skills = {s["skill"]: s for s in market["top_skills"]}
+    assert set(skills) == {"react", "python", "php"}
+    assert skills["react"]["demand_count"] == 78 and skills["python"]["demand_count"] == 90
+    assert skills["react"]["trend"] == "growing" and skills["react"]["change_percent"] == pytest.approx(169.2, abs=0.1)
+    assert skills["php"]["trend"] == "stable" and skills["php"]["change_percent"] == 0
+    assert market["top_categories"] == [
+        {"category": "web", "project_count": 90, "avg_budget": 200.0},
+        {"category": "uncategorized", "project_count": 1, "avg_budget": 100.0},
+    ]
+    assert market["market_summary"] == {"total_projects": 91, "unique_skills": 3, "avg_budget_overall": 198.73}
+
+    filtered = await service.get_market_trends(category="data")
+    assert filtered["top_skills"] == [] and filtered["market_summary"]["total_projects"] == 0
@@ -0,0 +1,155 @@
+# @AI-HINT: Audit log store tests - group commit, persistence, indexes and Merkle verification
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.audit_log_store import AuditLogStore, CHECKPOINT_BLOCK_SIZE
+from app.services.audit_trail import (
+    AuditTrailService,
+    AuditAction,
+    AuditCategory,
+    AuditSeverity,
+)
+
+
+@pytest.fixture
+def turso(sqlite_turso):
+    return sqlite_turso()
+
+
+def _service(turso, batch_size=50):
+    store = AuditLogStore(
+        backend_factory=lambda: turso,
+        batch_size=batch_size,
+        flush_interval=3600,
+        high_risk_actions=[a.value for a in AuditTrailService.HIGH_RISK_ACTIONS],
+    )
+    return AuditTrailService(db=None, store=store), store
+
+
+async def test_group_commit_and_chain_survives_restart(turso):
+    service, store = _service(turso, batch_size=10)
+    for i in range(25):
+        await service.log(user_id=i % 3 + 1, action=AuditAction.LOGIN, category=AuditCategory.AUTH)
+
+    # Two full batches committed, the rest still buffered
+    assert turso.batches == 3  # DDL + 2 group commits
+    assert store.pending_count == 5
+    store.flush()
+    assert turso.execute("SELECT COUNT(*) FROM audit_trail_entries")["rows"][0][0] == 25
+
+    # A fresh store continues the chain instead of restarting at genesis
+    service2, store2 = _service(turso)
+    entry = await service2.log(user_id=1, action=AuditAction.LOGOUT, category=AuditCategory.AUTH)
+    assert store2.flush() == 1  # chained when its batch commits
+    assert entry["previous_hash"] == store.get_by_seq([24])[0]["hash"]
+    assert len(store2) == 26
+    assert (await service2.verify_integrity())["integrity_valid"]
+
+
+async def test_workers_sharing_a_database_keep_one_chain(turso):
+    service_a, store_a = _service(turso)
+    service_b, store_b = _service(turso)
+    for user_id in (1, 2, 3):
+        await service_a.log(user_id=user_id, action=AuditAction.LOGIN, category=AuditCategory.AUTH)
+    for user_id in (4, 5):
+        await service_b.log(user_id=user_id, action=AuditAction.LOGIN, category=AuditCategory.AUTH)
+
+    assert store_a.flush() == 3
+    assert store_b.flush() == 2  # seqs 0-1 are taken: re-chained onto A's entries
+    await service_a.log(user_id=6, action=AuditAction.LOGOUT, category=AuditCategory.AUTH)
+    assert store_a.flush() == 1  # B's entries are read before A goes on
+    assert store_a.pending_count == store_b.pending_count == 0
+
+    rows = turso.execute("SELECT seq, user_id, hash, previous_hash FROM audit_trail_entries ORDER BY seq")["rows"]
+    assert [r[0] for r in rows] == [0, 1, 2, 3, 4, 5]
+    assert [r[1] for r in rows] == [1, 2, 3, 4, 5, 6]
+    assert [r[3] for r in rows[1:]] == [r[2] for r in rows[:-1]]
+    assert (await service_a.get_logs(user_id=5))["total"] == 1
+    _, fresh = _service(turso)
+    assert len(fresh) == 6 and fresh.verify()["integrity_valid"]
+
+
+async def test_lone_entries_are_committed_in_the_background_and_reads_catch_up(turso):
+    store_a = AuditLogStore(backend_factory=lambda: turso, flush_interval=0.05)
+    store_b = AuditLogStore(backend_factory=lambda: turso, flush_interval=3600, catch_up_interval=0)
+    service_a = AuditTrailService(db=None, store=store_a)
+    assert len(store_b) == 0
+
+    await service_a.log(user_id=7, action=AuditAction.LOGIN, category=AuditCategory.AUTH)
+    for _ in range(100):
+        if not store_a.pending_count:
+            break
+        time.sleep(0.01)
+    assert store_a.pending_count == 0
+    assert turso.execute("SELECT COUNT(*) FROM audit_trail_entries")["rows"][0][0] == 1
+
+    # B never wrote, but its next read picks up A's entry
+    entries, total = store_b.query({"user_id": 7})
+    assert total == 1 and entries[0]["hash"] == store_a.get_by_seq([0])[0]["hash"]
+    store_a.close()
+
+
+async def test_indexed_queries_and_statistics(turso):
+    service, _ = _service(turso)
+    await service.log(user_id=1, action=AuditAction.LOGIN, category=AuditCategory.AUTH, ip_address="1.1.1.1")
+    await service.log(user_id=2, action=AuditAction.LOGIN_FAILED, category=AuditCategory.AUTH, ip_address="2.2.2.2")
+    await service.log(user_id=1, action=AuditAction.DATA_EXPORT, category=AuditCategory.ADMIN,
+                      resource_type="report", resource_id="7", severity=AuditSeverity.WARNING)
+
+    result = await service.get_logs(user_id=1)
+    assert result["total"] == 2
+    assert result["logs"][0]["action"] == AuditAction.DATA_EXPORT.value
+
+    result = await service.get_logs(user_id=1, category=AuditCategory.AUTH)
+    assert [l["action"] for l in result["logs"]] == [AuditAction.LOGIN.value]
+
+    result = await service.get_logs(resource_id="7")
+    assert result["total"] == 1
+
+    future = datetime.now(timezone.utc) + timedelta(minutes=5)
+    assert (await service.get_logs(start_date=future))["total"] == 0
+
+    stats = await service.get_statistics(days=1)
+    assert stats["total_events"] == 3
+    assert stats["unique_users"] == 2
+    assert stats["failed_auth_count"] == 1
+    assert stats["high_risk_count"] == 1
+
+    activity = await service.get_user_activity(user_id=1)
+    assert activity["total_actions"] == 2
+    assert activity["last_login"] is not None
+    assert len(activity["high_risk_actions"]) == 1
+
+
+async def test_merkle_checkpoint_detects_rewritten_entry(turso):
+    service, store = _service(turso, batch_size=500)
+    for i in range(CHECKPOINT_BLOCK_SIZE + 10):
+        await service.log(user_id=1, action=AuditAction.DATA_READ, category=AuditCategory.DATA,
+                          details={"n": i})
+    store.flush()
+
+    result = await service.verify_integrity(start_index=100, end_index=110)
+    assert result["integrity_valid"]
+    assert result["checkpoints_checked"] == 1
+
+    # Rewrite an entry together with its own hash: only the checkpoint notices
+    entry = store.get_by_seq([105])[0]
+    entry["details"] = {"n": "tampered"}
+    entry["hash"] = service._calculate_hash(entry)
+    result = await service.verify_integrity(start_index=100, end_index=110)
+    assert not result["integrity_valid"]
+    assert any(i["issue"] == "Merkle checkpoint mismatch" for i in result["issues"])
+
+
+async def test_cleanup_prunes_payload_but_keeps_chain(turso):
+    service, store = _service(turso)
+    entry = await service.log(user_id=1, action=AuditAction.LOGIN, category=AuditCategory.AUTH)
+    await service.log(user_id=1, action=AuditAction.LOGOUT, category=AuditCategory.AUTH)
+    entry["timestamp"] = (datetime.now(timezone.utc) - timedelta(days=400)).isoformat()
+
+    result = await service.cleanup_old_logs()
+    assert result == {"deleted_count": 1, "remaining_count": 1}
+    assert (await service.get_logs())["total"] == 1
+    assert (await service.verify_integrity())["integrity_valid"]
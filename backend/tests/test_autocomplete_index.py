@@ -0,0 +1,147 @@
+# @AI-HINT: Autocomplete prefix index tests - ranking, word-start matching, cache eviction, change-feed sync, polled remote writes
+
+import pytest
+
+import app.services.autocomplete_index as autocomplete_module
+from app.services.autocomplete_index import AutocompleteService, PrefixIndex
+
+
+def _texts(suggestions):
+    return [s["text"] for s in suggestions]
+
+
+def test_completes_any_word_start_ranked_by_weight():
+    index = PrefixIndex()
+    index.load([
+        ("project", 1, "React Native App", 4, ["React Native App"]),
+        ("project", 2, "Build a React dashboard", 10, ["Build a React dashboard"]),
+        ("project", 3, "Logo redesign", 1, ["Logo redesign"]),
+        ("freelancer", 7, "Ada Lovelace", 3, ["Ada Lovelace", "Ada", "Lovelace"]),
+    ])
+    assert _texts(index.complete("rea", "project")) == ["Build a React dashboard", "React Native App"]
+    assert _texts(index.complete("re", "project")) == [
+        "Build a React dashboard", "React Native App", "Logo redesign",
+    ]
+    assert _texts(index.complete("native a", "project")) == ["React Native App"]
+    assert _texts(index.complete("love", "freelancer")) == ["Ada Lovelace"]
+    assert index.complete("rea", "skill") == []
+    assert _texts(index.complete("RE", "project", limit=1)) == ["Build a React dashboard"]
+
+
+def test_updates_evict_cached_prefixes():
+    index = PrefixIndex()
+    index.load([("skill", 1, "Python", 5, ["Python"]), ("skill", 2, "PyTorch", 1, ["PyTorch"])])
+    assert _texts(index.complete("py", "skill")) == ["Python", "PyTorch"]
+
+    index.upsert("skill", 3, "Pygame", 9)
+    assert _texts(index.complete("py", "skill")) == ["Pygame", "Python", "PyTorch"]
+
+    index.upsert("skill", 2, "PyTorch", 20)  # weight-only change
+    assert _texts(index.complete("pyt", "skill")) == ["PyTorch", "Python"]
+
+    index.upsert("skill", 3, "Godot", 9)  # renamed: old keys go away
+    assert _texts(index.complete("py", "skill")) == ["PyTorch", "Python"]
+    assert _texts(index.complete("go", "skill")) == ["Godot"]
+
+    index.remove("skill", 2)
+    assert _texts(index.complete("py", "skill")) == ["Python"]
+
+
+def test_search_history_boosts_matching_entries_even_before_they_exist():
+    index = PrefixIndex()
+    index.load([("tag", 1, "remote", 2, ["remote"]), ("tag", 2, "relocation", 3, ["relocation"])])
+    assert _texts(index.complete("re", "tag")) == ["relocation", "remote"]
+    index.boost("Remote")
+    index.boost("remote ")
+    assert _texts(index.complete("re", "tag")) == ["remote", "relocation"]
+
+    index.boost("rest api", amount=10)
+    index.upsert("tag", 3, "REST API", 0)
+    assert _texts(index.complete("re", "tag"))[0] == "REST API"
+
+
+@pytest.fixture
+def db(sqlite_turso):
+    turso = sqlite_turso()
+    turso.conn.executescript(
+        """
+        CREATE TABLE projects (id INTEGER PRIMARY KEY, title TEXT, status TEXT, created_at TEXT,
+            updated_at TEXT DEFAULT '2020-01-01 00:00:00');
+        CREATE TABLE proposals (id INTEGER PRIMARY KEY, project_id INTEGER, status TEXT,
+            updated_at TEXT DEFAULT '2020-01-01 00:00:00');
+        CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, first_name TEXT, last_name TEXT,
+            user_type TEXT, is_active INTEGER, created_at TEXT, updated_at TEXT DEFAULT '2020-01-01 00:00:00');
+        CREATE TABLE reviews (id INTEGER PRIMARY KEY, reviewee_id INTEGER, rating REAL,
+            updated_at TEXT DEFAULT '2020-01-01 00:00:00');
+        CREATE TABLE contracts (id INTEGER PRIMARY KEY, freelancer_id INTEGER, status TEXT,
+            updated_at TEXT DEFAULT '2020-01-01 00:00:00');
+        CREATE TABLE skills (id INTEGER PRIMARY KEY, name TEXT, created_at TEXT,
+            updated_at TEXT DEFAULT '2020-01-01 00:00:00');
+        CREATE TABLE user_skills (id INTEGER PRIMARY KEY, user_id INTEGER, skill_id INTEGER,
+            updated_at TEXT DEFAULT '2020-01-01 00:00:00');
+        CREATE TABLE tags (id INTEGER PRIMARY KEY, name TEXT, usage_count INTEGER,
+            updated_at TEXT DEFAULT '2020-01-01 00:00:00');
+
+        INSERT INTO projects (id, title, status, created_at) VALUES
+            (1, 'Django API', 'open', '2020-01-01'), (2, 'Data pipeline', 'open', '2020-01-01'),
+            (3, 'Design system', 'completed', '2020-01-01');
+        INSERT INTO proposals (project_id, status) VALUES (2, 'pending'), (2, 'pending'), (1, 'withdrawn');
+        INSERT INTO users (id, name, first_name, last_name, user_type, is_active, created_at) VALUES
+            (1, NULL, 'Dana', 'Scully', 'freelancer', 1, '2020-01-01'),
+            (2, 'Dale Cooper', 'Dale', 'Cooper', 'Freelancer', 1, '2020-01-01'),
+            (3, 'Dan Client', 'Dan', 'Client', 'client', 1, '2020-01-01');
+        INSERT INTO reviews (reviewee_id, rating) VALUES (2, 5), (2, 5);
+        INSERT INTO skills (id, name, created_at) VALUES (1, 'Docker', '2020-01-01'), (2, 'Django', '2020-01-01');
+        INSERT INTO user_skills (user_id, skill_id) VALUES (1, 2), (2, 2);
+        INSERT INTO tags (id, name, usage_count) VALUES (1, 'devops', 4);
+        """
+    )
+    return turso
+
+
+def test_service_loads_sources_and_applies_writes(db, monkeypatch):
+    monkeypatch.setattr(autocomplete_module, "REFRESH_MIN_SECONDS", 0)
+    service = AutocompleteService(backend_factory=lambda: db)
+    assert service.suggest("da") is None  # not loaded yet -> caller falls back to SQL
+    service.load()
+
+    assert service.suggest("da", limit=10) == [
+        {"id": 2, "type": "project", "text": "Data pipeline"},
+        {"id": 2, "type": "freelancer", "text": "Dale Cooper"},
+        {"id": 1, "type": "freelancer", "text": "Dana Scully"},
+    ]
+    assert _texts(service.suggest("d", "skill")) == ["Django", "Docker"]
+    assert _texts(service.suggest("sc", "freelancer")) == ["Dana Scully"]
+
+    db.execute("UPDATE projects SET status = 'completed' WHERE id = 2")
+    db.execute("INSERT INTO projects (id, title, status, created_at) VALUES (4, 'Dart SDK port', 'open', '2020-01-01')")
+    db.execute("INSERT INTO tags (id, name, usage_count) VALUES (2, 'design', 9)")
+    assert _texts(service.suggest("d", "project")) == ["Dart SDK port", "Django API"]
+    assert _texts(service.suggest("de", "tag")) == ["design", "devops"]
+
+
+def test_other_workers_writes_are_polled_and_only_touched_rows_reread(db, monkeypatch):
+    monkeypatch.setattr(autocomplete_module, "REFRESH_MIN_SECONDS", 0)
+    monkeypatch.setattr(autocomplete_module, "REMOTE_POLL_SECONDS", 0)
+    service = AutocompleteService(backend_factory=lambda: db)
+    service.load()
+    assert service.suggest("da", "project") == [{"id": 2, "type": "project", "text": "Data pipeline"}]
+
+    # Written by another worker: nothing in this process's change_feed
+    db.conn.execute("INSERT INTO projects (id, title, status, created_at) VALUES (4, 'Dart SDK port', 'open', "
+                    "'2020-01-01')")
+    db.conn.execute("INSERT INTO proposals (project_id, status) VALUES (4, 'pending')")
+    db.conn.execute("UPDATE projects SET status = 'completed', updated_at = '2030-01-01 00:00:00' WHERE id = 2")
+    db.conn.execute("UPDATE users SET name = 'Agent Cooper', updated_at = '2030-01-01 00:00:00' WHERE id = 2")
+    requests = db.requests
+    assert _texts(service.suggest("d", "project")) == ["Dart SDK port", "Django API"]
+    # One probe, then the touched ids per changed table and those entries (not the whole sources)
+    assert db.requests - requests == 1 + (2 + 1) + (1 + 1)
+    assert _texts(service.suggest("coo", "freelancer")) == ["Agent Cooper"]
+    requests = db.requests
+    assert _texts(service.suggest("d", "project")) == ["Dart SDK port", "Django API"]
+    assert db.requests - requests == 1  # probe unchanged: nothing re-read
+
+    # A deleted row leaves nothing to find by watermark: that source is re-read whole
+    db.conn.execute("DELETE FROM tags WHERE id = 1")
+    assert service.suggest("dev", "tag") == []
@@ -0,0 +1,75 @@
+# @AI-HINT: Bulk executor tests - set-based chunk execution, persisted progress/failures, cancellation between chunks
+
+import pytest
+
+from app.services.bulk_executor import BulkExecutor
+
+
+@pytest.fixture
+def db(sqlite_turso):
+    turso = sqlite_turso()
+    turso.conn.executescript(
+        """
+        CREATE TABLE projects (id INTEGER PRIMARY KEY, status TEXT, category TEXT, updated_at TEXT);
+        CREATE TABLE users (id INTEGER PRIMARY KEY, is_active INTEGER, role TEXT, updated_at TEXT);
+        """
+    )
+    turso.conn.executemany("INSERT INTO projects VALUES (?, 'open', 'Web', NULL)", [(i,) for i in range(1, 2001)])
+    return turso
+
+
+async def test_chunked_update_persists_progress_and_failures(db):
+    executor = BulkExecutor(backend_factory=lambda: db, chunk_size=300, parallelism=3)
+    ids = [str(i) for i in range(1, 2001)] + ["9999", "5"]
+    op = executor.create("project_operation", "archive", 2001, "1")
+
+    final = await executor.run(op["id"], ids, {})
+
+    assert final["status"] == "completed"
+    assert final["progress"] == {"processed": 2001, "total": 2001, "percentage": 100.0}
+    assert final["results"] == {"succeeded": 2000, "failed": 1}
+    assert db.scalar("SELECT COUNT(*) FROM projects WHERE status = 'archived'") == 2000
+    failures = executor.get(op["id"], with_failures=True)["results"]["failed_items"]
+    assert failures == [{"id": "9999", "error": "not found or not eligible"}]
+
+    operations, total = executor.list(created_by="1")
+    assert total == 1 and operations[0]["id"] == op["id"]
+
+
+async def test_guarded_transition_and_params(db):
+    executor = BulkExecutor(backend_factory=lambda: db, chunk_size=100)
+    op = executor.create("project_operation", "update_category", 3, "1")
+    await executor.run(op["id"], ["1", "2", "3"], {"category": "Data"})
+    assert db.scalar("SELECT COUNT(*) FROM projects WHERE category = 'Data'") == 3
+
+    # unarchive only touches archived projects
+    op = executor.create("project_operation", "unarchive", 2, "1")
+    final = await executor.run(op["id"], ["1", "2"], {})
+    assert final["results"] == {"succeeded": 0, "failed": 2}
+
+
+async def test_cancel_takes_effect_between_chunks(db):
+    executor = BulkExecutor(backend_factory=lambda: db, chunk_size=100, parallelism=1)
+    op = executor.create("project_operation", "archive", 2000, "1")
+    run_chunk = executor._run_chunk
+    calls = []
+
+    def cancelling_chunk(*args):
+        calls.append(1)
+        if len(calls) == 3:
+            executor.cancel(op["id"])
+        return run_chunk(*args)
+
+    executor._run_chunk = cancelling_chunk
+    final = await executor.run(op["id"], [str(i) for i in range(1, 2001)], {})
+
+    assert final["status"] == "cancelled"
+    assert len(calls) == 3
+    # the in-flight chunk is applied but not counted once the operation left "processing"
+    assert db.scalar("SELECT COUNT(*) FROM projects WHERE status = 'archived'") == 300
+    assert final["progress"]["processed"] == 200
+
+    queued = executor.create("project_operation", "archive", 1, "1")
+    assert executor.cancel(queued["id"])["status"] == "cancelled"
+    assert (await executor.run(queued["id"], ["1"], {}))["status"] == "cancelled"
+    assert executor.cancel(queued["id"]) is None
@@ -0,0 +1,115 @@
+# @AI-HINT: Code sandbox tests - question bank cases grade correctly; hostile submissions are contained and the pool keeps serving; workers recycle
+import platform
+import textwrap
+
+import pytest
+
+from app.services.code_sandbox import SandboxPool, SandboxWorker, entry_point_for, parse_test_case
+from app.services.skill_assessment import QUESTION_BANK
+
+pytestmark = pytest.mark.skipif(platform.system() != "Linux", reason="sandbox worker needs Linux fork/seccomp")
+
+
+def _question(question_id):
+    return next(q for questions in QUESTION_BANK.values() for q in questions if q["id"] == question_id)
+
+
+def _isolation():
+    worker = SandboxWorker()
+    worker.close()
+    return worker.isolation
+
+
+@pytest.fixture(scope="module")
+def pool():
+    if not _isolation()["seccomp"]:
+        pytest.skip("seccomp filters are not available here")
+    pool = SandboxPool(size=2, max_runs=5, timeout_seconds=0.5, memory_mb=128)
+    yield pool
+    pool.close()
+
+
+FIBONACCI = "def fibonacci(n):\n    a, b = 0, 1\n    for _ in range(n):\n        a, b = b, a + b\n    return a\n"
+
+LRU_CACHE = '''
+from collections import OrderedDict
+
+class LRUCache:
+    def __init__(self, capacity: int):
+        self.capacity, self.items = capacity, OrderedDict()
+
+    def get(self, key: int) -> int:
+        if key not in self.items:
+            return -1
+        self.items.move_to_end(key)
+        return self.items[key]
+
+    def put(self, key: int, value: int) -> None:
+        self.items[key] = value
+        self.items.move_to_end(key)
+        if len(self.items) > self.capacity:
+            self.items.popitem(last=False)
+'''
+
+HOSTILE = {
+    "busy_loop": ("while True:\n    pass", "timeout"),
+    "swallows_timer": ("while True:\n    try:\n        while True:\n            pass\n    except BaseException:\n        pass", "timeout"),
+    "memory_bomb": ("blocks = []\nwhile True:\n    blocks.append(bytearray(1 << 24))", "memory"),
+    "reads_files": ("return open('/etc/passwd').read()", "error"),
+    "lists_directories": ("import os\nreturn os.listdir('/')", "error"),
+    "forks": ("import os\nreturn os.fork()", "error"),
+    "execs_shell": ("import os\nreturn os.execv('/bin/sh', ['sh', '-c', 'id'])", "error"),
+    "opens_socket": ("import socket\nreturn socket.create_connection(('1.1.1.1', 53))", "error"),
+    "signals_parent": ("import os, signal\nreturn os.kill(os.getppid(), signal.SIGKILL)", "error"),
+    "recursion": ("return fibonacci(n + 1)", "error"),
+    "exits": ("raise SystemExit(0)", "error"),
+}
+
+
+def test_question_bank_cases_grade_outside_the_sandbox(pool):
+    py_004 = _question("py_004")
+    entry_point = entry_point_for(py_004)
+    assert entry_point == "fibonacci"
+    result = pool.execute_python(FIBONACCI, py_004["test_cases"], entry_point=entry_point)
+    assert result["all_passed"] and result["passed_count"] == result["total_tests"] == 4
+
+    off_by_one = FIBONACCI.replace("range(n)", "range(n - 1)")
+    result = pool.execute_python(off_by_one, py_004["test_cases"], entry_point=entry_point)
+    assert [r["status"] for r in result["results"]] == ["passed", "wrong_answer", "wrong_answer", "wrong_answer"]
+    assert "output" not in result["results"][2] and result["passed_count"] == 1
+
+    py_005 = _question("py_005")
+    assert parse_test_case(py_005["test_cases"][0], "LRUCache")["operations"][1] == {"method": "put", "args": [1, 1]}
+    result = pool.execute_python(LRU_CACHE, py_005["test_cases"], entry_point=entry_point_for(py_005))
+    assert result["all_passed"]
+
+    # Returning True for 1 or printing the expected answer does not pass
+    result = pool.execute_python("def fibonacci(n):\n    print(55)\n    return n == 1", py_004["test_cases"], entry_point)
+    assert result["passed_count"] == 0
+    result = pool.execute_python("def fibonacci(:", py_004["test_cases"], entry_point)
+    assert result["results"][0]["error"].startswith("SyntaxError")
+
+
+@pytest.mark.parametrize("name", sorted(HOSTILE))
+def test_hostile_submissions_are_contained(pool, name):
+    body, status = HOSTILE[name]
+    code = "def fibonacci(n):\n" + textwrap.indent(body, "    ") + "\n"
+    result = pool.execute_python(code, [{"input": [3], "expected": 2}], entry_point="fibonacci")
+    assert result["manual_review_required"] is False
+    assert result["results"][0]["passed"] is False
+    assert result["results"][0]["status"] == status, result
+    # The pool still grades the next submission
+    assert pool.execute_python(FIBONACCI, [{"input": [3], "expected": 2}], "fibonacci")["all_passed"]
+
+
+def test_workers_recycle_and_missing_isolation_falls_back_to_manual_review(pool):
+    spawned = pool.stats["spawned"]
+    for _ in range(pool.max_runs * pool.size + 1):
+        assert pool.execute_python(FIBONACCI, [{"input": [10], "expected": 55}], "fibonacci")["all_passed"]
+    assert pool.stats["recycled"] >= 2 and pool.stats["spawned"] > spawned
+
+    disabled = SandboxPool(enabled=False)
+    result = disabled.execute_python(FIBONACCI, _question("py_004")["test_cases"], "fibonacci")
+    assert result["manual_review_required"] and result["passed_count"] == 0
+    manual = pool.execute_python("function debounce() {}", _question("js_003")["test_cases"], "debounce")
+    assert manual["manual_review_required"]
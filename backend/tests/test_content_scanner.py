@@ -0,0 +1,75 @@
+# @AI-HINT: Content scanner tests - literal automaton, rule families and the services built on it
+import random
+import re
+
+import pytest
+
+from app.services.content_scanner import LiteralAutomaton, ScannerBuilder
+from app.services.moderation import ContentModerationService, ModerationContentType, ViolationType
+from app.services.ai_chatbot import AIChatbotService, ChatIntent, SentimentLevel
+
+
+def test_automaton_reports_overlapping_and_nested_terms():
+    automaton = LiteralAutomaton([("he", 0), ("she", 1), ("hers", 2), ("his", 3)])
+    found = sorted(automaton.iter_matches("ushers"))
+    assert found == [(0, 2, 4), (1, 1, 4), (2, 2, 6)]
+
+
+def test_automaton_matches_regex_reference():
+    rng = random.Random(3)
+    alphabet = "abc "
+    terms = sorted({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(40)})
+    automaton = LiteralAutomaton((t, i) for i, t in enumerate(terms))
+    for _ in range(50):
+        text = "".join(rng.choice(alphabet) for _ in range(200))
+        expected = sorted(
+            (i, m.start(), m.start() + len(t))
+            for i, t in enumerate(terms)
+            for m in re.finditer(f"(?={re.escape(t)})", text)
+        )
+        assert sorted(automaton.iter_matches(text)) == expected
+
+
+def test_scanner_tags_hits_with_category_and_rule():
+    scanner = (
+        ScannerBuilder()
+        .terms("bad", ["darn"], whole_word=True)
+        .patterns("intent", [r"\b(hi|hello)\b", r"how\s+are\s+you"])
+        .build()
+    )
+    hits = scanner.scan("Hello there, darnit. How are   you? darn")
+    assert {(h.category, h.rule, h.text) for h in hits} == {
+        ("intent", r"\b(hi|hello)\b", "Hello"),
+        ("intent", r"how\s+are\s+you", "How are   you"),
+        ("bad", "darn", "darn"),
+    }
+    assert scanner.rules_matched("hi", {"bad"}) == {}
+
+
+def test_family_flags_must_agree():
+    builder = ScannerBuilder().patterns("a", [r"x\d"], family="f")
+    with pytest.raises(ValueError):
+        builder.patterns("b", [r"y\d"], flags=0, family="f")
+
+
+async def test_moderation_detects_each_category_in_one_scan():
+    service = ContentModerationService(db=None)
+    result = await service.moderate_text(
+        "Click here to win! Send a gift card, call 555-123-4567.",
+        content_type=ModerationContentType.PROJECT,
+    )
+    types = {v["type"] for v in result["violations"]}
+    assert {
+        ViolationType.SPAM.value,
+        ViolationType.PERSONAL_INFO.value,
+    } <= types
+    clean = await service.moderate_text("A clean project description about APIs.", ModerationContentType.PROJECT)
+    assert clean["violations"] == []
+
+
+def test_chatbot_intent_and_sentiment():
+    bot = AIChatbotService(db=None)
+    assert bot._classify_intent("Hello, how are you?") == ChatIntent.GREETING
+    assert bot._analyze_sentiment("This is great, thanks, awesome work") in (
+        SentimentLevel.POSITIVE, SentimentLevel.VERY_POSITIVE,
+    )
@@ -0,0 +1,152 @@
+# @AI-HINT: External scraper pipeline tests - recorded feed fixtures served by a local HTTP stub
+import copy
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+import app.api.v1.external_projects as external_projects_api
+from app.services.external_project_scraper import SOURCES, scrape_all_sources
+
+FIXTURES = Path(__file__).parent / "fixtures" / "external_projects"
+
+
+class FeedStub:
+    """Serves recorded feeds with ETag / If-None-Match support."""
+
+    def __init__(self):
+        self.payloads = {
+            name: json.loads((FIXTURES / f"{name}.json").read_text(encoding="utf-8"))
+            for name in ("remoteok", "jobicy", "arbeitnow")
+        }
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                name = self.path.strip("/")
+                stub.requests.append((name, self.headers.get("If-None-Match")))
+                if name not in stub.payloads:
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                body = json.dumps(stub.payloads[name]).encode()
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def sources(self):
+        base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        return [source._replace(url=f"{base}/{source.name}") for source in SOURCES]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    feed = FeedStub()
+    yield feed
+    feed.close()
+
+
+@pytest.fixture
+def turso(sqlite_turso):
+    db = sqlite_turso()
+    external_projects_api.ensure_external_projects_table(db)
+    return db
+
+
+def _rows(turso):
+    return {r[0]: tuple(r[1:]) for r in turso.execute(
+        "SELECT source_id, title, views_count FROM external_projects")["rows"]}
+
+
+async def test_first_scrape_inserts_english_listings(stub, turso):
+    stats = await scrape_all_sources(turso, sources=stub.sources())
+
+    assert sorted(stats["sources"]) == ["arbeitnow", "jobicy", "remoteok"]
+    assert stats["errors"] == []
+    # The German Arbeitnow listing is filtered out
+    assert stats["inserted"] == stats["total_scraped"] == 5
+    assert set(_rows(turso)) == {
+        "remoteok_100234", "remoteok_100235", "jobicy_88121", "jobicy_88122",
+        "arbeitnow_frontend-engineer-berlin-123",
+    }
+
+
+async def test_unchanged_feeds_are_not_refetched_or_rewritten(stub, turso):
+    await scrape_all_sources(turso, sources=stub.sources())
+    turso.execute("UPDATE external_projects SET views_count = 7")
+    before = turso.statements
+
+    stats = await scrape_all_sources(turso, sources=stub.sources())
+
+    assert sorted(stats["not_modified"]) == ["arbeitnow", "jobicy", "remoteok"]
+    assert stats["inserted"] == stats["updated"] == 0
+    assert all(etag for _, etag in stub.requests[-3:])
+    assert turso.statements - before < 10  # state load + scraped_at touches only
+    assert {row[1] for row in _rows(turso).values()} == {7}
+
+
+async def test_changed_listing_is_the_only_row_written(stub, turso):
+    await scrape_all_sources(turso, sources=stub.sources())
+    turso.execute("UPDATE external_projects SET views_count = 3")
+    jobs = copy.deepcopy(stub.payloads["jobicy"])
+    jobs["jobs"][0]["jobTitle"] = "Senior Data Analyst"
+    stub.payloads["jobicy"] = jobs
+
+    stats = await scrape_all_sources(turso, sources=stub.sources())
+
+    assert sorted(stats["not_modified"]) == ["arbeitnow", "remoteok"]
+    assert (stats["inserted"], stats["updated"], stats["unchanged"]) == (0, 1, 1)
+    rows = _rows(turso)
+    assert rows["jobicy_88121"] == ("Senior Data Analyst", 3)  # counters survive the upsert
+
+
+async def test_failing_source_does_not_block_the_others(stub, turso):
+    sources = stub.sources()
+    sources[0] = sources[0]._replace(url=sources[0].url.replace("remoteok", "missing"))
+
+    stats = await scrape_all_sources(turso, sources=sources)
+
+    assert len(stats["errors"]) == 1 and stats["errors"][0].startswith("remoteok")
+    assert stats["inserted"] == 3
+
+
+async def test_failed_listing_write_is_retried_on_the_next_run(stub, turso):
+    turso.conn.execute("CREATE TRIGGER reject_listing BEFORE INSERT ON external_projects "
+                       "WHEN NEW.source_id = 'jobicy_88121' BEGIN SELECT RAISE(ABORT, 'rejected'); END")
+
+    stats = await scrape_all_sources(turso, sources=stub.sources())
+
+    assert (stats["inserted"], stats["write_errors"]) == (4, 1)
+    assert "jobicy_88121" not in _rows(turso)
+    assert turso.scalar("SELECT COUNT(*) FROM external_project_hashes WHERE source_id = 'jobicy_88121'") == 0
+    assert turso.scalar("SELECT COUNT(*) FROM external_scrape_state WHERE source = 'jobicy'") == 0
+
+    turso.conn.execute("DROP TRIGGER reject_listing")
+    stats = await scrape_all_sources(turso, sources=stub.sources())
+
+    assert sorted(stats["not_modified"]) == ["arbeitnow", "remoteok"]
+    assert (stats["inserted"], stats["updated"], stats["write_errors"]) == (1, 0, 0)
+    assert "jobicy_88121" in _rows(turso)
@@ -0,0 +1,242 @@
+# @AI-HINT: Facet index tests - bitmap filters/facets/pages against brute force, discovery refresh over SQLite
+import random
+
+import pytest
+
+from app.services.discovery_index import REMOTE_POLL_SECONDS, FreelancerDiscovery, ProjectDiscovery
+from app.services.facet_index import FacetIndex, RangeField
+
+
+CATEGORIES = ["web", "mobile", "data", None]
+LEVELS = ["entry", "intermediate", "expert"]
+SKILLS = ["python", "react", "sql", "go", "rust"]
+
+
+def _random_doc(rng):
+    return {
+        "category": rng.choice(CATEGORIES),
+        "level": rng.choice(LEVELS),
+        "skills": rng.sample(SKILLS, rng.randint(0, 3)),
+        "budget": rng.choice([None, round(rng.uniform(0, 5000), 2)]),
+        "created": rng.random(),  # unique, so page order is fully determined
+    }
+
+
+def _make_index():
+    return FacetIndex(
+        facets=("category", "level"),
+        multi_facets=("skills",),
+        ranges={"budget": 100},
+        sorts=("created", "budget"),
+    )
+
+
+def _expected(docs, category=None, skill=None, low=None, high=None):
+    out = []
+    for doc_id, d in docs.items():
+        if category is not None and d["category"] != category:
+            continue
+        if skill is not None and skill not in d["skills"]:
+            continue
+        if low is not None and (d["budget"] is None or d["budget"] < low):
+            continue
+        if high is not None and (d["budget"] is None or d["budget"] > high):
+            continue
+        out.append(doc_id)
+    return out
+
+
+def test_filters_facets_and_pages_match_brute_force():
+    rng = random.Random(7)
+    docs = {i: _random_doc(rng) for i in range(400)}
+    index = _make_index()
+    index.bulk_load((i, d, {"id": i}) for i, d in docs.items())
+
+    # Incremental changes on top of the bulk load, including slot reuse
+    for i in range(0, 400, 7):
+        index.remove(i)
+        del docs[i]
+    for i in range(400, 440):
+        docs[i] = _random_doc(rng)
+        index.upsert(i, docs[i], {"id": i})
+    for i in range(1, 60, 5):
+        docs[i] = _random_doc(rng)
+        index.upsert(i, docs[i], {"id": i})
+
+    for category, skill, low, high in [
+        (None, None, None, None),
+        ("web", None, None, None),
+        (None, "python", 1000, None),
+        ("data", "sql", 250.5, 4000),
+        (None, None, None, 0.01),
+    ]:
+        clauses = []
+        if category:
+            clauses.append(("category", [category]))
+        if skill:
+            clauses.append(("skills", [skill]))
+        ranges = {"budget": (low, high)} if low is not None or high is not None else None
+        expected = _expected(docs, category, skill, low, high)
+
+        for limit in (5, 500):  # membership walk vs. enumerate-and-sort
+            result = index.search(clauses, ranges, sort="created", descending=True,
+                                  offset=2, limit=limit, facets=("level", "skills"))
+            assert result["total_count"] == len(expected)
+            ordered = sorted(expected, key=lambda i: (docs[i]["created"], i), reverse=True)
+            assert [p["id"] for p in result["items"]] == ordered[2:2 + limit]
+
+        levels = {}
+        for i in expected:
+            levels[docs[i]["level"]] = levels.get(docs[i]["level"], 0) + 1
+        assert result["facets"]["level"] == levels
+
+
+def test_null_sort_keys_order_like_sqlite():
+    index = _make_index()
+    index.upsert("a", {"budget": 10}, "a")
+    index.upsert("b", {"budget": None}, "b")
+    index.upsert("c", {"budget": 5}, "c")
+    bitmap = index.match()
+    assert index.page(bitmap, "budget", descending=False) == ["b", "c", "a"]
+    assert index.page(bitmap, "budget", descending=True) == ["a", "c", "b"]
+
+
+def test_range_thresholds_are_exact_at_scale():
+    field = RangeField(scale=100)
+    for slot, value in enumerate([1.1, 1.09, 1.11, 0.29, None]):
+        field.set(slot, field.encode(value))
+    assert bin(field.at_least(1.1)).count("1") == 2
+    assert bin(field.at_most(1.1)).count("1") == 3
+    assert field.at_least(0.29) == field.at_least(0)
+
+
+@pytest.fixture
+def db(sqlite_turso):
+    turso = sqlite_turso()
+    turso.conn.executescript(
+        """
+        CREATE TABLE projects (
+            id INTEGER PRIMARY KEY, title TEXT, description TEXT, category TEXT,
+            budget_type TEXT, budget_min REAL, budget_max REAL, experience_level TEXT,
+            estimated_duration TEXT, status TEXT, skills TEXT, client_id INTEGER,
+            created_at TEXT, updated_at TEXT);
+        CREATE TABLE proposals (
+            id INTEGER PRIMARY KEY, project_id INTEGER, status TEXT, updated_at TEXT);
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY, email TEXT, name TEXT, first_name TEXT, last_name TEXT,
+            bio TEXT, hourly_rate REAL, location TEXT, skills TEXT, user_type TEXT,
+            is_active INTEGER, created_at TEXT, experience_level TEXT,
+            availability_status TEXT, profile_visibility TEXT, updated_at TEXT);
+        CREATE TABLE reviews (id INTEGER PRIMARY KEY, reviewee_id INTEGER, rating REAL, updated_at TEXT);
+        CREATE TABLE contracts (id INTEGER PRIMARY KEY, freelancer_id INTEGER, status TEXT, updated_at TEXT);
+        """
+    )
+    return turso
+
+
+def _add_project(db, pid, category, skills, budget, status="open", day=1):
+    db.execute(
+        "INSERT INTO projects (id, title, description, category, budget_type, budget_min, budget_max, "
+        "experience_level, estimated_duration, status, skills, client_id, created_at, updated_at) "
+        "VALUES (?, ?, '', ?, 'fixed', ?, ?, 'entry', '1 week', ?, ?, 1, ?, ?)",
+        [pid, f"P{pid}", category, budget, budget * 2, status, skills,
+         f"2026-01-{day:02d}T00:00:00", f"2026-01-{day:02d}T00:00:00"],
+    )
+
+
+def test_project_discovery_tracks_writes_through_change_feed(db):
+    _add_project(db, 1, "Web Development", "Python,Django", 100, day=1)
+    _add_project(db, 2, "Mobile", "Swift", 500, day=2)
+    _add_project(db, 3, "Web Design", "Figma", 50, status="completed", day=3)
+    db.execute("INSERT INTO proposals (id, project_id, status, updated_at) VALUES (1, 1, 'pending', '2026-01-05')")
+
+    discovery = ProjectDiscovery(backend_factory=lambda: db)
+    discovery.load()
+
+    result = discovery.search(category="web")
+    assert [p["id"] for p in result["items"]] == [1]
+    assert result["items"][0]["proposal_count"] == 1
+    assert result["facets"] == {"categories": {"Web Development": 1}, "experience_levels": {"entry": 1}}
+    assert discovery.search(skills=["pyth"])["total_count"] == 1
+    assert discovery.search(budget_min=200)["total_count"] == 1
+
+    # New project, a reopened one, a closed one and new proposals - applied incrementally
+    _add_project(db, 4, "Web Development", "React", 300, day=4)
+    db.execute("UPDATE projects SET status = 'open', updated_at = '2026-01-06T00:00:00' WHERE id = 3")
+    db.execute("UPDATE projects SET status = 'completed', updated_at = '2026-01-06T00:00:00' WHERE id = 2")
+    db.execute("INSERT INTO proposals (id, project_id, status, updated_at) VALUES (2, 4, 'pending', '2026-01-06')")
+    db.execute("INSERT INTO proposals (id, project_id, status, updated_at) VALUES (3, 4, 'pending', '2026-01-06')")
+    loaded_at = discovery._loaded_at
+
+    result = discovery.search(sort="most_proposals")
+    assert discovery._loaded_at == loaded_at  # no full reload
+    assert [p["id"] for p in result["items"]] == [4, 1, 3]
+    assert [p["proposal_count"] for p in result["items"]] == [2, 1, 0]
+
+    # Deletes force a full reload
+    db.execute("DELETE FROM projects WHERE id = 4")
+    result = discovery.search(sort="newest")
+    assert discovery._loaded_at > loaded_at
+    assert [p["id"] for p in result["items"]] == [3, 1]
+
+
+def test_project_discovery_polls_for_writes_from_other_instances(db):
+    _add_project(db, 1, "Web Development", "Python", 100, day=1)
+    discovery = ProjectDiscovery(backend_factory=lambda: db)
+    discovery.load()
+    loaded_at = discovery._loaded_at
+
+    def poll_due():
+        discovery._probed_at -= REMOTE_POLL_SECONDS
+
+    # Another worker's writes bypass this process's change feed
+    db.conn.execute(
+        "INSERT INTO projects (id, title, category, budget_type, budget_min, budget_max, status, skills, "
+        "client_id, created_at, updated_at) VALUES (2, 'P2', 'Mobile', 'fixed', 10, 20, 'open', 'Swift', 1, "
+        "'2026-01-02T00:00:00', '2026-01-02T00:00:00')")
+    db.conn.execute("INSERT INTO proposals (id, project_id, status, updated_at) VALUES (1, 1, 'pending', '2026-01-03')")
+    requests = db.requests
+    assert discovery.search()["total_count"] == 1 and db.requests == requests  # not polled yet
+
+    poll_due()
+    result = discovery.search(sort="most_proposals")
+    assert [p["id"] for p in result["items"]] == [1, 2]
+    assert result["items"][0]["proposal_count"] == 1
+    assert discovery._loaded_at == loaded_at  # applied incrementally
+
+    poll_due()
+    requests = db.requests
+    discovery.search()
+    assert db.requests == requests + 1  # nothing moved: one probe request
+
+    db.conn.execute("UPDATE projects SET status = 'completed', updated_at = '2026-01-04T00:00:00' WHERE id = 2")
+    poll_due()
+    assert [p["id"] for p in discovery.search()["items"]] == [1]
+    assert discovery._loaded_at == loaded_at
+
+    # A delete elsewhere, even with an insert in the same window, forces a full reload
+    db.conn.execute("DELETE FROM projects WHERE id = 1")
+    _add_project(db, 3, "Web Design", "Figma", 50, day=5)
+    db.conn.execute("DELETE FROM proposals WHERE id = 1")
+    poll_due()
+    assert [p["id"] for p in discovery.search()["items"]] == [3]
+    assert discovery._loaded_at > loaded_at
+
+
+def test_freelancer_min_rating_filters_before_paging(db):
+    for uid, rate, location in [(1, 40, "Berlin"), (2, 80, "Lagos"), (3, 60, None)]:
+        db.execute(
+            "INSERT INTO users (id, email, name, hourly_rate, location, skills, user_type, is_active, created_at) "
+            "VALUES (?, ?, ?, ?, ?, '[\"Python\", \"SQL\"]', 'Freelancer', 1, ?)",
+            [uid, f"u{uid}@example.com", f"U{uid}", rate, location, f"2026-01-0{uid}"],
+        )
+    db.execute("INSERT INTO reviews (reviewee_id, rating) VALUES (1, 5), (1, 4), (2, 3), (3, 4.5)")
+
+    discovery = FreelancerDiscovery(backend_factory=lambda: db)
+    discovery.load()
+
+    result = discovery.search(min_rating=4.5, limit=1, sort="rating_high")
+    assert result["total_count"] == 2
+    assert [u["id"] for u in result["items"]] == [3]
+    assert discovery.search(skills=["sql"], max_rate=60)["total_count"] == 2
+    assert discovery.search()["facets"]["locations"] == {"Berlin": 1, "Lagos": 1, "unspecified": 1}
@@ -0,0 +1,106 @@
+# @AI-HINT: Image derivative tests - variants are downscale-only, EXIF-free and rotated upright; the upload route negotiates format and width with strong ETags
+import io
+
+import pytest
+from PIL import Image
+
+import main
+from app.core.storage import LocalStorage
+from app.services import image_derivatives
+from app.services.image_derivatives import FORMAT_MIME, DerivativePipeline, select_variant
+
+AVIF = "image/avif,image/webp,image/apng,image/*,*/*;q=0.8"
+WEBP = "image/webp,*/*"
+
+
+def _photo(width=1600, height=1000) -> bytes:
+    img = Image.new("RGB", (width, height), (200, 80, 40))
+    exif = Image.Exif()
+    exif[0x0112] = 6  # camera held upright: rotate 90 degrees on display
+    exif[0x010F] = "PhoneCo"
+    out = io.BytesIO()
+    img.save(out, "JPEG", exif=exif.tobytes())
+    return out.getvalue()
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    storage = LocalStorage()
+    storage.upload_dir = tmp_path
+    p = DerivativePipeline(storage=storage, workers=1)
+    yield p
+    p.close()
+
+
+def test_variants_are_upright_downscaled_and_stripped(pipeline, tmp_path):
+    (tmp_path / "portfolio").mkdir()
+    (tmp_path / "portfolio" / "shot.jpg").write_bytes(_photo())
+    manifest = pipeline.enqueue("portfolio/shot.jpg").result(timeout=60)
+
+    # EXIF rotation makes it 1000 wide, so 1280 is capped at the original width
+    assert (manifest["width"], manifest["height"]) == (1000, 1600)
+    assert manifest["fallback"] == "jpeg" and manifest["formats"][-1] == "jpeg"
+    assert sorted({v["width"] for v in manifest["variants"]}) == [64, 160, 320, 640, 1000]
+    for v in manifest["variants"]:
+        img = Image.open(tmp_path / v["path"])
+        assert img.size == (v["width"], v["height"]) and img.height > img.width
+        assert not img.getexif() and "exif" not in img.info
+
+    assert select_variant(manifest, "image/jpeg", 300)["format"] == "jpeg"
+    chosen = pipeline.select("portfolio/shot.jpg", WEBP, 300)
+    assert chosen["width"] == 320 and chosen["format"] != "avif"  # not in Accept
+    assert pipeline.select("portfolio/shot.jpg", WEBP, 5000)["width"] == 1000
+    assert pipeline.select("portfolio/shot.jpg", "image/webp;q=0", None)["format"] == "jpeg"
+
+    pipeline.delete("portfolio/shot.jpg")
+    assert pipeline.manifest("portfolio/shot.jpg") is None
+    assert not (tmp_path / "_variants" / "portfolio" / "shot.jpg").exists()
+
+
+def test_transparent_images_fall_back_to_png_and_animations_are_skipped(pipeline):
+    icon = io.BytesIO()
+    Image.new("RGBA", (100, 50), (0, 0, 0, 0)).save(icon, "PNG")
+    manifest = pipeline.build("avatars/icon.png", icon.getvalue())
+    assert manifest["fallback"] == "png"
+    assert sorted({v["width"] for v in manifest["variants"]}) == [64, 100]
+
+    gif = io.BytesIO()
+    frames = [Image.new("RGB", (80, 80), (i * 100, 0, 0)) for i in range(3)]
+    frames[0].save(gif, "GIF", save_all=True, append_images=frames[1:])
+    assert pipeline.build("gigs/spin.gif", gif.getvalue()) is None
+    assert pipeline.stats["skipped"] == 1
+
+
+def test_upload_route_negotiates_variant_with_strong_etag(pipeline, tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    (tmp_path / "gigs").mkdir()
+    (tmp_path / "gigs" / "cover.jpg").write_bytes(_photo())
+    monkeypatch.setattr(main, "_UPLOADS_BASE", tmp_path.resolve())
+    monkeypatch.setattr(image_derivatives, "_pipeline", pipeline)
+    client = TestClient(main.app)
+
+    reads = []
+    read_file = pipeline.storage.read_file
+    monkeypatch.setattr(pipeline.storage, "read_file", lambda path: reads.append(path) or read_file(path))
+
+    # Before the build: the original, with a strong ETag of its own; the missing manifest is looked up once
+    original = client.get("/uploads/gigs/cover.jpg?w=320", headers={"Accept": AVIF})
+    assert original.status_code == 200 and original.headers["content-type"] == "image/jpeg"
+    assert original.headers["vary"] == "Accept" and not original.headers["etag"].startswith("W/")
+    again = client.get("/uploads/gigs/cover.jpg?w=320", headers={"Accept": AVIF, "If-None-Match": original.headers["etag"]})
+    assert again.status_code == 304 and len(reads) == 1
+
+    pipeline.build("gigs/cover.jpg")
+    r = client.get("/uploads/gigs/cover.jpg?w=320", headers={"Accept": AVIF})
+    variant = pipeline.select("gigs/cover.jpg", AVIF, 320)
+    same_width = [v for v in pipeline.manifest("gigs/cover.jpg")["variants"] if v["width"] == 320]
+    assert variant["bytes"] == min(v["bytes"] for v in same_width)
+    assert r.headers["content-type"] == FORMAT_MIME[variant["format"]] and r.headers["etag"] == variant["etag"]
+    assert len(r.content) == variant["bytes"] < len(original.content) / 10
+
+    legacy = client.get("/uploads/gigs/cover.jpg?w=320", headers={"Accept": "image/jpeg"})
+    assert legacy.headers["content-type"] == "image/jpeg" and legacy.headers["etag"] != r.headers["etag"]
+
+    cached = client.get("/uploads/gigs/cover.jpg?w=320", headers={"Accept": AVIF, "If-None-Match": r.headers["etag"]})
+    assert cached.status_code == 304 and not cached.content
@@ -0,0 +1,182 @@
+# @AI-HINT: Ledger tests - atomic escrow/wallet postings, refunds paid once, overdraft rollback, concurrent releases, payout reservations, legacy openings, reconciliation
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import pytest
+
+import app.db.turso_http as turso_module
+import app.services.ledger as ledger_module
+from app.services import escrow_service, refunds_service, wallet_service
+from app.services.ledger import InsufficientFunds, Ledger, LedgerError, user_account, wallet_account
+from app.services.multicurrency_payments import MultiCurrencyPaymentService
+
+
+@pytest.fixture
+def db(monkeypatch, sqlite_turso):
+    turso = sqlite_turso()
+    turso.conn.executescript(
+        """
+        CREATE TABLE users (id INTEGER PRIMARY KEY, account_balance REAL DEFAULT 0);
+        CREATE TABLE contracts (id INTEGER PRIMARY KEY, client_id INTEGER, freelancer_id INTEGER);
+        CREATE TABLE escrow (id INTEGER PRIMARY KEY AUTOINCREMENT, contract_id INTEGER, client_id INTEGER,
+            amount REAL, released_amount REAL, status TEXT, expires_at TEXT, notes TEXT,
+            created_at TEXT, updated_at TEXT);
+        INSERT INTO users VALUES (1, 1000), (2, 0);
+        INSERT INTO contracts VALUES (10, 1, 2);
+        """
+    )
+    monkeypatch.setattr(turso_module.TursoHTTP, "get_instance", classmethod(lambda cls: turso))
+    ledger = Ledger(backend_factory=lambda: turso)
+    monkeypatch.setattr(ledger_module, "_ledger", ledger)
+    return turso
+
+
+def _clean(report):
+    return not (report["unbalanced_postings"] or report["balance_drift"] or report["legacy_drift"])
+
+
+def test_escrow_fund_release_refund_post_balanced_entries(db):
+    escrow = escrow_service.create_escrow(10, 1, 400, None, "milestone 1")
+    assert escrow["amount"] == 400 and escrow["status"] == "active"
+    assert escrow_service.get_user_balance(1) == 600
+
+    escrow_service.release_escrow_funds(escrow["id"], 150, 2)
+    escrow_service.release_escrow_funds(escrow["id"], 50, 2)
+    escrow_service.refund_escrow_funds(escrow["id"], 200, 1)
+
+    assert db.scalar("SELECT account_balance FROM users WHERE id = 2") == 200
+    assert db.scalar("SELECT account_balance FROM users WHERE id = 1") == 800
+    assert escrow_service.get_escrow_core(escrow["id"])["released_amount"] == 400
+    assert ledger_module.get_ledger().balances([user_account(1), user_account(2), f"escrow:{escrow['id']}"]) == {
+        "user:1": 800, "user:2": 200, f"escrow:{escrow['id']}": 0,
+    }
+    assert _clean(ledger_module.get_ledger().reconcile())
+
+
+def test_first_posting_opens_accounts_at_their_legacy_balances(db):
+    db.execute("INSERT INTO escrow (id, contract_id, client_id, amount, released_amount, status) "
+               "VALUES (50, 10, 1, 300, 100, 'active')")  # funded before the ledger existed
+    assert escrow_service.get_user_balance(1) == 1000
+
+    escrow = escrow_service.create_escrow(10, 1, 900, None, None)
+    assert escrow_service.get_user_balance(1) == 100
+    escrow_service.release_escrow_funds(50, 200, 2)
+    with pytest.raises(InsufficientFunds):
+        escrow_service.release_escrow_funds(50, 0.01, 2)
+    escrow_service.refund_escrow_funds(escrow["id"], 50, 1)
+
+    assert db.scalar("SELECT account_balance FROM users WHERE id = 1") == 150
+    assert db.scalar("SELECT account_balance FROM users WHERE id = 2") == 200
+    assert db.scalar("SELECT COUNT(*) FROM ledger_entries WHERE kind = 'opening'") == 4  # user:1, escrow:50
+    assert ledger_module.get_ledger().balance(ledger_module.ADJUSTMENTS_ACCOUNT) == -1200
+    assert _clean(ledger_module.get_ledger().reconcile())
+
+
+async def test_instant_payout_reserves_before_sending_and_voids_on_failure(db):
+    db.execute("CREATE TABLE payouts (id INTEGER PRIMARY KEY, user_id INTEGER, amount REAL, currency TEXT, "
+               "payout_method TEXT, status TEXT, transaction_id TEXT, created_at TEXT)")
+    service = MultiCurrencyPaymentService(None)
+    seen = []
+
+    async def failing(user_id, amount, currency):
+        seen.append(db.scalar("SELECT account_balance FROM users WHERE id = 1"))
+        return {"error": "card declined"}
+
+    service._stripe_instant_payout = failing
+    assert await service.process_instant_payout(1, Decimal("300"), "USD", "stripe") == {"error": "card declined"}
+    assert seen == [700]  # reserved while the transfer was in flight
+    assert db.scalar("SELECT account_balance FROM users WHERE id = 1") == 1000
+
+    result = await service.process_instant_payout(1, Decimal("300"), "USD", "crypto")
+    assert result["success"] and db.scalar("SELECT account_balance FROM users WHERE id = 1") == 700
+    assert db.scalar("SELECT transaction_id FROM payouts") == result["transaction_id"]
+    assert await service.process_instant_payout(1, Decimal("700.01"), "USD", "crypto") == {
+        "error": "Insufficient balance"}
+    assert db.scalar("SELECT COUNT(*) FROM payouts") == 1
+    assert db.scalar("SELECT COUNT(*) FROM ledger_balances WHERE account LIKE 'hold:%' AND balance_cents != 0") == 0
+    assert _clean(ledger_module.get_ledger().reconcile())
+
+
+def test_refund_is_posted_once_with_its_status_updates(db):
+    db.conn.executescript(
+        """
+        CREATE TABLE payments (id INTEGER PRIMARY KEY, status TEXT);
+        CREATE TABLE refunds (id INTEGER PRIMARY KEY, status TEXT, processed_at TEXT, updated_at TEXT);
+        INSERT INTO payments VALUES (5, 'completed');
+        INSERT INTO refunds VALUES (7, 'approved', NULL, NULL);
+        """
+    )
+    refunds_service.process_refund(7, 5, 2, 30.5, refunds_service.get_user_balance(2))
+
+    assert refunds_service.get_user_balance(2) == 30.5
+    assert db.scalar("SELECT account_balance FROM users WHERE id = 2") == 30.5
+    assert db.scalar("SELECT status FROM payments WHERE id = 5") == "refunded"
+    assert db.scalar("SELECT status FROM refunds WHERE id = 7") == "processed"
+    assert _clean(ledger_module.get_ledger().reconcile())
+
+    db.execute("UPDATE refunds SET status = 'approved' WHERE id = 7")
+    with pytest.raises(LedgerError):
+        refunds_service.process_refund(7, 5, 2, 30.5, 30.5)
+    assert refunds_service.get_user_balance(2) == 30.5
+    assert db.scalar("SELECT status FROM refunds WHERE id = 7") == "approved"
+
+
+def test_overdraft_rolls_back_the_whole_posting(db):
+    escrow = escrow_service.create_escrow(10, 1, 100, None, None)
+    entries_before = db.scalar("SELECT COUNT(*) FROM ledger_entries")
+
+    with pytest.raises(InsufficientFunds):
+        escrow_service.release_escrow_funds(escrow["id"], 100.01, 2)
+    with pytest.raises(InsufficientFunds):
+        escrow_service.create_escrow(10, 1, 5000, None, None)
+
+    assert db.scalar("SELECT COUNT(*) FROM ledger_entries") == entries_before
+    assert db.scalar("SELECT COUNT(*) FROM escrow") == 1
+    assert db.scalar("SELECT released_amount FROM escrow") == 0
+    assert db.scalar("SELECT account_balance FROM users WHERE id = 2") == 0
+    with pytest.raises(LedgerError):
+        ledger_module.get_ledger().post("bogus", [(user_account(1), -1), (user_account(2), 2)])
+
+
+def test_concurrent_releases_never_overspend_or_drift(db):
+    escrow = escrow_service.create_escrow(10, 1, 500, None, None)
+
+    def release(_):
+        try:
+            escrow_service.release_escrow_funds(escrow["id"], 7, 2)
+            return True
+        except InsufficientFunds:
+            return False
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        succeeded = sum(pool.map(release, range(100)))
+
+    assert succeeded == 500 // 7
+    assert db.scalar("SELECT account_balance FROM users WHERE id = 2") == pytest.approx(7 * succeeded)
+    assert db.scalar("SELECT released_amount FROM escrow") == pytest.approx(7 * succeeded)
+    assert _clean(ledger_module.get_ledger().reconcile())
+
+
+def test_wallet_withdrawal_and_reconciliation_of_outside_writes(db):
+    wallet_service.ensure_wallet_tables()
+    assert wallet_service.withdraw_to_pending(1, 50, "USD", "Withdrawal", "WD-1", "{}") is False
+
+    db.execute("INSERT INTO wallet_balances (user_id, available, pending) VALUES (1, 80, 0)")
+    assert _clean(ledger_module.get_ledger().reconcile())  # not posted to yet: opens at 80
+    assert wallet_service.withdraw_to_pending(1, 50, "USD", "Withdrawal", "WD-1", "{}") is True
+    assert db.execute("SELECT available, pending FROM wallet_balances")["rows"] == [[30, 50]]
+    assert db.scalar("SELECT status FROM wallet_transactions WHERE reference_id = 'WD-1'") == "processing"
+
+    db.execute("UPDATE wallet_balances SET available = available + 25 WHERE user_id = 1")  # outside the ledger
+    db.execute("UPDATE users SET account_balance = -5 WHERE id = 2")
+    report = ledger_module.get_ledger().reconcile()
+    assert {d["account"] for d in report["legacy_drift"]} == {"user:2", "wallet:1:available"}
+
+    assert ledger_module.get_ledger().reconcile(repair=True)["repaired"]
+    assert ledger_module.get_ledger().balance(wallet_account(1)) == 55
+    assert ledger_module.get_ledger().reconcile()["legacy_drift"] == [
+        {"account": "user:2", "recorded": -5, "ledger": 0},  # negative balances are never adopted
+    ]
+
+    db.execute("UPDATE ledger_balances SET balance_cents = 1 WHERE account = 'wallet:1:pending'")
+    assert [d["account"] for d in ledger_module.get_ledger().reconcile()["balance_drift"]] == ["wallet:1:pending"]
@@ -0,0 +1,119 @@
+# @AI-HINT: Market calibration tests - percentile cells from platform tables, versioned publish, hot swap and estimator lookups without queries
+
+import pytest
+
+from app.services import price_estimator_engine
+from app.services import market_calibration
+from app.services.market_calibration import MarketRateSnapshot, MarketRateStore, country_code, percentile
+
+
+@pytest.fixture
+def db(sqlite_turso):
+    turso = sqlite_turso()
+    turso.conn.executescript(
+        """
+        CREATE TABLE users (id INTEGER PRIMARY KEY, user_type TEXT, hourly_rate REAL, is_active INTEGER,
+                            skills TEXT, location TEXT);
+        CREATE TABLE projects (id INTEGER PRIMARY KEY, title TEXT, category TEXT, budget_type TEXT,
+                               budget_min REAL, budget_max REAL, status TEXT);
+        CREATE TABLE contracts (id INTEGER PRIMARY KEY, project_id INTEGER, freelancer_id INTEGER,
+                                contract_type TEXT, amount REAL, hourly_rate REAL, status TEXT);
+        CREATE TABLE categories (id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE gigs (id INTEGER PRIMARY KEY, seller_id INTEGER, category_id INTEGER, subcategory TEXT,
+                           title TEXT, standard_price REAL, status TEXT);
+        """
+    )
+    rates = [20, 25, 30, 35, 40, 45]
+    for i, rate in enumerate(rates, start=1):
+        turso.conn.execute(
+            "INSERT INTO users VALUES (?, 'Freelancer', ?, 1, '[\"React\", \"Web applications\"]', 'Lahore, Pakistan')",
+            [i, rate],
+        )
+        turso.conn.execute("INSERT INTO projects VALUES (?, 'Shop site', 'Web Development', 'hourly', 20, 60, 'completed')", [i])
+        turso.conn.execute(
+            "INSERT INTO contracts VALUES (?, ?, ?, 'hourly', 0, ?, 'completed')", [i, i, i, rate + 10]
+        )
+        # Not contracted yet: the posted budget is the sample
+        turso.conn.execute(
+            "INSERT INTO projects VALUES (?, 'Shop site', 'Web Development', 'fixed', ?, ?, 'open')",
+            [i + 10, 1000 * i, 1000 * i + 500],
+        )
+    turso.conn.execute("INSERT INTO users VALUES (99, 'Client', 500, 1, 'web', 'Berlin, DE')")
+    turso.conn.execute("INSERT INTO gigs VALUES (1, 1, NULL, 'Logo', 'Minimal logo design', 50, 'active')")
+    return turso
+
+
+def test_percentiles_and_location_parsing():
+    assert percentile([10, 20, 30, 40], 50) == 25
+    assert percentile([10, 20, 30, 40], 90) == pytest.approx(37)
+    assert percentile([7], 10) == 7
+    assert country_code("Lahore, Pakistan") == "PK"
+    assert country_code("Berlin, DE") == "DE"
+    assert country_code("London, UK") == "GB"
+    assert country_code("Somewhere") is None
+
+
+def test_calibrate_publishes_versions_and_store_swaps(db):
+    store = MarketRateStore(backend_factory=lambda: db)
+    report = store.calibrate()
+    assert report["version"] == 1 and report["samples"] == 19
+
+    cell = store.snapshot.lookup("software_development", "web_application", "PK")
+    # Profile rates 20..45 plus contract rates 30..55, all Pakistani freelancers building web apps
+    assert cell["hourly"]["samples"] == 12 and cell["hourly"]["country"] == "PK"
+    assert cell["hourly"]["p50"] == 37.5
+    # Projects without a contract have no freelancer country: the budget falls back to the all-countries cell
+    assert cell["budget"]["country"] == "*" and cell["budget"]["p50"] == 3750.0
+    # Too few samples for a logo_branding cell
+    assert store.snapshot.lookup("design_creative", "logo_branding")["budget"] is None
+
+    # Another worker sees the published snapshot on refresh; nothing newer means no reload
+    other = MarketRateStore(backend_factory=lambda: db)
+    assert other.refresh() is True and other.snapshot.version == 1
+    assert other.snapshot.cells == store.snapshot.cells
+    assert other.refresh() is False
+
+    for version in range(2, 9):
+        assert store.calibrate()["version"] == version
+    versions = db.execute("SELECT version FROM market_rate_snapshots ORDER BY version")["rows"]
+    assert [v[0] for v in versions] == [4, 5, 6, 7, 8]
+    assert other.refresh() is True and other.snapshot.version == 8
+
+
+def test_estimator_market_data_reads_snapshot_without_queries(db, monkeypatch):
+    store = MarketRateStore(backend_factory=lambda: db)
+    store.calibrate()
+    monkeypatch.setattr(market_calibration, "_store", store)
+
+    queries = db.requests
+    data = price_estimator_engine.get_platform_market_data("software_development", "web_application", "PK")
+    assert db.requests == queries
+    assert data["avg_hourly_rate"] == 37.5 and data["total_freelancers"] == 12
+    assert data["avg_project_budget"] == 3750.0 and data["snapshot_version"] == 1
+
+    roundtrip = MarketRateSnapshot.from_payload(1, None, store.snapshot.to_payload())
+    assert roundtrip.cells == store.snapshot.cells
+
+
+def test_estimates_use_calibrated_percentiles_for_cells_with_enough_samples(db, monkeypatch):
+    static = price_estimator_engine.MARKET_RATES["software_development"]["web_application"]
+    store = MarketRateStore(backend_factory=lambda: db)
+    monkeypatch.setattr(market_calibration, "_store", store)
+    regional = price_estimator_engine._regional_multiplier("global_remote", None, None)
+
+    def standard_hourly():
+        estimate = price_estimator_engine.estimate_price("software_development", "web_application")
+        return estimate["market_comparison"]["tiers"]["standard"]["hourly"]
+
+    assert standard_hourly() == round(static["mid"] * regional, 2)
+
+    store.calibrate()
+    cell = store.snapshot.lookup("software_development", "web_application")["hourly"]
+    rates = price_estimator_engine._service_rates("software_development", "web_application")
+    assert (rates["junior"], rates["mid"], rates["senior"]) == (cell["p10"], cell["p50"], cell["p90"])
+    assert rates["expert"] == pytest.approx(cell["p90"] * static["expert"] / static["senior"])
+    assert standard_hourly() == round(cell["p50"] * regional, 2)
+
+    # Only the category roll-up has samples for this service: the static table still applies
+    assert price_estimator_engine._service_rates("software_development", "mobile_app") == \
+        price_estimator_engine.MARKET_RATES["software_development"]["mobile_app"]
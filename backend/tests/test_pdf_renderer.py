@@ -0,0 +1,101 @@
+# @AI-HINT: PDF render tests - streamed documents have a valid xref and repeat table headers per page; jobs and month-end style batches render through the pool and report status from Turso
+import re
+import zlib
+
+import pytest
+
+from app.core.storage import LocalStorage
+from app.services.pdf_document import render_bytes
+from app.services.pdf_renderer import PdfRenderService, data_blocks, invoice_document
+
+
+INVOICE = {
+    "id": 7, "invoice_number": "INV-2025-0007", "from_name": "Ayesha Khan", "to_name": "Acme Ltd",
+    "status": "sent", "created_at": "2025-06-30T10:00:00", "due_date": "2025-07-30",
+    "items": [{"description": "Landing page build", "quantity": 12, "rate": 40.0, "amount": 480.0}],
+    "subtotal": 480.0, "tax": 48.0, "total": 528.0,
+}
+
+
+def _content_streams(pdf: bytes):
+    for m in re.finditer(rb"/Length (\d+)[^>]*>>\nstream\n", pdf):
+        yield zlib.decompress(pdf[m.end():m.end() + int(m.group(1))])
+
+
+@pytest.fixture
+def service(tmp_path, sqlite_turso):
+    storage = LocalStorage()
+    storage.upload_dir = tmp_path
+    db = sqlite_turso()
+    s = PdfRenderService(backend_factory=lambda: db, storage=storage, workers=1, chunk_size=2)
+    yield s
+    s.close()
+
+
+def test_streamed_document_has_valid_xref_and_repeats_table_header():
+    rows = [{"day": f"2025-06-{i % 30 + 1:02d}", "project": f"Project {i}", "hours": i % 9, "earned": i * 12.5}
+            for i in range(300)]
+    pdf = render_bytes({"template": "report", "title": "Earnings", "blocks": data_blocks({"entries": rows})})
+
+    assert pdf.startswith(b"%PDF-1.4") and pdf.rstrip().endswith(b"%%EOF")
+    xref_at = int(re.search(rb"startxref\n(\d+)", pdf).group(1))
+    assert pdf[xref_at:xref_at + 4] == b"xref"
+    count = int(re.search(rb"xref\n0 (\d+)", pdf).group(1))
+    offsets = re.findall(rb"(\d{10}) 00000 n ", pdf[xref_at:])
+    assert len(offsets) == count - 1
+    for number, offset in enumerate(offsets, start=1):
+        assert pdf[int(offset):].startswith(b"%d 0 obj" % number)
+
+    pages = int(re.search(rb"/Type /Pages /Kids \[[^\]]*\] /Count (\d+)", pdf).group(1))
+    assert pages > 5
+    bodies = [s for s in _content_streams(pdf) if b"Page " in s]
+    assert len(bodies) == pages
+    assert all(b"(Project) Tj" in body for body in bodies)  # header on every page
+    assert b"(Page %d) Tj" % pages in bodies[-1]
+
+
+def test_submit_returns_handle_and_renders_to_storage(service, tmp_path):
+    handle = service.submit(invoice_document(INVOICE), owner_id=3, kind="invoice", filename="INV-2025-0007")
+    assert handle["status"] == "queued" and handle["filename"] == "INV-2025-0007.pdf"
+    assert handle["download_url"] == f"/api/pdf-jobs/{handle['job_id']}/download"
+
+    job = service.wait(handle["job_id"], timeout=60)
+    assert job["status"] == "completed" and job["owner_id"] == 3 and job["pages"] == 1
+    pdf = (tmp_path / job["path"]).read_bytes()
+    assert len(pdf) == job["bytes"]
+    text = b"".join(_content_streams(pdf))
+    assert b"(Invoice INV-2025-0007) Tj" in text and b"(528.00 USD) Tj" in text
+
+
+def test_rendered_pdfs_are_not_served_from_public_uploads(service, tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import main
+
+    job = service.wait(service.submit(invoice_document(INVOICE), owner_id=3)["job_id"], timeout=60)
+    (tmp_path / "attachments").mkdir()
+    (tmp_path / "attachments" / "brief.pdf").write_bytes(b"%PDF-1.4")
+    monkeypatch.setattr(main, "_UPLOADS_BASE", tmp_path.resolve())
+    client = TestClient(main.app)
+
+    assert (tmp_path / job["path"]).is_file()
+    assert client.get(f"/uploads/{job['path']}").status_code == 404
+    assert client.get(f"/uploads/attachments/../{job['path']}").status_code == 404
+    assert client.get("/uploads/attachments/brief.pdf").status_code == 200
+
+
+def test_batch_renders_in_chunks_and_isolates_failures(service):
+    broken = {"template": "invoice", "blocks": [{"type": "table", "columns": [{"key": "a", "width": "wide"}]}]}
+    items = [(invoice_document({**INVOICE, "invoice_number": f"INV-{i}"}), 3, f"INV-{i}") for i in range(4)]
+    batch = service.submit_batch(items + [(broken, 4, "broken")], kind="invoice")
+    assert batch["jobs"] == 5 and batch["status_url"].endswith(batch["batch_id"])
+
+    jobs = service._rows("batch_id = ?", [batch["batch_id"]])
+    for job in jobs:
+        service.wait(job["id"], timeout=60)
+    status = service.batch_status(batch["batch_id"])
+    assert status["status"] == "completed" and status["pages"] == 4
+    assert status["counts"]["completed"] == 4 and status["counts"]["failed"] == 1
+    assert status["failed"][0]["filename"] == "broken.pdf" and "ValueError" in status["failed"][0]["error"]
+    assert service.stats["chunks"] == 3
+    assert service.batch_status("missing") is None
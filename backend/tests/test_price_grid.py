@@ -0,0 +1,68 @@
+# @AI-HINT: Price grid tests - every scenario of estimate_price_grid matches estimate_price, with and without NumPy
+import sys
+
+import pytest
+
+from app.services import price_estimator_engine as engine
+
+
+def _grid_kwargs():
+    return dict(
+        category="software_development",
+        service_type="web_application",
+        urgencies=["critical", "standard", "relaxed"],
+        quality_tiers=["budget", "premium", "platinum"],
+        description="word " * 150,
+        features=["auth", "billing", "search"],
+        team_size=2,
+        client_country="US",
+    )
+
+
+@pytest.mark.parametrize("numpy_available", [True, False])
+def test_grid_matches_estimate_price(monkeypatch, numpy_available):
+    if not numpy_available:
+        monkeypatch.setitem(sys.modules, "numpy", None)
+    kwargs = _grid_kwargs()
+    grid = engine.estimate_price_grid(
+        experience_levels=["junior", "expert", "guru"],
+        freelancer_countries=["PK", "DE", "ZZ"],
+        **kwargs,
+    )
+    assert grid.shape == (3, 3, 3, 3) and len(grid) == 81
+    project = {k: kwargs[k] for k in ("category", "service_type", "description", "features", "team_size")}
+
+    for row in grid.rows():
+        expected = engine.estimate_price(**project, **grid.scenario(row["index"]))["estimate"]
+        assert {k: row[k] for k in ("hourly_rate", "total_estimate", "low_estimate", "high_estimate")} == {
+            k: expected[k] for k in ("hourly_rate", "total_estimate", "low_estimate", "high_estimate")
+        }
+        assert grid.total_hours == expected["total_hours"]
+
+    cheapest = grid.summary()["cheapest"]
+    assert grid.cheapest(1) == [cheapest]
+    assert grid.row(cheapest)["total_estimate"] == min(r["total_estimate"] for r in grid.rows())
+    detail = grid.detail(cheapest)
+    assert detail["estimate"]["total_estimate"] == grid.row(cheapest)["total_estimate"]
+    assert detail["meta"]["freelancer_country"] == grid.scenario(cheapest)["freelancer_country"]
+
+
+def test_grid_locations_and_limits():
+    grid = engine.estimate_price_grid("unknown_category", "unknown_service", regions=["south_asia", "north_america"])
+    assert [loc[0] for loc in grid.axes["location"]] == ["south_asia", "north_america"]
+    assert grid.row(1)["total_estimate"] == engine.estimate_price(
+        "unknown_category", "unknown_service", experience_level="junior", region="north_america"
+    )["estimate"]["total_estimate"]
+
+    grid = engine.estimate_price_grid("design_creative", "logo_branding", client_countries=["US", "IN"])
+    assert [loc[1] for loc in grid.axes["location"]] == ["US", "IN"]
+
+    with pytest.raises(IndexError):
+        grid.scenario(len(grid))
+    with pytest.raises(ValueError):
+        engine.estimate_price_grid("design_creative", "logo_branding", urgencies=[])
+    with pytest.raises(ValueError):
+        engine.estimate_price_grid(
+            "design_creative", "logo_branding", freelancer_countries=["PK"] * 2000,
+            urgencies=list(engine.URGENCY_MULTIPLIERS), quality_tiers=list(engine.QUALITY_MULTIPLIERS),
+        )
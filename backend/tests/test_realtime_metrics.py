@@ -0,0 +1,168 @@
+# @AI-HINT: Realtime metrics tests - boards seed once from aggregates, domain events update counters and earnings buckets without queries, pushes coalesce per user, writes racing a seed trigger a re-seed, events relayed between workers, relayed events already in a seed dropped
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.realtime_metrics import RealtimeMetrics
+
+SCHEMA = [
+    "CREATE TABLE projects (id INTEGER PRIMARY KEY, client_id INTEGER)",
+    "CREATE TABLE proposals (id INTEGER PRIMARY KEY, project_id INTEGER, freelancer_id INTEGER, status TEXT)",
+    "CREATE TABLE contracts (id INTEGER PRIMARY KEY, freelancer_id INTEGER, client_id INTEGER, status TEXT)",
+    "CREATE TABLE messages (id INTEGER PRIMARY KEY, receiver_id INTEGER, is_read INTEGER, is_deleted INTEGER)",
+    "CREATE TABLE payments (id INTEGER PRIMARY KEY, from_user_id INTEGER, to_user_id INTEGER, amount REAL, "
+    "status TEXT, processed_at TEXT, updated_at TEXT)",
+]
+
+
+@pytest.fixture
+def db(sqlite_turso):
+    db = sqlite_turso(SCHEMA)
+    now = datetime.now(timezone.utc)
+    db.conn.executemany("INSERT INTO projects VALUES (?, ?)", [(1, 10), (2, 11)])
+    db.conn.executemany("INSERT INTO proposals (project_id, freelancer_id, status) VALUES (?, ?, ?)",
+                        [(1, 20, "submitted"), (1, 21, "shortlisted"), (2, 20, "rejected"), (2, 20, "submitted")])
+    db.conn.executemany("INSERT INTO contracts (freelancer_id, client_id, status) VALUES (?, ?, ?)",
+                        [(20, 10, "active"), (20, 11, "completed")])
+    db.conn.executemany("INSERT INTO messages (receiver_id, is_read, is_deleted) VALUES (?, ?, ?)",
+                        [(20, 0, 0), (20, 0, 1), (20, 1, 0), (10, 0, 0)])
+    db.conn.executemany(
+        "INSERT INTO payments (from_user_id, to_user_id, amount, status, processed_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+        [(10, 20, 100.0, "completed", now.isoformat(), now.isoformat()),
+         (10, 20, 40.0, "completed", (now - timedelta(days=400)).isoformat(), now.isoformat()),
+         (10, 20, 75.0, "pending", None, now.isoformat())])
+    return db
+
+
+class _Bus:
+    """In-process stand-in for the Redis channel: every message goes through JSON to the other members."""
+
+    def __init__(self):
+        self.members = []
+
+    def relay(self):
+        bus = self
+
+        class Relay:
+            def start(self, deliver, on_gap):
+                self.deliver, self.on_gap = deliver, on_gap
+                bus.members.append(self)
+
+            def send(self, event, fields):
+                message = json.loads(json.dumps({"event": event, "fields": fields}))
+                for member in bus.members:
+                    if member is not self:
+                        member.deliver(message["event"], message["fields"])
+
+            def close(self):
+                bus.members.remove(self)
+
+        return Relay()
+
+
+def _metrics(db, pushes=None):
+    push = (lambda user_id, snapshot: pushes.append((user_id, snapshot))) if pushes is not None else None
+    return RealtimeMetrics(backend_factory=lambda: db, push=push, background=False)
+
+
+def test_seeds_once_then_serves_events_from_memory(db):
+    metrics = _metrics(db)
+    freelancer = metrics.snapshot(20)["metrics"]
+    assert freelancer == {"active_projects": 1, "pending_proposals": 2, "unread_messages": 1, "pending_payments": 1,
+                          "today_earnings": 100.0, "week_earnings": 100.0, "month_earnings": 100.0}
+    assert metrics.snapshot(10)["metrics"]["pending_proposals"] == 2  # on the client's project 1
+    assert db.requests == 2
+
+    metrics.publish("proposal_submitted", freelancer_id=20, client_id=11)
+    metrics.publish("message_sent", receiver_id=20, sender_id=10)
+    metrics.publish("messages_read", receiver_id=20, count=2)
+    metrics.publish("payment_completed", from_user_id=10, to_user_id=20, amount=75.0)
+    metrics.publish("contract_ended", freelancer_id=20, client_id=10, status="completed")
+    metrics.publish("proposal_submitted", freelancer_id=30, client_id=10)  # 30 is not held here: ignored
+
+    snapshot = metrics.peek(20)
+    assert snapshot["metrics"] == {"active_projects": 0, "pending_proposals": 3, "unread_messages": 0,
+                                   "pending_payments": 0, "today_earnings": 175.0, "week_earnings": 175.0,
+                                   "month_earnings": 175.0}
+    assert snapshot["activity"][0] == {"event": "contract_ended", "timestamp": snapshot["activity"][0]["timestamp"],
+                                       "status": "completed"}
+    assert len(snapshot["activity"]) == 5
+    assert metrics.peek(10)["metrics"]["pending_proposals"] == 3
+    assert metrics.peek(30) is None
+    assert db.requests == 2
+
+
+def test_pushes_coalesce_per_user(db):
+    pushes = []
+    metrics = _metrics(db, pushes)
+    metrics.load([10, 20])
+    assert metrics.push_pending() == 0
+
+    for _ in range(5):
+        metrics.publish("message_sent", receiver_id=20, sender_id=10)
+    metrics.publish("payment_created", from_user_id=10, to_user_id=20)
+    assert metrics.push_pending() == 2
+    by_user = {user_id: snapshot["metrics"] for user_id, snapshot in pushes}
+    assert by_user[20]["unread_messages"] == 6 and by_user[20]["pending_payments"] == 2
+    assert by_user[10]["pending_payments"] == 2
+    assert metrics.push_pending() == 0
+
+
+def test_write_landing_during_seed_triggers_reseed(db):
+    metrics = _metrics(db)
+
+    def concurrent_write():
+        db.conn.execute("INSERT INTO messages (receiver_id, is_read, is_deleted) VALUES (20, 0, 0)")
+        metrics.publish("message_sent", receiver_id=20, sender_id=10)
+
+    db.during_query = concurrent_write
+    assert metrics.snapshot(20)["metrics"]["unread_messages"] == 2  # counted once, not twice
+    assert metrics.stats["reseeds"] == 1 and db.requests == 2
+
+
+def test_events_published_on_one_worker_reach_boards_held_by_another(db):
+    bus = _Bus()
+    pushes = []
+    holder = RealtimeMetrics(backend_factory=lambda: db, push=lambda u, snap: pushes.append((u, snap)),
+                             background=False, relay=bus.relay())
+    writer = RealtimeMetrics(backend_factory=lambda: db, background=False, relay=bus.relay())
+    assert holder.snapshot(20)["metrics"]["unread_messages"] == 1
+    requests = db.requests
+
+    writer.publish("message_sent", receiver_id=20, sender_id=10)
+    writer.publish("payment_completed", from_user_id=10, to_user_id=20, amount=25.0)
+    assert writer.peek(20) is None  # the writer does not hold the board and does not seed it
+    assert holder.push_pending() == 1
+    metrics = pushes[0][1]["metrics"]
+    assert metrics["unread_messages"] == 2 and metrics["pending_payments"] == 0 and metrics["today_earnings"] == 125.0
+    assert holder.stats["remote_events"] == 2 and db.requests == requests
+
+    # A relay reconnect may have missed events: the held board is re-seeded on its next read
+    bus.members[0].on_gap()
+    db.conn.executemany("INSERT INTO messages (receiver_id, is_read, is_deleted) VALUES (?, 0, 0)", [(20,), (20,)])
+    assert holder.peek(20)["metrics"]["unread_messages"] == 2  # served while the re-seed is queued
+    assert holder.load() == 1 and db.requests == requests + 1
+    assert holder.peek(20)["metrics"]["unread_messages"] == 3
+    holder.close()
+    writer.close()
+    assert bus.members == []
+
+
+def test_relayed_event_for_a_write_the_seed_already_read_is_not_applied_again(db):
+    bus = _Bus()
+    holder = RealtimeMetrics(backend_factory=lambda: db, background=False, relay=bus.relay())
+    writer = RealtimeMetrics(backend_factory=lambda: db, background=False, relay=bus.relay())
+
+    # Another worker commits a message; its relayed event is still in flight when this worker seeds
+    db.conn.execute("INSERT INTO messages (receiver_id, is_read, is_deleted) VALUES (20, 0, 0)")
+    committed = datetime.now(timezone.utc).isoformat()
+    assert holder.snapshot(20)["metrics"]["unread_messages"] == 2
+    bus.members[0].deliver("message_sent", {"receiver_id": 20, "sender_id": 10, "at": committed})
+    assert holder.peek(20)["metrics"]["unread_messages"] == 2
+    assert holder.stats["remote_seeded"] == 1
+
+    writer.publish("message_sent", receiver_id=20, sender_id=10)
+    assert holder.peek(20)["metrics"]["unread_messages"] == 3
+    holder.close()
+    writer.close()
@@ -0,0 +1,87 @@
+# @AI-HINT: Router registry tests - lazy mounting on first request keeps declaration order; declared paths cover every v1 route
+import sys
+import types
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.router_registry import RouterRegistry
+
+
+def _fake_package(name, modules):
+    package = types.ModuleType(name)
+    package.__path__ = []
+    sys.modules[name] = package
+    for module_name, build in modules.items():
+        module = types.ModuleType(f"{name}.{module_name}")
+        module.router = build()
+        sys.modules[module.__name__] = module
+
+
+def _router(*routes, prefix=""):
+    router = APIRouter(prefix=prefix)
+    for path, value in routes:
+        router.add_api_route(path, lambda value=value: {"from": value}, methods=["GET"])
+    return router
+
+
+def _registry(package):
+    registry = RouterRegistry(package)
+    registry.add("admin", tags=["admin"], paths=["/admin"])
+    registry.add("gigs", prefix="/gigs", tags=["gigs"])
+    registry.add("fraud", prefix="/admin/fraud-alerts", tags=["fraud"])
+    return registry
+
+
+def _app(registry, lazy):
+    app = FastAPI()
+
+    @app.get("/api/health/live")
+    def live():
+        return {"from": "app"}
+
+    registry.mount(app, prefix="/api", lazy=lazy)
+    return app
+
+
+def _route_table(app):
+    return [(route.path, sorted(getattr(route, "methods", []) or [])) for route in app.routes]
+
+
+def test_modules_mount_on_first_request_in_declaration_order():
+    _fake_package("fake_v1_routes", {
+        "admin": lambda: _router(("/admin/{section}/recent/{n}", "admin"), ("/admin/users", "admin")),
+        "gigs": lambda: _router(("", "gigs"), ("/{gig_id}", "gigs")),
+        "fraud": lambda: _router(("/recent/{n}", "fraud")),
+    })
+    eager = _app(_registry("fake_v1_routes"), lazy=False)
+
+    registry = _registry("fake_v1_routes")
+    app = _app(registry, lazy=True)
+    client = TestClient(app)
+    assert registry.loaded() == []
+
+    assert client.get("/api/gigs/7").json() == {"from": "gigs"}
+    assert registry.loaded() == ["gigs"]
+
+    # Both modules serving /admin/... load; admin was declared first and still wins the overlap
+    assert client.get("/api/admin/fraud-alerts/recent/5").json() == {"from": "admin"}
+    assert registry.loaded() == ["admin", "gigs", "fraud"]
+    assert client.get("/api/health/live").json() == {"from": "app"}
+    assert _route_table(app) == _route_table(eager)
+
+
+def test_declared_paths_cover_every_v1_route():
+    from app.api.routers import api_routes
+
+    registry = RouterRegistry(api_routes.package)
+    for spec in api_routes.specs:
+        registry.add(spec.module, spec.prefix, spec.tags, spec.paths)
+    registry.mount(FastAPI(), prefix="/api", lazy=False)
+    undeclared = []
+    for index, spec in enumerate(registry.specs):
+        for route in registry._routes[index]:
+            path = route.path[len("/api"):]
+            if not any(path == p or path.startswith(p + "/") for p in spec.paths):
+                undeclared.append((spec.module, route.path))
+    assert undeclared == []
@@ -0,0 +1,58 @@
+# @AI-HINT: Schema registry tests - batched one-time bootstrap, version skip on restart, partial-failure isolation
+
+import pytest
+
+import app.db.schema_registry as registry
+
+
+@pytest.fixture
+def steps(monkeypatch):
+    monkeypatch.setattr(registry, "_steps", {})
+    for i in range(6):
+        registry.register_schema(f"step{i}", [
+            f"CREATE TABLE IF NOT EXISTS t{i} (id INTEGER PRIMARY KEY, v TEXT)",
+            f"CREATE INDEX IF NOT EXISTS idx_t{i}_v ON t{i}(v)",
+        ])
+    registry.register_schema("needs_base", [
+        "CREATE INDEX IF NOT EXISTS idx_missing ON not_there(id)",
+        "CREATE TABLE IF NOT EXISTS t_ok (id INTEGER PRIMARY KEY)",
+    ])
+    return registry
+
+
+def test_bootstrap_batches_once_and_skips_recorded_steps(steps, sqlite_turso):
+    db = sqlite_turso()
+    report = steps.bootstrap_schema(backend=db, modules=[])
+
+    assert report["counts"] == {"applied": 6, "partial": 1}
+    assert {"t0", "idx_t5_v", "t_ok", "schema_versions"} <= db.tables()
+    assert all(outcome["ms"] >= 0 for outcome in report["steps"].values())
+
+    # Next start (fresh process, same database): one round-trip, only the partial step retried
+    restarted = sqlite_turso(conn=db.conn)
+    report = steps.bootstrap_schema(backend=restarted, modules=[])
+    assert report["counts"] == {"skipped": 6, "partial": 1}
+    assert report["steps"]["needs_base"]["errors"]
+
+    # Changing a step's DDL re-applies just that step
+    steps.register_schema("step0", ["CREATE TABLE IF NOT EXISTS t0_v2 (id INTEGER PRIMARY KEY)"])
+    report = steps.bootstrap_schema(backend=sqlite_turso(conn=db.conn), modules=[])
+    assert report["steps"]["step0"]["status"] == "applied"
+    assert report["counts"]["skipped"] == 5
+
+
+def test_bootstrap_round_trips_and_ensure_schema(steps, sqlite_turso):
+    db = sqlite_turso()
+    steps._steps.pop("needs_base")
+    steps.bootstrap_schema(backend=db, modules=[])
+    # version read + 6 steps x 3 statements packed into one batch
+    assert db.batches == 2
+
+    steps.ensure_schema("step1", "step2", backend=db)
+    assert db.batches == 2  # already applied by the bootstrap
+
+    other = sqlite_turso()
+    steps.ensure_schema("step3", backend=other)
+    steps.ensure_schema("step3", backend=other)
+    assert other.batches == 1
+    assert "t3" in other.tables()
@@ -0,0 +1,178 @@
+# @AI-HINT: Seller stats engine tests - incremental counters match full reconcile, history backfilled once, racing events publish in order, leaderboard ordering and ranks
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.seller_stats_engine import Leaderboard, SellerStatsEngine
+
+
+@pytest.fixture
+def db(sqlite_turso):
+    turso = sqlite_turso()
+    turso.conn.executescript(
+        """
+        CREATE TABLE gig_orders (
+            id INTEGER PRIMARY KEY, seller_id INTEGER, buyer_id INTEGER, status TEXT,
+            total_price REAL, deadline TEXT, completed_at TEXT
+        );
+        CREATE TABLE gig_reviews (id INTEGER PRIMARY KEY, order_id INTEGER, seller_id INTEGER, rating_overall REAL);
+        CREATE TABLE seller_stats (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL UNIQUE, level TEXT DEFAULT 'new_seller',
+            level_updated_at TEXT, total_orders INTEGER DEFAULT 0, completed_orders INTEGER DEFAULT 0,
+            cancelled_orders INTEGER DEFAULT 0, disputed_orders INTEGER DEFAULT 0,
+            on_time_delivery_rate REAL DEFAULT 100.0, completion_rate REAL DEFAULT 100.0,
+            total_earnings REAL DEFAULT 0, average_rating REAL DEFAULT 0, total_reviews INTEGER DEFAULT 0,
+            five_star_reviews INTEGER DEFAULT 0, repeat_client_rate REAL DEFAULT 0, unique_clients INTEGER DEFAULT 0,
+            repeat_clients INTEGER DEFAULT 0, jss_score REAL DEFAULT 0, jss_calculated_at TEXT,
+            created_at TEXT, updated_at TEXT
+        );
+        """
+    )
+    return turso
+
+
+def _seller_stats(db, user_id):
+    result = db.execute("SELECT * FROM seller_stats WHERE user_id = ?", [user_id])
+    row = dict(zip(result["columns"], result["rows"][0]))
+    for col in ("id", "created_at", "updated_at", "jss_calculated_at", "level_updated_at"):
+        row.pop(col)
+    return row
+
+
+def test_incremental_events_match_full_reconcile(db):
+    engine = SellerStatsEngine(backend_factory=lambda: db)
+    now = datetime.now(timezone.utc)
+    orders = [
+        # seller, buyer, final status, price, deadline offset (days), rating
+        (1, 10, "completed", 100.0, 2, 5.0),
+        (1, 10, "completed", 50.0, -1, 4.0),
+        (1, 11, "completed", 80.0, 3, None),
+        (1, 12, "cancelled", 30.0, 3, None),
+        (1, 13, "in_progress", 20.0, 3, None),
+        (2, 10, "completed", 500.0, 5, 4.75),
+    ]
+    for order_id, (seller, buyer, status, price, offset, rating) in enumerate(orders, 1):
+        deadline = (now + timedelta(days=offset)).isoformat()
+        completed_at = now.strftime("%Y-%m-%d %H:%M:%S") if status == "completed" else None
+        db.execute(
+            "INSERT INTO gig_orders VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [order_id, seller, buyer, status, price, deadline, completed_at],
+        )
+        engine.order_placed(seller)
+        if status == "completed":
+            engine.order_completed(seller, buyer, price, deadline, completed_at=now)
+        elif status == "cancelled":
+            engine.order_cancelled(seller)
+        if rating is not None:
+            db.execute("INSERT INTO gig_reviews (order_id, seller_id, rating_overall) VALUES (?, ?, ?)",
+                       [order_id, seller, rating])
+            engine.review_added(seller, rating)
+
+    incremental = {seller: _seller_stats(db, seller) for seller in (1, 2)}
+    assert incremental[1]["total_orders"] == 5
+    assert incremental[1]["completed_orders"] == 3
+    assert incremental[1]["on_time_delivery_rate"] == pytest.approx(66.7)
+    assert incremental[1]["unique_clients"] == 2
+    assert incremental[1]["repeat_clients"] == 1
+    assert incremental[1]["average_rating"] == 4.5
+
+    report = engine.reconcile()
+    assert report["sellers"] == 2
+    assert report["drifted"] == 0
+    assert {seller: _seller_stats(db, seller) for seller in (1, 2)} == incremental
+
+    # Drift written outside the event path is detected and repaired
+    db.execute("UPDATE seller_stat_counters SET completed_orders = 99 WHERE user_id = 2")
+    report = engine.reconcile(seller_id=2)
+    assert report["drifted_sellers"] == [2]
+    assert report["stats"]["completed_orders"] == 1
+
+
+def test_history_before_the_counters_is_backfilled_once(db):
+    now = datetime.now(timezone.utc)
+    deadline = (now + timedelta(days=1)).isoformat()
+    completed_at = now.strftime("%Y-%m-%d %H:%M:%S")
+    db.conn.executemany("INSERT INTO gig_orders VALUES (?, ?, ?, ?, ?, ?, ?)", [
+        (1, 3, 30, "completed", 200.0, deadline, completed_at),
+        (2, 3, 31, "completed", 300.0, deadline, completed_at),
+        (3, 3, 30, "completed", 100.0, deadline, completed_at),
+        (4, 3, 32, "cancelled", 50.0, deadline, None),
+    ])
+    db.conn.execute("INSERT INTO gig_reviews (order_id, seller_id, rating_overall) VALUES (1, 3, 5.0)")
+    engine = SellerStatsEngine(backend_factory=lambda: db)
+    assert engine.backfill() == {"sellers": 1}
+
+    # The first event after deploy adds to the seeded history instead of replacing it
+    db.execute("INSERT INTO gig_orders VALUES (5, 3, 31, 'completed', 400.0, ?, ?)", [deadline, completed_at])
+    engine.order_placed(3)
+    stats = engine.order_completed(3, 31, 400.0, deadline, completed_at=now)
+    assert stats["total_orders"] == 5 and stats["completed_orders"] == 4
+    assert stats["total_earnings"] == 1000.0 and stats["unique_clients"] == 2 and stats["repeat_clients"] == 2
+    assert stats["average_rating"] == 5.0
+
+    # Running the seed again leaves counters kept by events alone
+    assert engine.backfill() == {"sellers": 0}
+    assert engine.reconcile()["drifted"] == 0
+    assert _seller_stats(db, 3)["total_earnings"] == 1000.0
+
+
+def test_an_older_event_never_publishes_over_a_newer_one(db):
+    engine = SellerStatsEngine(backend_factory=lambda: db)
+    engine.reload_leaderboard()
+    now = datetime.now(timezone.utc)
+    engine.order_placed(5)
+
+    # A second event bumps and publishes while the first is between its two batches
+    first_publish = []
+    original = db.execute_many
+
+    def delayed(statements):
+        if "INSERT INTO seller_stats" in statements[0]["q"] and not first_publish:
+            first_publish.append(statements)
+            engine.order_placed(5)
+            engine.order_completed(5, 50, 120.0, (now + timedelta(days=1)).isoformat(), completed_at=now)
+        return original(statements)
+
+    db.execute_many = delayed
+    engine.order_placed(5)
+    db.execute_many = original
+
+    assert first_publish
+    assert _seller_stats(db, 5)["total_orders"] == 3
+    assert _seller_stats(db, 5)["completed_orders"] == 1
+    assert engine.leaderboard()[0]["completed_orders"] == 1
+
+
+def test_leaderboard_orders_and_ranks_sellers(db):
+    board = Leaderboard()
+    board.load([
+        {"user_id": 1, "level": "bronze", "jss_score": 80.0, "completed_orders": 10},
+        {"user_id": 2, "level": "silver", "jss_score": 92.0, "completed_orders": 30},
+        {"user_id": 3, "level": "bronze", "jss_score": 80.0, "completed_orders": 12},
+        {"user_id": 4, "level": "new_seller", "jss_score": 0.0, "completed_orders": 0},
+    ])
+    assert [e["user_id"] for e in board.top(10)] == [2, 3, 1]
+    assert board.rank(1) == 3
+    assert board.rank(1, "bronze") == 2
+    assert board.rank(4) is None
+
+    board.update({"user_id": 1, "level": "silver", "jss_score": 95.0, "completed_orders": 21})
+    assert [e["user_id"] for e in board.top(2)] == [1, 2]
+    assert [e["user_id"] for e in board.top(10, "bronze")] == [3]
+    assert board.rank(1, "silver") == 1
+    assert len(board) == 3
+
+    # An update from older counters than the ranked entry is ignored
+    board.update({"user_id": 3, "level": "gold", "jss_score": 99.0, "completed_orders": 60, "version": 7})
+    board.update({"user_id": 3, "level": "bronze", "jss_score": 80.0, "completed_orders": 13, "version": 6})
+    assert board.rank(3) == 1 and board.top(1)[0]["level"] == "gold"
+
+    engine = SellerStatsEngine(backend_factory=lambda: db)
+    now = datetime.now(timezone.utc)
+    engine.order_placed(7)
+    engine.order_completed(7, 70, 40.0, (now + timedelta(days=1)).isoformat())
+    assert engine.rank(7) == 1
+    engine.order_placed(8)
+    engine.order_completed(8, 80, 40.0, (now + timedelta(days=1)).isoformat())
+    engine.review_added(8, 5.0)
+    assert [e["user_id"] for e in engine.leaderboard(5)] == [8, 7]
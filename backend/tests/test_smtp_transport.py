@@ -0,0 +1,193 @@
+# @AI-HINT: SMTP transport tests - connection reuse, pipelining, per-message results, idle reconnect, sync dispatcher
+import asyncio
+import base64
+import threading
+import time
+from email.message import EmailMessage
+
+import pytest
+
+from app.services.smtp_transport import MailDispatcher, SMTPPool
+
+
+class StubSMTPServer:
+    """Minimal ESMTP server: AUTH PLAIN, optional PIPELINING, rejects *@reject.test recipients."""
+
+    def __init__(self, pipelining=True):
+        self.pipelining = pipelining
+        self.connections = 0
+        self.commands = []
+        self.messages = []
+        self._sessions = []
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._session, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self.server.close()
+        self.drop_all()
+        await self.server.wait_closed()
+
+    def drop_all(self):
+        for writer in self._sessions:
+            writer.close()
+        self._sessions.clear()
+
+    async def _session(self, reader, writer):
+        self.connections += 1
+        self._sessions.append(writer)
+        writer.write(b"220 stub ESMTP\r\n")
+        rcpts = []
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                cmd = line.decode().strip()
+                verb = cmd.split(" ")[0].upper()
+                self.commands.append(verb)
+                if verb == "EHLO":
+                    ext = ["AUTH PLAIN LOGIN"] + (["PIPELINING"] if self.pipelining else [])
+                    writer.write(("250-stub\r\n" + "".join(f"250-{e}\r\n" for e in ext[:-1]) + f"250 {ext[-1]}\r\n").encode())
+                elif verb == "AUTH":
+                    ok = base64.b64decode(cmd.split(" ")[2]) == b"\0user\0secret"
+                    writer.write(b"235 ok\r\n" if ok else b"535 bad credentials\r\n")
+                elif verb == "MAIL":
+                    rcpts = []
+                    writer.write(b"250 ok\r\n")
+                elif verb == "RCPT":
+                    addr = cmd[cmd.index("<") + 1:cmd.index(">")]
+                    if addr.endswith("@reject.test"):
+                        writer.write(b"550 no such user\r\n")
+                    else:
+                        rcpts.append(addr)
+                        writer.write(b"250 ok\r\n")
+                elif verb == "DATA":
+                    if not rcpts:
+                        writer.write(b"554 no valid recipients\r\n")
+                        continue
+                    writer.write(b"354 go ahead\r\n")
+                    await writer.drain()
+                    body = []
+                    while (chunk := await reader.readline()) != b".\r\n":
+                        body.append(chunk)
+                    self.messages.append((rcpts, b"".join(body)))
+                    writer.write(f"250 queued as {len(self.messages)}\r\n".encode())
+                elif verb == "QUIT":
+                    writer.write(b"221 bye\r\n")
+                    await writer.drain()
+                    writer.close()
+                    return
+                else:
+                    writer.write(b"250 ok\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+
+
+def _message(to, subject="Hi", body="Hello\n.leading dot\n"):
+    msg = EmailMessage()
+    msg["From"] = "MegiLance <noreply@megilance.test>"
+    msg["To"] = to
+    msg["Subject"] = subject
+    msg.set_content(body)
+    return msg
+
+
+async def test_pool_reuses_authenticated_connections_and_reports_per_message():
+    server = await StubSMTPServer().start()
+    pool = SMTPPool("127.0.0.1", server.port, "user", "secret", size=2, starttls=False)
+    messages = [_message(f"user{i}@example.test") for i in range(10)] + [_message("ghost@reject.test")]
+    results = await pool.send_many(messages)
+    await pool.close()
+    await server.stop()
+
+    assert [r.ok for r in results] == [True] * 10 + [False]
+    assert results[-1].code == 550 and results[0].recipients == ["user0@example.test"]
+    assert server.connections == 2 and server.commands.count("AUTH") == 2
+    assert len(server.messages) == 10
+    assert b"\r\n..leading dot\r\n" in server.messages[0][1]  # dot-stuffed on the wire, stub keeps it raw
+
+
+async def test_partial_refusal_without_pipelining_and_bad_login():
+    server = await StubSMTPServer(pipelining=False).start()
+    pool = SMTPPool("127.0.0.1", server.port, "user", "secret", size=1, starttls=False)
+    result = await pool.send(_message("ok@example.test, nope@reject.test"))
+    assert result.ok and result.refused == ["nope@reject.test"]
+    assert server.messages[0][0] == ["ok@example.test"]
+
+    bad = SMTPPool("127.0.0.1", server.port, "user", "wrong", size=1, starttls=False)
+    for _ in range(2):  # the failed session is closed, not reused unauthenticated
+        result = await bad.send(_message("ok@example.test"))
+        assert not result.ok and result.code == 535
+    assert len(server.messages) == 1 and server.commands.count("AUTH") == 3
+    assert not bad._connections[0].connected
+    await pool.close()
+    await server.stop()
+
+
+async def test_reconnects_after_idle_timeout_and_server_hangup():
+    server = await StubSMTPServer().start()
+    pool = SMTPPool("127.0.0.1", server.port, size=1, starttls=False, idle_timeout=0.05)
+    assert (await pool.send(_message("a@example.test"))).ok
+    await asyncio.sleep(0.1)
+    assert (await pool.send(_message("b@example.test"))).ok
+    assert server.connections == 2  # idle connection was re-opened proactively
+
+    pool.idle_timeout = 60
+    server.drop_all()
+    await asyncio.sleep(0.01)
+    result = await pool.send(_message("c@example.test"))
+    assert result.ok and result.attempts in (1, 2)
+    assert server.connections == 3
+    await pool.close()
+    await server.stop()
+
+
+def test_dispatcher_serves_synchronous_callers():
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(StubSMTPServer().start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        dispatcher = MailDispatcher(SMTPPool("127.0.0.1", server.port, size=2, starttls=False), max_pending=4)
+        results = dispatcher.send_many([_message(f"u{i}@example.test") for i in range(12)])
+        assert all(r.ok for r in results) and len(results) == 12
+        assert dispatcher.send(_message("last@example.test")).ok
+        dispatcher.shutdown()
+        assert server.connections == 2
+    finally:
+        asyncio.run_coroutine_threadsafe(server.stop(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+
+
+async def test_async_senders_wait_for_a_slot_without_blocking_the_loop():
+    release = threading.Event()
+
+    class SlowPool:
+        async def send(self, message, sender=None):
+            await asyncio.to_thread(release.wait, 5)
+            return message["To"]
+
+        async def close(self):
+            pass
+
+    dispatcher = MailDispatcher(SlowPool(), max_pending=1)
+    first = asyncio.ensure_future(dispatcher.send_async(_message("a@example.test")))
+    second = asyncio.ensure_future(dispatcher.send_async(_message("b@example.test")))
+    abandoned = asyncio.ensure_future(dispatcher.send_async(_message("c@example.test")))
+    started = time.monotonic()
+    await asyncio.sleep(0.05)  # would not return while a submit blocked the loop
+    assert time.monotonic() - started < 1 and not second.done()
+
+    abandoned.cancel()
+    release.set()
+    assert await first == "a@example.test" and await second == "b@example.test"
+    with pytest.raises(asyncio.CancelledError):
+        await abandoned
+    # The cancelled waiter's slot came back
+    assert await asyncio.wait_for(dispatcher.send_async(_message("d@example.test")), 5) == "d@example.test"
+    dispatcher.shutdown()
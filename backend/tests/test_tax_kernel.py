@@ -0,0 +1,70 @@
+# @AI-HINT: Tax kernel tests - cumulative bracket tables match the bracket walk; income sweep cells match calculate_income
+import sys
+
+import pytest
+
+from app.services import income_calculator_engine, expense_tax_engine
+from app.services.tax_kernel import BracketTable
+
+
+def _walk(income, brackets):
+    """The per-call bracket walk the calculators used before the kernel."""
+    tax = 0
+    for bracket in brackets:
+        if income <= bracket["min"]:
+            break
+        taxable = income - bracket["min"]
+        if bracket["max"] is not None:
+            taxable = min(taxable, bracket["max"] - bracket["min"])
+        tax += taxable * bracket["rate"]
+    return tax
+
+
+@pytest.mark.parametrize("numpy_available", [True, False])
+def test_bracket_table_matches_walk(monkeypatch, numpy_available):
+    if not numpy_available:
+        monkeypatch.setitem(sys.modules, "numpy", None)
+    incomes = [0, -5, 1, 11000, 11000.5, 11001, 11001.5, 44725, 95376, 578125.99, 578126, 2_500_000]
+    incomes += [i * 1237.77 for i in range(400)]
+    for schedules, key in ((income_calculator_engine.TAX_BRACKETS, "income_tax"),
+                           (expense_tax_engine.TAX_REGIONS, "federal_brackets")):
+        for data in schedules.values():
+            table = BracketTable(data[key])
+            expected = [_walk(x, data[key]) for x in incomes]
+            assert [table.tax(x) for x in incomes] == expected
+            assert table.tax_many(incomes) == expected
+            marginal = table.marginal_rate_many(incomes)
+            assert marginal == [table.marginal_rate(x) for x in incomes]
+            assert table.marginal_rate(data[key][-1]["min"]) == data[key][-1]["rate"]
+
+    with pytest.raises(ValueError):
+        BracketTable([{"min": 100, "max": None, "rate": 0.2}, {"min": 0, "max": 99, "rate": 0.1}])
+
+
+def test_income_sweep_cells_match_calculate_income():
+    inputs = dict(income_type="mixed", country="canada", state_tax_rate=4,
+                  monthly_retainer=1200, retainer_clients=2, monthly_expenses={"software": 300, "office": 450})
+    rates, hours = [0, 45, 90, 140], [10, 25, 40]
+    result = income_calculator_engine.calculate_income_sweep(
+        rates, hours, projection_years=2, income_growth_percent=10, rate=90, hours_per_week=25, **inputs,
+    )
+    rows = result["grid"]["rows"]
+    assert [(r["rate"], r["hours_per_week"]) for r in rows] == [(r, h) for r in rates for h in hours]
+    for row in rows:
+        single = income_calculator_engine.calculate_income(rate=row["rate"], hours_per_week=row["hours_per_week"], **inputs)
+        assert row["gross_annual"] == single["income"]["gross_annual"]
+        assert row["total_tax"] == single["taxes"]["total_tax"]
+        assert row["net_annual"] == single["net_income"]["annual"]
+        assert row["effective_hourly"] == single["effective_rates"]["hourly"]
+        assert row["effective_tax_rate"] == single["taxes"]["effective_rate"]
+
+    projection = result["projection"]
+    assert len(projection) == 3
+    assert projection[0]["net_annual"] == next(r for r in rows if (r["rate"], r["hours_per_week"]) == (90, 25))["net_annual"]
+    assert projection[2]["gross_annual"] == round(projection[0]["gross_annual"] * 1.1 ** 2, 2)
+    assert projection[2]["cumulative_net"] == pytest.approx(sum(p["net_annual"] for p in projection), abs=0.02)
+
+    with pytest.raises(ValueError):
+        income_calculator_engine.calculate_income_sweep(list(range(60)), list(range(60)))
+    with pytest.raises(TypeError):
+        income_calculator_engine.calculate_income_sweep([50], [40], hourly_rate=50)
@@ -0,0 +1,54 @@
+"""Tests for the precompiled template engine used by email templates and i18n."""
+
+from app.services.email_templates import (
+    DEFAULT_TEMPLATES,
+    EmailTemplateType,
+    EmailTemplatesService,
+)
+from app.services.i18n import InternationalizationService, Language
+from app.services.template_compiler import BRACES, CompiledTemplate
+
+
+def _replace_render(text, variables):
+    for name, value in variables.items():
+        text = text.replace(f"{{{{{name}}}}}", str(value))
+    return text
+
+
+def test_compiled_render_matches_replace_semantics():
+    variables = {"user_name": "Ada", "amount": 12.5, "year": 2026}
+    for config in DEFAULT_TEMPLATES.values():
+        for part in ("subject", "html_body", "text_body"):
+            source = config[part]
+            assert CompiledTemplate(source).render(variables) == _replace_render(source, variables)
+
+    tpl = CompiledTemplate("Hi {{name}}, {{missing}} {{ name }}!")
+    assert tpl.render({"name": "{{missing}}"}) == "Hi {{missing}}, {{missing}} {{ name }}!"
+    assert tpl.names == ["name", "missing", " name "]
+    assert CompiledTemplate("{count} items", BRACES).render({"count": 3}) == "3 items"
+
+
+async def test_email_templates_compile_on_save_and_render_batch():
+    service = EmailTemplatesService(db=None)
+    template = await service.create_template(
+        EmailTemplateType.CUSTOM, "Promo", "Hello {{user_name}}",
+        "<p>{{offer}} until {{year}}</p>", "{{offer}}", ["user_name", "offer"], "admin",
+    )
+    await service.update_template(template.id, {"subject": "Hey {{user_name}}"})
+
+    rendered = await service.render_batch(
+        EmailTemplateType.CUSTOM, [{"user_name": "Ada", "offer": "10%"}, {"user_name": "Bob"}]
+    )
+    assert [r["subject"] for r in rendered] == ["Hey Ada", "Hey Bob"]
+    assert rendered[0]["html_body"].startswith("<p>10% until 20")
+    assert rendered[1]["text_body"] == "{{offer}}"
+
+    single = await service.render_template(EmailTemplateType.CUSTOM, {"user_name": "Ada", "offer": "10%"})
+    assert single == rendered[0]
+
+
+def test_i18n_interpolation_uses_compiled_strings():
+    i18n = InternationalizationService(db=None)
+    i18n.add_translation("greeting", {"en": "Hi {name}, you have {count} {unknown}"})
+    assert i18n.translate("greeting", Language.EN, {"name": "Ada", "count": 2}) == "Hi Ada, you have 2 {unknown}"
+    assert i18n.translate("greeting", Language.EN) == "Hi {name}, you have {count} {unknown}"
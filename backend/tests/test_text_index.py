@@ -0,0 +1,67 @@
+# @AI-HINT: Text index tests - BM25 ranking, stemming, prefix/typo expansion and help search wiring
+import pytest
+
+from app.services.text_index import TextIndex, stem
+from app.services.ai_chatbot import AIChatbotService
+from app.services.knowledge_base import KnowledgeBaseService, HELP_ARTICLES
+from app.services.help_search import get_help_index
+
+
+@pytest.fixture
+def index():
+    idx = TextIndex({"title": 3.0, "body": 1.0})
+    idx.add("a", {"title": "Reset your password", "body": "Use the forgot password link"}, {"kind": "faq"})
+    idx.add("b", {"title": "Escrow payments", "body": "Milestone payments are held in escrow"}, {"kind": "faq"})
+    idx.add("c", {"title": "Verification", "body": "Verify your identity with a passport"}, {"kind": "article"})
+    return idx
+
+
+def test_stemmer_conflates_inflections():
+    assert stem("payments") == stem("payment") == stem("pay")
+    assert stem("creating") == stem("creation") == stem("create")
+    assert stem("verification") == stem("verify")
+
+
+def test_bm25_ranks_title_matches_first(index):
+    assert index.search("payment")[0][0] == "b"
+    assert [d for d, _ in index.search("passport verification")][:1] == ["c"]
+
+
+def test_prefix_and_typo_expansion(index):
+    assert index.search("escr")[0][0] == "b"
+    assert index.search("pasword")[0][0] == "a"
+    assert index.search("xyzzy") == []
+
+
+def test_filter_remove_and_reindex(index):
+    assert [d for d, _ in index.search("verify", where=lambda m: m["kind"] == "faq")] == []
+    index.remove("b")
+    assert index.search("escrow") == []
+    index.add("b", {"title": "Escrow"}, {"kind": "faq"})
+    assert index.search("escrow")[0][0] == "b"
+    assert len(index) == 3
+
+
+def test_more_like_this_excludes_source(index):
+    index.add("d", {"title": "Escrow release", "body": "Escrow funds are released per milestone"})
+    related = [d for d, _ in index.more_like_this("b")]
+    assert related[0] == "d" and "b" not in related
+
+
+async def test_chatbot_faq_search_tolerates_typos():
+    results = await AIChatbotService(db=None).search_faq("withdrawl time")
+    assert results[0]["id"] == "withdrawal_time"
+
+
+async def test_created_article_is_searchable():
+    service = KnowledgeBaseService(db=None)
+    result = await service.create_article(1, {
+        "title": "Invoicing retainers", "category": "billing", "content_type": "guide",
+        "content": "Retainer invoices are generated monthly.", "tags": ["retainer"],
+    })
+    try:
+        found = await service.get_articles(search_query="retainer")
+        assert found[0]["id"] == result["article"]["id"]
+    finally:
+        HELP_ARTICLES.remove(result["article"])
+        get_help_index().remove(f"article:{result['article']['id']}")
@@ -0,0 +1,85 @@
+# @AI-HINT: Typed Turso result tests - Row/ResultSet access, lazy decoding, legacy execute_query compatibility
+import pytest
+
+import app.db.turso_http as turso_module
+from app.db.turso_http import ResultSet, Row, execute_query, parse_rows, query, to_float, to_str
+from app.services.search_service import row_to_project
+
+RAW = {
+    "columns": ["id", "title", "budget", "meta", "created_at"],
+    "rows": [
+        [1, "API build", 250.5, '{"tags": ["api"]}', "2024-05-01T10:00:00"],
+        [2, None, None, "not json", None],
+    ],
+}
+
+
+class FakeClient:
+    def __init__(self, result=RAW, error=None):
+        self.result = result
+        self.error = error
+
+    def execute(self, sql, params=None):
+        if self.error:
+            raise self.error
+        return self.result
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = FakeClient()
+    monkeypatch.setattr(turso_module.TursoHTTP, "get_instance", classmethod(lambda cls: fake))
+    return fake
+
+
+def test_result_set_exposes_raw_columns_and_lazy_rows(client):
+    rs = query("SELECT ...")
+    assert rs.columns == RAW["columns"] and rs.rows is RAW["rows"]
+    assert len(rs) == 2 and rs and not ResultSet([], [])
+
+    row = rs.first()
+    assert isinstance(row, Row)
+    assert (row[0], row["title"], row.budget) == (1, "API build", 250.5)
+    assert row.json("meta") == {"tags": ["api"]}
+    assert row.date("created_at").year == 2024
+    assert row.as_dict()["title"] == "API build"
+
+    empty = rs[1]
+    assert empty.get("title", "untitled") == "untitled"
+    assert empty.json("meta", {}) == {} and empty.date("created_at") is None
+    with pytest.raises(AttributeError):
+        empty.missing_column
+
+    assert rs.column("id") == [1, 2]
+    assert rs.scalar() == 1
+    assert rs.dicts()[1] == dict(zip(RAW["columns"], RAW["rows"][1]))
+
+
+def test_execute_query_keeps_the_legacy_wrapped_shape(client):
+    legacy = execute_query("SELECT ...")
+    assert legacy["cols"] == [{"name": c} for c in RAW["columns"]]
+    assert legacy["rows"][0][1] == {"type": "text", "value": "API build"}
+    assert legacy["rows"][1][1] == {"type": "null", "value": None}
+    assert legacy["rows"][0][:2] == [{"type": "text", "value": 1}, {"type": "text", "value": "API build"}]
+    assert [to_str(c) for c in legacy["rows"][0]][1] == "API build"
+    assert to_float(legacy["rows"][0][2]) == 250.5
+
+    # Fast path and the generic wrapped-dict path decode identically
+    plain = {"cols": legacy["cols"], "rows": [list(r) for r in legacy["rows"]]}
+    assert parse_rows(legacy) == parse_rows(plain) == ResultSet.from_result(RAW).dicts()
+
+    client.error = RuntimeError("boom")
+    assert execute_query("SELECT ...") is None
+    with pytest.raises(RuntimeError):
+        query("SELECT ...")
+
+
+def test_row_converters_accept_raw_and_wrapped_rows():
+    values = [7, "Logo", "desc", "Design", "fixed", 100, "300.5", "entry", None, "open",
+              "figma,svg", 3, "2024-01-02T00:00:00", None]
+    raw = ResultSet([f"c{i}" for i in range(len(values))], [values])[0]
+    wrapped = [{"type": "null", "value": None} if v is None else {"type": "text", "value": v} for v in values]
+    project = row_to_project(raw)
+    assert project == row_to_project(wrapped)
+    assert project["id"] == 7 and project["budget_max"] == 300.5
+    assert project["skills"] == ["figma", "svg"] and project["estimated_duration"] is None
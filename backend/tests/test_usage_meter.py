@@ -0,0 +1,177 @@
+# @AI-HINT: Usage meter tests - quota checks are answered from memory, deltas reach usage_counters in one batched flush, cold users overshoot by at most the allowance, counters seeded from existing usage and never negative, loads never overwrite a fresher flushed total, periods follow the subscription
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.storage import LocalStorage
+from app.services.usage_meter import MB, UsageMeter, billing_period, plan_from_profile
+
+
+class UserStub:
+    def __init__(self, user_id, profile_data=None):
+        self.id = user_id
+        self.profile_data = profile_data
+
+
+@pytest.fixture
+def db(sqlite_turso):
+    return sqlite_turso([
+        "CREATE TABLE users (id INTEGER PRIMARY KEY, profile_data TEXT, profile_image_url TEXT)",
+        "CREATE TABLE projects (id INTEGER PRIMARY KEY, client_id INTEGER, created_at TEXT)",
+        "CREATE TABLE proposals (id INTEGER PRIMARY KEY, freelancer_id INTEGER, created_at TEXT)",
+        "CREATE TABLE portfolio_items (id INTEGER PRIMARY KEY, freelancer_id INTEGER, image_url TEXT)",
+    ])
+
+
+def _meter(db):
+    return UsageMeter(backend_factory=lambda: db, refresh_interval=3600, background=False)
+
+
+def test_quota_checks_stay_in_memory_and_flush_in_one_batch(db):
+    meter = _meter(db)
+    user = UserStub(1)  # free plan: 10 proposals per month
+    meter.check(user, "proposals")
+    meter.check(user, "storage")
+    meter.load([1])
+
+    before = db.requests
+    for _ in range(10):
+        assert meter.check(user, "proposals")["allowed"]
+        meter.record(user, "proposals")
+    denied = meter.check(user, "proposals")
+    assert not denied["allowed"] and denied["used"] == 10 and denied["remaining"] == 0
+    meter.record(user, "storage", 3 * MB)
+    assert db.requests == before
+
+    assert meter.flush() == 2
+    assert db.requests == before + 1
+    period = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0).isoformat()
+    rows = db.conn.execute("SELECT meter, period_start, used FROM usage_counters ORDER BY meter").fetchall()
+    assert rows == [("proposals", period, 10), ("storage", "lifetime", 3 * MB)]
+
+    # Another worker sees the flushed totals once it loads the user
+    other = _meter(db)
+    other.check(user, "proposals")
+    other.load([1])
+    assert not other.check(user, "proposals")["allowed"]
+    meter.close()
+    other.close()
+
+
+def test_cold_user_overshoots_by_at_most_the_allowance(db):
+    db.conn.execute("CREATE TABLE IF NOT EXISTS usage_counters (user_id INTEGER, meter TEXT, period_start TEXT, "
+                    "used INTEGER, updated_at TEXT, PRIMARY KEY (user_id, meter, period_start))")
+    plan = plan_from_profile(None)
+    db.conn.execute("INSERT INTO usage_counters VALUES (2, 'projects', ?, 3, '')", [plan.period_start.isoformat()])
+
+    meter = _meter(db)
+    user = UserStub(2)  # free plan: 3 projects, all used on another worker
+    assert meter.check(user, "projects")["allowed"]  # not loaded yet: admitted on trust
+    meter.record(user, "projects")
+    second = meter.check(user, "projects")  # past the allowance: loads before answering
+    assert meter.stats["sync_loads"] == 1
+    assert not second["allowed"] and second["used"] == 4
+    meter.close()
+    assert db.conn.execute("SELECT used FROM usage_counters WHERE user_id = 2").fetchone()[0] == 4
+
+
+def test_counters_start_from_existing_usage_and_never_go_negative(db, tmp_path):
+    period = plan_from_profile(None).period_start
+    db.conn.executemany("INSERT INTO projects (client_id, created_at) VALUES (5, ?)",
+                        [(period.isoformat(),), ((period - timedelta(days=3)).isoformat(),)])
+    db.conn.execute("INSERT INTO users (id, profile_image_url) VALUES (5, '/uploads/avatars/me.jpg')")
+    db.conn.executemany("INSERT INTO portfolio_items (freelancer_id, image_url) VALUES (5, ?)",
+                        [("/uploads/portfolio/shot.png",), ("/uploads/portfolio/shot.png",), ("/uploads/gone.png",)])
+    for name, size in (("avatars/me.jpg", 300), ("portfolio/shot.png", 700)):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_bytes(b"x" * size)
+        os.utime(tmp_path / name, (0, 0))
+    storage = LocalStorage()
+    storage.upload_dir = tmp_path
+    meter = UsageMeter(backend_factory=lambda: db, refresh_interval=3600, background=False, storage=storage)
+    user = UserStub(5)
+
+    meter.check(user, "projects")
+    meter.check(user, "storage")
+    meter.load([5])
+    assert meter.check(user, "projects", 0)["used"] == 1  # last month's project does not count
+    assert meter.check(user, "storage", 0)["used"] == 1000
+    assert meter.stats["seeds"] == 2
+
+    # A project created after the counter arrives as a delta, not again through the seed
+    db.execute("INSERT INTO projects (client_id, created_at) VALUES (5, ?)", [datetime.now(timezone.utc).isoformat()])
+    meter.record(user, "projects")
+    meter.record(user, "storage", -5000)  # more than is stored: released down to zero
+    assert meter.check(user, "storage", 0)["used"] == 0
+    meter.flush()
+    rows = dict(db.conn.execute("SELECT meter, used FROM usage_counters WHERE user_id = 5").fetchall())
+    assert rows == {"projects": 2, "storage": 0}
+
+    # A release on a cold counter loads it first; with nothing stored it is dropped
+    other = UsageMeter(backend_factory=lambda: db, refresh_interval=3600, background=False, storage=storage)
+    other.record(UserStub(6), "storage", -100)
+    assert other.check(UserStub(6), "storage", 0)["used"] == 0 and other.flush() == 0
+    meter.close()
+    other.close()
+
+
+def test_periods_follow_the_subscription_and_plan_changes(db):
+    start = datetime(2025, 1, 15, tzinfo=timezone.utc)
+    sub = {"current_period_start": start.isoformat(), "current_period_end": (start + timedelta(days=30)).isoformat()}
+    assert billing_period(sub, datetime(2025, 3, 20, tzinfo=timezone.utc)) == (
+        datetime(2025, 3, 16, tzinfo=timezone.utc), datetime(2025, 4, 15, tzinfo=timezone.utc))
+    assert billing_period({}, datetime(2025, 12, 31, 23, tzinfo=timezone.utc)) == (
+        datetime(2025, 12, 1, tzinfo=timezone.utc), datetime(2026, 1, 1, tzinfo=timezone.utc))
+
+    now = datetime.now(timezone.utc)
+    subscription = {"tier": "starter", "current_period_start": (now - timedelta(days=40)).isoformat(),
+                    "current_period_end": (now - timedelta(days=10)).isoformat()}
+    db.conn.execute("INSERT INTO users (id, profile_data) VALUES (3, ?)", [json.dumps({"subscription": subscription})])
+    meter = _meter(db)
+    user = UserStub(3, json.dumps({"subscription": subscription}))
+    usage = meter.check(user, "proposals")
+    assert usage["limit"] == 50
+    assert usage["period_start"] == (now - timedelta(days=10)).isoformat()
+
+    meter.record(user, "proposals", 4)
+    summary = meter.summary(3)
+    assert summary["tier"] == "starter" and summary["usage"]["proposals"]["used"] == 4
+    assert summary["usage"]["storage"]["limit"] == 500 * MB
+
+    subscription["tier"] = "enterprise"
+    upgraded = meter.check(UserStub(3, json.dumps({"subscription": subscription})), "proposals", 1000)
+    assert upgraded["allowed"] and upgraded["unlimited"] and upgraded["used"] == 4
+    meter.close()
+
+
+def test_load_racing_a_flush_never_installs_an_older_total(db):
+    meter = _meter(db)
+    user = UserStub(3)
+    meter.check(user, "proposals")
+    meter.load([3])
+    meter.record(user, "proposals", 2)
+    meter.flush()
+    meter.record(user, "proposals", 3)
+
+    # A load reads the stored total (2) while a flush of the 3 pending is about to commit
+    original = db.execute_many
+    flusher = []
+
+    def racing(statements):
+        result = original(statements)
+        if not flusher and statements[0]["q"].startswith("SELECT user_id, meter, period_start, used"):
+            flusher.append(threading.Thread(target=meter.flush))
+            flusher[0].start()
+            flusher[0].join(timeout=0.2)
+        return result
+
+    db.execute_many = racing
+    meter.load([3])
+    db.execute_many = original
+    flusher[0].join()
+    assert meter.check(user, "proposals", 0)["used"] == 5
+    assert db.conn.execute("SELECT used FROM usage_counters WHERE user_id = 3").fetchone()[0] == 5
+    meter.close()
@@ -0,0 +1,96 @@
+# @AI-HINT: WebRTC signaling tests - participants on different workers meet through the shared registry; signals arrive in order with ICE bursts coalesced
+import asyncio
+from collections import defaultdict
+
+import pytest
+
+from app.services.webrtc_signaling import SignalingRegistry, WebRTCSignalingServer
+
+TOKENS = {"client": "client-token", "freelancer": "freelancer-token"}
+
+
+class MessageQueue:
+    """Rooms shared by every worker, like Socket.IO's Redis client manager."""
+
+    def __init__(self):
+        self.rooms = defaultdict(set)
+        self.received = defaultdict(list)
+
+    def worker(self):
+        queue = self
+
+        class Sio:
+            async def enter_room(self, sid, room):
+                queue.rooms[room].add(sid)
+
+            async def leave_room(self, sid, room):
+                queue.rooms[room].discard(sid)
+
+            async def emit(self, event, data, room=None):
+                for sid in queue.rooms[room]:
+                    queue.received[sid].append((event, data))
+
+        return Sio()
+
+
+@pytest.fixture
+def workers(sqlite_turso):
+    registry = SignalingRegistry(backend_factory=lambda db=sqlite_turso(): db)
+    registry.open_room("room1", 1, 2, TOKENS)
+    queue = MessageQueue()
+    a = WebRTCSignalingServer(queue.worker(), registry, coalesce_ms=20)
+    b = WebRTCSignalingServer(queue.worker(), registry, coalesce_ms=20)
+    return registry, queue, a, b
+
+
+async def test_participants_on_different_workers_exchange_ordered_signals(workers):
+    registry, queue, a, b = workers
+    assert (await a.join("sid-c", "room1", TOKENS["client"]))["other_participants"] == []
+    joined = await b.join("sid-f", "room1", TOKENS["freelancer"])
+    assert joined["user_id"] == 2 and [p["user_id"] for p in joined["other_participants"]] == [1]
+    assert queue.received["sid-c"] == [("webrtc_peer_joined", {"room_id": "room1", "user_id": 2, "role": "freelancer"})]
+
+    # Offer, a burst of five candidates, then end-of-candidates: three emits, in order
+    assert a.signal("sid-c", "room1", 2, "offer", {"sdp": "v=0"}) == 1
+    for i in range(5):
+        assert a.signal("sid-c", "room1", 2, "ice-candidate", {"candidate": f"c{i}"}) is None
+    assert a.signal("sid-c", "room1", 2, "ice-candidate", None) == 3
+    await a.flush("sid-c")
+    messages = [data for event, data in queue.received["sid-f"] if event == "webrtc_signal"]
+    assert [(m["seq"], m["type"]) for m in messages] == [(1, "offer"), (2, "ice-candidates"), (3, "ice-candidate")]
+    assert [c["candidate"] for c in messages[1]["data"]["candidates"]] == ["c0", "c1", "c2", "c3", "c4"]
+    assert messages[2]["data"] is None and a.stats["emits"] == 3
+
+    # A trickle with no flush goes out when the coalescing window ends
+    b.signal("sid-f", "room1", 1, "answer", {"sdp": "v=0"})
+    b.signal("sid-f", "room1", 1, "ice-candidate", {"candidate": "late"})
+    await asyncio.sleep(0.05)
+    answer, batch = [data for event, data in queue.received["sid-c"] if event == "webrtc_signal"]
+    assert (answer["type"], batch["type"], batch["data"]["candidates"]) == ("answer", "ice-candidates", [{"candidate": "late"}])
+
+
+async def test_joins_and_signals_are_checked_and_rest_push_uses_presence(workers):
+    registry, queue, a, b = workers
+    with pytest.raises(ValueError):
+        await a.join("sid-x", "room1", "guessed-token")
+    with pytest.raises(ValueError):
+        a.signal("sid-x", "room1", 2, "offer", {})
+    await a.join("sid-c", "room1", TOKENS["client"])
+    with pytest.raises(ValueError):
+        a.signal("sid-c", "room1", 2, "drop-table", {})
+
+    # REST signals are pushed only to participants with a signaling connection
+    assert await b.push("room1", 1, 2, "offer", {}) is False
+    assert await b.push("room1", 2, 1, "answer", {"sdp": "v=0"}) is True
+    assert queue.received["sid-c"][-1][1]["type"] == "answer"
+
+    # A reconnect on another worker is not undone by the old connection leaving
+    await b.join("sid-c2", "room1", TOKENS["client"])
+    await a.leave("sid-c")
+    assert registry.is_connected("room1", 1)
+    await b.leave("sid-c2")
+    assert not registry.is_connected("room1", 1)
+
+    registry.close_room("room1")
+    with pytest.raises(ValueError):
+        await a.join("sid-c", "room1", TOKENS["client"])
@@ -0,0 +1,195 @@
+# @AI-HINT: Workflow engine tests - compiled conditions, trigger index, async execution, delays outside the per-user limit, and history
+import asyncio
+
+import pytest
+
+from app.services import workflow_engine
+from app.services.workflow_automation import (
+    WorkflowAutomationService,
+    TriggerType,
+    ActionType,
+    ConditionOperator,
+    ExecutionStatus,
+    fire_trigger,
+)
+from app.services.workflow_engine import WorkflowEngine, compile_condition
+
+
+@pytest.fixture
+def turso(sqlite_turso):
+    return sqlite_turso()
+
+
+def _service(turso, **kwargs):
+    engine = WorkflowEngine(backend_factory=lambda: turso, **kwargs)
+    return WorkflowAutomationService(db=None, engine=engine), engine
+
+
+@pytest.mark.parametrize("field,operator,value,context,expected", [
+    ("category", ConditionOperator.EQUALS, "web", {"category": "web"}, True),
+    ("category", ConditionOperator.NOT_EQUALS, "web", {"category": "web"}, False),
+    ("amount", ConditionOperator.GREATER_THAN, 100, {"amount": "250.5"}, True),
+    ("amount", ConditionOperator.LESS_THAN, 100, {"amount": None}, False),
+    ("project.title", ConditionOperator.CONTAINS, "API", {"project": {"title": "Build an api"}}, True),
+    ("tags", ConditionOperator.NOT_CONTAINS, "x", {"tags": ["x", "y"]}, False),
+    ("note", ConditionOperator.IS_EMPTY, None, {}, True),
+    ("note", ConditionOperator.IS_NOT_EMPTY, None, {"note": ""}, False),
+    ("amount", ConditionOperator.IN_LIST, [1, 2], {"amount": 2}, True),
+    ("amount", ConditionOperator.NOT_IN_LIST, ["a"], {"amount": "a"}, False),
+])
+def test_compiled_conditions(field, operator, value, context, expected):
+    predicate = compile_condition({"field": field, "operator": operator.value, "value": value})
+    assert predicate(context) is expected
+
+
+async def test_invalid_definition_is_rejected(turso):
+    service, _ = _service(turso)
+    result = await service.create_workflow(
+        user_id=1, name="bad", description=None,
+        trigger={"type": TriggerType.PAYMENT_RECEIVED},
+        conditions=[{"field": "amount", "operator": "roughly", "value": 1}],
+        actions=[],
+    )
+    assert "error" in result
+
+
+async def test_trigger_runs_only_subscribed_active_workflows(turso):
+    service, engine = _service(turso)
+    seen = []
+
+    async def record(config, context):
+        seen.append(config["message"])
+        return {"ok": True}
+
+    engine.register_action_handler(ActionType.LOG_ACTIVITY, record)
+
+    created = await service.create_workflow(
+        user_id=1, name="Big payments", description=None,
+        trigger={"type": TriggerType.PAYMENT_RECEIVED},
+        conditions=[{"field": "amount", "operator": ConditionOperator.GREATER_THAN.value, "value": 100}],
+        actions=[{"type": ActionType.LOG_ACTIVITY, "config": {"message": "Got {{amount}}"}}],
+    )
+    workflow_id = created["workflow"]["id"]
+
+    # Drafts are not indexed
+    result = await service.process_trigger(TriggerType.PAYMENT_RECEIVED, {"user_id": 1, "amount": 500})
+    assert result["workflows_matched"] == 0
+
+    await service.activate_workflow(1, workflow_id)
+    assert (await service.process_trigger(TriggerType.PAYMENT_RECEIVED, {"user_id": 1, "amount": 50}))["workflows_matched"] == 0
+    assert (await service.process_trigger(TriggerType.PAYMENT_SENT, {"user_id": 1, "amount": 500}))["workflows_matched"] == 0
+    assert (await service.process_trigger(TriggerType.PAYMENT_RECEIVED, {"user_id": 2, "amount": 500}))["workflows_matched"] == 0
+
+    result = await service.process_trigger(TriggerType.PAYMENT_RECEIVED, {"user_id": 1, "amount": 500})
+    assert result["workflows_matched"] == 1
+    await engine.drain()
+    assert seen == ["Got 500"]
+
+    history = await service.get_execution_history(1)
+    assert history["executions"][0]["status"] == ExecutionStatus.COMPLETED.value
+
+    # History and definitions survive a fresh engine
+    service2, _ = _service(turso)
+    assert (await service2.get_workflow(1, workflow_id))["execution_count"] == 1
+    assert (await service2.get_execution_history(1))["total"] == 1
+    assert (await service2.process_trigger(TriggerType.PAYMENT_RECEIVED, {"user_id": 1, "amount": 500}))["workflows_matched"] == 1
+    await service2.engine.drain()
+
+
+async def test_per_user_concurrency_limit(turso):
+    service, engine = _service(turso, max_concurrent_per_user=2)
+    running = {"now": 0, "peak": 0}
+
+    async def slow(config, context):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+
+    engine.register_action_handler(ActionType.LOG_ACTIVITY, slow)
+    for _ in range(6):
+        created = await service.create_workflow(
+            user_id=7, name="wf", description=None,
+            trigger={"type": TriggerType.MESSAGE_RECEIVED}, conditions=[],
+            actions=[{"type": ActionType.LOG_ACTIVITY, "config": {}}],
+        )
+        await service.activate_workflow(7, created["workflow"]["id"])
+
+    result = await service.process_trigger(TriggerType.MESSAGE_RECEIVED, {"user_id": 7})
+    assert result["workflows_executed"] == 6
+    await engine.drain()
+    assert running["peak"] == 2
+
+
+async def test_delay_gives_back_the_owner_slot_while_waiting(turso):
+    service, engine = _service(turso, max_concurrent_per_user=1)
+    logged = []
+
+    async def record(config, context):
+        logged.append(config["message"])
+
+    engine.register_action_handler(ActionType.LOG_ACTIVITY, record)
+    for trigger, actions in (
+        (TriggerType.MESSAGE_RECEIVED, [{"type": ActionType.DELAY, "config": {"seconds": 0.05}},
+                                        {"type": ActionType.LOG_ACTIVITY, "config": {"message": "delayed"}}]),
+        (TriggerType.PAYMENT_RECEIVED, [{"type": ActionType.LOG_ACTIVITY, "config": {"message": "immediate"}}]),
+    ):
+        created = await service.create_workflow(
+            user_id=7, name="wf", description=None, trigger={"type": trigger}, conditions=[], actions=actions)
+        await service.activate_workflow(7, created["workflow"]["id"])
+
+    await service.process_trigger(TriggerType.MESSAGE_RECEIVED, {"user_id": 7})
+    await asyncio.sleep(0.01)
+    await service.process_trigger(TriggerType.PAYMENT_RECEIVED, {"user_id": 7})
+    await engine.drain()
+    assert logged == ["immediate", "delayed"]
+
+
+async def test_global_workflows_unhandled_actions_and_manual_runs(turso, monkeypatch):
+    service, engine = _service(turso)
+    seen = []
+
+    async def record(config, context):
+        seen.append(context["user_id"])
+
+    engine.register_action_handler(ActionType.LOG_ACTIVITY, record)
+    admin_rule = (await service.create_workflow(
+        user_id=1, name="Every registration", description=None,
+        trigger={"type": TriggerType.USER_REGISTERED}, conditions=[],
+        actions=[{"type": ActionType.LOG_ACTIVITY, "config": {}}], is_global=True,
+    ))["workflow"]
+    emailer = (await service.create_workflow(
+        user_id=5, name="Email", description=None,
+        trigger={"type": TriggerType.USER_REGISTERED}, conditions=[],
+        actions=[{"type": ActionType.SEND_EMAIL, "config": {}}],
+    ))["workflow"]
+
+    # Paused and draft workflows do not run by hand either
+    assert "error" in await service.execute_workflow(1, admin_rule["id"])
+    await service.pause_workflow(1, admin_rule["id"])
+    assert "error" in await service.execute_workflow(1, admin_rule["id"])
+    await service.activate_workflow(1, admin_rule["id"])
+    await service.activate_workflow(5, emailer["id"])
+
+    # The admin's global rule runs for any user, next to that user's own rules
+    assert (await service.process_trigger(TriggerType.USER_REGISTERED, {"user_id": 9}))["workflows_matched"] == 1
+    result = await service.process_trigger(TriggerType.USER_REGISTERED, {"user_id": 5})
+    assert result["workflows_matched"] == 2
+    await engine.drain()
+    assert seen == [9, 5]
+
+    # No handler for send_email: the run fails instead of reporting success
+    failed = (await service.get_execution_history(5))["executions"][0]
+    assert failed["status"] == ExecutionStatus.FAILED.value and "send_email" in failed["error"]
+
+    # Events fired from request threads run on the bound loop
+    monkeypatch.setattr(workflow_engine, "_engine", engine)
+    engine.bind_loop(asyncio.get_running_loop())
+    await asyncio.to_thread(fire_trigger, TriggerType.USER_REGISTERED, user_id=11)
+    fire_trigger(TriggerType.PAYMENT_RECEIVED, user_id=11)  # nothing subscribed
+    for _ in range(50):
+        await asyncio.sleep(0.01)
+        await engine.drain()
+        if 11 in seen:
+            break
+    assert seen == [9, 5, 11]